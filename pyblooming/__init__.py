@@ -11,6 +11,15 @@ except ImportError:
     from bloom import BloomFilter
 
 from sbf import ScalingBloomFilter
+from blocked import BlockedBloomFilter
+from counting import CountingBloomFilter
+from cuckoo import CuckooFilter
+from static import StaticFilter
+from rotating import RotatingBloomFilter
+from sharded import ShardedBloomFilter
+from flusher import Flusher
 
-__all__ = ["Bitmap", "BloomFilter", "ScalingBloomFilter"]
+__all__ = ["Bitmap", "BloomFilter", "ScalingBloomFilter", "BlockedBloomFilter",
+           "CountingBloomFilter", "CuckooFilter", "StaticFilter", "RotatingBloomFilter",
+           "ShardedBloomFilter", "Flusher"]
 __version__ = "0.4.0"
@@ -2,11 +2,26 @@
 Implements a simple class to address individual bits using
 a memory mapped file.
 """
+import binascii
+import fcntl
 import mmap
+import operator
 import os.path
+import struct
+import threading
+
+# The access pattern hints accepted by Bitmap
+ADVICE = ("normal", "random", "sequential", "willneed", "hugepage")
 
 class Bitmap(object):
-    def __init__(self, length, filename=None, private=False):
+    # The number of bytes processed at a time by bulk operations
+    CHUNK_SIZE = 1 << 20
+
+    # The size of a page of memory
+    PAGE_SIZE = mmap.PAGESIZE
+
+    def __init__(self, length, filename=None, private=False, preallocate=False,
+                 advice="willneed", populate=False, atomic=False):
         """
         Creates a new Bitmap object. Bitmap wraps a memory mapped
         file and allows bit-level operations to be performed. A bitmap can
@@ -21,7 +36,29 @@ class Bitmap(object):
             is mapped using MAP_PRIVATE, making a private copy-on-write
             version of the memory mapped region. Otherwise, MAP_SHARED is used,
             and changes are reflected to other copies of the file.
+          - `preallocate` (optional) : Defaults to False. If True, the disk
+            space for a new file is allocated up front by writing zeros.
+            Otherwise the file is extended sparsely, and blocks are
+            allocated as they are written.
+          - `advice` (optional) : Defaults to "willneed". The expected access
+            pattern. Accepted for compatibility with the C Bitmap, but the
+            mmap module does not expose madvise() so it has no effect.
+          - `populate` (optional) : Defaults to False. If True, the whole
+            map is faulted in when opened. See prefetch().
+          - `atomic` (optional) : Defaults to False. If True, writes of
+            bits and counters take a lock, and lock the file, so that several
+            threads, or processes sharing the file, do not lose writes. Can
+            not be used with `private`. The file lock only excludes other pure
+            Python bitmaps, the C Bitmap uses atomic instructions instead.
         """
+        if advice not in ADVICE: raise ValueError, "Unknown advice %r!" % advice
+        if atomic and private: raise ValueError, "Atomic bitmaps can not be private!"
+        self.atomic = atomic
+        self.lock = threading.Lock()
+
+        # Tracks the pages modified since the last flush
+        self.dirty = set()
+
         # Save if  the size
         self.size = length
 
@@ -38,16 +75,22 @@ class Bitmap(object):
         else:
             self.fileobj = open(filename, "a+")
 
-            # Zero-fill the file
+            # Extend the file, this reads back as zeros
             size_diff = length - os.path.getsize(filename)
-            while size_diff > 0:
-                self.fileobj.write(chr(0) * min(size_diff, 100000))
+            if size_diff > 0 and preallocate:
+                zeros = chr(0) * min(size_diff, self.CHUNK_SIZE)
+                while size_diff > 0:
+                    self.fileobj.write(zeros[:size_diff])
+                    size_diff -= len(zeros)
                 self.fileobj.flush()
-                size_diff = length - os.path.getsize(filename)
+            elif size_diff > 0:
+                os.ftruncate(self.fileobj.fileno(), length)
 
             # Create the memory mapped file, using the proper flags
             self.mmap = mmap.mmap(self.fileobj.fileno(), length, flags=flags)
 
+        if populate: self.prefetch()
+
     def __len__(self):
         "Returns the size of the Bitmap in bits"
         return 8 * self.size
@@ -66,19 +109,166 @@ class Bitmap(object):
         """
         byte = idx >> 3
         byte_off  = 7 - idx % 8
-        byte_val = ord(self.mmap[byte])
-        if val:
-            byte_val |= 1 << byte_off
-        else:
-            byte_val &= ~(1 << byte_off)
-        self.mmap[byte] = chr(byte_val)
+        if self.atomic: self._lock()
+        try:
+            byte_val = ord(self.mmap[byte])
+            if val:
+                byte_val |= 1 << byte_off
+            else:
+                byte_val &= ~(1 << byte_off)
+            self.mmap[byte] = chr(byte_val)
+        finally:
+            if self.atomic: self._unlock()
+        self.dirty.add(byte // self.PAGE_SIZE)
+        return val
+
+    def set_bits(self, indices):
+        """
+        Sets the value of many bits to 1. Takes an iterable
+        of integer indexes. This avoids a call per bit.
+        """
+        mmap = self.mmap
+        dirty = self.dirty
+        page_size = self.PAGE_SIZE
+        if self.atomic: self._lock()
+        try:
+            for idx in indices:
+                byte = idx >> 3
+                mmap[byte] = chr(ord(mmap[byte]) | (1 << (7 - idx % 8)))
+                dirty.add(byte // page_size)
+        finally:
+            if self.atomic: self._unlock()
+
+    def get_bits(self, indices):
+        """
+        Gets the value of many bits. Takes an iterable of
+        integer indexes, and returns a list of the bit values.
+        """
+        mmap = self.mmap
+        return [(ord(mmap[idx >> 3]) >> (7 - idx % 8)) & 0x1 for idx in indices]
+
+    def test_all(self, indices):
+        """
+        Checks if all of the bits are set. Takes an iterable of
+        integer indexes, and stops at the first bit that is not set.
+        """
+        mmap = self.mmap
+        for idx in indices:
+            if not (ord(mmap[idx >> 3]) >> (7 - idx % 8)) & 0x1:
+                return False
+        return True
+
+    def atomic_add(self, offset, delta):
+        """
+        Adds delta to the little endian 64 bit counter at a byte
+        offset, and returns the new value. For atomic bitmaps, the
+        file is locked so the add is atomic with respect to other
+        pure Python bitmaps on the same file.
+        """
+        if offset < 0 or offset + 8 > self.size: raise ValueError, "Bad offset!"
+        if self.atomic: self._lock()
+        try:
+            val = struct.unpack("<Q", self.mmap[offset:offset+8])[0]
+            val = (val + delta) & 0xffffffffffffffff
+            if delta: self.mmap[offset:offset+8] = struct.pack("<Q", val)
+        finally:
+            if self.atomic: self._unlock()
+        if delta: self._mark_dirty(offset, offset + 8)
         return val
 
-    def flush(self):
-        "Flushes the contents of the Bitmap to disk."
-        if self.mmap: self.mmap.flush()
+    def atomic_load(self, offset):
+        "Returns the value of the counter at a byte offset. See atomic_add()"
+        return self.atomic_add(offset, 0)
+
+    def _lock(self):
+        """
+        Takes the lock, and an exclusive lock on the whole file
+        if there is one. fcntl() locks do not exclude threads.
+        """
+        self.lock.acquire()
+        if self.fileobj:
+            try:
+                fcntl.lockf(self.fileobj.fileno(), fcntl.LOCK_EX)
+            except:
+                self.lock.release()
+                raise
+
+    def _unlock(self):
+        "Releases the lock on the file, and the lock"
+        try:
+            if self.fileobj: fcntl.lockf(self.fileobj.fileno(), fcntl.LOCK_UN)
+        finally:
+            self.lock.release()
+
+    def advise(self, advice):
+        """
+        Advises the kernel of the expected access pattern. This has
+        no effect, since the mmap module does not expose madvise().
+        """
+        if advice not in ADVICE: raise ValueError, "Unknown advice %r!" % advice
+
+    def prefetch(self):
+        """
+        Faults in the whole map by touching every page. This avoids
+        paying a page fault on the first access of each page
+        after a restart.
+        """
+        mmap = self.mmap
+        for i in xrange(0, self.size, self.PAGE_SIZE):
+            mmap[i]
+
+    def resident_bytes(self):
+        """
+        Returns the number of bytes of the Bitmap which are resident
+        in memory. Always None, since mincore() is not available.
+        """
+        return None
+
+    def flush(self, dirty_only=False):
+        """
+        Flushes the contents of the Bitmap to disk. If dirty_only
+        is True, only the pages modified since the last flush are
+        written, instead of syncing the whole map. If the sync fails,
+        the pages stay marked as modified for the next flush.
+        """
+        dirty, self.dirty = self.dirty, set()
+        try:
+            if self.mmap and not dirty_only: self.mmap.flush()
+            elif self.mmap and self.fileobj:
+                for start, end in self._runs(sorted(dirty)):
+                    offset = start * self.PAGE_SIZE
+                    self.mmap.flush(offset, min(end * self.PAGE_SIZE, self.size) - offset)
+        except:
+            self.dirty.update(dirty)
+            raise
         if self.fileobj: self.fileobj.flush()
 
+    def _runs(self, pages):
+        "Yields the (start, end) of each run of consecutive pages"
+        start = end = None
+        for page in pages:
+            if page != end:
+                if start is not None: yield start, end
+                start = page
+            end = page + 1
+        if start is not None: yield start, end
+
+    def dirty_bytes(self):
+        """
+        Returns the number of bytes in the pages modified
+        since the last flush. This is what flush(dirty_only=True)
+        would write.
+        """
+        count = len(self.dirty) * self.PAGE_SIZE
+        last = (self.size - 1) // self.PAGE_SIZE
+        if last in self.dirty: count -= (last + 1) * self.PAGE_SIZE - self.size
+        return count
+
+    def _mark_dirty(self, start, end):
+        "Marks the pages covering the bytes from start to end as modified"
+        if end > start:
+            self.dirty.update(xrange(start // self.PAGE_SIZE, (end - 1) // self.PAGE_SIZE + 1))
+
     def close(self, flush=True):
         "Closes the Bitmap, flushing the data if specified."
         # Safety first!
@@ -101,4 +291,106 @@ class Bitmap(object):
     def __setslice__(self, i, j, val):
         "Allow direct access to the mmap, indexed by byte"
         self.mmap[i:j] = val
+        self._mark_dirty(i, min(j, self.size))
+
+    def popcount(self, start=0, end=None):
+        """
+        Returns the number of bits set to 1. Optionally restricted
+        to the bytes from start to end.
+        """
+        if end is None: end = self.size
+        if start < 0 or start > end or end > self.size: raise ValueError, "Bad range!"
+        count = 0
+        for i in xrange(start, end, self.CHUNK_SIZE):
+            j = min(i + self.CHUNK_SIZE, end)
+            count += bin(long(binascii.hexlify(self.mmap[i:j]), 16)).count("1")
+        return count
+
+    def clear(self, start=0, end=None):
+        """
+        Sets every bit to 0. Optionally restricted
+        to the bytes from start to end.
+        """
+        if end is None: end = self.size
+        if start < 0 or start > end or end > self.size: raise ValueError, "Bad range!"
+        zeros = chr(0) * min(end - start, self.CHUNK_SIZE)
+        for i in xrange(start, end, self.CHUNK_SIZE):
+            j = min(i + self.CHUNK_SIZE, end)
+            self.mmap[i:j] = zeros[:j-i]
+        self._mark_dirty(start, end)
+
+    def copy(self):
+        "Returns a copy of the Bitmap, using an anonymous map"
+        other = Bitmap(self.size)
+        for i in xrange(0, self.size, self.CHUNK_SIZE):
+            j = min(i + self.CHUNK_SIZE, self.size)
+            other[i:j] = self[i:j]
+        return other
+
+    def union_update(self, other, start=0, end=None):
+        """
+        Sets each bit to the OR of itself and the same bit in the
+        other Bitmap. Optionally restricted to the bytes from start to end.
+        """
+        self._combine(other, start, end, operator.or_)
+        return self
+
+    def intersection_update(self, other, start=0, end=None):
+        """
+        Sets each bit to the AND of itself and the same bit in the
+        other Bitmap. Optionally restricted to the bytes from start to end.
+        """
+        self._combine(other, start, end, operator.and_)
+        return self
+
+    def symmetric_difference_update(self, other, start=0, end=None):
+        """
+        Sets each bit to the XOR of itself and the same bit in the
+        other Bitmap. Optionally restricted to the bytes from start to end.
+        """
+        self._combine(other, start, end, operator.xor)
+        return self
+
+    def _combine(self, other, start, end, op):
+        """
+        Combines the bytes from start to end with the other Bitmap.
+        Each chunk is converted to a long, so the operation is done
+        a machine word at a time by the long implementation.
+        """
+        if end is None: end = self.size
+        if start < 0 or start > end or end > self.size or end > len(other) / 8:
+            raise ValueError, "Bad range!"
+        for i in xrange(start, end, self.CHUNK_SIZE):
+            j = min(i + self.CHUNK_SIZE, end)
+            mine = long(binascii.hexlify(self.mmap[i:j]), 16)
+            theirs = long(binascii.hexlify(other[i:j]), 16)
+            self.mmap[i:j] = binascii.unhexlify("%0*x" % (2*(j-i), op(mine, theirs)))
+        self._mark_dirty(start, end)
+
+    def _check_size(self, other):
+        "Checks that the other Bitmap has the same size"
+        if len(other) != len(self): raise ValueError, "Bitmaps must have the same size!"
+
+    def __ior__(self, other):
+        self._check_size(other)
+        return self.union_update(other)
+
+    def __iand__(self, other):
+        self._check_size(other)
+        return self.intersection_update(other)
+
+    def __ixor__(self, other):
+        self._check_size(other)
+        return self.symmetric_difference_update(other)
+
+    def __or__(self, other):
+        self._check_size(other)
+        return self.copy().union_update(other)
+
+    def __and__(self, other):
+        self._check_size(other)
+        return self.copy().intersection_update(other)
 
+    def __xor__(self, other):
+        self._check_size(other)
+        return self.copy().symmetric_difference_update(other)
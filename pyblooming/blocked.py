@@ -0,0 +1,132 @@
+"""
+This module implements a cache-line blocked bloom filter,
+which places all k bits of a key in a single 64 byte block.
+"""
+import math
+
+# Try to import the C version, fallback to Python
+try:
+    import cbitmap as bitmaplib
+except ImportError:
+    import bitmap as bitmaplib
+from bloom import BloomFilter
+
+
+class BlockedBloomFilter(BloomFilter):
+    # The size of each block, one cache line
+    BLOCK_BYTES = 64
+    BLOCK_BITS = BLOCK_BYTES * 8
+
+    # Blocked filters can only be merged with each other
+    LAYOUT = "blocked"
+    LAYOUT_ID = 1
+
+    def __init__(self, bitmap, k, hash_engine=None, index_mode=None, shared=False, threadsafe=False,
+                 header=False):
+        """
+        Creates a new blocked Bloom Filter instance. Instead of
+        spreading the k bits of a key across the whole bitmap, the
+        first hash selects a block and the remaining k hashes select
+        bits within it. Each operation touches a single cache line,
+        at the cost of a higher false positive rate for the same size.
+        The sizing methods correct for this.
+
+        :Parameters:
+          - bitmap : The bitmap that should be used. Must be large enough
+            to store at least one block and the additional meta data.
+          - k : The number of bits to set per key. Must be at least 1.
+          - hash_engine (optional) : The id of the hash engine to use.
+          - index_mode (optional) : How the hashes are derived.
+          - shared, threadsafe, header (optional) : See BloomFilter.
+        """
+        BloomFilter.__init__(self, bitmap, k, hash_engine, index_mode, shared, threadsafe, header)
+        self.blocks = int(self.bitmap_size / self.BLOCK_BITS)
+        if self.blocks == 0: raise ValueError("Bitmap is not large enough!")
+
+    @classmethod
+    def for_capacity(cls, capacity, probability, hash_engine=None, index_mode=None):
+        """
+        Creates a new blocked bloom filter that computes the
+        size required for the given capacity and probability,
+        and sets the ideal K. Uses an anonymous bitmap.
+        """
+        bytes, ideal_k = cls.params_for_capacity(capacity, probability)
+        bitmap = bitmaplib.Bitmap(bytes)
+        return cls(bitmap, ideal_k, hash_engine, index_mode)
+
+    @classmethod
+    def params_for_capacity(cls, capacity, probability, header=False):
+        """
+        Returns the number of bytes and ideal K value that
+        should be used to create a blocked Bloom Filter for the
+        given capacity and probability. Starts at the size of a
+        classic filter and grows it until the blocked false
+        positive rate is met. If header is True, the size is
+        for a filter with a header.
+        """
+        bits = cls.required_bits(capacity, probability)
+        blocks = max(1, int(math.ceil(bits / float(cls.BLOCK_BITS))))
+        while True:
+            k = cls.block_ideal_k(blocks * cls.BLOCK_BITS, capacity)
+            if cls.block_probability(blocks * cls.BLOCK_BITS, capacity, k) <= probability:
+                break
+            blocks = int(math.ceil(blocks * 1.02))
+        if header: return cls.header_length(blocks*cls.BLOCK_BYTES), k
+        return blocks*cls.BLOCK_BYTES + cls.extra_buffer(), k
+
+    @classmethod
+    def block_probability(cls, bits, capacity, k):
+        """
+        Returns the expected probability of false positives given a
+        bit count, capacity and k. The number of keys per block is
+        Poisson distributed, and each block behaves like a small
+        classic filter. From "Cache-, Hash- and Space-Efficient
+        Bloom Filters", Putze et al. 2007.
+        """
+        b = cls.BLOCK_BITS
+        lam = float(capacity) * b / bits
+        limit = int(lam + 10 * math.sqrt(lam) + 10)
+        prob = 0.0
+        for i in xrange(limit + 1):
+            weight = math.exp(i * math.log(lam) - lam - math.lgamma(i + 1)) if lam > 0 else float(i == 0)
+            prob += weight * (1 - (1 - 1.0 / b) ** (i * k)) ** k
+        return prob
+
+    @classmethod
+    def block_ideal_k(cls, bits, capacity):
+        """
+        Calculates the K which minimizes false positives for a
+        blocked filter. This searches around the ideal K of a
+        classic filter, since the optimum is slightly lower.
+        """
+        guess = max(1, int(math.ceil(cls.ideal_k(bits, capacity))))
+        candidates = xrange(max(1, guess - 3), guess + 2)
+        return min(candidates, key=lambda k: cls.block_probability(bits, capacity, k))
+
+    def current_false_positive_rate(self):
+        """
+        Returns the false positive rate of the filter given the
+        bits that are currently set. The fill varies between blocks,
+        so this uses the blocked model with the estimated cardinality.
+        """
+        if self.fill_ratio() >= 1: return 1.0
+        bits = self._filter_bits()
+        return self.block_probability(bits, self.estimate_cardinality(), self.k_num)
+
+    def _filter_bits(self):
+        "Returns the number of bits used for keys"
+        return self.blocks * self.BLOCK_BITS
+
+    def key_hashes(self, key, k=None):
+        "Returns the hashes for a key, we need one more to select the block"
+        if k is None or k < self.k_num + 1: k = self.k_num + 1
+        return self._get_hashes(key, k)
+
+    def _hash_positions(self, hashes):
+        "Returns the bit positions for the hashes of a key, all within a single block"
+        b = self.BLOCK_BITS
+        base = (hashes[0] % self.blocks) * b
+
+        # Use the upper half for the bit, since the low bits of double
+        # hashes cycle quickly when h2 has many trailing zeros
+        return [base + ((h >> 32) % b) for h in hashes[1:self.k_num+1]]
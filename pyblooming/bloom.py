@@ -2,26 +2,58 @@
 Implements an easy to use Bloom filter on top of
 the bitmap implementation.
 """
+import binascii
 import math
+import os.path
 import struct
-import sys
+import threading
 
 # Try to import the C version, fallback to Python
 try:
     import cbitmap as bitmaplib
 except ImportError:
     import bitmap as bitmaplib
+try:
+    import chashing as hashing
+except ImportError:
+    import hashing
 
 class BloomFilter(object):
     # This is the packing format we use to store the count
     SIZE_FMT = "<Q"
-    K_NUM_FMT = "<I"
+
+    # The k num is packed with the hash engine id and index mode. Filters
+    # created before hash engines have a 0 engine, e.g. HASH_LEGACY,
+    # and a 0 index mode, e.g. INDEX_INDEPENDENT.
+    K_NUM_FMT = "<HBB"
 
     # This is how many bytes we need to store the count
     SIZE_LEN = 8
     K_NUM_LEN = 4
 
-    def __init__(self, bitmap, k):
+    # Filters created with a header describe themselves, so they can be
+    # opened from a path alone. The header is stored after the bits, so bit
+    # positions start at 0 in both formats. It holds the magic, version, k,
+    # hash engine, index mode, layout id and bit size, then a CRC32 of those
+    # fields, and the count at HEADER_COUNT_OFFSET, which is 8 byte aligned.
+    HEADER_MAGIC = "PYBLOOM\x00"
+    HEADER_VERSION = 1
+    HEADER_FMT = "<8sHHBBBxQ"
+    HEADER_FIELDS_LEN = 24
+    HEADER_CHECKSUM_FMT = "<I"
+    HEADER_COUNT_OFFSET = 32
+    HEADER_LEN = 64
+
+    # How bits are assigned to keys, filters can only be
+    # merged if they have the same layout
+    LAYOUT = "partitioned"
+    LAYOUT_ID = 0
+
+    # This is how many bit positions add_many buffers before setting them
+    BATCH_BITS = 4096
+
+    def __init__(self, bitmap, k, hash_engine=None, index_mode=None, shared=False, threadsafe=False,
+                 header=False):
         """
         Creates a new Bloom Filter instance. A bloom filter
         requires a bitmap underneath.
@@ -31,24 +63,77 @@ class BloomFilter(object):
             store the additional meta data. extra_buffers() should be used to
             determine the amount of additional padding.
           - k : The number of hashing algorithms to
-            use. Must be at least 1.
+            use. Must be at least 1. May be None if the bitmap
+            already contains a filter.
+          - hash_engine (optional) : The id of the hash engine to use,
+            from the hashing module. Defaults to hashing.DEFAULT_ENGINE.
+            Like k, this is ignored if the bitmap already contains a filter.
+          - index_mode (optional) : How the k hashes are derived, from
+            the hashing module. INDEX_INDEPENDENT computes k independent
+            hashes, while INDEX_DOUBLE hashes the key once and derives
+            the k hashes using double hashing. Defaults to
+            hashing.DEFAULT_INDEX_MODE. Like k, this is ignored if the
+            bitmap already contains a filter.
+          - shared (optional) : If True, the filter can be written by
+            several processes at once. The bitmap must be atomic, and the
+            count is kept in the bitmap with atomic_add() instead of being
+            written by flush(). See the README for how to open the filter
+            from other processes.
+          - threadsafe (optional) : If True, the filter can be used by
+            several threads at once. The bitmap must be atomic, and the
+            count is updated under a lock.
+          - header (optional) : If True, a new filter is written with a
+            header describing it, so it can be reopened with open().
+            Existing filters are read in the format they were written in.
         """
-        if bitmap is None or k is None: raise ValueError, "Must provide bitmap and k!"
-        if k < 1: raise ValueError, "Bad value provided for k!"
+        if bitmap is None: raise ValueError, "Must provide bitmap!"
+        if shared and not getattr(bitmap, "atomic", False):
+            raise ValueError, "Shared filters require an atomic bitmap!"
+        if threadsafe and not getattr(bitmap, "atomic", False):
+            raise ValueError, "Thread safe filters require an atomic bitmap!"
+        if k is not None and (k < 1 or k > 0xffff): raise ValueError, "Bad value provided for k!"
+        if hash_engine is None: hash_engine = hashing.DEFAULT_ENGINE
+        if hash_engine not in hashing.ENGINES: raise ValueError, "Unknown hash engine!"
+        if index_mode is None: index_mode = hashing.DEFAULT_INDEX_MODE
+        if index_mode not in hashing.INDEX_MODES: raise ValueError, "Unknown index mode!"
         self.bitmap = bitmap
-        self.bitmap_size = len(bitmap) - 8*self.extra_buffer() # Ignore our size
-        if self.bitmap_size <= 0: raise ValueError, "Bitmap is not large enough!"
-
-        # Restore the k num if we need to
-        self.k_num = self._read_k_num() # Read the existing knum from the file
+        self.shared = shared
+        self.threadsafe = threadsafe
+        self.lock = threading.Lock() if threadsafe else None
+        if len(bitmap) <= 8*self.extra_buffer(): raise ValueError, "Bitmap is not large enough!"
+
+        # Restore the k num, hash engine and index mode if we need to
+        fields = self._read_header()
+        if fields is not None:
+            self.header = True
+            self.k_num, self.hash_engine, self.index_mode, self.bitmap_size = fields
+        else:
+            self.header = False
+            self.bitmap_size = len(bitmap) - 8*self.extra_buffer() # Ignore our size
+            self.k_num, self.hash_engine, self.index_mode = self._read_k_num() # Read the existing knum from the file
         if self.k_num == 0:
+            if k is None: raise ValueError, "Bitmap does not contain a filter, must provide k!"
             self.k_num = k
-            self._write_k_num()
+            self.hash_engine = hash_engine
+            self.index_mode = index_mode
+            if header:
+                self.header = True
+                if len(bitmap) <= 8*self.HEADER_LEN: raise ValueError, "Bitmap is not large enough!"
+                self.bitmap_size = len(bitmap) - 8*self.HEADER_LEN
+                self._write_header()
+            else:
+                self._write_k_num()
+        elif self.hash_engine not in hashing.ENGINES:
+            raise ValueError, "Bitmap uses an unknown hash engine!"
+        elif self.index_mode not in hashing.INDEX_MODES:
+            raise ValueError, "Bitmap uses an unknown index mode!"
 
         # Compute the offset size
         self.offset = int(self.bitmap_size / self.k_num)
 
         # Restore the count
+        self.count_offset = self.bitmap_size / 8
+        if self.header: self.count_offset += self.HEADER_COUNT_OFFSET
         self.count = self._read_count() # Read the count from the file
         self.info = {} # Allows dynamic properties
 
@@ -60,7 +145,7 @@ class BloomFilter(object):
         return cls.SIZE_LEN + cls.K_NUM_LEN
 
     @classmethod
-    def for_capacity(cls, capacity, probability):
+    def for_capacity(cls, capacity, probability, hash_engine=None, index_mode=None):
         """
         Creates a new bloom filter that computes the
         size required for the given capacity and probability,
@@ -68,22 +153,64 @@ class BloomFilter(object):
         """
         bytes, ideal_k = cls.params_for_capacity(capacity, probability)
         bitmap = bitmaplib.Bitmap(bytes)
-        return BloomFilter(bitmap, ideal_k)
+        return BloomFilter(bitmap, ideal_k, hash_engine, index_mode)
 
     @classmethod
-    def params_for_capacity(cls, capacity, probability):
+    def params_for_capacity(cls, capacity, probability, header=False):
         """
         Returns the number of bytes and ideal K value that
         should be used to create a Bloom Filter for the given
-        capacity and probability.
+        capacity and probability. If header is True, the size is
+        for a filter with a header, with the count aligned.
         """
         # Get the number of bytes and bits
         bytes = cls.required_bytes(capacity, probability)
         bits = bytes*8 # The bytes may round up, so get the bits again
         ideal_k = cls.ideal_k(bits, capacity)
         ideal_k = int(math.ceil(ideal_k))
+        if header: return cls.header_length(bytes), ideal_k
         return bytes+cls.extra_buffer(), ideal_k
 
+    @classmethod
+    def header_length(cls, bytes):
+        """
+        Returns the length of a bitmap with a header, given the
+        bytes used for bits. The bits are padded to 8 bytes, so
+        the count can be updated with an atomic add.
+        """
+        return bytes + (-bytes % 8) + cls.HEADER_LEN
+
+    @classmethod
+    def create(cls, filename, capacity, probability, hash_engine=None, index_mode=None,
+               shared=False, threadsafe=False, **kwargs):
+        """
+        Creates a new file backed filter with a header for the given
+        capacity and probability, so it can be reopened with open().
+        If the file already contains a filter, it is opened instead.
+        Any other keyword arguments are passed to the Bitmap.
+        """
+        bytes, ideal_k = cls.params_for_capacity(capacity, probability, header=True)
+        if shared or threadsafe: kwargs.setdefault("atomic", True)
+        bitmap = bitmaplib.Bitmap(bytes, filename, **kwargs)
+        return cls(bitmap, ideal_k, hash_engine, index_mode, shared=shared,
+                   threadsafe=threadsafe, header=True)
+
+    @classmethod
+    def open(cls, filename, shared=False, threadsafe=False, **kwargs):
+        """
+        Opens an existing filter from a file, using the size of the file.
+        This works for files with a header, and for legacy files whose
+        size is the bitmap length. Any other keyword arguments are
+        passed to the Bitmap.
+        """
+        if shared or threadsafe: kwargs.setdefault("atomic", True)
+        bitmap = bitmaplib.Bitmap(os.path.getsize(filename), filename, **kwargs)
+        try:
+            return cls(bitmap, None, shared=shared, threadsafe=threadsafe)
+        except:
+            bitmap.close(flush=False)
+            raise
+
     @classmethod
     def required_bits(cls, capacity, prob):
         """
@@ -125,84 +252,232 @@ class BloomFilter(object):
 
     def _get_hashes(self, key, k):
         "Generates a specified number of hashes for a key"
-        max_val = (sys.maxint+1)*2
-        hashes = []
-        salt = ""
-        while len(hashes) < k:
-            # Get a set of new hashes
-            new_hashes = self._hash(key, salt)
-            hashes.extend(new_hashes)
-
-            # Generate a new salt
-            salt_raw = (new_hashes[0] ^ new_hashes[1] ^ new_hashes[2] ^ new_hashes[3]) % max_val
-            salt = struct.pack("<Q", salt_raw)
-        return hashes[:k]
-
-    def _hash(self, key, salt=""):
-        "Computes and returns the DJB, DEK, FNV, and JS hashes"
-        if salt: key = salt + key
-        max_val = (sys.maxint+1)*2
-        djb_hash = 5381
-        dek_hash = len(key)
-        fnv_prime = 0x811C9DC5
-        fnv_hash = 0
-        js_hash = 1315423911
-
-        for elem in key:
-            key_val = ord(elem)
-            djb_hash = (((djb_hash << 5) + djb_hash) + key_val) % max_val
-            dek_hash = (((dek_hash << 6) ^ (dek_hash >> 27)) ^ key_val) % max_val
-            fnv_hash = (fnv_hash * fnv_prime) % max_val
-            fnv_hash = fnv_hash ^ key_val
-            js_hash ^= (((js_hash << 5) + key_val + (js_hash >> 2)) % max_val)
-
-        return (djb_hash, dek_hash, fnv_hash, js_hash)
+        return hashing.get_hashes(self.hash_engine, key, k, self.index_mode)
 
     def add(self, key, check_first=False):
         "Add a key to the set"
         if check_first and key in self: return False
-        hashes = self._get_hashes(key, self.k_num)
-        m = self.offset
-        offset = 0
 
         # Set the bits for the hashes
-        for h in hashes:
-            self.bitmap[offset + (h % m)] = 1
-            offset += m
-
-        self.count += 1
+        self.bitmap.set_bits(self._positions(key))
+        self._add_count(1)
         return True
 
     def __contains__(self, key):
         "Checks if the set contains a given key"
-        hashes = self._get_hashes(key, self.k_num)
-        m = self.offset
-        offset = 0
+        return self.bitmap.test_all(self._positions(key))
 
-        for h in hashes:
-            if self.bitmap[offset + (h % m)] == 0: return False
-            offset += m
+    def add_many(self, keys, check_first=False):
+        """
+        Adds every key in an iterable to the set. This is equivalent
+        to calling add() for each key, but avoids the per-call overhead.
+        Returns the number of keys that were added.
+        """
+        bitmap = self.bitmap
+        positions = self._positions
+        added = 0
+
+        # Check and add each key so duplicates in the batch are found
+        if check_first:
+            for key in keys:
+                idx = positions(key)
+                if bitmap.test_all(idx): continue
+                bitmap.set_bits(idx)
+                added += 1
+
+        # Set the bits for a chunk of keys at a time
+        else:
+            batch = []
+            for key in keys:
+                batch.extend(positions(key))
+                added += 1
+                if len(batch) >= self.BATCH_BITS:
+                    bitmap.set_bits(batch)
+                    batch = []
+            bitmap.set_bits(batch)
+
+        self._add_count(added)
+        return added
+
+    def contains_many(self, keys):
+        """
+        Checks if the set contains each key in an iterable.
+        Returns a list of booleans in the same order as the keys.
+        """
+        test_all = self.bitmap.test_all
+        positions = self._positions
+        return [test_all(positions(key)) for key in keys]
 
+    def key_hashes(self, key, k=None):
+        """
+        Returns the hashes for a key. At least as many hashes as this
+        filter needs are returned, but more can be requested with k.
+        Since the hashes for a larger k extend those for a smaller k,
+        the result can be shared with any filter that has the same
+        hash engine and index mode and needs at most as many hashes.
+        """
+        if k is None or k < self.k_num: k = self.k_num
+        return self._get_hashes(key, k)
+
+    def add_hashes(self, hashes):
+        """
+        Adds a key to the set, given the hashes for
+        the key returned by key_hashes().
+        """
+        self.bitmap.set_bits(self._hash_positions(hashes))
+        self._add_count(1)
         return True
 
+    def contains_hashes(self, hashes):
+        """
+        Checks if the set contains a key, given the hashes
+        for the key returned by key_hashes().
+        """
+        return self.bitmap.test_all(self._hash_positions(hashes))
+
+    def _positions(self, key):
+        "Returns the bit positions for a key"
+        return self._hash_positions(self.key_hashes(key))
+
+    def _hash_positions(self, hashes):
+        "Returns the bit positions for the hashes of a key, one per partition"
+        m = self.offset
+        return [i*m + (hashes[i] % m) for i in xrange(self.k_num)]
+
+    def fill_ratio(self):
+        "Returns the fraction of the bits used by keys which are set"
+        return float(self.bitmap.popcount(0, self.bitmap_size / 8)) / self._filter_bits()
+
+    def estimate_cardinality(self):
+        """
+        Estimates the number of distinct keys in the filter from
+        the number of bits that are set. Unlike len(), this is not
+        inflated by duplicate adds or by merging filters. Returns
+        infinity if every bit is set. From "Cardinality estimation
+        and dynamic length adaptation for Bloom filters", Papapetrou et al. 2010.
+        """
+        bits = self._filter_bits()
+        fill = self.fill_ratio()
+        if fill >= 1: return float("inf")
+        return -float(bits) / self.k_num * math.log(1 - fill)
+
+    def current_false_positive_rate(self):
+        """
+        Returns the false positive rate of the filter given
+        the bits that are currently set.
+        """
+        return self.fill_ratio() ** self.k_num
+
+    def _filter_bits(self):
+        "Returns the number of bits used for keys"
+        return self.k_num * self.offset
+
+    def clear(self):
+        """
+        Removes every key from the filter, keeping the bitmap,
+        k, hash engine and index mode.
+        """
+        self.bitmap.clear(0, self.bitmap_size / 8)
+        self._add_count(-len(self))
+
+    def copy(self):
+        "Returns a copy of the filter, using an anonymous bitmap"
+        filt = type(self)(self.bitmap.copy(), self.k_num)
+        filt.count = len(self)
+        return filt
+
+    def union(self, other):
+        """
+        Returns a new filter containing the keys of both filters.
+        The filters must have the same size, k, hash engine and index mode.
+        The new filter uses an anonymous bitmap.
+        """
+        return self.copy().union_update(other)
+
+    def intersection(self, other):
+        """
+        Returns a new filter containing the keys found in both filters.
+        The filters must have the same size, k, hash engine and index mode.
+        The new filter uses an anonymous bitmap. This may have a higher
+        false positive rate than a filter built from the common keys.
+        """
+        return self.copy().intersection_update(other)
+
+    def union_update(self, other):
+        """
+        Adds the keys of another filter to this filter, in place.
+        The count becomes the sum of the counts, which is an upper bound.
+        """
+        self._check_compatible(other)
+        self.bitmap.union_update(other.bitmap, 0, self.bitmap_size / 8)
+        self._add_count(len(other))
+        return self
+
+    def intersection_update(self, other):
+        """
+        Removes the keys that are not in another filter, in place.
+        The count becomes the smaller of the counts, which is an upper bound.
+        """
+        self._check_compatible(other)
+        self.bitmap.intersection_update(other.bitmap, 0, self.bitmap_size / 8)
+        self._add_count(min(len(self), len(other)) - len(self))
+        return self
+
+    def _check_compatible(self, other):
+        "Checks that another filter can be merged with this one"
+        if (len(self.bitmap) != len(other.bitmap) or self.bitmap_size != other.bitmap_size or
+                self.k_num != other.k_num or
+                self.hash_engine != other.hash_engine or self.index_mode != other.index_mode or
+                self.LAYOUT != getattr(other, "LAYOUT", None)):
+            raise ValueError, "Filters must have the same size, k, hash engine and index mode!"
+
     def __len__(self):
-        "Returns the number of elements in the bitmap"
+        """
+        Returns the number of elements in the bitmap. Shared
+        filters read the count, which includes other processes.
+        """
+        if self.shared and self.bitmap:
+            self.count = self.bitmap.atomic_load(self.count_offset)
         return self.count
 
-    def flush(self):
+    def _add_count(self, delta):
+        """
+        Adds to the count. Shared filters add to the count
+        in the bitmap atomically, and keep the new value.
+        """
+        if self.shared:
+            self.count = self.bitmap.atomic_add(self.count_offset, delta)
+        elif self.lock:
+            with self.lock:
+                self.count += delta
+        else:
+            self.count += delta
+
+    def flush(self, dirty_only=False):
         """
         Forces us to write out the current count to the bitmap,
-        and flushes the underlying bitmap.
+        and flushes the underlying bitmap. If dirty_only is True,
+        only the modified pages of the bitmap are written.
         """
+        # Shared filters keep the count in the bitmap
+        if self.shared:
+            if self.bitmap: self.bitmap.flush(dirty_only=dirty_only)
+            return
+
         # Get the count string
         count_str = struct.pack(self.SIZE_FMT, self.count)
 
-        # Set the count as the last bytes
-        size_offset = self.bitmap_size / 8
-        if self.bitmap: self.bitmap[size_offset:size_offset+self.SIZE_LEN] = count_str
+        # Set the count, if it changed
+        size_offset = self.count_offset
+        if self.bitmap and self.bitmap[size_offset:size_offset+self.SIZE_LEN] != count_str:
+            self.bitmap[size_offset:size_offset+self.SIZE_LEN] = count_str
 
         # Flush the underlying bitmap
-        if self.bitmap: self.bitmap.flush()
+        if self.bitmap: self.bitmap.flush(dirty_only=dirty_only)
+
+    def dirty_bytes(self):
+        "Returns the number of bytes of the bitmap modified since the last flush"
+        return self.bitmap.dirty_bytes()
 
     def close(self, flush=True):
         "Closes the bloom filter and the underlying bitmap"
@@ -214,8 +489,7 @@ class BloomFilter(object):
 
     def _read_count(self):
         "Reads the count from the bitmap"
-        # Set the count as the last bytes
-        size_offset = self.bitmap_size / 8
+        size_offset = self.count_offset
         count_str = self.bitmap[size_offset:size_offset+self.SIZE_LEN]
 
         # Unpack
@@ -223,16 +497,46 @@ class BloomFilter(object):
         return unpacked[0]
 
     def _read_k_num(self):
-        "Reads the k-num we should use"
+        "Reads the k-num, hash engine and index mode we should use"
         size_offset = self.bitmap_size / 8 + self.SIZE_LEN
         knum_str = self.bitmap[size_offset:size_offset+self.K_NUM_LEN]
         unpacked = struct.unpack(self.K_NUM_FMT, knum_str)
-        return unpacked[0]
+        return unpacked
 
     def _write_k_num(self):
-        "Writes the k-num we should use"
+        "Writes the k-num, hash engine and index mode we should use"
         size_offset = self.bitmap_size / 8 + self.SIZE_LEN
-        knum_str = struct.pack(self.K_NUM_FMT, self.k_num)
+        knum_str = struct.pack(self.K_NUM_FMT, self.k_num, self.hash_engine, self.index_mode)
         self.bitmap[size_offset:size_offset+self.K_NUM_LEN] = knum_str
         self.bitmap.flush()
 
+
+    def _read_header(self):
+        """
+        Reads the k-num, hash engine, index mode and bit size from
+        the header. Returns None if the bitmap does not have a header.
+        """
+        offset = len(self.bitmap) / 8 - self.HEADER_LEN
+        if offset <= 0: return None
+        fields = self.bitmap[offset:offset+self.HEADER_FIELDS_LEN]
+        magic, version, k, engine, mode, layout, bits = struct.unpack(self.HEADER_FMT, fields)
+        if magic != self.HEADER_MAGIC: return None
+
+        # Validate the header before trusting it
+        checksum_str = self.bitmap[offset+self.HEADER_FIELDS_LEN:offset+self.HEADER_FIELDS_LEN+4]
+        if struct.unpack(self.HEADER_CHECKSUM_FMT, checksum_str)[0] != binascii.crc32(fields) & 0xffffffff:
+            raise ValueError, "Header checksum does not match!"
+        if version != self.HEADER_VERSION: raise ValueError, "Unsupported header version %d!" % version
+        if k < 1: raise ValueError, "Header has a bad value for k!"
+        if bits != 8 * offset: raise ValueError, "Header does not match the bitmap size!"
+        if layout != self.LAYOUT_ID: raise ValueError, "Bitmap contains a different kind of filter!"
+        return k, engine, mode, bits
+
+    def _write_header(self):
+        "Writes the header describing the filter"
+        offset = self.bitmap_size / 8
+        fields = struct.pack(self.HEADER_FMT, self.HEADER_MAGIC, self.HEADER_VERSION, self.k_num,
+                             self.hash_engine, self.index_mode, self.LAYOUT_ID, self.bitmap_size)
+        checksum_str = struct.pack(self.HEADER_CHECKSUM_FMT, binascii.crc32(fields) & 0xffffffff)
+        self.bitmap[offset:offset+self.HEADER_FIELDS_LEN+4] = fields + checksum_str
+        self.bitmap.flush()
@@ -1,16 +1,47 @@
-/* Generated by Cython 0.15 on Thu Dec 22 19:07:01 2011 */
+/* Generated by Cython 0.29.37 */
 
+/* BEGIN: Cython Metadata
+{
+    "distutils": {
+        "depends": [
+            "pyblooming/cbitmaputil.h"
+        ], 
+        "extra_compile_args": [
+            "-std=gnu99", 
+            "-O2"
+        ], 
+        "include_dirs": [
+            "pyblooming"
+        ], 
+        "library_dirs": [
+            "pyblooming"
+        ], 
+        "name": "pyblooming.cbitmap", 
+        "sources": [
+            "pyblooming/cbitmap.pyx", 
+            "pyblooming/cbitmaputil.c"
+        ]
+    }, 
+    "module_name": "pyblooming.cbitmap"
+}
+END: Cython Metadata */
+
+#ifndef PY_SSIZE_T_CLEAN
 #define PY_SSIZE_T_CLEAN
+#endif /* PY_SSIZE_T_CLEAN */
 #include "Python.h"
 #ifndef Py_PYTHON_H
     #error Python headers needed to compile C extensions, please install development version of Python.
+#elif PY_VERSION_HEX < 0x02060000 || (0x03000000 <= PY_VERSION_HEX && PY_VERSION_HEX < 0x03030000)
+    #error Cython requires Python 2.6+ or Python 3.3+.
 #else
-
-#include <stddef.h> /* For offsetof */
+#define CYTHON_ABI "0_29_37"
+#define CYTHON_HEX_VERSION 0x001D25F0
+#define CYTHON_FUTURE_DIVISION 0
+#include <stddef.h>
 #ifndef offsetof
-#define offsetof(type, member) ( (size_t) & ((type*)0) -> member )
+  #define offsetof(type, member) ( (size_t) & ((type*)0) -> member )
 #endif
-
 #if !defined(WIN32) && !defined(MS_WINDOWS)
   #ifndef __stdcall
     #define __stdcall
@@ -22,122 +53,633 @@
     #define __fastcall
   #endif
 #endif
-
 #ifndef DL_IMPORT
   #define DL_IMPORT(t) t
 #endif
 #ifndef DL_EXPORT
   #define DL_EXPORT(t) t
 #endif
-
+#define __PYX_COMMA ,
+#ifndef HAVE_LONG_LONG
+  #if PY_VERSION_HEX >= 0x02070000
+    #define HAVE_LONG_LONG
+  #endif
+#endif
 #ifndef PY_LONG_LONG
   #define PY_LONG_LONG LONG_LONG
 #endif
-
-#if PY_VERSION_HEX < 0x02040000
-  #define METH_COEXIST 0
-  #define PyDict_CheckExact(op) (Py_TYPE(op) == &PyDict_Type)
-  #define PyDict_Contains(d,o)   PySequence_Contains(d,o)
+#ifndef Py_HUGE_VAL
+  #define Py_HUGE_VAL HUGE_VAL
 #endif
-
-#if PY_VERSION_HEX < 0x02050000
-  typedef int Py_ssize_t;
-  #define PY_SSIZE_T_MAX INT_MAX
-  #define PY_SSIZE_T_MIN INT_MIN
-  #define PY_FORMAT_SIZE_T ""
-  #define PyInt_FromSsize_t(z) PyInt_FromLong(z)
-  #define PyInt_AsSsize_t(o)   __Pyx_PyInt_AsInt(o)
-  #define PyNumber_Index(o)    PyNumber_Int(o)
-  #define PyIndex_Check(o)     PyNumber_Check(o)
-  #define PyErr_WarnEx(category, message, stacklevel) PyErr_Warn(category, message)
+#ifdef PYPY_VERSION
+  #define CYTHON_COMPILING_IN_PYPY 1
+  #define CYTHON_COMPILING_IN_PYSTON 0
+  #define CYTHON_COMPILING_IN_CPYTHON 0
+  #define CYTHON_COMPILING_IN_NOGIL 0
+  #undef CYTHON_USE_TYPE_SLOTS
+  #define CYTHON_USE_TYPE_SLOTS 0
+  #undef CYTHON_USE_PYTYPE_LOOKUP
+  #define CYTHON_USE_PYTYPE_LOOKUP 0
+  #if PY_VERSION_HEX < 0x03050000
+    #undef CYTHON_USE_ASYNC_SLOTS
+    #define CYTHON_USE_ASYNC_SLOTS 0
+  #elif !defined(CYTHON_USE_ASYNC_SLOTS)
+    #define CYTHON_USE_ASYNC_SLOTS 1
+  #endif
+  #undef CYTHON_USE_PYLIST_INTERNALS
+  #define CYTHON_USE_PYLIST_INTERNALS 0
+  #undef CYTHON_USE_UNICODE_INTERNALS
+  #define CYTHON_USE_UNICODE_INTERNALS 0
+  #undef CYTHON_USE_UNICODE_WRITER
+  #define CYTHON_USE_UNICODE_WRITER 0
+  #undef CYTHON_USE_PYLONG_INTERNALS
+  #define CYTHON_USE_PYLONG_INTERNALS 0
+  #undef CYTHON_AVOID_BORROWED_REFS
+  #define CYTHON_AVOID_BORROWED_REFS 1
+  #undef CYTHON_ASSUME_SAFE_MACROS
+  #define CYTHON_ASSUME_SAFE_MACROS 0
+  #undef CYTHON_UNPACK_METHODS
+  #define CYTHON_UNPACK_METHODS 0
+  #undef CYTHON_FAST_THREAD_STATE
+  #define CYTHON_FAST_THREAD_STATE 0
+  #undef CYTHON_FAST_PYCALL
+  #define CYTHON_FAST_PYCALL 0
+  #if PY_VERSION_HEX < 0x03090000
+    #undef CYTHON_PEP489_MULTI_PHASE_INIT
+    #define CYTHON_PEP489_MULTI_PHASE_INIT 0
+  #elif !defined(CYTHON_PEP489_MULTI_PHASE_INIT)
+    #define CYTHON_PEP489_MULTI_PHASE_INIT 1
+  #endif
+  #undef CYTHON_USE_TP_FINALIZE
+  #define CYTHON_USE_TP_FINALIZE (PY_VERSION_HEX >= 0x030400a1 && PYPY_VERSION_NUM >= 0x07030C00)
+  #undef CYTHON_USE_DICT_VERSIONS
+  #define CYTHON_USE_DICT_VERSIONS 0
+  #undef CYTHON_USE_EXC_INFO_STACK
+  #define CYTHON_USE_EXC_INFO_STACK 0
+  #ifndef CYTHON_UPDATE_DESCRIPTOR_DOC
+    #define CYTHON_UPDATE_DESCRIPTOR_DOC 0
+  #endif
+#elif defined(PYSTON_VERSION)
+  #define CYTHON_COMPILING_IN_PYPY 0
+  #define CYTHON_COMPILING_IN_PYSTON 1
+  #define CYTHON_COMPILING_IN_CPYTHON 0
+  #define CYTHON_COMPILING_IN_NOGIL 0
+  #ifndef CYTHON_USE_TYPE_SLOTS
+    #define CYTHON_USE_TYPE_SLOTS 1
+  #endif
+  #undef CYTHON_USE_PYTYPE_LOOKUP
+  #define CYTHON_USE_PYTYPE_LOOKUP 0
+  #undef CYTHON_USE_ASYNC_SLOTS
+  #define CYTHON_USE_ASYNC_SLOTS 0
+  #undef CYTHON_USE_PYLIST_INTERNALS
+  #define CYTHON_USE_PYLIST_INTERNALS 0
+  #ifndef CYTHON_USE_UNICODE_INTERNALS
+    #define CYTHON_USE_UNICODE_INTERNALS 1
+  #endif
+  #undef CYTHON_USE_UNICODE_WRITER
+  #define CYTHON_USE_UNICODE_WRITER 0
+  #undef CYTHON_USE_PYLONG_INTERNALS
+  #define CYTHON_USE_PYLONG_INTERNALS 0
+  #ifndef CYTHON_AVOID_BORROWED_REFS
+    #define CYTHON_AVOID_BORROWED_REFS 0
+  #endif
+  #ifndef CYTHON_ASSUME_SAFE_MACROS
+    #define CYTHON_ASSUME_SAFE_MACROS 1
+  #endif
+  #ifndef CYTHON_UNPACK_METHODS
+    #define CYTHON_UNPACK_METHODS 1
+  #endif
+  #undef CYTHON_FAST_THREAD_STATE
+  #define CYTHON_FAST_THREAD_STATE 0
+  #undef CYTHON_FAST_PYCALL
+  #define CYTHON_FAST_PYCALL 0
+  #undef CYTHON_PEP489_MULTI_PHASE_INIT
+  #define CYTHON_PEP489_MULTI_PHASE_INIT 0
+  #undef CYTHON_USE_TP_FINALIZE
+  #define CYTHON_USE_TP_FINALIZE 0
+  #undef CYTHON_USE_DICT_VERSIONS
+  #define CYTHON_USE_DICT_VERSIONS 0
+  #undef CYTHON_USE_EXC_INFO_STACK
+  #define CYTHON_USE_EXC_INFO_STACK 0
+  #ifndef CYTHON_UPDATE_DESCRIPTOR_DOC
+    #define CYTHON_UPDATE_DESCRIPTOR_DOC 0
+  #endif
+#elif defined(PY_NOGIL)
+  #define CYTHON_COMPILING_IN_PYPY 0
+  #define CYTHON_COMPILING_IN_PYSTON 0
+  #define CYTHON_COMPILING_IN_CPYTHON 0
+  #define CYTHON_COMPILING_IN_NOGIL 1
+  #ifndef CYTHON_USE_TYPE_SLOTS
+    #define CYTHON_USE_TYPE_SLOTS 1
+  #endif
+  #undef CYTHON_USE_PYTYPE_LOOKUP
+  #define CYTHON_USE_PYTYPE_LOOKUP 0
+  #ifndef CYTHON_USE_ASYNC_SLOTS
+    #define CYTHON_USE_ASYNC_SLOTS 1
+  #endif
+  #undef CYTHON_USE_PYLIST_INTERNALS
+  #define CYTHON_USE_PYLIST_INTERNALS 0
+  #ifndef CYTHON_USE_UNICODE_INTERNALS
+    #define CYTHON_USE_UNICODE_INTERNALS 1
+  #endif
+  #undef CYTHON_USE_UNICODE_WRITER
+  #define CYTHON_USE_UNICODE_WRITER 0
+  #undef CYTHON_USE_PYLONG_INTERNALS
+  #define CYTHON_USE_PYLONG_INTERNALS 0
+  #ifndef CYTHON_AVOID_BORROWED_REFS
+    #define CYTHON_AVOID_BORROWED_REFS 0
+  #endif
+  #ifndef CYTHON_ASSUME_SAFE_MACROS
+    #define CYTHON_ASSUME_SAFE_MACROS 1
+  #endif
+  #ifndef CYTHON_UNPACK_METHODS
+    #define CYTHON_UNPACK_METHODS 1
+  #endif
+  #undef CYTHON_FAST_THREAD_STATE
+  #define CYTHON_FAST_THREAD_STATE 0
+  #undef CYTHON_FAST_PYCALL
+  #define CYTHON_FAST_PYCALL 0
+  #ifndef CYTHON_PEP489_MULTI_PHASE_INIT
+    #define CYTHON_PEP489_MULTI_PHASE_INIT 1
+  #endif
+  #ifndef CYTHON_USE_TP_FINALIZE
+    #define CYTHON_USE_TP_FINALIZE 1
+  #endif
+  #undef CYTHON_USE_DICT_VERSIONS
+  #define CYTHON_USE_DICT_VERSIONS 0
+  #undef CYTHON_USE_EXC_INFO_STACK
+  #define CYTHON_USE_EXC_INFO_STACK 0
+#else
+  #define CYTHON_COMPILING_IN_PYPY 0
+  #define CYTHON_COMPILING_IN_PYSTON 0
+  #define CYTHON_COMPILING_IN_CPYTHON 1
+  #define CYTHON_COMPILING_IN_NOGIL 0
+  #ifndef CYTHON_USE_TYPE_SLOTS
+    #define CYTHON_USE_TYPE_SLOTS 1
+  #endif
+  #if PY_VERSION_HEX < 0x02070000
+    #undef CYTHON_USE_PYTYPE_LOOKUP
+    #define CYTHON_USE_PYTYPE_LOOKUP 0
+  #elif !defined(CYTHON_USE_PYTYPE_LOOKUP)
+    #define CYTHON_USE_PYTYPE_LOOKUP 1
+  #endif
+  #if PY_MAJOR_VERSION < 3
+    #undef CYTHON_USE_ASYNC_SLOTS
+    #define CYTHON_USE_ASYNC_SLOTS 0
+  #elif !defined(CYTHON_USE_ASYNC_SLOTS)
+    #define CYTHON_USE_ASYNC_SLOTS 1
+  #endif
+  #if PY_VERSION_HEX < 0x02070000
+    #undef CYTHON_USE_PYLONG_INTERNALS
+    #define CYTHON_USE_PYLONG_INTERNALS 0
+  #elif !defined(CYTHON_USE_PYLONG_INTERNALS)
+    #define CYTHON_USE_PYLONG_INTERNALS (PY_VERSION_HEX < 0x030C00A5)
+  #endif
+  #ifndef CYTHON_USE_PYLIST_INTERNALS
+    #define CYTHON_USE_PYLIST_INTERNALS 1
+  #endif
+  #ifndef CYTHON_USE_UNICODE_INTERNALS
+    #define CYTHON_USE_UNICODE_INTERNALS 1
+  #endif
+  #if PY_VERSION_HEX < 0x030300F0 || PY_VERSION_HEX >= 0x030B00A2
+    #undef CYTHON_USE_UNICODE_WRITER
+    #define CYTHON_USE_UNICODE_WRITER 0
+  #elif !defined(CYTHON_USE_UNICODE_WRITER)
+    #define CYTHON_USE_UNICODE_WRITER 1
+  #endif
+  #ifndef CYTHON_AVOID_BORROWED_REFS
+    #define CYTHON_AVOID_BORROWED_REFS 0
+  #endif
+  #ifndef CYTHON_ASSUME_SAFE_MACROS
+    #define CYTHON_ASSUME_SAFE_MACROS 1
+  #endif
+  #ifndef CYTHON_UNPACK_METHODS
+    #define CYTHON_UNPACK_METHODS 1
+  #endif
+  #if PY_VERSION_HEX >= 0x030B00A4
+    #undef CYTHON_FAST_THREAD_STATE
+    #define CYTHON_FAST_THREAD_STATE 0
+  #elif !defined(CYTHON_FAST_THREAD_STATE)
+    #define CYTHON_FAST_THREAD_STATE 1
+  #endif
+  #ifndef CYTHON_FAST_PYCALL
+    #define CYTHON_FAST_PYCALL (PY_VERSION_HEX < 0x030A0000)
+  #endif
+  #ifndef CYTHON_PEP489_MULTI_PHASE_INIT
+    #define CYTHON_PEP489_MULTI_PHASE_INIT (PY_VERSION_HEX >= 0x03050000)
+  #endif
+  #ifndef CYTHON_USE_TP_FINALIZE
+    #define CYTHON_USE_TP_FINALIZE (PY_VERSION_HEX >= 0x030400a1)
+  #endif
+  #ifndef CYTHON_USE_DICT_VERSIONS
+    #define CYTHON_USE_DICT_VERSIONS ((PY_VERSION_HEX >= 0x030600B1) && (PY_VERSION_HEX < 0x030C00A5))
+  #endif
+  #if PY_VERSION_HEX >= 0x030B00A4
+    #undef CYTHON_USE_EXC_INFO_STACK
+    #define CYTHON_USE_EXC_INFO_STACK 0
+  #elif !defined(CYTHON_USE_EXC_INFO_STACK)
+    #define CYTHON_USE_EXC_INFO_STACK (PY_VERSION_HEX >= 0x030700A3)
+  #endif
+  #ifndef CYTHON_UPDATE_DESCRIPTOR_DOC
+    #define CYTHON_UPDATE_DESCRIPTOR_DOC 1
+  #endif
+#endif
+#if !defined(CYTHON_FAST_PYCCALL)
+#define CYTHON_FAST_PYCCALL  (CYTHON_FAST_PYCALL && PY_VERSION_HEX >= 0x030600B1)
+#endif
+#if CYTHON_USE_PYLONG_INTERNALS
+  #if PY_MAJOR_VERSION < 3
+    #include "longintrepr.h"
+  #endif
+  #undef SHIFT
+  #undef BASE
+  #undef MASK
+  #ifdef SIZEOF_VOID_P
+    enum { __pyx_check_sizeof_voidp = 1 / (int)(SIZEOF_VOID_P == sizeof(void*)) };
+  #endif
+#endif
+#ifndef __has_attribute
+  #define __has_attribute(x) 0
+#endif
+#ifndef __has_cpp_attribute
+  #define __has_cpp_attribute(x) 0
+#endif
+#ifndef CYTHON_RESTRICT
+  #if defined(__GNUC__)
+    #define CYTHON_RESTRICT __restrict__
+  #elif defined(_MSC_VER) && _MSC_VER >= 1400
+    #define CYTHON_RESTRICT __restrict
+  #elif defined (__STDC_VERSION__) && __STDC_VERSION__ >= 199901L
+    #define CYTHON_RESTRICT restrict
+  #else
+    #define CYTHON_RESTRICT
+  #endif
+#endif
+#ifndef CYTHON_UNUSED
+# if defined(__GNUC__)
+#   if !(defined(__cplusplus)) || (__GNUC__ > 3 || (__GNUC__ == 3 && __GNUC_MINOR__ >= 4))
+#     define CYTHON_UNUSED __attribute__ ((__unused__))
+#   else
+#     define CYTHON_UNUSED
+#   endif
+# elif defined(__ICC) || (defined(__INTEL_COMPILER) && !defined(_MSC_VER))
+#   define CYTHON_UNUSED __attribute__ ((__unused__))
+# else
+#   define CYTHON_UNUSED
+# endif
+#endif
+#ifndef CYTHON_MAYBE_UNUSED_VAR
+#  if defined(__cplusplus)
+     template<class T> void CYTHON_MAYBE_UNUSED_VAR( const T& ) { }
+#  else
+#    define CYTHON_MAYBE_UNUSED_VAR(x) (void)(x)
+#  endif
+#endif
+#ifndef CYTHON_NCP_UNUSED
+# if CYTHON_COMPILING_IN_CPYTHON
+#  define CYTHON_NCP_UNUSED
+# else
+#  define CYTHON_NCP_UNUSED CYTHON_UNUSED
+# endif
+#endif
+#define __Pyx_void_to_None(void_result) ((void)(void_result), Py_INCREF(Py_None), Py_None)
+#ifdef _MSC_VER
+    #ifndef _MSC_STDINT_H_
+        #if _MSC_VER < 1300
+           typedef unsigned char     uint8_t;
+           typedef unsigned int      uint32_t;
+        #else
+           typedef unsigned __int8   uint8_t;
+           typedef unsigned __int32  uint32_t;
+        #endif
+    #endif
+#else
+   #include <stdint.h>
+#endif
+#ifndef CYTHON_FALLTHROUGH
+  #if defined(__cplusplus) && __cplusplus >= 201103L
+    #if __has_cpp_attribute(fallthrough)
+      #define CYTHON_FALLTHROUGH [[fallthrough]]
+    #elif __has_cpp_attribute(clang::fallthrough)
+      #define CYTHON_FALLTHROUGH [[clang::fallthrough]]
+    #elif __has_cpp_attribute(gnu::fallthrough)
+      #define CYTHON_FALLTHROUGH [[gnu::fallthrough]]
+    #endif
+  #endif
+  #ifndef CYTHON_FALLTHROUGH
+    #if __has_attribute(fallthrough)
+      #define CYTHON_FALLTHROUGH __attribute__((fallthrough))
+    #else
+      #define CYTHON_FALLTHROUGH
+    #endif
+  #endif
+  #if defined(__clang__ ) && defined(__apple_build_version__)
+    #if __apple_build_version__ < 7000000
+      #undef  CYTHON_FALLTHROUGH
+      #define CYTHON_FALLTHROUGH
+    #endif
+  #endif
 #endif
 
-#if PY_VERSION_HEX < 0x02060000
-  #define Py_REFCNT(ob) (((PyObject*)(ob))->ob_refcnt)
-  #define Py_TYPE(ob)   (((PyObject*)(ob))->ob_type)
-  #define Py_SIZE(ob)   (((PyVarObject*)(ob))->ob_size)
-  #define PyVarObject_HEAD_INIT(type, size) \
-          PyObject_HEAD_INIT(type) size,
-  #define PyType_Modified(t)
-
-  typedef struct {
-     void *buf;
-     PyObject *obj;
-     Py_ssize_t len;
-     Py_ssize_t itemsize;
-     int readonly;
-     int ndim;
-     char *format;
-     Py_ssize_t *shape;
-     Py_ssize_t *strides;
-     Py_ssize_t *suboffsets;
-     void *internal;
-  } Py_buffer;
-
-  #define PyBUF_SIMPLE 0
-  #define PyBUF_WRITABLE 0x0001
-  #define PyBUF_FORMAT 0x0004
-  #define PyBUF_ND 0x0008
-  #define PyBUF_STRIDES (0x0010 | PyBUF_ND)
-  #define PyBUF_C_CONTIGUOUS (0x0020 | PyBUF_STRIDES)
-  #define PyBUF_F_CONTIGUOUS (0x0040 | PyBUF_STRIDES)
-  #define PyBUF_ANY_CONTIGUOUS (0x0080 | PyBUF_STRIDES)
-  #define PyBUF_INDIRECT (0x0100 | PyBUF_STRIDES)
-
+#ifndef CYTHON_INLINE
+  #if defined(__clang__)
+    #define CYTHON_INLINE __inline__ __attribute__ ((__unused__))
+  #elif defined(__GNUC__)
+    #define CYTHON_INLINE __inline__
+  #elif defined(_MSC_VER)
+    #define CYTHON_INLINE __inline
+  #elif defined (__STDC_VERSION__) && __STDC_VERSION__ >= 199901L
+    #define CYTHON_INLINE inline
+  #else
+    #define CYTHON_INLINE
+  #endif
 #endif
 
+#define __PYX_BUILD_PY_SSIZE_T "n"
+#define CYTHON_FORMAT_SSIZE_T "z"
 #if PY_MAJOR_VERSION < 3
   #define __Pyx_BUILTIN_MODULE_NAME "__builtin__"
+  #define __Pyx_PyCode_New(a, k, l, s, f, code, c, n, v, fv, cell, fn, name, fline, lnos)\
+          PyCode_New(a+k, l, s, f, code, c, n, v, fv, cell, fn, name, fline, lnos)
+  #define __Pyx_DefaultClassType PyClass_Type
 #else
   #define __Pyx_BUILTIN_MODULE_NAME "builtins"
+  #define __Pyx_DefaultClassType PyType_Type
+#if PY_VERSION_HEX >= 0x030B00A1
+    static CYTHON_INLINE PyCodeObject* __Pyx_PyCode_New(int a, int k, int l, int s, int f,
+                                                    PyObject *code, PyObject *c, PyObject* n, PyObject *v,
+                                                    PyObject *fv, PyObject *cell, PyObject* fn,
+                                                    PyObject *name, int fline, PyObject *lnos) {
+        PyObject *kwds=NULL, *argcount=NULL, *posonlyargcount=NULL, *kwonlyargcount=NULL;
+        PyObject *nlocals=NULL, *stacksize=NULL, *flags=NULL, *replace=NULL, *call_result=NULL, *empty=NULL;
+        const char *fn_cstr=NULL;
+        const char *name_cstr=NULL;
+        PyCodeObject* co=NULL;
+        PyObject *type, *value, *traceback;
+        PyErr_Fetch(&type, &value, &traceback);
+        if (!(kwds=PyDict_New())) goto end;
+        if (!(argcount=PyLong_FromLong(a))) goto end;
+        if (PyDict_SetItemString(kwds, "co_argcount", argcount) != 0) goto end;
+        if (!(posonlyargcount=PyLong_FromLong(0))) goto end;
+        if (PyDict_SetItemString(kwds, "co_posonlyargcount", posonlyargcount) != 0) goto end;
+        if (!(kwonlyargcount=PyLong_FromLong(k))) goto end;
+        if (PyDict_SetItemString(kwds, "co_kwonlyargcount", kwonlyargcount) != 0) goto end;
+        if (!(nlocals=PyLong_FromLong(l))) goto end;
+        if (PyDict_SetItemString(kwds, "co_nlocals", nlocals) != 0) goto end;
+        if (!(stacksize=PyLong_FromLong(s))) goto end;
+        if (PyDict_SetItemString(kwds, "co_stacksize", stacksize) != 0) goto end;
+        if (!(flags=PyLong_FromLong(f))) goto end;
+        if (PyDict_SetItemString(kwds, "co_flags", flags) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_code", code) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_consts", c) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_names", n) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_varnames", v) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_freevars", fv) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_cellvars", cell) != 0) goto end;
+        if (PyDict_SetItemString(kwds, "co_linetable", lnos) != 0) goto end;
+        if (!(fn_cstr=PyUnicode_AsUTF8AndSize(fn, NULL))) goto end;
+        if (!(name_cstr=PyUnicode_AsUTF8AndSize(name, NULL))) goto end;
+        if (!(co = PyCode_NewEmpty(fn_cstr, name_cstr, fline))) goto end;
+        if (!(replace = PyObject_GetAttrString((PyObject*)co, "replace"))) goto cleanup_code_too;
+        if (!(empty = PyTuple_New(0))) goto cleanup_code_too; // unfortunately __pyx_empty_tuple isn't available here
+        if (!(call_result = PyObject_Call(replace, empty, kwds))) goto cleanup_code_too;
+        Py_XDECREF((PyObject*)co);
+        co = (PyCodeObject*)call_result;
+        call_result = NULL;
+        if (0) {
+            cleanup_code_too:
+            Py_XDECREF((PyObject*)co);
+            co = NULL;
+        }
+        end:
+        Py_XDECREF(kwds);
+        Py_XDECREF(argcount);
+        Py_XDECREF(posonlyargcount);
+        Py_XDECREF(kwonlyargcount);
+        Py_XDECREF(nlocals);
+        Py_XDECREF(stacksize);
+        Py_XDECREF(replace);
+        Py_XDECREF(call_result);
+        Py_XDECREF(empty);
+        if (type) {
+            PyErr_Restore(type, value, traceback);
+        }
+        return co;
+    }
+#else
+  #define __Pyx_PyCode_New(a, k, l, s, f, code, c, n, v, fv, cell, fn, name, fline, lnos)\
+          PyCode_New(a, k, l, s, f, code, c, n, v, fv, cell, fn, name, fline, lnos)
 #endif
-
-#if PY_MAJOR_VERSION >= 3
+  #define __Pyx_DefaultClassType PyType_Type
+#endif
+#if PY_VERSION_HEX >= 0x030900F0 && !CYTHON_COMPILING_IN_PYPY
+  #define __Pyx_PyObject_GC_IsFinalized(o) PyObject_GC_IsFinalized(o)
+#else
+  #define __Pyx_PyObject_GC_IsFinalized(o) _PyGC_FINALIZED(o)
+#endif
+#ifndef Py_TPFLAGS_CHECKTYPES
   #define Py_TPFLAGS_CHECKTYPES 0
+#endif
+#ifndef Py_TPFLAGS_HAVE_INDEX
   #define Py_TPFLAGS_HAVE_INDEX 0
 #endif
-
-#if (PY_VERSION_HEX < 0x02060000) || (PY_MAJOR_VERSION >= 3)
+#ifndef Py_TPFLAGS_HAVE_NEWBUFFER
   #define Py_TPFLAGS_HAVE_NEWBUFFER 0
 #endif
-
+#ifndef Py_TPFLAGS_HAVE_FINALIZE
+  #define Py_TPFLAGS_HAVE_FINALIZE 0
+#endif
+#ifndef METH_STACKLESS
+  #define METH_STACKLESS 0
+#endif
+#if PY_VERSION_HEX <= 0x030700A3 || !defined(METH_FASTCALL)
+  #ifndef METH_FASTCALL
+     #define METH_FASTCALL 0x80
+  #endif
+  typedef PyObject *(*__Pyx_PyCFunctionFast) (PyObject *self, PyObject *const *args, Py_ssize_t nargs);
+  typedef PyObject *(*__Pyx_PyCFunctionFastWithKeywords) (PyObject *self, PyObject *const *args,
+                                                          Py_ssize_t nargs, PyObject *kwnames);
+#else
+  #define __Pyx_PyCFunctionFast _PyCFunctionFast
+  #define __Pyx_PyCFunctionFastWithKeywords _PyCFunctionFastWithKeywords
+#endif
+#if CYTHON_FAST_PYCCALL
+#define __Pyx_PyFastCFunction_Check(func)\
+    ((PyCFunction_Check(func) && (METH_FASTCALL == (PyCFunction_GET_FLAGS(func) & ~(METH_CLASS | METH_STATIC | METH_COEXIST | METH_KEYWORDS | METH_STACKLESS)))))
+#else
+#define __Pyx_PyFastCFunction_Check(func) 0
+#endif
+#if CYTHON_COMPILING_IN_PYPY && !defined(PyObject_Malloc)
+  #define PyObject_Malloc(s)   PyMem_Malloc(s)
+  #define PyObject_Free(p)     PyMem_Free(p)
+  #define PyObject_Realloc(p)  PyMem_Realloc(p)
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX < 0x030400A1
+  #define PyMem_RawMalloc(n)           PyMem_Malloc(n)
+  #define PyMem_RawRealloc(p, n)       PyMem_Realloc(p, n)
+  #define PyMem_RawFree(p)             PyMem_Free(p)
+#endif
+#if CYTHON_COMPILING_IN_PYSTON
+  #define __Pyx_PyCode_HasFreeVars(co)  PyCode_HasFreeVars(co)
+  #define __Pyx_PyFrame_SetLineNumber(frame, lineno) PyFrame_SetLineNumber(frame, lineno)
+#else
+  #define __Pyx_PyCode_HasFreeVars(co)  (PyCode_GetNumFree(co) > 0)
+  #define __Pyx_PyFrame_SetLineNumber(frame, lineno)  (frame)->f_lineno = (lineno)
+#endif
+#if !CYTHON_FAST_THREAD_STATE || PY_VERSION_HEX < 0x02070000
+  #define __Pyx_PyThreadState_Current PyThreadState_GET()
+#elif PY_VERSION_HEX >= 0x03060000
+  #define __Pyx_PyThreadState_Current _PyThreadState_UncheckedGet()
+#elif PY_VERSION_HEX >= 0x03000000
+  #define __Pyx_PyThreadState_Current PyThreadState_GET()
+#else
+  #define __Pyx_PyThreadState_Current _PyThreadState_Current
+#endif
+#if PY_VERSION_HEX < 0x030700A2 && !defined(PyThread_tss_create) && !defined(Py_tss_NEEDS_INIT)
+#include "pythread.h"
+#define Py_tss_NEEDS_INIT 0
+typedef int Py_tss_t;
+static CYTHON_INLINE int PyThread_tss_create(Py_tss_t *key) {
+  *key = PyThread_create_key();
+  return 0;
+}
+static CYTHON_INLINE Py_tss_t * PyThread_tss_alloc(void) {
+  Py_tss_t *key = (Py_tss_t *)PyObject_Malloc(sizeof(Py_tss_t));
+  *key = Py_tss_NEEDS_INIT;
+  return key;
+}
+static CYTHON_INLINE void PyThread_tss_free(Py_tss_t *key) {
+  PyObject_Free(key);
+}
+static CYTHON_INLINE int PyThread_tss_is_created(Py_tss_t *key) {
+  return *key != Py_tss_NEEDS_INIT;
+}
+static CYTHON_INLINE void PyThread_tss_delete(Py_tss_t *key) {
+  PyThread_delete_key(*key);
+  *key = Py_tss_NEEDS_INIT;
+}
+static CYTHON_INLINE int PyThread_tss_set(Py_tss_t *key, void *value) {
+  return PyThread_set_key_value(*key, value);
+}
+static CYTHON_INLINE void * PyThread_tss_get(Py_tss_t *key) {
+  return PyThread_get_key_value(*key);
+}
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON || defined(_PyDict_NewPresized)
+#define __Pyx_PyDict_NewPresized(n)  ((n <= 8) ? PyDict_New() : _PyDict_NewPresized(n))
+#else
+#define __Pyx_PyDict_NewPresized(n)  PyDict_New()
+#endif
+#if PY_MAJOR_VERSION >= 3 || CYTHON_FUTURE_DIVISION
+  #define __Pyx_PyNumber_Divide(x,y)         PyNumber_TrueDivide(x,y)
+  #define __Pyx_PyNumber_InPlaceDivide(x,y)  PyNumber_InPlaceTrueDivide(x,y)
+#else
+  #define __Pyx_PyNumber_Divide(x,y)         PyNumber_Divide(x,y)
+  #define __Pyx_PyNumber_InPlaceDivide(x,y)  PyNumber_InPlaceDivide(x,y)
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX >= 0x030500A1 && CYTHON_USE_UNICODE_INTERNALS
+#define __Pyx_PyDict_GetItemStr(dict, name)  _PyDict_GetItem_KnownHash(dict, name, ((PyASCIIObject *) name)->hash)
+#else
+#define __Pyx_PyDict_GetItemStr(dict, name)  PyDict_GetItem(dict, name)
+#endif
+#if PY_VERSION_HEX > 0x03030000 && defined(PyUnicode_KIND)
+  #define CYTHON_PEP393_ENABLED 1
+  #if PY_VERSION_HEX >= 0x030C0000
+    #define __Pyx_PyUnicode_READY(op)       (0)
+  #else
+    #define __Pyx_PyUnicode_READY(op)       (likely(PyUnicode_IS_READY(op)) ?\
+                                                0 : _PyUnicode_Ready((PyObject *)(op)))
+  #endif
+  #define __Pyx_PyUnicode_GET_LENGTH(u)   PyUnicode_GET_LENGTH(u)
+  #define __Pyx_PyUnicode_READ_CHAR(u, i) PyUnicode_READ_CHAR(u, i)
+  #define __Pyx_PyUnicode_MAX_CHAR_VALUE(u)   PyUnicode_MAX_CHAR_VALUE(u)
+  #define __Pyx_PyUnicode_KIND(u)         PyUnicode_KIND(u)
+  #define __Pyx_PyUnicode_DATA(u)         PyUnicode_DATA(u)
+  #define __Pyx_PyUnicode_READ(k, d, i)   PyUnicode_READ(k, d, i)
+  #define __Pyx_PyUnicode_WRITE(k, d, i, ch)  PyUnicode_WRITE(k, d, i, ch)
+  #if PY_VERSION_HEX >= 0x030C0000
+    #define __Pyx_PyUnicode_IS_TRUE(u)      (0 != PyUnicode_GET_LENGTH(u))
+  #else
+    #if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX >= 0x03090000
+    #define __Pyx_PyUnicode_IS_TRUE(u)      (0 != (likely(PyUnicode_IS_READY(u)) ? PyUnicode_GET_LENGTH(u) : ((PyCompactUnicodeObject *)(u))->wstr_length))
+    #else
+    #define __Pyx_PyUnicode_IS_TRUE(u)      (0 != (likely(PyUnicode_IS_READY(u)) ? PyUnicode_GET_LENGTH(u) : PyUnicode_GET_SIZE(u)))
+    #endif
+  #endif
+#else
+  #define CYTHON_PEP393_ENABLED 0
+  #define PyUnicode_1BYTE_KIND  1
+  #define PyUnicode_2BYTE_KIND  2
+  #define PyUnicode_4BYTE_KIND  4
+  #define __Pyx_PyUnicode_READY(op)       (0)
+  #define __Pyx_PyUnicode_GET_LENGTH(u)   PyUnicode_GET_SIZE(u)
+  #define __Pyx_PyUnicode_READ_CHAR(u, i) ((Py_UCS4)(PyUnicode_AS_UNICODE(u)[i]))
+  #define __Pyx_PyUnicode_MAX_CHAR_VALUE(u)   ((sizeof(Py_UNICODE) == 2) ? 65535 : 1114111)
+  #define __Pyx_PyUnicode_KIND(u)         (sizeof(Py_UNICODE))
+  #define __Pyx_PyUnicode_DATA(u)         ((void*)PyUnicode_AS_UNICODE(u))
+  #define __Pyx_PyUnicode_READ(k, d, i)   ((void)(k), (Py_UCS4)(((Py_UNICODE*)d)[i]))
+  #define __Pyx_PyUnicode_WRITE(k, d, i, ch)  (((void)(k)), ((Py_UNICODE*)d)[i] = ch)
+  #define __Pyx_PyUnicode_IS_TRUE(u)      (0 != PyUnicode_GET_SIZE(u))
+#endif
+#if CYTHON_COMPILING_IN_PYPY
+  #define __Pyx_PyUnicode_Concat(a, b)      PyNumber_Add(a, b)
+  #define __Pyx_PyUnicode_ConcatSafe(a, b)  PyNumber_Add(a, b)
+#else
+  #define __Pyx_PyUnicode_Concat(a, b)      PyUnicode_Concat(a, b)
+  #define __Pyx_PyUnicode_ConcatSafe(a, b)  ((unlikely((a) == Py_None) || unlikely((b) == Py_None)) ?\
+      PyNumber_Add(a, b) : __Pyx_PyUnicode_Concat(a, b))
+#endif
+#if CYTHON_COMPILING_IN_PYPY && !defined(PyUnicode_Contains)
+  #define PyUnicode_Contains(u, s)  PySequence_Contains(u, s)
+#endif
+#if CYTHON_COMPILING_IN_PYPY && !defined(PyByteArray_Check)
+  #define PyByteArray_Check(obj)  PyObject_TypeCheck(obj, &PyByteArray_Type)
+#endif
+#if CYTHON_COMPILING_IN_PYPY && !defined(PyObject_Format)
+  #define PyObject_Format(obj, fmt)  PyObject_CallMethod(obj, "__format__", "O", fmt)
+#endif
+#define __Pyx_PyString_FormatSafe(a, b)   ((unlikely((a) == Py_None || (PyString_Check(b) && !PyString_CheckExact(b)))) ? PyNumber_Remainder(a, b) : __Pyx_PyString_Format(a, b))
+#define __Pyx_PyUnicode_FormatSafe(a, b)  ((unlikely((a) == Py_None || (PyUnicode_Check(b) && !PyUnicode_CheckExact(b)))) ? PyNumber_Remainder(a, b) : PyUnicode_Format(a, b))
+#if PY_MAJOR_VERSION >= 3
+  #define __Pyx_PyString_Format(a, b)  PyUnicode_Format(a, b)
+#else
+  #define __Pyx_PyString_Format(a, b)  PyString_Format(a, b)
+#endif
+#if PY_MAJOR_VERSION < 3 && !defined(PyObject_ASCII)
+  #define PyObject_ASCII(o)            PyObject_Repr(o)
+#endif
 #if PY_MAJOR_VERSION >= 3
   #define PyBaseString_Type            PyUnicode_Type
   #define PyStringObject               PyUnicodeObject
   #define PyString_Type                PyUnicode_Type
   #define PyString_Check               PyUnicode_Check
   #define PyString_CheckExact          PyUnicode_CheckExact
+#ifndef PyObject_Unicode
+  #define PyObject_Unicode             PyObject_Str
 #endif
-
-#if PY_VERSION_HEX < 0x02060000
-  #define PyBytesObject                PyStringObject
-  #define PyBytes_Type                 PyString_Type
-  #define PyBytes_Check                PyString_Check
-  #define PyBytes_CheckExact           PyString_CheckExact
-  #define PyBytes_FromString           PyString_FromString
-  #define PyBytes_FromStringAndSize    PyString_FromStringAndSize
-  #define PyBytes_FromFormat           PyString_FromFormat
-  #define PyBytes_DecodeEscape         PyString_DecodeEscape
-  #define PyBytes_AsString             PyString_AsString
-  #define PyBytes_AsStringAndSize      PyString_AsStringAndSize
-  #define PyBytes_Size                 PyString_Size
-  #define PyBytes_AS_STRING            PyString_AS_STRING
-  #define PyBytes_GET_SIZE             PyString_GET_SIZE
-  #define PyBytes_Repr                 PyString_Repr
-  #define PyBytes_Concat               PyString_Concat
-  #define PyBytes_ConcatAndDel         PyString_ConcatAndDel
-#endif
-
-#if PY_VERSION_HEX < 0x02060000
-  #define PySet_Check(obj)             PyObject_TypeCheck(obj, &PySet_Type)
-  #define PyFrozenSet_Check(obj)       PyObject_TypeCheck(obj, &PyFrozenSet_Type)
+#endif
+#if PY_MAJOR_VERSION >= 3
+  #define __Pyx_PyBaseString_Check(obj) PyUnicode_Check(obj)
+  #define __Pyx_PyBaseString_CheckExact(obj) PyUnicode_CheckExact(obj)
+#else
+  #define __Pyx_PyBaseString_Check(obj) (PyString_Check(obj) || PyUnicode_Check(obj))
+  #define __Pyx_PyBaseString_CheckExact(obj) (PyString_CheckExact(obj) || PyUnicode_CheckExact(obj))
 #endif
 #ifndef PySet_CheckExact
   #define PySet_CheckExact(obj)        (Py_TYPE(obj) == &PySet_Type)
 #endif
-
-#define __Pyx_TypeCheck(obj, type) PyObject_TypeCheck(obj, (PyTypeObject *)type)
-
+#if PY_VERSION_HEX >= 0x030900A4
+  #define __Pyx_SET_REFCNT(obj, refcnt) Py_SET_REFCNT(obj, refcnt)
+  #define __Pyx_SET_SIZE(obj, size) Py_SET_SIZE(obj, size)
+#else
+  #define __Pyx_SET_REFCNT(obj, refcnt) Py_REFCNT(obj) = (refcnt)
+  #define __Pyx_SET_SIZE(obj, size) Py_SIZE(obj) = (size)
+#endif
+#if CYTHON_ASSUME_SAFE_MACROS
+  #define __Pyx_PySequence_SIZE(seq)  Py_SIZE(seq)
+#else
+  #define __Pyx_PySequence_SIZE(seq)  PySequence_Size(seq)
+#endif
 #if PY_MAJOR_VERSION >= 3
   #define PyIntObject                  PyLongObject
   #define PyInt_Type                   PyLong_Type
@@ -153,71 +695,73 @@
   #define PyInt_AsSsize_t              PyLong_AsSsize_t
   #define PyInt_AsUnsignedLongMask     PyLong_AsUnsignedLongMask
   #define PyInt_AsUnsignedLongLongMask PyLong_AsUnsignedLongLongMask
+  #define PyNumber_Int                 PyNumber_Long
 #endif
-
 #if PY_MAJOR_VERSION >= 3
   #define PyBoolObject                 PyLongObject
 #endif
-
-#if PY_VERSION_HEX < 0x03020000
+#if PY_MAJOR_VERSION >= 3 && CYTHON_COMPILING_IN_PYPY
+  #ifndef PyUnicode_InternFromString
+    #define PyUnicode_InternFromString(s) PyUnicode_FromString(s)
+  #endif
+#endif
+#if PY_VERSION_HEX < 0x030200A4
   typedef long Py_hash_t;
   #define __Pyx_PyInt_FromHash_t PyInt_FromLong
-  #define __Pyx_PyInt_AsHash_t   PyInt_AsLong
+  #define __Pyx_PyInt_AsHash_t   __Pyx_PyIndex_AsHash_t
 #else
   #define __Pyx_PyInt_FromHash_t PyInt_FromSsize_t
-  #define __Pyx_PyInt_AsHash_t   PyInt_AsSsize_t
+  #define __Pyx_PyInt_AsHash_t   __Pyx_PyIndex_AsSsize_t
 #endif
-
-
 #if PY_MAJOR_VERSION >= 3
-  #define __Pyx_PyNumber_Divide(x,y)         PyNumber_TrueDivide(x,y)
-  #define __Pyx_PyNumber_InPlaceDivide(x,y)  PyNumber_InPlaceTrueDivide(x,y)
+  #define __Pyx_PyMethod_New(func, self, klass) ((self) ? ((void)(klass), PyMethod_New(func, self)) : __Pyx_NewRef(func))
 #else
-  #define __Pyx_PyNumber_Divide(x,y)         PyNumber_Divide(x,y)
-  #define __Pyx_PyNumber_InPlaceDivide(x,y)  PyNumber_InPlaceDivide(x,y)
+  #define __Pyx_PyMethod_New(func, self, klass) PyMethod_New(func, self, klass)
 #endif
-
-#if (PY_MAJOR_VERSION < 3) || (PY_VERSION_HEX >= 0x03010300)
-  #define __Pyx_PySequence_GetSlice(obj, a, b) PySequence_GetSlice(obj, a, b)
-  #define __Pyx_PySequence_SetSlice(obj, a, b, value) PySequence_SetSlice(obj, a, b, value)
-  #define __Pyx_PySequence_DelSlice(obj, a, b) PySequence_DelSlice(obj, a, b)
+#if CYTHON_USE_ASYNC_SLOTS
+  #if PY_VERSION_HEX >= 0x030500B1
+    #define __Pyx_PyAsyncMethodsStruct PyAsyncMethods
+    #define __Pyx_PyType_AsAsync(obj) (Py_TYPE(obj)->tp_as_async)
+  #else
+    #define __Pyx_PyType_AsAsync(obj) ((__Pyx_PyAsyncMethodsStruct*) (Py_TYPE(obj)->tp_reserved))
+  #endif
 #else
-  #define __Pyx_PySequence_GetSlice(obj, a, b) (unlikely(!(obj)) ? \
-        (PyErr_SetString(PyExc_SystemError, "null argument to internal routine"), (PyObject*)0) : \
-        (likely((obj)->ob_type->tp_as_mapping) ? (PySequence_GetSlice(obj, a, b)) : \
-            (PyErr_Format(PyExc_TypeError, "'%.200s' object is unsliceable", (obj)->ob_type->tp_name), (PyObject*)0)))
-  #define __Pyx_PySequence_SetSlice(obj, a, b, value) (unlikely(!(obj)) ? \
-        (PyErr_SetString(PyExc_SystemError, "null argument to internal routine"), -1) : \
-        (likely((obj)->ob_type->tp_as_mapping) ? (PySequence_SetSlice(obj, a, b, value)) : \
-            (PyErr_Format(PyExc_TypeError, "'%.200s' object doesn't support slice assignment", (obj)->ob_type->tp_name), -1)))
-  #define __Pyx_PySequence_DelSlice(obj, a, b) (unlikely(!(obj)) ? \
-        (PyErr_SetString(PyExc_SystemError, "null argument to internal routine"), -1) : \
-        (likely((obj)->ob_type->tp_as_mapping) ? (PySequence_DelSlice(obj, a, b)) : \
-            (PyErr_Format(PyExc_TypeError, "'%.200s' object doesn't support slice deletion", (obj)->ob_type->tp_name), -1)))
+  #define __Pyx_PyType_AsAsync(obj) NULL
 #endif
-
-#if PY_MAJOR_VERSION >= 3
-  #define PyMethod_New(func, self, klass) ((self) ? PyMethod_New(func, self) : PyInstanceMethod_New(func))
+#ifndef __Pyx_PyAsyncMethodsStruct
+    typedef struct {
+        unaryfunc am_await;
+        unaryfunc am_aiter;
+        unaryfunc am_anext;
+    } __Pyx_PyAsyncMethodsStruct;
 #endif
 
-#if PY_VERSION_HEX < 0x02050000
-  #define __Pyx_GetAttrString(o,n)   PyObject_GetAttrString((o),((char *)(n)))
-  #define __Pyx_SetAttrString(o,n,a) PyObject_SetAttrString((o),((char *)(n)),(a))
-  #define __Pyx_DelAttrString(o,n)   PyObject_DelAttrString((o),((char *)(n)))
+#if defined(_WIN32) || defined(WIN32) || defined(MS_WINDOWS)
+  #if !defined(_USE_MATH_DEFINES)
+    #define _USE_MATH_DEFINES
+  #endif
+#endif
+#include <math.h>
+#ifdef NAN
+#define __PYX_NAN() ((float) NAN)
 #else
-  #define __Pyx_GetAttrString(o,n)   PyObject_GetAttrString((o),(n))
-  #define __Pyx_SetAttrString(o,n,a) PyObject_SetAttrString((o),(n),(a))
-  #define __Pyx_DelAttrString(o,n)   PyObject_DelAttrString((o),(n))
+static CYTHON_INLINE float __PYX_NAN() {
+  float value;
+  memset(&value, 0xFF, sizeof(value));
+  return value;
+}
 #endif
-
-#if PY_VERSION_HEX < 0x02050000
-  #define __Pyx_NAMESTR(n) ((char *)(n))
-  #define __Pyx_DOCSTR(n)  ((char *)(n))
+#if defined(__CYGWIN__) && defined(_LDBL_EQ_DBL)
+#define __Pyx_truncl trunc
 #else
-  #define __Pyx_NAMESTR(n) (n)
-  #define __Pyx_DOCSTR(n)  (n)
+#define __Pyx_truncl truncl
 #endif
 
+#define __PYX_MARK_ERR_POS(f_index, lineno) \
+    { __pyx_filename = __pyx_f[f_index]; (void)__pyx_filename; __pyx_lineno = lineno; (void)__pyx_lineno; __pyx_clineno = __LINE__; (void)__pyx_clineno; }
+#define __PYX_ERR(f_index, lineno, Ln_error) \
+    { __PYX_MARK_ERR_POS(f_index, lineno) goto Ln_error; }
+
 #ifndef __PYX_EXTERN_C
   #ifdef __cplusplus
     #define __PYX_EXTERN_C extern "C"
@@ -226,89 +770,218 @@
   #endif
 #endif
 
-#if defined(WIN32) || defined(MS_WINDOWS)
-#define _USE_MATH_DEFINES
-#endif
-#include <math.h>
 #define __PYX_HAVE__pyblooming__cbitmap
 #define __PYX_HAVE_API__pyblooming__cbitmap
-#include "stdlib.h"
+/* Early includes */
+#include <string.h>
+#include <stdlib.h>
+#include <stdint.h>
+#include <errno.h>
+#include <sys/types.h>
+#include <unistd.h>
 #include "cbitmaputil.h"
 #ifdef _OPENMP
 #include <omp.h>
 #endif /* _OPENMP */
 
-#ifdef PYREX_WITHOUT_ASSERTIONS
+#if defined(PYREX_WITHOUT_ASSERTIONS) && !defined(CYTHON_WITHOUT_ASSERTIONS)
 #define CYTHON_WITHOUT_ASSERTIONS
 #endif
 
-
-/* inline attribute */
-#ifndef CYTHON_INLINE
-  #if defined(__GNUC__)
-    #define CYTHON_INLINE __inline__
-  #elif defined(_MSC_VER)
-    #define CYTHON_INLINE __inline
-  #elif defined (__STDC_VERSION__) && __STDC_VERSION__ >= 199901L
-    #define CYTHON_INLINE inline
-  #else
-    #define CYTHON_INLINE
-  #endif
+typedef struct {PyObject **p; const char *s; const Py_ssize_t n; const char* encoding;
+                const char is_unicode; const char is_str; const char intern; } __Pyx_StringTabEntry;
+
+#define __PYX_DEFAULT_STRING_ENCODING_IS_ASCII 0
+#define __PYX_DEFAULT_STRING_ENCODING_IS_UTF8 0
+#define __PYX_DEFAULT_STRING_ENCODING_IS_DEFAULT (PY_MAJOR_VERSION >= 3 && __PYX_DEFAULT_STRING_ENCODING_IS_UTF8)
+#define __PYX_DEFAULT_STRING_ENCODING ""
+#define __Pyx_PyObject_FromString __Pyx_PyBytes_FromString
+#define __Pyx_PyObject_FromStringAndSize __Pyx_PyBytes_FromStringAndSize
+#define __Pyx_uchar_cast(c) ((unsigned char)c)
+#define __Pyx_long_cast(x) ((long)x)
+#define __Pyx_fits_Py_ssize_t(v, type, is_signed)  (\
+    (sizeof(type) < sizeof(Py_ssize_t))  ||\
+    (sizeof(type) > sizeof(Py_ssize_t) &&\
+          likely(v < (type)PY_SSIZE_T_MAX ||\
+                 v == (type)PY_SSIZE_T_MAX)  &&\
+          (!is_signed || likely(v > (type)PY_SSIZE_T_MIN ||\
+                                v == (type)PY_SSIZE_T_MIN)))  ||\
+    (sizeof(type) == sizeof(Py_ssize_t) &&\
+          (is_signed || likely(v < (type)PY_SSIZE_T_MAX ||\
+                               v == (type)PY_SSIZE_T_MAX)))  )
+static CYTHON_INLINE int __Pyx_is_valid_index(Py_ssize_t i, Py_ssize_t limit) {
+    return (size_t) i < (size_t) limit;
+}
+#if defined (__cplusplus) && __cplusplus >= 201103L
+    #include <cstdlib>
+    #define __Pyx_sst_abs(value) std::abs(value)
+#elif SIZEOF_INT >= SIZEOF_SIZE_T
+    #define __Pyx_sst_abs(value) abs(value)
+#elif SIZEOF_LONG >= SIZEOF_SIZE_T
+    #define __Pyx_sst_abs(value) labs(value)
+#elif defined (_MSC_VER)
+    #define __Pyx_sst_abs(value) ((Py_ssize_t)_abs64(value))
+#elif defined (__STDC_VERSION__) && __STDC_VERSION__ >= 199901L
+    #define __Pyx_sst_abs(value) llabs(value)
+#elif defined (__GNUC__)
+    #define __Pyx_sst_abs(value) __builtin_llabs(value)
+#else
+    #define __Pyx_sst_abs(value) ((value<0) ? -value : value)
 #endif
-
-/* unused attribute */
-#ifndef CYTHON_UNUSED
-# if defined(__GNUC__)
-#   if !(defined(__cplusplus)) || (__GNUC__ > 3 || (__GNUC__ == 3 && __GNUC_MINOR__ >= 4))
-#     define CYTHON_UNUSED __attribute__ ((__unused__))
-#   else
-#     define CYTHON_UNUSED
-#   endif
-# elif defined(__ICC) || defined(__INTEL_COMPILER)
-#   define CYTHON_UNUSED __attribute__ ((__unused__))
-# else
-#   define CYTHON_UNUSED
-# endif
+static CYTHON_INLINE const char* __Pyx_PyObject_AsString(PyObject*);
+static CYTHON_INLINE const char* __Pyx_PyObject_AsStringAndSize(PyObject*, Py_ssize_t* length);
+#define __Pyx_PyByteArray_FromString(s) PyByteArray_FromStringAndSize((const char*)s, strlen((const char*)s))
+#define __Pyx_PyByteArray_FromStringAndSize(s, l) PyByteArray_FromStringAndSize((const char*)s, l)
+#define __Pyx_PyBytes_FromString        PyBytes_FromString
+#define __Pyx_PyBytes_FromStringAndSize PyBytes_FromStringAndSize
+static CYTHON_INLINE PyObject* __Pyx_PyUnicode_FromString(const char*);
+#if PY_MAJOR_VERSION < 3
+    #define __Pyx_PyStr_FromString        __Pyx_PyBytes_FromString
+    #define __Pyx_PyStr_FromStringAndSize __Pyx_PyBytes_FromStringAndSize
+#else
+    #define __Pyx_PyStr_FromString        __Pyx_PyUnicode_FromString
+    #define __Pyx_PyStr_FromStringAndSize __Pyx_PyUnicode_FromStringAndSize
 #endif
-
-typedef struct {PyObject **p; char *s; const long n; const char* encoding; const char is_unicode; const char is_str; const char intern; } __Pyx_StringTabEntry; /*proto*/
-
-
-/* Type Conversion Predeclarations */
-
-#define __Pyx_PyBytes_FromUString(s) PyBytes_FromString((char*)s)
-#define __Pyx_PyBytes_AsUString(s)   ((unsigned char*) PyBytes_AsString(s))
-
-#define __Pyx_Owned_Py_None(b) (Py_INCREF(Py_None), Py_None)
-#define __Pyx_PyBool_FromLong(b) ((b) ? (Py_INCREF(Py_True), Py_True) : (Py_INCREF(Py_False), Py_False))
+#define __Pyx_PyBytes_AsWritableString(s)     ((char*) PyBytes_AS_STRING(s))
+#define __Pyx_PyBytes_AsWritableSString(s)    ((signed char*) PyBytes_AS_STRING(s))
+#define __Pyx_PyBytes_AsWritableUString(s)    ((unsigned char*) PyBytes_AS_STRING(s))
+#define __Pyx_PyBytes_AsString(s)     ((const char*) PyBytes_AS_STRING(s))
+#define __Pyx_PyBytes_AsSString(s)    ((const signed char*) PyBytes_AS_STRING(s))
+#define __Pyx_PyBytes_AsUString(s)    ((const unsigned char*) PyBytes_AS_STRING(s))
+#define __Pyx_PyObject_AsWritableString(s)    ((char*) __Pyx_PyObject_AsString(s))
+#define __Pyx_PyObject_AsWritableSString(s)    ((signed char*) __Pyx_PyObject_AsString(s))
+#define __Pyx_PyObject_AsWritableUString(s)    ((unsigned char*) __Pyx_PyObject_AsString(s))
+#define __Pyx_PyObject_AsSString(s)    ((const signed char*) __Pyx_PyObject_AsString(s))
+#define __Pyx_PyObject_AsUString(s)    ((const unsigned char*) __Pyx_PyObject_AsString(s))
+#define __Pyx_PyObject_FromCString(s)  __Pyx_PyObject_FromString((const char*)s)
+#define __Pyx_PyBytes_FromCString(s)   __Pyx_PyBytes_FromString((const char*)s)
+#define __Pyx_PyByteArray_FromCString(s)   __Pyx_PyByteArray_FromString((const char*)s)
+#define __Pyx_PyStr_FromCString(s)     __Pyx_PyStr_FromString((const char*)s)
+#define __Pyx_PyUnicode_FromCString(s) __Pyx_PyUnicode_FromString((const char*)s)
+static CYTHON_INLINE size_t __Pyx_Py_UNICODE_strlen(const Py_UNICODE *u) {
+    const Py_UNICODE *u_end = u;
+    while (*u_end++) ;
+    return (size_t)(u_end - u - 1);
+}
+#define __Pyx_PyUnicode_FromUnicode(u)       PyUnicode_FromUnicode(u, __Pyx_Py_UNICODE_strlen(u))
+#define __Pyx_PyUnicode_FromUnicodeAndLength PyUnicode_FromUnicode
+#define __Pyx_PyUnicode_AsUnicode            PyUnicode_AsUnicode
+#define __Pyx_NewRef(obj) (Py_INCREF(obj), obj)
+#define __Pyx_Owned_Py_None(b) __Pyx_NewRef(Py_None)
+static CYTHON_INLINE PyObject * __Pyx_PyBool_FromLong(long b);
 static CYTHON_INLINE int __Pyx_PyObject_IsTrue(PyObject*);
-static CYTHON_INLINE PyObject* __Pyx_PyNumber_Int(PyObject* x);
-
+static CYTHON_INLINE int __Pyx_PyObject_IsTrueAndDecref(PyObject*);
+static CYTHON_INLINE PyObject* __Pyx_PyNumber_IntOrLong(PyObject* x);
+#define __Pyx_PySequence_Tuple(obj)\
+    (likely(PyTuple_CheckExact(obj)) ? __Pyx_NewRef(obj) : PySequence_Tuple(obj))
 static CYTHON_INLINE Py_ssize_t __Pyx_PyIndex_AsSsize_t(PyObject*);
 static CYTHON_INLINE PyObject * __Pyx_PyInt_FromSize_t(size_t);
-static CYTHON_INLINE size_t __Pyx_PyInt_AsSize_t(PyObject*);
-
+static CYTHON_INLINE Py_hash_t __Pyx_PyIndex_AsHash_t(PyObject*);
+#if CYTHON_ASSUME_SAFE_MACROS
 #define __pyx_PyFloat_AsDouble(x) (PyFloat_CheckExact(x) ? PyFloat_AS_DOUBLE(x) : PyFloat_AsDouble(x))
+#else
+#define __pyx_PyFloat_AsDouble(x) PyFloat_AsDouble(x)
+#endif
+#define __pyx_PyFloat_AsFloat(x) ((float) __pyx_PyFloat_AsDouble(x))
+#if PY_MAJOR_VERSION >= 3
+#define __Pyx_PyNumber_Int(x) (PyLong_CheckExact(x) ? __Pyx_NewRef(x) : PyNumber_Long(x))
+#else
+#define __Pyx_PyNumber_Int(x) (PyInt_CheckExact(x) ? __Pyx_NewRef(x) : PyNumber_Int(x))
+#endif
+#define __Pyx_PyNumber_Float(x) (PyFloat_CheckExact(x) ? __Pyx_NewRef(x) : PyNumber_Float(x))
+#if PY_MAJOR_VERSION < 3 && __PYX_DEFAULT_STRING_ENCODING_IS_ASCII
+static int __Pyx_sys_getdefaultencoding_not_ascii;
+static int __Pyx_init_sys_getdefaultencoding_params(void) {
+    PyObject* sys;
+    PyObject* default_encoding = NULL;
+    PyObject* ascii_chars_u = NULL;
+    PyObject* ascii_chars_b = NULL;
+    const char* default_encoding_c;
+    sys = PyImport_ImportModule("sys");
+    if (!sys) goto bad;
+    default_encoding = PyObject_CallMethod(sys, (char*) "getdefaultencoding", NULL);
+    Py_DECREF(sys);
+    if (!default_encoding) goto bad;
+    default_encoding_c = PyBytes_AsString(default_encoding);
+    if (!default_encoding_c) goto bad;
+    if (strcmp(default_encoding_c, "ascii") == 0) {
+        __Pyx_sys_getdefaultencoding_not_ascii = 0;
+    } else {
+        char ascii_chars[128];
+        int c;
+        for (c = 0; c < 128; c++) {
+            ascii_chars[c] = c;
+        }
+        __Pyx_sys_getdefaultencoding_not_ascii = 1;
+        ascii_chars_u = PyUnicode_DecodeASCII(ascii_chars, 128, NULL);
+        if (!ascii_chars_u) goto bad;
+        ascii_chars_b = PyUnicode_AsEncodedString(ascii_chars_u, default_encoding_c, NULL);
+        if (!ascii_chars_b || !PyBytes_Check(ascii_chars_b) || memcmp(ascii_chars, PyBytes_AS_STRING(ascii_chars_b), 128) != 0) {
+            PyErr_Format(
+                PyExc_ValueError,
+                "This module compiled with c_string_encoding=ascii, but default encoding '%.200s' is not a superset of ascii.",
+                default_encoding_c);
+            goto bad;
+        }
+        Py_DECREF(ascii_chars_u);
+        Py_DECREF(ascii_chars_b);
+    }
+    Py_DECREF(default_encoding);
+    return 0;
+bad:
+    Py_XDECREF(default_encoding);
+    Py_XDECREF(ascii_chars_u);
+    Py_XDECREF(ascii_chars_b);
+    return -1;
+}
+#endif
+#if __PYX_DEFAULT_STRING_ENCODING_IS_DEFAULT && PY_MAJOR_VERSION >= 3
+#define __Pyx_PyUnicode_FromStringAndSize(c_str, size) PyUnicode_DecodeUTF8(c_str, size, NULL)
+#else
+#define __Pyx_PyUnicode_FromStringAndSize(c_str, size) PyUnicode_Decode(c_str, size, __PYX_DEFAULT_STRING_ENCODING, NULL)
+#if __PYX_DEFAULT_STRING_ENCODING_IS_DEFAULT
+static char* __PYX_DEFAULT_STRING_ENCODING;
+static int __Pyx_init_sys_getdefaultencoding_params(void) {
+    PyObject* sys;
+    PyObject* default_encoding = NULL;
+    char* default_encoding_c;
+    sys = PyImport_ImportModule("sys");
+    if (!sys) goto bad;
+    default_encoding = PyObject_CallMethod(sys, (char*) (const char*) "getdefaultencoding", NULL);
+    Py_DECREF(sys);
+    if (!default_encoding) goto bad;
+    default_encoding_c = PyBytes_AsString(default_encoding);
+    if (!default_encoding_c) goto bad;
+    __PYX_DEFAULT_STRING_ENCODING = (char*) malloc(strlen(default_encoding_c) + 1);
+    if (!__PYX_DEFAULT_STRING_ENCODING) goto bad;
+    strcpy(__PYX_DEFAULT_STRING_ENCODING, default_encoding_c);
+    Py_DECREF(default_encoding);
+    return 0;
+bad:
+    Py_XDECREF(default_encoding);
+    return -1;
+}
+#endif
+#endif
 
 
-#ifdef __GNUC__
-  /* Test for GCC > 2.95 */
-  #if __GNUC__ > 2 || (__GNUC__ == 2 && (__GNUC_MINOR__ > 95))
-    #define likely(x)   __builtin_expect(!!(x), 1)
-    #define unlikely(x) __builtin_expect(!!(x), 0)
-  #else /* __GNUC__ > 2 ... */
-    #define likely(x)   (x)
-    #define unlikely(x) (x)
-  #endif /* __GNUC__ > 2 ... */
-#else /* __GNUC__ */
+/* Test for GCC > 2.95 */
+#if defined(__GNUC__)     && (__GNUC__ > 2 || (__GNUC__ == 2 && (__GNUC_MINOR__ > 95)))
+  #define likely(x)   __builtin_expect(!!(x), 1)
+  #define unlikely(x) __builtin_expect(!!(x), 0)
+#else /* !__GNUC__ or GCC < 2.95 */
   #define likely(x)   (x)
   #define unlikely(x) (x)
 #endif /* __GNUC__ */
-    
-static PyObject *__pyx_m;
+static CYTHON_INLINE void __Pyx_pretend_to_initialize(void* ptr) { (void)ptr; }
+
+static PyObject *__pyx_m = NULL;
+static PyObject *__pyx_d;
 static PyObject *__pyx_b;
+static PyObject *__pyx_cython_runtime = NULL;
 static PyObject *__pyx_empty_tuple;
 static PyObject *__pyx_empty_bytes;
+static PyObject *__pyx_empty_unicode;
 static int __pyx_lineno;
 static int __pyx_clineno = 0;
 static const char * __pyx_cfilenm= __FILE__;
@@ -316,33 +989,86 @@ static const char *__pyx_filename;
 
 
 static const char *__pyx_f[] = {
-  "cbitmap.pyx",
+  "pyblooming/cbitmap.pyx",
+  "stringsource",
+  "pyblooming/cbitmap.pxd",
 };
+/* NoFastGil.proto */
+#define __Pyx_PyGILState_Ensure PyGILState_Ensure
+#define __Pyx_PyGILState_Release PyGILState_Release
+#define __Pyx_FastGIL_Remember()
+#define __Pyx_FastGIL_Forget()
+#define __Pyx_FastGilFuncInit()
+
+/* ForceInitThreads.proto */
+#ifndef __PYX_FORCE_INIT_THREADS
+  #define __PYX_FORCE_INIT_THREADS 0
+#endif
+
 
 /*--- Type declarations ---*/
 struct __pyx_obj_10pyblooming_7cbitmap_Bitmap;
 
-/* "pyblooming/cbitmap.pyx":10
- *     cdef int flush(int filedes, char* addr, size_t len)
+/* "pyblooming/cbitmap.pyx":20
  * 
+ * # The bitwise operations supported by _combine
+ * cdef enum:             # <<<<<<<<<<<<<<
+ *     OP_OR = 0
+ *     OP_AND = 1
+ */
+enum  {
+  __pyx_e_10pyblooming_7cbitmap_OP_OR = 0,
+  __pyx_e_10pyblooming_7cbitmap_OP_AND = 1,
+  __pyx_e_10pyblooming_7cbitmap_OP_XOR = 2
+};
+
+/* "pyblooming/cbitmap.pxd":1
  * cdef class Bitmap:             # <<<<<<<<<<<<<<
  *     cdef object fileobj
  *     cdef size_t size
  */
 struct __pyx_obj_10pyblooming_7cbitmap_Bitmap {
   PyObject_HEAD
+  struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *__pyx_vtab;
   PyObject *fileobj;
   size_t size;
   int fileno;
   unsigned char *mmap;
+  size_t *indices;
+  size_t indices_len;
+  unsigned char *dirty;
+  size_t page_shift;
+  int atomic;
 };
 
 
 
+/* "pyblooming/cbitmap.pyx":72
+ * }
+ * 
+ * cdef class Bitmap:             # <<<<<<<<<<<<<<
+ *     # The number of bytes processed at a time by bulk operations
+ *     CHUNK_SIZE = 1 << 20
+ */
+
+struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap {
+  int (*set_bit_array)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *, size_t *, size_t);
+  int (*test_bit_array)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *, size_t *, size_t);
+  void (*_set_array)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *, size_t *, size_t);
+  int (*_test_array)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *, size_t *, size_t);
+  size_t (*_load_indices)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *, PyObject *);
+  int (*_combine)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *, PyObject *, size_t, PyObject *, int);
+  void (*_mark_dirty)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *, size_t, size_t);
+  int (*_flush_dirty)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *);
+  size_t (*_pages)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *);
+};
+static struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *__pyx_vtabptr_10pyblooming_7cbitmap_Bitmap;
+
+/* --- Runtime support code (head) --- */
+/* Refnanny.proto */
 #ifndef CYTHON_REFNANNY
   #define CYTHON_REFNANNY 0
 #endif
-
 #if CYTHON_REFNANNY
   typedef struct {
     void (*INCREF)(void*, PyObject*, int);
@@ -353,10 +1079,23 @@ struct __pyx_obj_10pyblooming_7cbitmap_Bitmap {
     void (*FinishContext)(void**);
   } __Pyx_RefNannyAPIStruct;
   static __Pyx_RefNannyAPIStruct *__Pyx_RefNanny = NULL;
-  static __Pyx_RefNannyAPIStruct *__Pyx_RefNannyImportAPI(const char *modname); /*proto*/
+  static __Pyx_RefNannyAPIStruct *__Pyx_RefNannyImportAPI(const char *modname);
   #define __Pyx_RefNannyDeclarations void *__pyx_refnanny = NULL;
-  #define __Pyx_RefNannySetupContext(name)           __pyx_refnanny = __Pyx_RefNanny->SetupContext((name), __LINE__, __FILE__)
-  #define __Pyx_RefNannyFinishContext()           __Pyx_RefNanny->FinishContext(&__pyx_refnanny)
+#ifdef WITH_THREAD
+  #define __Pyx_RefNannySetupContext(name, acquire_gil)\
+          if (acquire_gil) {\
+              PyGILState_STATE __pyx_gilstate_save = PyGILState_Ensure();\
+              __pyx_refnanny = __Pyx_RefNanny->SetupContext((name), __LINE__, __FILE__);\
+              PyGILState_Release(__pyx_gilstate_save);\
+          } else {\
+              __pyx_refnanny = __Pyx_RefNanny->SetupContext((name), __LINE__, __FILE__);\
+          }
+#else
+  #define __Pyx_RefNannySetupContext(name, acquire_gil)\
+          __pyx_refnanny = __Pyx_RefNanny->SetupContext((name), __LINE__, __FILE__)
+#endif
+  #define __Pyx_RefNannyFinishContext()\
+          __Pyx_RefNanny->FinishContext(&__pyx_refnanny)
   #define __Pyx_INCREF(r)  __Pyx_RefNanny->INCREF(__pyx_refnanny, (PyObject *)(r), __LINE__)
   #define __Pyx_DECREF(r)  __Pyx_RefNanny->DECREF(__pyx_refnanny, (PyObject *)(r), __LINE__)
   #define __Pyx_GOTREF(r)  __Pyx_RefNanny->GOTREF(__pyx_refnanny, (PyObject *)(r), __LINE__)
@@ -367,7 +1106,7 @@ struct __pyx_obj_10pyblooming_7cbitmap_Bitmap {
   #define __Pyx_XGIVEREF(r) do { if((r) != NULL) {__Pyx_GIVEREF(r);}} while(0)
 #else
   #define __Pyx_RefNannyDeclarations
-  #define __Pyx_RefNannySetupContext(name)
+  #define __Pyx_RefNannySetupContext(name, acquire_gil)
   #define __Pyx_RefNannyFinishContext()
   #define __Pyx_INCREF(r) Py_INCREF(r)
   #define __Pyx_DECREF(r) Py_DECREF(r)
@@ -377,273 +1116,1107 @@ struct __pyx_obj_10pyblooming_7cbitmap_Bitmap {
   #define __Pyx_XDECREF(r) Py_XDECREF(r)
   #define __Pyx_XGOTREF(r)
   #define __Pyx_XGIVEREF(r)
-#endif /* CYTHON_REFNANNY */
+#endif
+#define __Pyx_XDECREF_SET(r, v) do {\
+        PyObject *tmp = (PyObject *) r;\
+        r = v; __Pyx_XDECREF(tmp);\
+    } while (0)
+#define __Pyx_DECREF_SET(r, v) do {\
+        PyObject *tmp = (PyObject *) r;\
+        r = v; __Pyx_DECREF(tmp);\
+    } while (0)
+#define __Pyx_CLEAR(r)    do { PyObject* tmp = ((PyObject*)(r)); r = NULL; __Pyx_DECREF(tmp);} while(0)
+#define __Pyx_XCLEAR(r)   do { if((r) != NULL) {PyObject* tmp = ((PyObject*)(r)); r = NULL; __Pyx_DECREF(tmp);}} while(0)
+
+/* PyObjectGetAttrStr.proto */
+#if CYTHON_USE_TYPE_SLOTS
+static CYTHON_INLINE PyObject* __Pyx_PyObject_GetAttrStr(PyObject* obj, PyObject* attr_name);
+#else
+#define __Pyx_PyObject_GetAttrStr(o,n) PyObject_GetAttr(o,n)
+#endif
 
-static PyObject *__Pyx_GetName(PyObject *dict, PyObject *name); /*proto*/
+/* GetBuiltinName.proto */
+static PyObject *__Pyx_GetBuiltinName(PyObject *name);
 
-static void __Pyx_RaiseDoubleKeywordsError(
-    const char* func_name, PyObject* kw_name); /*proto*/
+/* RaiseDoubleKeywords.proto */
+static void __Pyx_RaiseDoubleKeywordsError(const char* func_name, PyObject* kw_name);
 
-static int __Pyx_ParseOptionalKeywords(PyObject *kwds, PyObject **argnames[],     PyObject *kwds2, PyObject *values[], Py_ssize_t num_pos_args,     const char* function_name); /*proto*/
+/* ParseKeywords.proto */
+static int __Pyx_ParseOptionalKeywords(PyObject *kwds, PyObject **argnames[],\
+    PyObject *kwds2, PyObject *values[], Py_ssize_t num_pos_args,\
+    const char* function_name);
 
+/* RaiseArgTupleInvalid.proto */
 static void __Pyx_RaiseArgtupleInvalid(const char* func_name, int exact,
-    Py_ssize_t num_min, Py_ssize_t num_max, Py_ssize_t num_found); /*proto*/
+    Py_ssize_t num_min, Py_ssize_t num_max, Py_ssize_t num_found);
+
+/* PyThreadStateGet.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_PyThreadState_declare  PyThreadState *__pyx_tstate;
+#define __Pyx_PyThreadState_assign  __pyx_tstate = __Pyx_PyThreadState_Current;
+#define __Pyx_PyErr_Occurred()  __pyx_tstate->curexc_type
+#else
+#define __Pyx_PyThreadState_declare
+#define __Pyx_PyThreadState_assign
+#define __Pyx_PyErr_Occurred()  PyErr_Occurred()
+#endif
 
-static CYTHON_INLINE void __Pyx_ErrRestore(PyObject *type, PyObject *value, PyObject *tb); /*proto*/
-static CYTHON_INLINE void __Pyx_ErrFetch(PyObject **type, PyObject **value, PyObject **tb); /*proto*/
+/* PyErrFetchRestore.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_PyErr_Clear() __Pyx_ErrRestore(NULL, NULL, NULL)
+#define __Pyx_ErrRestoreWithState(type, value, tb)  __Pyx_ErrRestoreInState(PyThreadState_GET(), type, value, tb)
+#define __Pyx_ErrFetchWithState(type, value, tb)    __Pyx_ErrFetchInState(PyThreadState_GET(), type, value, tb)
+#define __Pyx_ErrRestore(type, value, tb)  __Pyx_ErrRestoreInState(__pyx_tstate, type, value, tb)
+#define __Pyx_ErrFetch(type, value, tb)    __Pyx_ErrFetchInState(__pyx_tstate, type, value, tb)
+static CYTHON_INLINE void __Pyx_ErrRestoreInState(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb);
+static CYTHON_INLINE void __Pyx_ErrFetchInState(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
+#if CYTHON_COMPILING_IN_CPYTHON
+#define __Pyx_PyErr_SetNone(exc) (Py_INCREF(exc), __Pyx_ErrRestore((exc), NULL, NULL))
+#else
+#define __Pyx_PyErr_SetNone(exc) PyErr_SetNone(exc)
+#endif
+#else
+#define __Pyx_PyErr_Clear() PyErr_Clear()
+#define __Pyx_PyErr_SetNone(exc) PyErr_SetNone(exc)
+#define __Pyx_ErrRestoreWithState(type, value, tb)  PyErr_Restore(type, value, tb)
+#define __Pyx_ErrFetchWithState(type, value, tb)  PyErr_Fetch(type, value, tb)
+#define __Pyx_ErrRestoreInState(tstate, type, value, tb)  PyErr_Restore(type, value, tb)
+#define __Pyx_ErrFetchInState(tstate, type, value, tb)  PyErr_Fetch(type, value, tb)
+#define __Pyx_ErrRestore(type, value, tb)  PyErr_Restore(type, value, tb)
+#define __Pyx_ErrFetch(type, value, tb)  PyErr_Fetch(type, value, tb)
+#endif
 
-static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause); /*proto*/
+/* RaiseException.proto */
+static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause);
+
+/* PyDictVersioning.proto */
+#if CYTHON_USE_DICT_VERSIONS && CYTHON_USE_TYPE_SLOTS
+#define __PYX_DICT_VERSION_INIT  ((PY_UINT64_T) -1)
+#define __PYX_GET_DICT_VERSION(dict)  (((PyDictObject*)(dict))->ma_version_tag)
+#define __PYX_UPDATE_DICT_CACHE(dict, value, cache_var, version_var)\
+    (version_var) = __PYX_GET_DICT_VERSION(dict);\
+    (cache_var) = (value);
+#define __PYX_PY_DICT_LOOKUP_IF_MODIFIED(VAR, DICT, LOOKUP) {\
+    static PY_UINT64_T __pyx_dict_version = 0;\
+    static PyObject *__pyx_dict_cached_value = NULL;\
+    if (likely(__PYX_GET_DICT_VERSION(DICT) == __pyx_dict_version)) {\
+        (VAR) = __pyx_dict_cached_value;\
+    } else {\
+        (VAR) = __pyx_dict_cached_value = (LOOKUP);\
+        __pyx_dict_version = __PYX_GET_DICT_VERSION(DICT);\
+    }\
+}
+static CYTHON_INLINE PY_UINT64_T __Pyx_get_tp_dict_version(PyObject *obj);
+static CYTHON_INLINE PY_UINT64_T __Pyx_get_object_dict_version(PyObject *obj);
+static CYTHON_INLINE int __Pyx_object_dict_version_matches(PyObject* obj, PY_UINT64_T tp_dict_version, PY_UINT64_T obj_dict_version);
+#else
+#define __PYX_GET_DICT_VERSION(dict)  (0)
+#define __PYX_UPDATE_DICT_CACHE(dict, value, cache_var, version_var)
+#define __PYX_PY_DICT_LOOKUP_IF_MODIFIED(VAR, DICT, LOOKUP)  (VAR) = (LOOKUP);
+#endif
 
-static PyObject *__Pyx_Import(PyObject *name, PyObject *from_list, long level); /*proto*/
+/* GetModuleGlobalName.proto */
+#if CYTHON_USE_DICT_VERSIONS
+#define __Pyx_GetModuleGlobalName(var, name)  do {\
+    static PY_UINT64_T __pyx_dict_version = 0;\
+    static PyObject *__pyx_dict_cached_value = NULL;\
+    (var) = (likely(__pyx_dict_version == __PYX_GET_DICT_VERSION(__pyx_d))) ?\
+        (likely(__pyx_dict_cached_value) ? __Pyx_NewRef(__pyx_dict_cached_value) : __Pyx_GetBuiltinName(name)) :\
+        __Pyx__GetModuleGlobalName(name, &__pyx_dict_version, &__pyx_dict_cached_value);\
+} while(0)
+#define __Pyx_GetModuleGlobalNameUncached(var, name)  do {\
+    PY_UINT64_T __pyx_dict_version;\
+    PyObject *__pyx_dict_cached_value;\
+    (var) = __Pyx__GetModuleGlobalName(name, &__pyx_dict_version, &__pyx_dict_cached_value);\
+} while(0)
+static PyObject *__Pyx__GetModuleGlobalName(PyObject *name, PY_UINT64_T *dict_version, PyObject **dict_cached_value);
+#else
+#define __Pyx_GetModuleGlobalName(var, name)  (var) = __Pyx__GetModuleGlobalName(name)
+#define __Pyx_GetModuleGlobalNameUncached(var, name)  (var) = __Pyx__GetModuleGlobalName(name)
+static CYTHON_INLINE PyObject *__Pyx__GetModuleGlobalName(PyObject *name);
+#endif
 
-#ifndef __PYX_FORCE_INIT_THREADS
-  #if PY_VERSION_HEX < 0x02040200
-    #define __PYX_FORCE_INIT_THREADS 1
-  #else
-    #define __PYX_FORCE_INIT_THREADS 0
+/* PySequenceContains.proto */
+static CYTHON_INLINE int __Pyx_PySequence_ContainsTF(PyObject* item, PyObject* seq, int eq) {
+    int result = PySequence_Contains(seq, item);
+    return unlikely(result < 0) ? result : (result == (eq == Py_EQ));
+}
+
+/* PyObjectCall.proto */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_Call(PyObject *func, PyObject *arg, PyObject *kw);
+#else
+#define __Pyx_PyObject_Call(func, arg, kw) PyObject_Call(func, arg, kw)
+#endif
+
+/* PyFunctionFastCall.proto */
+#if CYTHON_FAST_PYCALL
+#define __Pyx_PyFunction_FastCall(func, args, nargs)\
+    __Pyx_PyFunction_FastCallDict((func), (args), (nargs), NULL)
+#if 1 || PY_VERSION_HEX < 0x030600B1
+static PyObject *__Pyx_PyFunction_FastCallDict(PyObject *func, PyObject **args, Py_ssize_t nargs, PyObject *kwargs);
+#else
+#define __Pyx_PyFunction_FastCallDict(func, args, nargs, kwargs) _PyFunction_FastCallDict(func, args, nargs, kwargs)
+#endif
+#define __Pyx_BUILD_ASSERT_EXPR(cond)\
+    (sizeof(char [1 - 2*!(cond)]) - 1)
+#ifndef Py_MEMBER_SIZE
+#define Py_MEMBER_SIZE(type, member) sizeof(((type *)0)->member)
+#endif
+#if CYTHON_FAST_PYCALL
+  static size_t __pyx_pyframe_localsplus_offset = 0;
+  #include "frameobject.h"
+#if PY_VERSION_HEX >= 0x030b00a6
+  #ifndef Py_BUILD_CORE
+    #define Py_BUILD_CORE 1
   #endif
+  #include "internal/pycore_frame.h"
+#endif
+  #define __Pxy_PyFrame_Initialize_Offsets()\
+    ((void)__Pyx_BUILD_ASSERT_EXPR(sizeof(PyFrameObject) == offsetof(PyFrameObject, f_localsplus) + Py_MEMBER_SIZE(PyFrameObject, f_localsplus)),\
+     (void)(__pyx_pyframe_localsplus_offset = ((size_t)PyFrame_Type.tp_basicsize) - Py_MEMBER_SIZE(PyFrameObject, f_localsplus)))
+  #define __Pyx_PyFrame_GetLocalsplus(frame)\
+    (assert(__pyx_pyframe_localsplus_offset), (PyObject **)(((char *)(frame)) + __pyx_pyframe_localsplus_offset))
+#endif // CYTHON_FAST_PYCALL
+#endif
+
+/* PyObjectCallMethO.proto */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallMethO(PyObject *func, PyObject *arg);
+#endif
+
+/* PyObjectCallNoArg.proto */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallNoArg(PyObject *func);
+#else
+#define __Pyx_PyObject_CallNoArg(func) __Pyx_PyObject_Call(func, __pyx_empty_tuple, NULL)
+#endif
+
+/* PyCFunctionFastCall.proto */
+#if CYTHON_FAST_PYCCALL
+static CYTHON_INLINE PyObject *__Pyx_PyCFunction_FastCall(PyObject *func, PyObject **args, Py_ssize_t nargs);
+#else
+#define __Pyx_PyCFunction_FastCall(func, args, nargs)  (assert(0), NULL)
+#endif
+
+/* PyObjectCallOneArg.proto */
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObject *arg);
+
+/* PyObjectCall2Args.proto */
+static CYTHON_UNUSED PyObject* __Pyx_PyObject_Call2Args(PyObject* function, PyObject* arg1, PyObject* arg2);
+
+/* GetTopmostException.proto */
+#if CYTHON_USE_EXC_INFO_STACK
+static _PyErr_StackItem * __Pyx_PyErr_GetTopmostException(PyThreadState *tstate);
+#endif
+
+/* SaveResetException.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_ExceptionSave(type, value, tb)  __Pyx__ExceptionSave(__pyx_tstate, type, value, tb)
+static CYTHON_INLINE void __Pyx__ExceptionSave(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
+#define __Pyx_ExceptionReset(type, value, tb)  __Pyx__ExceptionReset(__pyx_tstate, type, value, tb)
+static CYTHON_INLINE void __Pyx__ExceptionReset(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb);
+#else
+#define __Pyx_ExceptionSave(type, value, tb)   PyErr_GetExcInfo(type, value, tb)
+#define __Pyx_ExceptionReset(type, value, tb)  PyErr_SetExcInfo(type, value, tb)
+#endif
+
+/* GetException.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_GetException(type, value, tb)  __Pyx__GetException(__pyx_tstate, type, value, tb)
+static int __Pyx__GetException(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb);
+#else
+static int __Pyx_GetException(PyObject **type, PyObject **value, PyObject **tb);
+#endif
+
+/* ListCompAppend.proto */
+#if CYTHON_USE_PYLIST_INTERNALS && CYTHON_ASSUME_SAFE_MACROS
+static CYTHON_INLINE int __Pyx_ListComp_Append(PyObject* list, PyObject* x) {
+    PyListObject* L = (PyListObject*) list;
+    Py_ssize_t len = Py_SIZE(list);
+    if (likely(L->allocated > len)) {
+        Py_INCREF(x);
+        PyList_SET_ITEM(list, len, x);
+        __Pyx_SET_SIZE(list, len + 1);
+        return 0;
+    }
+    return PyList_Append(list, x);
+}
+#else
+#define __Pyx_ListComp_Append(L,x) PyList_Append(L,x)
+#endif
+
+/* GetItemInt.proto */
+#define __Pyx_GetItemInt(o, i, type, is_signed, to_py_func, is_list, wraparound, boundscheck)\
+    (__Pyx_fits_Py_ssize_t(i, type, is_signed) ?\
+    __Pyx_GetItemInt_Fast(o, (Py_ssize_t)i, is_list, wraparound, boundscheck) :\
+    (is_list ? (PyErr_SetString(PyExc_IndexError, "list index out of range"), (PyObject*)NULL) :\
+               __Pyx_GetItemInt_Generic(o, to_py_func(i))))
+#define __Pyx_GetItemInt_List(o, i, type, is_signed, to_py_func, is_list, wraparound, boundscheck)\
+    (__Pyx_fits_Py_ssize_t(i, type, is_signed) ?\
+    __Pyx_GetItemInt_List_Fast(o, (Py_ssize_t)i, wraparound, boundscheck) :\
+    (PyErr_SetString(PyExc_IndexError, "list index out of range"), (PyObject*)NULL))
+static CYTHON_INLINE PyObject *__Pyx_GetItemInt_List_Fast(PyObject *o, Py_ssize_t i,
+                                                              int wraparound, int boundscheck);
+#define __Pyx_GetItemInt_Tuple(o, i, type, is_signed, to_py_func, is_list, wraparound, boundscheck)\
+    (__Pyx_fits_Py_ssize_t(i, type, is_signed) ?\
+    __Pyx_GetItemInt_Tuple_Fast(o, (Py_ssize_t)i, wraparound, boundscheck) :\
+    (PyErr_SetString(PyExc_IndexError, "tuple index out of range"), (PyObject*)NULL))
+static CYTHON_INLINE PyObject *__Pyx_GetItemInt_Tuple_Fast(PyObject *o, Py_ssize_t i,
+                                                              int wraparound, int boundscheck);
+static PyObject *__Pyx_GetItemInt_Generic(PyObject *o, PyObject* j);
+static CYTHON_INLINE PyObject *__Pyx_GetItemInt_Fast(PyObject *o, Py_ssize_t i,
+                                                     int is_list, int wraparound, int boundscheck);
+
+/* ObjectGetItem.proto */
+#if CYTHON_USE_TYPE_SLOTS
+static CYTHON_INLINE PyObject *__Pyx_PyObject_GetItem(PyObject *obj, PyObject* key);
+#else
+#define __Pyx_PyObject_GetItem(obj, key)  PyObject_GetItem(obj, key)
+#endif
+
+/* DivInt[Py_ssize_t].proto */
+static CYTHON_INLINE Py_ssize_t __Pyx_div_Py_ssize_t(Py_ssize_t, Py_ssize_t);
+
+/* SliceObject.proto */
+static CYTHON_INLINE PyObject* __Pyx_PyObject_GetSlice(
+        PyObject* obj, Py_ssize_t cstart, Py_ssize_t cstop,
+        PyObject** py_start, PyObject** py_stop, PyObject** py_slice,
+        int has_cstart, int has_cstop, int wraparound);
+
+/* PyObject_GenericGetAttrNoDict.proto */
+#if CYTHON_USE_TYPE_SLOTS && CYTHON_USE_PYTYPE_LOOKUP && PY_VERSION_HEX < 0x03070000
+static CYTHON_INLINE PyObject* __Pyx_PyObject_GenericGetAttrNoDict(PyObject* obj, PyObject* attr_name);
+#else
+#define __Pyx_PyObject_GenericGetAttrNoDict PyObject_GenericGetAttr
+#endif
+
+/* PyObject_GenericGetAttr.proto */
+#if CYTHON_USE_TYPE_SLOTS && CYTHON_USE_PYTYPE_LOOKUP && PY_VERSION_HEX < 0x03070000
+static PyObject* __Pyx_PyObject_GenericGetAttr(PyObject* obj, PyObject* attr_name);
+#else
+#define __Pyx_PyObject_GenericGetAttr PyObject_GenericGetAttr
 #endif
 
-static CYTHON_INLINE unsigned char __Pyx_PyInt_AsUnsignedChar(PyObject *);
+/* SetVTable.proto */
+static int __Pyx_SetVtable(PyObject *dict, void *vtable);
+
+/* PyErrExceptionMatches.proto */
+#if CYTHON_FAST_THREAD_STATE
+#define __Pyx_PyErr_ExceptionMatches(err) __Pyx_PyErr_ExceptionMatchesInState(__pyx_tstate, err)
+static CYTHON_INLINE int __Pyx_PyErr_ExceptionMatchesInState(PyThreadState* tstate, PyObject* err);
+#else
+#define __Pyx_PyErr_ExceptionMatches(err)  PyErr_ExceptionMatches(err)
+#endif
 
-static CYTHON_INLINE unsigned short __Pyx_PyInt_AsUnsignedShort(PyObject *);
+/* PyObjectGetAttrStrNoError.proto */
+static CYTHON_INLINE PyObject* __Pyx_PyObject_GetAttrStrNoError(PyObject* obj, PyObject* attr_name);
 
-static CYTHON_INLINE unsigned int __Pyx_PyInt_AsUnsignedInt(PyObject *);
+/* SetupReduce.proto */
+static int __Pyx_setup_reduce(PyObject* type_obj);
 
-static CYTHON_INLINE char __Pyx_PyInt_AsChar(PyObject *);
+/* Import.proto */
+static PyObject *__Pyx_Import(PyObject *name, PyObject *from_list, int level);
 
-static CYTHON_INLINE short __Pyx_PyInt_AsShort(PyObject *);
+/* CLineInTraceback.proto */
+#ifdef CYTHON_CLINE_IN_TRACEBACK
+#define __Pyx_CLineForTraceback(tstate, c_line)  (((CYTHON_CLINE_IN_TRACEBACK)) ? c_line : 0)
+#else
+static int __Pyx_CLineForTraceback(PyThreadState *tstate, int c_line);
+#endif
 
-static CYTHON_INLINE int __Pyx_PyInt_AsInt(PyObject *);
+/* CodeObjectCache.proto */
+typedef struct {
+    PyCodeObject* code_object;
+    int code_line;
+} __Pyx_CodeObjectCacheEntry;
+struct __Pyx_CodeObjectCache {
+    int count;
+    int max_count;
+    __Pyx_CodeObjectCacheEntry* entries;
+};
+static struct __Pyx_CodeObjectCache __pyx_code_cache = {0,0,NULL};
+static int __pyx_bisect_code_objects(__Pyx_CodeObjectCacheEntry* entries, int count, int code_line);
+static PyCodeObject *__pyx_find_code_object(int code_line);
+static void __pyx_insert_code_object(int code_line, PyCodeObject* code_object);
+
+/* AddTraceback.proto */
+static void __Pyx_AddTraceback(const char *funcname, int c_line,
+                               int py_line, const char *filename);
+
+/* GCCDiagnostics.proto */
+#if defined(__GNUC__) && (__GNUC__ > 4 || (__GNUC__ == 4 && __GNUC_MINOR__ >= 6))
+#define __Pyx_HAS_GCC_DIAGNOSTIC
+#endif
 
-static CYTHON_INLINE signed char __Pyx_PyInt_AsSignedChar(PyObject *);
+/* CIntToPy.proto */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_int(int value);
 
-static CYTHON_INLINE signed short __Pyx_PyInt_AsSignedShort(PyObject *);
+/* CIntFromPy.proto */
+static CYTHON_INLINE size_t __Pyx_PyInt_As_size_t(PyObject *);
 
-static CYTHON_INLINE signed int __Pyx_PyInt_AsSignedInt(PyObject *);
+/* CIntFromPy.proto */
+static CYTHON_INLINE unsigned int __Pyx_PyInt_As_unsigned_int(PyObject *);
 
-static CYTHON_INLINE int __Pyx_PyInt_AsLongDouble(PyObject *);
+/* CIntFromPy.proto */
+static CYTHON_INLINE int64_t __Pyx_PyInt_As_int64_t(PyObject *);
 
-static CYTHON_INLINE unsigned long __Pyx_PyInt_AsUnsignedLong(PyObject *);
+/* CIntFromPy.proto */
+static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *);
 
-static CYTHON_INLINE unsigned PY_LONG_LONG __Pyx_PyInt_AsUnsignedLongLong(PyObject *);
+/* CIntToPy.proto */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_long(long value);
 
-static CYTHON_INLINE long __Pyx_PyInt_AsLong(PyObject *);
+/* CIntToPy.proto */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_uint64_t(uint64_t value);
 
-static CYTHON_INLINE PY_LONG_LONG __Pyx_PyInt_AsLongLong(PyObject *);
+/* CIntToPy.proto */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_PY_LONG_LONG(PY_LONG_LONG value);
 
-static CYTHON_INLINE signed long __Pyx_PyInt_AsSignedLong(PyObject *);
+/* CIntFromPy.proto */
+static CYTHON_INLINE long __Pyx_PyInt_As_long(PyObject *);
 
-static CYTHON_INLINE signed PY_LONG_LONG __Pyx_PyInt_AsSignedLongLong(PyObject *);
+/* FastTypeChecks.proto */
+#if CYTHON_COMPILING_IN_CPYTHON
+#define __Pyx_TypeCheck(obj, type) __Pyx_IsSubtype(Py_TYPE(obj), (PyTypeObject *)type)
+static CYTHON_INLINE int __Pyx_IsSubtype(PyTypeObject *a, PyTypeObject *b);
+static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches(PyObject *err, PyObject *type);
+static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches2(PyObject *err, PyObject *type1, PyObject *type2);
+#else
+#define __Pyx_TypeCheck(obj, type) PyObject_TypeCheck(obj, (PyTypeObject *)type)
+#define __Pyx_PyErr_GivenExceptionMatches(err, type) PyErr_GivenExceptionMatches(err, type)
+#define __Pyx_PyErr_GivenExceptionMatches2(err, type1, type2) (PyErr_GivenExceptionMatches(err, type1) || PyErr_GivenExceptionMatches(err, type2))
+#endif
+#define __Pyx_PyException_Check(obj) __Pyx_TypeCheck(obj, PyExc_Exception)
 
+/* CheckBinaryVersion.proto */
 static int __Pyx_check_binary_version(void);
 
-static void __Pyx_AddTraceback(const char *funcname, int __pyx_clineno,
-                               int __pyx_lineno, const char *__pyx_filename); /*proto*/
+/* InitStrings.proto */
+static int __Pyx_InitStrings(__Pyx_StringTabEntry *t);
 
-static int __Pyx_InitStrings(__Pyx_StringTabEntry *t); /*proto*/
+static int __pyx_f_10pyblooming_7cbitmap_6Bitmap_set_bit_array(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t *__pyx_v_indices, size_t __pyx_v_n); /* proto*/
+static void __pyx_f_10pyblooming_7cbitmap_6Bitmap__set_array(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t *__pyx_v_indices, size_t __pyx_v_n); /* proto*/
+static int __pyx_f_10pyblooming_7cbitmap_6Bitmap_test_bit_array(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t *__pyx_v_indices, size_t __pyx_v_n); /* proto*/
+static int __pyx_f_10pyblooming_7cbitmap_6Bitmap__test_array(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t *__pyx_v_indices, size_t __pyx_v_n); /* proto*/
+static size_t __pyx_f_10pyblooming_7cbitmap_6Bitmap__load_indices(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_indices); /* proto*/
+static int __pyx_f_10pyblooming_7cbitmap_6Bitmap__flush_dirty(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self); /* proto*/
+static void __pyx_f_10pyblooming_7cbitmap_6Bitmap__mark_dirty(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t __pyx_v_start, size_t __pyx_v_end); /* proto*/
+static size_t __pyx_f_10pyblooming_7cbitmap_6Bitmap__pages(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self); /* proto*/
+static int __pyx_f_10pyblooming_7cbitmap_6Bitmap__combine(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other, size_t __pyx_v_start, PyObject *__pyx_v_end, int __pyx_v_op); /* proto*/
 
 /* Module declarations from 'libc' */
 
+/* Module declarations from 'libc.string' */
+
 /* Module declarations from 'libc.stdlib' */
 
-/* Module declarations from 'cython.cython.view' */
+/* Module declarations from 'libc.stdint' */
+
+/* Module declarations from 'libc.errno' */
+
+/* Module declarations from 'posix.types' */
+
+/* Module declarations from 'posix.unistd' */
 
 /* Module declarations from 'cython' */
 
 /* Module declarations from 'pyblooming.cbitmap' */
 static PyTypeObject *__pyx_ptype_10pyblooming_7cbitmap_Bitmap = 0;
+static void __pyx_f_10pyblooming_7cbitmap_combine_bytes(unsigned char *, unsigned char *, size_t, int); /*proto*/
 #define __Pyx_MODULE_NAME "pyblooming.cbitmap"
+extern int __pyx_module_is_main_pyblooming__cbitmap;
 int __pyx_module_is_main_pyblooming__cbitmap = 0;
 
 /* Implementation of 'pyblooming.cbitmap' */
+static PyObject *__pyx_builtin_range;
 static PyObject *__pyx_builtin_ValueError;
+static PyObject *__pyx_builtin_MemoryError;
 static PyObject *__pyx_builtin_OSError;
 static PyObject *__pyx_builtin_open;
-static PyObject *__pyx_builtin_chr;
+static PyObject *__pyx_builtin_IndexError;
 static PyObject *__pyx_builtin_xrange;
-static char __pyx_k_2[] = "Length must be positive!";
-static char __pyx_k_3[] = "Failed to create memory mapped region!";
-static char __pyx_k_4[] = "a+";
-static char __pyx_k_6[] = "Failed to memory map the file!";
-static char __pyx_k_7[] = "Failed to flush the buffers!";
-static char __pyx_k_9[] = "Bad slice!";
-static char __pyx_k_10[] = "os.path";
-static char __pyx_k__os[] = "os";
-static char __pyx_k__chr[] = "chr";
-static char __pyx_k__open[] = "open";
-static char __pyx_k__path[] = "path";
-static char __pyx_k__close[] = "close";
-static char __pyx_k__flush[] = "flush";
-static char __pyx_k__range[] = "range";
-static char __pyx_k__write[] = "write";
-static char __pyx_k__fileno[] = "fileno";
-static char __pyx_k__length[] = "length";
-static char __pyx_k__xrange[] = "xrange";
-static char __pyx_k__OSError[] = "OSError";
-static char __pyx_k__getsize[] = "getsize";
-static char __pyx_k__private[] = "private";
-static char __pyx_k____main__[] = "__main__";
-static char __pyx_k____test__[] = "__test__";
-static char __pyx_k__filename[] = "filename";
-static char __pyx_k__ValueError[] = "ValueError";
-static PyObject *__pyx_n_s_10;
-static PyObject *__pyx_kp_s_2;
-static PyObject *__pyx_kp_s_3;
-static PyObject *__pyx_kp_s_4;
-static PyObject *__pyx_kp_s_6;
-static PyObject *__pyx_kp_s_7;
-static PyObject *__pyx_kp_s_9;
-static PyObject *__pyx_n_s__OSError;
-static PyObject *__pyx_n_s__ValueError;
-static PyObject *__pyx_n_s____main__;
-static PyObject *__pyx_n_s____test__;
-static PyObject *__pyx_n_s__chr;
-static PyObject *__pyx_n_s__close;
-static PyObject *__pyx_n_s__filename;
-static PyObject *__pyx_n_s__fileno;
-static PyObject *__pyx_n_s__flush;
-static PyObject *__pyx_n_s__getsize;
-static PyObject *__pyx_n_s__length;
-static PyObject *__pyx_n_s__open;
-static PyObject *__pyx_n_s__os;
-static PyObject *__pyx_n_s__path;
-static PyObject *__pyx_n_s__private;
-static PyObject *__pyx_n_s__range;
-static PyObject *__pyx_n_s__write;
-static PyObject *__pyx_n_s__xrange;
+static PyObject *__pyx_builtin_NotImplemented;
+static PyObject *__pyx_builtin_TypeError;
+static const char __pyx_k_a[] = "a+";
+static const char __pyx_k_os[] = "os";
+static const char __pyx_k_end[] = "end";
+static const char __pyx_k_copy[] = "copy";
+static const char __pyx_k_main[] = "__main__";
+static const char __pyx_k_name[] = "__name__";
+static const char __pyx_k_open[] = "open";
+static const char __pyx_k_test[] = "__test__";
+static const char __pyx_k_close[] = "close";
+static const char __pyx_k_delta[] = "delta";
+static const char __pyx_k_flush[] = "flush";
+static const char __pyx_k_other[] = "other";
+static const char __pyx_k_range[] = "range";
+static const char __pyx_k_start[] = "start";
+static const char __pyx_k_ADVICE[] = "ADVICE";
+static const char __pyx_k_Bitmap[] = "Bitmap";
+static const char __pyx_k_advice[] = "advice";
+static const char __pyx_k_advise[] = "advise";
+static const char __pyx_k_atomic[] = "atomic";
+static const char __pyx_k_fileno[] = "fileno";
+static const char __pyx_k_import[] = "__import__";
+static const char __pyx_k_length[] = "length";
+static const char __pyx_k_normal[] = "normal";
+static const char __pyx_k_offset[] = "offset";
+static const char __pyx_k_random[] = "random";
+static const char __pyx_k_reduce[] = "__reduce__";
+static const char __pyx_k_xrange[] = "xrange";
+static const char __pyx_k_OSError[] = "OSError";
+static const char __pyx_k_os_path[] = "os.path";
+static const char __pyx_k_private[] = "private";
+static const char __pyx_k_filename[] = "filename";
+static const char __pyx_k_getstate[] = "__getstate__";
+static const char __pyx_k_hugepage[] = "hugepage";
+static const char __pyx_k_populate[] = "populate";
+static const char __pyx_k_prefetch[] = "prefetch";
+static const char __pyx_k_setstate[] = "__setstate__";
+static const char __pyx_k_strerror[] = "strerror";
+static const char __pyx_k_willneed[] = "willneed";
+static const char __pyx_k_Bad_range[] = "Bad range!";
+static const char __pyx_k_Bad_slice[] = "Bad slice!";
+static const char __pyx_k_TypeError[] = "TypeError";
+static const char __pyx_k_reduce_ex[] = "__reduce_ex__";
+static const char __pyx_k_Bad_offset[] = "Bad offset!";
+static const char __pyx_k_CHUNK_SIZE[] = "CHUNK_SIZE";
+static const char __pyx_k_IndexError[] = "IndexError";
+static const char __pyx_k_ValueError[] = "ValueError";
+static const char __pyx_k_atomic_add[] = "atomic_add";
+static const char __pyx_k_check_size[] = "_check_size";
+static const char __pyx_k_dirty_only[] = "dirty_only";
+static const char __pyx_k_pyx_vtable[] = "__pyx_vtable__";
+static const char __pyx_k_sequential[] = "sequential";
+static const char __pyx_k_MemoryError[] = "MemoryError";
+static const char __pyx_k_preallocate[] = "preallocate";
+static const char __pyx_k_union_update[] = "union_update";
+static const char __pyx_k_reduce_cython[] = "__reduce_cython__";
+static const char __pyx_k_NotImplemented[] = "NotImplemented";
+static const char __pyx_k_setstate_cython[] = "__setstate_cython__";
+static const char __pyx_k_Bitmap_is_closed[] = "Bitmap is closed!";
+static const char __pyx_k_Unknown_advice_r[] = "Unknown advice %r!";
+static const char __pyx_k_cline_in_traceback[] = "cline_in_traceback";
+static const char __pyx_k_intersection_update[] = "intersection_update";
+static const char __pyx_k_Bit_index_out_of_range[] = "Bit index out of range!";
+static const char __pyx_k_Length_must_be_positive[] = "Length must be positive!";
+static const char __pyx_k_Failed_to_call_madvise_s[] = "Failed to call madvise(): %s";
+static const char __pyx_k_Failed_to_call_mincore_s[] = "Failed to call mincore(): %s";
+static const char __pyx_k_Failed_to_extend_the_file_s[] = "Failed to extend the file: %s";
+static const char __pyx_k_Failed_to_flush_the_buffers[] = "Failed to flush the buffers!";
+static const char __pyx_k_symmetric_difference_update[] = "symmetric_difference_update";
+static const char __pyx_k_Failed_to_lock_the_counter_s[] = "Failed to lock the counter: %s";
+static const char __pyx_k_Failed_to_memory_map_the_file[] = "Failed to memory map the file!";
+static const char __pyx_k_Bitmaps_must_have_the_same_size[] = "Bitmaps must have the same size!";
+static const char __pyx_k_Atomic_bitmaps_can_not_be_privat[] = "Atomic bitmaps can not be private!";
+static const char __pyx_k_Failed_to_create_memory_mapped_r[] = "Failed to create memory mapped region!";
+static const char __pyx_k_no_default___reduce___due_to_non[] = "no default __reduce__ due to non-trivial __cinit__";
+static PyObject *__pyx_n_s_ADVICE;
+static PyObject *__pyx_kp_s_Atomic_bitmaps_can_not_be_privat;
+static PyObject *__pyx_kp_s_Bad_offset;
+static PyObject *__pyx_kp_s_Bad_range;
+static PyObject *__pyx_kp_s_Bad_slice;
+static PyObject *__pyx_kp_s_Bit_index_out_of_range;
+static PyObject *__pyx_n_s_Bitmap;
+static PyObject *__pyx_kp_s_Bitmap_is_closed;
+static PyObject *__pyx_kp_s_Bitmaps_must_have_the_same_size;
+static PyObject *__pyx_n_s_CHUNK_SIZE;
+static PyObject *__pyx_kp_s_Failed_to_call_madvise_s;
+static PyObject *__pyx_kp_s_Failed_to_call_mincore_s;
+static PyObject *__pyx_kp_s_Failed_to_create_memory_mapped_r;
+static PyObject *__pyx_kp_s_Failed_to_extend_the_file_s;
+static PyObject *__pyx_kp_s_Failed_to_flush_the_buffers;
+static PyObject *__pyx_kp_s_Failed_to_lock_the_counter_s;
+static PyObject *__pyx_kp_s_Failed_to_memory_map_the_file;
+static PyObject *__pyx_n_s_IndexError;
+static PyObject *__pyx_kp_s_Length_must_be_positive;
+static PyObject *__pyx_n_s_MemoryError;
+static PyObject *__pyx_n_s_NotImplemented;
+static PyObject *__pyx_n_s_OSError;
+static PyObject *__pyx_n_s_TypeError;
+static PyObject *__pyx_kp_s_Unknown_advice_r;
+static PyObject *__pyx_n_s_ValueError;
+static PyObject *__pyx_kp_s_a;
+static PyObject *__pyx_n_s_advice;
+static PyObject *__pyx_n_s_advise;
+static PyObject *__pyx_n_s_atomic;
+static PyObject *__pyx_n_s_atomic_add;
+static PyObject *__pyx_n_s_check_size;
+static PyObject *__pyx_n_s_cline_in_traceback;
+static PyObject *__pyx_n_s_close;
+static PyObject *__pyx_n_s_copy;
+static PyObject *__pyx_n_s_delta;
+static PyObject *__pyx_n_s_dirty_only;
+static PyObject *__pyx_n_s_end;
+static PyObject *__pyx_n_s_filename;
+static PyObject *__pyx_n_s_fileno;
+static PyObject *__pyx_n_s_flush;
+static PyObject *__pyx_n_s_getstate;
+static PyObject *__pyx_n_s_hugepage;
+static PyObject *__pyx_n_s_import;
+static PyObject *__pyx_n_s_intersection_update;
+static PyObject *__pyx_n_s_length;
+static PyObject *__pyx_n_s_main;
+static PyObject *__pyx_n_s_name;
+static PyObject *__pyx_kp_s_no_default___reduce___due_to_non;
+static PyObject *__pyx_n_s_normal;
+static PyObject *__pyx_n_s_offset;
+static PyObject *__pyx_n_s_open;
+static PyObject *__pyx_n_s_os;
+static PyObject *__pyx_n_s_os_path;
+static PyObject *__pyx_n_s_other;
+static PyObject *__pyx_n_s_populate;
+static PyObject *__pyx_n_s_preallocate;
+static PyObject *__pyx_n_s_prefetch;
+static PyObject *__pyx_n_s_private;
+static PyObject *__pyx_n_s_pyx_vtable;
+static PyObject *__pyx_n_s_random;
+static PyObject *__pyx_n_s_range;
+static PyObject *__pyx_n_s_reduce;
+static PyObject *__pyx_n_s_reduce_cython;
+static PyObject *__pyx_n_s_reduce_ex;
+static PyObject *__pyx_n_s_sequential;
+static PyObject *__pyx_n_s_setstate;
+static PyObject *__pyx_n_s_setstate_cython;
+static PyObject *__pyx_n_s_start;
+static PyObject *__pyx_n_s_strerror;
+static PyObject *__pyx_n_s_symmetric_difference_update;
+static PyObject *__pyx_n_s_test;
+static PyObject *__pyx_n_s_union_update;
+static PyObject *__pyx_n_s_willneed;
+static PyObject *__pyx_n_s_xrange;
+static int __pyx_pf_10pyblooming_7cbitmap_6Bitmap___cinit__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_length, PyObject *__pyx_v_filename, PyObject *__pyx_v_private, PyObject *__pyx_v_preallocate, PyObject *__pyx_v_advice, PyObject *__pyx_v_populate, PyObject *__pyx_v_atomic); /* proto */
+static Py_ssize_t __pyx_pf_10pyblooming_7cbitmap_6Bitmap_2__len__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_4__getitem__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t __pyx_v_idx); /* proto */
+static int __pyx_pf_10pyblooming_7cbitmap_6Bitmap_6__setitem__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t __pyx_v_idx, unsigned int __pyx_v_val); /* proto */
+static void __pyx_pf_10pyblooming_7cbitmap_6Bitmap_8__dealloc__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_10set_bits(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_indices); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_12get_bits(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_indices); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_14test_all(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_indices); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_16atomic_add(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t __pyx_v_offset, int64_t __pyx_v_delta); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_18atomic_load(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t __pyx_v_offset); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_20advise(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_advice); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_22prefetch(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_24resident_bytes(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_26flush(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_dirty_only); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_28dirty_bytes(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_30close(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_flush); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_32__getslice__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_i, PyObject *__pyx_v_j); /* proto */
+static int __pyx_pf_10pyblooming_7cbitmap_6Bitmap_34__setslice__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_i, PyObject *__pyx_v_j, char *__pyx_v_val); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_36popcount(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t __pyx_v_start, PyObject *__pyx_v_end); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_38clear(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t __pyx_v_start, PyObject *__pyx_v_end); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_40copy(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_42union_update(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other, size_t __pyx_v_start, PyObject *__pyx_v_end); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_44intersection_update(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other, size_t __pyx_v_start, PyObject *__pyx_v_end); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_46symmetric_difference_update(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other, size_t __pyx_v_start, PyObject *__pyx_v_end); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_48_check_size(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_50__ior__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_52__iand__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_54__ixor__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_56__or__(PyObject *__pyx_v_self, PyObject *__pyx_v_other); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_58__and__(PyObject *__pyx_v_self, PyObject *__pyx_v_other); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_60__xor__(PyObject *__pyx_v_self, PyObject *__pyx_v_other); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_6atomic___get__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_62__reduce_cython__(CYTHON_UNUSED struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self); /* proto */
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_64__setstate_cython__(CYTHON_UNUSED struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, CYTHON_UNUSED PyObject *__pyx_v___pyx_state); /* proto */
+static PyObject *__pyx_tp_new_10pyblooming_7cbitmap_Bitmap(PyTypeObject *t, PyObject *a, PyObject *k); /*proto*/
 static PyObject *__pyx_int_0;
-static PyObject *__pyx_k_1;
-static PyObject *__pyx_k_8;
-static PyObject *__pyx_k_tuple_5;
+static PyObject *__pyx_int_1048576;
+static PyObject *__pyx_tuple_;
+static PyObject *__pyx_tuple__2;
+/* Late includes */
+
+/* "pyblooming/cbitmap.pyx":27
+ * @cython.boundscheck(False)
+ * @cython.wraparound(False)
+ * cdef void combine_bytes(unsigned char* dst, unsigned char* src, size_t n, int op) nogil:             # <<<<<<<<<<<<<<
+ *     """
+ *     Combines n bytes of src into dst using a bitwise operation.
+ */
+
+static void __pyx_f_10pyblooming_7cbitmap_combine_bytes(unsigned char *__pyx_v_dst, unsigned char *__pyx_v_src, size_t __pyx_v_n, int __pyx_v_op) {
+  size_t __pyx_v_i;
+  size_t __pyx_v_words;
+  uint64_t __pyx_v_a;
+  uint64_t __pyx_v_b;
+  size_t __pyx_t_1;
+  size_t __pyx_t_2;
+  size_t __pyx_t_3;
+
+  /* "pyblooming/cbitmap.pyx":32
+ *     Works a 64 bit word at a time, with a byte loop for the tail.
+ *     """
+ *     cdef size_t i, words = n / 8             # <<<<<<<<<<<<<<
+ *     cdef uint64_t a, b
+ *     for i in range(words):
+ */
+  __pyx_v_words = (__pyx_v_n / 8);
+
+  /* "pyblooming/cbitmap.pyx":34
+ *     cdef size_t i, words = n / 8
+ *     cdef uint64_t a, b
+ *     for i in range(words):             # <<<<<<<<<<<<<<
+ *         memcpy(&a, dst + i*8, 8)
+ *         memcpy(&b, src + i*8, 8)
+ */
+  __pyx_t_1 = __pyx_v_words;
+  __pyx_t_2 = __pyx_t_1;
+  for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
+    __pyx_v_i = __pyx_t_3;
+
+    /* "pyblooming/cbitmap.pyx":35
+ *     cdef uint64_t a, b
+ *     for i in range(words):
+ *         memcpy(&a, dst + i*8, 8)             # <<<<<<<<<<<<<<
+ *         memcpy(&b, src + i*8, 8)
+ *         if op == OP_OR: a = a | b
+ */
+    (void)(memcpy((&__pyx_v_a), (__pyx_v_dst + (__pyx_v_i * 8)), 8));
+
+    /* "pyblooming/cbitmap.pyx":36
+ *     for i in range(words):
+ *         memcpy(&a, dst + i*8, 8)
+ *         memcpy(&b, src + i*8, 8)             # <<<<<<<<<<<<<<
+ *         if op == OP_OR: a = a | b
+ *         elif op == OP_AND: a = a & b
+ */
+    (void)(memcpy((&__pyx_v_b), (__pyx_v_src + (__pyx_v_i * 8)), 8));
+
+    /* "pyblooming/cbitmap.pyx":37
+ *         memcpy(&a, dst + i*8, 8)
+ *         memcpy(&b, src + i*8, 8)
+ *         if op == OP_OR: a = a | b             # <<<<<<<<<<<<<<
+ *         elif op == OP_AND: a = a & b
+ *         else: a = a ^ b
+ */
+    switch (__pyx_v_op) {
+      case __pyx_e_10pyblooming_7cbitmap_OP_OR:
+      __pyx_v_a = (__pyx_v_a | __pyx_v_b);
+      break;
+      case __pyx_e_10pyblooming_7cbitmap_OP_AND:
+
+      /* "pyblooming/cbitmap.pyx":38
+ *         memcpy(&b, src + i*8, 8)
+ *         if op == OP_OR: a = a | b
+ *         elif op == OP_AND: a = a & b             # <<<<<<<<<<<<<<
+ *         else: a = a ^ b
+ *         memcpy(dst + i*8, &a, 8)
+ */
+      __pyx_v_a = (__pyx_v_a & __pyx_v_b);
+      break;
+      default:
+
+      /* "pyblooming/cbitmap.pyx":39
+ *         if op == OP_OR: a = a | b
+ *         elif op == OP_AND: a = a & b
+ *         else: a = a ^ b             # <<<<<<<<<<<<<<
+ *         memcpy(dst + i*8, &a, 8)
+ *     for i in range(words*8, n):
+ */
+      __pyx_v_a = (__pyx_v_a ^ __pyx_v_b);
+      break;
+    }
+
+    /* "pyblooming/cbitmap.pyx":40
+ *         elif op == OP_AND: a = a & b
+ *         else: a = a ^ b
+ *         memcpy(dst + i*8, &a, 8)             # <<<<<<<<<<<<<<
+ *     for i in range(words*8, n):
+ *         if op == OP_OR: dst[i] = dst[i] | src[i]
+ */
+    (void)(memcpy((__pyx_v_dst + (__pyx_v_i * 8)), (&__pyx_v_a), 8));
+  }
+
+  /* "pyblooming/cbitmap.pyx":41
+ *         else: a = a ^ b
+ *         memcpy(dst + i*8, &a, 8)
+ *     for i in range(words*8, n):             # <<<<<<<<<<<<<<
+ *         if op == OP_OR: dst[i] = dst[i] | src[i]
+ *         elif op == OP_AND: dst[i] = dst[i] & src[i]
+ */
+  __pyx_t_1 = __pyx_v_n;
+  __pyx_t_2 = __pyx_t_1;
+  for (__pyx_t_3 = (__pyx_v_words * 8); __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
+    __pyx_v_i = __pyx_t_3;
+
+    /* "pyblooming/cbitmap.pyx":42
+ *         memcpy(dst + i*8, &a, 8)
+ *     for i in range(words*8, n):
+ *         if op == OP_OR: dst[i] = dst[i] | src[i]             # <<<<<<<<<<<<<<
+ *         elif op == OP_AND: dst[i] = dst[i] & src[i]
+ *         else: dst[i] = dst[i] ^ src[i]
+ */
+    switch (__pyx_v_op) {
+      case __pyx_e_10pyblooming_7cbitmap_OP_OR:
+      (__pyx_v_dst[__pyx_v_i]) = ((__pyx_v_dst[__pyx_v_i]) | (__pyx_v_src[__pyx_v_i]));
+      break;
+      case __pyx_e_10pyblooming_7cbitmap_OP_AND:
+
+      /* "pyblooming/cbitmap.pyx":43
+ *     for i in range(words*8, n):
+ *         if op == OP_OR: dst[i] = dst[i] | src[i]
+ *         elif op == OP_AND: dst[i] = dst[i] & src[i]             # <<<<<<<<<<<<<<
+ *         else: dst[i] = dst[i] ^ src[i]
+ * 
+ */
+      (__pyx_v_dst[__pyx_v_i]) = ((__pyx_v_dst[__pyx_v_i]) & (__pyx_v_src[__pyx_v_i]));
+      break;
+      default:
+
+      /* "pyblooming/cbitmap.pyx":44
+ *         if op == OP_OR: dst[i] = dst[i] | src[i]
+ *         elif op == OP_AND: dst[i] = dst[i] & src[i]
+ *         else: dst[i] = dst[i] ^ src[i]             # <<<<<<<<<<<<<<
+ * 
+ * cdef extern from "cbitmaputil.h" nogil:
+ */
+      (__pyx_v_dst[__pyx_v_i]) = ((__pyx_v_dst[__pyx_v_i]) ^ (__pyx_v_src[__pyx_v_i]));
+      break;
+    }
+  }
 
-/* "pyblooming/cbitmap.pyx":16
- *     cdef unsigned char* mmap
+  /* "pyblooming/cbitmap.pyx":27
+ * @cython.boundscheck(False)
+ * @cython.wraparound(False)
+ * cdef void combine_bytes(unsigned char* dst, unsigned char* src, size_t n, int op) nogil:             # <<<<<<<<<<<<<<
+ *     """
+ *     Combines n bytes of src into dst using a bitwise operation.
+ */
+
+  /* function exit code */
+}
+
+/* "pyblooming/cbitmap.pyx":76
+ *     CHUNK_SIZE = 1 << 20
  * 
- *     def __cinit__(self, length, filename=None, private=False):             # <<<<<<<<<<<<<<
+ *     def __cinit__(self, length, filename=None, private=False, preallocate=False,             # <<<<<<<<<<<<<<
+ *                   advice="willneed", populate=False, atomic=False):
  *         """
- *         Creates a new Bitmap object. Bitmap wraps a memory mapped
  */
 
-static int __pyx_pf_10pyblooming_7cbitmap_6Bitmap___cinit__(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
-static int __pyx_pf_10pyblooming_7cbitmap_6Bitmap___cinit__(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+/* Python wrapper */
+static int __pyx_pw_10pyblooming_7cbitmap_6Bitmap_1__cinit__(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static int __pyx_pw_10pyblooming_7cbitmap_6Bitmap_1__cinit__(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
   PyObject *__pyx_v_length = 0;
   PyObject *__pyx_v_filename = 0;
   PyObject *__pyx_v_private = 0;
-  PyObject *__pyx_v_size_diff = NULL;
-  long __pyx_v_priv;
-  int __pyx_r;
-  __Pyx_RefNannyDeclarations
-  PyObject *__pyx_t_1 = NULL;
-  int __pyx_t_2;
-  size_t __pyx_t_3;
-  int __pyx_t_4;
-  PyObject *__pyx_t_5 = NULL;
-  int __pyx_t_6;
-  PyObject *__pyx_t_7 = NULL;
-  long __pyx_t_8;
-  PyObject *__pyx_t_9 = NULL;
-  PyObject *__pyx_t_10 = NULL;
-  PyObject *__pyx_t_11 = NULL;
+  PyObject *__pyx_v_preallocate = 0;
+  PyObject *__pyx_v_advice = 0;
+  PyObject *__pyx_v_populate = 0;
+  PyObject *__pyx_v_atomic = 0;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
-  static PyObject **__pyx_pyargnames[] = {&__pyx_n_s__length,&__pyx_n_s__filename,&__pyx_n_s__private,0};
-  __Pyx_RefNannySetupContext("__cinit__");
-  if (unlikely(__pyx_kwds)) {
-    Py_ssize_t kw_args = PyDict_Size(__pyx_kwds);
-    PyObject* values[3] = {0,0,0};
+  int __pyx_r;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__cinit__ (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_length,&__pyx_n_s_filename,&__pyx_n_s_private,&__pyx_n_s_preallocate,&__pyx_n_s_advice,&__pyx_n_s_populate,&__pyx_n_s_atomic,0};
+    PyObject* values[7] = {0,0,0,0,0,0,0};
     values[1] = ((PyObject *)Py_None);
-    values[2] = __pyx_k_1;
-    switch (PyTuple_GET_SIZE(__pyx_args)) {
-      case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
-      case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
-      case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
-      case  0: break;
-      default: goto __pyx_L5_argtuple_error;
-    }
-    switch (PyTuple_GET_SIZE(__pyx_args)) {
-      case  0:
-      values[0] = PyDict_GetItem(__pyx_kwds, __pyx_n_s__length);
-      if (likely(values[0])) kw_args--;
-      else goto __pyx_L5_argtuple_error;
-      case  1:
-      if (kw_args > 0) {
-        PyObject* value = PyDict_GetItem(__pyx_kwds, __pyx_n_s__filename);
-        if (value) { values[1] = value; kw_args--; }
-      }
-      case  2:
-      if (kw_args > 0) {
-        PyObject* value = PyDict_GetItem(__pyx_kwds, __pyx_n_s__private);
-        if (value) { values[2] = value; kw_args--; }
-      }
-    }
-    if (unlikely(kw_args > 0)) {
-      if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, PyTuple_GET_SIZE(__pyx_args), "__cinit__") < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 16; __pyx_clineno = __LINE__; goto __pyx_L3_error;}
+    values[2] = ((PyObject *)Py_False);
+    values[3] = ((PyObject *)Py_False);
+    values[4] = ((PyObject *)__pyx_n_s_willneed);
+
+    /* "pyblooming/cbitmap.pyx":77
+ * 
+ *     def __cinit__(self, length, filename=None, private=False, preallocate=False,
+ *                   advice="willneed", populate=False, atomic=False):             # <<<<<<<<<<<<<<
+ *         """
+ *         Creates a new Bitmap object. Bitmap wraps a memory mapped
+ */
+    values[5] = ((PyObject *)Py_False);
+    values[6] = ((PyObject *)Py_False);
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  7: values[6] = PyTuple_GET_ITEM(__pyx_args, 6);
+        CYTHON_FALLTHROUGH;
+        case  6: values[5] = PyTuple_GET_ITEM(__pyx_args, 5);
+        CYTHON_FALLTHROUGH;
+        case  5: values[4] = PyTuple_GET_ITEM(__pyx_args, 4);
+        CYTHON_FALLTHROUGH;
+        case  4: values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+        CYTHON_FALLTHROUGH;
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_length)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_filename);
+          if (value) { values[1] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  2:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_private);
+          if (value) { values[2] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  3:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_preallocate);
+          if (value) { values[3] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  4:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_advice);
+          if (value) { values[4] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  5:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_populate);
+          if (value) { values[5] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  6:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_atomic);
+          if (value) { values[6] = value; kw_args--; }
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "__cinit__") < 0)) __PYX_ERR(0, 76, __pyx_L3_error)
+      }
+    } else {
+      switch (PyTuple_GET_SIZE(__pyx_args)) {
+        case  7: values[6] = PyTuple_GET_ITEM(__pyx_args, 6);
+        CYTHON_FALLTHROUGH;
+        case  6: values[5] = PyTuple_GET_ITEM(__pyx_args, 5);
+        CYTHON_FALLTHROUGH;
+        case  5: values[4] = PyTuple_GET_ITEM(__pyx_args, 4);
+        CYTHON_FALLTHROUGH;
+        case  4: values[3] = PyTuple_GET_ITEM(__pyx_args, 3);
+        CYTHON_FALLTHROUGH;
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        break;
+        default: goto __pyx_L5_argtuple_error;
+      }
     }
     __pyx_v_length = values[0];
     __pyx_v_filename = values[1];
     __pyx_v_private = values[2];
-  } else {
-    __pyx_v_filename = ((PyObject *)Py_None);
-    __pyx_v_private = __pyx_k_1;
-    switch (PyTuple_GET_SIZE(__pyx_args)) {
-      case  3: __pyx_v_private = PyTuple_GET_ITEM(__pyx_args, 2);
-      case  2: __pyx_v_filename = PyTuple_GET_ITEM(__pyx_args, 1);
-      case  1: __pyx_v_length = PyTuple_GET_ITEM(__pyx_args, 0);
-      break;
-      default: goto __pyx_L5_argtuple_error;
-    }
+    __pyx_v_preallocate = values[3];
+    __pyx_v_advice = values[4];
+    __pyx_v_populate = values[5];
+    __pyx_v_atomic = values[6];
   }
   goto __pyx_L4_argument_unpacking_done;
   __pyx_L5_argtuple_error:;
-  __Pyx_RaiseArgtupleInvalid("__cinit__", 0, 1, 3, PyTuple_GET_SIZE(__pyx_args)); {__pyx_filename = __pyx_f[0]; __pyx_lineno = 16; __pyx_clineno = __LINE__; goto __pyx_L3_error;}
+  __Pyx_RaiseArgtupleInvalid("__cinit__", 0, 1, 7, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 76, __pyx_L3_error)
   __pyx_L3_error:;
   __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__cinit__", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __Pyx_RefNannyFinishContext();
   return -1;
   __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap___cinit__(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), __pyx_v_length, __pyx_v_filename, __pyx_v_private, __pyx_v_preallocate, __pyx_v_advice, __pyx_v_populate, __pyx_v_atomic);
+
+  /* "pyblooming/cbitmap.pyx":76
+ *     CHUNK_SIZE = 1 << 20
+ * 
+ *     def __cinit__(self, length, filename=None, private=False, preallocate=False,             # <<<<<<<<<<<<<<
+ *                   advice="willneed", populate=False, atomic=False):
+ *         """
+ */
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static int __pyx_pf_10pyblooming_7cbitmap_6Bitmap___cinit__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_length, PyObject *__pyx_v_filename, PyObject *__pyx_v_private, PyObject *__pyx_v_preallocate, PyObject *__pyx_v_advice, PyObject *__pyx_v_populate, PyObject *__pyx_v_atomic) {
+  long __pyx_v_page_size;
+  PyObject *__pyx_v_err = NULL;
+  long __pyx_v_priv;
+  int __pyx_r;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  size_t __pyx_t_4;
+  PyObject *__pyx_t_5 = NULL;
+  PyObject *__pyx_t_6 = NULL;
+  int __pyx_t_7;
+  long __pyx_t_8;
+  PyObject *__pyx_t_9 = NULL;
+  PyObject *__pyx_t_10 = NULL;
+  PyObject *__pyx_t_11 = NULL;
+  PyObject *__pyx_t_12 = NULL;
+  PyObject *__pyx_t_13 = NULL;
+  PyObject *__pyx_t_14 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("__cinit__", 0);
 
-  /* "pyblooming/cbitmap.pyx":31
+  /* "pyblooming/cbitmap.pyx":107
  *         """
  *         # Check the length
  *         if length <= 0: raise ValueError, "Length must be positive!"             # <<<<<<<<<<<<<<
+ *         if advice not in ADVICE: raise ValueError, "Unknown advice %r!" % advice
+ *         if atomic and private: raise ValueError, "Atomic bitmaps can not be private!"
+ */
+  __pyx_t_1 = PyObject_RichCompare(__pyx_v_length, __pyx_int_0, Py_LE); __Pyx_XGOTREF(__pyx_t_1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 107, __pyx_L1_error)
+  __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_t_1); if (unlikely(__pyx_t_2 < 0)) __PYX_ERR(0, 107, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  if (unlikely(__pyx_t_2)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Length_must_be_positive, 0, 0);
+    __PYX_ERR(0, 107, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":108
+ *         # Check the length
+ *         if length <= 0: raise ValueError, "Length must be positive!"
+ *         if advice not in ADVICE: raise ValueError, "Unknown advice %r!" % advice             # <<<<<<<<<<<<<<
+ *         if atomic and private: raise ValueError, "Atomic bitmaps can not be private!"
  *         self.size = length
- * 
  */
-  __pyx_t_1 = PyObject_RichCompare(__pyx_v_length, __pyx_int_0, Py_LE); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 31; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
+  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_ADVICE); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 108, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
-  __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_t_1); if (unlikely(__pyx_t_2 < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 31; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
+  __pyx_t_2 = (__Pyx_PySequence_ContainsTF(__pyx_v_advice, __pyx_t_1, Py_NE)); if (unlikely(__pyx_t_2 < 0)) __PYX_ERR(0, 108, __pyx_L1_error)
   __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  if (__pyx_t_2) {
-    __Pyx_Raise(__pyx_builtin_ValueError, ((PyObject *)__pyx_kp_s_2), 0, 0);
-    {__pyx_filename = __pyx_f[0]; __pyx_lineno = 31; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    goto __pyx_L6;
+  __pyx_t_3 = (__pyx_t_2 != 0);
+  if (unlikely(__pyx_t_3)) {
+    __pyx_t_1 = __Pyx_PyString_FormatSafe(__pyx_kp_s_Unknown_advice_r, __pyx_v_advice); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 108, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_t_1, 0, 0);
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __PYX_ERR(0, 108, __pyx_L1_error)
   }
-  __pyx_L6:;
 
-  /* "pyblooming/cbitmap.pyx":32
- *         # Check the length
+  /* "pyblooming/cbitmap.pyx":109
  *         if length <= 0: raise ValueError, "Length must be positive!"
+ *         if advice not in ADVICE: raise ValueError, "Unknown advice %r!" % advice
+ *         if atomic and private: raise ValueError, "Atomic bitmaps can not be private!"             # <<<<<<<<<<<<<<
+ *         self.size = length
+ *         self.atomic = atomic
+ */
+  __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_v_atomic); if (unlikely(__pyx_t_2 < 0)) __PYX_ERR(0, 109, __pyx_L1_error)
+  if (__pyx_t_2) {
+  } else {
+    __pyx_t_3 = __pyx_t_2;
+    goto __pyx_L6_bool_binop_done;
+  }
+  __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_v_private); if (unlikely(__pyx_t_2 < 0)) __PYX_ERR(0, 109, __pyx_L1_error)
+  __pyx_t_3 = __pyx_t_2;
+  __pyx_L6_bool_binop_done:;
+  if (unlikely(__pyx_t_3)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Atomic_bitmaps_can_not_be_privat, 0, 0);
+    __PYX_ERR(0, 109, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":110
+ *         if advice not in ADVICE: raise ValueError, "Unknown advice %r!" % advice
+ *         if atomic and private: raise ValueError, "Atomic bitmaps can not be private!"
  *         self.size = length             # <<<<<<<<<<<<<<
+ *         self.atomic = atomic
  * 
- *         if not filename:
  */
-  __pyx_t_3 = __Pyx_PyInt_AsSize_t(__pyx_v_length); if (unlikely((__pyx_t_3 == (size_t)-1) && PyErr_Occurred())) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 32; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->size = __pyx_t_3;
+  __pyx_t_4 = __Pyx_PyInt_As_size_t(__pyx_v_length); if (unlikely((__pyx_t_4 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 110, __pyx_L1_error)
+  __pyx_v_self->size = __pyx_t_4;
 
-  /* "pyblooming/cbitmap.pyx":34
+  /* "pyblooming/cbitmap.pyx":111
+ *         if atomic and private: raise ValueError, "Atomic bitmaps can not be private!"
  *         self.size = length
+ *         self.atomic = atomic             # <<<<<<<<<<<<<<
+ * 
+ *         # Track the modified pages with a bit per page
+ */
+  __pyx_t_3 = __Pyx_PyObject_IsTrue(__pyx_v_atomic); if (unlikely((__pyx_t_3 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 111, __pyx_L1_error)
+  __pyx_v_self->atomic = __pyx_t_3;
+
+  /* "pyblooming/cbitmap.pyx":114
+ * 
+ *         # Track the modified pages with a bit per page
+ *         page_size = sysconf(_SC_PAGESIZE)             # <<<<<<<<<<<<<<
+ *         self.page_shift = 0
+ *         while (1 << self.page_shift) < page_size:
+ */
+  __pyx_v_page_size = sysconf(_SC_PAGESIZE);
+
+  /* "pyblooming/cbitmap.pyx":115
+ *         # Track the modified pages with a bit per page
+ *         page_size = sysconf(_SC_PAGESIZE)
+ *         self.page_shift = 0             # <<<<<<<<<<<<<<
+ *         while (1 << self.page_shift) < page_size:
+ *             self.page_shift += 1
+ */
+  __pyx_v_self->page_shift = 0;
+
+  /* "pyblooming/cbitmap.pyx":116
+ *         page_size = sysconf(_SC_PAGESIZE)
+ *         self.page_shift = 0
+ *         while (1 << self.page_shift) < page_size:             # <<<<<<<<<<<<<<
+ *             self.page_shift += 1
+ *         self.dirty = <unsigned char*>stdlib.calloc((self._pages() + 7) / 8, 1)
+ */
+  while (1) {
+    __pyx_t_3 = (((1 << __pyx_v_self->page_shift) < __pyx_v_page_size) != 0);
+    if (!__pyx_t_3) break;
+
+    /* "pyblooming/cbitmap.pyx":117
+ *         self.page_shift = 0
+ *         while (1 << self.page_shift) < page_size:
+ *             self.page_shift += 1             # <<<<<<<<<<<<<<
+ *         self.dirty = <unsigned char*>stdlib.calloc((self._pages() + 7) / 8, 1)
+ *         if self.dirty == NULL: raise MemoryError
+ */
+    __pyx_v_self->page_shift = (__pyx_v_self->page_shift + 1);
+  }
+
+  /* "pyblooming/cbitmap.pyx":118
+ *         while (1 << self.page_shift) < page_size:
+ *             self.page_shift += 1
+ *         self.dirty = <unsigned char*>stdlib.calloc((self._pages() + 7) / 8, 1)             # <<<<<<<<<<<<<<
+ *         if self.dirty == NULL: raise MemoryError
+ * 
+ */
+  __pyx_v_self->dirty = ((unsigned char *)calloc(((((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_pages(__pyx_v_self) + 7) / 8), 1));
+
+  /* "pyblooming/cbitmap.pyx":119
+ *             self.page_shift += 1
+ *         self.dirty = <unsigned char*>stdlib.calloc((self._pages() + 7) / 8, 1)
+ *         if self.dirty == NULL: raise MemoryError             # <<<<<<<<<<<<<<
+ * 
+ *         if not filename:
+ */
+  __pyx_t_3 = ((__pyx_v_self->dirty == NULL) != 0);
+  if (unlikely(__pyx_t_3)) {
+    PyErr_NoMemory(); __PYX_ERR(0, 119, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":121
+ *         if self.dirty == NULL: raise MemoryError
  * 
  *         if not filename:             # <<<<<<<<<<<<<<
  *             # For anonymous mmaps, always use MAP_PRIVATE
  *             self.fileobj = None
  */
-  __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_v_filename); if (unlikely(__pyx_t_2 < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 34; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __pyx_t_4 = (!__pyx_t_2);
-  if (__pyx_t_4) {
+  __pyx_t_3 = __Pyx_PyObject_IsTrue(__pyx_v_filename); if (unlikely(__pyx_t_3 < 0)) __PYX_ERR(0, 121, __pyx_L1_error)
+  __pyx_t_2 = ((!__pyx_t_3) != 0);
+  if (__pyx_t_2) {
 
-    /* "pyblooming/cbitmap.pyx":36
+    /* "pyblooming/cbitmap.pyx":123
  *         if not filename:
  *             # For anonymous mmaps, always use MAP_PRIVATE
  *             self.fileobj = None             # <<<<<<<<<<<<<<
@@ -652,343 +2225,541 @@ static int __pyx_pf_10pyblooming_7cbitmap_6Bitmap___cinit__(PyObject *__pyx_v_se
  */
     __Pyx_INCREF(Py_None);
     __Pyx_GIVEREF(Py_None);
-    __Pyx_GOTREF(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj);
-    __Pyx_DECREF(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj);
-    ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj = Py_None;
+    __Pyx_GOTREF(__pyx_v_self->fileobj);
+    __Pyx_DECREF(__pyx_v_self->fileobj);
+    __pyx_v_self->fileobj = Py_None;
 
-    /* "pyblooming/cbitmap.pyx":37
+    /* "pyblooming/cbitmap.pyx":124
  *             # For anonymous mmaps, always use MAP_PRIVATE
  *             self.fileobj = None
  *             self.fileno = -1             # <<<<<<<<<<<<<<
  *             self.mmap = <unsigned char*>mmap_file(self.fileno, self.size, 1)
  *             if self.mmap == NULL:
  */
-    ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileno = -1;
+    __pyx_v_self->fileno = -1;
 
-    /* "pyblooming/cbitmap.pyx":38
+    /* "pyblooming/cbitmap.pyx":125
  *             self.fileobj = None
  *             self.fileno = -1
  *             self.mmap = <unsigned char*>mmap_file(self.fileno, self.size, 1)             # <<<<<<<<<<<<<<
  *             if self.mmap == NULL:
  *                 raise OSError, "Failed to create memory mapped region!"
  */
-    ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap = ((unsigned char *)mmap_file(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileno, ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->size, 1));
+    __pyx_v_self->mmap = ((unsigned char *)mmap_file(__pyx_v_self->fileno, __pyx_v_self->size, 1));
 
-    /* "pyblooming/cbitmap.pyx":39
+    /* "pyblooming/cbitmap.pyx":126
  *             self.fileno = -1
  *             self.mmap = <unsigned char*>mmap_file(self.fileno, self.size, 1)
  *             if self.mmap == NULL:             # <<<<<<<<<<<<<<
  *                 raise OSError, "Failed to create memory mapped region!"
  * 
  */
-    __pyx_t_4 = (((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap == NULL);
-    if (__pyx_t_4) {
+    __pyx_t_2 = ((__pyx_v_self->mmap == NULL) != 0);
+    if (unlikely(__pyx_t_2)) {
 
-      /* "pyblooming/cbitmap.pyx":40
+      /* "pyblooming/cbitmap.pyx":127
  *             self.mmap = <unsigned char*>mmap_file(self.fileno, self.size, 1)
  *             if self.mmap == NULL:
  *                 raise OSError, "Failed to create memory mapped region!"             # <<<<<<<<<<<<<<
  * 
  *         else:
  */
-      __Pyx_Raise(__pyx_builtin_OSError, ((PyObject *)__pyx_kp_s_3), 0, 0);
-      {__pyx_filename = __pyx_f[0]; __pyx_lineno = 40; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      goto __pyx_L8;
+      __Pyx_Raise(__pyx_builtin_OSError, __pyx_kp_s_Failed_to_create_memory_mapped_r, 0, 0);
+      __PYX_ERR(0, 127, __pyx_L1_error)
+
+      /* "pyblooming/cbitmap.pyx":126
+ *             self.fileno = -1
+ *             self.mmap = <unsigned char*>mmap_file(self.fileno, self.size, 1)
+ *             if self.mmap == NULL:             # <<<<<<<<<<<<<<
+ *                 raise OSError, "Failed to create memory mapped region!"
+ * 
+ */
     }
-    __pyx_L8:;
-    goto __pyx_L7;
+
+    /* "pyblooming/cbitmap.pyx":121
+ *         if self.dirty == NULL: raise MemoryError
+ * 
+ *         if not filename:             # <<<<<<<<<<<<<<
+ *             # For anonymous mmaps, always use MAP_PRIVATE
+ *             self.fileobj = None
+ */
+    goto __pyx_L11;
   }
-  /*else*/ {
 
-    /* "pyblooming/cbitmap.pyx":43
+  /* "pyblooming/cbitmap.pyx":130
  * 
  *         else:
  *             self.fileobj = open(filename, "a+")             # <<<<<<<<<<<<<<
  *             self.fileno = self.fileobj.fileno()
  * 
  */
-    __pyx_t_1 = PyTuple_New(2); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 43; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(((PyObject *)__pyx_t_1));
+  /*else*/ {
+    __pyx_t_1 = PyTuple_New(2); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 130, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
     __Pyx_INCREF(__pyx_v_filename);
-    PyTuple_SET_ITEM(__pyx_t_1, 0, __pyx_v_filename);
     __Pyx_GIVEREF(__pyx_v_filename);
-    __Pyx_INCREF(((PyObject *)__pyx_kp_s_4));
-    PyTuple_SET_ITEM(__pyx_t_1, 1, ((PyObject *)__pyx_kp_s_4));
-    __Pyx_GIVEREF(((PyObject *)__pyx_kp_s_4));
-    __pyx_t_5 = PyObject_Call(__pyx_builtin_open, ((PyObject *)__pyx_t_1), NULL); if (unlikely(!__pyx_t_5)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 43; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
+    PyTuple_SET_ITEM(__pyx_t_1, 0, __pyx_v_filename);
+    __Pyx_INCREF(__pyx_kp_s_a);
+    __Pyx_GIVEREF(__pyx_kp_s_a);
+    PyTuple_SET_ITEM(__pyx_t_1, 1, __pyx_kp_s_a);
+    __pyx_t_5 = __Pyx_PyObject_Call(__pyx_builtin_open, __pyx_t_1, NULL); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 130, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_5);
-    __Pyx_DECREF(((PyObject *)__pyx_t_1)); __pyx_t_1 = 0;
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
     __Pyx_GIVEREF(__pyx_t_5);
-    __Pyx_GOTREF(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj);
-    __Pyx_DECREF(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj);
-    ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj = __pyx_t_5;
+    __Pyx_GOTREF(__pyx_v_self->fileobj);
+    __Pyx_DECREF(__pyx_v_self->fileobj);
+    __pyx_v_self->fileobj = __pyx_t_5;
     __pyx_t_5 = 0;
 
-    /* "pyblooming/cbitmap.pyx":44
+    /* "pyblooming/cbitmap.pyx":131
  *         else:
  *             self.fileobj = open(filename, "a+")
  *             self.fileno = self.fileobj.fileno()             # <<<<<<<<<<<<<<
  * 
- *             # Zero-fill the file
- */
-    __pyx_t_5 = PyObject_GetAttr(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj, __pyx_n_s__fileno); if (unlikely(!__pyx_t_5)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 44; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(__pyx_t_5);
-    __pyx_t_1 = PyObject_Call(__pyx_t_5, ((PyObject *)__pyx_empty_tuple), NULL); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 44; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(__pyx_t_1);
-    __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-    __pyx_t_6 = __Pyx_PyInt_AsInt(__pyx_t_1); if (unlikely((__pyx_t_6 == (int)-1) && PyErr_Occurred())) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 44; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-    ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileno = __pyx_t_6;
-
-    /* "pyblooming/cbitmap.pyx":47
- * 
- *             # Zero-fill the file
- *             size_diff = length - os.path.getsize(filename)             # <<<<<<<<<<<<<<
- *             while size_diff > 0:
- *                 self.fileobj.write(chr(0) * min(size_diff, 100000))
+ *             # Extend the file, this reads back as zeros
  */
-    __pyx_t_1 = __Pyx_GetName(__pyx_m, __pyx_n_s__os); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 47; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
+    __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_self->fileobj, __pyx_n_s_fileno); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 131, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_1);
-    __pyx_t_5 = PyObject_GetAttr(__pyx_t_1, __pyx_n_s__path); if (unlikely(!__pyx_t_5)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 47; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
+    __pyx_t_6 = NULL;
+    if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_1))) {
+      __pyx_t_6 = PyMethod_GET_SELF(__pyx_t_1);
+      if (likely(__pyx_t_6)) {
+        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_1);
+        __Pyx_INCREF(__pyx_t_6);
+        __Pyx_INCREF(function);
+        __Pyx_DECREF_SET(__pyx_t_1, function);
+      }
+    }
+    __pyx_t_5 = (__pyx_t_6) ? __Pyx_PyObject_CallOneArg(__pyx_t_1, __pyx_t_6) : __Pyx_PyObject_CallNoArg(__pyx_t_1);
+    __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
+    if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 131, __pyx_L1_error)
     __Pyx_GOTREF(__pyx_t_5);
     __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-    __pyx_t_1 = PyObject_GetAttr(__pyx_t_5, __pyx_n_s__getsize); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 47; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(__pyx_t_1);
+    __pyx_t_7 = __Pyx_PyInt_As_int(__pyx_t_5); if (unlikely((__pyx_t_7 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 131, __pyx_L1_error)
     __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-    __pyx_t_5 = PyTuple_New(1); if (unlikely(!__pyx_t_5)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 47; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(((PyObject *)__pyx_t_5));
-    __Pyx_INCREF(__pyx_v_filename);
-    PyTuple_SET_ITEM(__pyx_t_5, 0, __pyx_v_filename);
-    __Pyx_GIVEREF(__pyx_v_filename);
-    __pyx_t_7 = PyObject_Call(__pyx_t_1, ((PyObject *)__pyx_t_5), NULL); if (unlikely(!__pyx_t_7)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 47; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(__pyx_t_7);
-    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-    __Pyx_DECREF(((PyObject *)__pyx_t_5)); __pyx_t_5 = 0;
-    __pyx_t_5 = PyNumber_Subtract(__pyx_v_length, __pyx_t_7); if (unlikely(!__pyx_t_5)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 47; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(__pyx_t_5);
-    __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
-    __pyx_v_size_diff = __pyx_t_5;
-    __pyx_t_5 = 0;
+    __pyx_v_self->fileno = __pyx_t_7;
 
-    /* "pyblooming/cbitmap.pyx":48
- *             # Zero-fill the file
- *             size_diff = length - os.path.getsize(filename)
- *             while size_diff > 0:             # <<<<<<<<<<<<<<
- *                 self.fileobj.write(chr(0) * min(size_diff, 100000))
- *                 self.fileobj.flush()
+    /* "pyblooming/cbitmap.pyx":134
+ * 
+ *             # Extend the file, this reads back as zeros
+ *             if extend_file(self.fileno, self.size, 1 if preallocate else 0) == -1:             # <<<<<<<<<<<<<<
+ *                 err = errno
+ *                 self.fileobj.close()
  */
-    while (1) {
-      __pyx_t_5 = PyObject_RichCompare(__pyx_v_size_diff, __pyx_int_0, Py_GT); if (unlikely(!__pyx_t_5)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 48; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(__pyx_t_5);
-      __pyx_t_4 = __Pyx_PyObject_IsTrue(__pyx_t_5); if (unlikely(__pyx_t_4 < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 48; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-      if (!__pyx_t_4) break;
+    __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_v_preallocate); if (unlikely(__pyx_t_2 < 0)) __PYX_ERR(0, 134, __pyx_L1_error)
+    if (__pyx_t_2) {
+      __pyx_t_7 = 1;
+    } else {
+      __pyx_t_7 = 0;
+    }
+    __pyx_t_2 = ((extend_file(__pyx_v_self->fileno, __pyx_v_self->size, __pyx_t_7) == -1L) != 0);
+    if (unlikely(__pyx_t_2)) {
 
-      /* "pyblooming/cbitmap.pyx":49
- *             size_diff = length - os.path.getsize(filename)
- *             while size_diff > 0:
- *                 self.fileobj.write(chr(0) * min(size_diff, 100000))             # <<<<<<<<<<<<<<
- *                 self.fileobj.flush()
- *                 size_diff = length - os.path.getsize(filename)
+      /* "pyblooming/cbitmap.pyx":135
+ *             # Extend the file, this reads back as zeros
+ *             if extend_file(self.fileno, self.size, 1 if preallocate else 0) == -1:
+ *                 err = errno             # <<<<<<<<<<<<<<
+ *                 self.fileobj.close()
+ *                 raise OSError(err, "Failed to extend the file: %s" % os.strerror(err))
  */
-      __pyx_t_5 = PyObject_GetAttr(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj, __pyx_n_s__write); if (unlikely(!__pyx_t_5)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 49; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
+      __pyx_t_5 = __Pyx_PyInt_From_int(errno); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 135, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_5);
-      __pyx_t_7 = PyObject_Call(__pyx_builtin_chr, ((PyObject *)__pyx_k_tuple_5), NULL); if (unlikely(!__pyx_t_7)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 49; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(__pyx_t_7);
-      __pyx_t_8 = 100000;
-      __Pyx_INCREF(__pyx_v_size_diff);
-      __pyx_t_1 = __pyx_v_size_diff;
-      __pyx_t_10 = PyInt_FromLong(__pyx_t_8); if (unlikely(!__pyx_t_10)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 49; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(__pyx_t_10);
-      __pyx_t_11 = PyObject_RichCompare(__pyx_t_10, __pyx_t_1, Py_LT); if (unlikely(!__pyx_t_11)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 49; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(__pyx_t_11);
-      __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
-      __pyx_t_4 = __Pyx_PyObject_IsTrue(__pyx_t_11); if (unlikely(__pyx_t_4 < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 49; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_DECREF(__pyx_t_11); __pyx_t_11 = 0;
-      if (__pyx_t_4) {
-        __pyx_t_11 = PyInt_FromLong(__pyx_t_8); if (unlikely(!__pyx_t_11)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 49; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-        __Pyx_GOTREF(__pyx_t_11);
-        __pyx_t_9 = __pyx_t_11;
-        __pyx_t_11 = 0;
-      } else {
-        __Pyx_INCREF(__pyx_t_1);
-        __pyx_t_9 = __pyx_t_1;
-      }
-      __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-      __pyx_t_1 = PyNumber_Multiply(__pyx_t_7, __pyx_t_9); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 49; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(__pyx_t_1);
-      __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
-      __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
-      __pyx_t_9 = PyTuple_New(1); if (unlikely(!__pyx_t_9)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 49; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(((PyObject *)__pyx_t_9));
-      PyTuple_SET_ITEM(__pyx_t_9, 0, __pyx_t_1);
-      __Pyx_GIVEREF(__pyx_t_1);
-      __pyx_t_1 = 0;
-      __pyx_t_1 = PyObject_Call(__pyx_t_5, ((PyObject *)__pyx_t_9), NULL); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 49; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(__pyx_t_1);
-      __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-      __Pyx_DECREF(((PyObject *)__pyx_t_9)); __pyx_t_9 = 0;
-      __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+      __pyx_v_err = __pyx_t_5;
+      __pyx_t_5 = 0;
 
-      /* "pyblooming/cbitmap.pyx":50
- *             while size_diff > 0:
- *                 self.fileobj.write(chr(0) * min(size_diff, 100000))
- *                 self.fileobj.flush()             # <<<<<<<<<<<<<<
- *                 size_diff = length - os.path.getsize(filename)
+      /* "pyblooming/cbitmap.pyx":136
+ *             if extend_file(self.fileno, self.size, 1 if preallocate else 0) == -1:
+ *                 err = errno
+ *                 self.fileobj.close()             # <<<<<<<<<<<<<<
+ *                 raise OSError(err, "Failed to extend the file: %s" % os.strerror(err))
  * 
  */
-      __pyx_t_1 = PyObject_GetAttr(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj, __pyx_n_s__flush); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 50; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
+      __pyx_t_1 = __Pyx_PyObject_GetAttrStr(__pyx_v_self->fileobj, __pyx_n_s_close); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 136, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_1);
-      __pyx_t_9 = PyObject_Call(__pyx_t_1, ((PyObject *)__pyx_empty_tuple), NULL); if (unlikely(!__pyx_t_9)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 50; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(__pyx_t_9);
+      __pyx_t_6 = NULL;
+      if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_1))) {
+        __pyx_t_6 = PyMethod_GET_SELF(__pyx_t_1);
+        if (likely(__pyx_t_6)) {
+          PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_1);
+          __Pyx_INCREF(__pyx_t_6);
+          __Pyx_INCREF(function);
+          __Pyx_DECREF_SET(__pyx_t_1, function);
+        }
+      }
+      __pyx_t_5 = (__pyx_t_6) ? __Pyx_PyObject_CallOneArg(__pyx_t_1, __pyx_t_6) : __Pyx_PyObject_CallNoArg(__pyx_t_1);
+      __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
+      if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 136, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_5);
       __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-      __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+      __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
 
-      /* "pyblooming/cbitmap.pyx":51
- *                 self.fileobj.write(chr(0) * min(size_diff, 100000))
- *                 self.fileobj.flush()
- *                 size_diff = length - os.path.getsize(filename)             # <<<<<<<<<<<<<<
+      /* "pyblooming/cbitmap.pyx":137
+ *                 err = errno
+ *                 self.fileobj.close()
+ *                 raise OSError(err, "Failed to extend the file: %s" % os.strerror(err))             # <<<<<<<<<<<<<<
  * 
  *             # Create the memory mapped file
  */
-      __pyx_t_9 = __Pyx_GetName(__pyx_m, __pyx_n_s__os); if (unlikely(!__pyx_t_9)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 51; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(__pyx_t_9);
-      __pyx_t_1 = PyObject_GetAttr(__pyx_t_9, __pyx_n_s__path); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 51; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
+      __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_os); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 137, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_1);
-      __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
-      __pyx_t_9 = PyObject_GetAttr(__pyx_t_1, __pyx_n_s__getsize); if (unlikely(!__pyx_t_9)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 51; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(__pyx_t_9);
+      __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_t_1, __pyx_n_s_strerror); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 137, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_6);
       __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-      __pyx_t_1 = PyTuple_New(1); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 51; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(((PyObject *)__pyx_t_1));
-      __Pyx_INCREF(__pyx_v_filename);
-      PyTuple_SET_ITEM(__pyx_t_1, 0, __pyx_v_filename);
-      __Pyx_GIVEREF(__pyx_v_filename);
-      __pyx_t_5 = PyObject_Call(__pyx_t_9, ((PyObject *)__pyx_t_1), NULL); if (unlikely(!__pyx_t_5)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 51; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
+      __pyx_t_1 = NULL;
+      if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_6))) {
+        __pyx_t_1 = PyMethod_GET_SELF(__pyx_t_6);
+        if (likely(__pyx_t_1)) {
+          PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_6);
+          __Pyx_INCREF(__pyx_t_1);
+          __Pyx_INCREF(function);
+          __Pyx_DECREF_SET(__pyx_t_6, function);
+        }
+      }
+      __pyx_t_5 = (__pyx_t_1) ? __Pyx_PyObject_Call2Args(__pyx_t_6, __pyx_t_1, __pyx_v_err) : __Pyx_PyObject_CallOneArg(__pyx_t_6, __pyx_v_err);
+      __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
+      if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 137, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_5);
-      __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
-      __Pyx_DECREF(((PyObject *)__pyx_t_1)); __pyx_t_1 = 0;
-      __pyx_t_1 = PyNumber_Subtract(__pyx_v_length, __pyx_t_5); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 51; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(__pyx_t_1);
+      __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+      __pyx_t_6 = __Pyx_PyString_FormatSafe(__pyx_kp_s_Failed_to_extend_the_file_s, __pyx_t_5); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 137, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_6);
+      __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+      __pyx_t_5 = PyTuple_New(2); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 137, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_5);
+      __Pyx_INCREF(__pyx_v_err);
+      __Pyx_GIVEREF(__pyx_v_err);
+      PyTuple_SET_ITEM(__pyx_t_5, 0, __pyx_v_err);
+      __Pyx_GIVEREF(__pyx_t_6);
+      PyTuple_SET_ITEM(__pyx_t_5, 1, __pyx_t_6);
+      __pyx_t_6 = 0;
+      __pyx_t_6 = __Pyx_PyObject_Call(__pyx_builtin_OSError, __pyx_t_5, NULL); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 137, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_6);
       __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
-      __Pyx_DECREF(__pyx_v_size_diff);
-      __pyx_v_size_diff = __pyx_t_1;
-      __pyx_t_1 = 0;
+      __Pyx_Raise(__pyx_t_6, 0, 0, 0);
+      __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+      __PYX_ERR(0, 137, __pyx_L1_error)
+
+      /* "pyblooming/cbitmap.pyx":134
+ * 
+ *             # Extend the file, this reads back as zeros
+ *             if extend_file(self.fileno, self.size, 1 if preallocate else 0) == -1:             # <<<<<<<<<<<<<<
+ *                 err = errno
+ *                 self.fileobj.close()
+ */
     }
 
-    /* "pyblooming/cbitmap.pyx":54
+    /* "pyblooming/cbitmap.pyx":140
  * 
  *             # Create the memory mapped file
  *             priv = 1 if private else 0             # <<<<<<<<<<<<<<
  *             self.mmap = <unsigned char*>mmap_file(self.fileno, self.size, priv)
  *             if self.mmap == NULL:
  */
-    __pyx_t_4 = __Pyx_PyObject_IsTrue(__pyx_v_private); if (unlikely(__pyx_t_4 < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 54; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    if (__pyx_t_4) {
+    __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_v_private); if (unlikely(__pyx_t_2 < 0)) __PYX_ERR(0, 140, __pyx_L1_error)
+    if (__pyx_t_2) {
       __pyx_t_8 = 1;
     } else {
       __pyx_t_8 = 0;
     }
     __pyx_v_priv = __pyx_t_8;
 
-    /* "pyblooming/cbitmap.pyx":55
+    /* "pyblooming/cbitmap.pyx":141
  *             # Create the memory mapped file
  *             priv = 1 if private else 0
  *             self.mmap = <unsigned char*>mmap_file(self.fileno, self.size, priv)             # <<<<<<<<<<<<<<
  *             if self.mmap == NULL:
  *                 self.fileobj.close()
  */
-    ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap = ((unsigned char *)mmap_file(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileno, ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->size, __pyx_v_priv));
+    __pyx_v_self->mmap = ((unsigned char *)mmap_file(__pyx_v_self->fileno, __pyx_v_self->size, __pyx_v_priv));
 
-    /* "pyblooming/cbitmap.pyx":56
+    /* "pyblooming/cbitmap.pyx":142
  *             priv = 1 if private else 0
  *             self.mmap = <unsigned char*>mmap_file(self.fileno, self.size, priv)
  *             if self.mmap == NULL:             # <<<<<<<<<<<<<<
  *                 self.fileobj.close()
  *                 raise OSError, "Failed to memory map the file!"
  */
-    __pyx_t_4 = (((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap == NULL);
-    if (__pyx_t_4) {
+    __pyx_t_2 = ((__pyx_v_self->mmap == NULL) != 0);
+    if (unlikely(__pyx_t_2)) {
 
-      /* "pyblooming/cbitmap.pyx":57
+      /* "pyblooming/cbitmap.pyx":143
  *             self.mmap = <unsigned char*>mmap_file(self.fileno, self.size, priv)
  *             if self.mmap == NULL:
  *                 self.fileobj.close()             # <<<<<<<<<<<<<<
  *                 raise OSError, "Failed to memory map the file!"
  * 
  */
-      __pyx_t_1 = PyObject_GetAttr(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj, __pyx_n_s__close); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 57; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(__pyx_t_1);
-      __pyx_t_5 = PyObject_Call(__pyx_t_1, ((PyObject *)__pyx_empty_tuple), NULL); if (unlikely(!__pyx_t_5)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 57; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
+      __pyx_t_5 = __Pyx_PyObject_GetAttrStr(__pyx_v_self->fileobj, __pyx_n_s_close); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 143, __pyx_L1_error)
       __Pyx_GOTREF(__pyx_t_5);
-      __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+      __pyx_t_1 = NULL;
+      if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_5))) {
+        __pyx_t_1 = PyMethod_GET_SELF(__pyx_t_5);
+        if (likely(__pyx_t_1)) {
+          PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_5);
+          __Pyx_INCREF(__pyx_t_1);
+          __Pyx_INCREF(function);
+          __Pyx_DECREF_SET(__pyx_t_5, function);
+        }
+      }
+      __pyx_t_6 = (__pyx_t_1) ? __Pyx_PyObject_CallOneArg(__pyx_t_5, __pyx_t_1) : __Pyx_PyObject_CallNoArg(__pyx_t_5);
+      __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
+      if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 143, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_6);
       __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+      __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
 
-      /* "pyblooming/cbitmap.pyx":58
+      /* "pyblooming/cbitmap.pyx":144
  *             if self.mmap == NULL:
  *                 self.fileobj.close()
  *                 raise OSError, "Failed to memory map the file!"             # <<<<<<<<<<<<<<
  * 
+ *         # Set the access pattern, and warm up the map
+ */
+      __Pyx_Raise(__pyx_builtin_OSError, __pyx_kp_s_Failed_to_memory_map_the_file, 0, 0);
+      __PYX_ERR(0, 144, __pyx_L1_error)
+
+      /* "pyblooming/cbitmap.pyx":142
+ *             priv = 1 if private else 0
+ *             self.mmap = <unsigned char*>mmap_file(self.fileno, self.size, priv)
+ *             if self.mmap == NULL:             # <<<<<<<<<<<<<<
+ *                 self.fileobj.close()
+ *                 raise OSError, "Failed to memory map the file!"
+ */
+    }
+  }
+  __pyx_L11:;
+
+  /* "pyblooming/cbitmap.pyx":147
+ * 
+ *         # Set the access pattern, and warm up the map
+ *         try:             # <<<<<<<<<<<<<<
+ *             self.advise(advice)
+ *         except:
+ */
+  {
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ExceptionSave(&__pyx_t_9, &__pyx_t_10, &__pyx_t_11);
+    __Pyx_XGOTREF(__pyx_t_9);
+    __Pyx_XGOTREF(__pyx_t_10);
+    __Pyx_XGOTREF(__pyx_t_11);
+    /*try:*/ {
+
+      /* "pyblooming/cbitmap.pyx":148
+ *         # Set the access pattern, and warm up the map
+ *         try:
+ *             self.advise(advice)             # <<<<<<<<<<<<<<
+ *         except:
+ *             self.close(flush=False)
+ */
+      __pyx_t_5 = __Pyx_PyObject_GetAttrStr(((PyObject *)__pyx_v_self), __pyx_n_s_advise); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 148, __pyx_L15_error)
+      __Pyx_GOTREF(__pyx_t_5);
+      __pyx_t_1 = NULL;
+      if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_5))) {
+        __pyx_t_1 = PyMethod_GET_SELF(__pyx_t_5);
+        if (likely(__pyx_t_1)) {
+          PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_5);
+          __Pyx_INCREF(__pyx_t_1);
+          __Pyx_INCREF(function);
+          __Pyx_DECREF_SET(__pyx_t_5, function);
+        }
+      }
+      __pyx_t_6 = (__pyx_t_1) ? __Pyx_PyObject_Call2Args(__pyx_t_5, __pyx_t_1, __pyx_v_advice) : __Pyx_PyObject_CallOneArg(__pyx_t_5, __pyx_v_advice);
+      __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
+      if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 148, __pyx_L15_error)
+      __Pyx_GOTREF(__pyx_t_6);
+      __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+      __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+
+      /* "pyblooming/cbitmap.pyx":147
+ * 
+ *         # Set the access pattern, and warm up the map
+ *         try:             # <<<<<<<<<<<<<<
+ *             self.advise(advice)
+ *         except:
+ */
+    }
+    __Pyx_XDECREF(__pyx_t_9); __pyx_t_9 = 0;
+    __Pyx_XDECREF(__pyx_t_10); __pyx_t_10 = 0;
+    __Pyx_XDECREF(__pyx_t_11); __pyx_t_11 = 0;
+    goto __pyx_L20_try_end;
+    __pyx_L15_error:;
+    __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __Pyx_XDECREF(__pyx_t_5); __pyx_t_5 = 0;
+    __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
+
+    /* "pyblooming/cbitmap.pyx":149
+ *         try:
+ *             self.advise(advice)
+ *         except:             # <<<<<<<<<<<<<<
+ *             self.close(flush=False)
+ *             raise
+ */
+    /*except:*/ {
+      __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__cinit__", __pyx_clineno, __pyx_lineno, __pyx_filename);
+      if (__Pyx_GetException(&__pyx_t_6, &__pyx_t_5, &__pyx_t_1) < 0) __PYX_ERR(0, 149, __pyx_L17_except_error)
+      __Pyx_GOTREF(__pyx_t_6);
+      __Pyx_GOTREF(__pyx_t_5);
+      __Pyx_GOTREF(__pyx_t_1);
+
+      /* "pyblooming/cbitmap.pyx":150
+ *             self.advise(advice)
+ *         except:
+ *             self.close(flush=False)             # <<<<<<<<<<<<<<
+ *             raise
+ *         if populate: self.prefetch()
+ */
+      __pyx_t_12 = __Pyx_PyObject_GetAttrStr(((PyObject *)__pyx_v_self), __pyx_n_s_close); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 150, __pyx_L17_except_error)
+      __Pyx_GOTREF(__pyx_t_12);
+      __pyx_t_13 = __Pyx_PyDict_NewPresized(1); if (unlikely(!__pyx_t_13)) __PYX_ERR(0, 150, __pyx_L17_except_error)
+      __Pyx_GOTREF(__pyx_t_13);
+      if (PyDict_SetItem(__pyx_t_13, __pyx_n_s_flush, Py_False) < 0) __PYX_ERR(0, 150, __pyx_L17_except_error)
+      __pyx_t_14 = __Pyx_PyObject_Call(__pyx_t_12, __pyx_empty_tuple, __pyx_t_13); if (unlikely(!__pyx_t_14)) __PYX_ERR(0, 150, __pyx_L17_except_error)
+      __Pyx_GOTREF(__pyx_t_14);
+      __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
+      __Pyx_DECREF(__pyx_t_13); __pyx_t_13 = 0;
+      __Pyx_DECREF(__pyx_t_14); __pyx_t_14 = 0;
+
+      /* "pyblooming/cbitmap.pyx":151
+ *         except:
+ *             self.close(flush=False)
+ *             raise             # <<<<<<<<<<<<<<
+ *         if populate: self.prefetch()
+ * 
+ */
+      __Pyx_GIVEREF(__pyx_t_6);
+      __Pyx_GIVEREF(__pyx_t_5);
+      __Pyx_XGIVEREF(__pyx_t_1);
+      __Pyx_ErrRestoreWithState(__pyx_t_6, __pyx_t_5, __pyx_t_1);
+      __pyx_t_6 = 0; __pyx_t_5 = 0; __pyx_t_1 = 0; 
+      __PYX_ERR(0, 151, __pyx_L17_except_error)
+    }
+    __pyx_L17_except_error:;
+
+    /* "pyblooming/cbitmap.pyx":147
+ * 
+ *         # Set the access pattern, and warm up the map
+ *         try:             # <<<<<<<<<<<<<<
+ *             self.advise(advice)
+ *         except:
+ */
+    __Pyx_XGIVEREF(__pyx_t_9);
+    __Pyx_XGIVEREF(__pyx_t_10);
+    __Pyx_XGIVEREF(__pyx_t_11);
+    __Pyx_ExceptionReset(__pyx_t_9, __pyx_t_10, __pyx_t_11);
+    goto __pyx_L1_error;
+    __pyx_L20_try_end:;
+  }
+
+  /* "pyblooming/cbitmap.pyx":152
+ *             self.close(flush=False)
+ *             raise
+ *         if populate: self.prefetch()             # <<<<<<<<<<<<<<
+ * 
  *     def __len__(self):
  */
-      __Pyx_Raise(__pyx_builtin_OSError, ((PyObject *)__pyx_kp_s_6), 0, 0);
-      {__pyx_filename = __pyx_f[0]; __pyx_lineno = 58; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      goto __pyx_L11;
+  __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_v_populate); if (unlikely(__pyx_t_2 < 0)) __PYX_ERR(0, 152, __pyx_L1_error)
+  if (__pyx_t_2) {
+    __pyx_t_5 = __Pyx_PyObject_GetAttrStr(((PyObject *)__pyx_v_self), __pyx_n_s_prefetch); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 152, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_5);
+    __pyx_t_6 = NULL;
+    if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_5))) {
+      __pyx_t_6 = PyMethod_GET_SELF(__pyx_t_5);
+      if (likely(__pyx_t_6)) {
+        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_5);
+        __Pyx_INCREF(__pyx_t_6);
+        __Pyx_INCREF(function);
+        __Pyx_DECREF_SET(__pyx_t_5, function);
+      }
     }
-    __pyx_L11:;
+    __pyx_t_1 = (__pyx_t_6) ? __Pyx_PyObject_CallOneArg(__pyx_t_5, __pyx_t_6) : __Pyx_PyObject_CallNoArg(__pyx_t_5);
+    __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
+    if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 152, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
   }
-  __pyx_L7:;
 
+  /* "pyblooming/cbitmap.pyx":76
+ *     CHUNK_SIZE = 1 << 20
+ * 
+ *     def __cinit__(self, length, filename=None, private=False, preallocate=False,             # <<<<<<<<<<<<<<
+ *                   advice="willneed", populate=False, atomic=False):
+ *         """
+ */
+
+  /* function exit code */
   __pyx_r = 0;
   goto __pyx_L0;
   __pyx_L1_error:;
   __Pyx_XDECREF(__pyx_t_1);
   __Pyx_XDECREF(__pyx_t_5);
-  __Pyx_XDECREF(__pyx_t_7);
-  __Pyx_XDECREF(__pyx_t_9);
-  __Pyx_XDECREF(__pyx_t_10);
-  __Pyx_XDECREF(__pyx_t_11);
+  __Pyx_XDECREF(__pyx_t_6);
+  __Pyx_XDECREF(__pyx_t_12);
+  __Pyx_XDECREF(__pyx_t_13);
+  __Pyx_XDECREF(__pyx_t_14);
   __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__cinit__", __pyx_clineno, __pyx_lineno, __pyx_filename);
   __pyx_r = -1;
   __pyx_L0:;
-  __Pyx_XDECREF(__pyx_v_size_diff);
+  __Pyx_XDECREF(__pyx_v_err);
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-/* "pyblooming/cbitmap.pyx":60
- *                 raise OSError, "Failed to memory map the file!"
+/* "pyblooming/cbitmap.pyx":154
+ *         if populate: self.prefetch()
  * 
  *     def __len__(self):             # <<<<<<<<<<<<<<
  *         "Returns the size of the Bitmap in bits"
  *         return 8 * self.size
  */
 
-static Py_ssize_t __pyx_pf_10pyblooming_7cbitmap_6Bitmap_1__len__(PyObject *__pyx_v_self); /*proto*/
-static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_1__len__[] = "Returns the size of the Bitmap in bits";
-struct wrapperbase __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_1__len__;
-static Py_ssize_t __pyx_pf_10pyblooming_7cbitmap_6Bitmap_1__len__(PyObject *__pyx_v_self) {
+/* Python wrapper */
+static Py_ssize_t __pyx_pw_10pyblooming_7cbitmap_6Bitmap_3__len__(PyObject *__pyx_v_self); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_2__len__[] = "Returns the size of the Bitmap in bits";
+#if CYTHON_UPDATE_DESCRIPTOR_DOC
+struct wrapperbase __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_2__len__;
+#endif
+static Py_ssize_t __pyx_pw_10pyblooming_7cbitmap_6Bitmap_3__len__(PyObject *__pyx_v_self) {
+  Py_ssize_t __pyx_r;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__len__ (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_2__len__(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static Py_ssize_t __pyx_pf_10pyblooming_7cbitmap_6Bitmap_2__len__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self) {
   Py_ssize_t __pyx_r;
   __Pyx_RefNannyDeclarations
-  __Pyx_RefNannySetupContext("__len__");
+  __Pyx_RefNannySetupContext("__len__", 0);
 
-  /* "pyblooming/cbitmap.pyx":62
+  /* "pyblooming/cbitmap.pyx":156
  *     def __len__(self):
  *         "Returns the size of the Bitmap in bits"
  *         return 8 * self.size             # <<<<<<<<<<<<<<
  * 
  *     @cython.boundscheck(False)
  */
-  __pyx_r = (8 * ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->size);
+  __pyx_r = (8 * __pyx_v_self->size);
   goto __pyx_L0;
 
-  __pyx_r = 0;
+  /* "pyblooming/cbitmap.pyx":154
+ *         if populate: self.prefetch()
+ * 
+ *     def __len__(self):             # <<<<<<<<<<<<<<
+ *         "Returns the size of the Bitmap in bits"
+ *         return 8 * self.size
+ */
+
+  /* function exit code */
   __pyx_L0:;
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-/* "pyblooming/cbitmap.pyx":66
+/* "pyblooming/cbitmap.pyx":160
  *     @cython.boundscheck(False)
  *     @cython.wraparound(False)
  *     def __getitem__(self, size_t idx):             # <<<<<<<<<<<<<<
@@ -996,20 +2767,22 @@ static Py_ssize_t __pyx_pf_10pyblooming_7cbitmap_6Bitmap_1__len__(PyObject *__py
  *         return <int> (self.mmap[idx >> 3] >> (7 - idx % 8)) & 0x1
  */
 
-static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_2__getitem__(PyObject *__pyx_v_self, PyObject *__pyx_arg_idx); /*proto*/
-static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_2__getitem__[] = "Gets the value of a specific bit. Must take an integer argument";
-struct wrapperbase __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_2__getitem__;
-static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_2__getitem__(PyObject *__pyx_v_self, PyObject *__pyx_arg_idx) {
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_5__getitem__(PyObject *__pyx_v_self, PyObject *__pyx_arg_idx); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_4__getitem__[] = "Gets the value of a specific bit. Must take an integer argument";
+#if CYTHON_UPDATE_DESCRIPTOR_DOC
+struct wrapperbase __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_4__getitem__;
+#endif
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_5__getitem__(PyObject *__pyx_v_self, PyObject *__pyx_arg_idx) {
   size_t __pyx_v_idx;
-  PyObject *__pyx_r = NULL;
-  __Pyx_RefNannyDeclarations
-  PyObject *__pyx_t_1 = NULL;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
-  __Pyx_RefNannySetupContext("__getitem__");
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__getitem__ (wrapper)", 0);
   assert(__pyx_arg_idx); {
-    __pyx_v_idx = __Pyx_PyInt_AsSize_t(__pyx_arg_idx); if (unlikely((__pyx_v_idx == (size_t)-1) && PyErr_Occurred())) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 66; __pyx_clineno = __LINE__; goto __pyx_L3_error;}
+    __pyx_v_idx = __Pyx_PyInt_As_size_t(__pyx_arg_idx); if (unlikely((__pyx_v_idx == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 160, __pyx_L3_error)
   }
   goto __pyx_L4_argument_unpacking_done;
   __pyx_L3_error:;
@@ -1017,8 +2790,23 @@ static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_2__getitem__(PyObject *_
   __Pyx_RefNannyFinishContext();
   return NULL;
   __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_4__getitem__(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), ((size_t)__pyx_v_idx));
 
-  /* "pyblooming/cbitmap.pyx":68
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_4__getitem__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t __pyx_v_idx) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("__getitem__", 0);
+
+  /* "pyblooming/cbitmap.pyx":162
  *     def __getitem__(self, size_t idx):
  *         "Gets the value of a specific bit. Must take an integer argument"
  *         return <int> (self.mmap[idx >> 3] >> (7 - idx % 8)) & 0x1             # <<<<<<<<<<<<<<
@@ -1026,14 +2814,21 @@ static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_2__getitem__(PyObject *_
  *     @cython.boundscheck(False)
  */
   __Pyx_XDECREF(__pyx_r);
-  __pyx_t_1 = PyInt_FromLong((((int)((((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap[(__pyx_v_idx >> 3)]) >> (7 - (__pyx_v_idx % 8)))) & 0x1)); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 68; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
+  __pyx_t_1 = __Pyx_PyInt_From_long((((int)((__pyx_v_self->mmap[(__pyx_v_idx >> 3)]) >> (7 - (__pyx_v_idx % 8)))) & 0x1)); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 162, __pyx_L1_error)
   __Pyx_GOTREF(__pyx_t_1);
   __pyx_r = __pyx_t_1;
   __pyx_t_1 = 0;
   goto __pyx_L0;
 
-  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
-  goto __pyx_L0;
+  /* "pyblooming/cbitmap.pyx":160
+ *     @cython.boundscheck(False)
+ *     @cython.wraparound(False)
+ *     def __getitem__(self, size_t idx):             # <<<<<<<<<<<<<<
+ *         "Gets the value of a specific bit. Must take an integer argument"
+ *         return <int> (self.mmap[idx >> 3] >> (7 - idx % 8)) & 0x1
+ */
+
+  /* function exit code */
   __pyx_L1_error:;
   __Pyx_XDECREF(__pyx_t_1);
   __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__getitem__", __pyx_clineno, __pyx_lineno, __pyx_filename);
@@ -1044,7 +2839,7 @@ static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_2__getitem__(PyObject *_
   return __pyx_r;
 }
 
-/* "pyblooming/cbitmap.pyx":72
+/* "pyblooming/cbitmap.pyx":166
  *     @cython.boundscheck(False)
  *     @cython.wraparound(False)
  *     def __setitem__(self, size_t idx, unsigned int val):             # <<<<<<<<<<<<<<
@@ -1052,23 +2847,26 @@ static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_2__getitem__(PyObject *_
  *         Sets the value of a specific bit. The index must be an integer,
  */
 
-static int __pyx_pf_10pyblooming_7cbitmap_6Bitmap_3__setitem__(PyObject *__pyx_v_self, PyObject *__pyx_arg_idx, PyObject *__pyx_arg_val); /*proto*/
-static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_3__setitem__[] = "\n        Sets the value of a specific bit. The index must be an integer,\n        but if val evaluates to True, the bit is set to 1, else 0.\n        ";
-struct wrapperbase __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_3__setitem__;
-static int __pyx_pf_10pyblooming_7cbitmap_6Bitmap_3__setitem__(PyObject *__pyx_v_self, PyObject *__pyx_arg_idx, PyObject *__pyx_arg_val) {
+/* Python wrapper */
+static int __pyx_pw_10pyblooming_7cbitmap_6Bitmap_7__setitem__(PyObject *__pyx_v_self, PyObject *__pyx_arg_idx, PyObject *__pyx_arg_val); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_6__setitem__[] = "\n        Sets the value of a specific bit. The index must be an integer,\n        but if val evaluates to True, the bit is set to 1, else 0.\n        ";
+#if CYTHON_UPDATE_DESCRIPTOR_DOC
+struct wrapperbase __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_6__setitem__;
+#endif
+static int __pyx_pw_10pyblooming_7cbitmap_6Bitmap_7__setitem__(PyObject *__pyx_v_self, PyObject *__pyx_arg_idx, PyObject *__pyx_arg_val) {
   size_t __pyx_v_idx;
   unsigned int __pyx_v_val;
-  int __pyx_r;
-  __Pyx_RefNannyDeclarations
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
-  __Pyx_RefNannySetupContext("__setitem__");
+  int __pyx_r;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__setitem__ (wrapper)", 0);
   assert(__pyx_arg_idx); {
-    __pyx_v_idx = __Pyx_PyInt_AsSize_t(__pyx_arg_idx); if (unlikely((__pyx_v_idx == (size_t)-1) && PyErr_Occurred())) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 72; __pyx_clineno = __LINE__; goto __pyx_L3_error;}
+    __pyx_v_idx = __Pyx_PyInt_As_size_t(__pyx_arg_idx); if (unlikely((__pyx_v_idx == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 166, __pyx_L3_error)
   }
   assert(__pyx_arg_val); {
-    __pyx_v_val = __Pyx_PyInt_AsUnsignedInt(__pyx_arg_val); if (unlikely((__pyx_v_val == (unsigned int)-1) && PyErr_Occurred())) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 72; __pyx_clineno = __LINE__; goto __pyx_L3_error;}
+    __pyx_v_val = __Pyx_PyInt_As_unsigned_int(__pyx_arg_val); if (unlikely((__pyx_v_val == (unsigned int)-1) && PyErr_Occurred())) __PYX_ERR(0, 166, __pyx_L3_error)
   }
   goto __pyx_L4_argument_unpacking_done;
   __pyx_L3_error:;
@@ -1076,1421 +2874,8201 @@ static int __pyx_pf_10pyblooming_7cbitmap_6Bitmap_3__setitem__(PyObject *__pyx_v
   __Pyx_RefNannyFinishContext();
   return -1;
   __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_6__setitem__(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), ((size_t)__pyx_v_idx), ((unsigned int)__pyx_v_val));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static int __pyx_pf_10pyblooming_7cbitmap_6Bitmap_6__setitem__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t __pyx_v_idx, unsigned int __pyx_v_val) {
+  unsigned char __pyx_v_mask;
+  int __pyx_r;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  __Pyx_RefNannySetupContext("__setitem__", 0);
 
-  /* "pyblooming/cbitmap.pyx":77
+  /* "pyblooming/cbitmap.pyx":171
  *         but if val evaluates to True, the bit is set to 1, else 0.
  *         """
- *         if val:             # <<<<<<<<<<<<<<
- *             self.mmap[idx >> 3] = self.mmap[idx >> 3] | 1 << (7 - idx % 8)
- *         else:
+ *         cdef unsigned char mask = 1 << (7 - idx % 8)             # <<<<<<<<<<<<<<
+ *         if self.atomic:
+ *             if val:
  */
-  if (__pyx_v_val) {
+  __pyx_v_mask = (1 << (7 - (__pyx_v_idx % 8)));
 
-    /* "pyblooming/cbitmap.pyx":78
+  /* "pyblooming/cbitmap.pyx":172
  *         """
- *         if val:
- *             self.mmap[idx >> 3] = self.mmap[idx >> 3] | 1 << (7 - idx % 8)             # <<<<<<<<<<<<<<
+ *         cdef unsigned char mask = 1 << (7 - idx % 8)
+ *         if self.atomic:             # <<<<<<<<<<<<<<
+ *             if val:
+ *                 __atomic_fetch_or(&self.mmap[idx >> 3], mask, __ATOMIC_RELAXED)
+ */
+  __pyx_t_1 = (__pyx_v_self->atomic != 0);
+  if (__pyx_t_1) {
+
+    /* "pyblooming/cbitmap.pyx":173
+ *         cdef unsigned char mask = 1 << (7 - idx % 8)
+ *         if self.atomic:
+ *             if val:             # <<<<<<<<<<<<<<
+ *                 __atomic_fetch_or(&self.mmap[idx >> 3], mask, __ATOMIC_RELAXED)
+ *             else:
+ */
+    __pyx_t_1 = (__pyx_v_val != 0);
+    if (__pyx_t_1) {
+
+      /* "pyblooming/cbitmap.pyx":174
+ *         if self.atomic:
+ *             if val:
+ *                 __atomic_fetch_or(&self.mmap[idx >> 3], mask, __ATOMIC_RELAXED)             # <<<<<<<<<<<<<<
+ *             else:
+ *                 __atomic_fetch_and(&self.mmap[idx >> 3], ~mask, __ATOMIC_RELAXED)
+ */
+      (void)(__atomic_fetch_or((&(__pyx_v_self->mmap[(__pyx_v_idx >> 3)])), __pyx_v_mask, __ATOMIC_RELAXED));
+
+      /* "pyblooming/cbitmap.pyx":173
+ *         cdef unsigned char mask = 1 << (7 - idx % 8)
+ *         if self.atomic:
+ *             if val:             # <<<<<<<<<<<<<<
+ *                 __atomic_fetch_or(&self.mmap[idx >> 3], mask, __ATOMIC_RELAXED)
+ *             else:
+ */
+      goto __pyx_L4;
+    }
+
+    /* "pyblooming/cbitmap.pyx":176
+ *                 __atomic_fetch_or(&self.mmap[idx >> 3], mask, __ATOMIC_RELAXED)
+ *             else:
+ *                 __atomic_fetch_and(&self.mmap[idx >> 3], ~mask, __ATOMIC_RELAXED)             # <<<<<<<<<<<<<<
+ *         elif val:
+ *             self.mmap[idx >> 3] = self.mmap[idx >> 3] | mask
+ */
+    /*else*/ {
+      (void)(__atomic_fetch_and((&(__pyx_v_self->mmap[(__pyx_v_idx >> 3)])), (~__pyx_v_mask), __ATOMIC_RELAXED));
+    }
+    __pyx_L4:;
+
+    /* "pyblooming/cbitmap.pyx":172
+ *         """
+ *         cdef unsigned char mask = 1 << (7 - idx % 8)
+ *         if self.atomic:             # <<<<<<<<<<<<<<
+ *             if val:
+ *                 __atomic_fetch_or(&self.mmap[idx >> 3], mask, __ATOMIC_RELAXED)
+ */
+    goto __pyx_L3;
+  }
+
+  /* "pyblooming/cbitmap.pyx":177
+ *             else:
+ *                 __atomic_fetch_and(&self.mmap[idx >> 3], ~mask, __ATOMIC_RELAXED)
+ *         elif val:             # <<<<<<<<<<<<<<
+ *             self.mmap[idx >> 3] = self.mmap[idx >> 3] | mask
+ *         else:
+ */
+  __pyx_t_1 = (__pyx_v_val != 0);
+  if (__pyx_t_1) {
+
+    /* "pyblooming/cbitmap.pyx":178
+ *                 __atomic_fetch_and(&self.mmap[idx >> 3], ~mask, __ATOMIC_RELAXED)
+ *         elif val:
+ *             self.mmap[idx >> 3] = self.mmap[idx >> 3] | mask             # <<<<<<<<<<<<<<
+ *         else:
+ *             self.mmap[idx >> 3] = self.mmap[idx >> 3] & ~mask
+ */
+    (__pyx_v_self->mmap[(__pyx_v_idx >> 3)]) = ((__pyx_v_self->mmap[(__pyx_v_idx >> 3)]) | __pyx_v_mask);
+
+    /* "pyblooming/cbitmap.pyx":177
+ *             else:
+ *                 __atomic_fetch_and(&self.mmap[idx >> 3], ~mask, __ATOMIC_RELAXED)
+ *         elif val:             # <<<<<<<<<<<<<<
+ *             self.mmap[idx >> 3] = self.mmap[idx >> 3] | mask
  *         else:
- *             self.mmap[idx >> 3] = self.mmap[idx >> 3] & ~(1 << (7 - idx % 8))
  */
-    (((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap[(__pyx_v_idx >> 3)]) = ((((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap[(__pyx_v_idx >> 3)]) | (1 << (7 - (__pyx_v_idx % 8))));
-    goto __pyx_L5;
+    goto __pyx_L3;
   }
-  /*else*/ {
 
-    /* "pyblooming/cbitmap.pyx":80
- *             self.mmap[idx >> 3] = self.mmap[idx >> 3] | 1 << (7 - idx % 8)
+  /* "pyblooming/cbitmap.pyx":180
+ *             self.mmap[idx >> 3] = self.mmap[idx >> 3] | mask
  *         else:
- *             self.mmap[idx >> 3] = self.mmap[idx >> 3] & ~(1 << (7 - idx % 8))             # <<<<<<<<<<<<<<
+ *             self.mmap[idx >> 3] = self.mmap[idx >> 3] & ~mask             # <<<<<<<<<<<<<<
+ *         self._mark_dirty(idx >> 3, (idx >> 3) + 1)
  * 
- *     def flush(self):
  */
-    (((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap[(__pyx_v_idx >> 3)]) = ((((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap[(__pyx_v_idx >> 3)]) & (~(1 << (7 - (__pyx_v_idx % 8)))));
+  /*else*/ {
+    (__pyx_v_self->mmap[(__pyx_v_idx >> 3)]) = ((__pyx_v_self->mmap[(__pyx_v_idx >> 3)]) & (~__pyx_v_mask));
   }
-  __pyx_L5:;
+  __pyx_L3:;
+
+  /* "pyblooming/cbitmap.pyx":181
+ *         else:
+ *             self.mmap[idx >> 3] = self.mmap[idx >> 3] & ~mask
+ *         self._mark_dirty(idx >> 3, (idx >> 3) + 1)             # <<<<<<<<<<<<<<
+ * 
+ *     def __dealloc__(self):
+ */
+  ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_mark_dirty(__pyx_v_self, (__pyx_v_idx >> 3), ((__pyx_v_idx >> 3) + 1));
+
+  /* "pyblooming/cbitmap.pyx":166
+ *     @cython.boundscheck(False)
+ *     @cython.wraparound(False)
+ *     def __setitem__(self, size_t idx, unsigned int val):             # <<<<<<<<<<<<<<
+ *         """
+ *         Sets the value of a specific bit. The index must be an integer,
+ */
 
+  /* function exit code */
   __pyx_r = 0;
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-/* "pyblooming/cbitmap.pyx":82
- *             self.mmap[idx >> 3] = self.mmap[idx >> 3] & ~(1 << (7 - idx % 8))
+/* "pyblooming/cbitmap.pyx":183
+ *         self._mark_dirty(idx >> 3, (idx >> 3) + 1)
  * 
- *     def flush(self):             # <<<<<<<<<<<<<<
- *         "Flushes the contents of the Bitmap to disk."
- *         cdef int flushres = 0
+ *     def __dealloc__(self):             # <<<<<<<<<<<<<<
+ *         "Cleanup"
+ *         stdlib.free(self.indices)
  */
 
-static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_4flush(PyObject *__pyx_v_self, CYTHON_UNUSED PyObject *unused); /*proto*/
-static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_4flush[] = "Flushes the contents of the Bitmap to disk.";
-static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_4flush(PyObject *__pyx_v_self, CYTHON_UNUSED PyObject *unused) {
-  int __pyx_v_flushres;
-  PyObject *__pyx_r = NULL;
+/* Python wrapper */
+static void __pyx_pw_10pyblooming_7cbitmap_6Bitmap_9__dealloc__(PyObject *__pyx_v_self); /*proto*/
+static void __pyx_pw_10pyblooming_7cbitmap_6Bitmap_9__dealloc__(PyObject *__pyx_v_self) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__dealloc__ (wrapper)", 0);
+  __pyx_pf_10pyblooming_7cbitmap_6Bitmap_8__dealloc__(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+}
+
+static void __pyx_pf_10pyblooming_7cbitmap_6Bitmap_8__dealloc__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__dealloc__", 0);
+
+  /* "pyblooming/cbitmap.pyx":185
+ *     def __dealloc__(self):
+ *         "Cleanup"
+ *         stdlib.free(self.indices)             # <<<<<<<<<<<<<<
+ *         stdlib.free(self.dirty)
+ * 
+ */
+  free(__pyx_v_self->indices);
+
+  /* "pyblooming/cbitmap.pyx":186
+ *         "Cleanup"
+ *         stdlib.free(self.indices)
+ *         stdlib.free(self.dirty)             # <<<<<<<<<<<<<<
+ * 
+ *     @cython.boundscheck(False)
+ */
+  free(__pyx_v_self->dirty);
+
+  /* "pyblooming/cbitmap.pyx":183
+ *         self._mark_dirty(idx >> 3, (idx >> 3) + 1)
+ * 
+ *     def __dealloc__(self):             # <<<<<<<<<<<<<<
+ *         "Cleanup"
+ *         stdlib.free(self.indices)
+ */
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+}
+
+/* "pyblooming/cbitmap.pyx":190
+ *     @cython.boundscheck(False)
+ *     @cython.wraparound(False)
+ *     cdef int set_bit_array(self, size_t* indices, size_t n) except -1:             # <<<<<<<<<<<<<<
+ *         """
+ *         Sets the value of many bits to 1, given a C array of indexes.
+ */
+
+static int __pyx_f_10pyblooming_7cbitmap_6Bitmap_set_bit_array(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t *__pyx_v_indices, size_t __pyx_v_n) {
+  int __pyx_r;
   __Pyx_RefNannyDeclarations
   int __pyx_t_1;
-  PyObject *__pyx_t_2 = NULL;
-  PyObject *__pyx_t_3 = NULL;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
-  __Pyx_RefNannySetupContext("flush");
+  __Pyx_RefNannySetupContext("set_bit_array", 0);
 
-  /* "pyblooming/cbitmap.pyx":84
- *     def flush(self):
- *         "Flushes the contents of the Bitmap to disk."
- *         cdef int flushres = 0             # <<<<<<<<<<<<<<
- *         if self.mmap:
- *             with nogil:
+  /* "pyblooming/cbitmap.pyx":196
+ *         the indexes are usually in a buffer shared by every thread.
+ *         """
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"             # <<<<<<<<<<<<<<
+ *         self._set_array(indices, n)
+ *         return 0
  */
-  __pyx_v_flushres = 0;
+  __pyx_t_1 = ((__pyx_v_self->mmap == NULL) != 0);
+  if (unlikely(__pyx_t_1)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bitmap_is_closed, 0, 0);
+    __PYX_ERR(0, 196, __pyx_L1_error)
+  }
 
-  /* "pyblooming/cbitmap.pyx":85
- *         "Flushes the contents of the Bitmap to disk."
- *         cdef int flushres = 0
- *         if self.mmap:             # <<<<<<<<<<<<<<
- *             with nogil:
- *                 flushres = flush(self.fileno, <char*>self.mmap, self.size)
+  /* "pyblooming/cbitmap.pyx":197
+ *         """
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         self._set_array(indices, n)             # <<<<<<<<<<<<<<
+ *         return 0
+ * 
  */
-  __pyx_t_1 = (((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap != 0);
-  if (__pyx_t_1) {
+  ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_set_array(__pyx_v_self, __pyx_v_indices, __pyx_v_n);
 
-    /* "pyblooming/cbitmap.pyx":86
- *         cdef int flushres = 0
- *         if self.mmap:
- *             with nogil:             # <<<<<<<<<<<<<<
- *                 flushres = flush(self.fileno, <char*>self.mmap, self.size)
- *             if flushres == -1:
+  /* "pyblooming/cbitmap.pyx":198
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         self._set_array(indices, n)
+ *         return 0             # <<<<<<<<<<<<<<
+ * 
+ *     @cython.boundscheck(False)
  */
-    {
-        #ifdef WITH_THREAD
-        PyThreadState *_save = NULL;
-        #endif
-        Py_UNBLOCK_THREADS
-        /*try:*/ {
+  __pyx_r = 0;
+  goto __pyx_L0;
 
-          /* "pyblooming/cbitmap.pyx":87
- *         if self.mmap:
- *             with nogil:
- *                 flushres = flush(self.fileno, <char*>self.mmap, self.size)             # <<<<<<<<<<<<<<
- *             if flushres == -1:
- *                 raise OSError, "Failed to flush the buffers!"
+  /* "pyblooming/cbitmap.pyx":190
+ *     @cython.boundscheck(False)
+ *     @cython.wraparound(False)
+ *     cdef int set_bit_array(self, size_t* indices, size_t n) except -1:             # <<<<<<<<<<<<<<
+ *         """
+ *         Sets the value of many bits to 1, given a C array of indexes.
  */
-          __pyx_v_flushres = flush(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileno, ((char *)((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap), ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->size);
-        }
 
-        /* "pyblooming/cbitmap.pyx":86
- *         cdef int flushres = 0
- *         if self.mmap:
- *             with nogil:             # <<<<<<<<<<<<<<
- *                 flushres = flush(self.fileno, <char*>self.mmap, self.size)
- *             if flushres == -1:
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.set_bit_array", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = -1;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":202
+ *     @cython.boundscheck(False)
+ *     @cython.wraparound(False)
+ *     cdef void _set_array(self, size_t* indices, size_t n) nogil:             # <<<<<<<<<<<<<<
+ *         """
+ *         Sets the value of many bits to 1, given a C array of indexes.
  */
-        /*finally:*/ {
-          Py_BLOCK_THREADS
-        }
-    }
 
-    /* "pyblooming/cbitmap.pyx":88
- *             with nogil:
- *                 flushres = flush(self.fileno, <char*>self.mmap, self.size)
- *             if flushres == -1:             # <<<<<<<<<<<<<<
- *                 raise OSError, "Failed to flush the buffers!"
- *         if self.fileobj:
+static void __pyx_f_10pyblooming_7cbitmap_6Bitmap__set_array(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t *__pyx_v_indices, size_t __pyx_v_n) {
+  size_t __pyx_v_i;
+  size_t __pyx_v_idx;
+  size_t __pyx_v_page;
+  size_t __pyx_v_shift;
+  int __pyx_t_1;
+  size_t __pyx_t_2;
+  size_t __pyx_t_3;
+  size_t __pyx_t_4;
+
+  /* "pyblooming/cbitmap.pyx":210
+ *         """
+ *         cdef size_t i, idx, page
+ *         cdef size_t shift = self.page_shift + 3             # <<<<<<<<<<<<<<
+ *         if self.atomic:
+ *             for i in range(n):
  */
-    __pyx_t_1 = (__pyx_v_flushres == -1);
-    if (__pyx_t_1) {
+  __pyx_v_shift = (__pyx_v_self->page_shift + 3);
+
+  /* "pyblooming/cbitmap.pyx":211
+ *         cdef size_t i, idx, page
+ *         cdef size_t shift = self.page_shift + 3
+ *         if self.atomic:             # <<<<<<<<<<<<<<
+ *             for i in range(n):
+ *                 idx = indices[i]
+ */
+  __pyx_t_1 = (__pyx_v_self->atomic != 0);
+  if (__pyx_t_1) {
 
-      /* "pyblooming/cbitmap.pyx":89
- *                 flushres = flush(self.fileno, <char*>self.mmap, self.size)
- *             if flushres == -1:
- *                 raise OSError, "Failed to flush the buffers!"             # <<<<<<<<<<<<<<
- *         if self.fileobj:
- *             self.fileobj.flush()
+    /* "pyblooming/cbitmap.pyx":212
+ *         cdef size_t shift = self.page_shift + 3
+ *         if self.atomic:
+ *             for i in range(n):             # <<<<<<<<<<<<<<
+ *                 idx = indices[i]
+ *                 __atomic_fetch_or(&self.mmap[idx >> 3], 1 << (7 - idx % 8), __ATOMIC_RELAXED)
+ */
+    __pyx_t_2 = __pyx_v_n;
+    __pyx_t_3 = __pyx_t_2;
+    for (__pyx_t_4 = 0; __pyx_t_4 < __pyx_t_3; __pyx_t_4+=1) {
+      __pyx_v_i = __pyx_t_4;
+
+      /* "pyblooming/cbitmap.pyx":213
+ *         if self.atomic:
+ *             for i in range(n):
+ *                 idx = indices[i]             # <<<<<<<<<<<<<<
+ *                 __atomic_fetch_or(&self.mmap[idx >> 3], 1 << (7 - idx % 8), __ATOMIC_RELAXED)
+ *                 page = idx >> shift
+ */
+      __pyx_v_idx = (__pyx_v_indices[__pyx_v_i]);
+
+      /* "pyblooming/cbitmap.pyx":214
+ *             for i in range(n):
+ *                 idx = indices[i]
+ *                 __atomic_fetch_or(&self.mmap[idx >> 3], 1 << (7 - idx % 8), __ATOMIC_RELAXED)             # <<<<<<<<<<<<<<
+ *                 page = idx >> shift
+ *                 __atomic_fetch_or(&self.dirty[page >> 3], 1 << (page & 7), __ATOMIC_RELAXED)
  */
-      __Pyx_Raise(__pyx_builtin_OSError, ((PyObject *)__pyx_kp_s_7), 0, 0);
-      {__pyx_filename = __pyx_f[0]; __pyx_lineno = 89; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      goto __pyx_L9;
+      (void)(__atomic_fetch_or((&(__pyx_v_self->mmap[(__pyx_v_idx >> 3)])), (1 << (7 - (__pyx_v_idx % 8))), __ATOMIC_RELAXED));
+
+      /* "pyblooming/cbitmap.pyx":215
+ *                 idx = indices[i]
+ *                 __atomic_fetch_or(&self.mmap[idx >> 3], 1 << (7 - idx % 8), __ATOMIC_RELAXED)
+ *                 page = idx >> shift             # <<<<<<<<<<<<<<
+ *                 __atomic_fetch_or(&self.dirty[page >> 3], 1 << (page & 7), __ATOMIC_RELAXED)
+ *             return
+ */
+      __pyx_v_page = (__pyx_v_idx >> __pyx_v_shift);
+
+      /* "pyblooming/cbitmap.pyx":216
+ *                 __atomic_fetch_or(&self.mmap[idx >> 3], 1 << (7 - idx % 8), __ATOMIC_RELAXED)
+ *                 page = idx >> shift
+ *                 __atomic_fetch_or(&self.dirty[page >> 3], 1 << (page & 7), __ATOMIC_RELAXED)             # <<<<<<<<<<<<<<
+ *             return
+ *         for i in range(n):
+ */
+      (void)(__atomic_fetch_or((&(__pyx_v_self->dirty[(__pyx_v_page >> 3)])), (1 << (__pyx_v_page & 7)), __ATOMIC_RELAXED));
     }
-    __pyx_L9:;
-    goto __pyx_L5;
+
+    /* "pyblooming/cbitmap.pyx":217
+ *                 page = idx >> shift
+ *                 __atomic_fetch_or(&self.dirty[page >> 3], 1 << (page & 7), __ATOMIC_RELAXED)
+ *             return             # <<<<<<<<<<<<<<
+ *         for i in range(n):
+ *             idx = indices[i]
+ */
+    goto __pyx_L0;
+
+    /* "pyblooming/cbitmap.pyx":211
+ *         cdef size_t i, idx, page
+ *         cdef size_t shift = self.page_shift + 3
+ *         if self.atomic:             # <<<<<<<<<<<<<<
+ *             for i in range(n):
+ *                 idx = indices[i]
+ */
   }
-  __pyx_L5:;
 
-  /* "pyblooming/cbitmap.pyx":90
- *             if flushres == -1:
- *                 raise OSError, "Failed to flush the buffers!"
- *         if self.fileobj:             # <<<<<<<<<<<<<<
- *             self.fileobj.flush()
+  /* "pyblooming/cbitmap.pyx":218
+ *                 __atomic_fetch_or(&self.dirty[page >> 3], 1 << (page & 7), __ATOMIC_RELAXED)
+ *             return
+ *         for i in range(n):             # <<<<<<<<<<<<<<
+ *             idx = indices[i]
+ *             self.mmap[idx >> 3] = self.mmap[idx >> 3] | 1 << (7 - idx % 8)
+ */
+  __pyx_t_2 = __pyx_v_n;
+  __pyx_t_3 = __pyx_t_2;
+  for (__pyx_t_4 = 0; __pyx_t_4 < __pyx_t_3; __pyx_t_4+=1) {
+    __pyx_v_i = __pyx_t_4;
+
+    /* "pyblooming/cbitmap.pyx":219
+ *             return
+ *         for i in range(n):
+ *             idx = indices[i]             # <<<<<<<<<<<<<<
+ *             self.mmap[idx >> 3] = self.mmap[idx >> 3] | 1 << (7 - idx % 8)
+ *             page = idx >> shift
+ */
+    __pyx_v_idx = (__pyx_v_indices[__pyx_v_i]);
+
+    /* "pyblooming/cbitmap.pyx":220
+ *         for i in range(n):
+ *             idx = indices[i]
+ *             self.mmap[idx >> 3] = self.mmap[idx >> 3] | 1 << (7 - idx % 8)             # <<<<<<<<<<<<<<
+ *             page = idx >> shift
+ *             self.dirty[page >> 3] = self.dirty[page >> 3] | 1 << (page & 7)
+ */
+    (__pyx_v_self->mmap[(__pyx_v_idx >> 3)]) = ((__pyx_v_self->mmap[(__pyx_v_idx >> 3)]) | (1 << (7 - (__pyx_v_idx % 8))));
+
+    /* "pyblooming/cbitmap.pyx":221
+ *             idx = indices[i]
+ *             self.mmap[idx >> 3] = self.mmap[idx >> 3] | 1 << (7 - idx % 8)
+ *             page = idx >> shift             # <<<<<<<<<<<<<<
+ *             self.dirty[page >> 3] = self.dirty[page >> 3] | 1 << (page & 7)
  * 
  */
-  __pyx_t_1 = __Pyx_PyObject_IsTrue(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj); if (unlikely(__pyx_t_1 < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 90; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  if (__pyx_t_1) {
+    __pyx_v_page = (__pyx_v_idx >> __pyx_v_shift);
 
-    /* "pyblooming/cbitmap.pyx":91
- *                 raise OSError, "Failed to flush the buffers!"
- *         if self.fileobj:
- *             self.fileobj.flush()             # <<<<<<<<<<<<<<
+    /* "pyblooming/cbitmap.pyx":222
+ *             self.mmap[idx >> 3] = self.mmap[idx >> 3] | 1 << (7 - idx % 8)
+ *             page = idx >> shift
+ *             self.dirty[page >> 3] = self.dirty[page >> 3] | 1 << (page & 7)             # <<<<<<<<<<<<<<
  * 
- *     def close(self, flush=True):
+ *     @cython.boundscheck(False)
  */
-    __pyx_t_2 = PyObject_GetAttr(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj, __pyx_n_s__flush); if (unlikely(!__pyx_t_2)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 91; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(__pyx_t_2);
-    __pyx_t_3 = PyObject_Call(__pyx_t_2, ((PyObject *)__pyx_empty_tuple), NULL); if (unlikely(!__pyx_t_3)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 91; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(__pyx_t_3);
-    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-    goto __pyx_L10;
+    (__pyx_v_self->dirty[(__pyx_v_page >> 3)]) = ((__pyx_v_self->dirty[(__pyx_v_page >> 3)]) | (1 << (__pyx_v_page & 7)));
   }
-  __pyx_L10:;
 
-  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
-  goto __pyx_L0;
-  __pyx_L1_error:;
-  __Pyx_XDECREF(__pyx_t_2);
-  __Pyx_XDECREF(__pyx_t_3);
-  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.flush", __pyx_clineno, __pyx_lineno, __pyx_filename);
-  __pyx_r = NULL;
+  /* "pyblooming/cbitmap.pyx":202
+ *     @cython.boundscheck(False)
+ *     @cython.wraparound(False)
+ *     cdef void _set_array(self, size_t* indices, size_t n) nogil:             # <<<<<<<<<<<<<<
+ *         """
+ *         Sets the value of many bits to 1, given a C array of indexes.
+ */
+
+  /* function exit code */
   __pyx_L0:;
-  __Pyx_XGIVEREF(__pyx_r);
-  __Pyx_RefNannyFinishContext();
-  return __pyx_r;
 }
 
-/* "pyblooming/cbitmap.pyx":93
- *             self.fileobj.flush()
- * 
- *     def close(self, flush=True):             # <<<<<<<<<<<<<<
- *         "Closes the Bitmap, flushing the data if requried."
- *         # Safety first!
+/* "pyblooming/cbitmap.pyx":226
+ *     @cython.boundscheck(False)
+ *     @cython.wraparound(False)
+ *     cdef int test_bit_array(self, size_t* indices, size_t n) except -1:             # <<<<<<<<<<<<<<
+ *         """
+ *         Checks if all the bits are set, given a C array of indexes.
  */
 
-static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_5close(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
-static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_5close[] = "Closes the Bitmap, flushing the data if requried.";
-static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_5close(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
-  PyObject *__pyx_v_flush = 0;
-  PyObject *__pyx_r = NULL;
+static int __pyx_f_10pyblooming_7cbitmap_6Bitmap_test_bit_array(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t *__pyx_v_indices, size_t __pyx_v_n) {
+  int __pyx_r;
   __Pyx_RefNannyDeclarations
   int __pyx_t_1;
-  PyObject *__pyx_t_2 = NULL;
-  PyObject *__pyx_t_3 = NULL;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
-  static PyObject **__pyx_pyargnames[] = {&__pyx_n_s__flush,0};
-  __Pyx_RefNannySetupContext("close");
-  if (unlikely(__pyx_kwds)) {
-    Py_ssize_t kw_args = PyDict_Size(__pyx_kwds);
-    PyObject* values[1] = {0};
-    values[0] = __pyx_k_8;
-    switch (PyTuple_GET_SIZE(__pyx_args)) {
-      case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
-      case  0: break;
-      default: goto __pyx_L5_argtuple_error;
-    }
-    switch (PyTuple_GET_SIZE(__pyx_args)) {
-      case  0:
-      if (kw_args > 0) {
-        PyObject* value = PyDict_GetItem(__pyx_kwds, __pyx_n_s__flush);
-        if (value) { values[0] = value; kw_args--; }
-      }
-    }
-    if (unlikely(kw_args > 0)) {
-      if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, PyTuple_GET_SIZE(__pyx_args), "close") < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 93; __pyx_clineno = __LINE__; goto __pyx_L3_error;}
-    }
-    __pyx_v_flush = values[0];
-  } else {
-    __pyx_v_flush = __pyx_k_8;
-    switch (PyTuple_GET_SIZE(__pyx_args)) {
-      case  1: __pyx_v_flush = PyTuple_GET_ITEM(__pyx_args, 0);
-      case  0: break;
-      default: goto __pyx_L5_argtuple_error;
-    }
-  }
-  goto __pyx_L4_argument_unpacking_done;
-  __pyx_L5_argtuple_error:;
-  __Pyx_RaiseArgtupleInvalid("close", 0, 0, 1, PyTuple_GET_SIZE(__pyx_args)); {__pyx_filename = __pyx_f[0]; __pyx_lineno = 93; __pyx_clineno = __LINE__; goto __pyx_L3_error;}
-  __pyx_L3_error:;
-  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.close", __pyx_clineno, __pyx_lineno, __pyx_filename);
-  __Pyx_RefNannyFinishContext();
-  return NULL;
-  __pyx_L4_argument_unpacking_done:;
+  __Pyx_RefNannySetupContext("test_bit_array", 0);
 
-  /* "pyblooming/cbitmap.pyx":96
- *         "Closes the Bitmap, flushing the data if requried."
- *         # Safety first!
- *         if flush:             # <<<<<<<<<<<<<<
- *             self.flush()
+  /* "pyblooming/cbitmap.pyx":231
+ *         Returns 1 if they are, 0 otherwise. The indexes are not bounds checked.
+ *         """
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"             # <<<<<<<<<<<<<<
+ *         return self._test_array(indices, n)
  * 
  */
-  __pyx_t_1 = __Pyx_PyObject_IsTrue(__pyx_v_flush); if (unlikely(__pyx_t_1 < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 96; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  if (__pyx_t_1) {
+  __pyx_t_1 = ((__pyx_v_self->mmap == NULL) != 0);
+  if (unlikely(__pyx_t_1)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bitmap_is_closed, 0, 0);
+    __PYX_ERR(0, 231, __pyx_L1_error)
+  }
 
-    /* "pyblooming/cbitmap.pyx":97
- *         # Safety first!
- *         if flush:
- *             self.flush()             # <<<<<<<<<<<<<<
+  /* "pyblooming/cbitmap.pyx":232
+ *         """
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         return self._test_array(indices, n)             # <<<<<<<<<<<<<<
  * 
- *         # Close the mmap
+ *     @cython.boundscheck(False)
  */
-    __pyx_t_2 = PyObject_GetAttr(__pyx_v_self, __pyx_n_s__flush); if (unlikely(!__pyx_t_2)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 97; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(__pyx_t_2);
-    __pyx_t_3 = PyObject_Call(__pyx_t_2, ((PyObject *)__pyx_empty_tuple), NULL); if (unlikely(!__pyx_t_3)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 97; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(__pyx_t_3);
-    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
-    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-    goto __pyx_L6;
-  }
-  __pyx_L6:;
+  __pyx_r = ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_test_array(__pyx_v_self, __pyx_v_indices, __pyx_v_n);
+  goto __pyx_L0;
 
-  /* "pyblooming/cbitmap.pyx":100
- * 
- *         # Close the mmap
- *         if self.mmap:             # <<<<<<<<<<<<<<
- *             mummap_file(<char*>self.mmap, self.size)
- *             self.mmap = NULL
+  /* "pyblooming/cbitmap.pyx":226
+ *     @cython.boundscheck(False)
+ *     @cython.wraparound(False)
+ *     cdef int test_bit_array(self, size_t* indices, size_t n) except -1:             # <<<<<<<<<<<<<<
+ *         """
+ *         Checks if all the bits are set, given a C array of indexes.
  */
-  __pyx_t_1 = (((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap != 0);
-  if (__pyx_t_1) {
 
-    /* "pyblooming/cbitmap.pyx":101
- *         # Close the mmap
- *         if self.mmap:
- *             mummap_file(<char*>self.mmap, self.size)             # <<<<<<<<<<<<<<
- *             self.mmap = NULL
- * 
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.test_bit_array", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = -1;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":236
+ *     @cython.boundscheck(False)
+ *     @cython.wraparound(False)
+ *     cdef bint _test_array(self, size_t* indices, size_t n) nogil:             # <<<<<<<<<<<<<<
+ *         """
+ *         Checks if all the bits are set, given a C array of
  */
-    mummap_file(((char *)((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap), ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->size);
 
-    /* "pyblooming/cbitmap.pyx":102
- *         if self.mmap:
- *             mummap_file(<char*>self.mmap, self.size)
- *             self.mmap = NULL             # <<<<<<<<<<<<<<
- * 
- *         # For non-anonymous maps, we need to close the file
+static int __pyx_f_10pyblooming_7cbitmap_6Bitmap__test_array(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t *__pyx_v_indices, size_t __pyx_v_n) {
+  size_t __pyx_v_i;
+  size_t __pyx_v_idx;
+  int __pyx_r;
+  size_t __pyx_t_1;
+  size_t __pyx_t_2;
+  size_t __pyx_t_3;
+  int __pyx_t_4;
+
+  /* "pyblooming/cbitmap.pyx":242
+ *         """
+ *         cdef size_t i, idx
+ *         for i in range(n):             # <<<<<<<<<<<<<<
+ *             idx = indices[i]
+ *             if not (self.mmap[idx >> 3] >> (7 - idx % 8)) & 0x1:
  */
-    ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap = NULL;
-    goto __pyx_L7;
-  }
-  __pyx_L7:;
+  __pyx_t_1 = __pyx_v_n;
+  __pyx_t_2 = __pyx_t_1;
+  for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
+    __pyx_v_i = __pyx_t_3;
+
+    /* "pyblooming/cbitmap.pyx":243
+ *         cdef size_t i, idx
+ *         for i in range(n):
+ *             idx = indices[i]             # <<<<<<<<<<<<<<
+ *             if not (self.mmap[idx >> 3] >> (7 - idx % 8)) & 0x1:
+ *                 return 0
+ */
+    __pyx_v_idx = (__pyx_v_indices[__pyx_v_i]);
+
+    /* "pyblooming/cbitmap.pyx":244
+ *         for i in range(n):
+ *             idx = indices[i]
+ *             if not (self.mmap[idx >> 3] >> (7 - idx % 8)) & 0x1:             # <<<<<<<<<<<<<<
+ *                 return 0
+ *         return 1
+ */
+    __pyx_t_4 = ((!((((__pyx_v_self->mmap[(__pyx_v_idx >> 3)]) >> (7 - (__pyx_v_idx % 8))) & 0x1) != 0)) != 0);
+    if (__pyx_t_4) {
 
-  /* "pyblooming/cbitmap.pyx":105
+      /* "pyblooming/cbitmap.pyx":245
+ *             idx = indices[i]
+ *             if not (self.mmap[idx >> 3] >> (7 - idx % 8)) & 0x1:
+ *                 return 0             # <<<<<<<<<<<<<<
+ *         return 1
  * 
- *         # For non-anonymous maps, we need to close the file
- *         if self.fileobj:             # <<<<<<<<<<<<<<
- *             self.fileobj.close()
- *             self.fileobj = None
  */
-  __pyx_t_1 = __Pyx_PyObject_IsTrue(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj); if (unlikely(__pyx_t_1 < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 105; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  if (__pyx_t_1) {
+      __pyx_r = 0;
+      goto __pyx_L0;
+
+      /* "pyblooming/cbitmap.pyx":244
+ *         for i in range(n):
+ *             idx = indices[i]
+ *             if not (self.mmap[idx >> 3] >> (7 - idx % 8)) & 0x1:             # <<<<<<<<<<<<<<
+ *                 return 0
+ *         return 1
+ */
+    }
+  }
 
-    /* "pyblooming/cbitmap.pyx":106
- *         # For non-anonymous maps, we need to close the file
- *         if self.fileobj:
- *             self.fileobj.close()             # <<<<<<<<<<<<<<
- *             self.fileobj = None
+  /* "pyblooming/cbitmap.pyx":246
+ *             if not (self.mmap[idx >> 3] >> (7 - idx % 8)) & 0x1:
+ *                 return 0
+ *         return 1             # <<<<<<<<<<<<<<
  * 
+ *     cdef size_t _load_indices(self, indices) except? 0:
  */
-    __pyx_t_3 = PyObject_GetAttr(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj, __pyx_n_s__close); if (unlikely(!__pyx_t_3)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 106; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(__pyx_t_3);
-    __pyx_t_2 = PyObject_Call(__pyx_t_3, ((PyObject *)__pyx_empty_tuple), NULL); if (unlikely(!__pyx_t_2)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 106; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(__pyx_t_2);
-    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
-    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_r = 1;
+  goto __pyx_L0;
 
-    /* "pyblooming/cbitmap.pyx":107
- *         if self.fileobj:
- *             self.fileobj.close()
- *             self.fileobj = None             # <<<<<<<<<<<<<<
- * 
- *     def __getslice__(self, i, j):
+  /* "pyblooming/cbitmap.pyx":236
+ *     @cython.boundscheck(False)
+ *     @cython.wraparound(False)
+ *     cdef bint _test_array(self, size_t* indices, size_t n) nogil:             # <<<<<<<<<<<<<<
+ *         """
+ *         Checks if all the bits are set, given a C array of
  */
-    __Pyx_INCREF(Py_None);
-    __Pyx_GIVEREF(Py_None);
-    __Pyx_GOTREF(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj);
-    __Pyx_DECREF(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj);
-    ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->fileobj = Py_None;
-    goto __pyx_L8;
-  }
-  __pyx_L8:;
 
-  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
-  goto __pyx_L0;
-  __pyx_L1_error:;
-  __Pyx_XDECREF(__pyx_t_2);
-  __Pyx_XDECREF(__pyx_t_3);
-  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.close", __pyx_clineno, __pyx_lineno, __pyx_filename);
-  __pyx_r = NULL;
+  /* function exit code */
   __pyx_L0:;
-  __Pyx_XGIVEREF(__pyx_r);
-  __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-/* "pyblooming/cbitmap.pyx":109
- *             self.fileobj = None
+/* "pyblooming/cbitmap.pyx":248
+ *         return 1
  * 
- *     def __getslice__(self, i, j):             # <<<<<<<<<<<<<<
- *         "Allow direct access to the mmap, indexed by byte"
- *         if i >= j or i < 0 or j > self.size: raise ValueError, "Bad slice!"
+ *     cdef size_t _load_indices(self, indices) except? 0:             # <<<<<<<<<<<<<<
+ *         """
+ *         Copies an iterable of indexes into our index buffer,
  */
 
-static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_6__getslice__(PyObject *__pyx_v_self, Py_ssize_t __pyx_arg_i, Py_ssize_t __pyx_arg_j); /*proto*/
-static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_6__getslice__[] = "Allow direct access to the mmap, indexed by byte";
-struct wrapperbase __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_6__getslice__;
-static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_6__getslice__(PyObject *__pyx_v_self, Py_ssize_t __pyx_arg_i, Py_ssize_t __pyx_arg_j) {
-  PyObject *__pyx_v_i = 0;
-  PyObject *__pyx_v_j = 0;
-  PyObject *__pyx_r = NULL;
+static size_t __pyx_f_10pyblooming_7cbitmap_6Bitmap__load_indices(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_indices) {
+  size_t __pyx_v_n;
+  size_t __pyx_v_i;
+  size_t __pyx_v_idx;
+  size_t *__pyx_v_resized;
+  PyObject *__pyx_v_val = NULL;
+  size_t __pyx_r;
   __Pyx_RefNannyDeclarations
-  PyObject *__pyx_t_1 = NULL;
+  int __pyx_t_1;
   int __pyx_t_2;
   int __pyx_t_3;
   PyObject *__pyx_t_4 = NULL;
-  int __pyx_t_5;
-  int __pyx_t_6;
-  Py_ssize_t __pyx_t_7;
-  Py_ssize_t __pyx_t_8;
+  Py_ssize_t __pyx_t_5;
+  PyObject *(*__pyx_t_6)(PyObject *);
+  PyObject *__pyx_t_7 = NULL;
+  size_t __pyx_t_8;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
-  __Pyx_RefNannySetupContext("__getslice__");
-  __pyx_v_i = PyInt_FromSsize_t(__pyx_arg_i); if (unlikely(!__pyx_v_i)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 109; __pyx_clineno = __LINE__; goto __pyx_L3_error;}
-  __Pyx_GOTREF(__pyx_v_i);
-  __pyx_v_j = PyInt_FromSsize_t(__pyx_arg_j); if (unlikely(!__pyx_v_j)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 109; __pyx_clineno = __LINE__; goto __pyx_L3_error;}
-  __Pyx_GOTREF(__pyx_v_j);
-  goto __pyx_L4_argument_unpacking_done;
-  __pyx_L3_error:;
-  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__getslice__", __pyx_clineno, __pyx_lineno, __pyx_filename);
-  __Pyx_RefNannyFinishContext();
-  return NULL;
-  __pyx_L4_argument_unpacking_done:;
+  __Pyx_RefNannySetupContext("_load_indices", 0);
+  __Pyx_INCREF(__pyx_v_indices);
 
-  /* "pyblooming/cbitmap.pyx":111
- *     def __getslice__(self, i, j):
- *         "Allow direct access to the mmap, indexed by byte"
- *         if i >= j or i < 0 or j > self.size: raise ValueError, "Bad slice!"             # <<<<<<<<<<<<<<
- *         # Create a null terminated string
- *         return self.mmap[i:j]
+  /* "pyblooming/cbitmap.pyx":253
+ *         checking the bounds. Returns the number of indexes.
+ *         """
+ *         cdef size_t n, i = 0             # <<<<<<<<<<<<<<
+ *         cdef size_t idx
+ *         cdef size_t* resized
  */
-  __pyx_t_1 = PyObject_RichCompare(__pyx_v_i, __pyx_v_j, Py_GE); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 111; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __Pyx_GOTREF(__pyx_t_1);
-  __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_t_1); if (unlikely(__pyx_t_2 < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 111; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  if (!__pyx_t_2) {
-    __pyx_t_1 = PyObject_RichCompare(__pyx_v_i, __pyx_int_0, Py_LT); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 111; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(__pyx_t_1);
-    __pyx_t_3 = __Pyx_PyObject_IsTrue(__pyx_t_1); if (unlikely(__pyx_t_3 < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 111; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-    if (!__pyx_t_3) {
-      __pyx_t_1 = __Pyx_PyInt_FromSize_t(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->size); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 111; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(__pyx_t_1);
-      __pyx_t_4 = PyObject_RichCompare(__pyx_v_j, __pyx_t_1, Py_GT); if (unlikely(!__pyx_t_4)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 111; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(__pyx_t_4);
-      __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-      __pyx_t_5 = __Pyx_PyObject_IsTrue(__pyx_t_4); if (unlikely(__pyx_t_5 < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 111; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-      __pyx_t_6 = __pyx_t_5;
-    } else {
-      __pyx_t_6 = __pyx_t_3;
+  __pyx_v_i = 0;
+
+  /* "pyblooming/cbitmap.pyx":256
+ *         cdef size_t idx
+ *         cdef size_t* resized
+ *         if not isinstance(indices, (list, tuple)):             # <<<<<<<<<<<<<<
+ *             indices = list(indices)
+ *         n = len(indices)
+ */
+  __pyx_t_2 = PyList_Check(__pyx_v_indices); 
+  __pyx_t_3 = (__pyx_t_2 != 0);
+  if (!__pyx_t_3) {
+  } else {
+    __pyx_t_1 = __pyx_t_3;
+    goto __pyx_L4_bool_binop_done;
+  }
+  __pyx_t_3 = PyTuple_Check(__pyx_v_indices); 
+  __pyx_t_2 = (__pyx_t_3 != 0);
+  __pyx_t_1 = __pyx_t_2;
+  __pyx_L4_bool_binop_done:;
+  __pyx_t_2 = ((!(__pyx_t_1 != 0)) != 0);
+  if (__pyx_t_2) {
+
+    /* "pyblooming/cbitmap.pyx":257
+ *         cdef size_t* resized
+ *         if not isinstance(indices, (list, tuple)):
+ *             indices = list(indices)             # <<<<<<<<<<<<<<
+ *         n = len(indices)
+ * 
+ */
+    __pyx_t_4 = PySequence_List(__pyx_v_indices); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 257, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __Pyx_DECREF_SET(__pyx_v_indices, __pyx_t_4);
+    __pyx_t_4 = 0;
+
+    /* "pyblooming/cbitmap.pyx":256
+ *         cdef size_t idx
+ *         cdef size_t* resized
+ *         if not isinstance(indices, (list, tuple)):             # <<<<<<<<<<<<<<
+ *             indices = list(indices)
+ *         n = len(indices)
+ */
+  }
+
+  /* "pyblooming/cbitmap.pyx":258
+ *         if not isinstance(indices, (list, tuple)):
+ *             indices = list(indices)
+ *         n = len(indices)             # <<<<<<<<<<<<<<
+ * 
+ *         # Grow the buffer if needed
+ */
+  __pyx_t_5 = PyObject_Length(__pyx_v_indices); if (unlikely(__pyx_t_5 == ((Py_ssize_t)-1))) __PYX_ERR(0, 258, __pyx_L1_error)
+  __pyx_v_n = __pyx_t_5;
+
+  /* "pyblooming/cbitmap.pyx":261
+ * 
+ *         # Grow the buffer if needed
+ *         if n > self.indices_len:             # <<<<<<<<<<<<<<
+ *             resized = <size_t*>stdlib.realloc(self.indices, n*sizeof(size_t))
+ *             if resized == NULL: raise MemoryError
+ */
+  __pyx_t_2 = ((__pyx_v_n > __pyx_v_self->indices_len) != 0);
+  if (__pyx_t_2) {
+
+    /* "pyblooming/cbitmap.pyx":262
+ *         # Grow the buffer if needed
+ *         if n > self.indices_len:
+ *             resized = <size_t*>stdlib.realloc(self.indices, n*sizeof(size_t))             # <<<<<<<<<<<<<<
+ *             if resized == NULL: raise MemoryError
+ *             self.indices = resized
+ */
+    __pyx_v_resized = ((size_t *)realloc(__pyx_v_self->indices, (__pyx_v_n * (sizeof(size_t)))));
+
+    /* "pyblooming/cbitmap.pyx":263
+ *         if n > self.indices_len:
+ *             resized = <size_t*>stdlib.realloc(self.indices, n*sizeof(size_t))
+ *             if resized == NULL: raise MemoryError             # <<<<<<<<<<<<<<
+ *             self.indices = resized
+ *             self.indices_len = n
+ */
+    __pyx_t_2 = ((__pyx_v_resized == NULL) != 0);
+    if (unlikely(__pyx_t_2)) {
+      PyErr_NoMemory(); __PYX_ERR(0, 263, __pyx_L1_error)
     }
-    __pyx_t_3 = __pyx_t_6;
+
+    /* "pyblooming/cbitmap.pyx":264
+ *             resized = <size_t*>stdlib.realloc(self.indices, n*sizeof(size_t))
+ *             if resized == NULL: raise MemoryError
+ *             self.indices = resized             # <<<<<<<<<<<<<<
+ *             self.indices_len = n
+ * 
+ */
+    __pyx_v_self->indices = __pyx_v_resized;
+
+    /* "pyblooming/cbitmap.pyx":265
+ *             if resized == NULL: raise MemoryError
+ *             self.indices = resized
+ *             self.indices_len = n             # <<<<<<<<<<<<<<
+ * 
+ *         for val in indices:
+ */
+    __pyx_v_self->indices_len = __pyx_v_n;
+
+    /* "pyblooming/cbitmap.pyx":261
+ * 
+ *         # Grow the buffer if needed
+ *         if n > self.indices_len:             # <<<<<<<<<<<<<<
+ *             resized = <size_t*>stdlib.realloc(self.indices, n*sizeof(size_t))
+ *             if resized == NULL: raise MemoryError
+ */
+  }
+
+  /* "pyblooming/cbitmap.pyx":267
+ *             self.indices_len = n
+ * 
+ *         for val in indices:             # <<<<<<<<<<<<<<
+ *             idx = val
+ *             if idx >= 8 * self.size: raise IndexError, "Bit index out of range!"
+ */
+  if (likely(PyList_CheckExact(__pyx_v_indices)) || PyTuple_CheckExact(__pyx_v_indices)) {
+    __pyx_t_4 = __pyx_v_indices; __Pyx_INCREF(__pyx_t_4); __pyx_t_5 = 0;
+    __pyx_t_6 = NULL;
   } else {
-    __pyx_t_3 = __pyx_t_2;
+    __pyx_t_5 = -1; __pyx_t_4 = PyObject_GetIter(__pyx_v_indices); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 267, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __pyx_t_6 = Py_TYPE(__pyx_t_4)->tp_iternext; if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 267, __pyx_L1_error)
   }
-  if (__pyx_t_3) {
-    __Pyx_Raise(__pyx_builtin_ValueError, ((PyObject *)__pyx_kp_s_9), 0, 0);
-    {__pyx_filename = __pyx_f[0]; __pyx_lineno = 111; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    goto __pyx_L5;
+  for (;;) {
+    if (likely(!__pyx_t_6)) {
+      if (likely(PyList_CheckExact(__pyx_t_4))) {
+        if (__pyx_t_5 >= PyList_GET_SIZE(__pyx_t_4)) break;
+        #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+        __pyx_t_7 = PyList_GET_ITEM(__pyx_t_4, __pyx_t_5); __Pyx_INCREF(__pyx_t_7); __pyx_t_5++; if (unlikely(0 < 0)) __PYX_ERR(0, 267, __pyx_L1_error)
+        #else
+        __pyx_t_7 = PySequence_ITEM(__pyx_t_4, __pyx_t_5); __pyx_t_5++; if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 267, __pyx_L1_error)
+        __Pyx_GOTREF(__pyx_t_7);
+        #endif
+      } else {
+        if (__pyx_t_5 >= PyTuple_GET_SIZE(__pyx_t_4)) break;
+        #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+        __pyx_t_7 = PyTuple_GET_ITEM(__pyx_t_4, __pyx_t_5); __Pyx_INCREF(__pyx_t_7); __pyx_t_5++; if (unlikely(0 < 0)) __PYX_ERR(0, 267, __pyx_L1_error)
+        #else
+        __pyx_t_7 = PySequence_ITEM(__pyx_t_4, __pyx_t_5); __pyx_t_5++; if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 267, __pyx_L1_error)
+        __Pyx_GOTREF(__pyx_t_7);
+        #endif
+      }
+    } else {
+      __pyx_t_7 = __pyx_t_6(__pyx_t_4);
+      if (unlikely(!__pyx_t_7)) {
+        PyObject* exc_type = PyErr_Occurred();
+        if (exc_type) {
+          if (likely(__Pyx_PyErr_GivenExceptionMatches(exc_type, PyExc_StopIteration))) PyErr_Clear();
+          else __PYX_ERR(0, 267, __pyx_L1_error)
+        }
+        break;
+      }
+      __Pyx_GOTREF(__pyx_t_7);
+    }
+    __Pyx_XDECREF_SET(__pyx_v_val, __pyx_t_7);
+    __pyx_t_7 = 0;
+
+    /* "pyblooming/cbitmap.pyx":268
+ * 
+ *         for val in indices:
+ *             idx = val             # <<<<<<<<<<<<<<
+ *             if idx >= 8 * self.size: raise IndexError, "Bit index out of range!"
+ *             self.indices[i] = idx
+ */
+    __pyx_t_8 = __Pyx_PyInt_As_size_t(__pyx_v_val); if (unlikely((__pyx_t_8 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 268, __pyx_L1_error)
+    __pyx_v_idx = __pyx_t_8;
+
+    /* "pyblooming/cbitmap.pyx":269
+ *         for val in indices:
+ *             idx = val
+ *             if idx >= 8 * self.size: raise IndexError, "Bit index out of range!"             # <<<<<<<<<<<<<<
+ *             self.indices[i] = idx
+ *             i += 1
+ */
+    __pyx_t_2 = ((__pyx_v_idx >= (8 * __pyx_v_self->size)) != 0);
+    if (unlikely(__pyx_t_2)) {
+      __Pyx_Raise(__pyx_builtin_IndexError, __pyx_kp_s_Bit_index_out_of_range, 0, 0);
+      __PYX_ERR(0, 269, __pyx_L1_error)
+    }
+
+    /* "pyblooming/cbitmap.pyx":270
+ *             idx = val
+ *             if idx >= 8 * self.size: raise IndexError, "Bit index out of range!"
+ *             self.indices[i] = idx             # <<<<<<<<<<<<<<
+ *             i += 1
+ *         return n
+ */
+    (__pyx_v_self->indices[__pyx_v_i]) = __pyx_v_idx;
+
+    /* "pyblooming/cbitmap.pyx":271
+ *             if idx >= 8 * self.size: raise IndexError, "Bit index out of range!"
+ *             self.indices[i] = idx
+ *             i += 1             # <<<<<<<<<<<<<<
+ *         return n
+ * 
+ */
+    __pyx_v_i = (__pyx_v_i + 1);
+
+    /* "pyblooming/cbitmap.pyx":267
+ *             self.indices_len = n
+ * 
+ *         for val in indices:             # <<<<<<<<<<<<<<
+ *             idx = val
+ *             if idx >= 8 * self.size: raise IndexError, "Bit index out of range!"
+ */
   }
-  __pyx_L5:;
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
 
-  /* "pyblooming/cbitmap.pyx":113
- *         if i >= j or i < 0 or j > self.size: raise ValueError, "Bad slice!"
- *         # Create a null terminated string
- *         return self.mmap[i:j]             # <<<<<<<<<<<<<<
+  /* "pyblooming/cbitmap.pyx":272
+ *             self.indices[i] = idx
+ *             i += 1
+ *         return n             # <<<<<<<<<<<<<<
  * 
- *     def __setslice__(self, i, j, char* val):
+ *     def set_bits(self, indices):
  */
-  __Pyx_XDECREF(__pyx_r);
-  __pyx_t_7 = __Pyx_PyIndex_AsSsize_t(__pyx_v_i); if (unlikely((__pyx_t_7 == (Py_ssize_t)-1) && PyErr_Occurred())) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 113; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __pyx_t_8 = __Pyx_PyIndex_AsSsize_t(__pyx_v_j); if (unlikely((__pyx_t_8 == (Py_ssize_t)-1) && PyErr_Occurred())) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 113; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __pyx_t_4 = PyBytes_FromStringAndSize(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap + __pyx_t_7, __pyx_t_8 - __pyx_t_7); if (unlikely(!__pyx_t_4)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 113; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __Pyx_GOTREF(((PyObject *)__pyx_t_4));
-  __pyx_r = ((PyObject *)__pyx_t_4);
-  __pyx_t_4 = 0;
+  __pyx_r = __pyx_v_n;
   goto __pyx_L0;
 
-  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
-  goto __pyx_L0;
+  /* "pyblooming/cbitmap.pyx":248
+ *         return 1
+ * 
+ *     cdef size_t _load_indices(self, indices) except? 0:             # <<<<<<<<<<<<<<
+ *         """
+ *         Copies an iterable of indexes into our index buffer,
+ */
+
+  /* function exit code */
   __pyx_L1_error:;
-  __Pyx_XDECREF(__pyx_t_1);
   __Pyx_XDECREF(__pyx_t_4);
-  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__getslice__", __pyx_clineno, __pyx_lineno, __pyx_filename);
-  __pyx_r = NULL;
+  __Pyx_XDECREF(__pyx_t_7);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap._load_indices", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = 0;
   __pyx_L0:;
-  __Pyx_XDECREF(__pyx_v_i);
-  __Pyx_XDECREF(__pyx_v_j);
-  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_XDECREF(__pyx_v_val);
+  __Pyx_XDECREF(__pyx_v_indices);
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-/* "pyblooming/cbitmap.pyx":115
- *         return self.mmap[i:j]
+/* "pyblooming/cbitmap.pyx":274
+ *         return n
  * 
- *     def __setslice__(self, i, j, char* val):             # <<<<<<<<<<<<<<
- *         "Allow direct access to the mmap, indexed by byte"
- *         if i >= j or i < 0 or j > self.size: raise ValueError, "Bad slice!"
+ *     def set_bits(self, indices):             # <<<<<<<<<<<<<<
+ *         """
+ *         Sets the value of many bits to 1. Takes an iterable
  */
 
-static int __pyx_pf_10pyblooming_7cbitmap_6Bitmap_7__setslice__(PyObject *__pyx_v_self, Py_ssize_t __pyx_arg_i, Py_ssize_t __pyx_arg_j, PyObject *__pyx_arg_val); /*proto*/
-static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_7__setslice__[] = "Allow direct access to the mmap, indexed by byte";
-struct wrapperbase __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_7__setslice__;
-static int __pyx_pf_10pyblooming_7cbitmap_6Bitmap_7__setslice__(PyObject *__pyx_v_self, Py_ssize_t __pyx_arg_i, Py_ssize_t __pyx_arg_j, PyObject *__pyx_arg_val) {
-  PyObject *__pyx_v_i = 0;
-  PyObject *__pyx_v_j = 0;
-  char *__pyx_v_val;
-  int __pyx_v_size;
-  int __pyx_v_x;
-  int __pyx_r;
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_11set_bits(PyObject *__pyx_v_self, PyObject *__pyx_v_indices); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_10set_bits[] = "\n        Sets the value of many bits to 1. Takes an iterable\n        of integer indexes. This avoids a call per bit.\n        ";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_11set_bits(PyObject *__pyx_v_self, PyObject *__pyx_v_indices) {
+  PyObject *__pyx_r = 0;
   __Pyx_RefNannyDeclarations
-  PyObject *__pyx_t_1 = NULL;
+  __Pyx_RefNannySetupContext("set_bits (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_10set_bits(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), ((PyObject *)__pyx_v_indices));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_10set_bits(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_indices) {
+  size_t __pyx_v_n;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  size_t __pyx_t_1;
   int __pyx_t_2;
-  int __pyx_t_3;
-  PyObject *__pyx_t_4 = NULL;
-  int __pyx_t_5;
-  int __pyx_t_6;
-  int __pyx_t_7;
-  int __pyx_t_8;
-  Py_ssize_t __pyx_t_9;
   int __pyx_lineno = 0;
   const char *__pyx_filename = NULL;
   int __pyx_clineno = 0;
-  __Pyx_RefNannySetupContext("__setslice__");
-  __pyx_v_i = PyInt_FromSsize_t(__pyx_arg_i); if (unlikely(!__pyx_v_i)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 115; __pyx_clineno = __LINE__; goto __pyx_L3_error;}
-  __Pyx_GOTREF(__pyx_v_i);
-  __pyx_v_j = PyInt_FromSsize_t(__pyx_arg_j); if (unlikely(!__pyx_v_j)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 115; __pyx_clineno = __LINE__; goto __pyx_L3_error;}
-  __Pyx_GOTREF(__pyx_v_j);
-  assert(__pyx_arg_val); {
-    __pyx_v_val = PyBytes_AsString(__pyx_arg_val); if (unlikely((!__pyx_v_val) && PyErr_Occurred())) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 115; __pyx_clineno = __LINE__; goto __pyx_L3_error;}
-  }
-  goto __pyx_L4_argument_unpacking_done;
-  __pyx_L3_error:;
-  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__setslice__", __pyx_clineno, __pyx_lineno, __pyx_filename);
-  __Pyx_RefNannyFinishContext();
-  return -1;
-  __pyx_L4_argument_unpacking_done:;
-
-  /* "pyblooming/cbitmap.pyx":117
- *     def __setslice__(self, i, j, char* val):
- *         "Allow direct access to the mmap, indexed by byte"
- *         if i >= j or i < 0 or j > self.size: raise ValueError, "Bad slice!"             # <<<<<<<<<<<<<<
- *         # Create a null terminated string
- *         cdef int size  = j-i
- */
-  __pyx_t_1 = PyObject_RichCompare(__pyx_v_i, __pyx_v_j, Py_GE); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 117; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __Pyx_GOTREF(__pyx_t_1);
-  __pyx_t_2 = __Pyx_PyObject_IsTrue(__pyx_t_1); if (unlikely(__pyx_t_2 < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 117; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-  if (!__pyx_t_2) {
-    __pyx_t_1 = PyObject_RichCompare(__pyx_v_i, __pyx_int_0, Py_LT); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 117; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(__pyx_t_1);
-    __pyx_t_3 = __Pyx_PyObject_IsTrue(__pyx_t_1); if (unlikely(__pyx_t_3 < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 117; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-    if (!__pyx_t_3) {
-      __pyx_t_1 = __Pyx_PyInt_FromSize_t(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->size); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 117; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(__pyx_t_1);
-      __pyx_t_4 = PyObject_RichCompare(__pyx_v_j, __pyx_t_1, Py_GT); if (unlikely(!__pyx_t_4)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 117; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_GOTREF(__pyx_t_4);
-      __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-      __pyx_t_5 = __Pyx_PyObject_IsTrue(__pyx_t_4); if (unlikely(__pyx_t_5 < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 117; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-      __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-      __pyx_t_6 = __pyx_t_5;
-    } else {
-      __pyx_t_6 = __pyx_t_3;
-    }
-    __pyx_t_3 = __pyx_t_6;
-  } else {
-    __pyx_t_3 = __pyx_t_2;
-  }
-  if (__pyx_t_3) {
-    __Pyx_Raise(__pyx_builtin_ValueError, ((PyObject *)__pyx_kp_s_9), 0, 0);
-    {__pyx_filename = __pyx_f[0]; __pyx_lineno = 117; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    goto __pyx_L5;
-  }
-  __pyx_L5:;
+  __Pyx_RefNannySetupContext("set_bits", 0);
 
-  /* "pyblooming/cbitmap.pyx":119
- *         if i >= j or i < 0 or j > self.size: raise ValueError, "Bad slice!"
- *         # Create a null terminated string
- *         cdef int size  = j-i             # <<<<<<<<<<<<<<
- *         cdef int x
- *         for x in xrange(size):
+  /* "pyblooming/cbitmap.pyx":279
+ *         of integer indexes. This avoids a call per bit.
+ *         """
+ *         cdef size_t n = self._load_indices(indices)             # <<<<<<<<<<<<<<
+ *         self.set_bit_array(self.indices, n)
+ * 
  */
-  __pyx_t_4 = PyNumber_Subtract(__pyx_v_j, __pyx_v_i); if (unlikely(!__pyx_t_4)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 119; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __Pyx_GOTREF(__pyx_t_4);
-  __pyx_t_7 = __Pyx_PyInt_AsInt(__pyx_t_4); if (unlikely((__pyx_t_7 == (int)-1) && PyErr_Occurred())) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 119; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-  __pyx_v_size = __pyx_t_7;
+  __pyx_t_1 = ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_load_indices(__pyx_v_self, __pyx_v_indices); if (unlikely(__pyx_t_1 == ((size_t)0) && PyErr_Occurred())) __PYX_ERR(0, 279, __pyx_L1_error)
+  __pyx_v_n = __pyx_t_1;
 
-  /* "pyblooming/cbitmap.pyx":121
- *         cdef int size  = j-i
- *         cdef int x
- *         for x in xrange(size):             # <<<<<<<<<<<<<<
- *             self.mmap[i+x] = val[x]
+  /* "pyblooming/cbitmap.pyx":280
+ *         """
+ *         cdef size_t n = self._load_indices(indices)
+ *         self.set_bit_array(self.indices, n)             # <<<<<<<<<<<<<<
  * 
+ *     @cython.boundscheck(False)
  */
-  __pyx_t_7 = __pyx_v_size;
-  for (__pyx_t_8 = 0; __pyx_t_8 < __pyx_t_7; __pyx_t_8+=1) {
-    __pyx_v_x = __pyx_t_8;
+  __pyx_t_2 = ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->set_bit_array(__pyx_v_self, __pyx_v_self->indices, __pyx_v_n); if (unlikely(__pyx_t_2 == ((int)-1))) __PYX_ERR(0, 280, __pyx_L1_error)
 
-    /* "pyblooming/cbitmap.pyx":122
- *         cdef int x
- *         for x in xrange(size):
- *             self.mmap[i+x] = val[x]             # <<<<<<<<<<<<<<
- * 
+  /* "pyblooming/cbitmap.pyx":274
+ *         return n
  * 
+ *     def set_bits(self, indices):             # <<<<<<<<<<<<<<
+ *         """
+ *         Sets the value of many bits to 1. Takes an iterable
  */
-    __pyx_t_4 = PyInt_FromLong(__pyx_v_x); if (unlikely(!__pyx_t_4)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 122; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(__pyx_t_4);
-    __pyx_t_1 = PyNumber_Add(__pyx_v_i, __pyx_t_4); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 122; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_GOTREF(__pyx_t_1);
-    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
-    __pyx_t_9 = __Pyx_PyIndex_AsSsize_t(__pyx_t_1); if (unlikely((__pyx_t_9 == (Py_ssize_t)-1) && PyErr_Occurred())) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 122; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-    (((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self)->mmap[__pyx_t_9]) = (__pyx_v_val[__pyx_v_x]);
-  }
 
-  __pyx_r = 0;
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
   goto __pyx_L0;
   __pyx_L1_error:;
-  __Pyx_XDECREF(__pyx_t_1);
-  __Pyx_XDECREF(__pyx_t_4);
-  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__setslice__", __pyx_clineno, __pyx_lineno, __pyx_filename);
-  __pyx_r = -1;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.set_bits", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
   __pyx_L0:;
-  __Pyx_XDECREF(__pyx_v_i);
-  __Pyx_XDECREF(__pyx_v_j);
+  __Pyx_XGIVEREF(__pyx_r);
   __Pyx_RefNannyFinishContext();
   return __pyx_r;
 }
 
-static PyObject *__pyx_tp_new_10pyblooming_7cbitmap_Bitmap(PyTypeObject *t, PyObject *a, PyObject *k) {
-  struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *p;
-  PyObject *o = (*t->tp_alloc)(t, 0);
-  if (!o) return 0;
-  p = ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)o);
-  p->fileobj = Py_None; Py_INCREF(Py_None);
-  if (__pyx_pf_10pyblooming_7cbitmap_6Bitmap___cinit__(o, a, k) < 0) {
-    Py_DECREF(o); o = 0;
-  }
-  return o;
-}
+/* "pyblooming/cbitmap.pyx":284
+ *     @cython.boundscheck(False)
+ *     @cython.wraparound(False)
+ *     def get_bits(self, indices):             # <<<<<<<<<<<<<<
+ *         """
+ *         Gets the value of many bits. Takes an iterable of
+ */
 
-static void __pyx_tp_dealloc_10pyblooming_7cbitmap_Bitmap(PyObject *o) {
-  struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *p = (struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)o;
-  Py_XDECREF(p->fileobj);
-  (*Py_TYPE(o)->tp_free)(o);
-}
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_13get_bits(PyObject *__pyx_v_self, PyObject *__pyx_v_indices); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_12get_bits[] = "\n        Gets the value of many bits. Takes an iterable of\n        integer indexes, and returns a list of the bit values.\n        ";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_13get_bits(PyObject *__pyx_v_self, PyObject *__pyx_v_indices) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("get_bits (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_12get_bits(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), ((PyObject *)__pyx_v_indices));
 
-static int __pyx_tp_traverse_10pyblooming_7cbitmap_Bitmap(PyObject *o, visitproc v, void *a) {
-  int e;
-  struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *p = (struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)o;
-  if (p->fileobj) {
-    e = (*v)(p->fileobj, a); if (e) return e;
-  }
-  return 0;
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
 }
 
-static int __pyx_tp_clear_10pyblooming_7cbitmap_Bitmap(PyObject *o) {
-  struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *p = (struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)o;
-  PyObject* tmp;
-  tmp = ((PyObject*)p->fileobj);
-  p->fileobj = Py_None; Py_INCREF(Py_None);
-  Py_XDECREF(tmp);
-  return 0;
-}
-static PyObject *__pyx_sq_item_10pyblooming_7cbitmap_Bitmap(PyObject *o, Py_ssize_t i) {
-  PyObject *r;
-  PyObject *x = PyInt_FromSsize_t(i); if(!x) return 0;
-  r = Py_TYPE(o)->tp_as_mapping->mp_subscript(o, x);
-  Py_DECREF(x);
-  return r;
-}
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_12get_bits(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_indices) {
+  size_t __pyx_v_n;
+  size_t __pyx_v_i;
+  size_t __pyx_v_idx;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  size_t __pyx_t_1;
+  int __pyx_t_2;
+  size_t __pyx_t_3;
+  size_t __pyx_t_4;
+  PyObject *__pyx_t_5 = NULL;
+  PyObject *__pyx_t_6 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("get_bits", 0);
 
-static int __pyx_mp_ass_subscript_10pyblooming_7cbitmap_Bitmap(PyObject *o, PyObject *i, PyObject *v) {
-  if (v) {
-    return __pyx_pf_10pyblooming_7cbitmap_6Bitmap_3__setitem__(o, i, v);
-  }
-  else {
-    PyErr_Format(PyExc_NotImplementedError,
-      "Subscript deletion not supported by %s", Py_TYPE(o)->tp_name);
-    return -1;
+  /* "pyblooming/cbitmap.pyx":289
+ *         integer indexes, and returns a list of the bit values.
+ *         """
+ *         cdef size_t n = self._load_indices(indices)             # <<<<<<<<<<<<<<
+ *         cdef size_t i, idx
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ */
+  __pyx_t_1 = ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_load_indices(__pyx_v_self, __pyx_v_indices); if (unlikely(__pyx_t_1 == ((size_t)0) && PyErr_Occurred())) __PYX_ERR(0, 289, __pyx_L1_error)
+  __pyx_v_n = __pyx_t_1;
+
+  /* "pyblooming/cbitmap.pyx":291
+ *         cdef size_t n = self._load_indices(indices)
+ *         cdef size_t i, idx
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"             # <<<<<<<<<<<<<<
+ *         for i in range(n):
+ *             idx = self.indices[i]
+ */
+  __pyx_t_2 = ((__pyx_v_self->mmap == NULL) != 0);
+  if (unlikely(__pyx_t_2)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bitmap_is_closed, 0, 0);
+    __PYX_ERR(0, 291, __pyx_L1_error)
   }
-}
-#if PY_MAJOR_VERSION >= 3
-#error __getslice__, __setslice__, and __delslice__ not supported in Python 3.
-#endif
 
-static int __pyx_sq_ass_slice_10pyblooming_7cbitmap_Bitmap(PyObject *o, Py_ssize_t i, Py_ssize_t j, PyObject *v) {
-  if (v) {
-    return __pyx_pf_10pyblooming_7cbitmap_6Bitmap_7__setslice__(o, i, j, v);
+  /* "pyblooming/cbitmap.pyx":292
+ *         cdef size_t i, idx
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         for i in range(n):             # <<<<<<<<<<<<<<
+ *             idx = self.indices[i]
+ *             self.indices[i] = (self.mmap[idx >> 3] >> (7 - idx % 8)) & 0x1
+ */
+  __pyx_t_1 = __pyx_v_n;
+  __pyx_t_3 = __pyx_t_1;
+  for (__pyx_t_4 = 0; __pyx_t_4 < __pyx_t_3; __pyx_t_4+=1) {
+    __pyx_v_i = __pyx_t_4;
+
+    /* "pyblooming/cbitmap.pyx":293
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         for i in range(n):
+ *             idx = self.indices[i]             # <<<<<<<<<<<<<<
+ *             self.indices[i] = (self.mmap[idx >> 3] >> (7 - idx % 8)) & 0x1
+ *         return [self.indices[i] for i in range(n)]
+ */
+    __pyx_v_idx = (__pyx_v_self->indices[__pyx_v_i]);
+
+    /* "pyblooming/cbitmap.pyx":294
+ *         for i in range(n):
+ *             idx = self.indices[i]
+ *             self.indices[i] = (self.mmap[idx >> 3] >> (7 - idx % 8)) & 0x1             # <<<<<<<<<<<<<<
+ *         return [self.indices[i] for i in range(n)]
+ * 
+ */
+    (__pyx_v_self->indices[__pyx_v_i]) = (((__pyx_v_self->mmap[(__pyx_v_idx >> 3)]) >> (7 - (__pyx_v_idx % 8))) & 0x1);
   }
-  else {
-    PyErr_Format(PyExc_NotImplementedError,
-      "2-element slice deletion not supported by %s", Py_TYPE(o)->tp_name);
-    return -1;
+
+  /* "pyblooming/cbitmap.pyx":295
+ *             idx = self.indices[i]
+ *             self.indices[i] = (self.mmap[idx >> 3] >> (7 - idx % 8)) & 0x1
+ *         return [self.indices[i] for i in range(n)]             # <<<<<<<<<<<<<<
+ * 
+ *     def test_all(self, indices):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_5 = PyList_New(0); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 295, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __pyx_t_1 = __pyx_v_n;
+  __pyx_t_3 = __pyx_t_1;
+  for (__pyx_t_4 = 0; __pyx_t_4 < __pyx_t_3; __pyx_t_4+=1) {
+    __pyx_v_i = __pyx_t_4;
+    __pyx_t_6 = __Pyx_PyInt_FromSize_t((__pyx_v_self->indices[__pyx_v_i])); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 295, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_6);
+    if (unlikely(__Pyx_ListComp_Append(__pyx_t_5, (PyObject*)__pyx_t_6))) __PYX_ERR(0, 295, __pyx_L1_error)
+    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
   }
-}
+  __pyx_r = __pyx_t_5;
+  __pyx_t_5 = 0;
+  goto __pyx_L0;
 
-static PyMethodDef __pyx_methods_10pyblooming_7cbitmap_Bitmap[] = {
-  {__Pyx_NAMESTR("flush"), (PyCFunction)__pyx_pf_10pyblooming_7cbitmap_6Bitmap_4flush, METH_NOARGS, __Pyx_DOCSTR(__pyx_doc_10pyblooming_7cbitmap_6Bitmap_4flush)},
-  {__Pyx_NAMESTR("close"), (PyCFunction)__pyx_pf_10pyblooming_7cbitmap_6Bitmap_5close, METH_VARARGS|METH_KEYWORDS, __Pyx_DOCSTR(__pyx_doc_10pyblooming_7cbitmap_6Bitmap_5close)},
-  {0, 0, 0, 0}
-};
+  /* "pyblooming/cbitmap.pyx":284
+ *     @cython.boundscheck(False)
+ *     @cython.wraparound(False)
+ *     def get_bits(self, indices):             # <<<<<<<<<<<<<<
+ *         """
+ *         Gets the value of many bits. Takes an iterable of
+ */
 
-static PyNumberMethods __pyx_tp_as_number_Bitmap = {
-  0, /*nb_add*/
-  0, /*nb_subtract*/
-  0, /*nb_multiply*/
-  #if PY_MAJOR_VERSION < 3
-  0, /*nb_divide*/
-  #endif
-  0, /*nb_remainder*/
-  0, /*nb_divmod*/
-  0, /*nb_power*/
-  0, /*nb_negative*/
-  0, /*nb_positive*/
-  0, /*nb_absolute*/
-  0, /*nb_nonzero*/
-  0, /*nb_invert*/
-  0, /*nb_lshift*/
-  0, /*nb_rshift*/
-  0, /*nb_and*/
-  0, /*nb_xor*/
-  0, /*nb_or*/
-  #if PY_MAJOR_VERSION < 3
-  0, /*nb_coerce*/
-  #endif
-  0, /*nb_int*/
-  #if PY_MAJOR_VERSION < 3
-  0, /*nb_long*/
-  #else
-  0, /*reserved*/
-  #endif
-  0, /*nb_float*/
-  #if PY_MAJOR_VERSION < 3
-  0, /*nb_oct*/
-  #endif
-  #if PY_MAJOR_VERSION < 3
-  0, /*nb_hex*/
-  #endif
-  0, /*nb_inplace_add*/
-  0, /*nb_inplace_subtract*/
-  0, /*nb_inplace_multiply*/
-  #if PY_MAJOR_VERSION < 3
-  0, /*nb_inplace_divide*/
-  #endif
-  0, /*nb_inplace_remainder*/
-  0, /*nb_inplace_power*/
-  0, /*nb_inplace_lshift*/
-  0, /*nb_inplace_rshift*/
-  0, /*nb_inplace_and*/
-  0, /*nb_inplace_xor*/
-  0, /*nb_inplace_or*/
-  0, /*nb_floor_divide*/
-  0, /*nb_true_divide*/
-  0, /*nb_inplace_floor_divide*/
-  0, /*nb_inplace_true_divide*/
-  #if PY_VERSION_HEX >= 0x02050000
-  0, /*nb_index*/
-  #endif
-};
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_5);
+  __Pyx_XDECREF(__pyx_t_6);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.get_bits", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
 
-static PySequenceMethods __pyx_tp_as_sequence_Bitmap = {
-  __pyx_pf_10pyblooming_7cbitmap_6Bitmap_1__len__, /*sq_length*/
-  0, /*sq_concat*/
-  0, /*sq_repeat*/
-  __pyx_sq_item_10pyblooming_7cbitmap_Bitmap, /*sq_item*/
-  __pyx_pf_10pyblooming_7cbitmap_6Bitmap_6__getslice__, /*sq_slice*/
-  0, /*sq_ass_item*/
-  __pyx_sq_ass_slice_10pyblooming_7cbitmap_Bitmap, /*sq_ass_slice*/
-  0, /*sq_contains*/
-  0, /*sq_inplace_concat*/
-  0, /*sq_inplace_repeat*/
-};
+/* "pyblooming/cbitmap.pyx":297
+ *         return [self.indices[i] for i in range(n)]
+ * 
+ *     def test_all(self, indices):             # <<<<<<<<<<<<<<
+ *         """
+ *         Checks if all of the bits are set. Takes an iterable of
+ */
 
-static PyMappingMethods __pyx_tp_as_mapping_Bitmap = {
-  __pyx_pf_10pyblooming_7cbitmap_6Bitmap_1__len__, /*mp_length*/
-  __pyx_pf_10pyblooming_7cbitmap_6Bitmap_2__getitem__, /*mp_subscript*/
-  __pyx_mp_ass_subscript_10pyblooming_7cbitmap_Bitmap, /*mp_ass_subscript*/
-};
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_15test_all(PyObject *__pyx_v_self, PyObject *__pyx_v_indices); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_14test_all[] = "\n        Checks if all of the bits are set. Takes an iterable of\n        integer indexes.\n        ";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_15test_all(PyObject *__pyx_v_self, PyObject *__pyx_v_indices) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("test_all (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_14test_all(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), ((PyObject *)__pyx_v_indices));
 
-static PyBufferProcs __pyx_tp_as_buffer_Bitmap = {
-  #if PY_MAJOR_VERSION < 3
-  0, /*bf_getreadbuffer*/
-  #endif
-  #if PY_MAJOR_VERSION < 3
-  0, /*bf_getwritebuffer*/
-  #endif
-  #if PY_MAJOR_VERSION < 3
-  0, /*bf_getsegcount*/
-  #endif
-  #if PY_MAJOR_VERSION < 3
-  0, /*bf_getcharbuffer*/
-  #endif
-  #if PY_VERSION_HEX >= 0x02060000
-  0, /*bf_getbuffer*/
-  #endif
-  #if PY_VERSION_HEX >= 0x02060000
-  0, /*bf_releasebuffer*/
-  #endif
-};
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
 
-static PyTypeObject __pyx_type_10pyblooming_7cbitmap_Bitmap = {
-  PyVarObject_HEAD_INIT(0, 0)
-  __Pyx_NAMESTR("pyblooming.cbitmap.Bitmap"), /*tp_name*/
-  sizeof(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap), /*tp_basicsize*/
-  0, /*tp_itemsize*/
-  __pyx_tp_dealloc_10pyblooming_7cbitmap_Bitmap, /*tp_dealloc*/
-  0, /*tp_print*/
-  0, /*tp_getattr*/
-  0, /*tp_setattr*/
-  #if PY_MAJOR_VERSION < 3
-  0, /*tp_compare*/
-  #else
-  0, /*reserved*/
-  #endif
-  0, /*tp_repr*/
-  &__pyx_tp_as_number_Bitmap, /*tp_as_number*/
-  &__pyx_tp_as_sequence_Bitmap, /*tp_as_sequence*/
-  &__pyx_tp_as_mapping_Bitmap, /*tp_as_mapping*/
-  0, /*tp_hash*/
-  0, /*tp_call*/
-  0, /*tp_str*/
-  0, /*tp_getattro*/
-  0, /*tp_setattro*/
-  &__pyx_tp_as_buffer_Bitmap, /*tp_as_buffer*/
-  Py_TPFLAGS_DEFAULT|Py_TPFLAGS_CHECKTYPES|Py_TPFLAGS_HAVE_NEWBUFFER|Py_TPFLAGS_BASETYPE|Py_TPFLAGS_HAVE_GC, /*tp_flags*/
-  0, /*tp_doc*/
-  __pyx_tp_traverse_10pyblooming_7cbitmap_Bitmap, /*tp_traverse*/
-  __pyx_tp_clear_10pyblooming_7cbitmap_Bitmap, /*tp_clear*/
-  0, /*tp_richcompare*/
-  0, /*tp_weaklistoffset*/
-  0, /*tp_iter*/
-  0, /*tp_iternext*/
-  __pyx_methods_10pyblooming_7cbitmap_Bitmap, /*tp_methods*/
-  0, /*tp_members*/
-  0, /*tp_getset*/
-  0, /*tp_base*/
-  0, /*tp_dict*/
-  0, /*tp_descr_get*/
-  0, /*tp_descr_set*/
-  0, /*tp_dictoffset*/
-  0, /*tp_init*/
-  0, /*tp_alloc*/
-  __pyx_tp_new_10pyblooming_7cbitmap_Bitmap, /*tp_new*/
-  0, /*tp_free*/
-  0, /*tp_is_gc*/
-  0, /*tp_bases*/
-  0, /*tp_mro*/
-  0, /*tp_cache*/
-  0, /*tp_subclasses*/
-  0, /*tp_weaklist*/
-  0, /*tp_del*/
-  #if PY_VERSION_HEX >= 0x02060000
-  0, /*tp_version_tag*/
-  #endif
-};
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_14test_all(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_indices) {
+  size_t __pyx_v_n;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  size_t __pyx_t_1;
+  int __pyx_t_2;
+  PyObject *__pyx_t_3 = NULL;
+  int __pyx_t_4;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("test_all", 0);
 
-static PyMethodDef __pyx_methods[] = {
-  {0, 0, 0, 0}
-};
+  /* "pyblooming/cbitmap.pyx":302
+ *         integer indexes.
+ *         """
+ *         cdef size_t n = self._load_indices(indices)             # <<<<<<<<<<<<<<
+ *         return bool(self.test_bit_array(self.indices, n))
+ * 
+ */
+  __pyx_t_1 = ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_load_indices(__pyx_v_self, __pyx_v_indices); if (unlikely(__pyx_t_1 == ((size_t)0) && PyErr_Occurred())) __PYX_ERR(0, 302, __pyx_L1_error)
+  __pyx_v_n = __pyx_t_1;
 
-#if PY_MAJOR_VERSION >= 3
-static struct PyModuleDef __pyx_moduledef = {
-    PyModuleDef_HEAD_INIT,
-    __Pyx_NAMESTR("cbitmap"),
-    0, /* m_doc */
-    -1, /* m_size */
-    __pyx_methods /* m_methods */,
-    NULL, /* m_reload */
-    NULL, /* m_traverse */
-    NULL, /* m_clear */
-    NULL /* m_free */
-};
+  /* "pyblooming/cbitmap.pyx":303
+ *         """
+ *         cdef size_t n = self._load_indices(indices)
+ *         return bool(self.test_bit_array(self.indices, n))             # <<<<<<<<<<<<<<
+ * 
+ *     def atomic_add(self, size_t offset, int64_t delta):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_2 = ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->test_bit_array(__pyx_v_self, __pyx_v_self->indices, __pyx_v_n); if (unlikely(__pyx_t_2 == ((int)-1))) __PYX_ERR(0, 303, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyInt_From_int(__pyx_t_2); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 303, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __pyx_t_4 = __Pyx_PyObject_IsTrue(__pyx_t_3); if (unlikely(__pyx_t_4 < 0)) __PYX_ERR(0, 303, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  __pyx_t_3 = __Pyx_PyBool_FromLong((!(!__pyx_t_4))); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 303, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __pyx_r = __pyx_t_3;
+  __pyx_t_3 = 0;
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":297
+ *         return [self.indices[i] for i in range(n)]
+ * 
+ *     def test_all(self, indices):             # <<<<<<<<<<<<<<
+ *         """
+ *         Checks if all of the bits are set. Takes an iterable of
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.test_all", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":305
+ *         return bool(self.test_bit_array(self.indices, n))
+ * 
+ *     def atomic_add(self, size_t offset, int64_t delta):             # <<<<<<<<<<<<<<
+ *         """
+ *         Adds delta to the little endian 64 bit counter at a byte
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_17atomic_add(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_16atomic_add[] = "\n        Adds delta to the little endian 64 bit counter at a byte\n        offset, and returns the new value. The add is atomic with\n        respect to other atomic_add() calls on the same file, from\n        any process. Aligned counters use an atomic instruction,\n        others are protected by an fcntl() lock. The GIL is held,\n        since fcntl() locks do not exclude threads of one process.\n        ";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_17atomic_add(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  size_t __pyx_v_offset;
+  int64_t __pyx_v_delta;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("atomic_add (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_offset,&__pyx_n_s_delta,0};
+    PyObject* values[2] = {0,0};
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_offset)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (likely((values[1] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_delta)) != 0)) kw_args--;
+        else {
+          __Pyx_RaiseArgtupleInvalid("atomic_add", 1, 2, 2, 1); __PYX_ERR(0, 305, __pyx_L3_error)
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "atomic_add") < 0)) __PYX_ERR(0, 305, __pyx_L3_error)
+      }
+    } else if (PyTuple_GET_SIZE(__pyx_args) != 2) {
+      goto __pyx_L5_argtuple_error;
+    } else {
+      values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+      values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+    }
+    __pyx_v_offset = __Pyx_PyInt_As_size_t(values[0]); if (unlikely((__pyx_v_offset == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 305, __pyx_L3_error)
+    __pyx_v_delta = __Pyx_PyInt_As_int64_t(values[1]); if (unlikely((__pyx_v_delta == ((int64_t)-1)) && PyErr_Occurred())) __PYX_ERR(0, 305, __pyx_L3_error)
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("atomic_add", 1, 2, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 305, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.atomic_add", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_16atomic_add(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), __pyx_v_offset, __pyx_v_delta);
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_16atomic_add(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t __pyx_v_offset, int64_t __pyx_v_delta) {
+  uint64_t __pyx_v_result;
+  int __pyx_v_res;
+  PyObject *__pyx_v_err = NULL;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  PyObject *__pyx_t_2 = NULL;
+  PyObject *__pyx_t_3 = NULL;
+  PyObject *__pyx_t_4 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("atomic_add", 0);
+
+  /* "pyblooming/cbitmap.pyx":314
+ *         since fcntl() locks do not exclude threads of one process.
+ *         """
+ *         cdef uint64_t result = 0             # <<<<<<<<<<<<<<
+ *         cdef int res
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ */
+  __pyx_v_result = 0;
+
+  /* "pyblooming/cbitmap.pyx":316
+ *         cdef uint64_t result = 0
+ *         cdef int res
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"             # <<<<<<<<<<<<<<
+ *         if offset + 8 > self.size: raise ValueError, "Bad offset!"
+ *         res = atomic_add_u64(self.fileno, <char*>self.mmap, offset, delta, &result)
+ */
+  __pyx_t_1 = ((__pyx_v_self->mmap == NULL) != 0);
+  if (unlikely(__pyx_t_1)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bitmap_is_closed, 0, 0);
+    __PYX_ERR(0, 316, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":317
+ *         cdef int res
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         if offset + 8 > self.size: raise ValueError, "Bad offset!"             # <<<<<<<<<<<<<<
+ *         res = atomic_add_u64(self.fileno, <char*>self.mmap, offset, delta, &result)
+ *         if res == -1:
+ */
+  __pyx_t_1 = (((__pyx_v_offset + 8) > __pyx_v_self->size) != 0);
+  if (unlikely(__pyx_t_1)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bad_offset, 0, 0);
+    __PYX_ERR(0, 317, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":318
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         if offset + 8 > self.size: raise ValueError, "Bad offset!"
+ *         res = atomic_add_u64(self.fileno, <char*>self.mmap, offset, delta, &result)             # <<<<<<<<<<<<<<
+ *         if res == -1:
+ *             err = errno
+ */
+  __pyx_v_res = atomic_add_u64(__pyx_v_self->fileno, ((char *)__pyx_v_self->mmap), __pyx_v_offset, __pyx_v_delta, (&__pyx_v_result));
+
+  /* "pyblooming/cbitmap.pyx":319
+ *         if offset + 8 > self.size: raise ValueError, "Bad offset!"
+ *         res = atomic_add_u64(self.fileno, <char*>self.mmap, offset, delta, &result)
+ *         if res == -1:             # <<<<<<<<<<<<<<
+ *             err = errno
+ *             raise OSError(err, "Failed to lock the counter: %s" % os.strerror(err))
+ */
+  __pyx_t_1 = ((__pyx_v_res == -1L) != 0);
+  if (unlikely(__pyx_t_1)) {
+
+    /* "pyblooming/cbitmap.pyx":320
+ *         res = atomic_add_u64(self.fileno, <char*>self.mmap, offset, delta, &result)
+ *         if res == -1:
+ *             err = errno             # <<<<<<<<<<<<<<
+ *             raise OSError(err, "Failed to lock the counter: %s" % os.strerror(err))
+ *         if delta: self._mark_dirty(offset, offset + 8)
+ */
+    __pyx_t_2 = __Pyx_PyInt_From_int(errno); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 320, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_2);
+    __pyx_v_err = __pyx_t_2;
+    __pyx_t_2 = 0;
+
+    /* "pyblooming/cbitmap.pyx":321
+ *         if res == -1:
+ *             err = errno
+ *             raise OSError(err, "Failed to lock the counter: %s" % os.strerror(err))             # <<<<<<<<<<<<<<
+ *         if delta: self._mark_dirty(offset, offset + 8)
+ *         return result
+ */
+    __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_os); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 321, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_3);
+    __pyx_t_4 = __Pyx_PyObject_GetAttrStr(__pyx_t_3, __pyx_n_s_strerror); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 321, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+    __pyx_t_3 = NULL;
+    if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_4))) {
+      __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_4);
+      if (likely(__pyx_t_3)) {
+        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_4);
+        __Pyx_INCREF(__pyx_t_3);
+        __Pyx_INCREF(function);
+        __Pyx_DECREF_SET(__pyx_t_4, function);
+      }
+    }
+    __pyx_t_2 = (__pyx_t_3) ? __Pyx_PyObject_Call2Args(__pyx_t_4, __pyx_t_3, __pyx_v_err) : __Pyx_PyObject_CallOneArg(__pyx_t_4, __pyx_v_err);
+    __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
+    if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 321, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_2);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+    __pyx_t_4 = __Pyx_PyString_FormatSafe(__pyx_kp_s_Failed_to_lock_the_counter_s, __pyx_t_2); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 321, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+    __pyx_t_2 = PyTuple_New(2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 321, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_2);
+    __Pyx_INCREF(__pyx_v_err);
+    __Pyx_GIVEREF(__pyx_v_err);
+    PyTuple_SET_ITEM(__pyx_t_2, 0, __pyx_v_err);
+    __Pyx_GIVEREF(__pyx_t_4);
+    PyTuple_SET_ITEM(__pyx_t_2, 1, __pyx_t_4);
+    __pyx_t_4 = 0;
+    __pyx_t_4 = __Pyx_PyObject_Call(__pyx_builtin_OSError, __pyx_t_2, NULL); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 321, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+    __Pyx_Raise(__pyx_t_4, 0, 0, 0);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+    __PYX_ERR(0, 321, __pyx_L1_error)
+
+    /* "pyblooming/cbitmap.pyx":319
+ *         if offset + 8 > self.size: raise ValueError, "Bad offset!"
+ *         res = atomic_add_u64(self.fileno, <char*>self.mmap, offset, delta, &result)
+ *         if res == -1:             # <<<<<<<<<<<<<<
+ *             err = errno
+ *             raise OSError(err, "Failed to lock the counter: %s" % os.strerror(err))
+ */
+  }
+
+  /* "pyblooming/cbitmap.pyx":322
+ *             err = errno
+ *             raise OSError(err, "Failed to lock the counter: %s" % os.strerror(err))
+ *         if delta: self._mark_dirty(offset, offset + 8)             # <<<<<<<<<<<<<<
+ *         return result
+ * 
+ */
+  __pyx_t_1 = (__pyx_v_delta != 0);
+  if (__pyx_t_1) {
+    ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_mark_dirty(__pyx_v_self, __pyx_v_offset, (__pyx_v_offset + 8));
+  }
+
+  /* "pyblooming/cbitmap.pyx":323
+ *             raise OSError(err, "Failed to lock the counter: %s" % os.strerror(err))
+ *         if delta: self._mark_dirty(offset, offset + 8)
+ *         return result             # <<<<<<<<<<<<<<
+ * 
+ *     def atomic_load(self, size_t offset):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_4 = __Pyx_PyInt_From_uint64_t(__pyx_v_result); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 323, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __pyx_r = __pyx_t_4;
+  __pyx_t_4 = 0;
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":305
+ *         return bool(self.test_bit_array(self.indices, n))
+ * 
+ *     def atomic_add(self, size_t offset, int64_t delta):             # <<<<<<<<<<<<<<
+ *         """
+ *         Adds delta to the little endian 64 bit counter at a byte
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_2);
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.atomic_add", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XDECREF(__pyx_v_err);
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":325
+ *         return result
+ * 
+ *     def atomic_load(self, size_t offset):             # <<<<<<<<<<<<<<
+ *         "Returns the value of the counter at a byte offset. See atomic_add()"
+ *         return self.atomic_add(offset, 0)
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_19atomic_load(PyObject *__pyx_v_self, PyObject *__pyx_arg_offset); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_18atomic_load[] = "Returns the value of the counter at a byte offset. See atomic_add()";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_19atomic_load(PyObject *__pyx_v_self, PyObject *__pyx_arg_offset) {
+  size_t __pyx_v_offset;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("atomic_load (wrapper)", 0);
+  assert(__pyx_arg_offset); {
+    __pyx_v_offset = __Pyx_PyInt_As_size_t(__pyx_arg_offset); if (unlikely((__pyx_v_offset == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 325, __pyx_L3_error)
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.atomic_load", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_18atomic_load(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), ((size_t)__pyx_v_offset));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_18atomic_load(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t __pyx_v_offset) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  PyObject *__pyx_t_2 = NULL;
+  PyObject *__pyx_t_3 = NULL;
+  PyObject *__pyx_t_4 = NULL;
+  int __pyx_t_5;
+  PyObject *__pyx_t_6 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("atomic_load", 0);
+
+  /* "pyblooming/cbitmap.pyx":327
+ *     def atomic_load(self, size_t offset):
+ *         "Returns the value of the counter at a byte offset. See atomic_add()"
+ *         return self.atomic_add(offset, 0)             # <<<<<<<<<<<<<<
+ * 
+ *     def advise(self, advice):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(((PyObject *)__pyx_v_self), __pyx_n_s_atomic_add); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 327, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __pyx_t_3 = __Pyx_PyInt_FromSize_t(__pyx_v_offset); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 327, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __pyx_t_4 = NULL;
+  __pyx_t_5 = 0;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_2))) {
+    __pyx_t_4 = PyMethod_GET_SELF(__pyx_t_2);
+    if (likely(__pyx_t_4)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_2);
+      __Pyx_INCREF(__pyx_t_4);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_2, function);
+      __pyx_t_5 = 1;
+    }
+  }
+  #if CYTHON_FAST_PYCALL
+  if (PyFunction_Check(__pyx_t_2)) {
+    PyObject *__pyx_temp[3] = {__pyx_t_4, __pyx_t_3, __pyx_int_0};
+    __pyx_t_1 = __Pyx_PyFunction_FastCall(__pyx_t_2, __pyx_temp+1-__pyx_t_5, 2+__pyx_t_5); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 327, __pyx_L1_error)
+    __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  } else
+  #endif
+  #if CYTHON_FAST_PYCCALL
+  if (__Pyx_PyFastCFunction_Check(__pyx_t_2)) {
+    PyObject *__pyx_temp[3] = {__pyx_t_4, __pyx_t_3, __pyx_int_0};
+    __pyx_t_1 = __Pyx_PyCFunction_FastCall(__pyx_t_2, __pyx_temp+1-__pyx_t_5, 2+__pyx_t_5); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 327, __pyx_L1_error)
+    __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+  } else
+  #endif
+  {
+    __pyx_t_6 = PyTuple_New(2+__pyx_t_5); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 327, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_6);
+    if (__pyx_t_4) {
+      __Pyx_GIVEREF(__pyx_t_4); PyTuple_SET_ITEM(__pyx_t_6, 0, __pyx_t_4); __pyx_t_4 = NULL;
+    }
+    __Pyx_GIVEREF(__pyx_t_3);
+    PyTuple_SET_ITEM(__pyx_t_6, 0+__pyx_t_5, __pyx_t_3);
+    __Pyx_INCREF(__pyx_int_0);
+    __Pyx_GIVEREF(__pyx_int_0);
+    PyTuple_SET_ITEM(__pyx_t_6, 1+__pyx_t_5, __pyx_int_0);
+    __pyx_t_3 = 0;
+    __pyx_t_1 = __Pyx_PyObject_Call(__pyx_t_2, __pyx_t_6, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 327, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+  }
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_r = __pyx_t_1;
+  __pyx_t_1 = 0;
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":325
+ *         return result
+ * 
+ *     def atomic_load(self, size_t offset):             # <<<<<<<<<<<<<<
+ *         "Returns the value of the counter at a byte offset. See atomic_add()"
+ *         return self.atomic_add(offset, 0)
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_XDECREF(__pyx_t_2);
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_XDECREF(__pyx_t_6);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.atomic_load", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":329
+ *         return self.atomic_add(offset, 0)
+ * 
+ *     def advise(self, advice):             # <<<<<<<<<<<<<<
+ *         """
+ *         Advises the kernel of the expected access pattern. Takes
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_21advise(PyObject *__pyx_v_self, PyObject *__pyx_v_advice); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_20advise[] = "\n        Advises the kernel of the expected access pattern. Takes\n        one of \"normal\", \"random\", \"sequential\", \"willneed\" or \"hugepage\".\n        ";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_21advise(PyObject *__pyx_v_self, PyObject *__pyx_v_advice) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("advise (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_20advise(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), ((PyObject *)__pyx_v_advice));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_20advise(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_advice) {
+  PyObject *__pyx_v_err = NULL;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_t_2;
+  int __pyx_t_3;
+  PyObject *__pyx_t_4 = NULL;
+  int __pyx_t_5;
+  PyObject *__pyx_t_6 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("advise", 0);
+
+  /* "pyblooming/cbitmap.pyx":334
+ *         one of "normal", "random", "sequential", "willneed" or "hugepage".
+ *         """
+ *         if advice not in ADVICE: raise ValueError, "Unknown advice %r!" % advice             # <<<<<<<<<<<<<<
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         if advise_map(<char*>self.mmap, self.size, ADVICE[advice]) == -1:
+ */
+  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_ADVICE); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 334, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_2 = (__Pyx_PySequence_ContainsTF(__pyx_v_advice, __pyx_t_1, Py_NE)); if (unlikely(__pyx_t_2 < 0)) __PYX_ERR(0, 334, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_t_3 = (__pyx_t_2 != 0);
+  if (unlikely(__pyx_t_3)) {
+    __pyx_t_1 = __Pyx_PyString_FormatSafe(__pyx_kp_s_Unknown_advice_r, __pyx_v_advice); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 334, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_t_1, 0, 0);
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __PYX_ERR(0, 334, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":335
+ *         """
+ *         if advice not in ADVICE: raise ValueError, "Unknown advice %r!" % advice
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"             # <<<<<<<<<<<<<<
+ *         if advise_map(<char*>self.mmap, self.size, ADVICE[advice]) == -1:
+ *             err = errno
+ */
+  __pyx_t_3 = ((__pyx_v_self->mmap == NULL) != 0);
+  if (unlikely(__pyx_t_3)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bitmap_is_closed, 0, 0);
+    __PYX_ERR(0, 335, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":336
+ *         if advice not in ADVICE: raise ValueError, "Unknown advice %r!" % advice
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         if advise_map(<char*>self.mmap, self.size, ADVICE[advice]) == -1:             # <<<<<<<<<<<<<<
+ *             err = errno
+ *             raise OSError(err, "Failed to call madvise(): %s" % os.strerror(err))
+ */
+  __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_ADVICE); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 336, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_4 = __Pyx_PyObject_GetItem(__pyx_t_1, __pyx_v_advice); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 336, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_t_5 = __Pyx_PyInt_As_int(__pyx_t_4); if (unlikely((__pyx_t_5 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 336, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __pyx_t_3 = ((advise_map(((char *)__pyx_v_self->mmap), __pyx_v_self->size, __pyx_t_5) == -1L) != 0);
+  if (unlikely(__pyx_t_3)) {
+
+    /* "pyblooming/cbitmap.pyx":337
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         if advise_map(<char*>self.mmap, self.size, ADVICE[advice]) == -1:
+ *             err = errno             # <<<<<<<<<<<<<<
+ *             raise OSError(err, "Failed to call madvise(): %s" % os.strerror(err))
+ * 
+ */
+    __pyx_t_4 = __Pyx_PyInt_From_int(errno); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 337, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __pyx_v_err = __pyx_t_4;
+    __pyx_t_4 = 0;
+
+    /* "pyblooming/cbitmap.pyx":338
+ *         if advise_map(<char*>self.mmap, self.size, ADVICE[advice]) == -1:
+ *             err = errno
+ *             raise OSError(err, "Failed to call madvise(): %s" % os.strerror(err))             # <<<<<<<<<<<<<<
+ * 
+ *     def prefetch(self):
+ */
+    __Pyx_GetModuleGlobalName(__pyx_t_1, __pyx_n_s_os); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 338, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_1);
+    __pyx_t_6 = __Pyx_PyObject_GetAttrStr(__pyx_t_1, __pyx_n_s_strerror); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 338, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_6);
+    __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+    __pyx_t_1 = NULL;
+    if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_6))) {
+      __pyx_t_1 = PyMethod_GET_SELF(__pyx_t_6);
+      if (likely(__pyx_t_1)) {
+        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_6);
+        __Pyx_INCREF(__pyx_t_1);
+        __Pyx_INCREF(function);
+        __Pyx_DECREF_SET(__pyx_t_6, function);
+      }
+    }
+    __pyx_t_4 = (__pyx_t_1) ? __Pyx_PyObject_Call2Args(__pyx_t_6, __pyx_t_1, __pyx_v_err) : __Pyx_PyObject_CallOneArg(__pyx_t_6, __pyx_v_err);
+    __Pyx_XDECREF(__pyx_t_1); __pyx_t_1 = 0;
+    if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 338, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+    __pyx_t_6 = __Pyx_PyString_FormatSafe(__pyx_kp_s_Failed_to_call_madvise_s, __pyx_t_4); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 338, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_6);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+    __pyx_t_4 = PyTuple_New(2); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 338, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __Pyx_INCREF(__pyx_v_err);
+    __Pyx_GIVEREF(__pyx_v_err);
+    PyTuple_SET_ITEM(__pyx_t_4, 0, __pyx_v_err);
+    __Pyx_GIVEREF(__pyx_t_6);
+    PyTuple_SET_ITEM(__pyx_t_4, 1, __pyx_t_6);
+    __pyx_t_6 = 0;
+    __pyx_t_6 = __Pyx_PyObject_Call(__pyx_builtin_OSError, __pyx_t_4, NULL); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 338, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_6);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+    __Pyx_Raise(__pyx_t_6, 0, 0, 0);
+    __Pyx_DECREF(__pyx_t_6); __pyx_t_6 = 0;
+    __PYX_ERR(0, 338, __pyx_L1_error)
+
+    /* "pyblooming/cbitmap.pyx":336
+ *         if advice not in ADVICE: raise ValueError, "Unknown advice %r!" % advice
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         if advise_map(<char*>self.mmap, self.size, ADVICE[advice]) == -1:             # <<<<<<<<<<<<<<
+ *             err = errno
+ *             raise OSError(err, "Failed to call madvise(): %s" % os.strerror(err))
+ */
+  }
+
+  /* "pyblooming/cbitmap.pyx":329
+ *         return self.atomic_add(offset, 0)
+ * 
+ *     def advise(self, advice):             # <<<<<<<<<<<<<<
+ *         """
+ *         Advises the kernel of the expected access pattern. Takes
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_XDECREF(__pyx_t_6);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.advise", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XDECREF(__pyx_v_err);
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":340
+ *             raise OSError(err, "Failed to call madvise(): %s" % os.strerror(err))
+ * 
+ *     def prefetch(self):             # <<<<<<<<<<<<<<
+ *         """
+ *         Faults in the whole map, reading it from disk in bulk.
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_23prefetch(PyObject *__pyx_v_self, CYTHON_UNUSED PyObject *unused); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_22prefetch[] = "\n        Faults in the whole map, reading it from disk in bulk.\n        This avoids paying a page fault on the first access of\n        each page after a restart.\n        ";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_23prefetch(PyObject *__pyx_v_self, CYTHON_UNUSED PyObject *unused) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("prefetch (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_22prefetch(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_22prefetch(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("prefetch", 0);
+
+  /* "pyblooming/cbitmap.pyx":346
+ *         each page after a restart.
+ *         """
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"             # <<<<<<<<<<<<<<
+ *         with nogil:
+ *             prefetch_map(<char*>self.mmap, self.size)
+ */
+  __pyx_t_1 = ((__pyx_v_self->mmap == NULL) != 0);
+  if (unlikely(__pyx_t_1)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bitmap_is_closed, 0, 0);
+    __PYX_ERR(0, 346, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":347
+ *         """
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         with nogil:             # <<<<<<<<<<<<<<
+ *             prefetch_map(<char*>self.mmap, self.size)
+ * 
+ */
+  {
+      #ifdef WITH_THREAD
+      PyThreadState *_save;
+      Py_UNBLOCK_THREADS
+      __Pyx_FastGIL_Remember();
+      #endif
+      /*try:*/ {
+
+        /* "pyblooming/cbitmap.pyx":348
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         with nogil:
+ *             prefetch_map(<char*>self.mmap, self.size)             # <<<<<<<<<<<<<<
+ * 
+ *     def resident_bytes(self):
+ */
+        prefetch_map(((char *)__pyx_v_self->mmap), __pyx_v_self->size);
+      }
+
+      /* "pyblooming/cbitmap.pyx":347
+ *         """
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         with nogil:             # <<<<<<<<<<<<<<
+ *             prefetch_map(<char*>self.mmap, self.size)
+ * 
+ */
+      /*finally:*/ {
+        /*normal exit:*/{
+          #ifdef WITH_THREAD
+          __Pyx_FastGIL_Forget();
+          Py_BLOCK_THREADS
+          #endif
+          goto __pyx_L6;
+        }
+        __pyx_L6:;
+      }
+  }
+
+  /* "pyblooming/cbitmap.pyx":340
+ *             raise OSError(err, "Failed to call madvise(): %s" % os.strerror(err))
+ * 
+ *     def prefetch(self):             # <<<<<<<<<<<<<<
+ *         """
+ *         Faults in the whole map, reading it from disk in bulk.
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.prefetch", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":350
+ *             prefetch_map(<char*>self.mmap, self.size)
+ * 
+ *     def resident_bytes(self):             # <<<<<<<<<<<<<<
+ *         """
+ *         Returns the number of bytes of the Bitmap which are
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_25resident_bytes(PyObject *__pyx_v_self, CYTHON_UNUSED PyObject *unused); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_24resident_bytes[] = "\n        Returns the number of bytes of the Bitmap which are\n        resident in memory, rounded up to whole pages.\n        ";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_25resident_bytes(PyObject *__pyx_v_self, CYTHON_UNUSED PyObject *unused) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("resident_bytes (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_24resident_bytes(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_24resident_bytes(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self) {
+  PY_LONG_LONG __pyx_v_res;
+  PyObject *__pyx_v_err = NULL;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  PyObject *__pyx_t_2 = NULL;
+  PyObject *__pyx_t_3 = NULL;
+  PyObject *__pyx_t_4 = NULL;
+  size_t __pyx_t_5;
+  PY_LONG_LONG __pyx_t_6;
+  PY_LONG_LONG __pyx_t_7;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("resident_bytes", 0);
+
+  /* "pyblooming/cbitmap.pyx":356
+ *         """
+ *         cdef long long res
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"             # <<<<<<<<<<<<<<
+ *         res = resident_bytes(<char*>self.mmap, self.size)
+ *         if res == -1:
+ */
+  __pyx_t_1 = ((__pyx_v_self->mmap == NULL) != 0);
+  if (unlikely(__pyx_t_1)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bitmap_is_closed, 0, 0);
+    __PYX_ERR(0, 356, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":357
+ *         cdef long long res
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         res = resident_bytes(<char*>self.mmap, self.size)             # <<<<<<<<<<<<<<
+ *         if res == -1:
+ *             err = errno
+ */
+  __pyx_v_res = resident_bytes(((char *)__pyx_v_self->mmap), __pyx_v_self->size);
+
+  /* "pyblooming/cbitmap.pyx":358
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         res = resident_bytes(<char*>self.mmap, self.size)
+ *         if res == -1:             # <<<<<<<<<<<<<<
+ *             err = errno
+ *             raise OSError(err, "Failed to call mincore(): %s" % os.strerror(err))
+ */
+  __pyx_t_1 = ((__pyx_v_res == -1LL) != 0);
+  if (unlikely(__pyx_t_1)) {
+
+    /* "pyblooming/cbitmap.pyx":359
+ *         res = resident_bytes(<char*>self.mmap, self.size)
+ *         if res == -1:
+ *             err = errno             # <<<<<<<<<<<<<<
+ *             raise OSError(err, "Failed to call mincore(): %s" % os.strerror(err))
+ *         return min(res, self.size)
+ */
+    __pyx_t_2 = __Pyx_PyInt_From_int(errno); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 359, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_2);
+    __pyx_v_err = __pyx_t_2;
+    __pyx_t_2 = 0;
+
+    /* "pyblooming/cbitmap.pyx":360
+ *         if res == -1:
+ *             err = errno
+ *             raise OSError(err, "Failed to call mincore(): %s" % os.strerror(err))             # <<<<<<<<<<<<<<
+ *         return min(res, self.size)
+ * 
+ */
+    __Pyx_GetModuleGlobalName(__pyx_t_3, __pyx_n_s_os); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 360, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_3);
+    __pyx_t_4 = __Pyx_PyObject_GetAttrStr(__pyx_t_3, __pyx_n_s_strerror); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 360, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+    __pyx_t_3 = NULL;
+    if (CYTHON_UNPACK_METHODS && unlikely(PyMethod_Check(__pyx_t_4))) {
+      __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_4);
+      if (likely(__pyx_t_3)) {
+        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_4);
+        __Pyx_INCREF(__pyx_t_3);
+        __Pyx_INCREF(function);
+        __Pyx_DECREF_SET(__pyx_t_4, function);
+      }
+    }
+    __pyx_t_2 = (__pyx_t_3) ? __Pyx_PyObject_Call2Args(__pyx_t_4, __pyx_t_3, __pyx_v_err) : __Pyx_PyObject_CallOneArg(__pyx_t_4, __pyx_v_err);
+    __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
+    if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 360, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_2);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+    __pyx_t_4 = __Pyx_PyString_FormatSafe(__pyx_kp_s_Failed_to_call_mincore_s, __pyx_t_2); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 360, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+    __pyx_t_2 = PyTuple_New(2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 360, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_2);
+    __Pyx_INCREF(__pyx_v_err);
+    __Pyx_GIVEREF(__pyx_v_err);
+    PyTuple_SET_ITEM(__pyx_t_2, 0, __pyx_v_err);
+    __Pyx_GIVEREF(__pyx_t_4);
+    PyTuple_SET_ITEM(__pyx_t_2, 1, __pyx_t_4);
+    __pyx_t_4 = 0;
+    __pyx_t_4 = __Pyx_PyObject_Call(__pyx_builtin_OSError, __pyx_t_2, NULL); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 360, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+    __Pyx_Raise(__pyx_t_4, 0, 0, 0);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+    __PYX_ERR(0, 360, __pyx_L1_error)
+
+    /* "pyblooming/cbitmap.pyx":358
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         res = resident_bytes(<char*>self.mmap, self.size)
+ *         if res == -1:             # <<<<<<<<<<<<<<
+ *             err = errno
+ *             raise OSError(err, "Failed to call mincore(): %s" % os.strerror(err))
+ */
+  }
+
+  /* "pyblooming/cbitmap.pyx":361
+ *             err = errno
+ *             raise OSError(err, "Failed to call mincore(): %s" % os.strerror(err))
+ *         return min(res, self.size)             # <<<<<<<<<<<<<<
+ * 
+ *     def flush(self, dirty_only=False):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_5 = __pyx_v_self->size;
+  __pyx_t_6 = __pyx_v_res;
+  if (((__pyx_t_5 < __pyx_t_6) != 0)) {
+    __pyx_t_7 = __pyx_t_5;
+  } else {
+    __pyx_t_7 = __pyx_t_6;
+  }
+  __pyx_t_4 = __Pyx_PyInt_From_PY_LONG_LONG(__pyx_t_7); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 361, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __pyx_r = __pyx_t_4;
+  __pyx_t_4 = 0;
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":350
+ *             prefetch_map(<char*>self.mmap, self.size)
+ * 
+ *     def resident_bytes(self):             # <<<<<<<<<<<<<<
+ *         """
+ *         Returns the number of bytes of the Bitmap which are
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_2);
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.resident_bytes", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XDECREF(__pyx_v_err);
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":363
+ *         return min(res, self.size)
+ * 
+ *     def flush(self, dirty_only=False):             # <<<<<<<<<<<<<<
+ *         """
+ *         Flushes the contents of the Bitmap to disk. If dirty_only
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_27flush(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_26flush[] = "\n        Flushes the contents of the Bitmap to disk. If dirty_only\n        is True, only the pages modified since the last flush are\n        written, instead of syncing the whole map. If the sync fails,\n        the pages stay marked as modified for the next flush.\n        ";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_27flush(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyObject *__pyx_v_dirty_only = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("flush (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_dirty_only,0};
+    PyObject* values[1] = {0};
+    values[0] = ((PyObject *)Py_False);
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_dirty_only);
+          if (value) { values[0] = value; kw_args--; }
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "flush") < 0)) __PYX_ERR(0, 363, __pyx_L3_error)
+      }
+    } else {
+      switch (PyTuple_GET_SIZE(__pyx_args)) {
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+    }
+    __pyx_v_dirty_only = values[0];
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("flush", 0, 0, 1, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 363, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.flush", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_26flush(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), __pyx_v_dirty_only);
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_26flush(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_dirty_only) {
+  int __pyx_v_flushres;
+  int __pyx_v_only;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  PyObject *__pyx_t_2 = NULL;
+  PyObject *__pyx_t_3 = NULL;
+  PyObject *__pyx_t_4 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("flush", 0);
+
+  /* "pyblooming/cbitmap.pyx":370
+ *         the pages stay marked as modified for the next flush.
+ *         """
+ *         cdef int flushres = 0             # <<<<<<<<<<<<<<
+ *         cdef bint only = dirty_only
+ *         if self.mmap:
+ */
+  __pyx_v_flushres = 0;
+
+  /* "pyblooming/cbitmap.pyx":371
+ *         """
+ *         cdef int flushres = 0
+ *         cdef bint only = dirty_only             # <<<<<<<<<<<<<<
+ *         if self.mmap:
+ *             with nogil:
+ */
+  __pyx_t_1 = __Pyx_PyObject_IsTrue(__pyx_v_dirty_only); if (unlikely((__pyx_t_1 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 371, __pyx_L1_error)
+  __pyx_v_only = __pyx_t_1;
+
+  /* "pyblooming/cbitmap.pyx":372
+ *         cdef int flushres = 0
+ *         cdef bint only = dirty_only
+ *         if self.mmap:             # <<<<<<<<<<<<<<
+ *             with nogil:
+ *                 if only:
+ */
+  __pyx_t_1 = (__pyx_v_self->mmap != 0);
+  if (__pyx_t_1) {
+
+    /* "pyblooming/cbitmap.pyx":373
+ *         cdef bint only = dirty_only
+ *         if self.mmap:
+ *             with nogil:             # <<<<<<<<<<<<<<
+ *                 if only:
+ *                     flushres = self._flush_dirty()
+ */
+    {
+        #ifdef WITH_THREAD
+        PyThreadState *_save;
+        Py_UNBLOCK_THREADS
+        __Pyx_FastGIL_Remember();
+        #endif
+        /*try:*/ {
+
+          /* "pyblooming/cbitmap.pyx":374
+ *         if self.mmap:
+ *             with nogil:
+ *                 if only:             # <<<<<<<<<<<<<<
+ *                     flushres = self._flush_dirty()
+ *                 else:
+ */
+          __pyx_t_1 = (__pyx_v_only != 0);
+          if (__pyx_t_1) {
+
+            /* "pyblooming/cbitmap.pyx":375
+ *             with nogil:
+ *                 if only:
+ *                     flushres = self._flush_dirty()             # <<<<<<<<<<<<<<
+ *                 else:
+ *                     memset(self.dirty, 0, (self._pages() + 7) / 8)
+ */
+            __pyx_v_flushres = ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_flush_dirty(__pyx_v_self);
+
+            /* "pyblooming/cbitmap.pyx":374
+ *         if self.mmap:
+ *             with nogil:
+ *                 if only:             # <<<<<<<<<<<<<<
+ *                     flushres = self._flush_dirty()
+ *                 else:
+ */
+            goto __pyx_L7;
+          }
+
+          /* "pyblooming/cbitmap.pyx":377
+ *                     flushres = self._flush_dirty()
+ *                 else:
+ *                     memset(self.dirty, 0, (self._pages() + 7) / 8)             # <<<<<<<<<<<<<<
+ *                     flushres = flush(self.fileno, <char*>self.mmap, self.size)
+ *                     if flushres == -1: self._mark_dirty(0, self.size)
+ */
+          /*else*/ {
+            (void)(memset(__pyx_v_self->dirty, 0, ((((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_pages(__pyx_v_self) + 7) / 8)));
+
+            /* "pyblooming/cbitmap.pyx":378
+ *                 else:
+ *                     memset(self.dirty, 0, (self._pages() + 7) / 8)
+ *                     flushres = flush(self.fileno, <char*>self.mmap, self.size)             # <<<<<<<<<<<<<<
+ *                     if flushres == -1: self._mark_dirty(0, self.size)
+ *             if flushres == -1:
+ */
+            __pyx_v_flushres = flush(__pyx_v_self->fileno, ((char *)__pyx_v_self->mmap), __pyx_v_self->size);
+
+            /* "pyblooming/cbitmap.pyx":379
+ *                     memset(self.dirty, 0, (self._pages() + 7) / 8)
+ *                     flushres = flush(self.fileno, <char*>self.mmap, self.size)
+ *                     if flushres == -1: self._mark_dirty(0, self.size)             # <<<<<<<<<<<<<<
+ *             if flushres == -1:
+ *                 raise OSError, "Failed to flush the buffers!"
+ */
+            __pyx_t_1 = ((__pyx_v_flushres == -1L) != 0);
+            if (__pyx_t_1) {
+              ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_mark_dirty(__pyx_v_self, 0, __pyx_v_self->size);
+            }
+          }
+          __pyx_L7:;
+        }
+
+        /* "pyblooming/cbitmap.pyx":373
+ *         cdef bint only = dirty_only
+ *         if self.mmap:
+ *             with nogil:             # <<<<<<<<<<<<<<
+ *                 if only:
+ *                     flushres = self._flush_dirty()
+ */
+        /*finally:*/ {
+          /*normal exit:*/{
+            #ifdef WITH_THREAD
+            __Pyx_FastGIL_Forget();
+            Py_BLOCK_THREADS
+            #endif
+            goto __pyx_L6;
+          }
+          __pyx_L6:;
+        }
+    }
+
+    /* "pyblooming/cbitmap.pyx":380
+ *                     flushres = flush(self.fileno, <char*>self.mmap, self.size)
+ *                     if flushres == -1: self._mark_dirty(0, self.size)
+ *             if flushres == -1:             # <<<<<<<<<<<<<<
+ *                 raise OSError, "Failed to flush the buffers!"
+ *         if self.fileobj:
+ */
+    __pyx_t_1 = ((__pyx_v_flushres == -1L) != 0);
+    if (unlikely(__pyx_t_1)) {
+
+      /* "pyblooming/cbitmap.pyx":381
+ *                     if flushres == -1: self._mark_dirty(0, self.size)
+ *             if flushres == -1:
+ *                 raise OSError, "Failed to flush the buffers!"             # <<<<<<<<<<<<<<
+ *         if self.fileobj:
+ *             self.fileobj.flush()
+ */
+      __Pyx_Raise(__pyx_builtin_OSError, __pyx_kp_s_Failed_to_flush_the_buffers, 0, 0);
+      __PYX_ERR(0, 381, __pyx_L1_error)
+
+      /* "pyblooming/cbitmap.pyx":380
+ *                     flushres = flush(self.fileno, <char*>self.mmap, self.size)
+ *                     if flushres == -1: self._mark_dirty(0, self.size)
+ *             if flushres == -1:             # <<<<<<<<<<<<<<
+ *                 raise OSError, "Failed to flush the buffers!"
+ *         if self.fileobj:
+ */
+    }
+
+    /* "pyblooming/cbitmap.pyx":372
+ *         cdef int flushres = 0
+ *         cdef bint only = dirty_only
+ *         if self.mmap:             # <<<<<<<<<<<<<<
+ *             with nogil:
+ *                 if only:
+ */
+  }
+
+  /* "pyblooming/cbitmap.pyx":382
+ *             if flushres == -1:
+ *                 raise OSError, "Failed to flush the buffers!"
+ *         if self.fileobj:             # <<<<<<<<<<<<<<
+ *             self.fileobj.flush()
+ * 
+ */
+  __pyx_t_1 = __Pyx_PyObject_IsTrue(__pyx_v_self->fileobj); if (unlikely(__pyx_t_1 < 0)) __PYX_ERR(0, 382, __pyx_L1_error)
+  if (__pyx_t_1) {
+
+    /* "pyblooming/cbitmap.pyx":383
+ *                 raise OSError, "Failed to flush the buffers!"
+ *         if self.fileobj:
+ *             self.fileobj.flush()             # <<<<<<<<<<<<<<
+ * 
+ *     cdef int _flush_dirty(self) nogil:
+ */
+    __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_v_self->fileobj, __pyx_n_s_flush); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 383, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_3);
+    __pyx_t_4 = NULL;
+    if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_3))) {
+      __pyx_t_4 = PyMethod_GET_SELF(__pyx_t_3);
+      if (likely(__pyx_t_4)) {
+        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_3);
+        __Pyx_INCREF(__pyx_t_4);
+        __Pyx_INCREF(function);
+        __Pyx_DECREF_SET(__pyx_t_3, function);
+      }
+    }
+    __pyx_t_2 = (__pyx_t_4) ? __Pyx_PyObject_CallOneArg(__pyx_t_3, __pyx_t_4) : __Pyx_PyObject_CallNoArg(__pyx_t_3);
+    __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
+    if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 383, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_2);
+    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+    /* "pyblooming/cbitmap.pyx":382
+ *             if flushres == -1:
+ *                 raise OSError, "Failed to flush the buffers!"
+ *         if self.fileobj:             # <<<<<<<<<<<<<<
+ *             self.fileobj.flush()
+ * 
+ */
+  }
+
+  /* "pyblooming/cbitmap.pyx":363
+ *         return min(res, self.size)
+ * 
+ *     def flush(self, dirty_only=False):             # <<<<<<<<<<<<<<
+ *         """
+ *         Flushes the contents of the Bitmap to disk. If dirty_only
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_2);
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.flush", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":385
+ *             self.fileobj.flush()
+ * 
+ *     cdef int _flush_dirty(self) nogil:             # <<<<<<<<<<<<<<
+ *         """
+ *         Syncs each run of modified pages. The pages are cleared
+ */
+
+static int __pyx_f_10pyblooming_7cbitmap_6Bitmap__flush_dirty(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self) {
+  size_t __pyx_v_page;
+  size_t __pyx_v_start;
+  size_t __pyx_v_offset;
+  size_t __pyx_v_end;
+  size_t __pyx_v_mask_byte;
+  size_t __pyx_v_redo;
+  size_t __pyx_v_pages;
+  unsigned char __pyx_v_mask;
+  int __pyx_v_in_run;
+  int __pyx_r;
+  int __pyx_t_1;
+  int __pyx_t_2;
+  size_t __pyx_t_3;
+  size_t __pyx_t_4;
+  size_t __pyx_t_5;
+
+  /* "pyblooming/cbitmap.pyx":393
+ *         cleared but not synced are marked again.
+ *         """
+ *         cdef size_t page = 0, start = 0, offset, end, mask_byte = 0, redo             # <<<<<<<<<<<<<<
+ *         cdef size_t pages = self._pages()
+ *         cdef unsigned char mask = 0
+ */
+  __pyx_v_page = 0;
+  __pyx_v_start = 0;
+  __pyx_v_mask_byte = 0;
+
+  /* "pyblooming/cbitmap.pyx":394
+ *         """
+ *         cdef size_t page = 0, start = 0, offset, end, mask_byte = 0, redo
+ *         cdef size_t pages = self._pages()             # <<<<<<<<<<<<<<
+ *         cdef unsigned char mask = 0
+ *         cdef bint in_run = 0
+ */
+  __pyx_v_pages = ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_pages(__pyx_v_self);
+
+  /* "pyblooming/cbitmap.pyx":395
+ *         cdef size_t page = 0, start = 0, offset, end, mask_byte = 0, redo
+ *         cdef size_t pages = self._pages()
+ *         cdef unsigned char mask = 0             # <<<<<<<<<<<<<<
+ *         cdef bint in_run = 0
+ *         while page <= pages:
+ */
+  __pyx_v_mask = 0;
+
+  /* "pyblooming/cbitmap.pyx":396
+ *         cdef size_t pages = self._pages()
+ *         cdef unsigned char mask = 0
+ *         cdef bint in_run = 0             # <<<<<<<<<<<<<<
+ *         while page <= pages:
+ *             if page < pages and page & 7 == 0:
+ */
+  __pyx_v_in_run = 0;
+
+  /* "pyblooming/cbitmap.pyx":397
+ *         cdef unsigned char mask = 0
+ *         cdef bint in_run = 0
+ *         while page <= pages:             # <<<<<<<<<<<<<<
+ *             if page < pages and page & 7 == 0:
+ *                 if not in_run and self.dirty[page >> 3] == 0:
+ */
+  while (1) {
+    __pyx_t_1 = ((__pyx_v_page <= __pyx_v_pages) != 0);
+    if (!__pyx_t_1) break;
+
+    /* "pyblooming/cbitmap.pyx":398
+ *         cdef bint in_run = 0
+ *         while page <= pages:
+ *             if page < pages and page & 7 == 0:             # <<<<<<<<<<<<<<
+ *                 if not in_run and self.dirty[page >> 3] == 0:
+ *                     page += 8
+ */
+    __pyx_t_2 = ((__pyx_v_page < __pyx_v_pages) != 0);
+    if (__pyx_t_2) {
+    } else {
+      __pyx_t_1 = __pyx_t_2;
+      goto __pyx_L6_bool_binop_done;
+    }
+    __pyx_t_2 = (((__pyx_v_page & 7) == 0) != 0);
+    __pyx_t_1 = __pyx_t_2;
+    __pyx_L6_bool_binop_done:;
+    if (__pyx_t_1) {
+
+      /* "pyblooming/cbitmap.pyx":399
+ *         while page <= pages:
+ *             if page < pages and page & 7 == 0:
+ *                 if not in_run and self.dirty[page >> 3] == 0:             # <<<<<<<<<<<<<<
+ *                     page += 8
+ *                     continue
+ */
+      __pyx_t_2 = ((!(__pyx_v_in_run != 0)) != 0);
+      if (__pyx_t_2) {
+      } else {
+        __pyx_t_1 = __pyx_t_2;
+        goto __pyx_L9_bool_binop_done;
+      }
+      __pyx_t_2 = (((__pyx_v_self->dirty[(__pyx_v_page >> 3)]) == 0) != 0);
+      __pyx_t_1 = __pyx_t_2;
+      __pyx_L9_bool_binop_done:;
+      if (__pyx_t_1) {
+
+        /* "pyblooming/cbitmap.pyx":400
+ *             if page < pages and page & 7 == 0:
+ *                 if not in_run and self.dirty[page >> 3] == 0:
+ *                     page += 8             # <<<<<<<<<<<<<<
+ *                     continue
+ *                 mask_byte = page >> 3
+ */
+        __pyx_v_page = (__pyx_v_page + 8);
+
+        /* "pyblooming/cbitmap.pyx":401
+ *                 if not in_run and self.dirty[page >> 3] == 0:
+ *                     page += 8
+ *                     continue             # <<<<<<<<<<<<<<
+ *                 mask_byte = page >> 3
+ *                 mask = __atomic_exchange_n(&self.dirty[mask_byte], 0, __ATOMIC_SEQ_CST)
+ */
+        goto __pyx_L3_continue;
+
+        /* "pyblooming/cbitmap.pyx":399
+ *         while page <= pages:
+ *             if page < pages and page & 7 == 0:
+ *                 if not in_run and self.dirty[page >> 3] == 0:             # <<<<<<<<<<<<<<
+ *                     page += 8
+ *                     continue
+ */
+      }
+
+      /* "pyblooming/cbitmap.pyx":402
+ *                     page += 8
+ *                     continue
+ *                 mask_byte = page >> 3             # <<<<<<<<<<<<<<
+ *                 mask = __atomic_exchange_n(&self.dirty[mask_byte], 0, __ATOMIC_SEQ_CST)
+ * 
+ */
+      __pyx_v_mask_byte = (__pyx_v_page >> 3);
+
+      /* "pyblooming/cbitmap.pyx":403
+ *                     continue
+ *                 mask_byte = page >> 3
+ *                 mask = __atomic_exchange_n(&self.dirty[mask_byte], 0, __ATOMIC_SEQ_CST)             # <<<<<<<<<<<<<<
+ * 
+ *             # Extend the current run, or sync it when it ends
+ */
+      __pyx_v_mask = __atomic_exchange_n((&(__pyx_v_self->dirty[__pyx_v_mask_byte])), 0, __ATOMIC_SEQ_CST);
+
+      /* "pyblooming/cbitmap.pyx":398
+ *         cdef bint in_run = 0
+ *         while page <= pages:
+ *             if page < pages and page & 7 == 0:             # <<<<<<<<<<<<<<
+ *                 if not in_run and self.dirty[page >> 3] == 0:
+ *                     page += 8
+ */
+    }
+
+    /* "pyblooming/cbitmap.pyx":406
+ * 
+ *             # Extend the current run, or sync it when it ends
+ *             if page < pages and mask & (1 << (page & 7)):             # <<<<<<<<<<<<<<
+ *                 if not in_run: start = page
+ *                 in_run = 1
+ */
+    __pyx_t_2 = ((__pyx_v_page < __pyx_v_pages) != 0);
+    if (__pyx_t_2) {
+    } else {
+      __pyx_t_1 = __pyx_t_2;
+      goto __pyx_L12_bool_binop_done;
+    }
+    __pyx_t_2 = ((__pyx_v_mask & (1 << (__pyx_v_page & 7))) != 0);
+    __pyx_t_1 = __pyx_t_2;
+    __pyx_L12_bool_binop_done:;
+    if (__pyx_t_1) {
+
+      /* "pyblooming/cbitmap.pyx":407
+ *             # Extend the current run, or sync it when it ends
+ *             if page < pages and mask & (1 << (page & 7)):
+ *                 if not in_run: start = page             # <<<<<<<<<<<<<<
+ *                 in_run = 1
+ *             elif in_run:
+ */
+      __pyx_t_1 = ((!(__pyx_v_in_run != 0)) != 0);
+      if (__pyx_t_1) {
+        __pyx_v_start = __pyx_v_page;
+      }
+
+      /* "pyblooming/cbitmap.pyx":408
+ *             if page < pages and mask & (1 << (page & 7)):
+ *                 if not in_run: start = page
+ *                 in_run = 1             # <<<<<<<<<<<<<<
+ *             elif in_run:
+ *                 in_run = 0
+ */
+      __pyx_v_in_run = 1;
+
+      /* "pyblooming/cbitmap.pyx":406
+ * 
+ *             # Extend the current run, or sync it when it ends
+ *             if page < pages and mask & (1 << (page & 7)):             # <<<<<<<<<<<<<<
+ *                 if not in_run: start = page
+ *                 in_run = 1
+ */
+      goto __pyx_L11;
+    }
+
+    /* "pyblooming/cbitmap.pyx":409
+ *                 if not in_run: start = page
+ *                 in_run = 1
+ *             elif in_run:             # <<<<<<<<<<<<<<
+ *                 in_run = 0
+ *                 offset = start << self.page_shift
+ */
+    __pyx_t_1 = (__pyx_v_in_run != 0);
+    if (__pyx_t_1) {
+
+      /* "pyblooming/cbitmap.pyx":410
+ *                 in_run = 1
+ *             elif in_run:
+ *                 in_run = 0             # <<<<<<<<<<<<<<
+ *                 offset = start << self.page_shift
+ *                 end = min(page << self.page_shift, self.size)
+ */
+      __pyx_v_in_run = 0;
+
+      /* "pyblooming/cbitmap.pyx":411
+ *             elif in_run:
+ *                 in_run = 0
+ *                 offset = start << self.page_shift             # <<<<<<<<<<<<<<
+ *                 end = min(page << self.page_shift, self.size)
+ *                 if flush_range(self.fileno, <char*>self.mmap + offset, end - offset) == -1:
+ */
+      __pyx_v_offset = (__pyx_v_start << __pyx_v_self->page_shift);
+
+      /* "pyblooming/cbitmap.pyx":412
+ *                 in_run = 0
+ *                 offset = start << self.page_shift
+ *                 end = min(page << self.page_shift, self.size)             # <<<<<<<<<<<<<<
+ *                 if flush_range(self.fileno, <char*>self.mmap + offset, end - offset) == -1:
+ *                     for redo in range(start, page):
+ */
+      __pyx_t_3 = __pyx_v_self->size;
+      __pyx_t_4 = (__pyx_v_page << __pyx_v_self->page_shift);
+      if (((__pyx_t_3 < __pyx_t_4) != 0)) {
+        __pyx_t_5 = __pyx_t_3;
+      } else {
+        __pyx_t_5 = __pyx_t_4;
+      }
+      __pyx_v_end = __pyx_t_5;
+
+      /* "pyblooming/cbitmap.pyx":413
+ *                 offset = start << self.page_shift
+ *                 end = min(page << self.page_shift, self.size)
+ *                 if flush_range(self.fileno, <char*>self.mmap + offset, end - offset) == -1:             # <<<<<<<<<<<<<<
+ *                     for redo in range(start, page):
+ *                         __atomic_fetch_or(&self.dirty[redo >> 3], 1 << (redo & 7), __ATOMIC_RELAXED)
+ */
+      __pyx_t_1 = ((flush_range(__pyx_v_self->fileno, (((char *)__pyx_v_self->mmap) + __pyx_v_offset), (__pyx_v_end - __pyx_v_offset)) == -1L) != 0);
+      if (__pyx_t_1) {
+
+        /* "pyblooming/cbitmap.pyx":414
+ *                 end = min(page << self.page_shift, self.size)
+ *                 if flush_range(self.fileno, <char*>self.mmap + offset, end - offset) == -1:
+ *                     for redo in range(start, page):             # <<<<<<<<<<<<<<
+ *                         __atomic_fetch_or(&self.dirty[redo >> 3], 1 << (redo & 7), __ATOMIC_RELAXED)
+ *                     __atomic_fetch_or(&self.dirty[mask_byte], mask, __ATOMIC_RELAXED)
+ */
+        __pyx_t_5 = __pyx_v_page;
+        __pyx_t_3 = __pyx_t_5;
+        for (__pyx_t_4 = __pyx_v_start; __pyx_t_4 < __pyx_t_3; __pyx_t_4+=1) {
+          __pyx_v_redo = __pyx_t_4;
+
+          /* "pyblooming/cbitmap.pyx":415
+ *                 if flush_range(self.fileno, <char*>self.mmap + offset, end - offset) == -1:
+ *                     for redo in range(start, page):
+ *                         __atomic_fetch_or(&self.dirty[redo >> 3], 1 << (redo & 7), __ATOMIC_RELAXED)             # <<<<<<<<<<<<<<
+ *                     __atomic_fetch_or(&self.dirty[mask_byte], mask, __ATOMIC_RELAXED)
+ *                     return -1
+ */
+          (void)(__atomic_fetch_or((&(__pyx_v_self->dirty[(__pyx_v_redo >> 3)])), (1 << (__pyx_v_redo & 7)), __ATOMIC_RELAXED));
+        }
+
+        /* "pyblooming/cbitmap.pyx":416
+ *                     for redo in range(start, page):
+ *                         __atomic_fetch_or(&self.dirty[redo >> 3], 1 << (redo & 7), __ATOMIC_RELAXED)
+ *                     __atomic_fetch_or(&self.dirty[mask_byte], mask, __ATOMIC_RELAXED)             # <<<<<<<<<<<<<<
+ *                     return -1
+ *             page += 1
+ */
+        (void)(__atomic_fetch_or((&(__pyx_v_self->dirty[__pyx_v_mask_byte])), __pyx_v_mask, __ATOMIC_RELAXED));
+
+        /* "pyblooming/cbitmap.pyx":417
+ *                         __atomic_fetch_or(&self.dirty[redo >> 3], 1 << (redo & 7), __ATOMIC_RELAXED)
+ *                     __atomic_fetch_or(&self.dirty[mask_byte], mask, __ATOMIC_RELAXED)
+ *                     return -1             # <<<<<<<<<<<<<<
+ *             page += 1
+ *         return 0
+ */
+        __pyx_r = -1;
+        goto __pyx_L0;
+
+        /* "pyblooming/cbitmap.pyx":413
+ *                 offset = start << self.page_shift
+ *                 end = min(page << self.page_shift, self.size)
+ *                 if flush_range(self.fileno, <char*>self.mmap + offset, end - offset) == -1:             # <<<<<<<<<<<<<<
+ *                     for redo in range(start, page):
+ *                         __atomic_fetch_or(&self.dirty[redo >> 3], 1 << (redo & 7), __ATOMIC_RELAXED)
+ */
+      }
+
+      /* "pyblooming/cbitmap.pyx":409
+ *                 if not in_run: start = page
+ *                 in_run = 1
+ *             elif in_run:             # <<<<<<<<<<<<<<
+ *                 in_run = 0
+ *                 offset = start << self.page_shift
+ */
+    }
+    __pyx_L11:;
+
+    /* "pyblooming/cbitmap.pyx":418
+ *                     __atomic_fetch_or(&self.dirty[mask_byte], mask, __ATOMIC_RELAXED)
+ *                     return -1
+ *             page += 1             # <<<<<<<<<<<<<<
+ *         return 0
+ * 
+ */
+    __pyx_v_page = (__pyx_v_page + 1);
+    __pyx_L3_continue:;
+  }
+
+  /* "pyblooming/cbitmap.pyx":419
+ *                     return -1
+ *             page += 1
+ *         return 0             # <<<<<<<<<<<<<<
+ * 
+ *     def dirty_bytes(self):
+ */
+  __pyx_r = 0;
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":385
+ *             self.fileobj.flush()
+ * 
+ *     cdef int _flush_dirty(self) nogil:             # <<<<<<<<<<<<<<
+ *         """
+ *         Syncs each run of modified pages. The pages are cleared
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":421
+ *         return 0
+ * 
+ *     def dirty_bytes(self):             # <<<<<<<<<<<<<<
+ *         """
+ *         Returns the number of bytes in the pages modified
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_29dirty_bytes(PyObject *__pyx_v_self, CYTHON_UNUSED PyObject *unused); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_28dirty_bytes[] = "\n        Returns the number of bytes in the pages modified\n        since the last flush. This is what flush(dirty_only=True)\n        would write.\n        ";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_29dirty_bytes(PyObject *__pyx_v_self, CYTHON_UNUSED PyObject *unused) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("dirty_bytes (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_28dirty_bytes(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_28dirty_bytes(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self) {
+  size_t __pyx_v_page;
+  size_t __pyx_v_count;
+  size_t __pyx_v_pages;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  size_t __pyx_t_1;
+  size_t __pyx_t_2;
+  size_t __pyx_t_3;
+  int __pyx_t_4;
+  size_t __pyx_t_5;
+  size_t __pyx_t_6;
+  size_t __pyx_t_7;
+  PyObject *__pyx_t_8 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("dirty_bytes", 0);
+
+  /* "pyblooming/cbitmap.pyx":427
+ *         would write.
+ *         """
+ *         cdef size_t page, count = 0             # <<<<<<<<<<<<<<
+ *         cdef size_t pages = self._pages()
+ *         for page in range(pages):
+ */
+  __pyx_v_count = 0;
+
+  /* "pyblooming/cbitmap.pyx":428
+ *         """
+ *         cdef size_t page, count = 0
+ *         cdef size_t pages = self._pages()             # <<<<<<<<<<<<<<
+ *         for page in range(pages):
+ *             if self.dirty[page >> 3] & (1 << (page & 7)):
+ */
+  __pyx_v_pages = ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_pages(__pyx_v_self);
+
+  /* "pyblooming/cbitmap.pyx":429
+ *         cdef size_t page, count = 0
+ *         cdef size_t pages = self._pages()
+ *         for page in range(pages):             # <<<<<<<<<<<<<<
+ *             if self.dirty[page >> 3] & (1 << (page & 7)):
+ *                 count += min((page + 1) << self.page_shift, self.size) - (page << self.page_shift)
+ */
+  __pyx_t_1 = __pyx_v_pages;
+  __pyx_t_2 = __pyx_t_1;
+  for (__pyx_t_3 = 0; __pyx_t_3 < __pyx_t_2; __pyx_t_3+=1) {
+    __pyx_v_page = __pyx_t_3;
+
+    /* "pyblooming/cbitmap.pyx":430
+ *         cdef size_t pages = self._pages()
+ *         for page in range(pages):
+ *             if self.dirty[page >> 3] & (1 << (page & 7)):             # <<<<<<<<<<<<<<
+ *                 count += min((page + 1) << self.page_shift, self.size) - (page << self.page_shift)
+ *         return count
+ */
+    __pyx_t_4 = (((__pyx_v_self->dirty[(__pyx_v_page >> 3)]) & (1 << (__pyx_v_page & 7))) != 0);
+    if (__pyx_t_4) {
+
+      /* "pyblooming/cbitmap.pyx":431
+ *         for page in range(pages):
+ *             if self.dirty[page >> 3] & (1 << (page & 7)):
+ *                 count += min((page + 1) << self.page_shift, self.size) - (page << self.page_shift)             # <<<<<<<<<<<<<<
+ *         return count
+ * 
+ */
+      __pyx_t_5 = __pyx_v_self->size;
+      __pyx_t_6 = ((__pyx_v_page + 1) << __pyx_v_self->page_shift);
+      if (((__pyx_t_5 < __pyx_t_6) != 0)) {
+        __pyx_t_7 = __pyx_t_5;
+      } else {
+        __pyx_t_7 = __pyx_t_6;
+      }
+      __pyx_v_count = (__pyx_v_count + (__pyx_t_7 - (__pyx_v_page << __pyx_v_self->page_shift)));
+
+      /* "pyblooming/cbitmap.pyx":430
+ *         cdef size_t pages = self._pages()
+ *         for page in range(pages):
+ *             if self.dirty[page >> 3] & (1 << (page & 7)):             # <<<<<<<<<<<<<<
+ *                 count += min((page + 1) << self.page_shift, self.size) - (page << self.page_shift)
+ *         return count
+ */
+    }
+  }
+
+  /* "pyblooming/cbitmap.pyx":432
+ *             if self.dirty[page >> 3] & (1 << (page & 7)):
+ *                 count += min((page + 1) << self.page_shift, self.size) - (page << self.page_shift)
+ *         return count             # <<<<<<<<<<<<<<
+ * 
+ *     cdef void _mark_dirty(self, size_t start, size_t end) nogil:
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_8 = __Pyx_PyInt_FromSize_t(__pyx_v_count); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 432, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_8);
+  __pyx_r = __pyx_t_8;
+  __pyx_t_8 = 0;
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":421
+ *         return 0
+ * 
+ *     def dirty_bytes(self):             # <<<<<<<<<<<<<<
+ *         """
+ *         Returns the number of bytes in the pages modified
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_8);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.dirty_bytes", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":434
+ *         return count
+ * 
+ *     cdef void _mark_dirty(self, size_t start, size_t end) nogil:             # <<<<<<<<<<<<<<
+ *         "Marks the pages covering the bytes from start to end as modified"
+ *         cdef size_t page
+ */
+
+static void __pyx_f_10pyblooming_7cbitmap_6Bitmap__mark_dirty(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t __pyx_v_start, size_t __pyx_v_end) {
+  size_t __pyx_v_page;
+  int __pyx_t_1;
+  size_t __pyx_t_2;
+  size_t __pyx_t_3;
+  size_t __pyx_t_4;
+
+  /* "pyblooming/cbitmap.pyx":437
+ *         "Marks the pages covering the bytes from start to end as modified"
+ *         cdef size_t page
+ *         if end <= start: return             # <<<<<<<<<<<<<<
+ *         for page in range(start >> self.page_shift, ((end - 1) >> self.page_shift) + 1):
+ *             if self.atomic:
+ */
+  __pyx_t_1 = ((__pyx_v_end <= __pyx_v_start) != 0);
+  if (__pyx_t_1) {
+    goto __pyx_L0;
+  }
+
+  /* "pyblooming/cbitmap.pyx":438
+ *         cdef size_t page
+ *         if end <= start: return
+ *         for page in range(start >> self.page_shift, ((end - 1) >> self.page_shift) + 1):             # <<<<<<<<<<<<<<
+ *             if self.atomic:
+ *                 __atomic_fetch_or(&self.dirty[page >> 3], 1 << (page & 7), __ATOMIC_RELAXED)
+ */
+  __pyx_t_2 = (((__pyx_v_end - 1) >> __pyx_v_self->page_shift) + 1);
+  __pyx_t_3 = __pyx_t_2;
+  for (__pyx_t_4 = (__pyx_v_start >> __pyx_v_self->page_shift); __pyx_t_4 < __pyx_t_3; __pyx_t_4+=1) {
+    __pyx_v_page = __pyx_t_4;
+
+    /* "pyblooming/cbitmap.pyx":439
+ *         if end <= start: return
+ *         for page in range(start >> self.page_shift, ((end - 1) >> self.page_shift) + 1):
+ *             if self.atomic:             # <<<<<<<<<<<<<<
+ *                 __atomic_fetch_or(&self.dirty[page >> 3], 1 << (page & 7), __ATOMIC_RELAXED)
+ *             else:
+ */
+    __pyx_t_1 = (__pyx_v_self->atomic != 0);
+    if (__pyx_t_1) {
+
+      /* "pyblooming/cbitmap.pyx":440
+ *         for page in range(start >> self.page_shift, ((end - 1) >> self.page_shift) + 1):
+ *             if self.atomic:
+ *                 __atomic_fetch_or(&self.dirty[page >> 3], 1 << (page & 7), __ATOMIC_RELAXED)             # <<<<<<<<<<<<<<
+ *             else:
+ *                 self.dirty[page >> 3] = self.dirty[page >> 3] | 1 << (page & 7)
+ */
+      (void)(__atomic_fetch_or((&(__pyx_v_self->dirty[(__pyx_v_page >> 3)])), (1 << (__pyx_v_page & 7)), __ATOMIC_RELAXED));
+
+      /* "pyblooming/cbitmap.pyx":439
+ *         if end <= start: return
+ *         for page in range(start >> self.page_shift, ((end - 1) >> self.page_shift) + 1):
+ *             if self.atomic:             # <<<<<<<<<<<<<<
+ *                 __atomic_fetch_or(&self.dirty[page >> 3], 1 << (page & 7), __ATOMIC_RELAXED)
+ *             else:
+ */
+      goto __pyx_L6;
+    }
+
+    /* "pyblooming/cbitmap.pyx":442
+ *                 __atomic_fetch_or(&self.dirty[page >> 3], 1 << (page & 7), __ATOMIC_RELAXED)
+ *             else:
+ *                 self.dirty[page >> 3] = self.dirty[page >> 3] | 1 << (page & 7)             # <<<<<<<<<<<<<<
+ * 
+ *     cdef size_t _pages(self) nogil:
+ */
+    /*else*/ {
+      (__pyx_v_self->dirty[(__pyx_v_page >> 3)]) = ((__pyx_v_self->dirty[(__pyx_v_page >> 3)]) | (1 << (__pyx_v_page & 7)));
+    }
+    __pyx_L6:;
+  }
+
+  /* "pyblooming/cbitmap.pyx":434
+ *         return count
+ * 
+ *     cdef void _mark_dirty(self, size_t start, size_t end) nogil:             # <<<<<<<<<<<<<<
+ *         "Marks the pages covering the bytes from start to end as modified"
+ *         cdef size_t page
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+}
+
+/* "pyblooming/cbitmap.pyx":444
+ *                 self.dirty[page >> 3] = self.dirty[page >> 3] | 1 << (page & 7)
+ * 
+ *     cdef size_t _pages(self) nogil:             # <<<<<<<<<<<<<<
+ *         "Returns the number of pages in the map"
+ *         return (self.size + (1 << self.page_shift) - 1) >> self.page_shift
+ */
+
+static size_t __pyx_f_10pyblooming_7cbitmap_6Bitmap__pages(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self) {
+  size_t __pyx_r;
+
+  /* "pyblooming/cbitmap.pyx":446
+ *     cdef size_t _pages(self) nogil:
+ *         "Returns the number of pages in the map"
+ *         return (self.size + (1 << self.page_shift) - 1) >> self.page_shift             # <<<<<<<<<<<<<<
+ * 
+ *     def close(self, flush=True):
+ */
+  __pyx_r = (((__pyx_v_self->size + (1 << __pyx_v_self->page_shift)) - 1) >> __pyx_v_self->page_shift);
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":444
+ *                 self.dirty[page >> 3] = self.dirty[page >> 3] | 1 << (page & 7)
+ * 
+ *     cdef size_t _pages(self) nogil:             # <<<<<<<<<<<<<<
+ *         "Returns the number of pages in the map"
+ *         return (self.size + (1 << self.page_shift) - 1) >> self.page_shift
+ */
+
+  /* function exit code */
+  __pyx_L0:;
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":448
+ *         return (self.size + (1 << self.page_shift) - 1) >> self.page_shift
+ * 
+ *     def close(self, flush=True):             # <<<<<<<<<<<<<<
+ *         "Closes the Bitmap, flushing the data if requried."
+ *         # Safety first!
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_31close(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_30close[] = "Closes the Bitmap, flushing the data if requried.";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_31close(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyObject *__pyx_v_flush = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("close (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_flush,0};
+    PyObject* values[1] = {0};
+    values[0] = ((PyObject *)Py_True);
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_flush);
+          if (value) { values[0] = value; kw_args--; }
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "close") < 0)) __PYX_ERR(0, 448, __pyx_L3_error)
+      }
+    } else {
+      switch (PyTuple_GET_SIZE(__pyx_args)) {
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+    }
+    __pyx_v_flush = values[0];
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("close", 0, 0, 1, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 448, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.close", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_30close(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), __pyx_v_flush);
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_30close(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_flush) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  PyObject *__pyx_t_2 = NULL;
+  PyObject *__pyx_t_3 = NULL;
+  PyObject *__pyx_t_4 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("close", 0);
+
+  /* "pyblooming/cbitmap.pyx":451
+ *         "Closes the Bitmap, flushing the data if requried."
+ *         # Safety first!
+ *         if flush:             # <<<<<<<<<<<<<<
+ *             self.flush()
+ * 
+ */
+  __pyx_t_1 = __Pyx_PyObject_IsTrue(__pyx_v_flush); if (unlikely(__pyx_t_1 < 0)) __PYX_ERR(0, 451, __pyx_L1_error)
+  if (__pyx_t_1) {
+
+    /* "pyblooming/cbitmap.pyx":452
+ *         # Safety first!
+ *         if flush:
+ *             self.flush()             # <<<<<<<<<<<<<<
+ * 
+ *         # Close the mmap
+ */
+    __pyx_t_3 = __Pyx_PyObject_GetAttrStr(((PyObject *)__pyx_v_self), __pyx_n_s_flush); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 452, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_3);
+    __pyx_t_4 = NULL;
+    if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_3))) {
+      __pyx_t_4 = PyMethod_GET_SELF(__pyx_t_3);
+      if (likely(__pyx_t_4)) {
+        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_3);
+        __Pyx_INCREF(__pyx_t_4);
+        __Pyx_INCREF(function);
+        __Pyx_DECREF_SET(__pyx_t_3, function);
+      }
+    }
+    __pyx_t_2 = (__pyx_t_4) ? __Pyx_PyObject_CallOneArg(__pyx_t_3, __pyx_t_4) : __Pyx_PyObject_CallNoArg(__pyx_t_3);
+    __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
+    if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 452, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_2);
+    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+    /* "pyblooming/cbitmap.pyx":451
+ *         "Closes the Bitmap, flushing the data if requried."
+ *         # Safety first!
+ *         if flush:             # <<<<<<<<<<<<<<
+ *             self.flush()
+ * 
+ */
+  }
+
+  /* "pyblooming/cbitmap.pyx":455
+ * 
+ *         # Close the mmap
+ *         if self.mmap:             # <<<<<<<<<<<<<<
+ *             mummap_file(<char*>self.mmap, self.size)
+ *             self.mmap = NULL
+ */
+  __pyx_t_1 = (__pyx_v_self->mmap != 0);
+  if (__pyx_t_1) {
+
+    /* "pyblooming/cbitmap.pyx":456
+ *         # Close the mmap
+ *         if self.mmap:
+ *             mummap_file(<char*>self.mmap, self.size)             # <<<<<<<<<<<<<<
+ *             self.mmap = NULL
+ * 
+ */
+    (void)(mummap_file(((char *)__pyx_v_self->mmap), __pyx_v_self->size));
+
+    /* "pyblooming/cbitmap.pyx":457
+ *         if self.mmap:
+ *             mummap_file(<char*>self.mmap, self.size)
+ *             self.mmap = NULL             # <<<<<<<<<<<<<<
+ * 
+ *         # For non-anonymous maps, we need to close the file
+ */
+    __pyx_v_self->mmap = NULL;
+
+    /* "pyblooming/cbitmap.pyx":455
+ * 
+ *         # Close the mmap
+ *         if self.mmap:             # <<<<<<<<<<<<<<
+ *             mummap_file(<char*>self.mmap, self.size)
+ *             self.mmap = NULL
+ */
+  }
+
+  /* "pyblooming/cbitmap.pyx":460
+ * 
+ *         # For non-anonymous maps, we need to close the file
+ *         if self.fileobj:             # <<<<<<<<<<<<<<
+ *             self.fileobj.close()
+ *             self.fileobj = None
+ */
+  __pyx_t_1 = __Pyx_PyObject_IsTrue(__pyx_v_self->fileobj); if (unlikely(__pyx_t_1 < 0)) __PYX_ERR(0, 460, __pyx_L1_error)
+  if (__pyx_t_1) {
+
+    /* "pyblooming/cbitmap.pyx":461
+ *         # For non-anonymous maps, we need to close the file
+ *         if self.fileobj:
+ *             self.fileobj.close()             # <<<<<<<<<<<<<<
+ *             self.fileobj = None
+ * 
+ */
+    __pyx_t_3 = __Pyx_PyObject_GetAttrStr(__pyx_v_self->fileobj, __pyx_n_s_close); if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 461, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_3);
+    __pyx_t_4 = NULL;
+    if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_3))) {
+      __pyx_t_4 = PyMethod_GET_SELF(__pyx_t_3);
+      if (likely(__pyx_t_4)) {
+        PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_3);
+        __Pyx_INCREF(__pyx_t_4);
+        __Pyx_INCREF(function);
+        __Pyx_DECREF_SET(__pyx_t_3, function);
+      }
+    }
+    __pyx_t_2 = (__pyx_t_4) ? __Pyx_PyObject_CallOneArg(__pyx_t_3, __pyx_t_4) : __Pyx_PyObject_CallNoArg(__pyx_t_3);
+    __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
+    if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 461, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_2);
+    __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+    /* "pyblooming/cbitmap.pyx":462
+ *         if self.fileobj:
+ *             self.fileobj.close()
+ *             self.fileobj = None             # <<<<<<<<<<<<<<
+ * 
+ *     def __getslice__(self, i, j):
+ */
+    __Pyx_INCREF(Py_None);
+    __Pyx_GIVEREF(Py_None);
+    __Pyx_GOTREF(__pyx_v_self->fileobj);
+    __Pyx_DECREF(__pyx_v_self->fileobj);
+    __pyx_v_self->fileobj = Py_None;
+
+    /* "pyblooming/cbitmap.pyx":460
+ * 
+ *         # For non-anonymous maps, we need to close the file
+ *         if self.fileobj:             # <<<<<<<<<<<<<<
+ *             self.fileobj.close()
+ *             self.fileobj = None
+ */
+  }
+
+  /* "pyblooming/cbitmap.pyx":448
+ *         return (self.size + (1 << self.page_shift) - 1) >> self.page_shift
+ * 
+ *     def close(self, flush=True):             # <<<<<<<<<<<<<<
+ *         "Closes the Bitmap, flushing the data if requried."
+ *         # Safety first!
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_2);
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.close", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":464
+ *             self.fileobj = None
+ * 
+ *     def __getslice__(self, i, j):             # <<<<<<<<<<<<<<
+ *         "Allow direct access to the mmap, indexed by byte"
+ *         if i >= j or i < 0 or j > self.size: raise ValueError, "Bad slice!"
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_33__getslice__(PyObject *__pyx_v_self, Py_ssize_t __pyx_arg_i, Py_ssize_t __pyx_arg_j); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_32__getslice__[] = "Allow direct access to the mmap, indexed by byte";
+#if CYTHON_UPDATE_DESCRIPTOR_DOC
+struct wrapperbase __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_32__getslice__;
+#endif
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_33__getslice__(PyObject *__pyx_v_self, Py_ssize_t __pyx_arg_i, Py_ssize_t __pyx_arg_j) {
+  PyObject *__pyx_v_i = 0;
+  PyObject *__pyx_v_j = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__getslice__ (wrapper)", 0);
+  __pyx_v_i = PyInt_FromSsize_t(__pyx_arg_i); if (unlikely(!__pyx_v_i)) __PYX_ERR(0, 464, __pyx_L3_error)
+  __Pyx_GOTREF(__pyx_v_i);
+  __pyx_v_j = PyInt_FromSsize_t(__pyx_arg_j); if (unlikely(!__pyx_v_j)) __PYX_ERR(0, 464, __pyx_L3_error)
+  __Pyx_GOTREF(__pyx_v_j);
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__getslice__", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_32__getslice__(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), ((PyObject *)__pyx_v_i), ((PyObject *)__pyx_v_j));
+
+  /* function exit code */
+  __Pyx_XDECREF(__pyx_v_i);
+  __Pyx_XDECREF(__pyx_v_j);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_32__getslice__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_i, PyObject *__pyx_v_j) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  PyObject *__pyx_t_2 = NULL;
+  int __pyx_t_3;
+  PyObject *__pyx_t_4 = NULL;
+  Py_ssize_t __pyx_t_5;
+  Py_ssize_t __pyx_t_6;
+  Py_ssize_t __pyx_t_7;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("__getslice__", 0);
+
+  /* "pyblooming/cbitmap.pyx":466
+ *     def __getslice__(self, i, j):
+ *         "Allow direct access to the mmap, indexed by byte"
+ *         if i >= j or i < 0 or j > self.size: raise ValueError, "Bad slice!"             # <<<<<<<<<<<<<<
+ *         # Create a null terminated string
+ *         return self.mmap[i:j]
+ */
+  __pyx_t_2 = PyObject_RichCompare(__pyx_v_i, __pyx_v_j, Py_GE); __Pyx_XGOTREF(__pyx_t_2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 466, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyObject_IsTrue(__pyx_t_2); if (unlikely(__pyx_t_3 < 0)) __PYX_ERR(0, 466, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  if (!__pyx_t_3) {
+  } else {
+    __pyx_t_1 = __pyx_t_3;
+    goto __pyx_L4_bool_binop_done;
+  }
+  __pyx_t_2 = PyObject_RichCompare(__pyx_v_i, __pyx_int_0, Py_LT); __Pyx_XGOTREF(__pyx_t_2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 466, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyObject_IsTrue(__pyx_t_2); if (unlikely(__pyx_t_3 < 0)) __PYX_ERR(0, 466, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  if (!__pyx_t_3) {
+  } else {
+    __pyx_t_1 = __pyx_t_3;
+    goto __pyx_L4_bool_binop_done;
+  }
+  __pyx_t_2 = __Pyx_PyInt_FromSize_t(__pyx_v_self->size); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 466, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __pyx_t_4 = PyObject_RichCompare(__pyx_v_j, __pyx_t_2, Py_GT); __Pyx_XGOTREF(__pyx_t_4); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 466, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_t_3 = __Pyx_PyObject_IsTrue(__pyx_t_4); if (unlikely(__pyx_t_3 < 0)) __PYX_ERR(0, 466, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __pyx_t_1 = __pyx_t_3;
+  __pyx_L4_bool_binop_done:;
+  if (unlikely(__pyx_t_1)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bad_slice, 0, 0);
+    __PYX_ERR(0, 466, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":468
+ *         if i >= j or i < 0 or j > self.size: raise ValueError, "Bad slice!"
+ *         # Create a null terminated string
+ *         return self.mmap[i:j]             # <<<<<<<<<<<<<<
+ * 
+ *     def __setslice__(self, i, j, char* val):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __Pyx_INCREF(__pyx_v_i);
+  __pyx_t_4 = __pyx_v_i;
+  __pyx_t_1 = (__pyx_t_4 == Py_None);
+  if (__pyx_t_1) {
+    __pyx_t_5 = 0;
+  } else {
+    __pyx_t_6 = __Pyx_PyIndex_AsSsize_t(__pyx_t_4); if (unlikely((__pyx_t_6 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 468, __pyx_L1_error)
+    __pyx_t_5 = __pyx_t_6;
+  }
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __Pyx_INCREF(__pyx_v_j);
+  __pyx_t_4 = __pyx_v_j;
+  __pyx_t_1 = (__pyx_t_4 == Py_None);
+  if (__pyx_t_1) {
+    __pyx_t_6 = PY_SSIZE_T_MAX;
+  } else {
+    __pyx_t_7 = __Pyx_PyIndex_AsSsize_t(__pyx_t_4); if (unlikely((__pyx_t_7 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 468, __pyx_L1_error)
+    __pyx_t_6 = __pyx_t_7;
+  }
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __pyx_t_4 = __Pyx_PyBytes_FromStringAndSize(((const char*)__pyx_v_self->mmap) + __pyx_t_5, __pyx_t_6 - __pyx_t_5); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 468, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __pyx_r = __pyx_t_4;
+  __pyx_t_4 = 0;
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":464
+ *             self.fileobj = None
+ * 
+ *     def __getslice__(self, i, j):             # <<<<<<<<<<<<<<
+ *         "Allow direct access to the mmap, indexed by byte"
+ *         if i >= j or i < 0 or j > self.size: raise ValueError, "Bad slice!"
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_2);
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__getslice__", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":470
+ *         return self.mmap[i:j]
+ * 
+ *     def __setslice__(self, i, j, char* val):             # <<<<<<<<<<<<<<
+ *         "Allow direct access to the mmap, indexed by byte"
+ *         if i >= j or i < 0 or j > self.size: raise ValueError, "Bad slice!"
+ */
+
+/* Python wrapper */
+static int __pyx_pw_10pyblooming_7cbitmap_6Bitmap_35__setslice__(PyObject *__pyx_v_self, Py_ssize_t __pyx_arg_i, Py_ssize_t __pyx_arg_j, PyObject *__pyx_arg_val); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_34__setslice__[] = "Allow direct access to the mmap, indexed by byte";
+#if CYTHON_UPDATE_DESCRIPTOR_DOC
+struct wrapperbase __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_34__setslice__;
+#endif
+static int __pyx_pw_10pyblooming_7cbitmap_6Bitmap_35__setslice__(PyObject *__pyx_v_self, Py_ssize_t __pyx_arg_i, Py_ssize_t __pyx_arg_j, PyObject *__pyx_arg_val) {
+  PyObject *__pyx_v_i = 0;
+  PyObject *__pyx_v_j = 0;
+  char *__pyx_v_val;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  int __pyx_r;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__setslice__ (wrapper)", 0);
+  __pyx_v_i = PyInt_FromSsize_t(__pyx_arg_i); if (unlikely(!__pyx_v_i)) __PYX_ERR(0, 470, __pyx_L3_error)
+  __Pyx_GOTREF(__pyx_v_i);
+  __pyx_v_j = PyInt_FromSsize_t(__pyx_arg_j); if (unlikely(!__pyx_v_j)) __PYX_ERR(0, 470, __pyx_L3_error)
+  __Pyx_GOTREF(__pyx_v_j);
+  assert(__pyx_arg_val); {
+    __pyx_v_val = __Pyx_PyObject_AsWritableString(__pyx_arg_val); if (unlikely((!__pyx_v_val) && PyErr_Occurred())) __PYX_ERR(0, 470, __pyx_L3_error)
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__setslice__", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return -1;
+  __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_34__setslice__(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), ((PyObject *)__pyx_v_i), ((PyObject *)__pyx_v_j), ((char *)__pyx_v_val));
+
+  /* function exit code */
+  __Pyx_XDECREF(__pyx_v_i);
+  __Pyx_XDECREF(__pyx_v_j);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static int __pyx_pf_10pyblooming_7cbitmap_6Bitmap_34__setslice__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_i, PyObject *__pyx_v_j, char *__pyx_v_val) {
+  int __pyx_v_size;
+  int __pyx_v_x;
+  int __pyx_r;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  PyObject *__pyx_t_2 = NULL;
+  int __pyx_t_3;
+  PyObject *__pyx_t_4 = NULL;
+  int __pyx_t_5;
+  int __pyx_t_6;
+  int __pyx_t_7;
+  Py_ssize_t __pyx_t_8;
+  size_t __pyx_t_9;
+  size_t __pyx_t_10;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("__setslice__", 0);
+
+  /* "pyblooming/cbitmap.pyx":472
+ *     def __setslice__(self, i, j, char* val):
+ *         "Allow direct access to the mmap, indexed by byte"
+ *         if i >= j or i < 0 or j > self.size: raise ValueError, "Bad slice!"             # <<<<<<<<<<<<<<
+ *         # Create a null terminated string
+ *         cdef int size  = j-i
+ */
+  __pyx_t_2 = PyObject_RichCompare(__pyx_v_i, __pyx_v_j, Py_GE); __Pyx_XGOTREF(__pyx_t_2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 472, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyObject_IsTrue(__pyx_t_2); if (unlikely(__pyx_t_3 < 0)) __PYX_ERR(0, 472, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  if (!__pyx_t_3) {
+  } else {
+    __pyx_t_1 = __pyx_t_3;
+    goto __pyx_L4_bool_binop_done;
+  }
+  __pyx_t_2 = PyObject_RichCompare(__pyx_v_i, __pyx_int_0, Py_LT); __Pyx_XGOTREF(__pyx_t_2); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 472, __pyx_L1_error)
+  __pyx_t_3 = __Pyx_PyObject_IsTrue(__pyx_t_2); if (unlikely(__pyx_t_3 < 0)) __PYX_ERR(0, 472, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  if (!__pyx_t_3) {
+  } else {
+    __pyx_t_1 = __pyx_t_3;
+    goto __pyx_L4_bool_binop_done;
+  }
+  __pyx_t_2 = __Pyx_PyInt_FromSize_t(__pyx_v_self->size); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 472, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __pyx_t_4 = PyObject_RichCompare(__pyx_v_j, __pyx_t_2, Py_GT); __Pyx_XGOTREF(__pyx_t_4); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 472, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_t_3 = __Pyx_PyObject_IsTrue(__pyx_t_4); if (unlikely(__pyx_t_3 < 0)) __PYX_ERR(0, 472, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __pyx_t_1 = __pyx_t_3;
+  __pyx_L4_bool_binop_done:;
+  if (unlikely(__pyx_t_1)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bad_slice, 0, 0);
+    __PYX_ERR(0, 472, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":474
+ *         if i >= j or i < 0 or j > self.size: raise ValueError, "Bad slice!"
+ *         # Create a null terminated string
+ *         cdef int size  = j-i             # <<<<<<<<<<<<<<
+ *         cdef int x
+ *         for x in xrange(size):
+ */
+  __pyx_t_4 = PyNumber_Subtract(__pyx_v_j, __pyx_v_i); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 474, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __pyx_t_5 = __Pyx_PyInt_As_int(__pyx_t_4); if (unlikely((__pyx_t_5 == (int)-1) && PyErr_Occurred())) __PYX_ERR(0, 474, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __pyx_v_size = __pyx_t_5;
+
+  /* "pyblooming/cbitmap.pyx":476
+ *         cdef int size  = j-i
+ *         cdef int x
+ *         for x in xrange(size):             # <<<<<<<<<<<<<<
+ *             self.mmap[i+x] = val[x]
+ *         self._mark_dirty(i, j)
+ */
+  __pyx_t_5 = __pyx_v_size;
+  __pyx_t_6 = __pyx_t_5;
+  for (__pyx_t_7 = 0; __pyx_t_7 < __pyx_t_6; __pyx_t_7+=1) {
+    __pyx_v_x = __pyx_t_7;
+
+    /* "pyblooming/cbitmap.pyx":477
+ *         cdef int x
+ *         for x in xrange(size):
+ *             self.mmap[i+x] = val[x]             # <<<<<<<<<<<<<<
+ *         self._mark_dirty(i, j)
+ * 
+ */
+    __pyx_t_4 = __Pyx_PyInt_From_int(__pyx_v_x); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 477, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_4);
+    __pyx_t_2 = PyNumber_Add(__pyx_v_i, __pyx_t_4); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 477, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_2);
+    __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+    __pyx_t_8 = __Pyx_PyIndex_AsSsize_t(__pyx_t_2); if (unlikely((__pyx_t_8 == (Py_ssize_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 477, __pyx_L1_error)
+    __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+    (__pyx_v_self->mmap[__pyx_t_8]) = (__pyx_v_val[__pyx_v_x]);
+  }
+
+  /* "pyblooming/cbitmap.pyx":478
+ *         for x in xrange(size):
+ *             self.mmap[i+x] = val[x]
+ *         self._mark_dirty(i, j)             # <<<<<<<<<<<<<<
+ * 
+ *     @cython.boundscheck(False)
+ */
+  __pyx_t_9 = __Pyx_PyInt_As_size_t(__pyx_v_i); if (unlikely((__pyx_t_9 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 478, __pyx_L1_error)
+  __pyx_t_10 = __Pyx_PyInt_As_size_t(__pyx_v_j); if (unlikely((__pyx_t_10 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 478, __pyx_L1_error)
+  ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_mark_dirty(__pyx_v_self, __pyx_t_9, __pyx_t_10);
+
+  /* "pyblooming/cbitmap.pyx":470
+ *         return self.mmap[i:j]
+ * 
+ *     def __setslice__(self, i, j, char* val):             # <<<<<<<<<<<<<<
+ *         "Allow direct access to the mmap, indexed by byte"
+ *         if i >= j or i < 0 or j > self.size: raise ValueError, "Bad slice!"
+ */
+
+  /* function exit code */
+  __pyx_r = 0;
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_2);
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__setslice__", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = -1;
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":482
+ *     @cython.boundscheck(False)
+ *     @cython.wraparound(False)
+ *     def popcount(self, size_t start=0, end=None):             # <<<<<<<<<<<<<<
+ *         """
+ *         Returns the number of bits set to 1. Optionally restricted
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_37popcount(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_36popcount[] = "\n        Returns the number of bits set to 1. Optionally restricted\n        to the bytes from start to end.\n        ";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_37popcount(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  size_t __pyx_v_start;
+  PyObject *__pyx_v_end = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("popcount (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_start,&__pyx_n_s_end,0};
+    PyObject* values[2] = {0,0};
+    values[1] = ((PyObject *)Py_None);
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_start);
+          if (value) { values[0] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_end);
+          if (value) { values[1] = value; kw_args--; }
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "popcount") < 0)) __PYX_ERR(0, 482, __pyx_L3_error)
+      }
+    } else {
+      switch (PyTuple_GET_SIZE(__pyx_args)) {
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+    }
+    if (values[0]) {
+      __pyx_v_start = __Pyx_PyInt_As_size_t(values[0]); if (unlikely((__pyx_v_start == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 482, __pyx_L3_error)
+    } else {
+      __pyx_v_start = ((size_t)0);
+    }
+    __pyx_v_end = values[1];
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("popcount", 0, 0, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 482, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.popcount", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_36popcount(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), __pyx_v_start, __pyx_v_end);
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_36popcount(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t __pyx_v_start, PyObject *__pyx_v_end) {
+  size_t __pyx_v_stop;
+  size_t __pyx_v_i;
+  size_t __pyx_v_words;
+  size_t __pyx_v_count;
+  unsigned char *__pyx_v_base;
+  uint64_t __pyx_v_word;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  size_t __pyx_t_1;
+  int __pyx_t_2;
+  size_t __pyx_t_3;
+  int __pyx_t_4;
+  size_t __pyx_t_5;
+  PyObject *__pyx_t_6 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("popcount", 0);
+
+  /* "pyblooming/cbitmap.pyx":487
+ *         to the bytes from start to end.
+ *         """
+ *         cdef size_t stop = self.size if end is None else end             # <<<<<<<<<<<<<<
+ *         cdef size_t i, words, count = 0
+ *         cdef unsigned char* base
+ */
+  __pyx_t_2 = (__pyx_v_end == Py_None);
+  if ((__pyx_t_2 != 0)) {
+    __pyx_t_1 = __pyx_v_self->size;
+  } else {
+    __pyx_t_3 = __Pyx_PyInt_As_size_t(__pyx_v_end); if (unlikely((__pyx_t_3 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 487, __pyx_L1_error)
+    __pyx_t_1 = __pyx_t_3;
+  }
+  __pyx_v_stop = __pyx_t_1;
+
+  /* "pyblooming/cbitmap.pyx":488
+ *         """
+ *         cdef size_t stop = self.size if end is None else end
+ *         cdef size_t i, words, count = 0             # <<<<<<<<<<<<<<
+ *         cdef unsigned char* base
+ *         cdef uint64_t word
+ */
+  __pyx_v_count = 0;
+
+  /* "pyblooming/cbitmap.pyx":491
+ *         cdef unsigned char* base
+ *         cdef uint64_t word
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"             # <<<<<<<<<<<<<<
+ *         if start > stop or stop > self.size: raise ValueError, "Bad range!"
+ * 
+ */
+  __pyx_t_2 = ((__pyx_v_self->mmap == NULL) != 0);
+  if (unlikely(__pyx_t_2)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bitmap_is_closed, 0, 0);
+    __PYX_ERR(0, 491, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":492
+ *         cdef uint64_t word
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         if start > stop or stop > self.size: raise ValueError, "Bad range!"             # <<<<<<<<<<<<<<
+ * 
+ *         base = self.mmap + start
+ */
+  __pyx_t_4 = ((__pyx_v_start > __pyx_v_stop) != 0);
+  if (!__pyx_t_4) {
+  } else {
+    __pyx_t_2 = __pyx_t_4;
+    goto __pyx_L5_bool_binop_done;
+  }
+  __pyx_t_4 = ((__pyx_v_stop > __pyx_v_self->size) != 0);
+  __pyx_t_2 = __pyx_t_4;
+  __pyx_L5_bool_binop_done:;
+  if (unlikely(__pyx_t_2)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bad_range, 0, 0);
+    __PYX_ERR(0, 492, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":494
+ *         if start > stop or stop > self.size: raise ValueError, "Bad range!"
+ * 
+ *         base = self.mmap + start             # <<<<<<<<<<<<<<
+ *         words = (stop - start) / 8
+ *         with nogil:
+ */
+  __pyx_v_base = (__pyx_v_self->mmap + __pyx_v_start);
+
+  /* "pyblooming/cbitmap.pyx":495
+ * 
+ *         base = self.mmap + start
+ *         words = (stop - start) / 8             # <<<<<<<<<<<<<<
+ *         with nogil:
+ *             for i in range(words):
+ */
+  __pyx_v_words = ((__pyx_v_stop - __pyx_v_start) / 8);
+
+  /* "pyblooming/cbitmap.pyx":496
+ *         base = self.mmap + start
+ *         words = (stop - start) / 8
+ *         with nogil:             # <<<<<<<<<<<<<<
+ *             for i in range(words):
+ *                 memcpy(&word, base + i*8, 8)
+ */
+  {
+      #ifdef WITH_THREAD
+      PyThreadState *_save;
+      Py_UNBLOCK_THREADS
+      __Pyx_FastGIL_Remember();
+      #endif
+      /*try:*/ {
+
+        /* "pyblooming/cbitmap.pyx":497
+ *         words = (stop - start) / 8
+ *         with nogil:
+ *             for i in range(words):             # <<<<<<<<<<<<<<
+ *                 memcpy(&word, base + i*8, 8)
+ *                 count += __builtin_popcountll(word)
+ */
+        __pyx_t_1 = __pyx_v_words;
+        __pyx_t_3 = __pyx_t_1;
+        for (__pyx_t_5 = 0; __pyx_t_5 < __pyx_t_3; __pyx_t_5+=1) {
+          __pyx_v_i = __pyx_t_5;
+
+          /* "pyblooming/cbitmap.pyx":498
+ *         with nogil:
+ *             for i in range(words):
+ *                 memcpy(&word, base + i*8, 8)             # <<<<<<<<<<<<<<
+ *                 count += __builtin_popcountll(word)
+ *             for i in range(words*8, stop - start):
+ */
+          (void)(memcpy((&__pyx_v_word), (__pyx_v_base + (__pyx_v_i * 8)), 8));
+
+          /* "pyblooming/cbitmap.pyx":499
+ *             for i in range(words):
+ *                 memcpy(&word, base + i*8, 8)
+ *                 count += __builtin_popcountll(word)             # <<<<<<<<<<<<<<
+ *             for i in range(words*8, stop - start):
+ *                 count += __builtin_popcount(base[i])
+ */
+          __pyx_v_count = (__pyx_v_count + __builtin_popcountll(__pyx_v_word));
+        }
+
+        /* "pyblooming/cbitmap.pyx":500
+ *                 memcpy(&word, base + i*8, 8)
+ *                 count += __builtin_popcountll(word)
+ *             for i in range(words*8, stop - start):             # <<<<<<<<<<<<<<
+ *                 count += __builtin_popcount(base[i])
+ *         return count
+ */
+        __pyx_t_1 = (__pyx_v_stop - __pyx_v_start);
+        __pyx_t_3 = __pyx_t_1;
+        for (__pyx_t_5 = (__pyx_v_words * 8); __pyx_t_5 < __pyx_t_3; __pyx_t_5+=1) {
+          __pyx_v_i = __pyx_t_5;
+
+          /* "pyblooming/cbitmap.pyx":501
+ *                 count += __builtin_popcountll(word)
+ *             for i in range(words*8, stop - start):
+ *                 count += __builtin_popcount(base[i])             # <<<<<<<<<<<<<<
+ *         return count
+ * 
+ */
+          __pyx_v_count = (__pyx_v_count + __builtin_popcount((__pyx_v_base[__pyx_v_i])));
+        }
+      }
+
+      /* "pyblooming/cbitmap.pyx":496
+ *         base = self.mmap + start
+ *         words = (stop - start) / 8
+ *         with nogil:             # <<<<<<<<<<<<<<
+ *             for i in range(words):
+ *                 memcpy(&word, base + i*8, 8)
+ */
+      /*finally:*/ {
+        /*normal exit:*/{
+          #ifdef WITH_THREAD
+          __Pyx_FastGIL_Forget();
+          Py_BLOCK_THREADS
+          #endif
+          goto __pyx_L9;
+        }
+        __pyx_L9:;
+      }
+  }
+
+  /* "pyblooming/cbitmap.pyx":502
+ *             for i in range(words*8, stop - start):
+ *                 count += __builtin_popcount(base[i])
+ *         return count             # <<<<<<<<<<<<<<
+ * 
+ *     def clear(self, size_t start=0, end=None):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_6 = __Pyx_PyInt_FromSize_t(__pyx_v_count); if (unlikely(!__pyx_t_6)) __PYX_ERR(0, 502, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_6);
+  __pyx_r = __pyx_t_6;
+  __pyx_t_6 = 0;
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":482
+ *     @cython.boundscheck(False)
+ *     @cython.wraparound(False)
+ *     def popcount(self, size_t start=0, end=None):             # <<<<<<<<<<<<<<
+ *         """
+ *         Returns the number of bits set to 1. Optionally restricted
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_6);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.popcount", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":504
+ *         return count
+ * 
+ *     def clear(self, size_t start=0, end=None):             # <<<<<<<<<<<<<<
+ *         """
+ *         Sets every bit to 0. Optionally restricted
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_39clear(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_38clear[] = "\n        Sets every bit to 0. Optionally restricted\n        to the bytes from start to end.\n        ";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_39clear(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  size_t __pyx_v_start;
+  PyObject *__pyx_v_end = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("clear (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_start,&__pyx_n_s_end,0};
+    PyObject* values[2] = {0,0};
+    values[1] = ((PyObject *)Py_None);
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_start);
+          if (value) { values[0] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_end);
+          if (value) { values[1] = value; kw_args--; }
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "clear") < 0)) __PYX_ERR(0, 504, __pyx_L3_error)
+      }
+    } else {
+      switch (PyTuple_GET_SIZE(__pyx_args)) {
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+    }
+    if (values[0]) {
+      __pyx_v_start = __Pyx_PyInt_As_size_t(values[0]); if (unlikely((__pyx_v_start == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 504, __pyx_L3_error)
+    } else {
+      __pyx_v_start = ((size_t)0);
+    }
+    __pyx_v_end = values[1];
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("clear", 0, 0, 2, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 504, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.clear", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_38clear(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), __pyx_v_start, __pyx_v_end);
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_38clear(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, size_t __pyx_v_start, PyObject *__pyx_v_end) {
+  size_t __pyx_v_stop;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  size_t __pyx_t_1;
+  int __pyx_t_2;
+  size_t __pyx_t_3;
+  int __pyx_t_4;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("clear", 0);
+
+  /* "pyblooming/cbitmap.pyx":509
+ *         to the bytes from start to end.
+ *         """
+ *         cdef size_t stop = self.size if end is None else end             # <<<<<<<<<<<<<<
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         if start > stop or stop > self.size: raise ValueError, "Bad range!"
+ */
+  __pyx_t_2 = (__pyx_v_end == Py_None);
+  if ((__pyx_t_2 != 0)) {
+    __pyx_t_1 = __pyx_v_self->size;
+  } else {
+    __pyx_t_3 = __Pyx_PyInt_As_size_t(__pyx_v_end); if (unlikely((__pyx_t_3 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 509, __pyx_L1_error)
+    __pyx_t_1 = __pyx_t_3;
+  }
+  __pyx_v_stop = __pyx_t_1;
+
+  /* "pyblooming/cbitmap.pyx":510
+ *         """
+ *         cdef size_t stop = self.size if end is None else end
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"             # <<<<<<<<<<<<<<
+ *         if start > stop or stop > self.size: raise ValueError, "Bad range!"
+ *         with nogil:
+ */
+  __pyx_t_2 = ((__pyx_v_self->mmap == NULL) != 0);
+  if (unlikely(__pyx_t_2)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bitmap_is_closed, 0, 0);
+    __PYX_ERR(0, 510, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":511
+ *         cdef size_t stop = self.size if end is None else end
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         if start > stop or stop > self.size: raise ValueError, "Bad range!"             # <<<<<<<<<<<<<<
+ *         with nogil:
+ *             memset(self.mmap + start, 0, stop - start)
+ */
+  __pyx_t_4 = ((__pyx_v_start > __pyx_v_stop) != 0);
+  if (!__pyx_t_4) {
+  } else {
+    __pyx_t_2 = __pyx_t_4;
+    goto __pyx_L5_bool_binop_done;
+  }
+  __pyx_t_4 = ((__pyx_v_stop > __pyx_v_self->size) != 0);
+  __pyx_t_2 = __pyx_t_4;
+  __pyx_L5_bool_binop_done:;
+  if (unlikely(__pyx_t_2)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bad_range, 0, 0);
+    __PYX_ERR(0, 511, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":512
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         if start > stop or stop > self.size: raise ValueError, "Bad range!"
+ *         with nogil:             # <<<<<<<<<<<<<<
+ *             memset(self.mmap + start, 0, stop - start)
+ *             self._mark_dirty(start, stop)
+ */
+  {
+      #ifdef WITH_THREAD
+      PyThreadState *_save;
+      Py_UNBLOCK_THREADS
+      __Pyx_FastGIL_Remember();
+      #endif
+      /*try:*/ {
+
+        /* "pyblooming/cbitmap.pyx":513
+ *         if start > stop or stop > self.size: raise ValueError, "Bad range!"
+ *         with nogil:
+ *             memset(self.mmap + start, 0, stop - start)             # <<<<<<<<<<<<<<
+ *             self._mark_dirty(start, stop)
+ * 
+ */
+        (void)(memset((__pyx_v_self->mmap + __pyx_v_start), 0, (__pyx_v_stop - __pyx_v_start)));
+
+        /* "pyblooming/cbitmap.pyx":514
+ *         with nogil:
+ *             memset(self.mmap + start, 0, stop - start)
+ *             self._mark_dirty(start, stop)             # <<<<<<<<<<<<<<
+ * 
+ *     def copy(self):
+ */
+        ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_mark_dirty(__pyx_v_self, __pyx_v_start, __pyx_v_stop);
+      }
+
+      /* "pyblooming/cbitmap.pyx":512
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         if start > stop or stop > self.size: raise ValueError, "Bad range!"
+ *         with nogil:             # <<<<<<<<<<<<<<
+ *             memset(self.mmap + start, 0, stop - start)
+ *             self._mark_dirty(start, stop)
+ */
+      /*finally:*/ {
+        /*normal exit:*/{
+          #ifdef WITH_THREAD
+          __Pyx_FastGIL_Forget();
+          Py_BLOCK_THREADS
+          #endif
+          goto __pyx_L9;
+        }
+        __pyx_L9:;
+      }
+  }
+
+  /* "pyblooming/cbitmap.pyx":504
+ *         return count
+ * 
+ *     def clear(self, size_t start=0, end=None):             # <<<<<<<<<<<<<<
+ *         """
+ *         Sets every bit to 0. Optionally restricted
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.clear", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":516
+ *             self._mark_dirty(start, stop)
+ * 
+ *     def copy(self):             # <<<<<<<<<<<<<<
+ *         "Returns a copy of the Bitmap, using an anonymous map"
+ *         cdef Bitmap other = Bitmap(self.size)
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_41copy(PyObject *__pyx_v_self, CYTHON_UNUSED PyObject *unused); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_40copy[] = "Returns a copy of the Bitmap, using an anonymous map";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_41copy(PyObject *__pyx_v_self, CYTHON_UNUSED PyObject *unused) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("copy (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_40copy(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_40copy(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self) {
+  struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_other = 0;
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  PyObject *__pyx_t_2 = NULL;
+  int __pyx_t_3;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("copy", 0);
+
+  /* "pyblooming/cbitmap.pyx":518
+ *     def copy(self):
+ *         "Returns a copy of the Bitmap, using an anonymous map"
+ *         cdef Bitmap other = Bitmap(self.size)             # <<<<<<<<<<<<<<
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         with nogil:
+ */
+  __pyx_t_1 = __Pyx_PyInt_FromSize_t(__pyx_v_self->size); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 518, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_2 = __Pyx_PyObject_CallOneArg(((PyObject *)__pyx_ptype_10pyblooming_7cbitmap_Bitmap), __pyx_t_1); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 518, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __pyx_v_other = ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_t_2);
+  __pyx_t_2 = 0;
+
+  /* "pyblooming/cbitmap.pyx":519
+ *         "Returns a copy of the Bitmap, using an anonymous map"
+ *         cdef Bitmap other = Bitmap(self.size)
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"             # <<<<<<<<<<<<<<
+ *         with nogil:
+ *             memcpy(other.mmap, self.mmap, self.size)
+ */
+  __pyx_t_3 = ((__pyx_v_self->mmap == NULL) != 0);
+  if (unlikely(__pyx_t_3)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bitmap_is_closed, 0, 0);
+    __PYX_ERR(0, 519, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":520
+ *         cdef Bitmap other = Bitmap(self.size)
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         with nogil:             # <<<<<<<<<<<<<<
+ *             memcpy(other.mmap, self.mmap, self.size)
+ *         return other
+ */
+  {
+      #ifdef WITH_THREAD
+      PyThreadState *_save;
+      Py_UNBLOCK_THREADS
+      __Pyx_FastGIL_Remember();
+      #endif
+      /*try:*/ {
+
+        /* "pyblooming/cbitmap.pyx":521
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         with nogil:
+ *             memcpy(other.mmap, self.mmap, self.size)             # <<<<<<<<<<<<<<
+ *         return other
+ * 
+ */
+        (void)(memcpy(__pyx_v_other->mmap, __pyx_v_self->mmap, __pyx_v_self->size));
+      }
+
+      /* "pyblooming/cbitmap.pyx":520
+ *         cdef Bitmap other = Bitmap(self.size)
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         with nogil:             # <<<<<<<<<<<<<<
+ *             memcpy(other.mmap, self.mmap, self.size)
+ *         return other
+ */
+      /*finally:*/ {
+        /*normal exit:*/{
+          #ifdef WITH_THREAD
+          __Pyx_FastGIL_Forget();
+          Py_BLOCK_THREADS
+          #endif
+          goto __pyx_L6;
+        }
+        __pyx_L6:;
+      }
+  }
+
+  /* "pyblooming/cbitmap.pyx":522
+ *         with nogil:
+ *             memcpy(other.mmap, self.mmap, self.size)
+ *         return other             # <<<<<<<<<<<<<<
+ * 
+ *     def union_update(self, other, size_t start=0, end=None):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __Pyx_INCREF(((PyObject *)__pyx_v_other));
+  __pyx_r = ((PyObject *)__pyx_v_other);
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":516
+ *             self._mark_dirty(start, stop)
+ * 
+ *     def copy(self):             # <<<<<<<<<<<<<<
+ *         "Returns a copy of the Bitmap, using an anonymous map"
+ *         cdef Bitmap other = Bitmap(self.size)
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_XDECREF(__pyx_t_2);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.copy", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XDECREF((PyObject *)__pyx_v_other);
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":524
+ *         return other
+ * 
+ *     def union_update(self, other, size_t start=0, end=None):             # <<<<<<<<<<<<<<
+ *         """
+ *         Sets each bit to the OR of itself and the same bit in the
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_43union_update(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_42union_update[] = "\n        Sets each bit to the OR of itself and the same bit in the\n        other Bitmap. Optionally restricted to the bytes from start to end.\n        ";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_43union_update(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyObject *__pyx_v_other = 0;
+  size_t __pyx_v_start;
+  PyObject *__pyx_v_end = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("union_update (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_other,&__pyx_n_s_start,&__pyx_n_s_end,0};
+    PyObject* values[3] = {0,0,0};
+    values[2] = ((PyObject *)Py_None);
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_other)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_start);
+          if (value) { values[1] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  2:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_end);
+          if (value) { values[2] = value; kw_args--; }
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "union_update") < 0)) __PYX_ERR(0, 524, __pyx_L3_error)
+      }
+    } else {
+      switch (PyTuple_GET_SIZE(__pyx_args)) {
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+    }
+    __pyx_v_other = values[0];
+    if (values[1]) {
+      __pyx_v_start = __Pyx_PyInt_As_size_t(values[1]); if (unlikely((__pyx_v_start == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 524, __pyx_L3_error)
+    } else {
+      __pyx_v_start = ((size_t)0);
+    }
+    __pyx_v_end = values[2];
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("union_update", 0, 1, 3, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 524, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.union_update", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_42union_update(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), __pyx_v_other, __pyx_v_start, __pyx_v_end);
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_42union_update(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other, size_t __pyx_v_start, PyObject *__pyx_v_end) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("union_update", 0);
+
+  /* "pyblooming/cbitmap.pyx":529
+ *         other Bitmap. Optionally restricted to the bytes from start to end.
+ *         """
+ *         self._combine(other, start, end, OP_OR)             # <<<<<<<<<<<<<<
+ *         return self
+ * 
+ */
+  __pyx_t_1 = ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_combine(__pyx_v_self, __pyx_v_other, __pyx_v_start, __pyx_v_end, __pyx_e_10pyblooming_7cbitmap_OP_OR); if (unlikely(__pyx_t_1 == ((int)-1))) __PYX_ERR(0, 529, __pyx_L1_error)
+
+  /* "pyblooming/cbitmap.pyx":530
+ *         """
+ *         self._combine(other, start, end, OP_OR)
+ *         return self             # <<<<<<<<<<<<<<
+ * 
+ *     def intersection_update(self, other, size_t start=0, end=None):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __Pyx_INCREF(((PyObject *)__pyx_v_self));
+  __pyx_r = ((PyObject *)__pyx_v_self);
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":524
+ *         return other
+ * 
+ *     def union_update(self, other, size_t start=0, end=None):             # <<<<<<<<<<<<<<
+ *         """
+ *         Sets each bit to the OR of itself and the same bit in the
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.union_update", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":532
+ *         return self
+ * 
+ *     def intersection_update(self, other, size_t start=0, end=None):             # <<<<<<<<<<<<<<
+ *         """
+ *         Sets each bit to the AND of itself and the same bit in the
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_45intersection_update(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_44intersection_update[] = "\n        Sets each bit to the AND of itself and the same bit in the\n        other Bitmap. Optionally restricted to the bytes from start to end.\n        ";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_45intersection_update(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyObject *__pyx_v_other = 0;
+  size_t __pyx_v_start;
+  PyObject *__pyx_v_end = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("intersection_update (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_other,&__pyx_n_s_start,&__pyx_n_s_end,0};
+    PyObject* values[3] = {0,0,0};
+    values[2] = ((PyObject *)Py_None);
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_other)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_start);
+          if (value) { values[1] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  2:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_end);
+          if (value) { values[2] = value; kw_args--; }
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "intersection_update") < 0)) __PYX_ERR(0, 532, __pyx_L3_error)
+      }
+    } else {
+      switch (PyTuple_GET_SIZE(__pyx_args)) {
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+    }
+    __pyx_v_other = values[0];
+    if (values[1]) {
+      __pyx_v_start = __Pyx_PyInt_As_size_t(values[1]); if (unlikely((__pyx_v_start == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 532, __pyx_L3_error)
+    } else {
+      __pyx_v_start = ((size_t)0);
+    }
+    __pyx_v_end = values[2];
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("intersection_update", 0, 1, 3, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 532, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.intersection_update", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_44intersection_update(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), __pyx_v_other, __pyx_v_start, __pyx_v_end);
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_44intersection_update(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other, size_t __pyx_v_start, PyObject *__pyx_v_end) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("intersection_update", 0);
+
+  /* "pyblooming/cbitmap.pyx":537
+ *         other Bitmap. Optionally restricted to the bytes from start to end.
+ *         """
+ *         self._combine(other, start, end, OP_AND)             # <<<<<<<<<<<<<<
+ *         return self
+ * 
+ */
+  __pyx_t_1 = ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_combine(__pyx_v_self, __pyx_v_other, __pyx_v_start, __pyx_v_end, __pyx_e_10pyblooming_7cbitmap_OP_AND); if (unlikely(__pyx_t_1 == ((int)-1))) __PYX_ERR(0, 537, __pyx_L1_error)
+
+  /* "pyblooming/cbitmap.pyx":538
+ *         """
+ *         self._combine(other, start, end, OP_AND)
+ *         return self             # <<<<<<<<<<<<<<
+ * 
+ *     def symmetric_difference_update(self, other, size_t start=0, end=None):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __Pyx_INCREF(((PyObject *)__pyx_v_self));
+  __pyx_r = ((PyObject *)__pyx_v_self);
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":532
+ *         return self
+ * 
+ *     def intersection_update(self, other, size_t start=0, end=None):             # <<<<<<<<<<<<<<
+ *         """
+ *         Sets each bit to the AND of itself and the same bit in the
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.intersection_update", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":540
+ *         return self
+ * 
+ *     def symmetric_difference_update(self, other, size_t start=0, end=None):             # <<<<<<<<<<<<<<
+ *         """
+ *         Sets each bit to the XOR of itself and the same bit in the
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_47symmetric_difference_update(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_46symmetric_difference_update[] = "\n        Sets each bit to the XOR of itself and the same bit in the\n        other Bitmap. Optionally restricted to the bytes from start to end.\n        ";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_47symmetric_difference_update(PyObject *__pyx_v_self, PyObject *__pyx_args, PyObject *__pyx_kwds) {
+  PyObject *__pyx_v_other = 0;
+  size_t __pyx_v_start;
+  PyObject *__pyx_v_end = 0;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("symmetric_difference_update (wrapper)", 0);
+  {
+    static PyObject **__pyx_pyargnames[] = {&__pyx_n_s_other,&__pyx_n_s_start,&__pyx_n_s_end,0};
+    PyObject* values[3] = {0,0,0};
+    values[2] = ((PyObject *)Py_None);
+    if (unlikely(__pyx_kwds)) {
+      Py_ssize_t kw_args;
+      const Py_ssize_t pos_args = PyTuple_GET_SIZE(__pyx_args);
+      switch (pos_args) {
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        CYTHON_FALLTHROUGH;
+        case  0: break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+      kw_args = PyDict_Size(__pyx_kwds);
+      switch (pos_args) {
+        case  0:
+        if (likely((values[0] = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_other)) != 0)) kw_args--;
+        else goto __pyx_L5_argtuple_error;
+        CYTHON_FALLTHROUGH;
+        case  1:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_start);
+          if (value) { values[1] = value; kw_args--; }
+        }
+        CYTHON_FALLTHROUGH;
+        case  2:
+        if (kw_args > 0) {
+          PyObject* value = __Pyx_PyDict_GetItemStr(__pyx_kwds, __pyx_n_s_end);
+          if (value) { values[2] = value; kw_args--; }
+        }
+      }
+      if (unlikely(kw_args > 0)) {
+        if (unlikely(__Pyx_ParseOptionalKeywords(__pyx_kwds, __pyx_pyargnames, 0, values, pos_args, "symmetric_difference_update") < 0)) __PYX_ERR(0, 540, __pyx_L3_error)
+      }
+    } else {
+      switch (PyTuple_GET_SIZE(__pyx_args)) {
+        case  3: values[2] = PyTuple_GET_ITEM(__pyx_args, 2);
+        CYTHON_FALLTHROUGH;
+        case  2: values[1] = PyTuple_GET_ITEM(__pyx_args, 1);
+        CYTHON_FALLTHROUGH;
+        case  1: values[0] = PyTuple_GET_ITEM(__pyx_args, 0);
+        break;
+        default: goto __pyx_L5_argtuple_error;
+      }
+    }
+    __pyx_v_other = values[0];
+    if (values[1]) {
+      __pyx_v_start = __Pyx_PyInt_As_size_t(values[1]); if (unlikely((__pyx_v_start == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 540, __pyx_L3_error)
+    } else {
+      __pyx_v_start = ((size_t)0);
+    }
+    __pyx_v_end = values[2];
+  }
+  goto __pyx_L4_argument_unpacking_done;
+  __pyx_L5_argtuple_error:;
+  __Pyx_RaiseArgtupleInvalid("symmetric_difference_update", 0, 1, 3, PyTuple_GET_SIZE(__pyx_args)); __PYX_ERR(0, 540, __pyx_L3_error)
+  __pyx_L3_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.symmetric_difference_update", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __Pyx_RefNannyFinishContext();
+  return NULL;
+  __pyx_L4_argument_unpacking_done:;
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_46symmetric_difference_update(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), __pyx_v_other, __pyx_v_start, __pyx_v_end);
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_46symmetric_difference_update(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other, size_t __pyx_v_start, PyObject *__pyx_v_end) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("symmetric_difference_update", 0);
+
+  /* "pyblooming/cbitmap.pyx":545
+ *         other Bitmap. Optionally restricted to the bytes from start to end.
+ *         """
+ *         self._combine(other, start, end, OP_XOR)             # <<<<<<<<<<<<<<
+ *         return self
+ * 
+ */
+  __pyx_t_1 = ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_combine(__pyx_v_self, __pyx_v_other, __pyx_v_start, __pyx_v_end, __pyx_e_10pyblooming_7cbitmap_OP_XOR); if (unlikely(__pyx_t_1 == ((int)-1))) __PYX_ERR(0, 545, __pyx_L1_error)
+
+  /* "pyblooming/cbitmap.pyx":546
+ *         """
+ *         self._combine(other, start, end, OP_XOR)
+ *         return self             # <<<<<<<<<<<<<<
+ * 
+ *     cdef int _combine(self, other, size_t start, end, int op) except -1:
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __Pyx_INCREF(((PyObject *)__pyx_v_self));
+  __pyx_r = ((PyObject *)__pyx_v_self);
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":540
+ *         return self
+ * 
+ *     def symmetric_difference_update(self, other, size_t start=0, end=None):             # <<<<<<<<<<<<<<
+ *         """
+ *         Sets each bit to the XOR of itself and the same bit in the
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.symmetric_difference_update", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":548
+ *         return self
+ * 
+ *     cdef int _combine(self, other, size_t start, end, int op) except -1:             # <<<<<<<<<<<<<<
+ *         """
+ *         Combines the bytes from start to end with the other Bitmap.
+ */
+
+static int __pyx_f_10pyblooming_7cbitmap_6Bitmap__combine(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other, size_t __pyx_v_start, PyObject *__pyx_v_end, int __pyx_v_op) {
+  size_t __pyx_v_stop;
+  size_t __pyx_v_i;
+  size_t __pyx_v_j;
+  unsigned char *__pyx_v_src;
+  PyObject *__pyx_v_chunk = NULL;
+  int __pyx_r;
+  __Pyx_RefNannyDeclarations
+  size_t __pyx_t_1;
+  int __pyx_t_2;
+  size_t __pyx_t_3;
+  int __pyx_t_4;
+  Py_ssize_t __pyx_t_5;
+  unsigned char *__pyx_t_6;
+  PyObject *__pyx_t_7 = NULL;
+  PyObject *__pyx_t_8 = NULL;
+  PyObject *__pyx_t_9 = NULL;
+  PyObject *__pyx_t_10 = NULL;
+  PyObject *(*__pyx_t_11)(PyObject *);
+  PyObject *__pyx_t_12 = NULL;
+  char *__pyx_t_13;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("_combine", 0);
+
+  /* "pyblooming/cbitmap.pyx":554
+ *         directly, otherwise chunks of it are copied out.
+ *         """
+ *         cdef size_t stop = self.size if end is None else end             # <<<<<<<<<<<<<<
+ *         cdef size_t i, j
+ *         cdef unsigned char* src
+ */
+  __pyx_t_2 = (__pyx_v_end == Py_None);
+  if ((__pyx_t_2 != 0)) {
+    __pyx_t_1 = __pyx_v_self->size;
+  } else {
+    __pyx_t_3 = __Pyx_PyInt_As_size_t(__pyx_v_end); if (unlikely((__pyx_t_3 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 554, __pyx_L1_error)
+    __pyx_t_1 = __pyx_t_3;
+  }
+  __pyx_v_stop = __pyx_t_1;
+
+  /* "pyblooming/cbitmap.pyx":557
+ *         cdef size_t i, j
+ *         cdef unsigned char* src
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"             # <<<<<<<<<<<<<<
+ *         if start > stop or stop > self.size or stop > len(other) / 8:
+ *             raise ValueError, "Bad range!"
+ */
+  __pyx_t_2 = ((__pyx_v_self->mmap == NULL) != 0);
+  if (unlikely(__pyx_t_2)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bitmap_is_closed, 0, 0);
+    __PYX_ERR(0, 557, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":558
+ *         cdef unsigned char* src
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         if start > stop or stop > self.size or stop > len(other) / 8:             # <<<<<<<<<<<<<<
+ *             raise ValueError, "Bad range!"
+ * 
+ */
+  __pyx_t_4 = ((__pyx_v_start > __pyx_v_stop) != 0);
+  if (!__pyx_t_4) {
+  } else {
+    __pyx_t_2 = __pyx_t_4;
+    goto __pyx_L5_bool_binop_done;
+  }
+  __pyx_t_4 = ((__pyx_v_stop > __pyx_v_self->size) != 0);
+  if (!__pyx_t_4) {
+  } else {
+    __pyx_t_2 = __pyx_t_4;
+    goto __pyx_L5_bool_binop_done;
+  }
+  __pyx_t_5 = PyObject_Length(__pyx_v_other); if (unlikely(__pyx_t_5 == ((Py_ssize_t)-1))) __PYX_ERR(0, 558, __pyx_L1_error)
+  __pyx_t_4 = ((__pyx_v_stop > __Pyx_div_Py_ssize_t(__pyx_t_5, 8)) != 0);
+  __pyx_t_2 = __pyx_t_4;
+  __pyx_L5_bool_binop_done:;
+  if (unlikely(__pyx_t_2)) {
+
+    /* "pyblooming/cbitmap.pyx":559
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         if start > stop or stop > self.size or stop > len(other) / 8:
+ *             raise ValueError, "Bad range!"             # <<<<<<<<<<<<<<
+ * 
+ *         if isinstance(other, Bitmap):
+ */
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bad_range, 0, 0);
+    __PYX_ERR(0, 559, __pyx_L1_error)
+
+    /* "pyblooming/cbitmap.pyx":558
+ *         cdef unsigned char* src
+ *         if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+ *         if start > stop or stop > self.size or stop > len(other) / 8:             # <<<<<<<<<<<<<<
+ *             raise ValueError, "Bad range!"
+ * 
+ */
+  }
+
+  /* "pyblooming/cbitmap.pyx":561
+ *             raise ValueError, "Bad range!"
+ * 
+ *         if isinstance(other, Bitmap):             # <<<<<<<<<<<<<<
+ *             src = (<Bitmap>other).mmap
+ *             if src == NULL: raise ValueError, "Bitmap is closed!"
+ */
+  __pyx_t_2 = __Pyx_TypeCheck(__pyx_v_other, __pyx_ptype_10pyblooming_7cbitmap_Bitmap); 
+  __pyx_t_4 = (__pyx_t_2 != 0);
+  if (__pyx_t_4) {
+
+    /* "pyblooming/cbitmap.pyx":562
+ * 
+ *         if isinstance(other, Bitmap):
+ *             src = (<Bitmap>other).mmap             # <<<<<<<<<<<<<<
+ *             if src == NULL: raise ValueError, "Bitmap is closed!"
+ *             with nogil:
+ */
+    __pyx_t_6 = ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_other)->mmap;
+    __pyx_v_src = __pyx_t_6;
+
+    /* "pyblooming/cbitmap.pyx":563
+ *         if isinstance(other, Bitmap):
+ *             src = (<Bitmap>other).mmap
+ *             if src == NULL: raise ValueError, "Bitmap is closed!"             # <<<<<<<<<<<<<<
+ *             with nogil:
+ *                 combine_bytes(self.mmap + start, src + start, stop - start, op)
+ */
+    __pyx_t_4 = ((__pyx_v_src == NULL) != 0);
+    if (unlikely(__pyx_t_4)) {
+      __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bitmap_is_closed, 0, 0);
+      __PYX_ERR(0, 563, __pyx_L1_error)
+    }
+
+    /* "pyblooming/cbitmap.pyx":564
+ *             src = (<Bitmap>other).mmap
+ *             if src == NULL: raise ValueError, "Bitmap is closed!"
+ *             with nogil:             # <<<<<<<<<<<<<<
+ *                 combine_bytes(self.mmap + start, src + start, stop - start, op)
+ *                 self._mark_dirty(start, stop)
+ */
+    {
+        #ifdef WITH_THREAD
+        PyThreadState *_save;
+        Py_UNBLOCK_THREADS
+        __Pyx_FastGIL_Remember();
+        #endif
+        /*try:*/ {
+
+          /* "pyblooming/cbitmap.pyx":565
+ *             if src == NULL: raise ValueError, "Bitmap is closed!"
+ *             with nogil:
+ *                 combine_bytes(self.mmap + start, src + start, stop - start, op)             # <<<<<<<<<<<<<<
+ *                 self._mark_dirty(start, stop)
+ *             return 0
+ */
+          __pyx_f_10pyblooming_7cbitmap_combine_bytes((__pyx_v_self->mmap + __pyx_v_start), (__pyx_v_src + __pyx_v_start), (__pyx_v_stop - __pyx_v_start), __pyx_v_op);
+
+          /* "pyblooming/cbitmap.pyx":566
+ *             with nogil:
+ *                 combine_bytes(self.mmap + start, src + start, stop - start, op)
+ *                 self._mark_dirty(start, stop)             # <<<<<<<<<<<<<<
+ *             return 0
+ * 
+ */
+          ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_mark_dirty(__pyx_v_self, __pyx_v_start, __pyx_v_stop);
+        }
+
+        /* "pyblooming/cbitmap.pyx":564
+ *             src = (<Bitmap>other).mmap
+ *             if src == NULL: raise ValueError, "Bitmap is closed!"
+ *             with nogil:             # <<<<<<<<<<<<<<
+ *                 combine_bytes(self.mmap + start, src + start, stop - start, op)
+ *                 self._mark_dirty(start, stop)
+ */
+        /*finally:*/ {
+          /*normal exit:*/{
+            #ifdef WITH_THREAD
+            __Pyx_FastGIL_Forget();
+            Py_BLOCK_THREADS
+            #endif
+            goto __pyx_L12;
+          }
+          __pyx_L12:;
+        }
+    }
+
+    /* "pyblooming/cbitmap.pyx":567
+ *                 combine_bytes(self.mmap + start, src + start, stop - start, op)
+ *                 self._mark_dirty(start, stop)
+ *             return 0             # <<<<<<<<<<<<<<
+ * 
+ *         for i in range(start, stop, self.CHUNK_SIZE):
+ */
+    __pyx_r = 0;
+    goto __pyx_L0;
+
+    /* "pyblooming/cbitmap.pyx":561
+ *             raise ValueError, "Bad range!"
+ * 
+ *         if isinstance(other, Bitmap):             # <<<<<<<<<<<<<<
+ *             src = (<Bitmap>other).mmap
+ *             if src == NULL: raise ValueError, "Bitmap is closed!"
+ */
+  }
+
+  /* "pyblooming/cbitmap.pyx":569
+ *             return 0
+ * 
+ *         for i in range(start, stop, self.CHUNK_SIZE):             # <<<<<<<<<<<<<<
+ *             j = min(i + self.CHUNK_SIZE, stop)
+ *             chunk = other[i:j]
+ */
+  __pyx_t_7 = __Pyx_PyInt_FromSize_t(__pyx_v_start); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 569, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_7);
+  __pyx_t_8 = __Pyx_PyInt_FromSize_t(__pyx_v_stop); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 569, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_8);
+  __pyx_t_9 = __Pyx_PyObject_GetAttrStr(((PyObject *)__pyx_v_self), __pyx_n_s_CHUNK_SIZE); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 569, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_9);
+  __pyx_t_10 = PyTuple_New(3); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 569, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_10);
+  __Pyx_GIVEREF(__pyx_t_7);
+  PyTuple_SET_ITEM(__pyx_t_10, 0, __pyx_t_7);
+  __Pyx_GIVEREF(__pyx_t_8);
+  PyTuple_SET_ITEM(__pyx_t_10, 1, __pyx_t_8);
+  __Pyx_GIVEREF(__pyx_t_9);
+  PyTuple_SET_ITEM(__pyx_t_10, 2, __pyx_t_9);
+  __pyx_t_7 = 0;
+  __pyx_t_8 = 0;
+  __pyx_t_9 = 0;
+  __pyx_t_9 = __Pyx_PyObject_Call(__pyx_builtin_range, __pyx_t_10, NULL); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 569, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_9);
+  __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
+  if (likely(PyList_CheckExact(__pyx_t_9)) || PyTuple_CheckExact(__pyx_t_9)) {
+    __pyx_t_10 = __pyx_t_9; __Pyx_INCREF(__pyx_t_10); __pyx_t_5 = 0;
+    __pyx_t_11 = NULL;
+  } else {
+    __pyx_t_5 = -1; __pyx_t_10 = PyObject_GetIter(__pyx_t_9); if (unlikely(!__pyx_t_10)) __PYX_ERR(0, 569, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_10);
+    __pyx_t_11 = Py_TYPE(__pyx_t_10)->tp_iternext; if (unlikely(!__pyx_t_11)) __PYX_ERR(0, 569, __pyx_L1_error)
+  }
+  __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+  for (;;) {
+    if (likely(!__pyx_t_11)) {
+      if (likely(PyList_CheckExact(__pyx_t_10))) {
+        if (__pyx_t_5 >= PyList_GET_SIZE(__pyx_t_10)) break;
+        #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+        __pyx_t_9 = PyList_GET_ITEM(__pyx_t_10, __pyx_t_5); __Pyx_INCREF(__pyx_t_9); __pyx_t_5++; if (unlikely(0 < 0)) __PYX_ERR(0, 569, __pyx_L1_error)
+        #else
+        __pyx_t_9 = PySequence_ITEM(__pyx_t_10, __pyx_t_5); __pyx_t_5++; if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 569, __pyx_L1_error)
+        __Pyx_GOTREF(__pyx_t_9);
+        #endif
+      } else {
+        if (__pyx_t_5 >= PyTuple_GET_SIZE(__pyx_t_10)) break;
+        #if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+        __pyx_t_9 = PyTuple_GET_ITEM(__pyx_t_10, __pyx_t_5); __Pyx_INCREF(__pyx_t_9); __pyx_t_5++; if (unlikely(0 < 0)) __PYX_ERR(0, 569, __pyx_L1_error)
+        #else
+        __pyx_t_9 = PySequence_ITEM(__pyx_t_10, __pyx_t_5); __pyx_t_5++; if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 569, __pyx_L1_error)
+        __Pyx_GOTREF(__pyx_t_9);
+        #endif
+      }
+    } else {
+      __pyx_t_9 = __pyx_t_11(__pyx_t_10);
+      if (unlikely(!__pyx_t_9)) {
+        PyObject* exc_type = PyErr_Occurred();
+        if (exc_type) {
+          if (likely(__Pyx_PyErr_GivenExceptionMatches(exc_type, PyExc_StopIteration))) PyErr_Clear();
+          else __PYX_ERR(0, 569, __pyx_L1_error)
+        }
+        break;
+      }
+      __Pyx_GOTREF(__pyx_t_9);
+    }
+    __pyx_t_1 = __Pyx_PyInt_As_size_t(__pyx_t_9); if (unlikely((__pyx_t_1 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 569, __pyx_L1_error)
+    __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+    __pyx_v_i = __pyx_t_1;
+
+    /* "pyblooming/cbitmap.pyx":570
+ * 
+ *         for i in range(start, stop, self.CHUNK_SIZE):
+ *             j = min(i + self.CHUNK_SIZE, stop)             # <<<<<<<<<<<<<<
+ *             chunk = other[i:j]
+ *             src = <unsigned char*><char*>chunk
+ */
+    __pyx_t_1 = __pyx_v_stop;
+    __pyx_t_9 = __Pyx_PyInt_FromSize_t(__pyx_v_i); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 570, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_9);
+    __pyx_t_8 = __Pyx_PyObject_GetAttrStr(((PyObject *)__pyx_v_self), __pyx_n_s_CHUNK_SIZE); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 570, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_8);
+    __pyx_t_7 = PyNumber_Add(__pyx_t_9, __pyx_t_8); if (unlikely(!__pyx_t_7)) __PYX_ERR(0, 570, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_7);
+    __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+    __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
+    __pyx_t_9 = __Pyx_PyInt_FromSize_t(__pyx_t_1); if (unlikely(!__pyx_t_9)) __PYX_ERR(0, 570, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_9);
+    __pyx_t_12 = PyObject_RichCompare(__pyx_t_9, __pyx_t_7, Py_LT); __Pyx_XGOTREF(__pyx_t_12); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 570, __pyx_L1_error)
+    __Pyx_DECREF(__pyx_t_9); __pyx_t_9 = 0;
+    __pyx_t_4 = __Pyx_PyObject_IsTrue(__pyx_t_12); if (unlikely(__pyx_t_4 < 0)) __PYX_ERR(0, 570, __pyx_L1_error)
+    __Pyx_DECREF(__pyx_t_12); __pyx_t_12 = 0;
+    if (__pyx_t_4) {
+      __pyx_t_12 = __Pyx_PyInt_FromSize_t(__pyx_t_1); if (unlikely(!__pyx_t_12)) __PYX_ERR(0, 570, __pyx_L1_error)
+      __Pyx_GOTREF(__pyx_t_12);
+      __pyx_t_8 = __pyx_t_12;
+      __pyx_t_12 = 0;
+    } else {
+      __Pyx_INCREF(__pyx_t_7);
+      __pyx_t_8 = __pyx_t_7;
+    }
+    __Pyx_DECREF(__pyx_t_7); __pyx_t_7 = 0;
+    __pyx_t_1 = __Pyx_PyInt_As_size_t(__pyx_t_8); if (unlikely((__pyx_t_1 == (size_t)-1) && PyErr_Occurred())) __PYX_ERR(0, 570, __pyx_L1_error)
+    __Pyx_DECREF(__pyx_t_8); __pyx_t_8 = 0;
+    __pyx_v_j = __pyx_t_1;
+
+    /* "pyblooming/cbitmap.pyx":571
+ *         for i in range(start, stop, self.CHUNK_SIZE):
+ *             j = min(i + self.CHUNK_SIZE, stop)
+ *             chunk = other[i:j]             # <<<<<<<<<<<<<<
+ *             src = <unsigned char*><char*>chunk
+ *             combine_bytes(self.mmap + i, src, j - i, op)
+ */
+    __pyx_t_8 = __Pyx_PyObject_GetSlice(__pyx_v_other, __pyx_v_i, __pyx_v_j, NULL, NULL, NULL, 1, 1, 1); if (unlikely(!__pyx_t_8)) __PYX_ERR(0, 571, __pyx_L1_error)
+    __Pyx_GOTREF(__pyx_t_8);
+    __Pyx_XDECREF_SET(__pyx_v_chunk, __pyx_t_8);
+    __pyx_t_8 = 0;
+
+    /* "pyblooming/cbitmap.pyx":572
+ *             j = min(i + self.CHUNK_SIZE, stop)
+ *             chunk = other[i:j]
+ *             src = <unsigned char*><char*>chunk             # <<<<<<<<<<<<<<
+ *             combine_bytes(self.mmap + i, src, j - i, op)
+ *         self._mark_dirty(start, stop)
+ */
+    __pyx_t_13 = __Pyx_PyObject_AsWritableString(__pyx_v_chunk); if (unlikely((!__pyx_t_13) && PyErr_Occurred())) __PYX_ERR(0, 572, __pyx_L1_error)
+    __pyx_v_src = ((unsigned char *)((char *)__pyx_t_13));
+
+    /* "pyblooming/cbitmap.pyx":573
+ *             chunk = other[i:j]
+ *             src = <unsigned char*><char*>chunk
+ *             combine_bytes(self.mmap + i, src, j - i, op)             # <<<<<<<<<<<<<<
+ *         self._mark_dirty(start, stop)
+ *         return 0
+ */
+    __pyx_f_10pyblooming_7cbitmap_combine_bytes((__pyx_v_self->mmap + __pyx_v_i), __pyx_v_src, (__pyx_v_j - __pyx_v_i), __pyx_v_op);
+
+    /* "pyblooming/cbitmap.pyx":569
+ *             return 0
+ * 
+ *         for i in range(start, stop, self.CHUNK_SIZE):             # <<<<<<<<<<<<<<
+ *             j = min(i + self.CHUNK_SIZE, stop)
+ *             chunk = other[i:j]
+ */
+  }
+  __Pyx_DECREF(__pyx_t_10); __pyx_t_10 = 0;
+
+  /* "pyblooming/cbitmap.pyx":574
+ *             src = <unsigned char*><char*>chunk
+ *             combine_bytes(self.mmap + i, src, j - i, op)
+ *         self._mark_dirty(start, stop)             # <<<<<<<<<<<<<<
+ *         return 0
+ * 
+ */
+  ((struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self->__pyx_vtab)->_mark_dirty(__pyx_v_self, __pyx_v_start, __pyx_v_stop);
+
+  /* "pyblooming/cbitmap.pyx":575
+ *             combine_bytes(self.mmap + i, src, j - i, op)
+ *         self._mark_dirty(start, stop)
+ *         return 0             # <<<<<<<<<<<<<<
+ * 
+ *     def _check_size(self, other):
+ */
+  __pyx_r = 0;
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":548
+ *         return self
+ * 
+ *     cdef int _combine(self, other, size_t start, end, int op) except -1:             # <<<<<<<<<<<<<<
+ *         """
+ *         Combines the bytes from start to end with the other Bitmap.
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_7);
+  __Pyx_XDECREF(__pyx_t_8);
+  __Pyx_XDECREF(__pyx_t_9);
+  __Pyx_XDECREF(__pyx_t_10);
+  __Pyx_XDECREF(__pyx_t_12);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap._combine", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = -1;
+  __pyx_L0:;
+  __Pyx_XDECREF(__pyx_v_chunk);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":577
+ *         return 0
+ * 
+ *     def _check_size(self, other):             # <<<<<<<<<<<<<<
+ *         "Checks that the other Bitmap has the same size"
+ *         if len(other) != len(self): raise ValueError, "Bitmaps must have the same size!"
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_49_check_size(PyObject *__pyx_v_self, PyObject *__pyx_v_other); /*proto*/
+static char __pyx_doc_10pyblooming_7cbitmap_6Bitmap_48_check_size[] = "Checks that the other Bitmap has the same size";
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_49_check_size(PyObject *__pyx_v_self, PyObject *__pyx_v_other) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("_check_size (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_48_check_size(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), ((PyObject *)__pyx_v_other));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_48_check_size(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  Py_ssize_t __pyx_t_1;
+  Py_ssize_t __pyx_t_2;
+  int __pyx_t_3;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("_check_size", 0);
+
+  /* "pyblooming/cbitmap.pyx":579
+ *     def _check_size(self, other):
+ *         "Checks that the other Bitmap has the same size"
+ *         if len(other) != len(self): raise ValueError, "Bitmaps must have the same size!"             # <<<<<<<<<<<<<<
+ * 
+ *     def __ior__(self, other):
+ */
+  __pyx_t_1 = PyObject_Length(__pyx_v_other); if (unlikely(__pyx_t_1 == ((Py_ssize_t)-1))) __PYX_ERR(0, 579, __pyx_L1_error)
+  __pyx_t_2 = PyObject_Length(((PyObject *)__pyx_v_self)); if (unlikely(__pyx_t_2 == ((Py_ssize_t)-1))) __PYX_ERR(0, 579, __pyx_L1_error)
+  __pyx_t_3 = ((__pyx_t_1 != __pyx_t_2) != 0);
+  if (unlikely(__pyx_t_3)) {
+    __Pyx_Raise(__pyx_builtin_ValueError, __pyx_kp_s_Bitmaps_must_have_the_same_size, 0, 0);
+    __PYX_ERR(0, 579, __pyx_L1_error)
+  }
+
+  /* "pyblooming/cbitmap.pyx":577
+ *         return 0
+ * 
+ *     def _check_size(self, other):             # <<<<<<<<<<<<<<
+ *         "Checks that the other Bitmap has the same size"
+ *         if len(other) != len(self): raise ValueError, "Bitmaps must have the same size!"
+ */
+
+  /* function exit code */
+  __pyx_r = Py_None; __Pyx_INCREF(Py_None);
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap._check_size", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":581
+ *         if len(other) != len(self): raise ValueError, "Bitmaps must have the same size!"
+ * 
+ *     def __ior__(self, other):             # <<<<<<<<<<<<<<
+ *         self._check_size(other)
+ *         return self.union_update(other)
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_51__ior__(PyObject *__pyx_v_self, PyObject *__pyx_v_other); /*proto*/
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_51__ior__(PyObject *__pyx_v_self, PyObject *__pyx_v_other) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__ior__ (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_50__ior__(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), ((PyObject *)__pyx_v_other));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_50__ior__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  PyObject *__pyx_t_2 = NULL;
+  PyObject *__pyx_t_3 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("__ior__", 0);
+
+  /* "pyblooming/cbitmap.pyx":582
+ * 
+ *     def __ior__(self, other):
+ *         self._check_size(other)             # <<<<<<<<<<<<<<
+ *         return self.union_update(other)
+ * 
+ */
+  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(((PyObject *)__pyx_v_self), __pyx_n_s_check_size); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 582, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __pyx_t_3 = NULL;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_2))) {
+    __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_2);
+    if (likely(__pyx_t_3)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_2);
+      __Pyx_INCREF(__pyx_t_3);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_2, function);
+    }
+  }
+  __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_Call2Args(__pyx_t_2, __pyx_t_3, __pyx_v_other) : __Pyx_PyObject_CallOneArg(__pyx_t_2, __pyx_v_other);
+  __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 582, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+  /* "pyblooming/cbitmap.pyx":583
+ *     def __ior__(self, other):
+ *         self._check_size(other)
+ *         return self.union_update(other)             # <<<<<<<<<<<<<<
+ * 
+ *     def __iand__(self, other):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(((PyObject *)__pyx_v_self), __pyx_n_s_union_update); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 583, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __pyx_t_3 = NULL;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_2))) {
+    __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_2);
+    if (likely(__pyx_t_3)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_2);
+      __Pyx_INCREF(__pyx_t_3);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_2, function);
+    }
+  }
+  __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_Call2Args(__pyx_t_2, __pyx_t_3, __pyx_v_other) : __Pyx_PyObject_CallOneArg(__pyx_t_2, __pyx_v_other);
+  __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 583, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_r = __pyx_t_1;
+  __pyx_t_1 = 0;
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":581
+ *         if len(other) != len(self): raise ValueError, "Bitmaps must have the same size!"
+ * 
+ *     def __ior__(self, other):             # <<<<<<<<<<<<<<
+ *         self._check_size(other)
+ *         return self.union_update(other)
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_XDECREF(__pyx_t_2);
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__ior__", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":585
+ *         return self.union_update(other)
+ * 
+ *     def __iand__(self, other):             # <<<<<<<<<<<<<<
+ *         self._check_size(other)
+ *         return self.intersection_update(other)
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_53__iand__(PyObject *__pyx_v_self, PyObject *__pyx_v_other); /*proto*/
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_53__iand__(PyObject *__pyx_v_self, PyObject *__pyx_v_other) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__iand__ (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_52__iand__(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), ((PyObject *)__pyx_v_other));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_52__iand__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  PyObject *__pyx_t_2 = NULL;
+  PyObject *__pyx_t_3 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("__iand__", 0);
+
+  /* "pyblooming/cbitmap.pyx":586
+ * 
+ *     def __iand__(self, other):
+ *         self._check_size(other)             # <<<<<<<<<<<<<<
+ *         return self.intersection_update(other)
+ * 
+ */
+  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(((PyObject *)__pyx_v_self), __pyx_n_s_check_size); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 586, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __pyx_t_3 = NULL;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_2))) {
+    __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_2);
+    if (likely(__pyx_t_3)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_2);
+      __Pyx_INCREF(__pyx_t_3);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_2, function);
+    }
+  }
+  __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_Call2Args(__pyx_t_2, __pyx_t_3, __pyx_v_other) : __Pyx_PyObject_CallOneArg(__pyx_t_2, __pyx_v_other);
+  __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 586, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+  /* "pyblooming/cbitmap.pyx":587
+ *     def __iand__(self, other):
+ *         self._check_size(other)
+ *         return self.intersection_update(other)             # <<<<<<<<<<<<<<
+ * 
+ *     def __ixor__(self, other):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(((PyObject *)__pyx_v_self), __pyx_n_s_intersection_update); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 587, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __pyx_t_3 = NULL;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_2))) {
+    __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_2);
+    if (likely(__pyx_t_3)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_2);
+      __Pyx_INCREF(__pyx_t_3);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_2, function);
+    }
+  }
+  __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_Call2Args(__pyx_t_2, __pyx_t_3, __pyx_v_other) : __Pyx_PyObject_CallOneArg(__pyx_t_2, __pyx_v_other);
+  __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 587, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_r = __pyx_t_1;
+  __pyx_t_1 = 0;
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":585
+ *         return self.union_update(other)
+ * 
+ *     def __iand__(self, other):             # <<<<<<<<<<<<<<
+ *         self._check_size(other)
+ *         return self.intersection_update(other)
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_XDECREF(__pyx_t_2);
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__iand__", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":589
+ *         return self.intersection_update(other)
+ * 
+ *     def __ixor__(self, other):             # <<<<<<<<<<<<<<
+ *         self._check_size(other)
+ *         return self.symmetric_difference_update(other)
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_55__ixor__(PyObject *__pyx_v_self, PyObject *__pyx_v_other); /*proto*/
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_55__ixor__(PyObject *__pyx_v_self, PyObject *__pyx_v_other) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__ixor__ (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_54__ixor__(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), ((PyObject *)__pyx_v_other));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_54__ixor__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, PyObject *__pyx_v_other) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  PyObject *__pyx_t_2 = NULL;
+  PyObject *__pyx_t_3 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("__ixor__", 0);
+
+  /* "pyblooming/cbitmap.pyx":590
+ * 
+ *     def __ixor__(self, other):
+ *         self._check_size(other)             # <<<<<<<<<<<<<<
+ *         return self.symmetric_difference_update(other)
+ * 
+ */
+  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(((PyObject *)__pyx_v_self), __pyx_n_s_check_size); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 590, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __pyx_t_3 = NULL;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_2))) {
+    __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_2);
+    if (likely(__pyx_t_3)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_2);
+      __Pyx_INCREF(__pyx_t_3);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_2, function);
+    }
+  }
+  __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_Call2Args(__pyx_t_2, __pyx_t_3, __pyx_v_other) : __Pyx_PyObject_CallOneArg(__pyx_t_2, __pyx_v_other);
+  __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 590, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+  /* "pyblooming/cbitmap.pyx":591
+ *     def __ixor__(self, other):
+ *         self._check_size(other)
+ *         return self.symmetric_difference_update(other)             # <<<<<<<<<<<<<<
+ * 
+ *     def __or__(self, other):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_2 = __Pyx_PyObject_GetAttrStr(((PyObject *)__pyx_v_self), __pyx_n_s_symmetric_difference_update); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 591, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  __pyx_t_3 = NULL;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_2))) {
+    __pyx_t_3 = PyMethod_GET_SELF(__pyx_t_2);
+    if (likely(__pyx_t_3)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_2);
+      __Pyx_INCREF(__pyx_t_3);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_2, function);
+    }
+  }
+  __pyx_t_1 = (__pyx_t_3) ? __Pyx_PyObject_Call2Args(__pyx_t_2, __pyx_t_3, __pyx_v_other) : __Pyx_PyObject_CallOneArg(__pyx_t_2, __pyx_v_other);
+  __Pyx_XDECREF(__pyx_t_3); __pyx_t_3 = 0;
+  if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 591, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  __pyx_r = __pyx_t_1;
+  __pyx_t_1 = 0;
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":589
+ *         return self.intersection_update(other)
+ * 
+ *     def __ixor__(self, other):             # <<<<<<<<<<<<<<
+ *         self._check_size(other)
+ *         return self.symmetric_difference_update(other)
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_XDECREF(__pyx_t_2);
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__ixor__", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":593
+ *         return self.symmetric_difference_update(other)
+ * 
+ *     def __or__(self, other):             # <<<<<<<<<<<<<<
+ *         # Cython may call this with the operands swapped
+ *         if not isinstance(self, Bitmap): return NotImplemented
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_57__or__(PyObject *__pyx_v_self, PyObject *__pyx_v_other); /*proto*/
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_57__or__(PyObject *__pyx_v_self, PyObject *__pyx_v_other) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__or__ (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_56__or__(((PyObject *)__pyx_v_self), ((PyObject *)__pyx_v_other));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_56__or__(PyObject *__pyx_v_self, PyObject *__pyx_v_other) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_t_2;
+  PyObject *__pyx_t_3 = NULL;
+  PyObject *__pyx_t_4 = NULL;
+  PyObject *__pyx_t_5 = NULL;
+  PyObject *__pyx_t_6 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("__or__", 0);
+
+  /* "pyblooming/cbitmap.pyx":595
+ *     def __or__(self, other):
+ *         # Cython may call this with the operands swapped
+ *         if not isinstance(self, Bitmap): return NotImplemented             # <<<<<<<<<<<<<<
+ *         self._check_size(other)
+ *         return self.copy().union_update(other)
+ */
+  __pyx_t_1 = __Pyx_TypeCheck(__pyx_v_self, __pyx_ptype_10pyblooming_7cbitmap_Bitmap); 
+  __pyx_t_2 = ((!(__pyx_t_1 != 0)) != 0);
+  if (__pyx_t_2) {
+    __Pyx_XDECREF(__pyx_r);
+    __Pyx_INCREF(__pyx_builtin_NotImplemented);
+    __pyx_r = __pyx_builtin_NotImplemented;
+    goto __pyx_L0;
+  }
+
+  /* "pyblooming/cbitmap.pyx":596
+ *         # Cython may call this with the operands swapped
+ *         if not isinstance(self, Bitmap): return NotImplemented
+ *         self._check_size(other)             # <<<<<<<<<<<<<<
+ *         return self.copy().union_update(other)
+ * 
+ */
+  __pyx_t_4 = __Pyx_PyObject_GetAttrStr(__pyx_v_self, __pyx_n_s_check_size); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 596, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __pyx_t_5 = NULL;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_4))) {
+    __pyx_t_5 = PyMethod_GET_SELF(__pyx_t_4);
+    if (likely(__pyx_t_5)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_4);
+      __Pyx_INCREF(__pyx_t_5);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_4, function);
+    }
+  }
+  __pyx_t_3 = (__pyx_t_5) ? __Pyx_PyObject_Call2Args(__pyx_t_4, __pyx_t_5, __pyx_v_other) : __Pyx_PyObject_CallOneArg(__pyx_t_4, __pyx_v_other);
+  __Pyx_XDECREF(__pyx_t_5); __pyx_t_5 = 0;
+  if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 596, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+
+  /* "pyblooming/cbitmap.pyx":597
+ *         if not isinstance(self, Bitmap): return NotImplemented
+ *         self._check_size(other)
+ *         return self.copy().union_update(other)             # <<<<<<<<<<<<<<
+ * 
+ *     def __and__(self, other):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_5 = __Pyx_PyObject_GetAttrStr(__pyx_v_self, __pyx_n_s_copy); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 597, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __pyx_t_6 = NULL;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_5))) {
+    __pyx_t_6 = PyMethod_GET_SELF(__pyx_t_5);
+    if (likely(__pyx_t_6)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_5);
+      __Pyx_INCREF(__pyx_t_6);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_5, function);
+    }
+  }
+  __pyx_t_4 = (__pyx_t_6) ? __Pyx_PyObject_CallOneArg(__pyx_t_5, __pyx_t_6) : __Pyx_PyObject_CallNoArg(__pyx_t_5);
+  __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
+  if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 597, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+  __pyx_t_5 = __Pyx_PyObject_GetAttrStr(__pyx_t_4, __pyx_n_s_union_update); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 597, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __pyx_t_4 = NULL;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_5))) {
+    __pyx_t_4 = PyMethod_GET_SELF(__pyx_t_5);
+    if (likely(__pyx_t_4)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_5);
+      __Pyx_INCREF(__pyx_t_4);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_5, function);
+    }
+  }
+  __pyx_t_3 = (__pyx_t_4) ? __Pyx_PyObject_Call2Args(__pyx_t_5, __pyx_t_4, __pyx_v_other) : __Pyx_PyObject_CallOneArg(__pyx_t_5, __pyx_v_other);
+  __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
+  if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 597, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+  __pyx_r = __pyx_t_3;
+  __pyx_t_3 = 0;
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":593
+ *         return self.symmetric_difference_update(other)
+ * 
+ *     def __or__(self, other):             # <<<<<<<<<<<<<<
+ *         # Cython may call this with the operands swapped
+ *         if not isinstance(self, Bitmap): return NotImplemented
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_XDECREF(__pyx_t_5);
+  __Pyx_XDECREF(__pyx_t_6);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__or__", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":599
+ *         return self.copy().union_update(other)
+ * 
+ *     def __and__(self, other):             # <<<<<<<<<<<<<<
+ *         # Cython may call this with the operands swapped
+ *         if not isinstance(self, Bitmap): return NotImplemented
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_59__and__(PyObject *__pyx_v_self, PyObject *__pyx_v_other); /*proto*/
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_59__and__(PyObject *__pyx_v_self, PyObject *__pyx_v_other) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__and__ (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_58__and__(((PyObject *)__pyx_v_self), ((PyObject *)__pyx_v_other));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_58__and__(PyObject *__pyx_v_self, PyObject *__pyx_v_other) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_t_2;
+  PyObject *__pyx_t_3 = NULL;
+  PyObject *__pyx_t_4 = NULL;
+  PyObject *__pyx_t_5 = NULL;
+  PyObject *__pyx_t_6 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("__and__", 0);
+
+  /* "pyblooming/cbitmap.pyx":601
+ *     def __and__(self, other):
+ *         # Cython may call this with the operands swapped
+ *         if not isinstance(self, Bitmap): return NotImplemented             # <<<<<<<<<<<<<<
+ *         self._check_size(other)
+ *         return self.copy().intersection_update(other)
+ */
+  __pyx_t_1 = __Pyx_TypeCheck(__pyx_v_self, __pyx_ptype_10pyblooming_7cbitmap_Bitmap); 
+  __pyx_t_2 = ((!(__pyx_t_1 != 0)) != 0);
+  if (__pyx_t_2) {
+    __Pyx_XDECREF(__pyx_r);
+    __Pyx_INCREF(__pyx_builtin_NotImplemented);
+    __pyx_r = __pyx_builtin_NotImplemented;
+    goto __pyx_L0;
+  }
+
+  /* "pyblooming/cbitmap.pyx":602
+ *         # Cython may call this with the operands swapped
+ *         if not isinstance(self, Bitmap): return NotImplemented
+ *         self._check_size(other)             # <<<<<<<<<<<<<<
+ *         return self.copy().intersection_update(other)
+ * 
+ */
+  __pyx_t_4 = __Pyx_PyObject_GetAttrStr(__pyx_v_self, __pyx_n_s_check_size); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 602, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __pyx_t_5 = NULL;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_4))) {
+    __pyx_t_5 = PyMethod_GET_SELF(__pyx_t_4);
+    if (likely(__pyx_t_5)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_4);
+      __Pyx_INCREF(__pyx_t_5);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_4, function);
+    }
+  }
+  __pyx_t_3 = (__pyx_t_5) ? __Pyx_PyObject_Call2Args(__pyx_t_4, __pyx_t_5, __pyx_v_other) : __Pyx_PyObject_CallOneArg(__pyx_t_4, __pyx_v_other);
+  __Pyx_XDECREF(__pyx_t_5); __pyx_t_5 = 0;
+  if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 602, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+
+  /* "pyblooming/cbitmap.pyx":603
+ *         if not isinstance(self, Bitmap): return NotImplemented
+ *         self._check_size(other)
+ *         return self.copy().intersection_update(other)             # <<<<<<<<<<<<<<
+ * 
+ *     def __xor__(self, other):
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_5 = __Pyx_PyObject_GetAttrStr(__pyx_v_self, __pyx_n_s_copy); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 603, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __pyx_t_6 = NULL;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_5))) {
+    __pyx_t_6 = PyMethod_GET_SELF(__pyx_t_5);
+    if (likely(__pyx_t_6)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_5);
+      __Pyx_INCREF(__pyx_t_6);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_5, function);
+    }
+  }
+  __pyx_t_4 = (__pyx_t_6) ? __Pyx_PyObject_CallOneArg(__pyx_t_5, __pyx_t_6) : __Pyx_PyObject_CallNoArg(__pyx_t_5);
+  __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
+  if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 603, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+  __pyx_t_5 = __Pyx_PyObject_GetAttrStr(__pyx_t_4, __pyx_n_s_intersection_update); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 603, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __pyx_t_4 = NULL;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_5))) {
+    __pyx_t_4 = PyMethod_GET_SELF(__pyx_t_5);
+    if (likely(__pyx_t_4)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_5);
+      __Pyx_INCREF(__pyx_t_4);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_5, function);
+    }
+  }
+  __pyx_t_3 = (__pyx_t_4) ? __Pyx_PyObject_Call2Args(__pyx_t_5, __pyx_t_4, __pyx_v_other) : __Pyx_PyObject_CallOneArg(__pyx_t_5, __pyx_v_other);
+  __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
+  if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 603, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+  __pyx_r = __pyx_t_3;
+  __pyx_t_3 = 0;
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":599
+ *         return self.copy().union_update(other)
+ * 
+ *     def __and__(self, other):             # <<<<<<<<<<<<<<
+ *         # Cython may call this with the operands swapped
+ *         if not isinstance(self, Bitmap): return NotImplemented
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_XDECREF(__pyx_t_5);
+  __Pyx_XDECREF(__pyx_t_6);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__and__", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pyx":605
+ *         return self.copy().intersection_update(other)
+ * 
+ *     def __xor__(self, other):             # <<<<<<<<<<<<<<
+ *         # Cython may call this with the operands swapped
+ *         if not isinstance(self, Bitmap): return NotImplemented
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_61__xor__(PyObject *__pyx_v_self, PyObject *__pyx_v_other); /*proto*/
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_61__xor__(PyObject *__pyx_v_self, PyObject *__pyx_v_other) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__xor__ (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_60__xor__(((PyObject *)__pyx_v_self), ((PyObject *)__pyx_v_other));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_60__xor__(PyObject *__pyx_v_self, PyObject *__pyx_v_other) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  int __pyx_t_1;
+  int __pyx_t_2;
+  PyObject *__pyx_t_3 = NULL;
+  PyObject *__pyx_t_4 = NULL;
+  PyObject *__pyx_t_5 = NULL;
+  PyObject *__pyx_t_6 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("__xor__", 0);
+
+  /* "pyblooming/cbitmap.pyx":607
+ *     def __xor__(self, other):
+ *         # Cython may call this with the operands swapped
+ *         if not isinstance(self, Bitmap): return NotImplemented             # <<<<<<<<<<<<<<
+ *         self._check_size(other)
+ *         return self.copy().symmetric_difference_update(other)
+ */
+  __pyx_t_1 = __Pyx_TypeCheck(__pyx_v_self, __pyx_ptype_10pyblooming_7cbitmap_Bitmap); 
+  __pyx_t_2 = ((!(__pyx_t_1 != 0)) != 0);
+  if (__pyx_t_2) {
+    __Pyx_XDECREF(__pyx_r);
+    __Pyx_INCREF(__pyx_builtin_NotImplemented);
+    __pyx_r = __pyx_builtin_NotImplemented;
+    goto __pyx_L0;
+  }
+
+  /* "pyblooming/cbitmap.pyx":608
+ *         # Cython may call this with the operands swapped
+ *         if not isinstance(self, Bitmap): return NotImplemented
+ *         self._check_size(other)             # <<<<<<<<<<<<<<
+ *         return self.copy().symmetric_difference_update(other)
+ */
+  __pyx_t_4 = __Pyx_PyObject_GetAttrStr(__pyx_v_self, __pyx_n_s_check_size); if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 608, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __pyx_t_5 = NULL;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_4))) {
+    __pyx_t_5 = PyMethod_GET_SELF(__pyx_t_4);
+    if (likely(__pyx_t_5)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_4);
+      __Pyx_INCREF(__pyx_t_5);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_4, function);
+    }
+  }
+  __pyx_t_3 = (__pyx_t_5) ? __Pyx_PyObject_Call2Args(__pyx_t_4, __pyx_t_5, __pyx_v_other) : __Pyx_PyObject_CallOneArg(__pyx_t_4, __pyx_v_other);
+  __Pyx_XDECREF(__pyx_t_5); __pyx_t_5 = 0;
+  if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 608, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __Pyx_DECREF(__pyx_t_3); __pyx_t_3 = 0;
+
+  /* "pyblooming/cbitmap.pyx":609
+ *         if not isinstance(self, Bitmap): return NotImplemented
+ *         self._check_size(other)
+ *         return self.copy().symmetric_difference_update(other)             # <<<<<<<<<<<<<<
+ */
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_5 = __Pyx_PyObject_GetAttrStr(__pyx_v_self, __pyx_n_s_copy); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 609, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __pyx_t_6 = NULL;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_5))) {
+    __pyx_t_6 = PyMethod_GET_SELF(__pyx_t_5);
+    if (likely(__pyx_t_6)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_5);
+      __Pyx_INCREF(__pyx_t_6);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_5, function);
+    }
+  }
+  __pyx_t_4 = (__pyx_t_6) ? __Pyx_PyObject_CallOneArg(__pyx_t_5, __pyx_t_6) : __Pyx_PyObject_CallNoArg(__pyx_t_5);
+  __Pyx_XDECREF(__pyx_t_6); __pyx_t_6 = 0;
+  if (unlikely(!__pyx_t_4)) __PYX_ERR(0, 609, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_4);
+  __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+  __pyx_t_5 = __Pyx_PyObject_GetAttrStr(__pyx_t_4, __pyx_n_s_symmetric_difference_update); if (unlikely(!__pyx_t_5)) __PYX_ERR(0, 609, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_5);
+  __Pyx_DECREF(__pyx_t_4); __pyx_t_4 = 0;
+  __pyx_t_4 = NULL;
+  if (CYTHON_UNPACK_METHODS && likely(PyMethod_Check(__pyx_t_5))) {
+    __pyx_t_4 = PyMethod_GET_SELF(__pyx_t_5);
+    if (likely(__pyx_t_4)) {
+      PyObject* function = PyMethod_GET_FUNCTION(__pyx_t_5);
+      __Pyx_INCREF(__pyx_t_4);
+      __Pyx_INCREF(function);
+      __Pyx_DECREF_SET(__pyx_t_5, function);
+    }
+  }
+  __pyx_t_3 = (__pyx_t_4) ? __Pyx_PyObject_Call2Args(__pyx_t_5, __pyx_t_4, __pyx_v_other) : __Pyx_PyObject_CallOneArg(__pyx_t_5, __pyx_v_other);
+  __Pyx_XDECREF(__pyx_t_4); __pyx_t_4 = 0;
+  if (unlikely(!__pyx_t_3)) __PYX_ERR(0, 609, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_3);
+  __Pyx_DECREF(__pyx_t_5); __pyx_t_5 = 0;
+  __pyx_r = __pyx_t_3;
+  __pyx_t_3 = 0;
+  goto __pyx_L0;
+
+  /* "pyblooming/cbitmap.pyx":605
+ *         return self.copy().intersection_update(other)
+ * 
+ *     def __xor__(self, other):             # <<<<<<<<<<<<<<
+ *         # Cython may call this with the operands swapped
+ *         if not isinstance(self, Bitmap): return NotImplemented
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_3);
+  __Pyx_XDECREF(__pyx_t_4);
+  __Pyx_XDECREF(__pyx_t_5);
+  __Pyx_XDECREF(__pyx_t_6);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__xor__", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "pyblooming/cbitmap.pxd":10
+ *     cdef unsigned char* dirty
+ *     cdef size_t page_shift
+ *     cdef readonly bint atomic             # <<<<<<<<<<<<<<
+ * 
+ *     cdef int set_bit_array(self, size_t* indices, size_t n) except -1
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_6atomic_1__get__(PyObject *__pyx_v_self); /*proto*/
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_6atomic_1__get__(PyObject *__pyx_v_self) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__get__ (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_6atomic___get__(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_6atomic___get__(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("__get__", 0);
+  __Pyx_XDECREF(__pyx_r);
+  __pyx_t_1 = __Pyx_PyBool_FromLong(__pyx_v_self->atomic); if (unlikely(!__pyx_t_1)) __PYX_ERR(2, 10, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_r = __pyx_t_1;
+  __pyx_t_1 = 0;
+  goto __pyx_L0;
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.atomic.__get__", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __pyx_L0:;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "(tree fragment)":1
+ * def __reduce_cython__(self):             # <<<<<<<<<<<<<<
+ *     raise TypeError("no default __reduce__ due to non-trivial __cinit__")
+ * def __setstate_cython__(self, __pyx_state):
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_63__reduce_cython__(PyObject *__pyx_v_self, CYTHON_UNUSED PyObject *unused); /*proto*/
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_63__reduce_cython__(PyObject *__pyx_v_self, CYTHON_UNUSED PyObject *unused) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__reduce_cython__ (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_62__reduce_cython__(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_62__reduce_cython__(CYTHON_UNUSED struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("__reduce_cython__", 0);
+
+  /* "(tree fragment)":2
+ * def __reduce_cython__(self):
+ *     raise TypeError("no default __reduce__ due to non-trivial __cinit__")             # <<<<<<<<<<<<<<
+ * def __setstate_cython__(self, __pyx_state):
+ *     raise TypeError("no default __reduce__ due to non-trivial __cinit__")
+ */
+  __pyx_t_1 = __Pyx_PyObject_Call(__pyx_builtin_TypeError, __pyx_tuple_, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 2, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_Raise(__pyx_t_1, 0, 0, 0);
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __PYX_ERR(1, 2, __pyx_L1_error)
+
+  /* "(tree fragment)":1
+ * def __reduce_cython__(self):             # <<<<<<<<<<<<<<
+ *     raise TypeError("no default __reduce__ due to non-trivial __cinit__")
+ * def __setstate_cython__(self, __pyx_state):
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__reduce_cython__", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+/* "(tree fragment)":3
+ * def __reduce_cython__(self):
+ *     raise TypeError("no default __reduce__ due to non-trivial __cinit__")
+ * def __setstate_cython__(self, __pyx_state):             # <<<<<<<<<<<<<<
+ *     raise TypeError("no default __reduce__ due to non-trivial __cinit__")
+ */
+
+/* Python wrapper */
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_65__setstate_cython__(PyObject *__pyx_v_self, PyObject *__pyx_v___pyx_state); /*proto*/
+static PyObject *__pyx_pw_10pyblooming_7cbitmap_6Bitmap_65__setstate_cython__(PyObject *__pyx_v_self, PyObject *__pyx_v___pyx_state) {
+  PyObject *__pyx_r = 0;
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__setstate_cython__ (wrapper)", 0);
+  __pyx_r = __pyx_pf_10pyblooming_7cbitmap_6Bitmap_64__setstate_cython__(((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)__pyx_v_self), ((PyObject *)__pyx_v___pyx_state));
+
+  /* function exit code */
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+
+static PyObject *__pyx_pf_10pyblooming_7cbitmap_6Bitmap_64__setstate_cython__(CYTHON_UNUSED struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *__pyx_v_self, CYTHON_UNUSED PyObject *__pyx_v___pyx_state) {
+  PyObject *__pyx_r = NULL;
+  __Pyx_RefNannyDeclarations
+  PyObject *__pyx_t_1 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("__setstate_cython__", 0);
+
+  /* "(tree fragment)":4
+ *     raise TypeError("no default __reduce__ due to non-trivial __cinit__")
+ * def __setstate_cython__(self, __pyx_state):
+ *     raise TypeError("no default __reduce__ due to non-trivial __cinit__")             # <<<<<<<<<<<<<<
+ */
+  __pyx_t_1 = __Pyx_PyObject_Call(__pyx_builtin_TypeError, __pyx_tuple__2, NULL); if (unlikely(!__pyx_t_1)) __PYX_ERR(1, 4, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __Pyx_Raise(__pyx_t_1, 0, 0, 0);
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+  __PYX_ERR(1, 4, __pyx_L1_error)
+
+  /* "(tree fragment)":3
+ * def __reduce_cython__(self):
+ *     raise TypeError("no default __reduce__ due to non-trivial __cinit__")
+ * def __setstate_cython__(self, __pyx_state):             # <<<<<<<<<<<<<<
+ *     raise TypeError("no default __reduce__ due to non-trivial __cinit__")
+ */
+
+  /* function exit code */
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_AddTraceback("pyblooming.cbitmap.Bitmap.__setstate_cython__", __pyx_clineno, __pyx_lineno, __pyx_filename);
+  __pyx_r = NULL;
+  __Pyx_XGIVEREF(__pyx_r);
+  __Pyx_RefNannyFinishContext();
+  return __pyx_r;
+}
+static struct __pyx_vtabstruct_10pyblooming_7cbitmap_Bitmap __pyx_vtable_10pyblooming_7cbitmap_Bitmap;
+
+static PyObject *__pyx_tp_new_10pyblooming_7cbitmap_Bitmap(PyTypeObject *t, PyObject *a, PyObject *k) {
+  struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *p;
+  PyObject *o;
+  if (likely((t->tp_flags & Py_TPFLAGS_IS_ABSTRACT) == 0)) {
+    o = (*t->tp_alloc)(t, 0);
+  } else {
+    o = (PyObject *) PyBaseObject_Type.tp_new(t, __pyx_empty_tuple, 0);
+  }
+  if (unlikely(!o)) return 0;
+  p = ((struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)o);
+  p->__pyx_vtab = __pyx_vtabptr_10pyblooming_7cbitmap_Bitmap;
+  p->fileobj = Py_None; Py_INCREF(Py_None);
+  if (unlikely(__pyx_pw_10pyblooming_7cbitmap_6Bitmap_1__cinit__(o, a, k) < 0)) goto bad;
+  return o;
+  bad:
+  Py_DECREF(o); o = 0;
+  return NULL;
+}
+
+static void __pyx_tp_dealloc_10pyblooming_7cbitmap_Bitmap(PyObject *o) {
+  struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *p = (struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)o;
+  #if CYTHON_USE_TP_FINALIZE
+  if (unlikely(PyType_HasFeature(Py_TYPE(o), Py_TPFLAGS_HAVE_FINALIZE) && Py_TYPE(o)->tp_finalize) && !__Pyx_PyObject_GC_IsFinalized(o)) {
+    if (PyObject_CallFinalizerFromDealloc(o)) return;
+  }
+  #endif
+  PyObject_GC_UnTrack(o);
+  {
+    PyObject *etype, *eval, *etb;
+    PyErr_Fetch(&etype, &eval, &etb);
+    __Pyx_SET_REFCNT(o, Py_REFCNT(o) + 1);
+    __pyx_pw_10pyblooming_7cbitmap_6Bitmap_9__dealloc__(o);
+    __Pyx_SET_REFCNT(o, Py_REFCNT(o) - 1);
+    PyErr_Restore(etype, eval, etb);
+  }
+  Py_CLEAR(p->fileobj);
+  (*Py_TYPE(o)->tp_free)(o);
+}
+
+static int __pyx_tp_traverse_10pyblooming_7cbitmap_Bitmap(PyObject *o, visitproc v, void *a) {
+  int e;
+  struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *p = (struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)o;
+  if (p->fileobj) {
+    e = (*v)(p->fileobj, a); if (e) return e;
+  }
+  return 0;
+}
+
+static int __pyx_tp_clear_10pyblooming_7cbitmap_Bitmap(PyObject *o) {
+  PyObject* tmp;
+  struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *p = (struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *)o;
+  tmp = ((PyObject*)p->fileobj);
+  p->fileobj = Py_None; Py_INCREF(Py_None);
+  Py_XDECREF(tmp);
+  return 0;
+}
+static PyObject *__pyx_sq_item_10pyblooming_7cbitmap_Bitmap(PyObject *o, Py_ssize_t i) {
+  PyObject *r;
+  PyObject *x = PyInt_FromSsize_t(i); if(!x) return 0;
+  r = Py_TYPE(o)->tp_as_mapping->mp_subscript(o, x);
+  Py_DECREF(x);
+  return r;
+}
+
+static int __pyx_mp_ass_subscript_10pyblooming_7cbitmap_Bitmap(PyObject *o, PyObject *i, PyObject *v) {
+  if (v) {
+    return __pyx_pw_10pyblooming_7cbitmap_6Bitmap_7__setitem__(o, i, v);
+  }
+  else {
+    PyErr_Format(PyExc_NotImplementedError,
+      "Subscript deletion not supported by %.200s", Py_TYPE(o)->tp_name);
+    return -1;
+  }
+}
+#if PY_MAJOR_VERSION >= 3
+#error __getslice__, __setslice__, and __delslice__ not supported in Python 3.
+#endif
+
+static int __pyx_sq_ass_slice_10pyblooming_7cbitmap_Bitmap(PyObject *o, Py_ssize_t i, Py_ssize_t j, PyObject *v) {
+  if (v) {
+    return __pyx_pw_10pyblooming_7cbitmap_6Bitmap_35__setslice__(o, i, j, v);
+  }
+  else {
+    PyErr_Format(PyExc_NotImplementedError,
+      "2-element slice deletion not supported by %.200s", Py_TYPE(o)->tp_name);
+    return -1;
+  }
+}
+
+static PyObject *__pyx_getprop_10pyblooming_7cbitmap_6Bitmap_atomic(PyObject *o, CYTHON_UNUSED void *x) {
+  return __pyx_pw_10pyblooming_7cbitmap_6Bitmap_6atomic_1__get__(o);
+}
+
+static PyMethodDef __pyx_methods_10pyblooming_7cbitmap_Bitmap[] = {
+  {"set_bits", (PyCFunction)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_11set_bits, METH_O, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_10set_bits},
+  {"get_bits", (PyCFunction)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_13get_bits, METH_O, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_12get_bits},
+  {"test_all", (PyCFunction)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_15test_all, METH_O, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_14test_all},
+  {"atomic_add", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_17atomic_add, METH_VARARGS|METH_KEYWORDS, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_16atomic_add},
+  {"atomic_load", (PyCFunction)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_19atomic_load, METH_O, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_18atomic_load},
+  {"advise", (PyCFunction)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_21advise, METH_O, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_20advise},
+  {"prefetch", (PyCFunction)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_23prefetch, METH_NOARGS, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_22prefetch},
+  {"resident_bytes", (PyCFunction)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_25resident_bytes, METH_NOARGS, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_24resident_bytes},
+  {"flush", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_27flush, METH_VARARGS|METH_KEYWORDS, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_26flush},
+  {"dirty_bytes", (PyCFunction)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_29dirty_bytes, METH_NOARGS, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_28dirty_bytes},
+  {"close", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_31close, METH_VARARGS|METH_KEYWORDS, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_30close},
+  {"popcount", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_37popcount, METH_VARARGS|METH_KEYWORDS, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_36popcount},
+  {"clear", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_39clear, METH_VARARGS|METH_KEYWORDS, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_38clear},
+  {"copy", (PyCFunction)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_41copy, METH_NOARGS, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_40copy},
+  {"union_update", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_43union_update, METH_VARARGS|METH_KEYWORDS, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_42union_update},
+  {"intersection_update", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_45intersection_update, METH_VARARGS|METH_KEYWORDS, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_44intersection_update},
+  {"symmetric_difference_update", (PyCFunction)(void*)(PyCFunctionWithKeywords)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_47symmetric_difference_update, METH_VARARGS|METH_KEYWORDS, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_46symmetric_difference_update},
+  {"_check_size", (PyCFunction)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_49_check_size, METH_O, __pyx_doc_10pyblooming_7cbitmap_6Bitmap_48_check_size},
+  {"__reduce_cython__", (PyCFunction)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_63__reduce_cython__, METH_NOARGS, 0},
+  {"__setstate_cython__", (PyCFunction)__pyx_pw_10pyblooming_7cbitmap_6Bitmap_65__setstate_cython__, METH_O, 0},
+  {0, 0, 0, 0}
+};
+
+static struct PyGetSetDef __pyx_getsets_10pyblooming_7cbitmap_Bitmap[] = {
+  {(char *)"atomic", __pyx_getprop_10pyblooming_7cbitmap_6Bitmap_atomic, 0, (char *)0, 0},
+  {0, 0, 0, 0, 0}
+};
+
+static PyNumberMethods __pyx_tp_as_number_Bitmap = {
+  0, /*nb_add*/
+  0, /*nb_subtract*/
+  0, /*nb_multiply*/
+  #if PY_MAJOR_VERSION < 3 || (CYTHON_COMPILING_IN_PYPY && PY_VERSION_HEX < 0x03050000)
+  0, /*nb_divide*/
+  #endif
+  0, /*nb_remainder*/
+  0, /*nb_divmod*/
+  0, /*nb_power*/
+  0, /*nb_negative*/
+  0, /*nb_positive*/
+  0, /*nb_absolute*/
+  0, /*nb_nonzero*/
+  0, /*nb_invert*/
+  0, /*nb_lshift*/
+  0, /*nb_rshift*/
+  __pyx_pw_10pyblooming_7cbitmap_6Bitmap_59__and__, /*nb_and*/
+  __pyx_pw_10pyblooming_7cbitmap_6Bitmap_61__xor__, /*nb_xor*/
+  __pyx_pw_10pyblooming_7cbitmap_6Bitmap_57__or__, /*nb_or*/
+  #if PY_MAJOR_VERSION < 3 || (CYTHON_COMPILING_IN_PYPY && PY_VERSION_HEX < 0x03050000)
+  0, /*nb_coerce*/
+  #endif
+  0, /*nb_int*/
+  #if PY_MAJOR_VERSION < 3
+  0, /*nb_long*/
+  #else
+  0, /*reserved*/
+  #endif
+  0, /*nb_float*/
+  #if PY_MAJOR_VERSION < 3 || (CYTHON_COMPILING_IN_PYPY && PY_VERSION_HEX < 0x03050000)
+  0, /*nb_oct*/
+  #endif
+  #if PY_MAJOR_VERSION < 3 || (CYTHON_COMPILING_IN_PYPY && PY_VERSION_HEX < 0x03050000)
+  0, /*nb_hex*/
+  #endif
+  0, /*nb_inplace_add*/
+  0, /*nb_inplace_subtract*/
+  0, /*nb_inplace_multiply*/
+  #if PY_MAJOR_VERSION < 3 || (CYTHON_COMPILING_IN_PYPY && PY_VERSION_HEX < 0x03050000)
+  0, /*nb_inplace_divide*/
+  #endif
+  0, /*nb_inplace_remainder*/
+  0, /*nb_inplace_power*/
+  0, /*nb_inplace_lshift*/
+  0, /*nb_inplace_rshift*/
+  __pyx_pw_10pyblooming_7cbitmap_6Bitmap_53__iand__, /*nb_inplace_and*/
+  __pyx_pw_10pyblooming_7cbitmap_6Bitmap_55__ixor__, /*nb_inplace_xor*/
+  __pyx_pw_10pyblooming_7cbitmap_6Bitmap_51__ior__, /*nb_inplace_or*/
+  0, /*nb_floor_divide*/
+  0, /*nb_true_divide*/
+  0, /*nb_inplace_floor_divide*/
+  0, /*nb_inplace_true_divide*/
+  0, /*nb_index*/
+  #if PY_VERSION_HEX >= 0x03050000
+  0, /*nb_matrix_multiply*/
+  #endif
+  #if PY_VERSION_HEX >= 0x03050000
+  0, /*nb_inplace_matrix_multiply*/
+  #endif
+};
+
+static PySequenceMethods __pyx_tp_as_sequence_Bitmap = {
+  __pyx_pw_10pyblooming_7cbitmap_6Bitmap_3__len__, /*sq_length*/
+  0, /*sq_concat*/
+  0, /*sq_repeat*/
+  __pyx_sq_item_10pyblooming_7cbitmap_Bitmap, /*sq_item*/
+  __pyx_pw_10pyblooming_7cbitmap_6Bitmap_33__getslice__, /*sq_slice*/
+  0, /*sq_ass_item*/
+  __pyx_sq_ass_slice_10pyblooming_7cbitmap_Bitmap, /*sq_ass_slice*/
+  0, /*sq_contains*/
+  0, /*sq_inplace_concat*/
+  0, /*sq_inplace_repeat*/
+};
+
+static PyMappingMethods __pyx_tp_as_mapping_Bitmap = {
+  __pyx_pw_10pyblooming_7cbitmap_6Bitmap_3__len__, /*mp_length*/
+  __pyx_pw_10pyblooming_7cbitmap_6Bitmap_5__getitem__, /*mp_subscript*/
+  __pyx_mp_ass_subscript_10pyblooming_7cbitmap_Bitmap, /*mp_ass_subscript*/
+};
+
+static PyTypeObject __pyx_type_10pyblooming_7cbitmap_Bitmap = {
+  PyVarObject_HEAD_INIT(0, 0)
+  "pyblooming.cbitmap.Bitmap", /*tp_name*/
+  sizeof(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap), /*tp_basicsize*/
+  0, /*tp_itemsize*/
+  __pyx_tp_dealloc_10pyblooming_7cbitmap_Bitmap, /*tp_dealloc*/
+  #if PY_VERSION_HEX < 0x030800b4
+  0, /*tp_print*/
+  #endif
+  #if PY_VERSION_HEX >= 0x030800b4
+  0, /*tp_vectorcall_offset*/
+  #endif
+  0, /*tp_getattr*/
+  0, /*tp_setattr*/
+  #if PY_MAJOR_VERSION < 3
+  0, /*tp_compare*/
+  #endif
+  #if PY_MAJOR_VERSION >= 3
+  0, /*tp_as_async*/
+  #endif
+  0, /*tp_repr*/
+  &__pyx_tp_as_number_Bitmap, /*tp_as_number*/
+  &__pyx_tp_as_sequence_Bitmap, /*tp_as_sequence*/
+  &__pyx_tp_as_mapping_Bitmap, /*tp_as_mapping*/
+  0, /*tp_hash*/
+  0, /*tp_call*/
+  0, /*tp_str*/
+  0, /*tp_getattro*/
+  0, /*tp_setattro*/
+  0, /*tp_as_buffer*/
+  Py_TPFLAGS_DEFAULT|Py_TPFLAGS_HAVE_VERSION_TAG|Py_TPFLAGS_CHECKTYPES|Py_TPFLAGS_HAVE_NEWBUFFER|Py_TPFLAGS_BASETYPE|Py_TPFLAGS_HAVE_GC, /*tp_flags*/
+  0, /*tp_doc*/
+  __pyx_tp_traverse_10pyblooming_7cbitmap_Bitmap, /*tp_traverse*/
+  __pyx_tp_clear_10pyblooming_7cbitmap_Bitmap, /*tp_clear*/
+  0, /*tp_richcompare*/
+  0, /*tp_weaklistoffset*/
+  0, /*tp_iter*/
+  0, /*tp_iternext*/
+  __pyx_methods_10pyblooming_7cbitmap_Bitmap, /*tp_methods*/
+  0, /*tp_members*/
+  __pyx_getsets_10pyblooming_7cbitmap_Bitmap, /*tp_getset*/
+  0, /*tp_base*/
+  0, /*tp_dict*/
+  0, /*tp_descr_get*/
+  0, /*tp_descr_set*/
+  0, /*tp_dictoffset*/
+  0, /*tp_init*/
+  0, /*tp_alloc*/
+  __pyx_tp_new_10pyblooming_7cbitmap_Bitmap, /*tp_new*/
+  0, /*tp_free*/
+  0, /*tp_is_gc*/
+  0, /*tp_bases*/
+  0, /*tp_mro*/
+  0, /*tp_cache*/
+  0, /*tp_subclasses*/
+  0, /*tp_weaklist*/
+  0, /*tp_del*/
+  0, /*tp_version_tag*/
+  #if PY_VERSION_HEX >= 0x030400a1
+  0, /*tp_finalize*/
+  #endif
+  #if PY_VERSION_HEX >= 0x030800b1 && (!CYTHON_COMPILING_IN_PYPY || PYPY_VERSION_NUM >= 0x07030800)
+  0, /*tp_vectorcall*/
+  #endif
+  #if PY_VERSION_HEX >= 0x030800b4 && PY_VERSION_HEX < 0x03090000
+  0, /*tp_print*/
+  #endif
+  #if CYTHON_COMPILING_IN_PYPY && PY_VERSION_HEX >= 0x03090000 && PY_VERSION_HEX < 0x030a0000
+  0, /*tp_pypy_flags*/
+  #endif
+};
+
+static PyMethodDef __pyx_methods[] = {
+  {0, 0, 0, 0}
+};
+
+#if PY_MAJOR_VERSION >= 3
+#if CYTHON_PEP489_MULTI_PHASE_INIT
+static PyObject* __pyx_pymod_create(PyObject *spec, PyModuleDef *def); /*proto*/
+static int __pyx_pymod_exec_cbitmap(PyObject* module); /*proto*/
+static PyModuleDef_Slot __pyx_moduledef_slots[] = {
+  {Py_mod_create, (void*)__pyx_pymod_create},
+  {Py_mod_exec, (void*)__pyx_pymod_exec_cbitmap},
+  {0, NULL}
+};
+#endif
+
+static struct PyModuleDef __pyx_moduledef = {
+    PyModuleDef_HEAD_INIT,
+    "cbitmap",
+    0, /* m_doc */
+  #if CYTHON_PEP489_MULTI_PHASE_INIT
+    0, /* m_size */
+  #else
+    -1, /* m_size */
+  #endif
+    __pyx_methods /* m_methods */,
+  #if CYTHON_PEP489_MULTI_PHASE_INIT
+    __pyx_moduledef_slots, /* m_slots */
+  #else
+    NULL, /* m_reload */
+  #endif
+    NULL, /* m_traverse */
+    NULL, /* m_clear */
+    NULL /* m_free */
+};
+#endif
+#ifndef CYTHON_SMALL_CODE
+#if defined(__clang__)
+    #define CYTHON_SMALL_CODE
+#elif defined(__GNUC__) && (__GNUC__ > 4 || (__GNUC__ == 4 && __GNUC_MINOR__ >= 3))
+    #define CYTHON_SMALL_CODE __attribute__((cold))
+#else
+    #define CYTHON_SMALL_CODE
+#endif
+#endif
+
+static __Pyx_StringTabEntry __pyx_string_tab[] = {
+  {&__pyx_n_s_ADVICE, __pyx_k_ADVICE, sizeof(__pyx_k_ADVICE), 0, 0, 1, 1},
+  {&__pyx_kp_s_Atomic_bitmaps_can_not_be_privat, __pyx_k_Atomic_bitmaps_can_not_be_privat, sizeof(__pyx_k_Atomic_bitmaps_can_not_be_privat), 0, 0, 1, 0},
+  {&__pyx_kp_s_Bad_offset, __pyx_k_Bad_offset, sizeof(__pyx_k_Bad_offset), 0, 0, 1, 0},
+  {&__pyx_kp_s_Bad_range, __pyx_k_Bad_range, sizeof(__pyx_k_Bad_range), 0, 0, 1, 0},
+  {&__pyx_kp_s_Bad_slice, __pyx_k_Bad_slice, sizeof(__pyx_k_Bad_slice), 0, 0, 1, 0},
+  {&__pyx_kp_s_Bit_index_out_of_range, __pyx_k_Bit_index_out_of_range, sizeof(__pyx_k_Bit_index_out_of_range), 0, 0, 1, 0},
+  {&__pyx_n_s_Bitmap, __pyx_k_Bitmap, sizeof(__pyx_k_Bitmap), 0, 0, 1, 1},
+  {&__pyx_kp_s_Bitmap_is_closed, __pyx_k_Bitmap_is_closed, sizeof(__pyx_k_Bitmap_is_closed), 0, 0, 1, 0},
+  {&__pyx_kp_s_Bitmaps_must_have_the_same_size, __pyx_k_Bitmaps_must_have_the_same_size, sizeof(__pyx_k_Bitmaps_must_have_the_same_size), 0, 0, 1, 0},
+  {&__pyx_n_s_CHUNK_SIZE, __pyx_k_CHUNK_SIZE, sizeof(__pyx_k_CHUNK_SIZE), 0, 0, 1, 1},
+  {&__pyx_kp_s_Failed_to_call_madvise_s, __pyx_k_Failed_to_call_madvise_s, sizeof(__pyx_k_Failed_to_call_madvise_s), 0, 0, 1, 0},
+  {&__pyx_kp_s_Failed_to_call_mincore_s, __pyx_k_Failed_to_call_mincore_s, sizeof(__pyx_k_Failed_to_call_mincore_s), 0, 0, 1, 0},
+  {&__pyx_kp_s_Failed_to_create_memory_mapped_r, __pyx_k_Failed_to_create_memory_mapped_r, sizeof(__pyx_k_Failed_to_create_memory_mapped_r), 0, 0, 1, 0},
+  {&__pyx_kp_s_Failed_to_extend_the_file_s, __pyx_k_Failed_to_extend_the_file_s, sizeof(__pyx_k_Failed_to_extend_the_file_s), 0, 0, 1, 0},
+  {&__pyx_kp_s_Failed_to_flush_the_buffers, __pyx_k_Failed_to_flush_the_buffers, sizeof(__pyx_k_Failed_to_flush_the_buffers), 0, 0, 1, 0},
+  {&__pyx_kp_s_Failed_to_lock_the_counter_s, __pyx_k_Failed_to_lock_the_counter_s, sizeof(__pyx_k_Failed_to_lock_the_counter_s), 0, 0, 1, 0},
+  {&__pyx_kp_s_Failed_to_memory_map_the_file, __pyx_k_Failed_to_memory_map_the_file, sizeof(__pyx_k_Failed_to_memory_map_the_file), 0, 0, 1, 0},
+  {&__pyx_n_s_IndexError, __pyx_k_IndexError, sizeof(__pyx_k_IndexError), 0, 0, 1, 1},
+  {&__pyx_kp_s_Length_must_be_positive, __pyx_k_Length_must_be_positive, sizeof(__pyx_k_Length_must_be_positive), 0, 0, 1, 0},
+  {&__pyx_n_s_MemoryError, __pyx_k_MemoryError, sizeof(__pyx_k_MemoryError), 0, 0, 1, 1},
+  {&__pyx_n_s_NotImplemented, __pyx_k_NotImplemented, sizeof(__pyx_k_NotImplemented), 0, 0, 1, 1},
+  {&__pyx_n_s_OSError, __pyx_k_OSError, sizeof(__pyx_k_OSError), 0, 0, 1, 1},
+  {&__pyx_n_s_TypeError, __pyx_k_TypeError, sizeof(__pyx_k_TypeError), 0, 0, 1, 1},
+  {&__pyx_kp_s_Unknown_advice_r, __pyx_k_Unknown_advice_r, sizeof(__pyx_k_Unknown_advice_r), 0, 0, 1, 0},
+  {&__pyx_n_s_ValueError, __pyx_k_ValueError, sizeof(__pyx_k_ValueError), 0, 0, 1, 1},
+  {&__pyx_kp_s_a, __pyx_k_a, sizeof(__pyx_k_a), 0, 0, 1, 0},
+  {&__pyx_n_s_advice, __pyx_k_advice, sizeof(__pyx_k_advice), 0, 0, 1, 1},
+  {&__pyx_n_s_advise, __pyx_k_advise, sizeof(__pyx_k_advise), 0, 0, 1, 1},
+  {&__pyx_n_s_atomic, __pyx_k_atomic, sizeof(__pyx_k_atomic), 0, 0, 1, 1},
+  {&__pyx_n_s_atomic_add, __pyx_k_atomic_add, sizeof(__pyx_k_atomic_add), 0, 0, 1, 1},
+  {&__pyx_n_s_check_size, __pyx_k_check_size, sizeof(__pyx_k_check_size), 0, 0, 1, 1},
+  {&__pyx_n_s_cline_in_traceback, __pyx_k_cline_in_traceback, sizeof(__pyx_k_cline_in_traceback), 0, 0, 1, 1},
+  {&__pyx_n_s_close, __pyx_k_close, sizeof(__pyx_k_close), 0, 0, 1, 1},
+  {&__pyx_n_s_copy, __pyx_k_copy, sizeof(__pyx_k_copy), 0, 0, 1, 1},
+  {&__pyx_n_s_delta, __pyx_k_delta, sizeof(__pyx_k_delta), 0, 0, 1, 1},
+  {&__pyx_n_s_dirty_only, __pyx_k_dirty_only, sizeof(__pyx_k_dirty_only), 0, 0, 1, 1},
+  {&__pyx_n_s_end, __pyx_k_end, sizeof(__pyx_k_end), 0, 0, 1, 1},
+  {&__pyx_n_s_filename, __pyx_k_filename, sizeof(__pyx_k_filename), 0, 0, 1, 1},
+  {&__pyx_n_s_fileno, __pyx_k_fileno, sizeof(__pyx_k_fileno), 0, 0, 1, 1},
+  {&__pyx_n_s_flush, __pyx_k_flush, sizeof(__pyx_k_flush), 0, 0, 1, 1},
+  {&__pyx_n_s_getstate, __pyx_k_getstate, sizeof(__pyx_k_getstate), 0, 0, 1, 1},
+  {&__pyx_n_s_hugepage, __pyx_k_hugepage, sizeof(__pyx_k_hugepage), 0, 0, 1, 1},
+  {&__pyx_n_s_import, __pyx_k_import, sizeof(__pyx_k_import), 0, 0, 1, 1},
+  {&__pyx_n_s_intersection_update, __pyx_k_intersection_update, sizeof(__pyx_k_intersection_update), 0, 0, 1, 1},
+  {&__pyx_n_s_length, __pyx_k_length, sizeof(__pyx_k_length), 0, 0, 1, 1},
+  {&__pyx_n_s_main, __pyx_k_main, sizeof(__pyx_k_main), 0, 0, 1, 1},
+  {&__pyx_n_s_name, __pyx_k_name, sizeof(__pyx_k_name), 0, 0, 1, 1},
+  {&__pyx_kp_s_no_default___reduce___due_to_non, __pyx_k_no_default___reduce___due_to_non, sizeof(__pyx_k_no_default___reduce___due_to_non), 0, 0, 1, 0},
+  {&__pyx_n_s_normal, __pyx_k_normal, sizeof(__pyx_k_normal), 0, 0, 1, 1},
+  {&__pyx_n_s_offset, __pyx_k_offset, sizeof(__pyx_k_offset), 0, 0, 1, 1},
+  {&__pyx_n_s_open, __pyx_k_open, sizeof(__pyx_k_open), 0, 0, 1, 1},
+  {&__pyx_n_s_os, __pyx_k_os, sizeof(__pyx_k_os), 0, 0, 1, 1},
+  {&__pyx_n_s_os_path, __pyx_k_os_path, sizeof(__pyx_k_os_path), 0, 0, 1, 1},
+  {&__pyx_n_s_other, __pyx_k_other, sizeof(__pyx_k_other), 0, 0, 1, 1},
+  {&__pyx_n_s_populate, __pyx_k_populate, sizeof(__pyx_k_populate), 0, 0, 1, 1},
+  {&__pyx_n_s_preallocate, __pyx_k_preallocate, sizeof(__pyx_k_preallocate), 0, 0, 1, 1},
+  {&__pyx_n_s_prefetch, __pyx_k_prefetch, sizeof(__pyx_k_prefetch), 0, 0, 1, 1},
+  {&__pyx_n_s_private, __pyx_k_private, sizeof(__pyx_k_private), 0, 0, 1, 1},
+  {&__pyx_n_s_pyx_vtable, __pyx_k_pyx_vtable, sizeof(__pyx_k_pyx_vtable), 0, 0, 1, 1},
+  {&__pyx_n_s_random, __pyx_k_random, sizeof(__pyx_k_random), 0, 0, 1, 1},
+  {&__pyx_n_s_range, __pyx_k_range, sizeof(__pyx_k_range), 0, 0, 1, 1},
+  {&__pyx_n_s_reduce, __pyx_k_reduce, sizeof(__pyx_k_reduce), 0, 0, 1, 1},
+  {&__pyx_n_s_reduce_cython, __pyx_k_reduce_cython, sizeof(__pyx_k_reduce_cython), 0, 0, 1, 1},
+  {&__pyx_n_s_reduce_ex, __pyx_k_reduce_ex, sizeof(__pyx_k_reduce_ex), 0, 0, 1, 1},
+  {&__pyx_n_s_sequential, __pyx_k_sequential, sizeof(__pyx_k_sequential), 0, 0, 1, 1},
+  {&__pyx_n_s_setstate, __pyx_k_setstate, sizeof(__pyx_k_setstate), 0, 0, 1, 1},
+  {&__pyx_n_s_setstate_cython, __pyx_k_setstate_cython, sizeof(__pyx_k_setstate_cython), 0, 0, 1, 1},
+  {&__pyx_n_s_start, __pyx_k_start, sizeof(__pyx_k_start), 0, 0, 1, 1},
+  {&__pyx_n_s_strerror, __pyx_k_strerror, sizeof(__pyx_k_strerror), 0, 0, 1, 1},
+  {&__pyx_n_s_symmetric_difference_update, __pyx_k_symmetric_difference_update, sizeof(__pyx_k_symmetric_difference_update), 0, 0, 1, 1},
+  {&__pyx_n_s_test, __pyx_k_test, sizeof(__pyx_k_test), 0, 0, 1, 1},
+  {&__pyx_n_s_union_update, __pyx_k_union_update, sizeof(__pyx_k_union_update), 0, 0, 1, 1},
+  {&__pyx_n_s_willneed, __pyx_k_willneed, sizeof(__pyx_k_willneed), 0, 0, 1, 1},
+  {&__pyx_n_s_xrange, __pyx_k_xrange, sizeof(__pyx_k_xrange), 0, 0, 1, 1},
+  {0, 0, 0, 0, 0, 0, 0}
+};
+static CYTHON_SMALL_CODE int __Pyx_InitCachedBuiltins(void) {
+  __pyx_builtin_range = __Pyx_GetBuiltinName(__pyx_n_s_range); if (!__pyx_builtin_range) __PYX_ERR(0, 34, __pyx_L1_error)
+  __pyx_builtin_ValueError = __Pyx_GetBuiltinName(__pyx_n_s_ValueError); if (!__pyx_builtin_ValueError) __PYX_ERR(0, 107, __pyx_L1_error)
+  __pyx_builtin_MemoryError = __Pyx_GetBuiltinName(__pyx_n_s_MemoryError); if (!__pyx_builtin_MemoryError) __PYX_ERR(0, 119, __pyx_L1_error)
+  __pyx_builtin_OSError = __Pyx_GetBuiltinName(__pyx_n_s_OSError); if (!__pyx_builtin_OSError) __PYX_ERR(0, 127, __pyx_L1_error)
+  __pyx_builtin_open = __Pyx_GetBuiltinName(__pyx_n_s_open); if (!__pyx_builtin_open) __PYX_ERR(0, 130, __pyx_L1_error)
+  __pyx_builtin_IndexError = __Pyx_GetBuiltinName(__pyx_n_s_IndexError); if (!__pyx_builtin_IndexError) __PYX_ERR(0, 269, __pyx_L1_error)
+  #if PY_MAJOR_VERSION >= 3
+  __pyx_builtin_xrange = __Pyx_GetBuiltinName(__pyx_n_s_range); if (!__pyx_builtin_xrange) __PYX_ERR(0, 476, __pyx_L1_error)
+  #else
+  __pyx_builtin_xrange = __Pyx_GetBuiltinName(__pyx_n_s_xrange); if (!__pyx_builtin_xrange) __PYX_ERR(0, 476, __pyx_L1_error)
+  #endif
+  __pyx_builtin_NotImplemented = __Pyx_GetBuiltinName(__pyx_n_s_NotImplemented); if (!__pyx_builtin_NotImplemented) __PYX_ERR(0, 595, __pyx_L1_error)
+  __pyx_builtin_TypeError = __Pyx_GetBuiltinName(__pyx_n_s_TypeError); if (!__pyx_builtin_TypeError) __PYX_ERR(1, 2, __pyx_L1_error)
+  return 0;
+  __pyx_L1_error:;
+  return -1;
+}
+
+static CYTHON_SMALL_CODE int __Pyx_InitCachedConstants(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_InitCachedConstants", 0);
+
+  /* "(tree fragment)":2
+ * def __reduce_cython__(self):
+ *     raise TypeError("no default __reduce__ due to non-trivial __cinit__")             # <<<<<<<<<<<<<<
+ * def __setstate_cython__(self, __pyx_state):
+ *     raise TypeError("no default __reduce__ due to non-trivial __cinit__")
+ */
+  __pyx_tuple_ = PyTuple_Pack(1, __pyx_kp_s_no_default___reduce___due_to_non); if (unlikely(!__pyx_tuple_)) __PYX_ERR(1, 2, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple_);
+  __Pyx_GIVEREF(__pyx_tuple_);
+
+  /* "(tree fragment)":4
+ *     raise TypeError("no default __reduce__ due to non-trivial __cinit__")
+ * def __setstate_cython__(self, __pyx_state):
+ *     raise TypeError("no default __reduce__ due to non-trivial __cinit__")             # <<<<<<<<<<<<<<
+ */
+  __pyx_tuple__2 = PyTuple_Pack(1, __pyx_kp_s_no_default___reduce___due_to_non); if (unlikely(!__pyx_tuple__2)) __PYX_ERR(1, 4, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_tuple__2);
+  __Pyx_GIVEREF(__pyx_tuple__2);
+  __Pyx_RefNannyFinishContext();
+  return 0;
+  __pyx_L1_error:;
+  __Pyx_RefNannyFinishContext();
+  return -1;
+}
+
+static CYTHON_SMALL_CODE int __Pyx_InitGlobals(void) {
+  if (__Pyx_InitStrings(__pyx_string_tab) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  __pyx_int_0 = PyInt_FromLong(0); if (unlikely(!__pyx_int_0)) __PYX_ERR(0, 1, __pyx_L1_error)
+  __pyx_int_1048576 = PyInt_FromLong(1048576L); if (unlikely(!__pyx_int_1048576)) __PYX_ERR(0, 1, __pyx_L1_error)
+  return 0;
+  __pyx_L1_error:;
+  return -1;
+}
+
+static CYTHON_SMALL_CODE int __Pyx_modinit_global_init_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_variable_export_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_function_export_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_type_init_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_type_import_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_variable_import_code(void); /*proto*/
+static CYTHON_SMALL_CODE int __Pyx_modinit_function_import_code(void); /*proto*/
+
+static int __Pyx_modinit_global_init_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_global_init_code", 0);
+  /*--- Global init code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+static int __Pyx_modinit_variable_export_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_variable_export_code", 0);
+  /*--- Variable export code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+static int __Pyx_modinit_function_export_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_function_export_code", 0);
+  /*--- Function export code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+static int __Pyx_modinit_type_init_code(void) {
+  __Pyx_RefNannyDeclarations
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannySetupContext("__Pyx_modinit_type_init_code", 0);
+  /*--- Type init code ---*/
+  __pyx_vtabptr_10pyblooming_7cbitmap_Bitmap = &__pyx_vtable_10pyblooming_7cbitmap_Bitmap;
+  __pyx_vtable_10pyblooming_7cbitmap_Bitmap.set_bit_array = (int (*)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *, size_t *, size_t))__pyx_f_10pyblooming_7cbitmap_6Bitmap_set_bit_array;
+  __pyx_vtable_10pyblooming_7cbitmap_Bitmap.test_bit_array = (int (*)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *, size_t *, size_t))__pyx_f_10pyblooming_7cbitmap_6Bitmap_test_bit_array;
+  __pyx_vtable_10pyblooming_7cbitmap_Bitmap._set_array = (void (*)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *, size_t *, size_t))__pyx_f_10pyblooming_7cbitmap_6Bitmap__set_array;
+  __pyx_vtable_10pyblooming_7cbitmap_Bitmap._test_array = (int (*)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *, size_t *, size_t))__pyx_f_10pyblooming_7cbitmap_6Bitmap__test_array;
+  __pyx_vtable_10pyblooming_7cbitmap_Bitmap._load_indices = (size_t (*)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *, PyObject *))__pyx_f_10pyblooming_7cbitmap_6Bitmap__load_indices;
+  __pyx_vtable_10pyblooming_7cbitmap_Bitmap._combine = (int (*)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *, PyObject *, size_t, PyObject *, int))__pyx_f_10pyblooming_7cbitmap_6Bitmap__combine;
+  __pyx_vtable_10pyblooming_7cbitmap_Bitmap._mark_dirty = (void (*)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *, size_t, size_t))__pyx_f_10pyblooming_7cbitmap_6Bitmap__mark_dirty;
+  __pyx_vtable_10pyblooming_7cbitmap_Bitmap._flush_dirty = (int (*)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *))__pyx_f_10pyblooming_7cbitmap_6Bitmap__flush_dirty;
+  __pyx_vtable_10pyblooming_7cbitmap_Bitmap._pages = (size_t (*)(struct __pyx_obj_10pyblooming_7cbitmap_Bitmap *))__pyx_f_10pyblooming_7cbitmap_6Bitmap__pages;
+  if (PyType_Ready(&__pyx_type_10pyblooming_7cbitmap_Bitmap) < 0) __PYX_ERR(0, 72, __pyx_L1_error)
+  #if PY_VERSION_HEX < 0x030800B1
+  __pyx_type_10pyblooming_7cbitmap_Bitmap.tp_print = 0;
+  #endif
+  if ((CYTHON_USE_TYPE_SLOTS && CYTHON_USE_PYTYPE_LOOKUP) && likely(!__pyx_type_10pyblooming_7cbitmap_Bitmap.tp_dictoffset && __pyx_type_10pyblooming_7cbitmap_Bitmap.tp_getattro == PyObject_GenericGetAttr)) {
+    __pyx_type_10pyblooming_7cbitmap_Bitmap.tp_getattro = __Pyx_PyObject_GenericGetAttr;
+  }
+  #if CYTHON_UPDATE_DESCRIPTOR_DOC
+  {
+    PyObject *wrapper = PyObject_GetAttrString((PyObject *)&__pyx_type_10pyblooming_7cbitmap_Bitmap, "__len__"); if (unlikely(!wrapper)) __PYX_ERR(0, 72, __pyx_L1_error)
+    if (Py_TYPE(wrapper) == &PyWrapperDescr_Type) {
+      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_2__len__ = *((PyWrapperDescrObject *)wrapper)->d_base;
+      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_2__len__.doc = __pyx_doc_10pyblooming_7cbitmap_6Bitmap_2__len__;
+      ((PyWrapperDescrObject *)wrapper)->d_base = &__pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_2__len__;
+    }
+  }
+  #endif
+  #if CYTHON_UPDATE_DESCRIPTOR_DOC
+  {
+    PyObject *wrapper = PyObject_GetAttrString((PyObject *)&__pyx_type_10pyblooming_7cbitmap_Bitmap, "__getitem__"); if (unlikely(!wrapper)) __PYX_ERR(0, 72, __pyx_L1_error)
+    if (Py_TYPE(wrapper) == &PyWrapperDescr_Type) {
+      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_4__getitem__ = *((PyWrapperDescrObject *)wrapper)->d_base;
+      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_4__getitem__.doc = __pyx_doc_10pyblooming_7cbitmap_6Bitmap_4__getitem__;
+      ((PyWrapperDescrObject *)wrapper)->d_base = &__pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_4__getitem__;
+    }
+  }
+  #endif
+  #if CYTHON_UPDATE_DESCRIPTOR_DOC
+  {
+    PyObject *wrapper = PyObject_GetAttrString((PyObject *)&__pyx_type_10pyblooming_7cbitmap_Bitmap, "__setitem__"); if (unlikely(!wrapper)) __PYX_ERR(0, 72, __pyx_L1_error)
+    if (Py_TYPE(wrapper) == &PyWrapperDescr_Type) {
+      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_6__setitem__ = *((PyWrapperDescrObject *)wrapper)->d_base;
+      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_6__setitem__.doc = __pyx_doc_10pyblooming_7cbitmap_6Bitmap_6__setitem__;
+      ((PyWrapperDescrObject *)wrapper)->d_base = &__pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_6__setitem__;
+    }
+  }
+  #endif
+  #if CYTHON_UPDATE_DESCRIPTOR_DOC
+  {
+    PyObject *wrapper = PyObject_GetAttrString((PyObject *)&__pyx_type_10pyblooming_7cbitmap_Bitmap, "__getslice__"); if (unlikely(!wrapper)) __PYX_ERR(0, 72, __pyx_L1_error)
+    if (Py_TYPE(wrapper) == &PyWrapperDescr_Type) {
+      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_32__getslice__ = *((PyWrapperDescrObject *)wrapper)->d_base;
+      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_32__getslice__.doc = __pyx_doc_10pyblooming_7cbitmap_6Bitmap_32__getslice__;
+      ((PyWrapperDescrObject *)wrapper)->d_base = &__pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_32__getslice__;
+    }
+  }
+  #endif
+  #if CYTHON_UPDATE_DESCRIPTOR_DOC
+  {
+    PyObject *wrapper = PyObject_GetAttrString((PyObject *)&__pyx_type_10pyblooming_7cbitmap_Bitmap, "__setslice__"); if (unlikely(!wrapper)) __PYX_ERR(0, 72, __pyx_L1_error)
+    if (Py_TYPE(wrapper) == &PyWrapperDescr_Type) {
+      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_34__setslice__ = *((PyWrapperDescrObject *)wrapper)->d_base;
+      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_34__setslice__.doc = __pyx_doc_10pyblooming_7cbitmap_6Bitmap_34__setslice__;
+      ((PyWrapperDescrObject *)wrapper)->d_base = &__pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_34__setslice__;
+    }
+  }
+  #endif
+  if (__Pyx_SetVtable(__pyx_type_10pyblooming_7cbitmap_Bitmap.tp_dict, __pyx_vtabptr_10pyblooming_7cbitmap_Bitmap) < 0) __PYX_ERR(0, 72, __pyx_L1_error)
+  if (PyObject_SetAttr(__pyx_m, __pyx_n_s_Bitmap, (PyObject *)&__pyx_type_10pyblooming_7cbitmap_Bitmap) < 0) __PYX_ERR(0, 72, __pyx_L1_error)
+  if (__Pyx_setup_reduce((PyObject*)&__pyx_type_10pyblooming_7cbitmap_Bitmap) < 0) __PYX_ERR(0, 72, __pyx_L1_error)
+  __pyx_ptype_10pyblooming_7cbitmap_Bitmap = &__pyx_type_10pyblooming_7cbitmap_Bitmap;
+  __Pyx_RefNannyFinishContext();
+  return 0;
+  __pyx_L1_error:;
+  __Pyx_RefNannyFinishContext();
+  return -1;
+}
+
+static int __Pyx_modinit_type_import_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_type_import_code", 0);
+  /*--- Type import code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+static int __Pyx_modinit_variable_import_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_variable_import_code", 0);
+  /*--- Variable import code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+static int __Pyx_modinit_function_import_code(void) {
+  __Pyx_RefNannyDeclarations
+  __Pyx_RefNannySetupContext("__Pyx_modinit_function_import_code", 0);
+  /*--- Function import code ---*/
+  __Pyx_RefNannyFinishContext();
+  return 0;
+}
+
+
+#ifndef CYTHON_NO_PYINIT_EXPORT
+#define __Pyx_PyMODINIT_FUNC PyMODINIT_FUNC
+#elif PY_MAJOR_VERSION < 3
+#ifdef __cplusplus
+#define __Pyx_PyMODINIT_FUNC extern "C" void
+#else
+#define __Pyx_PyMODINIT_FUNC void
+#endif
+#else
+#ifdef __cplusplus
+#define __Pyx_PyMODINIT_FUNC extern "C" PyObject *
+#else
+#define __Pyx_PyMODINIT_FUNC PyObject *
+#endif
+#endif
+
+
+#if PY_MAJOR_VERSION < 3
+__Pyx_PyMODINIT_FUNC initcbitmap(void) CYTHON_SMALL_CODE; /*proto*/
+__Pyx_PyMODINIT_FUNC initcbitmap(void)
+#else
+__Pyx_PyMODINIT_FUNC PyInit_cbitmap(void) CYTHON_SMALL_CODE; /*proto*/
+__Pyx_PyMODINIT_FUNC PyInit_cbitmap(void)
+#if CYTHON_PEP489_MULTI_PHASE_INIT
+{
+  return PyModuleDef_Init(&__pyx_moduledef);
+}
+static CYTHON_SMALL_CODE int __Pyx_check_single_interpreter(void) {
+    #if PY_VERSION_HEX >= 0x030700A1
+    static PY_INT64_T main_interpreter_id = -1;
+    PY_INT64_T current_id = PyInterpreterState_GetID(PyThreadState_Get()->interp);
+    if (main_interpreter_id == -1) {
+        main_interpreter_id = current_id;
+        return (unlikely(current_id == -1)) ? -1 : 0;
+    } else if (unlikely(main_interpreter_id != current_id))
+    #else
+    static PyInterpreterState *main_interpreter = NULL;
+    PyInterpreterState *current_interpreter = PyThreadState_Get()->interp;
+    if (!main_interpreter) {
+        main_interpreter = current_interpreter;
+    } else if (unlikely(main_interpreter != current_interpreter))
+    #endif
+    {
+        PyErr_SetString(
+            PyExc_ImportError,
+            "Interpreter change detected - this module can only be loaded into one interpreter per process.");
+        return -1;
+    }
+    return 0;
+}
+static CYTHON_SMALL_CODE int __Pyx_copy_spec_to_module(PyObject *spec, PyObject *moddict, const char* from_name, const char* to_name, int allow_none) {
+    PyObject *value = PyObject_GetAttrString(spec, from_name);
+    int result = 0;
+    if (likely(value)) {
+        if (allow_none || value != Py_None) {
+            result = PyDict_SetItemString(moddict, to_name, value);
+        }
+        Py_DECREF(value);
+    } else if (PyErr_ExceptionMatches(PyExc_AttributeError)) {
+        PyErr_Clear();
+    } else {
+        result = -1;
+    }
+    return result;
+}
+static CYTHON_SMALL_CODE PyObject* __pyx_pymod_create(PyObject *spec, CYTHON_UNUSED PyModuleDef *def) {
+    PyObject *module = NULL, *moddict, *modname;
+    if (__Pyx_check_single_interpreter())
+        return NULL;
+    if (__pyx_m)
+        return __Pyx_NewRef(__pyx_m);
+    modname = PyObject_GetAttrString(spec, "name");
+    if (unlikely(!modname)) goto bad;
+    module = PyModule_NewObject(modname);
+    Py_DECREF(modname);
+    if (unlikely(!module)) goto bad;
+    moddict = PyModule_GetDict(module);
+    if (unlikely(!moddict)) goto bad;
+    if (unlikely(__Pyx_copy_spec_to_module(spec, moddict, "loader", "__loader__", 1) < 0)) goto bad;
+    if (unlikely(__Pyx_copy_spec_to_module(spec, moddict, "origin", "__file__", 1) < 0)) goto bad;
+    if (unlikely(__Pyx_copy_spec_to_module(spec, moddict, "parent", "__package__", 1) < 0)) goto bad;
+    if (unlikely(__Pyx_copy_spec_to_module(spec, moddict, "submodule_search_locations", "__path__", 0) < 0)) goto bad;
+    return module;
+bad:
+    Py_XDECREF(module);
+    return NULL;
+}
+
+
+static CYTHON_SMALL_CODE int __pyx_pymod_exec_cbitmap(PyObject *__pyx_pyinit_module)
+#endif
+#endif
+{
+  PyObject *__pyx_t_1 = NULL;
+  PyObject *__pyx_t_2 = NULL;
+  int __pyx_lineno = 0;
+  const char *__pyx_filename = NULL;
+  int __pyx_clineno = 0;
+  __Pyx_RefNannyDeclarations
+  #if CYTHON_PEP489_MULTI_PHASE_INIT
+  if (__pyx_m) {
+    if (__pyx_m == __pyx_pyinit_module) return 0;
+    PyErr_SetString(PyExc_RuntimeError, "Module 'cbitmap' has already been imported. Re-initialisation is not supported.");
+    return -1;
+  }
+  #elif PY_MAJOR_VERSION >= 3
+  if (__pyx_m) return __Pyx_NewRef(__pyx_m);
+  #endif
+  #if CYTHON_REFNANNY
+__Pyx_RefNanny = __Pyx_RefNannyImportAPI("refnanny");
+if (!__Pyx_RefNanny) {
+  PyErr_Clear();
+  __Pyx_RefNanny = __Pyx_RefNannyImportAPI("Cython.Runtime.refnanny");
+  if (!__Pyx_RefNanny)
+      Py_FatalError("failed to import 'refnanny' module");
+}
+#endif
+  __Pyx_RefNannySetupContext("__Pyx_PyMODINIT_FUNC PyInit_cbitmap(void)", 0);
+  if (__Pyx_check_binary_version() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #ifdef __Pxy_PyFrame_Initialize_Offsets
+  __Pxy_PyFrame_Initialize_Offsets();
+  #endif
+  __pyx_empty_tuple = PyTuple_New(0); if (unlikely(!__pyx_empty_tuple)) __PYX_ERR(0, 1, __pyx_L1_error)
+  __pyx_empty_bytes = PyBytes_FromStringAndSize("", 0); if (unlikely(!__pyx_empty_bytes)) __PYX_ERR(0, 1, __pyx_L1_error)
+  __pyx_empty_unicode = PyUnicode_FromStringAndSize("", 0); if (unlikely(!__pyx_empty_unicode)) __PYX_ERR(0, 1, __pyx_L1_error)
+  #ifdef __Pyx_CyFunction_USED
+  if (__pyx_CyFunction_init() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  #ifdef __Pyx_FusedFunction_USED
+  if (__pyx_FusedFunction_init() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  #ifdef __Pyx_Coroutine_USED
+  if (__pyx_Coroutine_init() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  #ifdef __Pyx_Generator_USED
+  if (__pyx_Generator_init() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  #ifdef __Pyx_AsyncGen_USED
+  if (__pyx_AsyncGen_init() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  #ifdef __Pyx_StopAsyncIteration_USED
+  if (__pyx_StopAsyncIteration_init() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  /*--- Library function declarations ---*/
+  /*--- Threads initialization code ---*/
+  #if defined(WITH_THREAD) && PY_VERSION_HEX < 0x030700F0 && defined(__PYX_FORCE_INIT_THREADS) && __PYX_FORCE_INIT_THREADS
+  PyEval_InitThreads();
+  #endif
+  /*--- Module creation code ---*/
+  #if CYTHON_PEP489_MULTI_PHASE_INIT
+  __pyx_m = __pyx_pyinit_module;
+  Py_INCREF(__pyx_m);
+  #else
+  #if PY_MAJOR_VERSION < 3
+  __pyx_m = Py_InitModule4("cbitmap", __pyx_methods, 0, 0, PYTHON_API_VERSION); Py_XINCREF(__pyx_m);
+  #else
+  __pyx_m = PyModule_Create(&__pyx_moduledef);
+  #endif
+  if (unlikely(!__pyx_m)) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  __pyx_d = PyModule_GetDict(__pyx_m); if (unlikely(!__pyx_d)) __PYX_ERR(0, 1, __pyx_L1_error)
+  Py_INCREF(__pyx_d);
+  __pyx_b = PyImport_AddModule(__Pyx_BUILTIN_MODULE_NAME); if (unlikely(!__pyx_b)) __PYX_ERR(0, 1, __pyx_L1_error)
+  Py_INCREF(__pyx_b);
+  __pyx_cython_runtime = PyImport_AddModule((char *) "cython_runtime"); if (unlikely(!__pyx_cython_runtime)) __PYX_ERR(0, 1, __pyx_L1_error)
+  Py_INCREF(__pyx_cython_runtime);
+  if (PyObject_SetAttrString(__pyx_m, "__builtins__", __pyx_b) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  /*--- Initialize various global constants etc. ---*/
+  if (__Pyx_InitGlobals() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #if PY_MAJOR_VERSION < 3 && (__PYX_DEFAULT_STRING_ENCODING_IS_ASCII || __PYX_DEFAULT_STRING_ENCODING_IS_DEFAULT)
+  if (__Pyx_init_sys_getdefaultencoding_params() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+  if (__pyx_module_is_main_pyblooming__cbitmap) {
+    if (PyObject_SetAttr(__pyx_m, __pyx_n_s_name, __pyx_n_s_main) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  }
+  #if PY_MAJOR_VERSION >= 3
+  {
+    PyObject *modules = PyImport_GetModuleDict(); if (unlikely(!modules)) __PYX_ERR(0, 1, __pyx_L1_error)
+    if (!PyDict_GetItemString(modules, "pyblooming.cbitmap")) {
+      if (unlikely(PyDict_SetItemString(modules, "pyblooming.cbitmap", __pyx_m) < 0)) __PYX_ERR(0, 1, __pyx_L1_error)
+    }
+  }
+  #endif
+  /*--- Builtin init code ---*/
+  if (__Pyx_InitCachedBuiltins() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  /*--- Constants init code ---*/
+  if (__Pyx_InitCachedConstants() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  /*--- Global type/function init code ---*/
+  (void)__Pyx_modinit_global_init_code();
+  (void)__Pyx_modinit_variable_export_code();
+  (void)__Pyx_modinit_function_export_code();
+  if (unlikely(__Pyx_modinit_type_init_code() < 0)) __PYX_ERR(0, 1, __pyx_L1_error)
+  (void)__Pyx_modinit_type_import_code();
+  (void)__Pyx_modinit_variable_import_code();
+  (void)__Pyx_modinit_function_import_code();
+  /*--- Execution code ---*/
+  #if defined(__Pyx_Generator_USED) || defined(__Pyx_Coroutine_USED)
+  if (__Pyx_patch_abc() < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  #endif
+
+  /* "pyblooming/cbitmap.pyx":8
+ * from posix.unistd cimport sysconf, _SC_PAGESIZE
+ * cimport cython
+ * import os.path             # <<<<<<<<<<<<<<
+ * 
+ * cdef extern from *:
+ */
+  __pyx_t_1 = __Pyx_Import(__pyx_n_s_os_path, 0, -1); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 8, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_os, __pyx_t_1) < 0) __PYX_ERR(0, 8, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+  /* "pyblooming/cbitmap.pyx":65
+ * # Maps the access pattern hints to the madvise() advice
+ * ADVICE = {
+ *     "normal": ADVICE_NORMAL,             # <<<<<<<<<<<<<<
+ *     "random": ADVICE_RANDOM,
+ *     "sequential": ADVICE_SEQUENTIAL,
+ */
+  __pyx_t_1 = __Pyx_PyDict_NewPresized(5); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 65, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  __pyx_t_2 = __Pyx_PyInt_From_int(ADVICE_NORMAL); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 65, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_t_1, __pyx_n_s_normal, __pyx_t_2) < 0) __PYX_ERR(0, 65, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "pyblooming/cbitmap.pyx":66
+ * ADVICE = {
+ *     "normal": ADVICE_NORMAL,
+ *     "random": ADVICE_RANDOM,             # <<<<<<<<<<<<<<
+ *     "sequential": ADVICE_SEQUENTIAL,
+ *     "willneed": ADVICE_WILLNEED,
+ */
+  __pyx_t_2 = __Pyx_PyInt_From_int(ADVICE_RANDOM); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 66, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_t_1, __pyx_n_s_random, __pyx_t_2) < 0) __PYX_ERR(0, 65, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "pyblooming/cbitmap.pyx":67
+ *     "normal": ADVICE_NORMAL,
+ *     "random": ADVICE_RANDOM,
+ *     "sequential": ADVICE_SEQUENTIAL,             # <<<<<<<<<<<<<<
+ *     "willneed": ADVICE_WILLNEED,
+ *     "hugepage": ADVICE_HUGEPAGE,
+ */
+  __pyx_t_2 = __Pyx_PyInt_From_int(ADVICE_SEQUENTIAL); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 67, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_t_1, __pyx_n_s_sequential, __pyx_t_2) < 0) __PYX_ERR(0, 65, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "pyblooming/cbitmap.pyx":68
+ *     "random": ADVICE_RANDOM,
+ *     "sequential": ADVICE_SEQUENTIAL,
+ *     "willneed": ADVICE_WILLNEED,             # <<<<<<<<<<<<<<
+ *     "hugepage": ADVICE_HUGEPAGE,
+ * }
+ */
+  __pyx_t_2 = __Pyx_PyInt_From_int(ADVICE_WILLNEED); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 68, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_t_1, __pyx_n_s_willneed, __pyx_t_2) < 0) __PYX_ERR(0, 65, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+
+  /* "pyblooming/cbitmap.pyx":69
+ *     "sequential": ADVICE_SEQUENTIAL,
+ *     "willneed": ADVICE_WILLNEED,
+ *     "hugepage": ADVICE_HUGEPAGE,             # <<<<<<<<<<<<<<
+ * }
+ * 
+ */
+  __pyx_t_2 = __Pyx_PyInt_From_int(ADVICE_HUGEPAGE); if (unlikely(!__pyx_t_2)) __PYX_ERR(0, 69, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_2);
+  if (PyDict_SetItem(__pyx_t_1, __pyx_n_s_hugepage, __pyx_t_2) < 0) __PYX_ERR(0, 65, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_2); __pyx_t_2 = 0;
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_ADVICE, __pyx_t_1) < 0) __PYX_ERR(0, 64, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+  /* "pyblooming/cbitmap.pyx":74
+ * cdef class Bitmap:
+ *     # The number of bytes processed at a time by bulk operations
+ *     CHUNK_SIZE = 1 << 20             # <<<<<<<<<<<<<<
+ * 
+ *     def __cinit__(self, length, filename=None, private=False, preallocate=False,
+ */
+  if (PyDict_SetItem((PyObject *)__pyx_ptype_10pyblooming_7cbitmap_Bitmap->tp_dict, __pyx_n_s_CHUNK_SIZE, __pyx_int_1048576) < 0) __PYX_ERR(0, 74, __pyx_L1_error)
+  PyType_Modified(__pyx_ptype_10pyblooming_7cbitmap_Bitmap);
+
+  /* "pyblooming/cbitmap.pyx":1
+ * from libc cimport stdlib             # <<<<<<<<<<<<<<
+ * from libc.string cimport memcpy
+ * from libc.stdint cimport uint64_t, int64_t
+ */
+  __pyx_t_1 = __Pyx_PyDict_NewPresized(0); if (unlikely(!__pyx_t_1)) __PYX_ERR(0, 1, __pyx_L1_error)
+  __Pyx_GOTREF(__pyx_t_1);
+  if (PyDict_SetItem(__pyx_d, __pyx_n_s_test, __pyx_t_1) < 0) __PYX_ERR(0, 1, __pyx_L1_error)
+  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
+
+  /*--- Wrapped vars code ---*/
+
+  goto __pyx_L0;
+  __pyx_L1_error:;
+  __Pyx_XDECREF(__pyx_t_1);
+  __Pyx_XDECREF(__pyx_t_2);
+  if (__pyx_m) {
+    if (__pyx_d) {
+      __Pyx_AddTraceback("init pyblooming.cbitmap", __pyx_clineno, __pyx_lineno, __pyx_filename);
+    }
+    Py_CLEAR(__pyx_m);
+  } else if (!PyErr_Occurred()) {
+    PyErr_SetString(PyExc_ImportError, "init pyblooming.cbitmap");
+  }
+  __pyx_L0:;
+  __Pyx_RefNannyFinishContext();
+  #if CYTHON_PEP489_MULTI_PHASE_INIT
+  return (__pyx_m != NULL) ? 0 : -1;
+  #elif PY_MAJOR_VERSION >= 3
+  return __pyx_m;
+  #else
+  return;
+  #endif
+}
+
+/* --- Runtime support code --- */
+/* Refnanny */
+#if CYTHON_REFNANNY
+static __Pyx_RefNannyAPIStruct *__Pyx_RefNannyImportAPI(const char *modname) {
+    PyObject *m = NULL, *p = NULL;
+    void *r = NULL;
+    m = PyImport_ImportModule(modname);
+    if (!m) goto end;
+    p = PyObject_GetAttrString(m, "RefNannyAPI");
+    if (!p) goto end;
+    r = PyLong_AsVoidPtr(p);
+end:
+    Py_XDECREF(p);
+    Py_XDECREF(m);
+    return (__Pyx_RefNannyAPIStruct *)r;
+}
+#endif
+
+/* PyObjectGetAttrStr */
+#if CYTHON_USE_TYPE_SLOTS
+static CYTHON_INLINE PyObject* __Pyx_PyObject_GetAttrStr(PyObject* obj, PyObject* attr_name) {
+    PyTypeObject* tp = Py_TYPE(obj);
+    if (likely(tp->tp_getattro))
+        return tp->tp_getattro(obj, attr_name);
+#if PY_MAJOR_VERSION < 3
+    if (likely(tp->tp_getattr))
+        return tp->tp_getattr(obj, PyString_AS_STRING(attr_name));
+#endif
+    return PyObject_GetAttr(obj, attr_name);
+}
+#endif
+
+/* GetBuiltinName */
+static PyObject *__Pyx_GetBuiltinName(PyObject *name) {
+    PyObject* result = __Pyx_PyObject_GetAttrStr(__pyx_b, name);
+    if (unlikely(!result)) {
+        PyErr_Format(PyExc_NameError,
+#if PY_MAJOR_VERSION >= 3
+            "name '%U' is not defined", name);
+#else
+            "name '%.200s' is not defined", PyString_AS_STRING(name));
+#endif
+    }
+    return result;
+}
+
+/* RaiseDoubleKeywords */
+static void __Pyx_RaiseDoubleKeywordsError(
+    const char* func_name,
+    PyObject* kw_name)
+{
+    PyErr_Format(PyExc_TypeError,
+        #if PY_MAJOR_VERSION >= 3
+        "%s() got multiple values for keyword argument '%U'", func_name, kw_name);
+        #else
+        "%s() got multiple values for keyword argument '%s'", func_name,
+        PyString_AsString(kw_name));
+        #endif
+}
+
+/* ParseKeywords */
+static int __Pyx_ParseOptionalKeywords(
+    PyObject *kwds,
+    PyObject **argnames[],
+    PyObject *kwds2,
+    PyObject *values[],
+    Py_ssize_t num_pos_args,
+    const char* function_name)
+{
+    PyObject *key = 0, *value = 0;
+    Py_ssize_t pos = 0;
+    PyObject*** name;
+    PyObject*** first_kw_arg = argnames + num_pos_args;
+    while (PyDict_Next(kwds, &pos, &key, &value)) {
+        name = first_kw_arg;
+        while (*name && (**name != key)) name++;
+        if (*name) {
+            values[name-argnames] = value;
+            continue;
+        }
+        name = first_kw_arg;
+        #if PY_MAJOR_VERSION < 3
+        if (likely(PyString_Check(key))) {
+            while (*name) {
+                if ((CYTHON_COMPILING_IN_PYPY || PyString_GET_SIZE(**name) == PyString_GET_SIZE(key))
+                        && _PyString_Eq(**name, key)) {
+                    values[name-argnames] = value;
+                    break;
+                }
+                name++;
+            }
+            if (*name) continue;
+            else {
+                PyObject*** argname = argnames;
+                while (argname != first_kw_arg) {
+                    if ((**argname == key) || (
+                            (CYTHON_COMPILING_IN_PYPY || PyString_GET_SIZE(**argname) == PyString_GET_SIZE(key))
+                             && _PyString_Eq(**argname, key))) {
+                        goto arg_passed_twice;
+                    }
+                    argname++;
+                }
+            }
+        } else
+        #endif
+        if (likely(PyUnicode_Check(key))) {
+            while (*name) {
+                int cmp = (**name == key) ? 0 :
+                #if !CYTHON_COMPILING_IN_PYPY && PY_MAJOR_VERSION >= 3
+                    (__Pyx_PyUnicode_GET_LENGTH(**name) != __Pyx_PyUnicode_GET_LENGTH(key)) ? 1 :
+                #endif
+                    PyUnicode_Compare(**name, key);
+                if (cmp < 0 && unlikely(PyErr_Occurred())) goto bad;
+                if (cmp == 0) {
+                    values[name-argnames] = value;
+                    break;
+                }
+                name++;
+            }
+            if (*name) continue;
+            else {
+                PyObject*** argname = argnames;
+                while (argname != first_kw_arg) {
+                    int cmp = (**argname == key) ? 0 :
+                    #if !CYTHON_COMPILING_IN_PYPY && PY_MAJOR_VERSION >= 3
+                        (__Pyx_PyUnicode_GET_LENGTH(**argname) != __Pyx_PyUnicode_GET_LENGTH(key)) ? 1 :
+                    #endif
+                        PyUnicode_Compare(**argname, key);
+                    if (cmp < 0 && unlikely(PyErr_Occurred())) goto bad;
+                    if (cmp == 0) goto arg_passed_twice;
+                    argname++;
+                }
+            }
+        } else
+            goto invalid_keyword_type;
+        if (kwds2) {
+            if (unlikely(PyDict_SetItem(kwds2, key, value))) goto bad;
+        } else {
+            goto invalid_keyword;
+        }
+    }
+    return 0;
+arg_passed_twice:
+    __Pyx_RaiseDoubleKeywordsError(function_name, key);
+    goto bad;
+invalid_keyword_type:
+    PyErr_Format(PyExc_TypeError,
+        "%.200s() keywords must be strings", function_name);
+    goto bad;
+invalid_keyword:
+    PyErr_Format(PyExc_TypeError,
+    #if PY_MAJOR_VERSION < 3
+        "%.200s() got an unexpected keyword argument '%.200s'",
+        function_name, PyString_AsString(key));
+    #else
+        "%s() got an unexpected keyword argument '%U'",
+        function_name, key);
+    #endif
+bad:
+    return -1;
+}
+
+/* RaiseArgTupleInvalid */
+static void __Pyx_RaiseArgtupleInvalid(
+    const char* func_name,
+    int exact,
+    Py_ssize_t num_min,
+    Py_ssize_t num_max,
+    Py_ssize_t num_found)
+{
+    Py_ssize_t num_expected;
+    const char *more_or_less;
+    if (num_found < num_min) {
+        num_expected = num_min;
+        more_or_less = "at least";
+    } else {
+        num_expected = num_max;
+        more_or_less = "at most";
+    }
+    if (exact) {
+        more_or_less = "exactly";
+    }
+    PyErr_Format(PyExc_TypeError,
+                 "%.200s() takes %.8s %" CYTHON_FORMAT_SSIZE_T "d positional argument%.1s (%" CYTHON_FORMAT_SSIZE_T "d given)",
+                 func_name, more_or_less, num_expected,
+                 (num_expected == 1) ? "" : "s", num_found);
+}
+
+/* PyErrFetchRestore */
+#if CYTHON_FAST_THREAD_STATE
+static CYTHON_INLINE void __Pyx_ErrRestoreInState(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb) {
+    PyObject *tmp_type, *tmp_value, *tmp_tb;
+    tmp_type = tstate->curexc_type;
+    tmp_value = tstate->curexc_value;
+    tmp_tb = tstate->curexc_traceback;
+    tstate->curexc_type = type;
+    tstate->curexc_value = value;
+    tstate->curexc_traceback = tb;
+    Py_XDECREF(tmp_type);
+    Py_XDECREF(tmp_value);
+    Py_XDECREF(tmp_tb);
+}
+static CYTHON_INLINE void __Pyx_ErrFetchInState(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
+    *type = tstate->curexc_type;
+    *value = tstate->curexc_value;
+    *tb = tstate->curexc_traceback;
+    tstate->curexc_type = 0;
+    tstate->curexc_value = 0;
+    tstate->curexc_traceback = 0;
+}
+#endif
+
+/* RaiseException */
+#if PY_MAJOR_VERSION < 3
+static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb,
+                        CYTHON_UNUSED PyObject *cause) {
+    __Pyx_PyThreadState_declare
+    Py_XINCREF(type);
+    if (!value || value == Py_None)
+        value = NULL;
+    else
+        Py_INCREF(value);
+    if (!tb || tb == Py_None)
+        tb = NULL;
+    else {
+        Py_INCREF(tb);
+        if (!PyTraceBack_Check(tb)) {
+            PyErr_SetString(PyExc_TypeError,
+                "raise: arg 3 must be a traceback or None");
+            goto raise_error;
+        }
+    }
+    if (PyType_Check(type)) {
+#if CYTHON_COMPILING_IN_PYPY
+        if (!value) {
+            Py_INCREF(Py_None);
+            value = Py_None;
+        }
+#endif
+        PyErr_NormalizeException(&type, &value, &tb);
+    } else {
+        if (value) {
+            PyErr_SetString(PyExc_TypeError,
+                "instance exception may not have a separate value");
+            goto raise_error;
+        }
+        value = type;
+        type = (PyObject*) Py_TYPE(type);
+        Py_INCREF(type);
+        if (!PyType_IsSubtype((PyTypeObject *)type, (PyTypeObject *)PyExc_BaseException)) {
+            PyErr_SetString(PyExc_TypeError,
+                "raise: exception class must be a subclass of BaseException");
+            goto raise_error;
+        }
+    }
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrRestore(type, value, tb);
+    return;
+raise_error:
+    Py_XDECREF(value);
+    Py_XDECREF(type);
+    Py_XDECREF(tb);
+    return;
+}
+#else
+static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause) {
+    PyObject* owned_instance = NULL;
+    if (tb == Py_None) {
+        tb = 0;
+    } else if (tb && !PyTraceBack_Check(tb)) {
+        PyErr_SetString(PyExc_TypeError,
+            "raise: arg 3 must be a traceback or None");
+        goto bad;
+    }
+    if (value == Py_None)
+        value = 0;
+    if (PyExceptionInstance_Check(type)) {
+        if (value) {
+            PyErr_SetString(PyExc_TypeError,
+                "instance exception may not have a separate value");
+            goto bad;
+        }
+        value = type;
+        type = (PyObject*) Py_TYPE(value);
+    } else if (PyExceptionClass_Check(type)) {
+        PyObject *instance_class = NULL;
+        if (value && PyExceptionInstance_Check(value)) {
+            instance_class = (PyObject*) Py_TYPE(value);
+            if (instance_class != type) {
+                int is_subclass = PyObject_IsSubclass(instance_class, type);
+                if (!is_subclass) {
+                    instance_class = NULL;
+                } else if (unlikely(is_subclass == -1)) {
+                    goto bad;
+                } else {
+                    type = instance_class;
+                }
+            }
+        }
+        if (!instance_class) {
+            PyObject *args;
+            if (!value)
+                args = PyTuple_New(0);
+            else if (PyTuple_Check(value)) {
+                Py_INCREF(value);
+                args = value;
+            } else
+                args = PyTuple_Pack(1, value);
+            if (!args)
+                goto bad;
+            owned_instance = PyObject_Call(type, args, NULL);
+            Py_DECREF(args);
+            if (!owned_instance)
+                goto bad;
+            value = owned_instance;
+            if (!PyExceptionInstance_Check(value)) {
+                PyErr_Format(PyExc_TypeError,
+                             "calling %R should have returned an instance of "
+                             "BaseException, not %R",
+                             type, Py_TYPE(value));
+                goto bad;
+            }
+        }
+    } else {
+        PyErr_SetString(PyExc_TypeError,
+            "raise: exception class must be a subclass of BaseException");
+        goto bad;
+    }
+    if (cause) {
+        PyObject *fixed_cause;
+        if (cause == Py_None) {
+            fixed_cause = NULL;
+        } else if (PyExceptionClass_Check(cause)) {
+            fixed_cause = PyObject_CallObject(cause, NULL);
+            if (fixed_cause == NULL)
+                goto bad;
+        } else if (PyExceptionInstance_Check(cause)) {
+            fixed_cause = cause;
+            Py_INCREF(fixed_cause);
+        } else {
+            PyErr_SetString(PyExc_TypeError,
+                            "exception causes must derive from "
+                            "BaseException");
+            goto bad;
+        }
+        PyException_SetCause(value, fixed_cause);
+    }
+    PyErr_SetObject(type, value);
+    if (tb) {
+#if CYTHON_FAST_THREAD_STATE
+        PyThreadState *tstate = __Pyx_PyThreadState_Current;
+        PyObject* tmp_tb = tstate->curexc_traceback;
+        if (tb != tmp_tb) {
+            Py_INCREF(tb);
+            tstate->curexc_traceback = tb;
+            Py_XDECREF(tmp_tb);
+        }
+#else
+        PyObject *tmp_type, *tmp_value, *tmp_tb;
+        PyErr_Fetch(&tmp_type, &tmp_value, &tmp_tb);
+        Py_INCREF(tb);
+        PyErr_Restore(tmp_type, tmp_value, tb);
+        Py_XDECREF(tmp_tb);
 #endif
-
-static __Pyx_StringTabEntry __pyx_string_tab[] = {
-  {&__pyx_n_s_10, __pyx_k_10, sizeof(__pyx_k_10), 0, 0, 1, 1},
-  {&__pyx_kp_s_2, __pyx_k_2, sizeof(__pyx_k_2), 0, 0, 1, 0},
-  {&__pyx_kp_s_3, __pyx_k_3, sizeof(__pyx_k_3), 0, 0, 1, 0},
-  {&__pyx_kp_s_4, __pyx_k_4, sizeof(__pyx_k_4), 0, 0, 1, 0},
-  {&__pyx_kp_s_6, __pyx_k_6, sizeof(__pyx_k_6), 0, 0, 1, 0},
-  {&__pyx_kp_s_7, __pyx_k_7, sizeof(__pyx_k_7), 0, 0, 1, 0},
-  {&__pyx_kp_s_9, __pyx_k_9, sizeof(__pyx_k_9), 0, 0, 1, 0},
-  {&__pyx_n_s__OSError, __pyx_k__OSError, sizeof(__pyx_k__OSError), 0, 0, 1, 1},
-  {&__pyx_n_s__ValueError, __pyx_k__ValueError, sizeof(__pyx_k__ValueError), 0, 0, 1, 1},
-  {&__pyx_n_s____main__, __pyx_k____main__, sizeof(__pyx_k____main__), 0, 0, 1, 1},
-  {&__pyx_n_s____test__, __pyx_k____test__, sizeof(__pyx_k____test__), 0, 0, 1, 1},
-  {&__pyx_n_s__chr, __pyx_k__chr, sizeof(__pyx_k__chr), 0, 0, 1, 1},
-  {&__pyx_n_s__close, __pyx_k__close, sizeof(__pyx_k__close), 0, 0, 1, 1},
-  {&__pyx_n_s__filename, __pyx_k__filename, sizeof(__pyx_k__filename), 0, 0, 1, 1},
-  {&__pyx_n_s__fileno, __pyx_k__fileno, sizeof(__pyx_k__fileno), 0, 0, 1, 1},
-  {&__pyx_n_s__flush, __pyx_k__flush, sizeof(__pyx_k__flush), 0, 0, 1, 1},
-  {&__pyx_n_s__getsize, __pyx_k__getsize, sizeof(__pyx_k__getsize), 0, 0, 1, 1},
-  {&__pyx_n_s__length, __pyx_k__length, sizeof(__pyx_k__length), 0, 0, 1, 1},
-  {&__pyx_n_s__open, __pyx_k__open, sizeof(__pyx_k__open), 0, 0, 1, 1},
-  {&__pyx_n_s__os, __pyx_k__os, sizeof(__pyx_k__os), 0, 0, 1, 1},
-  {&__pyx_n_s__path, __pyx_k__path, sizeof(__pyx_k__path), 0, 0, 1, 1},
-  {&__pyx_n_s__private, __pyx_k__private, sizeof(__pyx_k__private), 0, 0, 1, 1},
-  {&__pyx_n_s__range, __pyx_k__range, sizeof(__pyx_k__range), 0, 0, 1, 1},
-  {&__pyx_n_s__write, __pyx_k__write, sizeof(__pyx_k__write), 0, 0, 1, 1},
-  {&__pyx_n_s__xrange, __pyx_k__xrange, sizeof(__pyx_k__xrange), 0, 0, 1, 1},
-  {0, 0, 0, 0, 0, 0, 0}
-};
-static int __Pyx_InitCachedBuiltins(void) {
-  __pyx_builtin_ValueError = __Pyx_GetName(__pyx_b, __pyx_n_s__ValueError); if (!__pyx_builtin_ValueError) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 31; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __pyx_builtin_OSError = __Pyx_GetName(__pyx_b, __pyx_n_s__OSError); if (!__pyx_builtin_OSError) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 40; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __pyx_builtin_open = __Pyx_GetName(__pyx_b, __pyx_n_s__open); if (!__pyx_builtin_open) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 43; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __pyx_builtin_chr = __Pyx_GetName(__pyx_b, __pyx_n_s__chr); if (!__pyx_builtin_chr) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 49; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  #if PY_MAJOR_VERSION >= 3
-  __pyx_builtin_xrange = __Pyx_GetName(__pyx_b, __pyx_n_s__range); if (!__pyx_builtin_xrange) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 121; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  #else
-  __pyx_builtin_xrange = __Pyx_GetName(__pyx_b, __pyx_n_s__xrange); if (!__pyx_builtin_xrange) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 121; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  #endif
-  return 0;
-  __pyx_L1_error:;
-  return -1;
+    }
+bad:
+    Py_XDECREF(owned_instance);
+    return;
 }
+#endif
 
-static int __Pyx_InitCachedConstants(void) {
-  __Pyx_RefNannyDeclarations
-  __Pyx_RefNannySetupContext("__Pyx_InitCachedConstants");
-
-  /* "pyblooming/cbitmap.pyx":49
- *             size_diff = length - os.path.getsize(filename)
- *             while size_diff > 0:
- *                 self.fileobj.write(chr(0) * min(size_diff, 100000))             # <<<<<<<<<<<<<<
- *                 self.fileobj.flush()
- *                 size_diff = length - os.path.getsize(filename)
- */
-  __pyx_k_tuple_5 = PyTuple_New(1); if (unlikely(!__pyx_k_tuple_5)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 49; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __Pyx_GOTREF(((PyObject *)__pyx_k_tuple_5));
-  __Pyx_INCREF(__pyx_int_0);
-  PyTuple_SET_ITEM(__pyx_k_tuple_5, 0, __pyx_int_0);
-  __Pyx_GIVEREF(__pyx_int_0);
-  __Pyx_GIVEREF(((PyObject *)__pyx_k_tuple_5));
-  __Pyx_RefNannyFinishContext();
-  return 0;
-  __pyx_L1_error:;
-  __Pyx_RefNannyFinishContext();
-  return -1;
+/* PyDictVersioning */
+#if CYTHON_USE_DICT_VERSIONS && CYTHON_USE_TYPE_SLOTS
+static CYTHON_INLINE PY_UINT64_T __Pyx_get_tp_dict_version(PyObject *obj) {
+    PyObject *dict = Py_TYPE(obj)->tp_dict;
+    return likely(dict) ? __PYX_GET_DICT_VERSION(dict) : 0;
 }
-
-static int __Pyx_InitGlobals(void) {
-  if (__Pyx_InitStrings(__pyx_string_tab) < 0) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 1; __pyx_clineno = __LINE__; goto __pyx_L1_error;};
-  __pyx_int_0 = PyInt_FromLong(0); if (unlikely(!__pyx_int_0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 1; __pyx_clineno = __LINE__; goto __pyx_L1_error;};
-  return 0;
-  __pyx_L1_error:;
-  return -1;
+static CYTHON_INLINE PY_UINT64_T __Pyx_get_object_dict_version(PyObject *obj) {
+    PyObject **dictptr = NULL;
+    Py_ssize_t offset = Py_TYPE(obj)->tp_dictoffset;
+    if (offset) {
+#if CYTHON_COMPILING_IN_CPYTHON
+        dictptr = (likely(offset > 0)) ? (PyObject **) ((char *)obj + offset) : _PyObject_GetDictPtr(obj);
+#else
+        dictptr = _PyObject_GetDictPtr(obj);
+#endif
+    }
+    return (dictptr && *dictptr) ? __PYX_GET_DICT_VERSION(*dictptr) : 0;
+}
+static CYTHON_INLINE int __Pyx_object_dict_version_matches(PyObject* obj, PY_UINT64_T tp_dict_version, PY_UINT64_T obj_dict_version) {
+    PyObject *dict = Py_TYPE(obj)->tp_dict;
+    if (unlikely(!dict) || unlikely(tp_dict_version != __PYX_GET_DICT_VERSION(dict)))
+        return 0;
+    return obj_dict_version == __Pyx_get_object_dict_version(obj);
 }
+#endif
 
-#if PY_MAJOR_VERSION < 3
-PyMODINIT_FUNC initcbitmap(void); /*proto*/
-PyMODINIT_FUNC initcbitmap(void)
+/* GetModuleGlobalName */
+#if CYTHON_USE_DICT_VERSIONS
+static PyObject *__Pyx__GetModuleGlobalName(PyObject *name, PY_UINT64_T *dict_version, PyObject **dict_cached_value)
 #else
-PyMODINIT_FUNC PyInit_cbitmap(void); /*proto*/
-PyMODINIT_FUNC PyInit_cbitmap(void)
+static CYTHON_INLINE PyObject *__Pyx__GetModuleGlobalName(PyObject *name)
 #endif
 {
-  PyObject *__pyx_t_1 = NULL;
-  __Pyx_RefNannyDeclarations
-  #if CYTHON_REFNANNY
-  __Pyx_RefNanny = __Pyx_RefNannyImportAPI("refnanny");
-  if (!__Pyx_RefNanny) {
-      PyErr_Clear();
-      __Pyx_RefNanny = __Pyx_RefNannyImportAPI("Cython.Runtime.refnanny");
-      if (!__Pyx_RefNanny)
-          Py_FatalError("failed to import 'refnanny' module");
-  }
-  #endif
-  __Pyx_RefNannySetupContext("PyMODINIT_FUNC PyInit_cbitmap(void)");
-  if ( __Pyx_check_binary_version() < 0) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 1; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __pyx_empty_tuple = PyTuple_New(0); if (unlikely(!__pyx_empty_tuple)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 1; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __pyx_empty_bytes = PyBytes_FromStringAndSize("", 0); if (unlikely(!__pyx_empty_bytes)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 1; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  #ifdef __pyx_binding_PyCFunctionType_USED
-  if (__pyx_binding_PyCFunctionType_init() < 0) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 1; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  #endif
-  /*--- Library function declarations ---*/
-  /*--- Threads initialization code ---*/
-  #if defined(__PYX_FORCE_INIT_THREADS) && __PYX_FORCE_INIT_THREADS
-  #ifdef WITH_THREAD /* Python build with threading support? */
-  PyEval_InitThreads();
-  #endif
-  #endif
-  /*--- Module creation code ---*/
-  #if PY_MAJOR_VERSION < 3
-  __pyx_m = Py_InitModule4(__Pyx_NAMESTR("cbitmap"), __pyx_methods, 0, 0, PYTHON_API_VERSION);
-  #else
-  __pyx_m = PyModule_Create(&__pyx_moduledef);
-  #endif
-  if (!__pyx_m) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 1; __pyx_clineno = __LINE__; goto __pyx_L1_error;};
-  #if PY_MAJOR_VERSION < 3
-  Py_INCREF(__pyx_m);
-  #endif
-  __pyx_b = PyImport_AddModule(__Pyx_NAMESTR(__Pyx_BUILTIN_MODULE_NAME));
-  if (!__pyx_b) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 1; __pyx_clineno = __LINE__; goto __pyx_L1_error;};
-  if (__Pyx_SetAttrString(__pyx_m, "__builtins__", __pyx_b) < 0) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 1; __pyx_clineno = __LINE__; goto __pyx_L1_error;};
-  /*--- Initialize various global constants etc. ---*/
-  if (unlikely(__Pyx_InitGlobals() < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 1; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  if (__pyx_module_is_main_pyblooming__cbitmap) {
-    if (__Pyx_SetAttrString(__pyx_m, "__name__", __pyx_n_s____main__) < 0) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 1; __pyx_clineno = __LINE__; goto __pyx_L1_error;};
-  }
-  /*--- Builtin init code ---*/
-  if (unlikely(__Pyx_InitCachedBuiltins() < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 1; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  /*--- Constants init code ---*/
-  if (unlikely(__Pyx_InitCachedConstants() < 0)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 1; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  /*--- Global init code ---*/
-  /*--- Variable export code ---*/
-  /*--- Function export code ---*/
-  /*--- Type init code ---*/
-  if (PyType_Ready(&__pyx_type_10pyblooming_7cbitmap_Bitmap) < 0) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 10; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  {
-    PyObject *wrapper = __Pyx_GetAttrString((PyObject *)&__pyx_type_10pyblooming_7cbitmap_Bitmap, "__len__"); if (unlikely(!wrapper)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 10; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    if (Py_TYPE(wrapper) == &PyWrapperDescr_Type) {
-      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_1__len__ = *((PyWrapperDescrObject *)wrapper)->d_base;
-      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_1__len__.doc = __pyx_doc_10pyblooming_7cbitmap_6Bitmap_1__len__;
-      ((PyWrapperDescrObject *)wrapper)->d_base = &__pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_1__len__;
-    }
-  }
-  {
-    PyObject *wrapper = __Pyx_GetAttrString((PyObject *)&__pyx_type_10pyblooming_7cbitmap_Bitmap, "__getitem__"); if (unlikely(!wrapper)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 10; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    if (Py_TYPE(wrapper) == &PyWrapperDescr_Type) {
-      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_2__getitem__ = *((PyWrapperDescrObject *)wrapper)->d_base;
-      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_2__getitem__.doc = __pyx_doc_10pyblooming_7cbitmap_6Bitmap_2__getitem__;
-      ((PyWrapperDescrObject *)wrapper)->d_base = &__pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_2__getitem__;
-    }
-  }
-  {
-    PyObject *wrapper = __Pyx_GetAttrString((PyObject *)&__pyx_type_10pyblooming_7cbitmap_Bitmap, "__setitem__"); if (unlikely(!wrapper)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 10; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    if (Py_TYPE(wrapper) == &PyWrapperDescr_Type) {
-      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_3__setitem__ = *((PyWrapperDescrObject *)wrapper)->d_base;
-      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_3__setitem__.doc = __pyx_doc_10pyblooming_7cbitmap_6Bitmap_3__setitem__;
-      ((PyWrapperDescrObject *)wrapper)->d_base = &__pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_3__setitem__;
+    PyObject *result;
+#if !CYTHON_AVOID_BORROWED_REFS
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX >= 0x030500A1
+    result = _PyDict_GetItem_KnownHash(__pyx_d, name, ((PyASCIIObject *) name)->hash);
+    __PYX_UPDATE_DICT_CACHE(__pyx_d, result, *dict_cached_value, *dict_version)
+    if (likely(result)) {
+        return __Pyx_NewRef(result);
+    } else if (unlikely(PyErr_Occurred())) {
+        return NULL;
     }
-  }
-  {
-    PyObject *wrapper = __Pyx_GetAttrString((PyObject *)&__pyx_type_10pyblooming_7cbitmap_Bitmap, "__getslice__"); if (unlikely(!wrapper)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 10; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    if (Py_TYPE(wrapper) == &PyWrapperDescr_Type) {
-      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_6__getslice__ = *((PyWrapperDescrObject *)wrapper)->d_base;
-      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_6__getslice__.doc = __pyx_doc_10pyblooming_7cbitmap_6Bitmap_6__getslice__;
-      ((PyWrapperDescrObject *)wrapper)->d_base = &__pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_6__getslice__;
+#else
+    result = PyDict_GetItem(__pyx_d, name);
+    __PYX_UPDATE_DICT_CACHE(__pyx_d, result, *dict_cached_value, *dict_version)
+    if (likely(result)) {
+        return __Pyx_NewRef(result);
     }
-  }
-  {
-    PyObject *wrapper = __Pyx_GetAttrString((PyObject *)&__pyx_type_10pyblooming_7cbitmap_Bitmap, "__setslice__"); if (unlikely(!wrapper)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 10; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-    if (Py_TYPE(wrapper) == &PyWrapperDescr_Type) {
-      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_7__setslice__ = *((PyWrapperDescrObject *)wrapper)->d_base;
-      __pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_7__setslice__.doc = __pyx_doc_10pyblooming_7cbitmap_6Bitmap_7__setslice__;
-      ((PyWrapperDescrObject *)wrapper)->d_base = &__pyx_wrapperbase_10pyblooming_7cbitmap_6Bitmap_7__setslice__;
+#endif
+#else
+    result = PyObject_GetItem(__pyx_d, name);
+    __PYX_UPDATE_DICT_CACHE(__pyx_d, result, *dict_cached_value, *dict_version)
+    if (likely(result)) {
+        return __Pyx_NewRef(result);
     }
-  }
-  if (__Pyx_SetAttrString(__pyx_m, "Bitmap", (PyObject *)&__pyx_type_10pyblooming_7cbitmap_Bitmap) < 0) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 10; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __pyx_ptype_10pyblooming_7cbitmap_Bitmap = &__pyx_type_10pyblooming_7cbitmap_Bitmap;
-  /*--- Type import code ---*/
-  /*--- Variable import code ---*/
-  /*--- Function import code ---*/
-  /*--- Execution code ---*/
-
-  /* "pyblooming/cbitmap.pyx":3
- * from libc cimport stdlib
- * cimport cython
- * import os.path             # <<<<<<<<<<<<<<
- * 
- * cdef extern from "cbitmaputil.h" nogil:
- */
-  __pyx_t_1 = __Pyx_Import(((PyObject *)__pyx_n_s_10), 0, -1); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 3; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __Pyx_GOTREF(__pyx_t_1);
-  if (PyObject_SetAttr(__pyx_m, __pyx_n_s__os, __pyx_t_1) < 0) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 3; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __Pyx_DECREF(__pyx_t_1); __pyx_t_1 = 0;
-
-  /* "pyblooming/cbitmap.pyx":16
- *     cdef unsigned char* mmap
- * 
- *     def __cinit__(self, length, filename=None, private=False):             # <<<<<<<<<<<<<<
- *         """
- *         Creates a new Bitmap object. Bitmap wraps a memory mapped
- */
-  __pyx_t_1 = __Pyx_PyBool_FromLong(0); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 16; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __Pyx_GOTREF(__pyx_t_1);
-  __pyx_k_1 = __pyx_t_1;
-  __Pyx_GIVEREF(__pyx_t_1);
-  __pyx_t_1 = 0;
-
-  /* "pyblooming/cbitmap.pyx":93
- *             self.fileobj.flush()
- * 
- *     def close(self, flush=True):             # <<<<<<<<<<<<<<
- *         "Closes the Bitmap, flushing the data if requried."
- *         # Safety first!
- */
-  __pyx_t_1 = __Pyx_PyBool_FromLong(1); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 93; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __Pyx_GOTREF(__pyx_t_1);
-  __pyx_k_8 = __pyx_t_1;
-  __Pyx_GIVEREF(__pyx_t_1);
-  __pyx_t_1 = 0;
-
-  /* "pyblooming/cbitmap.pyx":1
- * from libc cimport stdlib             # <<<<<<<<<<<<<<
- * cimport cython
- * import os.path
- */
-  __pyx_t_1 = PyDict_New(); if (unlikely(!__pyx_t_1)) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 1; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __Pyx_GOTREF(((PyObject *)__pyx_t_1));
-  if (PyObject_SetAttr(__pyx_m, __pyx_n_s____test__, ((PyObject *)__pyx_t_1)) < 0) {__pyx_filename = __pyx_f[0]; __pyx_lineno = 1; __pyx_clineno = __LINE__; goto __pyx_L1_error;}
-  __Pyx_DECREF(((PyObject *)__pyx_t_1)); __pyx_t_1 = 0;
-  goto __pyx_L0;
-  __pyx_L1_error:;
-  __Pyx_XDECREF(__pyx_t_1);
-  if (__pyx_m) {
-    __Pyx_AddTraceback("init pyblooming.cbitmap", __pyx_clineno, __pyx_lineno, __pyx_filename);
-    Py_DECREF(__pyx_m); __pyx_m = 0;
-  } else if (!PyErr_Occurred()) {
-    PyErr_SetString(PyExc_ImportError, "init pyblooming.cbitmap");
-  }
-  __pyx_L0:;
-  __Pyx_RefNannyFinishContext();
-  #if PY_MAJOR_VERSION < 3
-  return;
-  #else
-  return __pyx_m;
-  #endif
+    PyErr_Clear();
+#endif
+    return __Pyx_GetBuiltinName(name);
 }
 
-/* Runtime support code */
-
-#if CYTHON_REFNANNY
-static __Pyx_RefNannyAPIStruct *__Pyx_RefNannyImportAPI(const char *modname) {
-    PyObject *m = NULL, *p = NULL;
-    void *r = NULL;
-    m = PyImport_ImportModule((char *)modname);
-    if (!m) goto end;
-    p = PyObject_GetAttrString(m, (char *)"RefNannyAPI");
-    if (!p) goto end;
-    r = PyLong_AsVoidPtr(p);
-end:
-    Py_XDECREF(p);
-    Py_XDECREF(m);
-    return (__Pyx_RefNannyAPIStruct *)r;
+/* PyObjectCall */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_Call(PyObject *func, PyObject *arg, PyObject *kw) {
+    PyObject *result;
+    ternaryfunc call = Py_TYPE(func)->tp_call;
+    if (unlikely(!call))
+        return PyObject_Call(func, arg, kw);
+    if (unlikely(Py_EnterRecursiveCall((char*)" while calling a Python object")))
+        return NULL;
+    result = (*call)(func, arg, kw);
+    Py_LeaveRecursiveCall();
+    if (unlikely(!result) && unlikely(!PyErr_Occurred())) {
+        PyErr_SetString(
+            PyExc_SystemError,
+            "NULL result without error in PyObject_Call");
+    }
+    return result;
 }
-#endif /* CYTHON_REFNANNY */
+#endif
 
-static PyObject *__Pyx_GetName(PyObject *dict, PyObject *name) {
+/* PyFunctionFastCall */
+#if CYTHON_FAST_PYCALL
+static PyObject* __Pyx_PyFunction_FastCallNoKw(PyCodeObject *co, PyObject **args, Py_ssize_t na,
+                                               PyObject *globals) {
+    PyFrameObject *f;
+    PyThreadState *tstate = __Pyx_PyThreadState_Current;
+    PyObject **fastlocals;
+    Py_ssize_t i;
+    PyObject *result;
+    assert(globals != NULL);
+    /* XXX Perhaps we should create a specialized
+       PyFrame_New() that doesn't take locals, but does
+       take builtins without sanity checking them.
+       */
+    assert(tstate != NULL);
+    f = PyFrame_New(tstate, co, globals, NULL);
+    if (f == NULL) {
+        return NULL;
+    }
+    fastlocals = __Pyx_PyFrame_GetLocalsplus(f);
+    for (i = 0; i < na; i++) {
+        Py_INCREF(*args);
+        fastlocals[i] = *args++;
+    }
+    result = PyEval_EvalFrameEx(f,0);
+    ++tstate->recursion_depth;
+    Py_DECREF(f);
+    --tstate->recursion_depth;
+    return result;
+}
+#if 1 || PY_VERSION_HEX < 0x030600B1
+static PyObject *__Pyx_PyFunction_FastCallDict(PyObject *func, PyObject **args, Py_ssize_t nargs, PyObject *kwargs) {
+    PyCodeObject *co = (PyCodeObject *)PyFunction_GET_CODE(func);
+    PyObject *globals = PyFunction_GET_GLOBALS(func);
+    PyObject *argdefs = PyFunction_GET_DEFAULTS(func);
+    PyObject *closure;
+#if PY_MAJOR_VERSION >= 3
+    PyObject *kwdefs;
+#endif
+    PyObject *kwtuple, **k;
+    PyObject **d;
+    Py_ssize_t nd;
+    Py_ssize_t nk;
     PyObject *result;
-    result = PyObject_GetAttr(dict, name);
-    if (!result) {
-        if (dict != __pyx_b) {
-            PyErr_Clear();
-            result = PyObject_GetAttr(__pyx_b, name);
+    assert(kwargs == NULL || PyDict_Check(kwargs));
+    nk = kwargs ? PyDict_Size(kwargs) : 0;
+    if (Py_EnterRecursiveCall((char*)" while calling a Python object")) {
+        return NULL;
+    }
+    if (
+#if PY_MAJOR_VERSION >= 3
+            co->co_kwonlyargcount == 0 &&
+#endif
+            likely(kwargs == NULL || nk == 0) &&
+            co->co_flags == (CO_OPTIMIZED | CO_NEWLOCALS | CO_NOFREE)) {
+        if (argdefs == NULL && co->co_argcount == nargs) {
+            result = __Pyx_PyFunction_FastCallNoKw(co, args, nargs, globals);
+            goto done;
+        }
+        else if (nargs == 0 && argdefs != NULL
+                 && co->co_argcount == Py_SIZE(argdefs)) {
+            /* function called with no arguments, but all parameters have
+               a default value: use default values as arguments .*/
+            args = &PyTuple_GET_ITEM(argdefs, 0);
+            result =__Pyx_PyFunction_FastCallNoKw(co, args, Py_SIZE(argdefs), globals);
+            goto done;
         }
-        if (!result) {
-            PyErr_SetObject(PyExc_NameError, name);
+    }
+    if (kwargs != NULL) {
+        Py_ssize_t pos, i;
+        kwtuple = PyTuple_New(2 * nk);
+        if (kwtuple == NULL) {
+            result = NULL;
+            goto done;
+        }
+        k = &PyTuple_GET_ITEM(kwtuple, 0);
+        pos = i = 0;
+        while (PyDict_Next(kwargs, &pos, &k[i], &k[i+1])) {
+            Py_INCREF(k[i]);
+            Py_INCREF(k[i+1]);
+            i += 2;
         }
+        nk = i / 2;
+    }
+    else {
+        kwtuple = NULL;
+        k = NULL;
     }
+    closure = PyFunction_GET_CLOSURE(func);
+#if PY_MAJOR_VERSION >= 3
+    kwdefs = PyFunction_GET_KW_DEFAULTS(func);
+#endif
+    if (argdefs != NULL) {
+        d = &PyTuple_GET_ITEM(argdefs, 0);
+        nd = Py_SIZE(argdefs);
+    }
+    else {
+        d = NULL;
+        nd = 0;
+    }
+#if PY_MAJOR_VERSION >= 3
+    result = PyEval_EvalCodeEx((PyObject*)co, globals, (PyObject *)NULL,
+                               args, (int)nargs,
+                               k, (int)nk,
+                               d, (int)nd, kwdefs, closure);
+#else
+    result = PyEval_EvalCodeEx(co, globals, (PyObject *)NULL,
+                               args, (int)nargs,
+                               k, (int)nk,
+                               d, (int)nd, closure);
+#endif
+    Py_XDECREF(kwtuple);
+done:
+    Py_LeaveRecursiveCall();
     return result;
 }
+#endif
+#endif
 
-static void __Pyx_RaiseDoubleKeywordsError(
-    const char* func_name,
-    PyObject* kw_name)
-{
-    PyErr_Format(PyExc_TypeError,
-        #if PY_MAJOR_VERSION >= 3
-        "%s() got multiple values for keyword argument '%U'", func_name, kw_name);
-        #else
-        "%s() got multiple values for keyword argument '%s'", func_name,
-        PyString_AS_STRING(kw_name));
-        #endif
+/* PyObjectCallMethO */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallMethO(PyObject *func, PyObject *arg) {
+    PyObject *self, *result;
+    PyCFunction cfunc;
+    cfunc = PyCFunction_GET_FUNCTION(func);
+    self = PyCFunction_GET_SELF(func);
+    if (unlikely(Py_EnterRecursiveCall((char*)" while calling a Python object")))
+        return NULL;
+    result = cfunc(self, arg);
+    Py_LeaveRecursiveCall();
+    if (unlikely(!result) && unlikely(!PyErr_Occurred())) {
+        PyErr_SetString(
+            PyExc_SystemError,
+            "NULL result without error in PyObject_Call");
+    }
+    return result;
 }
+#endif
 
-static int __Pyx_ParseOptionalKeywords(
-    PyObject *kwds,
-    PyObject **argnames[],
-    PyObject *kwds2,
-    PyObject *values[],
-    Py_ssize_t num_pos_args,
-    const char* function_name)
-{
-    PyObject *key = 0, *value = 0;
-    Py_ssize_t pos = 0;
-    PyObject*** name;
-    PyObject*** first_kw_arg = argnames + num_pos_args;
+/* PyObjectCallNoArg */
+#if CYTHON_COMPILING_IN_CPYTHON
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallNoArg(PyObject *func) {
+#if CYTHON_FAST_PYCALL
+    if (PyFunction_Check(func)) {
+        return __Pyx_PyFunction_FastCall(func, NULL, 0);
+    }
+#endif
+#if defined(__Pyx_CyFunction_USED) && defined(NDEBUG)
+    if (likely(PyCFunction_Check(func) || __Pyx_CyFunction_Check(func)))
+#else
+    if (likely(PyCFunction_Check(func)))
+#endif
+    {
+        if (likely(PyCFunction_GET_FLAGS(func) & METH_NOARGS)) {
+            return __Pyx_PyObject_CallMethO(func, NULL);
+        }
+    }
+    return __Pyx_PyObject_Call(func, __pyx_empty_tuple, NULL);
+}
+#endif
 
-    while (PyDict_Next(kwds, &pos, &key, &value)) {
-        name = first_kw_arg;
-        while (*name && (**name != key)) name++;
-        if (*name) {
-            values[name-argnames] = value;
-        } else {
-            #if PY_MAJOR_VERSION < 3
-            if (unlikely(!PyString_CheckExact(key)) && unlikely(!PyString_Check(key))) {
-            #else
-            if (unlikely(!PyUnicode_CheckExact(key)) && unlikely(!PyUnicode_Check(key))) {
-            #endif
-                goto invalid_keyword_type;
-            } else {
-                for (name = first_kw_arg; *name; name++) {
-                    #if PY_MAJOR_VERSION >= 3
-                    if (PyUnicode_GET_SIZE(**name) == PyUnicode_GET_SIZE(key) &&
-                        PyUnicode_Compare(**name, key) == 0) break;
-                    #else
-                    if (PyString_GET_SIZE(**name) == PyString_GET_SIZE(key) &&
-                        _PyString_Eq(**name, key)) break;
-                    #endif
-                }
-                if (*name) {
-                    values[name-argnames] = value;
-                } else {
-                    /* unexpected keyword found */
-                    for (name=argnames; name != first_kw_arg; name++) {
-                        if (**name == key) goto arg_passed_twice;
-                        #if PY_MAJOR_VERSION >= 3
-                        if (PyUnicode_GET_SIZE(**name) == PyUnicode_GET_SIZE(key) &&
-                            PyUnicode_Compare(**name, key) == 0) goto arg_passed_twice;
-                        #else
-                        if (PyString_GET_SIZE(**name) == PyString_GET_SIZE(key) &&
-                            _PyString_Eq(**name, key)) goto arg_passed_twice;
-                        #endif
-                    }
-                    if (kwds2) {
-                        if (unlikely(PyDict_SetItem(kwds2, key, value))) goto bad;
-                    } else {
-                        goto invalid_keyword;
-                    }
-                }
-            }
+/* PyCFunctionFastCall */
+#if CYTHON_FAST_PYCCALL
+static CYTHON_INLINE PyObject * __Pyx_PyCFunction_FastCall(PyObject *func_obj, PyObject **args, Py_ssize_t nargs) {
+    PyCFunctionObject *func = (PyCFunctionObject*)func_obj;
+    PyCFunction meth = PyCFunction_GET_FUNCTION(func);
+    PyObject *self = PyCFunction_GET_SELF(func);
+    int flags = PyCFunction_GET_FLAGS(func);
+    assert(PyCFunction_Check(func));
+    assert(METH_FASTCALL == (flags & ~(METH_CLASS | METH_STATIC | METH_COEXIST | METH_KEYWORDS | METH_STACKLESS)));
+    assert(nargs >= 0);
+    assert(nargs == 0 || args != NULL);
+    /* _PyCFunction_FastCallDict() must not be called with an exception set,
+       because it may clear it (directly or indirectly) and so the
+       caller loses its exception */
+    assert(!PyErr_Occurred());
+    if ((PY_VERSION_HEX < 0x030700A0) || unlikely(flags & METH_KEYWORDS)) {
+        return (*((__Pyx_PyCFunctionFastWithKeywords)(void*)meth)) (self, args, nargs, NULL);
+    } else {
+        return (*((__Pyx_PyCFunctionFast)(void*)meth)) (self, args, nargs);
+    }
+}
+#endif
+
+/* PyObjectCallOneArg */
+#if CYTHON_COMPILING_IN_CPYTHON
+static PyObject* __Pyx__PyObject_CallOneArg(PyObject *func, PyObject *arg) {
+    PyObject *result;
+    PyObject *args = PyTuple_New(1);
+    if (unlikely(!args)) return NULL;
+    Py_INCREF(arg);
+    PyTuple_SET_ITEM(args, 0, arg);
+    result = __Pyx_PyObject_Call(func, args, NULL);
+    Py_DECREF(args);
+    return result;
+}
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObject *arg) {
+#if CYTHON_FAST_PYCALL
+    if (PyFunction_Check(func)) {
+        return __Pyx_PyFunction_FastCall(func, &arg, 1);
+    }
+#endif
+    if (likely(PyCFunction_Check(func))) {
+        if (likely(PyCFunction_GET_FLAGS(func) & METH_O)) {
+            return __Pyx_PyObject_CallMethO(func, arg);
+#if CYTHON_FAST_PYCCALL
+        } else if (__Pyx_PyFastCFunction_Check(func)) {
+            return __Pyx_PyCFunction_FastCall(func, &arg, 1);
+#endif
         }
     }
-    return 0;
-arg_passed_twice:
-    __Pyx_RaiseDoubleKeywordsError(function_name, **name);
-    goto bad;
-invalid_keyword_type:
-    PyErr_Format(PyExc_TypeError,
-        "%s() keywords must be strings", function_name);
-    goto bad;
-invalid_keyword:
-    PyErr_Format(PyExc_TypeError,
-    #if PY_MAJOR_VERSION < 3
-        "%s() got an unexpected keyword argument '%s'",
-        function_name, PyString_AsString(key));
-    #else
-        "%s() got an unexpected keyword argument '%U'",
-        function_name, key);
+    return __Pyx__PyObject_CallOneArg(func, arg);
+}
+#else
+static CYTHON_INLINE PyObject* __Pyx_PyObject_CallOneArg(PyObject *func, PyObject *arg) {
+    PyObject *result;
+    PyObject *args = PyTuple_Pack(1, arg);
+    if (unlikely(!args)) return NULL;
+    result = __Pyx_PyObject_Call(func, args, NULL);
+    Py_DECREF(args);
+    return result;
+}
+#endif
+
+/* PyObjectCall2Args */
+static CYTHON_UNUSED PyObject* __Pyx_PyObject_Call2Args(PyObject* function, PyObject* arg1, PyObject* arg2) {
+    PyObject *args, *result = NULL;
+    #if CYTHON_FAST_PYCALL
+    if (PyFunction_Check(function)) {
+        PyObject *args[2] = {arg1, arg2};
+        return __Pyx_PyFunction_FastCall(function, args, 2);
+    }
     #endif
-bad:
-    return -1;
+    #if CYTHON_FAST_PYCCALL
+    if (__Pyx_PyFastCFunction_Check(function)) {
+        PyObject *args[2] = {arg1, arg2};
+        return __Pyx_PyCFunction_FastCall(function, args, 2);
+    }
+    #endif
+    args = PyTuple_New(2);
+    if (unlikely(!args)) goto done;
+    Py_INCREF(arg1);
+    PyTuple_SET_ITEM(args, 0, arg1);
+    Py_INCREF(arg2);
+    PyTuple_SET_ITEM(args, 1, arg2);
+    Py_INCREF(function);
+    result = __Pyx_PyObject_Call(function, args, NULL);
+    Py_DECREF(args);
+    Py_DECREF(function);
+done:
+    return result;
 }
 
-static void __Pyx_RaiseArgtupleInvalid(
-    const char* func_name,
-    int exact,
-    Py_ssize_t num_min,
-    Py_ssize_t num_max,
-    Py_ssize_t num_found)
+/* GetTopmostException */
+#if CYTHON_USE_EXC_INFO_STACK
+static _PyErr_StackItem *
+__Pyx_PyErr_GetTopmostException(PyThreadState *tstate)
 {
-    Py_ssize_t num_expected;
-    const char *more_or_less;
-
-    if (num_found < num_min) {
-        num_expected = num_min;
-        more_or_less = "at least";
-    } else {
-        num_expected = num_max;
-        more_or_less = "at most";
-    }
-    if (exact) {
-        more_or_less = "exactly";
+    _PyErr_StackItem *exc_info = tstate->exc_info;
+    while ((exc_info->exc_type == NULL || exc_info->exc_type == Py_None) &&
+           exc_info->previous_item != NULL)
+    {
+        exc_info = exc_info->previous_item;
     }
-    PyErr_Format(PyExc_TypeError,
-                 "%s() takes %s %"PY_FORMAT_SIZE_T"d positional argument%s (%"PY_FORMAT_SIZE_T"d given)",
-                 func_name, more_or_less, num_expected,
-                 (num_expected == 1) ? "" : "s", num_found);
+    return exc_info;
 }
+#endif
 
-static CYTHON_INLINE void __Pyx_ErrRestore(PyObject *type, PyObject *value, PyObject *tb) {
+/* SaveResetException */
+#if CYTHON_FAST_THREAD_STATE
+static CYTHON_INLINE void __Pyx__ExceptionSave(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb) {
+    #if CYTHON_USE_EXC_INFO_STACK
+    _PyErr_StackItem *exc_info = __Pyx_PyErr_GetTopmostException(tstate);
+    *type = exc_info->exc_type;
+    *value = exc_info->exc_value;
+    *tb = exc_info->exc_traceback;
+    #else
+    *type = tstate->exc_type;
+    *value = tstate->exc_value;
+    *tb = tstate->exc_traceback;
+    #endif
+    Py_XINCREF(*type);
+    Py_XINCREF(*value);
+    Py_XINCREF(*tb);
+}
+static CYTHON_INLINE void __Pyx__ExceptionReset(PyThreadState *tstate, PyObject *type, PyObject *value, PyObject *tb) {
     PyObject *tmp_type, *tmp_value, *tmp_tb;
-    PyThreadState *tstate = PyThreadState_GET();
-
-    tmp_type = tstate->curexc_type;
-    tmp_value = tstate->curexc_value;
-    tmp_tb = tstate->curexc_traceback;
-    tstate->curexc_type = type;
-    tstate->curexc_value = value;
-    tstate->curexc_traceback = tb;
+    #if CYTHON_USE_EXC_INFO_STACK
+    _PyErr_StackItem *exc_info = tstate->exc_info;
+    tmp_type = exc_info->exc_type;
+    tmp_value = exc_info->exc_value;
+    tmp_tb = exc_info->exc_traceback;
+    exc_info->exc_type = type;
+    exc_info->exc_value = value;
+    exc_info->exc_traceback = tb;
+    #else
+    tmp_type = tstate->exc_type;
+    tmp_value = tstate->exc_value;
+    tmp_tb = tstate->exc_traceback;
+    tstate->exc_type = type;
+    tstate->exc_value = value;
+    tstate->exc_traceback = tb;
+    #endif
     Py_XDECREF(tmp_type);
     Py_XDECREF(tmp_value);
     Py_XDECREF(tmp_tb);
 }
+#endif
 
-static CYTHON_INLINE void __Pyx_ErrFetch(PyObject **type, PyObject **value, PyObject **tb) {
-    PyThreadState *tstate = PyThreadState_GET();
-    *type = tstate->curexc_type;
-    *value = tstate->curexc_value;
-    *tb = tstate->curexc_traceback;
-
+/* GetException */
+#if CYTHON_FAST_THREAD_STATE
+static int __Pyx__GetException(PyThreadState *tstate, PyObject **type, PyObject **value, PyObject **tb)
+#else
+static int __Pyx_GetException(PyObject **type, PyObject **value, PyObject **tb)
+#endif
+{
+    PyObject *local_type, *local_value, *local_tb;
+#if CYTHON_FAST_THREAD_STATE
+    PyObject *tmp_type, *tmp_value, *tmp_tb;
+    local_type = tstate->curexc_type;
+    local_value = tstate->curexc_value;
+    local_tb = tstate->curexc_traceback;
     tstate->curexc_type = 0;
     tstate->curexc_value = 0;
     tstate->curexc_traceback = 0;
+#else
+    PyErr_Fetch(&local_type, &local_value, &local_tb);
+#endif
+    PyErr_NormalizeException(&local_type, &local_value, &local_tb);
+#if CYTHON_FAST_THREAD_STATE
+    if (unlikely(tstate->curexc_type))
+#else
+    if (unlikely(PyErr_Occurred()))
+#endif
+        goto bad;
+    #if PY_MAJOR_VERSION >= 3
+    if (local_tb) {
+        if (unlikely(PyException_SetTraceback(local_value, local_tb) < 0))
+            goto bad;
+    }
+    #endif
+    Py_XINCREF(local_tb);
+    Py_XINCREF(local_type);
+    Py_XINCREF(local_value);
+    *type = local_type;
+    *value = local_value;
+    *tb = local_tb;
+#if CYTHON_FAST_THREAD_STATE
+    #if CYTHON_USE_EXC_INFO_STACK
+    {
+        _PyErr_StackItem *exc_info = tstate->exc_info;
+        tmp_type = exc_info->exc_type;
+        tmp_value = exc_info->exc_value;
+        tmp_tb = exc_info->exc_traceback;
+        exc_info->exc_type = local_type;
+        exc_info->exc_value = local_value;
+        exc_info->exc_traceback = local_tb;
+    }
+    #else
+    tmp_type = tstate->exc_type;
+    tmp_value = tstate->exc_value;
+    tmp_tb = tstate->exc_traceback;
+    tstate->exc_type = local_type;
+    tstate->exc_value = local_value;
+    tstate->exc_traceback = local_tb;
+    #endif
+    Py_XDECREF(tmp_type);
+    Py_XDECREF(tmp_value);
+    Py_XDECREF(tmp_tb);
+#else
+    PyErr_SetExcInfo(local_type, local_value, local_tb);
+#endif
+    return 0;
+bad:
+    *type = 0;
+    *value = 0;
+    *tb = 0;
+    Py_XDECREF(local_type);
+    Py_XDECREF(local_value);
+    Py_XDECREF(local_tb);
+    return -1;
 }
 
+/* GetItemInt */
+static PyObject *__Pyx_GetItemInt_Generic(PyObject *o, PyObject* j) {
+    PyObject *r;
+    if (!j) return NULL;
+    r = PyObject_GetItem(o, j);
+    Py_DECREF(j);
+    return r;
+}
+static CYTHON_INLINE PyObject *__Pyx_GetItemInt_List_Fast(PyObject *o, Py_ssize_t i,
+                                                              CYTHON_NCP_UNUSED int wraparound,
+                                                              CYTHON_NCP_UNUSED int boundscheck) {
+#if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+    Py_ssize_t wrapped_i = i;
+    if (wraparound & unlikely(i < 0)) {
+        wrapped_i += PyList_GET_SIZE(o);
+    }
+    if ((!boundscheck) || likely(__Pyx_is_valid_index(wrapped_i, PyList_GET_SIZE(o)))) {
+        PyObject *r = PyList_GET_ITEM(o, wrapped_i);
+        Py_INCREF(r);
+        return r;
+    }
+    return __Pyx_GetItemInt_Generic(o, PyInt_FromSsize_t(i));
+#else
+    return PySequence_GetItem(o, i);
+#endif
+}
+static CYTHON_INLINE PyObject *__Pyx_GetItemInt_Tuple_Fast(PyObject *o, Py_ssize_t i,
+                                                              CYTHON_NCP_UNUSED int wraparound,
+                                                              CYTHON_NCP_UNUSED int boundscheck) {
+#if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS
+    Py_ssize_t wrapped_i = i;
+    if (wraparound & unlikely(i < 0)) {
+        wrapped_i += PyTuple_GET_SIZE(o);
+    }
+    if ((!boundscheck) || likely(__Pyx_is_valid_index(wrapped_i, PyTuple_GET_SIZE(o)))) {
+        PyObject *r = PyTuple_GET_ITEM(o, wrapped_i);
+        Py_INCREF(r);
+        return r;
+    }
+    return __Pyx_GetItemInt_Generic(o, PyInt_FromSsize_t(i));
+#else
+    return PySequence_GetItem(o, i);
+#endif
+}
+static CYTHON_INLINE PyObject *__Pyx_GetItemInt_Fast(PyObject *o, Py_ssize_t i, int is_list,
+                                                     CYTHON_NCP_UNUSED int wraparound,
+                                                     CYTHON_NCP_UNUSED int boundscheck) {
+#if CYTHON_ASSUME_SAFE_MACROS && !CYTHON_AVOID_BORROWED_REFS && CYTHON_USE_TYPE_SLOTS
+    if (is_list || PyList_CheckExact(o)) {
+        Py_ssize_t n = ((!wraparound) | likely(i >= 0)) ? i : i + PyList_GET_SIZE(o);
+        if ((!boundscheck) || (likely(__Pyx_is_valid_index(n, PyList_GET_SIZE(o))))) {
+            PyObject *r = PyList_GET_ITEM(o, n);
+            Py_INCREF(r);
+            return r;
+        }
+    }
+    else if (PyTuple_CheckExact(o)) {
+        Py_ssize_t n = ((!wraparound) | likely(i >= 0)) ? i : i + PyTuple_GET_SIZE(o);
+        if ((!boundscheck) || likely(__Pyx_is_valid_index(n, PyTuple_GET_SIZE(o)))) {
+            PyObject *r = PyTuple_GET_ITEM(o, n);
+            Py_INCREF(r);
+            return r;
+        }
+    } else {
+        PySequenceMethods *m = Py_TYPE(o)->tp_as_sequence;
+        if (likely(m && m->sq_item)) {
+            if (wraparound && unlikely(i < 0) && likely(m->sq_length)) {
+                Py_ssize_t l = m->sq_length(o);
+                if (likely(l >= 0)) {
+                    i += l;
+                } else {
+                    if (!PyErr_ExceptionMatches(PyExc_OverflowError))
+                        return NULL;
+                    PyErr_Clear();
+                }
+            }
+            return m->sq_item(o, i);
+        }
+    }
+#else
+    if (is_list || PySequence_Check(o)) {
+        return PySequence_GetItem(o, i);
+    }
+#endif
+    return __Pyx_GetItemInt_Generic(o, PyInt_FromSsize_t(i));
+}
 
-#if PY_MAJOR_VERSION < 3
-static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause) {
-    /* cause is unused */
-    Py_XINCREF(type);
-    Py_XINCREF(value);
-    Py_XINCREF(tb);
-    /* First, check the traceback argument, replacing None with NULL. */
-    if (tb == Py_None) {
-        Py_DECREF(tb);
-        tb = 0;
+/* ObjectGetItem */
+#if CYTHON_USE_TYPE_SLOTS
+static PyObject *__Pyx_PyObject_GetIndex(PyObject *obj, PyObject* index) {
+    PyObject *runerr = NULL;
+    Py_ssize_t key_value;
+    PySequenceMethods *m = Py_TYPE(obj)->tp_as_sequence;
+    if (unlikely(!(m && m->sq_item))) {
+        PyErr_Format(PyExc_TypeError, "'%.200s' object is not subscriptable", Py_TYPE(obj)->tp_name);
+        return NULL;
     }
-    else if (tb != NULL && !PyTraceBack_Check(tb)) {
-        PyErr_SetString(PyExc_TypeError,
-            "raise: arg 3 must be a traceback or None");
-        goto raise_error;
+    key_value = __Pyx_PyIndex_AsSsize_t(index);
+    if (likely(key_value != -1 || !(runerr = PyErr_Occurred()))) {
+        return __Pyx_GetItemInt_Fast(obj, key_value, 0, 1, 1);
     }
-    /* Next, replace a missing value with None */
-    if (value == NULL) {
-        value = Py_None;
-        Py_INCREF(value);
+    if (PyErr_GivenExceptionMatches(runerr, PyExc_OverflowError)) {
+        PyErr_Clear();
+        PyErr_Format(PyExc_IndexError, "cannot fit '%.200s' into an index-sized integer", Py_TYPE(index)->tp_name);
     }
-    #if PY_VERSION_HEX < 0x02050000
-    if (!PyClass_Check(type))
-    #else
-    if (!PyType_Check(type))
-    #endif
-    {
-        /* Raising an instance.  The value should be a dummy. */
-        if (value != Py_None) {
-            PyErr_SetString(PyExc_TypeError,
-                "instance exception may not have a separate value");
-            goto raise_error;
+    return NULL;
+}
+static PyObject *__Pyx_PyObject_GetItem(PyObject *obj, PyObject* key) {
+    PyMappingMethods *m = Py_TYPE(obj)->tp_as_mapping;
+    if (likely(m && m->mp_subscript)) {
+        return m->mp_subscript(obj, key);
+    }
+    return __Pyx_PyObject_GetIndex(obj, key);
+}
+#endif
+
+/* DivInt[Py_ssize_t] */
+static CYTHON_INLINE Py_ssize_t __Pyx_div_Py_ssize_t(Py_ssize_t a, Py_ssize_t b) {
+    Py_ssize_t q = a / b;
+    Py_ssize_t r = a - q*b;
+    q -= ((r != 0) & ((r ^ b) < 0));
+    return q;
+}
+
+/* SliceObject */
+static CYTHON_INLINE PyObject* __Pyx_PyObject_GetSlice(PyObject* obj,
+        Py_ssize_t cstart, Py_ssize_t cstop,
+        PyObject** _py_start, PyObject** _py_stop, PyObject** _py_slice,
+        int has_cstart, int has_cstop, CYTHON_UNUSED int wraparound) {
+#if CYTHON_USE_TYPE_SLOTS
+    PyMappingMethods* mp;
+#if PY_MAJOR_VERSION < 3
+    PySequenceMethods* ms = Py_TYPE(obj)->tp_as_sequence;
+    if (likely(ms && ms->sq_slice)) {
+        if (!has_cstart) {
+            if (_py_start && (*_py_start != Py_None)) {
+                cstart = __Pyx_PyIndex_AsSsize_t(*_py_start);
+                if ((cstart == (Py_ssize_t)-1) && PyErr_Occurred()) goto bad;
+            } else
+                cstart = 0;
         }
-        /* Normalize to raise <class>, <instance> */
-        Py_DECREF(value);
-        value = type;
-        #if PY_VERSION_HEX < 0x02050000
-            if (PyInstance_Check(type)) {
-                type = (PyObject*) ((PyInstanceObject*)type)->in_class;
-                Py_INCREF(type);
+        if (!has_cstop) {
+            if (_py_stop && (*_py_stop != Py_None)) {
+                cstop = __Pyx_PyIndex_AsSsize_t(*_py_stop);
+                if ((cstop == (Py_ssize_t)-1) && PyErr_Occurred()) goto bad;
+            } else
+                cstop = PY_SSIZE_T_MAX;
+        }
+        if (wraparound && unlikely((cstart < 0) | (cstop < 0)) && likely(ms->sq_length)) {
+            Py_ssize_t l = ms->sq_length(obj);
+            if (likely(l >= 0)) {
+                if (cstop < 0) {
+                    cstop += l;
+                    if (cstop < 0) cstop = 0;
+                }
+                if (cstart < 0) {
+                    cstart += l;
+                    if (cstart < 0) cstart = 0;
+                }
+            } else {
+                if (!PyErr_ExceptionMatches(PyExc_OverflowError))
+                    goto bad;
+                PyErr_Clear();
             }
-            else {
-                type = 0;
-                PyErr_SetString(PyExc_TypeError,
-                    "raise: exception must be an old-style class or instance");
-                goto raise_error;
+        }
+        return ms->sq_slice(obj, cstart, cstop);
+    }
+#endif
+    mp = Py_TYPE(obj)->tp_as_mapping;
+    if (likely(mp && mp->mp_subscript))
+#endif
+    {
+        PyObject* result;
+        PyObject *py_slice, *py_start, *py_stop;
+        if (_py_slice) {
+            py_slice = *_py_slice;
+        } else {
+            PyObject* owned_start = NULL;
+            PyObject* owned_stop = NULL;
+            if (_py_start) {
+                py_start = *_py_start;
+            } else {
+                if (has_cstart) {
+                    owned_start = py_start = PyInt_FromSsize_t(cstart);
+                    if (unlikely(!py_start)) goto bad;
+                } else
+                    py_start = Py_None;
             }
-        #else
-            type = (PyObject*) Py_TYPE(type);
-            Py_INCREF(type);
-            if (!PyType_IsSubtype((PyTypeObject *)type, (PyTypeObject *)PyExc_BaseException)) {
-                PyErr_SetString(PyExc_TypeError,
-                    "raise: exception class must be a subclass of BaseException");
-                goto raise_error;
+            if (_py_stop) {
+                py_stop = *_py_stop;
+            } else {
+                if (has_cstop) {
+                    owned_stop = py_stop = PyInt_FromSsize_t(cstop);
+                    if (unlikely(!py_stop)) {
+                        Py_XDECREF(owned_start);
+                        goto bad;
+                    }
+                } else
+                    py_stop = Py_None;
             }
-        #endif
+            py_slice = PySlice_New(py_start, py_stop, Py_None);
+            Py_XDECREF(owned_start);
+            Py_XDECREF(owned_stop);
+            if (unlikely(!py_slice)) goto bad;
+        }
+#if CYTHON_USE_TYPE_SLOTS
+        result = mp->mp_subscript(obj, py_slice);
+#else
+        result = PyObject_GetItem(obj, py_slice);
+#endif
+        if (!_py_slice) {
+            Py_DECREF(py_slice);
+        }
+        return result;
     }
+    PyErr_Format(PyExc_TypeError,
+        "'%.200s' object is unsliceable", Py_TYPE(obj)->tp_name);
+bad:
+    return NULL;
+}
 
-    __Pyx_ErrRestore(type, value, tb);
-    return;
-raise_error:
-    Py_XDECREF(value);
-    Py_XDECREF(type);
-    Py_XDECREF(tb);
-    return;
+/* PyObject_GenericGetAttrNoDict */
+#if CYTHON_USE_TYPE_SLOTS && CYTHON_USE_PYTYPE_LOOKUP && PY_VERSION_HEX < 0x03070000
+static PyObject *__Pyx_RaiseGenericGetAttributeError(PyTypeObject *tp, PyObject *attr_name) {
+    PyErr_Format(PyExc_AttributeError,
+#if PY_MAJOR_VERSION >= 3
+                 "'%.50s' object has no attribute '%U'",
+                 tp->tp_name, attr_name);
+#else
+                 "'%.50s' object has no attribute '%.400s'",
+                 tp->tp_name, PyString_AS_STRING(attr_name));
+#endif
+    return NULL;
+}
+static CYTHON_INLINE PyObject* __Pyx_PyObject_GenericGetAttrNoDict(PyObject* obj, PyObject* attr_name) {
+    PyObject *descr;
+    PyTypeObject *tp = Py_TYPE(obj);
+    if (unlikely(!PyString_Check(attr_name))) {
+        return PyObject_GenericGetAttr(obj, attr_name);
+    }
+    assert(!tp->tp_dictoffset);
+    descr = _PyType_Lookup(tp, attr_name);
+    if (unlikely(!descr)) {
+        return __Pyx_RaiseGenericGetAttributeError(tp, attr_name);
+    }
+    Py_INCREF(descr);
+    #if PY_MAJOR_VERSION < 3
+    if (likely(PyType_HasFeature(Py_TYPE(descr), Py_TPFLAGS_HAVE_CLASS)))
+    #endif
+    {
+        descrgetfunc f = Py_TYPE(descr)->tp_descr_get;
+        if (unlikely(f)) {
+            PyObject *res = f(descr, obj, (PyObject *)tp);
+            Py_DECREF(descr);
+            return res;
+        }
+    }
+    return descr;
 }
+#endif
 
-#else /* Python 3+ */
+/* PyObject_GenericGetAttr */
+#if CYTHON_USE_TYPE_SLOTS && CYTHON_USE_PYTYPE_LOOKUP && PY_VERSION_HEX < 0x03070000
+static PyObject* __Pyx_PyObject_GenericGetAttr(PyObject* obj, PyObject* attr_name) {
+    if (unlikely(Py_TYPE(obj)->tp_dictoffset)) {
+        return PyObject_GenericGetAttr(obj, attr_name);
+    }
+    return __Pyx_PyObject_GenericGetAttrNoDict(obj, attr_name);
+}
+#endif
 
-static void __Pyx_Raise(PyObject *type, PyObject *value, PyObject *tb, PyObject *cause) {
-    if (tb == Py_None) {
-        tb = 0;
-    } else if (tb && !PyTraceBack_Check(tb)) {
-        PyErr_SetString(PyExc_TypeError,
-            "raise: arg 3 must be a traceback or None");
+/* SetVTable */
+static int __Pyx_SetVtable(PyObject *dict, void *vtable) {
+#if PY_VERSION_HEX >= 0x02070000
+    PyObject *ob = PyCapsule_New(vtable, 0, 0);
+#else
+    PyObject *ob = PyCObject_FromVoidPtr(vtable, 0);
+#endif
+    if (!ob)
         goto bad;
+    if (PyDict_SetItem(dict, __pyx_n_s_pyx_vtable, ob) < 0)
+        goto bad;
+    Py_DECREF(ob);
+    return 0;
+bad:
+    Py_XDECREF(ob);
+    return -1;
+}
+
+/* PyErrExceptionMatches */
+#if CYTHON_FAST_THREAD_STATE
+static int __Pyx_PyErr_ExceptionMatchesTuple(PyObject *exc_type, PyObject *tuple) {
+    Py_ssize_t i, n;
+    n = PyTuple_GET_SIZE(tuple);
+#if PY_MAJOR_VERSION >= 3
+    for (i=0; i<n; i++) {
+        if (exc_type == PyTuple_GET_ITEM(tuple, i)) return 1;
     }
-    if (value == Py_None)
-        value = 0;
+#endif
+    for (i=0; i<n; i++) {
+        if (__Pyx_PyErr_GivenExceptionMatches(exc_type, PyTuple_GET_ITEM(tuple, i))) return 1;
+    }
+    return 0;
+}
+static CYTHON_INLINE int __Pyx_PyErr_ExceptionMatchesInState(PyThreadState* tstate, PyObject* err) {
+    PyObject *exc_type = tstate->curexc_type;
+    if (exc_type == err) return 1;
+    if (unlikely(!exc_type)) return 0;
+    if (unlikely(PyTuple_Check(err)))
+        return __Pyx_PyErr_ExceptionMatchesTuple(exc_type, err);
+    return __Pyx_PyErr_GivenExceptionMatches(exc_type, err);
+}
+#endif
 
-    if (PyExceptionInstance_Check(type)) {
-        if (value) {
-            PyErr_SetString(PyExc_TypeError,
-                "instance exception may not have a separate value");
-            goto bad;
-        }
-        value = type;
-        type = (PyObject*) Py_TYPE(value);
-    } else if (!PyExceptionClass_Check(type)) {
-        PyErr_SetString(PyExc_TypeError,
-            "raise: exception class must be a subclass of BaseException");
-        goto bad;
+/* PyObjectGetAttrStrNoError */
+static void __Pyx_PyObject_GetAttrStr_ClearAttributeError(void) {
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    if (likely(__Pyx_PyErr_ExceptionMatches(PyExc_AttributeError)))
+        __Pyx_PyErr_Clear();
+}
+static CYTHON_INLINE PyObject* __Pyx_PyObject_GetAttrStrNoError(PyObject* obj, PyObject* attr_name) {
+    PyObject *result;
+#if CYTHON_COMPILING_IN_CPYTHON && CYTHON_USE_TYPE_SLOTS && PY_VERSION_HEX >= 0x030700B1
+    PyTypeObject* tp = Py_TYPE(obj);
+    if (likely(tp->tp_getattro == PyObject_GenericGetAttr)) {
+        return _PyObject_GenericGetAttrWithDict(obj, attr_name, NULL, 1);
     }
+#endif
+    result = __Pyx_PyObject_GetAttrStr(obj, attr_name);
+    if (unlikely(!result)) {
+        __Pyx_PyObject_GetAttrStr_ClearAttributeError();
+    }
+    return result;
+}
 
-    if (cause) {
-        PyObject *fixed_cause;
-        if (PyExceptionClass_Check(cause)) {
-            fixed_cause = PyObject_CallObject(cause, NULL);
-            if (fixed_cause == NULL)
-                goto bad;
-        }
-        else if (PyExceptionInstance_Check(cause)) {
-            fixed_cause = cause;
-            Py_INCREF(fixed_cause);
-        }
-        else {
-            PyErr_SetString(PyExc_TypeError,
-                            "exception causes must derive from "
-                            "BaseException");
-            goto bad;
+/* SetupReduce */
+static int __Pyx_setup_reduce_is_named(PyObject* meth, PyObject* name) {
+  int ret;
+  PyObject *name_attr;
+  name_attr = __Pyx_PyObject_GetAttrStr(meth, __pyx_n_s_name);
+  if (likely(name_attr)) {
+      ret = PyObject_RichCompareBool(name_attr, name, Py_EQ);
+  } else {
+      ret = -1;
+  }
+  if (unlikely(ret < 0)) {
+      PyErr_Clear();
+      ret = 0;
+  }
+  Py_XDECREF(name_attr);
+  return ret;
+}
+static int __Pyx_setup_reduce(PyObject* type_obj) {
+    int ret = 0;
+    PyObject *object_reduce = NULL;
+    PyObject *object_getstate = NULL;
+    PyObject *object_reduce_ex = NULL;
+    PyObject *reduce = NULL;
+    PyObject *reduce_ex = NULL;
+    PyObject *reduce_cython = NULL;
+    PyObject *setstate = NULL;
+    PyObject *setstate_cython = NULL;
+    PyObject *getstate = NULL;
+#if CYTHON_USE_PYTYPE_LOOKUP
+    getstate = _PyType_Lookup((PyTypeObject*)type_obj, __pyx_n_s_getstate);
+#else
+    getstate = __Pyx_PyObject_GetAttrStrNoError(type_obj, __pyx_n_s_getstate);
+    if (!getstate && PyErr_Occurred()) {
+        goto __PYX_BAD;
+    }
+#endif
+    if (getstate) {
+#if CYTHON_USE_PYTYPE_LOOKUP
+        object_getstate = _PyType_Lookup(&PyBaseObject_Type, __pyx_n_s_getstate);
+#else
+        object_getstate = __Pyx_PyObject_GetAttrStrNoError((PyObject*)&PyBaseObject_Type, __pyx_n_s_getstate);
+        if (!object_getstate && PyErr_Occurred()) {
+            goto __PYX_BAD;
         }
-        if (!value) {
-            value = PyObject_CallObject(type, NULL);
+#endif
+        if (object_getstate != getstate) {
+            goto __PYX_GOOD;
         }
-        PyException_SetCause(value, fixed_cause);
     }
-
-    PyErr_SetObject(type, value);
-
-    if (tb) {
-        PyThreadState *tstate = PyThreadState_GET();
-        PyObject* tmp_tb = tstate->curexc_traceback;
-        if (tb != tmp_tb) {
-            Py_INCREF(tb);
-            tstate->curexc_traceback = tb;
-            Py_XDECREF(tmp_tb);
+#if CYTHON_USE_PYTYPE_LOOKUP
+    object_reduce_ex = _PyType_Lookup(&PyBaseObject_Type, __pyx_n_s_reduce_ex); if (!object_reduce_ex) goto __PYX_BAD;
+#else
+    object_reduce_ex = __Pyx_PyObject_GetAttrStr((PyObject*)&PyBaseObject_Type, __pyx_n_s_reduce_ex); if (!object_reduce_ex) goto __PYX_BAD;
+#endif
+    reduce_ex = __Pyx_PyObject_GetAttrStr(type_obj, __pyx_n_s_reduce_ex); if (unlikely(!reduce_ex)) goto __PYX_BAD;
+    if (reduce_ex == object_reduce_ex) {
+#if CYTHON_USE_PYTYPE_LOOKUP
+        object_reduce = _PyType_Lookup(&PyBaseObject_Type, __pyx_n_s_reduce); if (!object_reduce) goto __PYX_BAD;
+#else
+        object_reduce = __Pyx_PyObject_GetAttrStr((PyObject*)&PyBaseObject_Type, __pyx_n_s_reduce); if (!object_reduce) goto __PYX_BAD;
+#endif
+        reduce = __Pyx_PyObject_GetAttrStr(type_obj, __pyx_n_s_reduce); if (unlikely(!reduce)) goto __PYX_BAD;
+        if (reduce == object_reduce || __Pyx_setup_reduce_is_named(reduce, __pyx_n_s_reduce_cython)) {
+            reduce_cython = __Pyx_PyObject_GetAttrStrNoError(type_obj, __pyx_n_s_reduce_cython);
+            if (likely(reduce_cython)) {
+                ret = PyDict_SetItem(((PyTypeObject*)type_obj)->tp_dict, __pyx_n_s_reduce, reduce_cython); if (unlikely(ret < 0)) goto __PYX_BAD;
+                ret = PyDict_DelItem(((PyTypeObject*)type_obj)->tp_dict, __pyx_n_s_reduce_cython); if (unlikely(ret < 0)) goto __PYX_BAD;
+            } else if (reduce == object_reduce || PyErr_Occurred()) {
+                goto __PYX_BAD;
+            }
+            setstate = __Pyx_PyObject_GetAttrStr(type_obj, __pyx_n_s_setstate);
+            if (!setstate) PyErr_Clear();
+            if (!setstate || __Pyx_setup_reduce_is_named(setstate, __pyx_n_s_setstate_cython)) {
+                setstate_cython = __Pyx_PyObject_GetAttrStrNoError(type_obj, __pyx_n_s_setstate_cython);
+                if (likely(setstate_cython)) {
+                    ret = PyDict_SetItem(((PyTypeObject*)type_obj)->tp_dict, __pyx_n_s_setstate, setstate_cython); if (unlikely(ret < 0)) goto __PYX_BAD;
+                    ret = PyDict_DelItem(((PyTypeObject*)type_obj)->tp_dict, __pyx_n_s_setstate_cython); if (unlikely(ret < 0)) goto __PYX_BAD;
+                } else if (!setstate || PyErr_Occurred()) {
+                    goto __PYX_BAD;
+                }
+            }
+            PyType_Modified((PyTypeObject*)type_obj);
         }
     }
-
-bad:
-    return;
-}
+    goto __PYX_GOOD;
+__PYX_BAD:
+    if (!PyErr_Occurred())
+        PyErr_Format(PyExc_RuntimeError, "Unable to initialize pickling for %s", ((PyTypeObject*)type_obj)->tp_name);
+    ret = -1;
+__PYX_GOOD:
+#if !CYTHON_USE_PYTYPE_LOOKUP
+    Py_XDECREF(object_reduce);
+    Py_XDECREF(object_reduce_ex);
+    Py_XDECREF(object_getstate);
+    Py_XDECREF(getstate);
 #endif
+    Py_XDECREF(reduce);
+    Py_XDECREF(reduce_ex);
+    Py_XDECREF(reduce_cython);
+    Py_XDECREF(setstate);
+    Py_XDECREF(setstate_cython);
+    return ret;
+}
 
-static PyObject *__Pyx_Import(PyObject *name, PyObject *from_list, long level) {
-    PyObject *py_import = 0;
+/* Import */
+static PyObject *__Pyx_Import(PyObject *name, PyObject *from_list, int level) {
     PyObject *empty_list = 0;
     PyObject *module = 0;
     PyObject *global_dict = 0;
     PyObject *empty_dict = 0;
     PyObject *list;
-    py_import = __Pyx_GetAttrString(__pyx_b, "__import__");
+    #if PY_MAJOR_VERSION < 3
+    PyObject *py_import;
+    py_import = __Pyx_PyObject_GetAttrStr(__pyx_b, __pyx_n_s_import);
     if (!py_import)
         goto bad;
+    #endif
     if (from_list)
         list = from_list;
     else {
@@ -2505,520 +11083,1566 @@ static PyObject *__Pyx_Import(PyObject *name, PyObject *from_list, long level) {
     empty_dict = PyDict_New();
     if (!empty_dict)
         goto bad;
-    #if PY_VERSION_HEX >= 0x02050000
     {
-        PyObject *py_level = PyInt_FromLong(level);
-        if (!py_level)
-            goto bad;
-        module = PyObject_CallFunctionObjArgs(py_import,
-            name, global_dict, empty_dict, list, py_level, NULL);
-        Py_DECREF(py_level);
-    }
-    #else
-    if (level>0) {
-        PyErr_SetString(PyExc_RuntimeError, "Relative import is not supported for Python <=2.4.");
-        goto bad;
+        #if PY_MAJOR_VERSION >= 3
+        if (level == -1) {
+            if ((1) && (strchr(__Pyx_MODULE_NAME, '.'))) {
+                module = PyImport_ImportModuleLevelObject(
+                    name, global_dict, empty_dict, list, 1);
+                if (!module) {
+                    if (!PyErr_ExceptionMatches(PyExc_ImportError))
+                        goto bad;
+                    PyErr_Clear();
+                }
+            }
+            level = 0;
+        }
+        #endif
+        if (!module) {
+            #if PY_MAJOR_VERSION < 3
+            PyObject *py_level = PyInt_FromLong(level);
+            if (!py_level)
+                goto bad;
+            module = PyObject_CallFunctionObjArgs(py_import,
+                name, global_dict, empty_dict, list, py_level, (PyObject *)NULL);
+            Py_DECREF(py_level);
+            #else
+            module = PyImport_ImportModuleLevelObject(
+                name, global_dict, empty_dict, list, level);
+            #endif
+        }
     }
-    module = PyObject_CallFunctionObjArgs(py_import,
-        name, global_dict, empty_dict, list, NULL);
-    #endif
 bad:
-    Py_XDECREF(empty_list);
+    #if PY_MAJOR_VERSION < 3
     Py_XDECREF(py_import);
+    #endif
+    Py_XDECREF(empty_list);
     Py_XDECREF(empty_dict);
     return module;
 }
 
-static CYTHON_INLINE unsigned char __Pyx_PyInt_AsUnsignedChar(PyObject* x) {
-    const unsigned char neg_one = (unsigned char)-1, const_zero = 0;
-    const int is_unsigned = neg_one > const_zero;
-    if (sizeof(unsigned char) < sizeof(long)) {
-        long val = __Pyx_PyInt_AsLong(x);
-        if (unlikely(val != (long)(unsigned char)val)) {
-            if (!unlikely(val == -1 && PyErr_Occurred())) {
-                PyErr_SetString(PyExc_OverflowError,
-                    (is_unsigned && unlikely(val < 0)) ?
-                    "can't convert negative value to unsigned char" :
-                    "value too large to convert to unsigned char");
-            }
-            return (unsigned char)-1;
-        }
-        return (unsigned char)val;
+/* CLineInTraceback */
+#ifndef CYTHON_CLINE_IN_TRACEBACK
+static int __Pyx_CLineForTraceback(CYTHON_UNUSED PyThreadState *tstate, int c_line) {
+    PyObject *use_cline;
+    PyObject *ptype, *pvalue, *ptraceback;
+#if CYTHON_COMPILING_IN_CPYTHON
+    PyObject **cython_runtime_dict;
+#endif
+    if (unlikely(!__pyx_cython_runtime)) {
+        return c_line;
     }
-    return (unsigned char)__Pyx_PyInt_AsUnsignedLong(x);
+    __Pyx_ErrFetchInState(tstate, &ptype, &pvalue, &ptraceback);
+#if CYTHON_COMPILING_IN_CPYTHON
+    cython_runtime_dict = _PyObject_GetDictPtr(__pyx_cython_runtime);
+    if (likely(cython_runtime_dict)) {
+        __PYX_PY_DICT_LOOKUP_IF_MODIFIED(
+            use_cline, *cython_runtime_dict,
+            __Pyx_PyDict_GetItemStr(*cython_runtime_dict, __pyx_n_s_cline_in_traceback))
+    } else
+#endif
+    {
+      PyObject *use_cline_obj = __Pyx_PyObject_GetAttrStr(__pyx_cython_runtime, __pyx_n_s_cline_in_traceback);
+      if (use_cline_obj) {
+        use_cline = PyObject_Not(use_cline_obj) ? Py_False : Py_True;
+        Py_DECREF(use_cline_obj);
+      } else {
+        PyErr_Clear();
+        use_cline = NULL;
+      }
+    }
+    if (!use_cline) {
+        c_line = 0;
+        (void) PyObject_SetAttr(__pyx_cython_runtime, __pyx_n_s_cline_in_traceback, Py_False);
+    }
+    else if (use_cline == Py_False || (use_cline != Py_True && PyObject_Not(use_cline) != 0)) {
+        c_line = 0;
+    }
+    __Pyx_ErrRestoreInState(tstate, ptype, pvalue, ptraceback);
+    return c_line;
 }
+#endif
 
-static CYTHON_INLINE unsigned short __Pyx_PyInt_AsUnsignedShort(PyObject* x) {
-    const unsigned short neg_one = (unsigned short)-1, const_zero = 0;
-    const int is_unsigned = neg_one > const_zero;
-    if (sizeof(unsigned short) < sizeof(long)) {
-        long val = __Pyx_PyInt_AsLong(x);
-        if (unlikely(val != (long)(unsigned short)val)) {
-            if (!unlikely(val == -1 && PyErr_Occurred())) {
-                PyErr_SetString(PyExc_OverflowError,
-                    (is_unsigned && unlikely(val < 0)) ?
-                    "can't convert negative value to unsigned short" :
-                    "value too large to convert to unsigned short");
-            }
-            return (unsigned short)-1;
+/* CodeObjectCache */
+static int __pyx_bisect_code_objects(__Pyx_CodeObjectCacheEntry* entries, int count, int code_line) {
+    int start = 0, mid = 0, end = count - 1;
+    if (end >= 0 && code_line > entries[end].code_line) {
+        return count;
+    }
+    while (start < end) {
+        mid = start + (end - start) / 2;
+        if (code_line < entries[mid].code_line) {
+            end = mid;
+        } else if (code_line > entries[mid].code_line) {
+             start = mid + 1;
+        } else {
+            return mid;
         }
-        return (unsigned short)val;
     }
-    return (unsigned short)__Pyx_PyInt_AsUnsignedLong(x);
+    if (code_line <= entries[mid].code_line) {
+        return mid;
+    } else {
+        return mid + 1;
+    }
 }
-
-static CYTHON_INLINE unsigned int __Pyx_PyInt_AsUnsignedInt(PyObject* x) {
-    const unsigned int neg_one = (unsigned int)-1, const_zero = 0;
-    const int is_unsigned = neg_one > const_zero;
-    if (sizeof(unsigned int) < sizeof(long)) {
-        long val = __Pyx_PyInt_AsLong(x);
-        if (unlikely(val != (long)(unsigned int)val)) {
-            if (!unlikely(val == -1 && PyErr_Occurred())) {
-                PyErr_SetString(PyExc_OverflowError,
-                    (is_unsigned && unlikely(val < 0)) ?
-                    "can't convert negative value to unsigned int" :
-                    "value too large to convert to unsigned int");
-            }
-            return (unsigned int)-1;
-        }
-        return (unsigned int)val;
+static PyCodeObject *__pyx_find_code_object(int code_line) {
+    PyCodeObject* code_object;
+    int pos;
+    if (unlikely(!code_line) || unlikely(!__pyx_code_cache.entries)) {
+        return NULL;
+    }
+    pos = __pyx_bisect_code_objects(__pyx_code_cache.entries, __pyx_code_cache.count, code_line);
+    if (unlikely(pos >= __pyx_code_cache.count) || unlikely(__pyx_code_cache.entries[pos].code_line != code_line)) {
+        return NULL;
     }
-    return (unsigned int)__Pyx_PyInt_AsUnsignedLong(x);
+    code_object = __pyx_code_cache.entries[pos].code_object;
+    Py_INCREF(code_object);
+    return code_object;
 }
-
-static CYTHON_INLINE char __Pyx_PyInt_AsChar(PyObject* x) {
-    const char neg_one = (char)-1, const_zero = 0;
-    const int is_unsigned = neg_one > const_zero;
-    if (sizeof(char) < sizeof(long)) {
-        long val = __Pyx_PyInt_AsLong(x);
-        if (unlikely(val != (long)(char)val)) {
-            if (!unlikely(val == -1 && PyErr_Occurred())) {
-                PyErr_SetString(PyExc_OverflowError,
-                    (is_unsigned && unlikely(val < 0)) ?
-                    "can't convert negative value to char" :
-                    "value too large to convert to char");
-            }
-            return (char)-1;
+static void __pyx_insert_code_object(int code_line, PyCodeObject* code_object) {
+    int pos, i;
+    __Pyx_CodeObjectCacheEntry* entries = __pyx_code_cache.entries;
+    if (unlikely(!code_line)) {
+        return;
+    }
+    if (unlikely(!entries)) {
+        entries = (__Pyx_CodeObjectCacheEntry*)PyMem_Malloc(64*sizeof(__Pyx_CodeObjectCacheEntry));
+        if (likely(entries)) {
+            __pyx_code_cache.entries = entries;
+            __pyx_code_cache.max_count = 64;
+            __pyx_code_cache.count = 1;
+            entries[0].code_line = code_line;
+            entries[0].code_object = code_object;
+            Py_INCREF(code_object);
         }
-        return (char)val;
+        return;
     }
-    return (char)__Pyx_PyInt_AsLong(x);
-}
-
-static CYTHON_INLINE short __Pyx_PyInt_AsShort(PyObject* x) {
-    const short neg_one = (short)-1, const_zero = 0;
-    const int is_unsigned = neg_one > const_zero;
-    if (sizeof(short) < sizeof(long)) {
-        long val = __Pyx_PyInt_AsLong(x);
-        if (unlikely(val != (long)(short)val)) {
-            if (!unlikely(val == -1 && PyErr_Occurred())) {
-                PyErr_SetString(PyExc_OverflowError,
-                    (is_unsigned && unlikely(val < 0)) ?
-                    "can't convert negative value to short" :
-                    "value too large to convert to short");
-            }
-            return (short)-1;
+    pos = __pyx_bisect_code_objects(__pyx_code_cache.entries, __pyx_code_cache.count, code_line);
+    if ((pos < __pyx_code_cache.count) && unlikely(__pyx_code_cache.entries[pos].code_line == code_line)) {
+        PyCodeObject* tmp = entries[pos].code_object;
+        entries[pos].code_object = code_object;
+        Py_DECREF(tmp);
+        return;
+    }
+    if (__pyx_code_cache.count == __pyx_code_cache.max_count) {
+        int new_max = __pyx_code_cache.max_count + 64;
+        entries = (__Pyx_CodeObjectCacheEntry*)PyMem_Realloc(
+            __pyx_code_cache.entries, ((size_t)new_max) * sizeof(__Pyx_CodeObjectCacheEntry));
+        if (unlikely(!entries)) {
+            return;
         }
-        return (short)val;
+        __pyx_code_cache.entries = entries;
+        __pyx_code_cache.max_count = new_max;
     }
-    return (short)__Pyx_PyInt_AsLong(x);
+    for (i=__pyx_code_cache.count; i>pos; i--) {
+        entries[i] = entries[i-1];
+    }
+    entries[pos].code_line = code_line;
+    entries[pos].code_object = code_object;
+    __pyx_code_cache.count++;
+    Py_INCREF(code_object);
 }
 
-static CYTHON_INLINE int __Pyx_PyInt_AsInt(PyObject* x) {
-    const int neg_one = (int)-1, const_zero = 0;
-    const int is_unsigned = neg_one > const_zero;
-    if (sizeof(int) < sizeof(long)) {
-        long val = __Pyx_PyInt_AsLong(x);
-        if (unlikely(val != (long)(int)val)) {
-            if (!unlikely(val == -1 && PyErr_Occurred())) {
-                PyErr_SetString(PyExc_OverflowError,
-                    (is_unsigned && unlikely(val < 0)) ?
-                    "can't convert negative value to int" :
-                    "value too large to convert to int");
-            }
-            return (int)-1;
+/* AddTraceback */
+#include "compile.h"
+#include "frameobject.h"
+#include "traceback.h"
+#if PY_VERSION_HEX >= 0x030b00a6
+  #ifndef Py_BUILD_CORE
+    #define Py_BUILD_CORE 1
+  #endif
+  #include "internal/pycore_frame.h"
+#endif
+static PyCodeObject* __Pyx_CreateCodeObjectForTraceback(
+            const char *funcname, int c_line,
+            int py_line, const char *filename) {
+    PyCodeObject *py_code = NULL;
+    PyObject *py_funcname = NULL;
+    #if PY_MAJOR_VERSION < 3
+    PyObject *py_srcfile = NULL;
+    py_srcfile = PyString_FromString(filename);
+    if (!py_srcfile) goto bad;
+    #endif
+    if (c_line) {
+        #if PY_MAJOR_VERSION < 3
+        py_funcname = PyString_FromFormat( "%s (%s:%d)", funcname, __pyx_cfilenm, c_line);
+        if (!py_funcname) goto bad;
+        #else
+        py_funcname = PyUnicode_FromFormat( "%s (%s:%d)", funcname, __pyx_cfilenm, c_line);
+        if (!py_funcname) goto bad;
+        funcname = PyUnicode_AsUTF8(py_funcname);
+        if (!funcname) goto bad;
+        #endif
+    }
+    else {
+        #if PY_MAJOR_VERSION < 3
+        py_funcname = PyString_FromString(funcname);
+        if (!py_funcname) goto bad;
+        #endif
+    }
+    #if PY_MAJOR_VERSION < 3
+    py_code = __Pyx_PyCode_New(
+        0,
+        0,
+        0,
+        0,
+        0,
+        __pyx_empty_bytes, /*PyObject *code,*/
+        __pyx_empty_tuple, /*PyObject *consts,*/
+        __pyx_empty_tuple, /*PyObject *names,*/
+        __pyx_empty_tuple, /*PyObject *varnames,*/
+        __pyx_empty_tuple, /*PyObject *freevars,*/
+        __pyx_empty_tuple, /*PyObject *cellvars,*/
+        py_srcfile,   /*PyObject *filename,*/
+        py_funcname,  /*PyObject *name,*/
+        py_line,
+        __pyx_empty_bytes  /*PyObject *lnotab*/
+    );
+    Py_DECREF(py_srcfile);
+    #else
+    py_code = PyCode_NewEmpty(filename, funcname, py_line);
+    #endif
+    Py_XDECREF(py_funcname);  // XDECREF since it's only set on Py3 if cline
+    return py_code;
+bad:
+    Py_XDECREF(py_funcname);
+    #if PY_MAJOR_VERSION < 3
+    Py_XDECREF(py_srcfile);
+    #endif
+    return NULL;
+}
+static void __Pyx_AddTraceback(const char *funcname, int c_line,
+                               int py_line, const char *filename) {
+    PyCodeObject *py_code = 0;
+    PyFrameObject *py_frame = 0;
+    PyThreadState *tstate = __Pyx_PyThreadState_Current;
+    PyObject *ptype, *pvalue, *ptraceback;
+    if (c_line) {
+        c_line = __Pyx_CLineForTraceback(tstate, c_line);
+    }
+    py_code = __pyx_find_code_object(c_line ? -c_line : py_line);
+    if (!py_code) {
+        __Pyx_ErrFetchInState(tstate, &ptype, &pvalue, &ptraceback);
+        py_code = __Pyx_CreateCodeObjectForTraceback(
+            funcname, c_line, py_line, filename);
+        if (!py_code) {
+            /* If the code object creation fails, then we should clear the
+               fetched exception references and propagate the new exception */
+            Py_XDECREF(ptype);
+            Py_XDECREF(pvalue);
+            Py_XDECREF(ptraceback);
+            goto bad;
         }
-        return (int)val;
+        __Pyx_ErrRestoreInState(tstate, ptype, pvalue, ptraceback);
+        __pyx_insert_code_object(c_line ? -c_line : py_line, py_code);
     }
-    return (int)__Pyx_PyInt_AsLong(x);
+    py_frame = PyFrame_New(
+        tstate,            /*PyThreadState *tstate,*/
+        py_code,           /*PyCodeObject *code,*/
+        __pyx_d,    /*PyObject *globals,*/
+        0                  /*PyObject *locals*/
+    );
+    if (!py_frame) goto bad;
+    __Pyx_PyFrame_SetLineNumber(py_frame, py_line);
+    PyTraceBack_Here(py_frame);
+bad:
+    Py_XDECREF(py_code);
+    Py_XDECREF(py_frame);
 }
 
-static CYTHON_INLINE signed char __Pyx_PyInt_AsSignedChar(PyObject* x) {
-    const signed char neg_one = (signed char)-1, const_zero = 0;
+/* CIntFromPyVerify */
+#define __PYX_VERIFY_RETURN_INT(target_type, func_type, func_value)\
+    __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, 0)
+#define __PYX_VERIFY_RETURN_INT_EXC(target_type, func_type, func_value)\
+    __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, 1)
+#define __PYX__VERIFY_RETURN_INT(target_type, func_type, func_value, exc)\
+    {\
+        func_type value = func_value;\
+        if (sizeof(target_type) < sizeof(func_type)) {\
+            if (unlikely(value != (func_type) (target_type) value)) {\
+                func_type zero = 0;\
+                if (exc && unlikely(value == (func_type)-1 && PyErr_Occurred()))\
+                    return (target_type) -1;\
+                if (is_unsigned && unlikely(value < zero))\
+                    goto raise_neg_overflow;\
+                else\
+                    goto raise_overflow;\
+            }\
+        }\
+        return (target_type) value;\
+    }
+
+/* CIntToPy */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_int(int value) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const int neg_one = (int) -1, const_zero = (int) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
     const int is_unsigned = neg_one > const_zero;
-    if (sizeof(signed char) < sizeof(long)) {
-        long val = __Pyx_PyInt_AsLong(x);
-        if (unlikely(val != (long)(signed char)val)) {
-            if (!unlikely(val == -1 && PyErr_Occurred())) {
-                PyErr_SetString(PyExc_OverflowError,
-                    (is_unsigned && unlikely(val < 0)) ?
-                    "can't convert negative value to signed char" :
-                    "value too large to convert to signed char");
-            }
-            return (signed char)-1;
+    if (is_unsigned) {
+        if (sizeof(int) < sizeof(long)) {
+            return PyInt_FromLong((long) value);
+        } else if (sizeof(int) <= sizeof(unsigned long)) {
+            return PyLong_FromUnsignedLong((unsigned long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(int) <= sizeof(unsigned PY_LONG_LONG)) {
+            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
+#endif
+        }
+    } else {
+        if (sizeof(int) <= sizeof(long)) {
+            return PyInt_FromLong((long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(int) <= sizeof(PY_LONG_LONG)) {
+            return PyLong_FromLongLong((PY_LONG_LONG) value);
+#endif
         }
-        return (signed char)val;
     }
-    return (signed char)__Pyx_PyInt_AsSignedLong(x);
+    {
+        int one = 1; int little = (int)*(unsigned char *)&one;
+        unsigned char *bytes = (unsigned char *)&value;
+        return _PyLong_FromByteArray(bytes, sizeof(int),
+                                     little, !is_unsigned);
+    }
 }
 
-static CYTHON_INLINE signed short __Pyx_PyInt_AsSignedShort(PyObject* x) {
-    const signed short neg_one = (signed short)-1, const_zero = 0;
+/* CIntFromPy */
+static CYTHON_INLINE size_t __Pyx_PyInt_As_size_t(PyObject *x) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const size_t neg_one = (size_t) -1, const_zero = (size_t) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
     const int is_unsigned = neg_one > const_zero;
-    if (sizeof(signed short) < sizeof(long)) {
-        long val = __Pyx_PyInt_AsLong(x);
-        if (unlikely(val != (long)(signed short)val)) {
-            if (!unlikely(val == -1 && PyErr_Occurred())) {
-                PyErr_SetString(PyExc_OverflowError,
-                    (is_unsigned && unlikely(val < 0)) ?
-                    "can't convert negative value to signed short" :
-                    "value too large to convert to signed short");
+#if PY_MAJOR_VERSION < 3
+    if (likely(PyInt_Check(x))) {
+        if (sizeof(size_t) < sizeof(long)) {
+            __PYX_VERIFY_RETURN_INT(size_t, long, PyInt_AS_LONG(x))
+        } else {
+            long val = PyInt_AS_LONG(x);
+            if (is_unsigned && unlikely(val < 0)) {
+                goto raise_neg_overflow;
+            }
+            return (size_t) val;
+        }
+    } else
+#endif
+    if (likely(PyLong_Check(x))) {
+        if (is_unsigned) {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (size_t) 0;
+                case  1: __PYX_VERIFY_RETURN_INT(size_t, digit, digits[0])
+                case 2:
+                    if (8 * sizeof(size_t) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) >= 2 * PyLong_SHIFT) {
+                            return (size_t) (((((size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(size_t) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) >= 3 * PyLong_SHIFT) {
+                            return (size_t) (((((((size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(size_t) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) >= 4 * PyLong_SHIFT) {
+                            return (size_t) (((((((((size_t)digits[3]) << PyLong_SHIFT) | (size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+                        }
+                    }
+                    break;
+            }
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX < 0x030C00A7
+            if (unlikely(Py_SIZE(x) < 0)) {
+                goto raise_neg_overflow;
+            }
+#else
+            {
+                int result = PyObject_RichCompareBool(x, Py_False, Py_LT);
+                if (unlikely(result < 0))
+                    return (size_t) -1;
+                if (unlikely(result == 1))
+                    goto raise_neg_overflow;
+            }
+#endif
+            if (sizeof(size_t) <= sizeof(unsigned long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(size_t, unsigned long, PyLong_AsUnsignedLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(size_t) <= sizeof(unsigned PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(size_t, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
+#endif
+            }
+        } else {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (size_t) 0;
+                case -1: __PYX_VERIFY_RETURN_INT(size_t, sdigit, (sdigit) (-(sdigit)digits[0]))
+                case  1: __PYX_VERIFY_RETURN_INT(size_t,  digit, +digits[0])
+                case -2:
+                    if (8 * sizeof(size_t) - 1 > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(size_t, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) - 1 > 2 * PyLong_SHIFT) {
+                            return (size_t) (((size_t)-1)*(((((size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
+                        }
+                    }
+                    break;
+                case 2:
+                    if (8 * sizeof(size_t) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) - 1 > 2 * PyLong_SHIFT) {
+                            return (size_t) ((((((size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
+                        }
+                    }
+                    break;
+                case -3:
+                    if (8 * sizeof(size_t) - 1 > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(size_t, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) - 1 > 3 * PyLong_SHIFT) {
+                            return (size_t) (((size_t)-1)*(((((((size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(size_t) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) - 1 > 3 * PyLong_SHIFT) {
+                            return (size_t) ((((((((size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
+                        }
+                    }
+                    break;
+                case -4:
+                    if (8 * sizeof(size_t) - 1 > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(size_t, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) - 1 > 4 * PyLong_SHIFT) {
+                            return (size_t) (((size_t)-1)*(((((((((size_t)digits[3]) << PyLong_SHIFT) | (size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(size_t) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(size_t, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(size_t) - 1 > 4 * PyLong_SHIFT) {
+                            return (size_t) ((((((((((size_t)digits[3]) << PyLong_SHIFT) | (size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0])));
+                        }
+                    }
+                    break;
+            }
+#endif
+            if (sizeof(size_t) <= sizeof(long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(size_t, long, PyLong_AsLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(size_t) <= sizeof(PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(size_t, PY_LONG_LONG, PyLong_AsLongLong(x))
+#endif
+            }
+        }
+        {
+#if CYTHON_COMPILING_IN_PYPY && !defined(_PyLong_AsByteArray)
+            PyErr_SetString(PyExc_RuntimeError,
+                            "_PyLong_AsByteArray() not available in PyPy, cannot convert large numbers");
+#else
+            size_t val;
+            PyObject *v = __Pyx_PyNumber_IntOrLong(x);
+ #if PY_MAJOR_VERSION < 3
+            if (likely(v) && !PyLong_Check(v)) {
+                PyObject *tmp = v;
+                v = PyNumber_Long(tmp);
+                Py_DECREF(tmp);
             }
-            return (signed short)-1;
+ #endif
+            if (likely(v)) {
+                int one = 1; int is_little = (int)*(unsigned char *)&one;
+                unsigned char *bytes = (unsigned char *)&val;
+                int ret = _PyLong_AsByteArray((PyLongObject *)v,
+                                              bytes, sizeof(val),
+                                              is_little, !is_unsigned);
+                Py_DECREF(v);
+                if (likely(!ret))
+                    return val;
+            }
+#endif
+            return (size_t) -1;
         }
-        return (signed short)val;
+    } else {
+        size_t val;
+        PyObject *tmp = __Pyx_PyNumber_IntOrLong(x);
+        if (!tmp) return (size_t) -1;
+        val = __Pyx_PyInt_As_size_t(tmp);
+        Py_DECREF(tmp);
+        return val;
     }
-    return (signed short)__Pyx_PyInt_AsSignedLong(x);
+raise_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "value too large to convert to size_t");
+    return (size_t) -1;
+raise_neg_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "can't convert negative value to size_t");
+    return (size_t) -1;
 }
 
-static CYTHON_INLINE signed int __Pyx_PyInt_AsSignedInt(PyObject* x) {
-    const signed int neg_one = (signed int)-1, const_zero = 0;
+/* CIntFromPy */
+static CYTHON_INLINE unsigned int __Pyx_PyInt_As_unsigned_int(PyObject *x) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const unsigned int neg_one = (unsigned int) -1, const_zero = (unsigned int) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
     const int is_unsigned = neg_one > const_zero;
-    if (sizeof(signed int) < sizeof(long)) {
-        long val = __Pyx_PyInt_AsLong(x);
-        if (unlikely(val != (long)(signed int)val)) {
-            if (!unlikely(val == -1 && PyErr_Occurred())) {
-                PyErr_SetString(PyExc_OverflowError,
-                    (is_unsigned && unlikely(val < 0)) ?
-                    "can't convert negative value to signed int" :
-                    "value too large to convert to signed int");
+#if PY_MAJOR_VERSION < 3
+    if (likely(PyInt_Check(x))) {
+        if (sizeof(unsigned int) < sizeof(long)) {
+            __PYX_VERIFY_RETURN_INT(unsigned int, long, PyInt_AS_LONG(x))
+        } else {
+            long val = PyInt_AS_LONG(x);
+            if (is_unsigned && unlikely(val < 0)) {
+                goto raise_neg_overflow;
+            }
+            return (unsigned int) val;
+        }
+    } else
+#endif
+    if (likely(PyLong_Check(x))) {
+        if (is_unsigned) {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (unsigned int) 0;
+                case  1: __PYX_VERIFY_RETURN_INT(unsigned int, digit, digits[0])
+                case 2:
+                    if (8 * sizeof(unsigned int) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) >= 2 * PyLong_SHIFT) {
+                            return (unsigned int) (((((unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0]));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(unsigned int) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) >= 3 * PyLong_SHIFT) {
+                            return (unsigned int) (((((((unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0]));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(unsigned int) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) >= 4 * PyLong_SHIFT) {
+                            return (unsigned int) (((((((((unsigned int)digits[3]) << PyLong_SHIFT) | (unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0]));
+                        }
+                    }
+                    break;
+            }
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX < 0x030C00A7
+            if (unlikely(Py_SIZE(x) < 0)) {
+                goto raise_neg_overflow;
+            }
+#else
+            {
+                int result = PyObject_RichCompareBool(x, Py_False, Py_LT);
+                if (unlikely(result < 0))
+                    return (unsigned int) -1;
+                if (unlikely(result == 1))
+                    goto raise_neg_overflow;
+            }
+#endif
+            if (sizeof(unsigned int) <= sizeof(unsigned long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(unsigned int, unsigned long, PyLong_AsUnsignedLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(unsigned int) <= sizeof(unsigned PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(unsigned int, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
+#endif
+            }
+        } else {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (unsigned int) 0;
+                case -1: __PYX_VERIFY_RETURN_INT(unsigned int, sdigit, (sdigit) (-(sdigit)digits[0]))
+                case  1: __PYX_VERIFY_RETURN_INT(unsigned int,  digit, +digits[0])
+                case -2:
+                    if (8 * sizeof(unsigned int) - 1 > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(unsigned int, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) - 1 > 2 * PyLong_SHIFT) {
+                            return (unsigned int) (((unsigned int)-1)*(((((unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
+                        }
+                    }
+                    break;
+                case 2:
+                    if (8 * sizeof(unsigned int) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) - 1 > 2 * PyLong_SHIFT) {
+                            return (unsigned int) ((((((unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
+                        }
+                    }
+                    break;
+                case -3:
+                    if (8 * sizeof(unsigned int) - 1 > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(unsigned int, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) - 1 > 3 * PyLong_SHIFT) {
+                            return (unsigned int) (((unsigned int)-1)*(((((((unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(unsigned int) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) - 1 > 3 * PyLong_SHIFT) {
+                            return (unsigned int) ((((((((unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
+                        }
+                    }
+                    break;
+                case -4:
+                    if (8 * sizeof(unsigned int) - 1 > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(unsigned int, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) - 1 > 4 * PyLong_SHIFT) {
+                            return (unsigned int) (((unsigned int)-1)*(((((((((unsigned int)digits[3]) << PyLong_SHIFT) | (unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(unsigned int) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(unsigned int, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(unsigned int) - 1 > 4 * PyLong_SHIFT) {
+                            return (unsigned int) ((((((((((unsigned int)digits[3]) << PyLong_SHIFT) | (unsigned int)digits[2]) << PyLong_SHIFT) | (unsigned int)digits[1]) << PyLong_SHIFT) | (unsigned int)digits[0])));
+                        }
+                    }
+                    break;
+            }
+#endif
+            if (sizeof(unsigned int) <= sizeof(long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(unsigned int, long, PyLong_AsLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(unsigned int) <= sizeof(PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(unsigned int, PY_LONG_LONG, PyLong_AsLongLong(x))
+#endif
             }
-            return (signed int)-1;
         }
-        return (signed int)val;
+        {
+#if CYTHON_COMPILING_IN_PYPY && !defined(_PyLong_AsByteArray)
+            PyErr_SetString(PyExc_RuntimeError,
+                            "_PyLong_AsByteArray() not available in PyPy, cannot convert large numbers");
+#else
+            unsigned int val;
+            PyObject *v = __Pyx_PyNumber_IntOrLong(x);
+ #if PY_MAJOR_VERSION < 3
+            if (likely(v) && !PyLong_Check(v)) {
+                PyObject *tmp = v;
+                v = PyNumber_Long(tmp);
+                Py_DECREF(tmp);
+            }
+ #endif
+            if (likely(v)) {
+                int one = 1; int is_little = (int)*(unsigned char *)&one;
+                unsigned char *bytes = (unsigned char *)&val;
+                int ret = _PyLong_AsByteArray((PyLongObject *)v,
+                                              bytes, sizeof(val),
+                                              is_little, !is_unsigned);
+                Py_DECREF(v);
+                if (likely(!ret))
+                    return val;
+            }
+#endif
+            return (unsigned int) -1;
+        }
+    } else {
+        unsigned int val;
+        PyObject *tmp = __Pyx_PyNumber_IntOrLong(x);
+        if (!tmp) return (unsigned int) -1;
+        val = __Pyx_PyInt_As_unsigned_int(tmp);
+        Py_DECREF(tmp);
+        return val;
     }
-    return (signed int)__Pyx_PyInt_AsSignedLong(x);
+raise_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "value too large to convert to unsigned int");
+    return (unsigned int) -1;
+raise_neg_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "can't convert negative value to unsigned int");
+    return (unsigned int) -1;
 }
 
-static CYTHON_INLINE int __Pyx_PyInt_AsLongDouble(PyObject* x) {
-    const int neg_one = (int)-1, const_zero = 0;
+/* CIntFromPy */
+static CYTHON_INLINE int64_t __Pyx_PyInt_As_int64_t(PyObject *x) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const int64_t neg_one = (int64_t) -1, const_zero = (int64_t) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
     const int is_unsigned = neg_one > const_zero;
-    if (sizeof(int) < sizeof(long)) {
-        long val = __Pyx_PyInt_AsLong(x);
-        if (unlikely(val != (long)(int)val)) {
-            if (!unlikely(val == -1 && PyErr_Occurred())) {
-                PyErr_SetString(PyExc_OverflowError,
-                    (is_unsigned && unlikely(val < 0)) ?
-                    "can't convert negative value to int" :
-                    "value too large to convert to int");
+#if PY_MAJOR_VERSION < 3
+    if (likely(PyInt_Check(x))) {
+        if (sizeof(int64_t) < sizeof(long)) {
+            __PYX_VERIFY_RETURN_INT(int64_t, long, PyInt_AS_LONG(x))
+        } else {
+            long val = PyInt_AS_LONG(x);
+            if (is_unsigned && unlikely(val < 0)) {
+                goto raise_neg_overflow;
+            }
+            return (int64_t) val;
+        }
+    } else
+#endif
+    if (likely(PyLong_Check(x))) {
+        if (is_unsigned) {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (int64_t) 0;
+                case  1: __PYX_VERIFY_RETURN_INT(int64_t, digit, digits[0])
+                case 2:
+                    if (8 * sizeof(int64_t) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int64_t, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int64_t) >= 2 * PyLong_SHIFT) {
+                            return (int64_t) (((((int64_t)digits[1]) << PyLong_SHIFT) | (int64_t)digits[0]));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(int64_t) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int64_t, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int64_t) >= 3 * PyLong_SHIFT) {
+                            return (int64_t) (((((((int64_t)digits[2]) << PyLong_SHIFT) | (int64_t)digits[1]) << PyLong_SHIFT) | (int64_t)digits[0]));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(int64_t) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int64_t, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int64_t) >= 4 * PyLong_SHIFT) {
+                            return (int64_t) (((((((((int64_t)digits[3]) << PyLong_SHIFT) | (int64_t)digits[2]) << PyLong_SHIFT) | (int64_t)digits[1]) << PyLong_SHIFT) | (int64_t)digits[0]));
+                        }
+                    }
+                    break;
+            }
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX < 0x030C00A7
+            if (unlikely(Py_SIZE(x) < 0)) {
+                goto raise_neg_overflow;
+            }
+#else
+            {
+                int result = PyObject_RichCompareBool(x, Py_False, Py_LT);
+                if (unlikely(result < 0))
+                    return (int64_t) -1;
+                if (unlikely(result == 1))
+                    goto raise_neg_overflow;
+            }
+#endif
+            if (sizeof(int64_t) <= sizeof(unsigned long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int64_t, unsigned long, PyLong_AsUnsignedLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(int64_t) <= sizeof(unsigned PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int64_t, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
+#endif
+            }
+        } else {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (int64_t) 0;
+                case -1: __PYX_VERIFY_RETURN_INT(int64_t, sdigit, (sdigit) (-(sdigit)digits[0]))
+                case  1: __PYX_VERIFY_RETURN_INT(int64_t,  digit, +digits[0])
+                case -2:
+                    if (8 * sizeof(int64_t) - 1 > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int64_t, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int64_t) - 1 > 2 * PyLong_SHIFT) {
+                            return (int64_t) (((int64_t)-1)*(((((int64_t)digits[1]) << PyLong_SHIFT) | (int64_t)digits[0])));
+                        }
+                    }
+                    break;
+                case 2:
+                    if (8 * sizeof(int64_t) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int64_t, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int64_t) - 1 > 2 * PyLong_SHIFT) {
+                            return (int64_t) ((((((int64_t)digits[1]) << PyLong_SHIFT) | (int64_t)digits[0])));
+                        }
+                    }
+                    break;
+                case -3:
+                    if (8 * sizeof(int64_t) - 1 > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int64_t, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int64_t) - 1 > 3 * PyLong_SHIFT) {
+                            return (int64_t) (((int64_t)-1)*(((((((int64_t)digits[2]) << PyLong_SHIFT) | (int64_t)digits[1]) << PyLong_SHIFT) | (int64_t)digits[0])));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(int64_t) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int64_t, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int64_t) - 1 > 3 * PyLong_SHIFT) {
+                            return (int64_t) ((((((((int64_t)digits[2]) << PyLong_SHIFT) | (int64_t)digits[1]) << PyLong_SHIFT) | (int64_t)digits[0])));
+                        }
+                    }
+                    break;
+                case -4:
+                    if (8 * sizeof(int64_t) - 1 > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int64_t, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int64_t) - 1 > 4 * PyLong_SHIFT) {
+                            return (int64_t) (((int64_t)-1)*(((((((((int64_t)digits[3]) << PyLong_SHIFT) | (int64_t)digits[2]) << PyLong_SHIFT) | (int64_t)digits[1]) << PyLong_SHIFT) | (int64_t)digits[0])));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(int64_t) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int64_t, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int64_t) - 1 > 4 * PyLong_SHIFT) {
+                            return (int64_t) ((((((((((int64_t)digits[3]) << PyLong_SHIFT) | (int64_t)digits[2]) << PyLong_SHIFT) | (int64_t)digits[1]) << PyLong_SHIFT) | (int64_t)digits[0])));
+                        }
+                    }
+                    break;
+            }
+#endif
+            if (sizeof(int64_t) <= sizeof(long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int64_t, long, PyLong_AsLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(int64_t) <= sizeof(PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int64_t, PY_LONG_LONG, PyLong_AsLongLong(x))
+#endif
+            }
+        }
+        {
+#if CYTHON_COMPILING_IN_PYPY && !defined(_PyLong_AsByteArray)
+            PyErr_SetString(PyExc_RuntimeError,
+                            "_PyLong_AsByteArray() not available in PyPy, cannot convert large numbers");
+#else
+            int64_t val;
+            PyObject *v = __Pyx_PyNumber_IntOrLong(x);
+ #if PY_MAJOR_VERSION < 3
+            if (likely(v) && !PyLong_Check(v)) {
+                PyObject *tmp = v;
+                v = PyNumber_Long(tmp);
+                Py_DECREF(tmp);
             }
-            return (int)-1;
+ #endif
+            if (likely(v)) {
+                int one = 1; int is_little = (int)*(unsigned char *)&one;
+                unsigned char *bytes = (unsigned char *)&val;
+                int ret = _PyLong_AsByteArray((PyLongObject *)v,
+                                              bytes, sizeof(val),
+                                              is_little, !is_unsigned);
+                Py_DECREF(v);
+                if (likely(!ret))
+                    return val;
+            }
+#endif
+            return (int64_t) -1;
         }
-        return (int)val;
+    } else {
+        int64_t val;
+        PyObject *tmp = __Pyx_PyNumber_IntOrLong(x);
+        if (!tmp) return (int64_t) -1;
+        val = __Pyx_PyInt_As_int64_t(tmp);
+        Py_DECREF(tmp);
+        return val;
     }
-    return (int)__Pyx_PyInt_AsLong(x);
+raise_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "value too large to convert to int64_t");
+    return (int64_t) -1;
+raise_neg_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "can't convert negative value to int64_t");
+    return (int64_t) -1;
 }
 
-static CYTHON_INLINE unsigned long __Pyx_PyInt_AsUnsignedLong(PyObject* x) {
-    const unsigned long neg_one = (unsigned long)-1, const_zero = 0;
+/* CIntFromPy */
+static CYTHON_INLINE int __Pyx_PyInt_As_int(PyObject *x) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const int neg_one = (int) -1, const_zero = (int) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
     const int is_unsigned = neg_one > const_zero;
-#if PY_VERSION_HEX < 0x03000000
+#if PY_MAJOR_VERSION < 3
     if (likely(PyInt_Check(x))) {
-        long val = PyInt_AS_LONG(x);
-        if (is_unsigned && unlikely(val < 0)) {
-            PyErr_SetString(PyExc_OverflowError,
-                            "can't convert negative value to unsigned long");
-            return (unsigned long)-1;
+        if (sizeof(int) < sizeof(long)) {
+            __PYX_VERIFY_RETURN_INT(int, long, PyInt_AS_LONG(x))
+        } else {
+            long val = PyInt_AS_LONG(x);
+            if (is_unsigned && unlikely(val < 0)) {
+                goto raise_neg_overflow;
+            }
+            return (int) val;
         }
-        return (unsigned long)val;
     } else
 #endif
     if (likely(PyLong_Check(x))) {
         if (is_unsigned) {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (int) 0;
+                case  1: __PYX_VERIFY_RETURN_INT(int, digit, digits[0])
+                case 2:
+                    if (8 * sizeof(int) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) >= 2 * PyLong_SHIFT) {
+                            return (int) (((((int)digits[1]) << PyLong_SHIFT) | (int)digits[0]));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(int) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) >= 3 * PyLong_SHIFT) {
+                            return (int) (((((((int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0]));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(int) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) >= 4 * PyLong_SHIFT) {
+                            return (int) (((((((((int)digits[3]) << PyLong_SHIFT) | (int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0]));
+                        }
+                    }
+                    break;
+            }
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX < 0x030C00A7
             if (unlikely(Py_SIZE(x) < 0)) {
-                PyErr_SetString(PyExc_OverflowError,
-                                "can't convert negative value to unsigned long");
-                return (unsigned long)-1;
+                goto raise_neg_overflow;
+            }
+#else
+            {
+                int result = PyObject_RichCompareBool(x, Py_False, Py_LT);
+                if (unlikely(result < 0))
+                    return (int) -1;
+                if (unlikely(result == 1))
+                    goto raise_neg_overflow;
+            }
+#endif
+            if (sizeof(int) <= sizeof(unsigned long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int, unsigned long, PyLong_AsUnsignedLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(int) <= sizeof(unsigned PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
+#endif
             }
-            return (unsigned long)PyLong_AsUnsignedLong(x);
         } else {
-            return (unsigned long)PyLong_AsLong(x);
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (int) 0;
+                case -1: __PYX_VERIFY_RETURN_INT(int, sdigit, (sdigit) (-(sdigit)digits[0]))
+                case  1: __PYX_VERIFY_RETURN_INT(int,  digit, +digits[0])
+                case -2:
+                    if (8 * sizeof(int) - 1 > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 2 * PyLong_SHIFT) {
+                            return (int) (((int)-1)*(((((int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+                case 2:
+                    if (8 * sizeof(int) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 2 * PyLong_SHIFT) {
+                            return (int) ((((((int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+                case -3:
+                    if (8 * sizeof(int) - 1 > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 3 * PyLong_SHIFT) {
+                            return (int) (((int)-1)*(((((((int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(int) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 3 * PyLong_SHIFT) {
+                            return (int) ((((((((int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+                case -4:
+                    if (8 * sizeof(int) - 1 > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 4 * PyLong_SHIFT) {
+                            return (int) (((int)-1)*(((((((((int)digits[3]) << PyLong_SHIFT) | (int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(int) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(int, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(int) - 1 > 4 * PyLong_SHIFT) {
+                            return (int) ((((((((((int)digits[3]) << PyLong_SHIFT) | (int)digits[2]) << PyLong_SHIFT) | (int)digits[1]) << PyLong_SHIFT) | (int)digits[0])));
+                        }
+                    }
+                    break;
+            }
+#endif
+            if (sizeof(int) <= sizeof(long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int, long, PyLong_AsLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(int) <= sizeof(PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(int, PY_LONG_LONG, PyLong_AsLongLong(x))
+#endif
+            }
+        }
+        {
+#if CYTHON_COMPILING_IN_PYPY && !defined(_PyLong_AsByteArray)
+            PyErr_SetString(PyExc_RuntimeError,
+                            "_PyLong_AsByteArray() not available in PyPy, cannot convert large numbers");
+#else
+            int val;
+            PyObject *v = __Pyx_PyNumber_IntOrLong(x);
+ #if PY_MAJOR_VERSION < 3
+            if (likely(v) && !PyLong_Check(v)) {
+                PyObject *tmp = v;
+                v = PyNumber_Long(tmp);
+                Py_DECREF(tmp);
+            }
+ #endif
+            if (likely(v)) {
+                int one = 1; int is_little = (int)*(unsigned char *)&one;
+                unsigned char *bytes = (unsigned char *)&val;
+                int ret = _PyLong_AsByteArray((PyLongObject *)v,
+                                              bytes, sizeof(val),
+                                              is_little, !is_unsigned);
+                Py_DECREF(v);
+                if (likely(!ret))
+                    return val;
+            }
+#endif
+            return (int) -1;
         }
     } else {
-        unsigned long val;
-        PyObject *tmp = __Pyx_PyNumber_Int(x);
-        if (!tmp) return (unsigned long)-1;
-        val = __Pyx_PyInt_AsUnsignedLong(tmp);
+        int val;
+        PyObject *tmp = __Pyx_PyNumber_IntOrLong(x);
+        if (!tmp) return (int) -1;
+        val = __Pyx_PyInt_As_int(tmp);
         Py_DECREF(tmp);
         return val;
     }
+raise_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "value too large to convert to int");
+    return (int) -1;
+raise_neg_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "can't convert negative value to int");
+    return (int) -1;
 }
 
-static CYTHON_INLINE unsigned PY_LONG_LONG __Pyx_PyInt_AsUnsignedLongLong(PyObject* x) {
-    const unsigned PY_LONG_LONG neg_one = (unsigned PY_LONG_LONG)-1, const_zero = 0;
+/* CIntToPy */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_long(long value) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const long neg_one = (long) -1, const_zero = (long) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
     const int is_unsigned = neg_one > const_zero;
-#if PY_VERSION_HEX < 0x03000000
-    if (likely(PyInt_Check(x))) {
-        long val = PyInt_AS_LONG(x);
-        if (is_unsigned && unlikely(val < 0)) {
-            PyErr_SetString(PyExc_OverflowError,
-                            "can't convert negative value to unsigned PY_LONG_LONG");
-            return (unsigned PY_LONG_LONG)-1;
-        }
-        return (unsigned PY_LONG_LONG)val;
-    } else
+    if (is_unsigned) {
+        if (sizeof(long) < sizeof(long)) {
+            return PyInt_FromLong((long) value);
+        } else if (sizeof(long) <= sizeof(unsigned long)) {
+            return PyLong_FromUnsignedLong((unsigned long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(long) <= sizeof(unsigned PY_LONG_LONG)) {
+            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
 #endif
-    if (likely(PyLong_Check(x))) {
-        if (is_unsigned) {
-            if (unlikely(Py_SIZE(x) < 0)) {
-                PyErr_SetString(PyExc_OverflowError,
-                                "can't convert negative value to unsigned PY_LONG_LONG");
-                return (unsigned PY_LONG_LONG)-1;
-            }
-            return (unsigned PY_LONG_LONG)PyLong_AsUnsignedLongLong(x);
-        } else {
-            return (unsigned PY_LONG_LONG)PyLong_AsLongLong(x);
         }
     } else {
-        unsigned PY_LONG_LONG val;
-        PyObject *tmp = __Pyx_PyNumber_Int(x);
-        if (!tmp) return (unsigned PY_LONG_LONG)-1;
-        val = __Pyx_PyInt_AsUnsignedLongLong(tmp);
-        Py_DECREF(tmp);
-        return val;
+        if (sizeof(long) <= sizeof(long)) {
+            return PyInt_FromLong((long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(long) <= sizeof(PY_LONG_LONG)) {
+            return PyLong_FromLongLong((PY_LONG_LONG) value);
+#endif
+        }
+    }
+    {
+        int one = 1; int little = (int)*(unsigned char *)&one;
+        unsigned char *bytes = (unsigned char *)&value;
+        return _PyLong_FromByteArray(bytes, sizeof(long),
+                                     little, !is_unsigned);
     }
 }
 
-static CYTHON_INLINE long __Pyx_PyInt_AsLong(PyObject* x) {
-    const long neg_one = (long)-1, const_zero = 0;
+/* CIntToPy */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_uint64_t(uint64_t value) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const uint64_t neg_one = (uint64_t) -1, const_zero = (uint64_t) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
     const int is_unsigned = neg_one > const_zero;
-#if PY_VERSION_HEX < 0x03000000
-    if (likely(PyInt_Check(x))) {
-        long val = PyInt_AS_LONG(x);
-        if (is_unsigned && unlikely(val < 0)) {
-            PyErr_SetString(PyExc_OverflowError,
-                            "can't convert negative value to long");
-            return (long)-1;
-        }
-        return (long)val;
-    } else
+    if (is_unsigned) {
+        if (sizeof(uint64_t) < sizeof(long)) {
+            return PyInt_FromLong((long) value);
+        } else if (sizeof(uint64_t) <= sizeof(unsigned long)) {
+            return PyLong_FromUnsignedLong((unsigned long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(uint64_t) <= sizeof(unsigned PY_LONG_LONG)) {
+            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
 #endif
-    if (likely(PyLong_Check(x))) {
-        if (is_unsigned) {
-            if (unlikely(Py_SIZE(x) < 0)) {
-                PyErr_SetString(PyExc_OverflowError,
-                                "can't convert negative value to long");
-                return (long)-1;
-            }
-            return (long)PyLong_AsUnsignedLong(x);
-        } else {
-            return (long)PyLong_AsLong(x);
         }
     } else {
-        long val;
-        PyObject *tmp = __Pyx_PyNumber_Int(x);
-        if (!tmp) return (long)-1;
-        val = __Pyx_PyInt_AsLong(tmp);
-        Py_DECREF(tmp);
-        return val;
+        if (sizeof(uint64_t) <= sizeof(long)) {
+            return PyInt_FromLong((long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(uint64_t) <= sizeof(PY_LONG_LONG)) {
+            return PyLong_FromLongLong((PY_LONG_LONG) value);
+#endif
+        }
+    }
+    {
+        int one = 1; int little = (int)*(unsigned char *)&one;
+        unsigned char *bytes = (unsigned char *)&value;
+        return _PyLong_FromByteArray(bytes, sizeof(uint64_t),
+                                     little, !is_unsigned);
     }
 }
 
-static CYTHON_INLINE PY_LONG_LONG __Pyx_PyInt_AsLongLong(PyObject* x) {
-    const PY_LONG_LONG neg_one = (PY_LONG_LONG)-1, const_zero = 0;
+/* CIntToPy */
+static CYTHON_INLINE PyObject* __Pyx_PyInt_From_PY_LONG_LONG(PY_LONG_LONG value) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const PY_LONG_LONG neg_one = (PY_LONG_LONG) -1, const_zero = (PY_LONG_LONG) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
     const int is_unsigned = neg_one > const_zero;
-#if PY_VERSION_HEX < 0x03000000
-    if (likely(PyInt_Check(x))) {
-        long val = PyInt_AS_LONG(x);
-        if (is_unsigned && unlikely(val < 0)) {
-            PyErr_SetString(PyExc_OverflowError,
-                            "can't convert negative value to PY_LONG_LONG");
-            return (PY_LONG_LONG)-1;
-        }
-        return (PY_LONG_LONG)val;
-    } else
+    if (is_unsigned) {
+        if (sizeof(PY_LONG_LONG) < sizeof(long)) {
+            return PyInt_FromLong((long) value);
+        } else if (sizeof(PY_LONG_LONG) <= sizeof(unsigned long)) {
+            return PyLong_FromUnsignedLong((unsigned long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(PY_LONG_LONG) <= sizeof(unsigned PY_LONG_LONG)) {
+            return PyLong_FromUnsignedLongLong((unsigned PY_LONG_LONG) value);
 #endif
-    if (likely(PyLong_Check(x))) {
-        if (is_unsigned) {
-            if (unlikely(Py_SIZE(x) < 0)) {
-                PyErr_SetString(PyExc_OverflowError,
-                                "can't convert negative value to PY_LONG_LONG");
-                return (PY_LONG_LONG)-1;
-            }
-            return (PY_LONG_LONG)PyLong_AsUnsignedLongLong(x);
-        } else {
-            return (PY_LONG_LONG)PyLong_AsLongLong(x);
         }
     } else {
-        PY_LONG_LONG val;
-        PyObject *tmp = __Pyx_PyNumber_Int(x);
-        if (!tmp) return (PY_LONG_LONG)-1;
-        val = __Pyx_PyInt_AsLongLong(tmp);
-        Py_DECREF(tmp);
-        return val;
+        if (sizeof(PY_LONG_LONG) <= sizeof(long)) {
+            return PyInt_FromLong((long) value);
+#ifdef HAVE_LONG_LONG
+        } else if (sizeof(PY_LONG_LONG) <= sizeof(PY_LONG_LONG)) {
+            return PyLong_FromLongLong((PY_LONG_LONG) value);
+#endif
+        }
+    }
+    {
+        int one = 1; int little = (int)*(unsigned char *)&one;
+        unsigned char *bytes = (unsigned char *)&value;
+        return _PyLong_FromByteArray(bytes, sizeof(PY_LONG_LONG),
+                                     little, !is_unsigned);
     }
 }
 
-static CYTHON_INLINE signed long __Pyx_PyInt_AsSignedLong(PyObject* x) {
-    const signed long neg_one = (signed long)-1, const_zero = 0;
+/* CIntFromPy */
+static CYTHON_INLINE long __Pyx_PyInt_As_long(PyObject *x) {
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic push
+#pragma GCC diagnostic ignored "-Wconversion"
+#endif
+    const long neg_one = (long) -1, const_zero = (long) 0;
+#ifdef __Pyx_HAS_GCC_DIAGNOSTIC
+#pragma GCC diagnostic pop
+#endif
     const int is_unsigned = neg_one > const_zero;
-#if PY_VERSION_HEX < 0x03000000
+#if PY_MAJOR_VERSION < 3
     if (likely(PyInt_Check(x))) {
-        long val = PyInt_AS_LONG(x);
-        if (is_unsigned && unlikely(val < 0)) {
-            PyErr_SetString(PyExc_OverflowError,
-                            "can't convert negative value to signed long");
-            return (signed long)-1;
+        if (sizeof(long) < sizeof(long)) {
+            __PYX_VERIFY_RETURN_INT(long, long, PyInt_AS_LONG(x))
+        } else {
+            long val = PyInt_AS_LONG(x);
+            if (is_unsigned && unlikely(val < 0)) {
+                goto raise_neg_overflow;
+            }
+            return (long) val;
         }
-        return (signed long)val;
     } else
 #endif
     if (likely(PyLong_Check(x))) {
         if (is_unsigned) {
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (long) 0;
+                case  1: __PYX_VERIFY_RETURN_INT(long, digit, digits[0])
+                case 2:
+                    if (8 * sizeof(long) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) >= 2 * PyLong_SHIFT) {
+                            return (long) (((((long)digits[1]) << PyLong_SHIFT) | (long)digits[0]));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(long) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) >= 3 * PyLong_SHIFT) {
+                            return (long) (((((((long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0]));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(long) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) >= 4 * PyLong_SHIFT) {
+                            return (long) (((((((((long)digits[3]) << PyLong_SHIFT) | (long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0]));
+                        }
+                    }
+                    break;
+            }
+#endif
+#if CYTHON_COMPILING_IN_CPYTHON && PY_VERSION_HEX < 0x030C00A7
             if (unlikely(Py_SIZE(x) < 0)) {
-                PyErr_SetString(PyExc_OverflowError,
-                                "can't convert negative value to signed long");
-                return (signed long)-1;
+                goto raise_neg_overflow;
+            }
+#else
+            {
+                int result = PyObject_RichCompareBool(x, Py_False, Py_LT);
+                if (unlikely(result < 0))
+                    return (long) -1;
+                if (unlikely(result == 1))
+                    goto raise_neg_overflow;
+            }
+#endif
+            if (sizeof(long) <= sizeof(unsigned long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(long, unsigned long, PyLong_AsUnsignedLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(long) <= sizeof(unsigned PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(long, unsigned PY_LONG_LONG, PyLong_AsUnsignedLongLong(x))
+#endif
             }
-            return (signed long)PyLong_AsUnsignedLong(x);
         } else {
-            return (signed long)PyLong_AsLong(x);
+#if CYTHON_USE_PYLONG_INTERNALS
+            const digit* digits = ((PyLongObject*)x)->ob_digit;
+            switch (Py_SIZE(x)) {
+                case  0: return (long) 0;
+                case -1: __PYX_VERIFY_RETURN_INT(long, sdigit, (sdigit) (-(sdigit)digits[0]))
+                case  1: __PYX_VERIFY_RETURN_INT(long,  digit, +digits[0])
+                case -2:
+                    if (8 * sizeof(long) - 1 > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, long, -(long) (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
+                            return (long) (((long)-1)*(((((long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+                case 2:
+                    if (8 * sizeof(long) > 1 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 2 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
+                            return (long) ((((((long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+                case -3:
+                    if (8 * sizeof(long) - 1 > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, long, -(long) (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
+                            return (long) (((long)-1)*(((((((long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+                case 3:
+                    if (8 * sizeof(long) > 2 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 3 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
+                            return (long) ((((((((long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+                case -4:
+                    if (8 * sizeof(long) - 1 > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, long, -(long) (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
+                            return (long) (((long)-1)*(((((((((long)digits[3]) << PyLong_SHIFT) | (long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+                case 4:
+                    if (8 * sizeof(long) > 3 * PyLong_SHIFT) {
+                        if (8 * sizeof(unsigned long) > 4 * PyLong_SHIFT) {
+                            __PYX_VERIFY_RETURN_INT(long, unsigned long, (((((((((unsigned long)digits[3]) << PyLong_SHIFT) | (unsigned long)digits[2]) << PyLong_SHIFT) | (unsigned long)digits[1]) << PyLong_SHIFT) | (unsigned long)digits[0])))
+                        } else if (8 * sizeof(long) - 1 > 4 * PyLong_SHIFT) {
+                            return (long) ((((((((((long)digits[3]) << PyLong_SHIFT) | (long)digits[2]) << PyLong_SHIFT) | (long)digits[1]) << PyLong_SHIFT) | (long)digits[0])));
+                        }
+                    }
+                    break;
+            }
+#endif
+            if (sizeof(long) <= sizeof(long)) {
+                __PYX_VERIFY_RETURN_INT_EXC(long, long, PyLong_AsLong(x))
+#ifdef HAVE_LONG_LONG
+            } else if (sizeof(long) <= sizeof(PY_LONG_LONG)) {
+                __PYX_VERIFY_RETURN_INT_EXC(long, PY_LONG_LONG, PyLong_AsLongLong(x))
+#endif
+            }
+        }
+        {
+#if CYTHON_COMPILING_IN_PYPY && !defined(_PyLong_AsByteArray)
+            PyErr_SetString(PyExc_RuntimeError,
+                            "_PyLong_AsByteArray() not available in PyPy, cannot convert large numbers");
+#else
+            long val;
+            PyObject *v = __Pyx_PyNumber_IntOrLong(x);
+ #if PY_MAJOR_VERSION < 3
+            if (likely(v) && !PyLong_Check(v)) {
+                PyObject *tmp = v;
+                v = PyNumber_Long(tmp);
+                Py_DECREF(tmp);
+            }
+ #endif
+            if (likely(v)) {
+                int one = 1; int is_little = (int)*(unsigned char *)&one;
+                unsigned char *bytes = (unsigned char *)&val;
+                int ret = _PyLong_AsByteArray((PyLongObject *)v,
+                                              bytes, sizeof(val),
+                                              is_little, !is_unsigned);
+                Py_DECREF(v);
+                if (likely(!ret))
+                    return val;
+            }
+#endif
+            return (long) -1;
         }
     } else {
-        signed long val;
-        PyObject *tmp = __Pyx_PyNumber_Int(x);
-        if (!tmp) return (signed long)-1;
-        val = __Pyx_PyInt_AsSignedLong(tmp);
+        long val;
+        PyObject *tmp = __Pyx_PyNumber_IntOrLong(x);
+        if (!tmp) return (long) -1;
+        val = __Pyx_PyInt_As_long(tmp);
         Py_DECREF(tmp);
         return val;
     }
+raise_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "value too large to convert to long");
+    return (long) -1;
+raise_neg_overflow:
+    PyErr_SetString(PyExc_OverflowError,
+        "can't convert negative value to long");
+    return (long) -1;
 }
 
-static CYTHON_INLINE signed PY_LONG_LONG __Pyx_PyInt_AsSignedLongLong(PyObject* x) {
-    const signed PY_LONG_LONG neg_one = (signed PY_LONG_LONG)-1, const_zero = 0;
-    const int is_unsigned = neg_one > const_zero;
-#if PY_VERSION_HEX < 0x03000000
-    if (likely(PyInt_Check(x))) {
-        long val = PyInt_AS_LONG(x);
-        if (is_unsigned && unlikely(val < 0)) {
-            PyErr_SetString(PyExc_OverflowError,
-                            "can't convert negative value to signed PY_LONG_LONG");
-            return (signed PY_LONG_LONG)-1;
+/* FastTypeChecks */
+#if CYTHON_COMPILING_IN_CPYTHON
+static int __Pyx_InBases(PyTypeObject *a, PyTypeObject *b) {
+    while (a) {
+        a = a->tp_base;
+        if (a == b)
+            return 1;
+    }
+    return b == &PyBaseObject_Type;
+}
+static CYTHON_INLINE int __Pyx_IsSubtype(PyTypeObject *a, PyTypeObject *b) {
+    PyObject *mro;
+    if (a == b) return 1;
+    mro = a->tp_mro;
+    if (likely(mro)) {
+        Py_ssize_t i, n;
+        n = PyTuple_GET_SIZE(mro);
+        for (i = 0; i < n; i++) {
+            if (PyTuple_GET_ITEM(mro, i) == (PyObject *)b)
+                return 1;
         }
-        return (signed PY_LONG_LONG)val;
-    } else
+        return 0;
+    }
+    return __Pyx_InBases(a, b);
+}
+#if PY_MAJOR_VERSION == 2
+static int __Pyx_inner_PyErr_GivenExceptionMatches2(PyObject *err, PyObject* exc_type1, PyObject* exc_type2) {
+    PyObject *exception, *value, *tb;
+    int res;
+    __Pyx_PyThreadState_declare
+    __Pyx_PyThreadState_assign
+    __Pyx_ErrFetch(&exception, &value, &tb);
+    res = exc_type1 ? PyObject_IsSubclass(err, exc_type1) : 0;
+    if (unlikely(res == -1)) {
+        PyErr_WriteUnraisable(err);
+        res = 0;
+    }
+    if (!res) {
+        res = PyObject_IsSubclass(err, exc_type2);
+        if (unlikely(res == -1)) {
+            PyErr_WriteUnraisable(err);
+            res = 0;
+        }
+    }
+    __Pyx_ErrRestore(exception, value, tb);
+    return res;
+}
+#else
+static CYTHON_INLINE int __Pyx_inner_PyErr_GivenExceptionMatches2(PyObject *err, PyObject* exc_type1, PyObject *exc_type2) {
+    int res = exc_type1 ? __Pyx_IsSubtype((PyTypeObject*)err, (PyTypeObject*)exc_type1) : 0;
+    if (!res) {
+        res = __Pyx_IsSubtype((PyTypeObject*)err, (PyTypeObject*)exc_type2);
+    }
+    return res;
+}
 #endif
-    if (likely(PyLong_Check(x))) {
-        if (is_unsigned) {
-            if (unlikely(Py_SIZE(x) < 0)) {
-                PyErr_SetString(PyExc_OverflowError,
-                                "can't convert negative value to signed PY_LONG_LONG");
-                return (signed PY_LONG_LONG)-1;
-            }
-            return (signed PY_LONG_LONG)PyLong_AsUnsignedLongLong(x);
+static int __Pyx_PyErr_GivenExceptionMatchesTuple(PyObject *exc_type, PyObject *tuple) {
+    Py_ssize_t i, n;
+    assert(PyExceptionClass_Check(exc_type));
+    n = PyTuple_GET_SIZE(tuple);
+#if PY_MAJOR_VERSION >= 3
+    for (i=0; i<n; i++) {
+        if (exc_type == PyTuple_GET_ITEM(tuple, i)) return 1;
+    }
+#endif
+    for (i=0; i<n; i++) {
+        PyObject *t = PyTuple_GET_ITEM(tuple, i);
+        #if PY_MAJOR_VERSION < 3
+        if (likely(exc_type == t)) return 1;
+        #endif
+        if (likely(PyExceptionClass_Check(t))) {
+            if (__Pyx_inner_PyErr_GivenExceptionMatches2(exc_type, NULL, t)) return 1;
         } else {
-            return (signed PY_LONG_LONG)PyLong_AsLongLong(x);
         }
-    } else {
-        signed PY_LONG_LONG val;
-        PyObject *tmp = __Pyx_PyNumber_Int(x);
-        if (!tmp) return (signed PY_LONG_LONG)-1;
-        val = __Pyx_PyInt_AsSignedLongLong(tmp);
-        Py_DECREF(tmp);
-        return val;
     }
+    return 0;
+}
+static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches(PyObject *err, PyObject* exc_type) {
+    if (likely(err == exc_type)) return 1;
+    if (likely(PyExceptionClass_Check(err))) {
+        if (likely(PyExceptionClass_Check(exc_type))) {
+            return __Pyx_inner_PyErr_GivenExceptionMatches2(err, NULL, exc_type);
+        } else if (likely(PyTuple_Check(exc_type))) {
+            return __Pyx_PyErr_GivenExceptionMatchesTuple(err, exc_type);
+        } else {
+        }
+    }
+    return PyErr_GivenExceptionMatches(err, exc_type);
+}
+static CYTHON_INLINE int __Pyx_PyErr_GivenExceptionMatches2(PyObject *err, PyObject *exc_type1, PyObject *exc_type2) {
+    assert(PyExceptionClass_Check(exc_type1));
+    assert(PyExceptionClass_Check(exc_type2));
+    if (likely(err == exc_type1 || err == exc_type2)) return 1;
+    if (likely(PyExceptionClass_Check(err))) {
+        return __Pyx_inner_PyErr_GivenExceptionMatches2(err, exc_type1, exc_type2);
+    }
+    return (PyErr_GivenExceptionMatches(err, exc_type1) || PyErr_GivenExceptionMatches(err, exc_type2));
 }
+#endif
 
+/* CheckBinaryVersion */
 static int __Pyx_check_binary_version(void) {
-    char ctversion[4], rtversion[4];
-    PyOS_snprintf(ctversion, 4, "%d.%d", PY_MAJOR_VERSION, PY_MINOR_VERSION);
-    PyOS_snprintf(rtversion, 4, "%s", Py_GetVersion());
-    if (ctversion[0] != rtversion[0] || ctversion[2] != rtversion[2]) {
+    char ctversion[5];
+    int same=1, i, found_dot;
+    const char* rt_from_call = Py_GetVersion();
+    PyOS_snprintf(ctversion, 5, "%d.%d", PY_MAJOR_VERSION, PY_MINOR_VERSION);
+    found_dot = 0;
+    for (i = 0; i < 4; i++) {
+        if (!ctversion[i]) {
+            same = (rt_from_call[i] < '0' || rt_from_call[i] > '9');
+            break;
+        }
+        if (rt_from_call[i] != ctversion[i]) {
+            same = 0;
+            break;
+        }
+    }
+    if (!same) {
+        char rtversion[5] = {'\0'};
         char message[200];
+        for (i=0; i<4; ++i) {
+            if (rt_from_call[i] == '.') {
+                if (found_dot) break;
+                found_dot = 1;
+            } else if (rt_from_call[i] < '0' || rt_from_call[i] > '9') {
+                break;
+            }
+            rtversion[i] = rt_from_call[i];
+        }
         PyOS_snprintf(message, sizeof(message),
                       "compiletime version %s of module '%.100s' "
                       "does not match runtime version %s",
                       ctversion, __Pyx_MODULE_NAME, rtversion);
-        #if PY_VERSION_HEX < 0x02050000
-        return PyErr_Warn(NULL, message);
-        #else
         return PyErr_WarnEx(NULL, message, 1);
-        #endif
     }
     return 0;
 }
 
-#include "compile.h"
-#include "frameobject.h"
-#include "traceback.h"
-
-static void __Pyx_AddTraceback(const char *funcname, int __pyx_clineno,
-                               int __pyx_lineno, const char *__pyx_filename) {
-    PyObject *py_srcfile = 0;
-    PyObject *py_funcname = 0;
-    PyObject *py_globals = 0;
-    PyCodeObject *py_code = 0;
-    PyFrameObject *py_frame = 0;
-
-    #if PY_MAJOR_VERSION < 3
-    py_srcfile = PyString_FromString(__pyx_filename);
-    #else
-    py_srcfile = PyUnicode_FromString(__pyx_filename);
-    #endif
-    if (!py_srcfile) goto bad;
-    if (__pyx_clineno) {
-        #if PY_MAJOR_VERSION < 3
-        py_funcname = PyString_FromFormat( "%s (%s:%d)", funcname, __pyx_cfilenm, __pyx_clineno);
-        #else
-        py_funcname = PyUnicode_FromFormat( "%s (%s:%d)", funcname, __pyx_cfilenm, __pyx_clineno);
-        #endif
-    }
-    else {
-        #if PY_MAJOR_VERSION < 3
-        py_funcname = PyString_FromString(funcname);
-        #else
-        py_funcname = PyUnicode_FromString(funcname);
-        #endif
-    }
-    if (!py_funcname) goto bad;
-    py_globals = PyModule_GetDict(__pyx_m);
-    if (!py_globals) goto bad;
-    py_code = PyCode_New(
-        0,            /*int argcount,*/
-        #if PY_MAJOR_VERSION >= 3
-        0,            /*int kwonlyargcount,*/
-        #endif
-        0,            /*int nlocals,*/
-        0,            /*int stacksize,*/
-        0,            /*int flags,*/
-        __pyx_empty_bytes, /*PyObject *code,*/
-        __pyx_empty_tuple,  /*PyObject *consts,*/
-        __pyx_empty_tuple,  /*PyObject *names,*/
-        __pyx_empty_tuple,  /*PyObject *varnames,*/
-        __pyx_empty_tuple,  /*PyObject *freevars,*/
-        __pyx_empty_tuple,  /*PyObject *cellvars,*/
-        py_srcfile,   /*PyObject *filename,*/
-        py_funcname,  /*PyObject *name,*/
-        __pyx_lineno,   /*int firstlineno,*/
-        __pyx_empty_bytes  /*PyObject *lnotab*/
-    );
-    if (!py_code) goto bad;
-    py_frame = PyFrame_New(
-        PyThreadState_GET(), /*PyThreadState *tstate,*/
-        py_code,             /*PyCodeObject *code,*/
-        py_globals,          /*PyObject *globals,*/
-        0                    /*PyObject *locals*/
-    );
-    if (!py_frame) goto bad;
-    py_frame->f_lineno = __pyx_lineno;
-    PyTraceBack_Here(py_frame);
-bad:
-    Py_XDECREF(py_srcfile);
-    Py_XDECREF(py_funcname);
-    Py_XDECREF(py_code);
-    Py_XDECREF(py_frame);
-}
-
+/* InitStrings */
 static int __Pyx_InitStrings(__Pyx_StringTabEntry *t) {
     while (t->p) {
         #if PY_MAJOR_VERSION < 3
@@ -3029,7 +12653,7 @@ static int __Pyx_InitStrings(__Pyx_StringTabEntry *t) {
         } else {
             *t->p = PyString_FromStringAndSize(t->s, t->n - 1);
         }
-        #else  /* Python 3+ has unicode identifiers */
+        #else
         if (t->is_unicode | t->is_str) {
             if (t->intern) {
                 *t->p = PyUnicode_InternFromString(t->s);
@@ -3044,56 +12668,158 @@ static int __Pyx_InitStrings(__Pyx_StringTabEntry *t) {
         #endif
         if (!*t->p)
             return -1;
+        if (PyObject_Hash(*t->p) == -1)
+            return -1;
         ++t;
     }
     return 0;
 }
 
-/* Type Conversion Functions */
-
+static CYTHON_INLINE PyObject* __Pyx_PyUnicode_FromString(const char* c_str) {
+    return __Pyx_PyUnicode_FromStringAndSize(c_str, (Py_ssize_t)strlen(c_str));
+}
+static CYTHON_INLINE const char* __Pyx_PyObject_AsString(PyObject* o) {
+    Py_ssize_t ignore;
+    return __Pyx_PyObject_AsStringAndSize(o, &ignore);
+}
+#if __PYX_DEFAULT_STRING_ENCODING_IS_ASCII || __PYX_DEFAULT_STRING_ENCODING_IS_DEFAULT
+#if !CYTHON_PEP393_ENABLED
+static const char* __Pyx_PyUnicode_AsStringAndSize(PyObject* o, Py_ssize_t *length) {
+    char* defenc_c;
+    PyObject* defenc = _PyUnicode_AsDefaultEncodedString(o, NULL);
+    if (!defenc) return NULL;
+    defenc_c = PyBytes_AS_STRING(defenc);
+#if __PYX_DEFAULT_STRING_ENCODING_IS_ASCII
+    {
+        char* end = defenc_c + PyBytes_GET_SIZE(defenc);
+        char* c;
+        for (c = defenc_c; c < end; c++) {
+            if ((unsigned char) (*c) >= 128) {
+                PyUnicode_AsASCIIString(o);
+                return NULL;
+            }
+        }
+    }
+#endif
+    *length = PyBytes_GET_SIZE(defenc);
+    return defenc_c;
+}
+#else
+static CYTHON_INLINE const char* __Pyx_PyUnicode_AsStringAndSize(PyObject* o, Py_ssize_t *length) {
+    if (unlikely(__Pyx_PyUnicode_READY(o) == -1)) return NULL;
+#if __PYX_DEFAULT_STRING_ENCODING_IS_ASCII
+    if (likely(PyUnicode_IS_ASCII(o))) {
+        *length = PyUnicode_GET_LENGTH(o);
+        return PyUnicode_AsUTF8(o);
+    } else {
+        PyUnicode_AsASCIIString(o);
+        return NULL;
+    }
+#else
+    return PyUnicode_AsUTF8AndSize(o, length);
+#endif
+}
+#endif
+#endif
+static CYTHON_INLINE const char* __Pyx_PyObject_AsStringAndSize(PyObject* o, Py_ssize_t *length) {
+#if __PYX_DEFAULT_STRING_ENCODING_IS_ASCII || __PYX_DEFAULT_STRING_ENCODING_IS_DEFAULT
+    if (
+#if PY_MAJOR_VERSION < 3 && __PYX_DEFAULT_STRING_ENCODING_IS_ASCII
+            __Pyx_sys_getdefaultencoding_not_ascii &&
+#endif
+            PyUnicode_Check(o)) {
+        return __Pyx_PyUnicode_AsStringAndSize(o, length);
+    } else
+#endif
+#if (!CYTHON_COMPILING_IN_PYPY) || (defined(PyByteArray_AS_STRING) && defined(PyByteArray_GET_SIZE))
+    if (PyByteArray_Check(o)) {
+        *length = PyByteArray_GET_SIZE(o);
+        return PyByteArray_AS_STRING(o);
+    } else
+#endif
+    {
+        char* result;
+        int r = PyBytes_AsStringAndSize(o, &result, length);
+        if (unlikely(r < 0)) {
+            return NULL;
+        } else {
+            return result;
+        }
+    }
+}
 static CYTHON_INLINE int __Pyx_PyObject_IsTrue(PyObject* x) {
    int is_true = x == Py_True;
    if (is_true | (x == Py_False) | (x == Py_None)) return is_true;
    else return PyObject_IsTrue(x);
 }
-
-static CYTHON_INLINE PyObject* __Pyx_PyNumber_Int(PyObject* x) {
+static CYTHON_INLINE int __Pyx_PyObject_IsTrueAndDecref(PyObject* x) {
+    int retval;
+    if (unlikely(!x)) return -1;
+    retval = __Pyx_PyObject_IsTrue(x);
+    Py_DECREF(x);
+    return retval;
+}
+static PyObject* __Pyx_PyNumber_IntOrLongWrongResultType(PyObject* result, const char* type_name) {
+#if PY_MAJOR_VERSION >= 3
+    if (PyLong_Check(result)) {
+        if (PyErr_WarnFormat(PyExc_DeprecationWarning, 1,
+                "__int__ returned non-int (type %.200s).  "
+                "The ability to return an instance of a strict subclass of int "
+                "is deprecated, and may be removed in a future version of Python.",
+                Py_TYPE(result)->tp_name)) {
+            Py_DECREF(result);
+            return NULL;
+        }
+        return result;
+    }
+#endif
+    PyErr_Format(PyExc_TypeError,
+                 "__%.4s__ returned non-%.4s (type %.200s)",
+                 type_name, type_name, Py_TYPE(result)->tp_name);
+    Py_DECREF(result);
+    return NULL;
+}
+static CYTHON_INLINE PyObject* __Pyx_PyNumber_IntOrLong(PyObject* x) {
+#if CYTHON_USE_TYPE_SLOTS
   PyNumberMethods *m;
+#endif
   const char *name = NULL;
   PyObject *res = NULL;
-#if PY_VERSION_HEX < 0x03000000
-  if (PyInt_Check(x) || PyLong_Check(x))
+#if PY_MAJOR_VERSION < 3
+  if (likely(PyInt_Check(x) || PyLong_Check(x)))
 #else
-  if (PyLong_Check(x))
+  if (likely(PyLong_Check(x)))
 #endif
-    return Py_INCREF(x), x;
+    return __Pyx_NewRef(x);
+#if CYTHON_USE_TYPE_SLOTS
   m = Py_TYPE(x)->tp_as_number;
-#if PY_VERSION_HEX < 0x03000000
+  #if PY_MAJOR_VERSION < 3
   if (m && m->nb_int) {
     name = "int";
-    res = PyNumber_Int(x);
+    res = m->nb_int(x);
   }
   else if (m && m->nb_long) {
     name = "long";
-    res = PyNumber_Long(x);
+    res = m->nb_long(x);
   }
-#else
-  if (m && m->nb_int) {
+  #else
+  if (likely(m && m->nb_int)) {
     name = "int";
-    res = PyNumber_Long(x);
+    res = m->nb_int(x);
+  }
+  #endif
+#else
+  if (!PyBytes_CheckExact(x) && !PyUnicode_CheckExact(x)) {
+    res = PyNumber_Int(x);
   }
 #endif
-  if (res) {
-#if PY_VERSION_HEX < 0x03000000
-    if (!PyInt_Check(res) && !PyLong_Check(res)) {
+  if (likely(res)) {
+#if PY_MAJOR_VERSION < 3
+    if (unlikely(!PyInt_Check(res) && !PyLong_Check(res))) {
 #else
-    if (!PyLong_Check(res)) {
+    if (unlikely(!PyLong_CheckExact(res))) {
 #endif
-      PyErr_Format(PyExc_TypeError,
-                   "__%s__ returned non-%s (type %.200s)",
-                   name, name, Py_TYPE(res)->tp_name);
-      Py_DECREF(res);
-      return NULL;
+        return __Pyx_PyNumber_IntOrLongWrongResultType(res, name);
     }
   }
   else if (!PyErr_Occurred()) {
@@ -3102,40 +12828,90 @@ static CYTHON_INLINE PyObject* __Pyx_PyNumber_Int(PyObject* x) {
   }
   return res;
 }
-
 static CYTHON_INLINE Py_ssize_t __Pyx_PyIndex_AsSsize_t(PyObject* b) {
   Py_ssize_t ival;
-  PyObject* x = PyNumber_Index(b);
+  PyObject *x;
+#if PY_MAJOR_VERSION < 3
+  if (likely(PyInt_CheckExact(b))) {
+    if (sizeof(Py_ssize_t) >= sizeof(long))
+        return PyInt_AS_LONG(b);
+    else
+        return PyInt_AsSsize_t(b);
+  }
+#endif
+  if (likely(PyLong_CheckExact(b))) {
+    #if CYTHON_USE_PYLONG_INTERNALS
+    const digit* digits = ((PyLongObject*)b)->ob_digit;
+    const Py_ssize_t size = Py_SIZE(b);
+    if (likely(__Pyx_sst_abs(size) <= 1)) {
+        ival = likely(size) ? digits[0] : 0;
+        if (size == -1) ival = -ival;
+        return ival;
+    } else {
+      switch (size) {
+         case 2:
+           if (8 * sizeof(Py_ssize_t) > 2 * PyLong_SHIFT) {
+             return (Py_ssize_t) (((((size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+           }
+           break;
+         case -2:
+           if (8 * sizeof(Py_ssize_t) > 2 * PyLong_SHIFT) {
+             return -(Py_ssize_t) (((((size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+           }
+           break;
+         case 3:
+           if (8 * sizeof(Py_ssize_t) > 3 * PyLong_SHIFT) {
+             return (Py_ssize_t) (((((((size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+           }
+           break;
+         case -3:
+           if (8 * sizeof(Py_ssize_t) > 3 * PyLong_SHIFT) {
+             return -(Py_ssize_t) (((((((size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+           }
+           break;
+         case 4:
+           if (8 * sizeof(Py_ssize_t) > 4 * PyLong_SHIFT) {
+             return (Py_ssize_t) (((((((((size_t)digits[3]) << PyLong_SHIFT) | (size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+           }
+           break;
+         case -4:
+           if (8 * sizeof(Py_ssize_t) > 4 * PyLong_SHIFT) {
+             return -(Py_ssize_t) (((((((((size_t)digits[3]) << PyLong_SHIFT) | (size_t)digits[2]) << PyLong_SHIFT) | (size_t)digits[1]) << PyLong_SHIFT) | (size_t)digits[0]));
+           }
+           break;
+      }
+    }
+    #endif
+    return PyLong_AsSsize_t(b);
+  }
+  x = PyNumber_Index(b);
   if (!x) return -1;
   ival = PyInt_AsSsize_t(x);
   Py_DECREF(x);
   return ival;
 }
-
+static CYTHON_INLINE Py_hash_t __Pyx_PyIndex_AsHash_t(PyObject* o) {
+  if (sizeof(Py_hash_t) == sizeof(Py_ssize_t)) {
+    return (Py_hash_t) __Pyx_PyIndex_AsSsize_t(o);
+#if PY_MAJOR_VERSION < 3
+  } else if (likely(PyInt_CheckExact(o))) {
+    return PyInt_AS_LONG(o);
+#endif
+  } else {
+    Py_ssize_t ival;
+    PyObject *x;
+    x = PyNumber_Index(o);
+    if (!x) return -1;
+    ival = PyInt_AsLong(x);
+    Py_DECREF(x);
+    return ival;
+  }
+}
+static CYTHON_INLINE PyObject * __Pyx_PyBool_FromLong(long b) {
+  return b ? __Pyx_NewRef(Py_True) : __Pyx_NewRef(Py_False);
+}
 static CYTHON_INLINE PyObject * __Pyx_PyInt_FromSize_t(size_t ival) {
-#if PY_VERSION_HEX < 0x02050000
-   if (ival <= LONG_MAX)
-       return PyInt_FromLong((long)ival);
-   else {
-       unsigned char *bytes = (unsigned char *) &ival;
-       int one = 1; int little = (int)*(unsigned char*)&one;
-       return _PyLong_FromByteArray(bytes, sizeof(size_t), little, 0);
-   }
-#else
-   return PyInt_FromSize_t(ival);
-#endif
-}
-
-static CYTHON_INLINE size_t __Pyx_PyInt_AsSize_t(PyObject* x) {
-   unsigned PY_LONG_LONG val = __Pyx_PyInt_AsUnsignedLongLong(x);
-   if (unlikely(val == (unsigned PY_LONG_LONG)-1 && PyErr_Occurred())) {
-       return (size_t)-1;
-   } else if (unlikely(val != (unsigned PY_LONG_LONG)(size_t)val)) {
-       PyErr_SetString(PyExc_OverflowError,
-                       "value too large to convert to size_t");
-       return (size_t)-1;
-   }
-   return (size_t)val;
+    return PyInt_FromSize_t(ival);
 }
 
 
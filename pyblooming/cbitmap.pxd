@@ -0,0 +1,20 @@
+cdef class Bitmap:
+    cdef object fileobj
+    cdef size_t size
+    cdef int fileno
+    cdef unsigned char* mmap
+    cdef size_t* indices
+    cdef size_t indices_len
+    cdef unsigned char* dirty
+    cdef size_t page_shift
+    cdef readonly bint atomic
+
+    cdef int set_bit_array(self, size_t* indices, size_t n) except -1
+    cdef int test_bit_array(self, size_t* indices, size_t n) except -1
+    cdef void _set_array(self, size_t* indices, size_t n) nogil
+    cdef bint _test_array(self, size_t* indices, size_t n) nogil
+    cdef size_t _load_indices(self, indices) except? 0
+    cdef int _combine(self, other, size_t start, end, int op) except -1
+    cdef void _mark_dirty(self, size_t start, size_t end) nogil
+    cdef int _flush_dirty(self) nogil
+    cdef size_t _pages(self) nogil
@@ -1,19 +1,80 @@
 from libc cimport stdlib
+from libc.string cimport memcpy
+from libc.stdint cimport uint64_t, int64_t
+from libc.errno cimport errno
+from libc.string cimport memset
+from posix.unistd cimport sysconf, _SC_PAGESIZE
 cimport cython
 import os.path
 
+cdef extern from *:
+    int __builtin_popcount(unsigned int x) nogil
+    int __builtin_popcountll(unsigned long long x) nogil
+    unsigned char __atomic_exchange_n(unsigned char* ptr, unsigned char val, int order) nogil
+    unsigned char __atomic_fetch_or(unsigned char* ptr, unsigned char val, int order) nogil
+    unsigned char __atomic_fetch_and(unsigned char* ptr, unsigned char val, int order) nogil
+    int __ATOMIC_SEQ_CST
+    int __ATOMIC_RELAXED
+
+# The bitwise operations supported by _combine
+cdef enum:
+    OP_OR = 0
+    OP_AND = 1
+    OP_XOR = 2
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void combine_bytes(unsigned char* dst, unsigned char* src, size_t n, int op) nogil:
+    """
+    Combines n bytes of src into dst using a bitwise operation.
+    Works a 64 bit word at a time, with a byte loop for the tail.
+    """
+    cdef size_t i, words = n / 8
+    cdef uint64_t a, b
+    for i in range(words):
+        memcpy(&a, dst + i*8, 8)
+        memcpy(&b, src + i*8, 8)
+        if op == OP_OR: a = a | b
+        elif op == OP_AND: a = a & b
+        else: a = a ^ b
+        memcpy(dst + i*8, &a, 8)
+    for i in range(words*8, n):
+        if op == OP_OR: dst[i] = dst[i] | src[i]
+        elif op == OP_AND: dst[i] = dst[i] & src[i]
+        else: dst[i] = dst[i] ^ src[i]
+
 cdef extern from "cbitmaputil.h" nogil:
     cdef char* mmap_file(int filedes, size_t len, int map_private)
     cdef int mummap_file(char* addr, size_t len)
     cdef int flush(int filedes, char* addr, size_t len)
+    cdef int extend_file(int filedes, size_t len, int preallocate)
+    cdef int flush_range(int filedes, char* addr, size_t len)
+    cdef int advise_map(char* addr, size_t len, int advice)
+    cdef void prefetch_map(char* addr, size_t len)
+    cdef long long resident_bytes(char* addr, size_t len)
+    cdef int atomic_add_u64(int filedes, char* addr, size_t offset, int64_t delta, uint64_t* result)
+    cdef enum:
+        ADVICE_NORMAL
+        ADVICE_RANDOM
+        ADVICE_SEQUENTIAL
+        ADVICE_WILLNEED
+        ADVICE_HUGEPAGE
+
+# Maps the access pattern hints to the madvise() advice
+ADVICE = {
+    "normal": ADVICE_NORMAL,
+    "random": ADVICE_RANDOM,
+    "sequential": ADVICE_SEQUENTIAL,
+    "willneed": ADVICE_WILLNEED,
+    "hugepage": ADVICE_HUGEPAGE,
+}
 
 cdef class Bitmap:
-    cdef object fileobj
-    cdef size_t size
-    cdef int fileno
-    cdef unsigned char* mmap
+    # The number of bytes processed at a time by bulk operations
+    CHUNK_SIZE = 1 << 20
 
-    def __cinit__(self, length, filename=None, private=False):
+    def __cinit__(self, length, filename=None, private=False, preallocate=False,
+                  advice="willneed", populate=False, atomic=False):
         """
         Creates a new Bitmap object. Bitmap wraps a memory mapped
         file and allows bit-level operations to be performed.
@@ -26,10 +87,36 @@ cdef class Bitmap:
             is mapped using MAP_PRIVATE, making a private copy-on-write
             version of the memory mapped region. Otherwise, MAP_SHARED is used,
             and changes are reflected to other copies of the file.
+          - `preallocate` (optional) : Defaults to False. If True, the disk
+            space for a new file is allocated up front. Otherwise the file
+            is extended sparsely, and blocks are allocated as they are written.
+          - `advice` (optional) : Defaults to "willneed". The expected access
+            pattern, one of "normal", "random", "sequential", "willneed"
+            or "hugepage". Use "random" to disable readahead for lookups
+            on large files. "hugepage" is only supported for
+            anonymous bitmaps on Linux.
+          - `populate` (optional) : Defaults to False. If True, the whole
+            map is faulted in when opened. See prefetch().
+          - `atomic` (optional) : Defaults to False. If True, bits are set
+            with atomic operations, so that several threads, or processes
+            sharing the same file, can set bits without holding the GIL
+            and without losing writes. Can not be used with `private`.
+            See atomic_add().
         """
         # Check the length
         if length <= 0: raise ValueError, "Length must be positive!"
+        if advice not in ADVICE: raise ValueError, "Unknown advice %r!" % advice
+        if atomic and private: raise ValueError, "Atomic bitmaps can not be private!"
         self.size = length
+        self.atomic = atomic
+
+        # Track the modified pages with a bit per page
+        page_size = sysconf(_SC_PAGESIZE)
+        self.page_shift = 0
+        while (1 << self.page_shift) < page_size:
+            self.page_shift += 1
+        self.dirty = <unsigned char*>stdlib.calloc((self._pages() + 7) / 8, 1)
+        if self.dirty == NULL: raise MemoryError
 
         if not filename:
             # For anonymous mmaps, always use MAP_PRIVATE
@@ -43,12 +130,11 @@ cdef class Bitmap:
             self.fileobj = open(filename, "a+")
             self.fileno = self.fileobj.fileno()
 
-            # Zero-fill the file
-            size_diff = length - os.path.getsize(filename)
-            while size_diff > 0:
-                self.fileobj.write(chr(0) * min(size_diff, 100000))
-                self.fileobj.flush()
-                size_diff = length - os.path.getsize(filename)
+            # Extend the file, this reads back as zeros
+            if extend_file(self.fileno, self.size, 1 if preallocate else 0) == -1:
+                err = errno
+                self.fileobj.close()
+                raise OSError(err, "Failed to extend the file: %s" % os.strerror(err))
 
             # Create the memory mapped file
             priv = 1 if private else 0
@@ -57,6 +143,14 @@ cdef class Bitmap:
                 self.fileobj.close()
                 raise OSError, "Failed to memory map the file!"
 
+        # Set the access pattern, and warm up the map
+        try:
+            self.advise(advice)
+        except:
+            self.close(flush=False)
+            raise
+        if populate: self.prefetch()
+
     def __len__(self):
         "Returns the size of the Bitmap in bits"
         return 8 * self.size
@@ -74,22 +168,283 @@ cdef class Bitmap:
         Sets the value of a specific bit. The index must be an integer,
         but if val evaluates to True, the bit is set to 1, else 0.
         """
-        if val:
-            self.mmap[idx >> 3] = self.mmap[idx >> 3] | 1 << (7 - idx % 8)
+        cdef unsigned char mask = 1 << (7 - idx % 8)
+        if self.atomic:
+            if val:
+                __atomic_fetch_or(&self.mmap[idx >> 3], mask, __ATOMIC_RELAXED)
+            else:
+                __atomic_fetch_and(&self.mmap[idx >> 3], ~mask, __ATOMIC_RELAXED)
+        elif val:
+            self.mmap[idx >> 3] = self.mmap[idx >> 3] | mask
         else:
-            self.mmap[idx >> 3] = self.mmap[idx >> 3] & ~(1 << (7 - idx % 8))
+            self.mmap[idx >> 3] = self.mmap[idx >> 3] & ~mask
+        self._mark_dirty(idx >> 3, (idx >> 3) + 1)
+
+    def __dealloc__(self):
+        "Cleanup"
+        stdlib.free(self.indices)
+        stdlib.free(self.dirty)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef int set_bit_array(self, size_t* indices, size_t n) except -1:
+        """
+        Sets the value of many bits to 1, given a C array of indexes.
+        The indexes are not bounds checked. The GIL is held, since
+        the indexes are usually in a buffer shared by every thread.
+        """
+        if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+        self._set_array(indices, n)
+        return 0
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _set_array(self, size_t* indices, size_t n) nogil:
+        """
+        Sets the value of many bits to 1, given a C array of indexes.
+        The map must be open. Atomic bitmaps use an atomic OR per byte,
+        which is lock-free and needs no alignment. Otherwise the caller
+        must hold the GIL to avoid losing bits.
+        """
+        cdef size_t i, idx, page
+        cdef size_t shift = self.page_shift + 3
+        if self.atomic:
+            for i in range(n):
+                idx = indices[i]
+                __atomic_fetch_or(&self.mmap[idx >> 3], 1 << (7 - idx % 8), __ATOMIC_RELAXED)
+                page = idx >> shift
+                __atomic_fetch_or(&self.dirty[page >> 3], 1 << (page & 7), __ATOMIC_RELAXED)
+            return
+        for i in range(n):
+            idx = indices[i]
+            self.mmap[idx >> 3] = self.mmap[idx >> 3] | 1 << (7 - idx % 8)
+            page = idx >> shift
+            self.dirty[page >> 3] = self.dirty[page >> 3] | 1 << (page & 7)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef int test_bit_array(self, size_t* indices, size_t n) except -1:
+        """
+        Checks if all the bits are set, given a C array of indexes.
+        Returns 1 if they are, 0 otherwise. The indexes are not bounds checked.
+        """
+        if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+        return self._test_array(indices, n)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef bint _test_array(self, size_t* indices, size_t n) nogil:
+        """
+        Checks if all the bits are set, given a C array of
+        indexes. The map must be open. Safe to call without the GIL.
+        """
+        cdef size_t i, idx
+        for i in range(n):
+            idx = indices[i]
+            if not (self.mmap[idx >> 3] >> (7 - idx % 8)) & 0x1:
+                return 0
+        return 1
+
+    cdef size_t _load_indices(self, indices) except? 0:
+        """
+        Copies an iterable of indexes into our index buffer,
+        checking the bounds. Returns the number of indexes.
+        """
+        cdef size_t n, i = 0
+        cdef size_t idx
+        cdef size_t* resized
+        if not isinstance(indices, (list, tuple)):
+            indices = list(indices)
+        n = len(indices)
+
+        # Grow the buffer if needed
+        if n > self.indices_len:
+            resized = <size_t*>stdlib.realloc(self.indices, n*sizeof(size_t))
+            if resized == NULL: raise MemoryError
+            self.indices = resized
+            self.indices_len = n
+
+        for val in indices:
+            idx = val
+            if idx >= 8 * self.size: raise IndexError, "Bit index out of range!"
+            self.indices[i] = idx
+            i += 1
+        return n
+
+    def set_bits(self, indices):
+        """
+        Sets the value of many bits to 1. Takes an iterable
+        of integer indexes. This avoids a call per bit.
+        """
+        cdef size_t n = self._load_indices(indices)
+        self.set_bit_array(self.indices, n)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def get_bits(self, indices):
+        """
+        Gets the value of many bits. Takes an iterable of
+        integer indexes, and returns a list of the bit values.
+        """
+        cdef size_t n = self._load_indices(indices)
+        cdef size_t i, idx
+        if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+        for i in range(n):
+            idx = self.indices[i]
+            self.indices[i] = (self.mmap[idx >> 3] >> (7 - idx % 8)) & 0x1
+        return [self.indices[i] for i in range(n)]
+
+    def test_all(self, indices):
+        """
+        Checks if all of the bits are set. Takes an iterable of
+        integer indexes.
+        """
+        cdef size_t n = self._load_indices(indices)
+        return bool(self.test_bit_array(self.indices, n))
+
+    def atomic_add(self, size_t offset, int64_t delta):
+        """
+        Adds delta to the little endian 64 bit counter at a byte
+        offset, and returns the new value. The add is atomic with
+        respect to other atomic_add() calls on the same file, from
+        any process. Aligned counters use an atomic instruction,
+        others are protected by an fcntl() lock. The GIL is held,
+        since fcntl() locks do not exclude threads of one process.
+        """
+        cdef uint64_t result = 0
+        cdef int res
+        if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+        if offset + 8 > self.size: raise ValueError, "Bad offset!"
+        res = atomic_add_u64(self.fileno, <char*>self.mmap, offset, delta, &result)
+        if res == -1:
+            err = errno
+            raise OSError(err, "Failed to lock the counter: %s" % os.strerror(err))
+        if delta: self._mark_dirty(offset, offset + 8)
+        return result
+
+    def atomic_load(self, size_t offset):
+        "Returns the value of the counter at a byte offset. See atomic_add()"
+        return self.atomic_add(offset, 0)
 
-    def flush(self):
-        "Flushes the contents of the Bitmap to disk."
+    def advise(self, advice):
+        """
+        Advises the kernel of the expected access pattern. Takes
+        one of "normal", "random", "sequential", "willneed" or "hugepage".
+        """
+        if advice not in ADVICE: raise ValueError, "Unknown advice %r!" % advice
+        if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+        if advise_map(<char*>self.mmap, self.size, ADVICE[advice]) == -1:
+            err = errno
+            raise OSError(err, "Failed to call madvise(): %s" % os.strerror(err))
+
+    def prefetch(self):
+        """
+        Faults in the whole map, reading it from disk in bulk.
+        This avoids paying a page fault on the first access of
+        each page after a restart.
+        """
+        if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+        with nogil:
+            prefetch_map(<char*>self.mmap, self.size)
+
+    def resident_bytes(self):
+        """
+        Returns the number of bytes of the Bitmap which are
+        resident in memory, rounded up to whole pages.
+        """
+        cdef long long res
+        if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+        res = resident_bytes(<char*>self.mmap, self.size)
+        if res == -1:
+            err = errno
+            raise OSError(err, "Failed to call mincore(): %s" % os.strerror(err))
+        return min(res, self.size)
+
+    def flush(self, dirty_only=False):
+        """
+        Flushes the contents of the Bitmap to disk. If dirty_only
+        is True, only the pages modified since the last flush are
+        written, instead of syncing the whole map. If the sync fails,
+        the pages stay marked as modified for the next flush.
+        """
         cdef int flushres = 0
+        cdef bint only = dirty_only
         if self.mmap:
             with nogil:
-                flushres = flush(self.fileno, <char*>self.mmap, self.size)
+                if only:
+                    flushres = self._flush_dirty()
+                else:
+                    memset(self.dirty, 0, (self._pages() + 7) / 8)
+                    flushres = flush(self.fileno, <char*>self.mmap, self.size)
+                    if flushres == -1: self._mark_dirty(0, self.size)
             if flushres == -1:
                 raise OSError, "Failed to flush the buffers!"
         if self.fileobj: 
             self.fileobj.flush()
 
+    cdef int _flush_dirty(self) nogil:
+        """
+        Syncs each run of modified pages. The pages are cleared
+        before they are synced, a byte at a time with an atomic
+        exchange, so pages marked by a concurrent writer are kept
+        for the next flush. If a sync fails, the pages which were
+        cleared but not synced are marked again.
+        """
+        cdef size_t page = 0, start = 0, offset, end, mask_byte = 0, redo
+        cdef size_t pages = self._pages()
+        cdef unsigned char mask = 0
+        cdef bint in_run = 0
+        while page <= pages:
+            if page < pages and page & 7 == 0:
+                if not in_run and self.dirty[page >> 3] == 0:
+                    page += 8
+                    continue
+                mask_byte = page >> 3
+                mask = __atomic_exchange_n(&self.dirty[mask_byte], 0, __ATOMIC_SEQ_CST)
+
+            # Extend the current run, or sync it when it ends
+            if page < pages and mask & (1 << (page & 7)):
+                if not in_run: start = page
+                in_run = 1
+            elif in_run:
+                in_run = 0
+                offset = start << self.page_shift
+                end = min(page << self.page_shift, self.size)
+                if flush_range(self.fileno, <char*>self.mmap + offset, end - offset) == -1:
+                    for redo in range(start, page):
+                        __atomic_fetch_or(&self.dirty[redo >> 3], 1 << (redo & 7), __ATOMIC_RELAXED)
+                    __atomic_fetch_or(&self.dirty[mask_byte], mask, __ATOMIC_RELAXED)
+                    return -1
+            page += 1
+        return 0
+
+    def dirty_bytes(self):
+        """
+        Returns the number of bytes in the pages modified
+        since the last flush. This is what flush(dirty_only=True)
+        would write.
+        """
+        cdef size_t page, count = 0
+        cdef size_t pages = self._pages()
+        for page in range(pages):
+            if self.dirty[page >> 3] & (1 << (page & 7)):
+                count += min((page + 1) << self.page_shift, self.size) - (page << self.page_shift)
+        return count
+
+    cdef void _mark_dirty(self, size_t start, size_t end) nogil:
+        "Marks the pages covering the bytes from start to end as modified"
+        cdef size_t page
+        if end <= start: return
+        for page in range(start >> self.page_shift, ((end - 1) >> self.page_shift) + 1):
+            if self.atomic:
+                __atomic_fetch_or(&self.dirty[page >> 3], 1 << (page & 7), __ATOMIC_RELAXED)
+            else:
+                self.dirty[page >> 3] = self.dirty[page >> 3] | 1 << (page & 7)
+
+    cdef size_t _pages(self) nogil:
+        "Returns the number of pages in the map"
+        return (self.size + (1 << self.page_shift) - 1) >> self.page_shift
+
     def close(self, flush=True):
         "Closes the Bitmap, flushing the data if requried."
         # Safety first!
@@ -120,5 +475,135 @@ cdef class Bitmap:
         cdef int x
         for x in xrange(size):
             self.mmap[i+x] = val[x]
+        self._mark_dirty(i, j)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def popcount(self, size_t start=0, end=None):
+        """
+        Returns the number of bits set to 1. Optionally restricted
+        to the bytes from start to end.
+        """
+        cdef size_t stop = self.size if end is None else end
+        cdef size_t i, words, count = 0
+        cdef unsigned char* base
+        cdef uint64_t word
+        if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+        if start > stop or stop > self.size: raise ValueError, "Bad range!"
+
+        base = self.mmap + start
+        words = (stop - start) / 8
+        with nogil:
+            for i in range(words):
+                memcpy(&word, base + i*8, 8)
+                count += __builtin_popcountll(word)
+            for i in range(words*8, stop - start):
+                count += __builtin_popcount(base[i])
+        return count
+
+    def clear(self, size_t start=0, end=None):
+        """
+        Sets every bit to 0. Optionally restricted
+        to the bytes from start to end.
+        """
+        cdef size_t stop = self.size if end is None else end
+        if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+        if start > stop or stop > self.size: raise ValueError, "Bad range!"
+        with nogil:
+            memset(self.mmap + start, 0, stop - start)
+            self._mark_dirty(start, stop)
+
+    def copy(self):
+        "Returns a copy of the Bitmap, using an anonymous map"
+        cdef Bitmap other = Bitmap(self.size)
+        if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+        with nogil:
+            memcpy(other.mmap, self.mmap, self.size)
+        return other
+
+    def union_update(self, other, size_t start=0, end=None):
+        """
+        Sets each bit to the OR of itself and the same bit in the
+        other Bitmap. Optionally restricted to the bytes from start to end.
+        """
+        self._combine(other, start, end, OP_OR)
+        return self
+
+    def intersection_update(self, other, size_t start=0, end=None):
+        """
+        Sets each bit to the AND of itself and the same bit in the
+        other Bitmap. Optionally restricted to the bytes from start to end.
+        """
+        self._combine(other, start, end, OP_AND)
+        return self
+
+    def symmetric_difference_update(self, other, size_t start=0, end=None):
+        """
+        Sets each bit to the XOR of itself and the same bit in the
+        other Bitmap. Optionally restricted to the bytes from start to end.
+        """
+        self._combine(other, start, end, OP_XOR)
+        return self
+
+    cdef int _combine(self, other, size_t start, end, int op) except -1:
+        """
+        Combines the bytes from start to end with the other Bitmap.
+        If the other Bitmap is a C Bitmap, the maps are combined
+        directly, otherwise chunks of it are copied out.
+        """
+        cdef size_t stop = self.size if end is None else end
+        cdef size_t i, j
+        cdef unsigned char* src
+        if self.mmap == NULL: raise ValueError, "Bitmap is closed!"
+        if start > stop or stop > self.size or stop > len(other) / 8:
+            raise ValueError, "Bad range!"
+
+        if isinstance(other, Bitmap):
+            src = (<Bitmap>other).mmap
+            if src == NULL: raise ValueError, "Bitmap is closed!"
+            with nogil:
+                combine_bytes(self.mmap + start, src + start, stop - start, op)
+                self._mark_dirty(start, stop)
+            return 0
+
+        for i in range(start, stop, self.CHUNK_SIZE):
+            j = min(i + self.CHUNK_SIZE, stop)
+            chunk = other[i:j]
+            src = <unsigned char*><char*>chunk
+            combine_bytes(self.mmap + i, src, j - i, op)
+        self._mark_dirty(start, stop)
+        return 0
+
+    def _check_size(self, other):
+        "Checks that the other Bitmap has the same size"
+        if len(other) != len(self): raise ValueError, "Bitmaps must have the same size!"
+
+    def __ior__(self, other):
+        self._check_size(other)
+        return self.union_update(other)
+
+    def __iand__(self, other):
+        self._check_size(other)
+        return self.intersection_update(other)
+
+    def __ixor__(self, other):
+        self._check_size(other)
+        return self.symmetric_difference_update(other)
+
+    def __or__(self, other):
+        # Cython may call this with the operands swapped
+        if not isinstance(self, Bitmap): return NotImplemented
+        self._check_size(other)
+        return self.copy().union_update(other)
 
+    def __and__(self, other):
+        # Cython may call this with the operands swapped
+        if not isinstance(self, Bitmap): return NotImplemented
+        self._check_size(other)
+        return self.copy().intersection_update(other)
 
+    def __xor__(self, other):
+        # Cython may call this with the operands swapped
+        if not isinstance(self, Bitmap): return NotImplemented
+        self._check_size(other)
+        return self.copy().symmetric_difference_update(other)
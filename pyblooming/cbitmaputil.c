@@ -1,7 +1,12 @@
 #include <stdlib.h>
 #include <unistd.h>
 #include <stdio.h>
+#include <errno.h>
+#include <fcntl.h>
 #include <sys/mman.h>
+#include <sys/stat.h>
+#include <string.h>
+#include "cbitmaputil.h"
 
 /**
  * Helper to memory map open file descriptors.
@@ -37,14 +42,86 @@ char* mmap_file(int filedes, size_t len, int map_private) {
         perror("Failed to mmap");
         return 0;
     }
+    return addr;
+}
 
-    // Fault the memory in 
-    int res = madvise(addr, len, MADV_WILLNEED);
-    if (res != 0) {
-        perror("Failed to call madvise()");
+/**
+ * Helper to advise the kernel of the access pattern of a memory map.
+ * @arg addr The address of the memory mapped region
+ * @arg len The length of bytes of the mmap region
+ * @arg advice One of the ADVICE_* values
+ * @returns -1 on error and sets errno, 0 on success
+ */
+int advise_map(char* addr, size_t len, int advice) {
+    int flag;
+    switch (advice) {
+        case ADVICE_NORMAL:
+            flag = MADV_NORMAL;
+            break;
+        case ADVICE_RANDOM:
+            flag = MADV_RANDOM;
+            break;
+        case ADVICE_SEQUENTIAL:
+            flag = MADV_SEQUENTIAL;
+            break;
+        case ADVICE_WILLNEED:
+            flag = MADV_WILLNEED;
+            break;
+#ifdef MADV_HUGEPAGE
+        case ADVICE_HUGEPAGE:
+            flag = MADV_HUGEPAGE;
+            break;
+#endif
+        default:
+            errno = EINVAL;
+            return -1;
     }
+    return madvise(addr, len, flag);
+}
 
-    return addr;
+/**
+ * Helper to fault in the pages of a memory map, so
+ * that later accesses do not block on the disk.
+ * @arg addr The address of the memory mapped region
+ * @arg len The length of bytes of the mmap region
+ */
+void prefetch_map(char* addr, size_t len) {
+    // Start the reads in bulk, then touch every page
+    madvise(addr, len, MADV_WILLNEED);
+    size_t page = sysconf(_SC_PAGESIZE);
+    volatile char sum = 0;
+    for (size_t i=0; i < len; i += page) {
+        sum ^= addr[i];
+    }
+}
+
+/**
+ * Helper to count the bytes of a memory map which are
+ * resident in memory. Counts whole pages.
+ * @arg addr The address of the memory mapped region
+ * @arg len The length of bytes of the mmap region
+ * @returns -1 on error and sets errno, else the number of bytes.
+ */
+long long resident_bytes(char* addr, size_t len) {
+    size_t page = sysconf(_SC_PAGESIZE);
+    size_t pages = (len + page - 1) / page;
+#ifdef __APPLE__
+    char* vec = malloc(pages);
+#else
+    unsigned char* vec = malloc(pages);
+#endif
+    if (!vec) return -1;
+    if (mincore(addr, len, vec) == -1) {
+        free(vec);
+        return -1;
+    }
+
+    long long resident = 0;
+    for (size_t i=0; i < pages; i++) {
+        if (vec[i] & 1) resident += page;
+    }
+    free(vec);
+    return resident;
 }
 
 /**
@@ -81,3 +158,103 @@ int flush(int filedes, char* addr, size_t len) {
     return 0;
 }
 
+
+/**
+ * Helper to extend a file to a given length. The file
+ * is never shrunk.
+ * @arg filedes The file descriptor of the file
+ * @arg len The length in bytes the file should have
+ * @arg preallocate If set, the blocks are allocated on disk,
+ * otherwise the file is extended sparsely.
+ * @returns -1 on error and sets errno, 0 on success
+ */
+int extend_file(int filedes, size_t len, int preallocate) {
+    struct stat buf;
+    int res = fstat(filedes, &buf);
+    if (res == -1) return -1;
+    if ((size_t)buf.st_size >= len) return 0;
+
+    if (preallocate) {
+#ifdef __APPLE__
+        // No posix_fallocate, reserve the space and then set the length
+        fstore_t store = {F_ALLOCATEALL, F_PEOFPOSMODE, 0, len - buf.st_size, 0};
+        if (fcntl(filedes, F_PREALLOCATE, &store) == -1) {
+            store.fst_flags = F_ALLOCATEALL;
+            if (fcntl(filedes, F_PREALLOCATE, &store) == -1) return -1;
+        }
+#else
+        // posix_fallocate returns the error instead of setting errno
+        res = posix_fallocate(filedes, 0, len);
+        if (res != 0) {
+            errno = res;
+            return -1;
+        }
+        return 0;
+#endif
+    }
+
+    return ftruncate(filedes, len);
+}
+
+/**
+ * Helper to flush part of a memory mapped file. Unlike
+ * flush, this does not fsync the whole file.
+ * @arg filedes The file descriptor under the mmap file, -1 for anonymous
+ * @arg addr The address of the range, must be page aligned
+ * @arg len The length of bytes of the range
+ * @returns -1 on error, 0 on success
+ */
+int flush_range(int filedes, char* addr, size_t len) {
+    // Don't bother if there is no file backing
+    if (filedes == -1)
+        return 0;
+    return msync(addr, len, MS_SYNC);
+}
+
+/**
+ * Helper to add to a little endian 64 bit counter in a memory
+ * map, which may be shared with other processes. If the counter is
+ * aligned and the host is little endian, an atomic add is used.
+ * Otherwise, an fcntl lock on the bytes of the counter is held.
+ * @arg filedes The file descriptor under the mmap file, -1 for anonymous
+ * @arg addr The address of the memory mapped region
+ * @arg offset The byte offset of the counter
+ * @arg delta The amount to add
+ * @arg result Set to the new value of the counter
+ * @returns -1 on error and sets errno, 0 on success
+ */
+int atomic_add_u64(int filedes, char* addr, size_t offset, int64_t delta, uint64_t* result) {
+#if defined(__BYTE_ORDER__) && __BYTE_ORDER__ == __ORDER_LITTLE_ENDIAN__
+    if ((((uintptr_t)addr) + offset) % 8 == 0) {
+        *result = __atomic_add_fetch((uint64_t*)(addr + offset), (uint64_t)delta, __ATOMIC_SEQ_CST);
+        return 0;
+    }
+#endif
+
+    // Lock the counter if it is backed by a file
+    struct flock lock;
+    memset(&lock, 0, sizeof(lock));
+    lock.l_type = F_WRLCK;
+    lock.l_whence = SEEK_SET;
+    lock.l_start = offset;
+    lock.l_len = 8;
+    if (filedes != -1 && fcntl(filedes, F_SETLKW, &lock) == -1) return -1;
+
+    // Decode, add and encode as little endian
+    unsigned char* bytes = (unsigned char*)(addr + offset);
+    uint64_t val = 0;
+    for (int i=7; i >= 0; i--) {
+        val = (val << 8) | bytes[i];
+    }
+    val += (uint64_t)delta;
+    for (int i=0; i < 8; i++) {
+        bytes[i] = (val >> (8 * i)) & 0xff;
+    }
+    *result = val;
+
+    if (filedes != -1) {
+        lock.l_type = F_UNLCK;
+        if (fcntl(filedes, F_SETLK, &lock) == -1) return -1;
+    }
+    return 0;
+}
@@ -4,6 +4,18 @@
 #ifndef CBITMAP_H
 #define CBITMAP_H
 
+#include <stddef.h>
+#include <stdint.h>
+
+/**
+ * The access pattern hints supported by advise_map
+ */
+#define ADVICE_NORMAL 0
+#define ADVICE_RANDOM 1
+#define ADVICE_SEQUENTIAL 2
+#define ADVICE_WILLNEED 3
+#define ADVICE_HUGEPAGE 4
+
 /**
  * Helper to memory map open file descriptors.
  * @arg filedes The file descriptor to mmap in. -1 for anonymous.
@@ -21,6 +33,32 @@ char* mmap_file(int filedes, size_t len, int map_private);
  */
 int mummap_file(char* addr, size_t len);
 
+/**
+ * Helper to advise the kernel of the access pattern of a memory map.
+ * @arg addr The address of the memory mapped region
+ * @arg len The length of bytes of the mmap region
+ * @arg advice One of the ADVICE_* values
+ * @returns -1 on error and sets errno, 0 on success
+ */
+int advise_map(char* addr, size_t len, int advice);
+
+/**
+ * Helper to fault in the pages of a memory map, so
+ * that later accesses do not block on the disk.
+ * @arg addr The address of the memory mapped region
+ * @arg len The length of bytes of the mmap region
+ */
+void prefetch_map(char* addr, size_t len);
+
+/**
+ * Helper to count the bytes of a memory map which are
+ * resident in memory. Counts whole pages.
+ * @arg addr The address of the memory mapped region
+ * @arg len The length of bytes of the mmap region
+ * @returns -1 on error and sets errno, else the number of bytes.
+ */
+long long resident_bytes(char* addr, size_t len);
+
 /**
  * Helper to flush memory mapped files 
  * @arg filedes The file descriptor under the mmap file, -1 for anonymous
@@ -30,4 +68,39 @@ int mummap_file(char* addr, size_t len);
  */
 int flush(int filedes, char* addr, size_t len);
 
+/**
+ * Helper to extend a file to a given length. The file
+ * is never shrunk.
+ * @arg filedes The file descriptor of the file
+ * @arg len The length in bytes the file should have
+ * @arg preallocate If set, the blocks are allocated on disk,
+ * otherwise the file is extended sparsely.
+ * @returns -1 on error and sets errno, 0 on success
+ */
+int extend_file(int filedes, size_t len, int preallocate);
+
+/**
+ * Helper to flush part of a memory mapped file. Unlike
+ * flush, this does not fsync the whole file.
+ * @arg filedes The file descriptor under the mmap file, -1 for anonymous
+ * @arg addr The address of the range, must be page aligned
+ * @arg len The length of bytes of the range
+ * @returns -1 on error, 0 on success
+ */
+int flush_range(int filedes, char* addr, size_t len);
+
+/**
+ * Helper to add to a little endian 64 bit counter in a memory
+ * map, which may be shared with other processes. If the counter is
+ * aligned and the host is little endian, an atomic add is used.
+ * Otherwise, an fcntl lock on the bytes of the counter is held.
+ * @arg filedes The file descriptor under the mmap file, -1 for anonymous
+ * @arg addr The address of the memory mapped region
+ * @arg offset The byte offset of the counter
+ * @arg delta The amount to add
+ * @arg result Set to the new value of the counter
+ * @returns -1 on error and sets errno, 0 on success
+ */
+int atomic_add_u64(int filedes, char* addr, size_t offset, int64_t delta, uint64_t* result);
+
 #endif
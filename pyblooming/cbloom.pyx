@@ -4,29 +4,126 @@ the bitmap implementation.
 """
 from libc cimport stdlib
 import operator
+import binascii
 import math
+import os.path
 import struct
 import cbitmap as bitmaplib
+from cbitmap cimport Bitmap as CBitmap
+import hashing
 cimport cython
+from libc.stdint cimport uint32_t, uint64_t, int64_t
+
+cdef extern from "hashutil.h" nogil:
+    cdef void murmur3_128(const void* key, size_t len, uint32_t seed, uint64_t* out)
+    cdef uint64_t int_hash(uint64_t key, uint32_t i)
+
+cdef extern from "Python.h":
+    int PyObject_AsReadBuffer(object obj, const void** buf, Py_ssize_t* buf_len) except -1
+
+# The hash engine ids and index modes, these must match the hashing module
+cdef enum:
+    ENGINE_LEGACY = 0
+    ENGINE_MURMUR3 = 1
+cdef enum:
+    INDEX_INDEPENDENT = 0
+    INDEX_DOUBLE = 1
+
+# The operations supported by the batch paths
+cdef enum:
+    BATCH_TEST = 0
+    BATCH_ADD = 1
+    BATCH_ADD_NEW = 2
+
+cdef object _key_data(key, char** raw, size_t* length, uint64_t* value, bint legacy):
+    """
+    Finds the data hashed for a key, see hashing.key_bytes. For integer
+    keys, value is set and raw is NULL. Otherwise raw and length are set,
+    and the object owning the data is returned. It must be kept alive
+    while raw is used. For the legacy engine, unicode keys are hashed
+    by code point. Those above 255 are stored as 32 bit code points, which
+    is flagged by setting value to 1, and value is 0 for other data.
+    """
+    cdef const void* buf
+    cdef Py_ssize_t buf_len
+    value[0] = 0
+    if type(key) is str:
+        raw[0] = key
+        length[0] = len(key)
+        return key
+    if isinstance(key, (int, long)):
+        if key < 0: value[0] = <uint64_t><int64_t>key
+        else: value[0] = <uint64_t>key
+        raw[0] = NULL
+        return None
+
+    if isinstance(key, unicode) and legacy:
+        try:
+            key = key.encode("latin-1")
+        except UnicodeEncodeError:
+            key = struct.pack("<%dI" % len(key), *[ord(c) for c in key])
+            value[0] = 1
+    elif isinstance(key, unicode): key = key.encode(hashing.KEY_ENCODING)
+    elif isinstance(key, memoryview): key = key.tobytes()
+    elif key is None: raise TypeError, "Keys can not be None!"
+    PyObject_AsReadBuffer(key, &buf, &buf_len)
+    raw[0] = <char*>buf
+    length[0] = buf_len
+    return key
+
 
 cdef class BloomFilter:
     # This is the packing format we use to store the count
     SIZE_FMT = "<Q"
-    K_NUM_FMT = "<I"
+
+    # The k num is packed with the hash engine id and index mode. Filters
+    # created before hash engines have a 0 engine, e.g. HASH_LEGACY,
+    # and a 0 index mode, e.g. INDEX_INDEPENDENT.
+    K_NUM_FMT = "<HBB"
 
     # This is how many bytes we need to store the count
     SIZE_LEN = 8
     K_NUM_LEN = 4
 
+    # Filters created with a header describe themselves, so they can be
+    # opened from a path alone. The header is stored after the bits, so bit
+    # positions start at 0 in both formats. It holds the magic, version, k,
+    # hash engine, index mode, layout id and bit size, then a CRC32 of those
+    # fields, and the count at HEADER_COUNT_OFFSET, which is 8 byte aligned.
+    HEADER_MAGIC = "PYBLOOM\x00"
+    HEADER_VERSION = 1
+    HEADER_FMT = "<8sHHBBBxQ"
+    HEADER_FIELDS_LEN = 24
+    HEADER_CHECKSUM_FMT = "<I"
+    HEADER_COUNT_OFFSET = 32
+    HEADER_LEN = 64
+
+    # How bits are assigned to keys, filters can only be
+    # merged if they have the same layout
+    LAYOUT = "partitioned"
+    LAYOUT_ID = 0
+
+    # This is how many keys the batch paths hash and probe at a time
+    BATCH_KEYS = 4096
+
     cdef public object info
     cdef public object bitmap
     cdef readonly unsigned int k_num
-    cdef size_t bitmap_size
+    cdef readonly unsigned int hash_engine
+    cdef readonly unsigned int index_mode
+    cdef readonly size_t bitmap_size
+    cdef readonly size_t count_offset
+    cdef readonly bint header
     cdef size_t count
+    cdef readonly bint shared
+    cdef readonly bint threadsafe
     cdef size_t* hashes
+    cdef size_t hashes_len
+    cdef size_t* positions
     cdef readonly size_t offset
 
-    def __cinit__(self, bitmap, k):
+    def __cinit__(self, bitmap, k, hash_engine=None, index_mode=None, shared=False, threadsafe=False,
+                  header=False):
         """
         Creates a new Bloom Filter instance. A bloom filter
         requires a bitmap underneath.
@@ -36,33 +133,91 @@ cdef class BloomFilter:
             store the additional meta data. extra_buffers() should be used to
             determine the amount of additional padding.
           - k : The number of hashing algorithms to
-            use. Must be at least 1.
+            use. Must be at least 1. May be None if the bitmap
+            already contains a filter.
+          - hash_engine (optional) : The id of the hash engine to use,
+            from the hashing module. Defaults to hashing.DEFAULT_ENGINE.
+            Like k, this is ignored if the bitmap already contains a filter.
+          - index_mode (optional) : How the k hashes are derived, from
+            the hashing module. INDEX_INDEPENDENT computes k independent
+            hashes, while INDEX_DOUBLE hashes the key once and derives
+            the k hashes using double hashing. Defaults to
+            hashing.DEFAULT_INDEX_MODE. Like k, this is ignored if the
+            bitmap already contains a filter.
+          - shared (optional) : If True, the filter can be written by
+            several processes at once. The bitmap must be atomic, and the
+            count is kept in the bitmap with atomic_add() instead of being
+            written by flush(). See the README for how to open the filter
+            from other processes.
+          - threadsafe (optional) : If True, the filter can be used by
+            several threads at once. The bitmap must be atomic, which lets
+            add_many() set bits without holding the GIL. Lookups and
+            contains_many() are always safe to use from several threads.
+          - header (optional) : If True, a new filter is written with a
+            header describing it, so it can be reopened with open().
+            Existing filters are read in the format they were written in.
         """
-        if bitmap is None or k is None: raise ValueError, "Must provide bitmap and k!"
-        if k < 1: raise ValueError, "Bad value provided for k!"
+        if bitmap is None: raise ValueError, "Must provide bitmap!"
+        if shared and not getattr(bitmap, "atomic", False):
+            raise ValueError, "Shared filters require an atomic bitmap!"
+        if threadsafe and not getattr(bitmap, "atomic", False):
+            raise ValueError, "Thread safe filters require an atomic bitmap!"
+        if k is not None and (k < 1 or k > 0xffff): raise ValueError, "Bad value provided for k!"
+        if hash_engine is None: hash_engine = hashing.DEFAULT_ENGINE
+        if hash_engine not in hashing.ENGINES: raise ValueError, "Unknown hash engine!"
+        if index_mode is None: index_mode = hashing.DEFAULT_INDEX_MODE
+        if index_mode not in hashing.INDEX_MODES: raise ValueError, "Unknown index mode!"
         self.bitmap = bitmap
-        self.bitmap_size = len(bitmap) - 8*self.extra_buffer() # Ignore our size
-        if self.bitmap_size <= 0: raise ValueError, "Bitmap is not large enough!"
-
-        # Restore the k num if we need to
-        self.k_num = self._read_k_num() # Read the existing knum from the file
+        self.shared = shared
+        self.threadsafe = threadsafe
+        if len(bitmap) <= 8*self.extra_buffer(): raise ValueError, "Bitmap is not large enough!"
+
+        # Restore the k num, hash engine and index mode if we need to
+        fields = self._read_header()
+        if fields is not None:
+            self.header = True
+            self.k_num, self.hash_engine, self.index_mode, self.bitmap_size = fields
+        else:
+            self.header = False
+            self.bitmap_size = len(bitmap) - 8*self.extra_buffer() # Ignore our size
+            self.k_num, self.hash_engine, self.index_mode = self._read_k_num() # Read the existing knum from the file
         if self.k_num == 0:
+            if k is None: raise ValueError, "Bitmap does not contain a filter, must provide k!"
             self.k_num = k
-            self._write_k_num()
+            self.hash_engine = hash_engine
+            self.index_mode = index_mode
+            if header:
+                self.header = True
+                if len(bitmap) <= 8*self.HEADER_LEN: raise ValueError, "Bitmap is not large enough!"
+                self.bitmap_size = len(bitmap) - 8*self.HEADER_LEN
+                self._write_header()
+            else:
+                self._write_k_num()
+        elif self.hash_engine not in hashing.ENGINES:
+            raise ValueError, "Bitmap uses an unknown hash engine!"
+        elif self.index_mode not in hashing.INDEX_MODES:
+            raise ValueError, "Bitmap uses an unknown index mode!"
     
         # Store a buffer for our hashes
-        self.hashes = <size_t*>stdlib.malloc(self.k_num*8*sizeof(size_t))
+        self.hashes_len = self.k_num*8
+        self.hashes = <size_t*>stdlib.malloc(self.hashes_len*sizeof(size_t))
+        if self.hashes == NULL: raise MemoryError
+        self.positions = <size_t*>stdlib.malloc(self.k_num*sizeof(size_t))
+        if self.positions == NULL: raise MemoryError
 
         # Compute the offset size
         self.offset = self.bitmap_size / self.k_num
 
         # Restore the count
+        self.count_offset = self.bitmap_size / 8
+        if self.header: self.count_offset += self.HEADER_COUNT_OFFSET
         self.count = self._read_count() # Read the count from the file
         self.info = {} # Allows dynamic properties
 
     def __dealloc__(self):
         "Cleanup"
         stdlib.free(self.hashes)
+        stdlib.free(self.positions)
 
     @classmethod
     def extra_buffer(cls):
@@ -72,7 +227,7 @@ cdef class BloomFilter:
         return cls.SIZE_LEN + cls.K_NUM_LEN
 
     @classmethod
-    def for_capacity(cls, capacity, probability):
+    def for_capacity(cls, capacity, probability, hash_engine=None, index_mode=None):
         """
         Creates a new bloom filter that computes the
         size required for the given capacity and probability,
@@ -80,22 +235,64 @@ cdef class BloomFilter:
         """
         bytes, ideal_k = cls.params_for_capacity(capacity, probability)
         bitmap = bitmaplib.Bitmap(bytes)
-        return BloomFilter(bitmap, ideal_k)
+        return BloomFilter(bitmap, ideal_k, hash_engine, index_mode)
 
     @classmethod
-    def params_for_capacity(cls, capacity, probability):
+    def params_for_capacity(cls, capacity, probability, header=False):
         """
         Returns the number of bytes and ideal K value that
         should be used to create a Bloom Filter for the given
-        capacity and probability.
+        capacity and probability. If header is True, the size is
+        for a filter with a header, with the count aligned.
         """
         # Get the number of bytes and bits
         bytes = cls.required_bytes(capacity, probability)
         bits = bytes*8 # The bytes may round up, so get the bits again
         ideal_k = cls.ideal_k(bits, capacity)
         ideal_k = int(math.ceil(ideal_k))
+        if header: return cls.header_length(bytes), ideal_k
         return bytes+cls.extra_buffer(), ideal_k
 
+    @classmethod
+    def header_length(cls, bytes):
+        """
+        Returns the length of a bitmap with a header, given the
+        bytes used for bits. The bits are padded to 8 bytes, so
+        the count can be updated with an atomic add.
+        """
+        return bytes + (-bytes % 8) + cls.HEADER_LEN
+
+    @classmethod
+    def create(cls, filename, capacity, probability, hash_engine=None, index_mode=None,
+               shared=False, threadsafe=False, **kwargs):
+        """
+        Creates a new file backed filter with a header for the given
+        capacity and probability, so it can be reopened with open().
+        If the file already contains a filter, it is opened instead.
+        Any other keyword arguments are passed to the Bitmap.
+        """
+        bytes, ideal_k = cls.params_for_capacity(capacity, probability, header=True)
+        if shared or threadsafe: kwargs.setdefault("atomic", True)
+        bitmap = bitmaplib.Bitmap(bytes, filename, **kwargs)
+        return cls(bitmap, ideal_k, hash_engine, index_mode, shared=shared,
+                   threadsafe=threadsafe, header=True)
+
+    @classmethod
+    def open(cls, filename, shared=False, threadsafe=False, **kwargs):
+        """
+        Opens an existing filter from a file, using the size of the file.
+        This works for files with a header, and for legacy files whose
+        size is the bitmap length. Any other keyword arguments are
+        passed to the Bitmap.
+        """
+        if shared or threadsafe: kwargs.setdefault("atomic", True)
+        bitmap = bitmaplib.Bitmap(os.path.getsize(filename), filename, **kwargs)
+        try:
+            return cls(bitmap, None, shared=shared, threadsafe=threadsafe)
+        except:
+            bitmap.close(flush=False)
+            raise
+
     @classmethod
     def required_bits(cls, capacity, prob):
         """
@@ -135,17 +332,94 @@ cdef class BloomFilter:
         """
         return math.log(2) * bits / capacity
 
+    cdef int _compute_hashes(self, key, unsigned int k) except -1:
+        """
+        Generates k hashes for a key into the hash buffer.
+        The hash buffer must have room for k hashes, rounded up to 4.
+        """
+        cdef char* raw
+        cdef size_t length = 0
+        cdef uint64_t value = 0
+        owner = _key_data(key, &raw, &length, &value, self.hash_engine != ENGINE_MURMUR3)
+        self._hash_key(raw, length, value, k, self.hashes)
+        return 0
+
+    cdef void _hash_key(self, char* key, size_t length, uint64_t value, unsigned int k, size_t* out) nogil:
+        """
+        Generates k hashes for a key using our hash engine and index mode.
+        If key is NULL, the integer key value is hashed instead. Otherwise
+        value flags code point keys for the legacy engine, see _key_data.
+        The output must have room for k hashes, rounded up to 4.
+        """
+        cdef unsigned int base = k
+        cdef unsigned int i
+        cdef size_t h1, h2
+
+        # Only compute the two base hashes for double hashing
+        if self.index_mode == INDEX_DOUBLE:
+            base = 2
+
+        if key == NULL:
+            for i from 0 <= i < base:
+                out[i] = int_hash(value, i)
+        elif self.hash_engine == ENGINE_MURMUR3:
+            self._compute_murmur3(key, length, base, out)
+        else:
+            self._compute_legacy(key, length, value == 1, base, out)
+
+        # Derive the k hashes as h1 + i*h2
+        if self.index_mode == INDEX_DOUBLE:
+            h1 = out[0]
+            h2 = out[1]
+            for i from 0 <= i < k:
+                out[i] = h1 + i*h2
+
+    cdef int _reserve_hashes(self, unsigned int k) except -1:
+        "Grows the hash buffer to have room for k hashes"
+        cdef size_t* resized
+        if k + 4 <= self.hashes_len: return 0
+        resized = <size_t*>stdlib.realloc(self.hashes, (k+4)*sizeof(size_t))
+        if resized == NULL: raise MemoryError
+        self.hashes = resized
+        self.hashes_len = k+4
+        return 0
+
+    cdef int _load_hashes(self, hashes) except -1:
+        "Copies the hashes for a key into the hash buffer"
+        cdef unsigned int i
+        if len(hashes) < self.k_num: raise ValueError, "Not enough hashes provided!"
+        for i from 0 <= i < self.k_num:
+            self.hashes[i] = hashes[i]
+        return 0
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    cdef void _compute_hashes(self, char* key):
-        "Generates a specified number of hashes for a key"
+    cdef void _compute_murmur3(self, char* key, size_t length, unsigned int k, size_t* out) nogil:
+        "Generates k hashes for a key, two per round of MurmurHash3"
+        cdef uint64_t res[2]
+        cdef uint32_t i, rounds = (k + 1) / 2
+
+        for i from 0 <= i < rounds:
+            murmur3_128(key, length, i, res)
+            out[i*2] = res[0]
+            out[i*2+1] = res[1]
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _compute_legacy(self, char* key, size_t length, bint wide, unsigned int k, size_t* out) nogil:
+        """
+        Generates k hashes for a key, using the DJB, DEK, FNV, and JS hashes.
+        If wide is set, the key holds 32 bit code points instead of bytes.
+        """
         cdef size_t djb_hash, dek_hash, fnv_hash, js_hash
         cdef size_t fnv_prime = 0x811C9DC5
         cdef size_t salt
+        cdef unsigned char* data = <unsigned char*>key
 
         cdef int i,j,rounds
-        cdef unsigned int k = self.k_num
-        cdef unsigned char key_val
+        cdef size_t x
+        cdef size_t key_val
+        cdef size_t step = 4 if wide else 1
 
         # Compute the number of rounds we need
         rounds = k / 4
@@ -155,7 +429,7 @@ cdef class BloomFilter:
         for i from 0 <= i < rounds:
             # Reset the hashes
             djb_hash = 5381
-            dek_hash = len(key)
+            dek_hash = length / step
             fnv_hash = 0
             js_hash = 1315423911
           
@@ -170,7 +444,11 @@ cdef class BloomFilter:
                     fnv_hash ^= key_val
                     js_hash ^= ((js_hash << 5) + key_val + (js_hash >> 2))
 
-            for key_val in key:
+            for x from 0 <= x < length by step:
+                if wide:
+                    key_val = data[x] | data[x+1] << 8 | <size_t>data[x+2] << 16 | <size_t>data[x+3] << 24
+                else:
+                    key_val = data[x]
                 djb_hash = ((djb_hash << 5) + djb_hash) + key_val
                 dek_hash = ((dek_hash << 6) ^ (dek_hash >> 27)) ^ key_val
                 fnv_hash *= fnv_prime
@@ -178,16 +456,16 @@ cdef class BloomFilter:
                 js_hash ^= ((js_hash << 5) + key_val + (js_hash >> 2))
 
             # Copy the hashes
-            self.hashes[i*4] = djb_hash
-            self.hashes[i*4+1] = dek_hash
-            self.hashes[i*4+2] = fnv_hash
-            self.hashes[i*4+3] = js_hash
+            out[i*4] = djb_hash
+            out[i*4+1] = dek_hash
+            out[i*4+2] = fnv_hash
+            out[i*4+3] = js_hash
 
             # Generate a new salt
             salt = djb_hash ^ dek_hash ^ fnv_hash ^ js_hash
 
-    def print_hashes(self, char* key):
-        self._compute_hashes(key)
+    def print_hashes(self, key):
+        self._compute_hashes(key, self.k_num)
         cdef int i
         cdef size_t h
 
@@ -198,62 +476,359 @@ cdef class BloomFilter:
 
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    def add(self, char* key, int check_first=0):
-        "Add a key to the set"
-        if check_first:
-            if self.__contains__(key): 
-                return False
-        else:
-            self._compute_hashes(key)
+    cdef void _compute_positions(self):
+        "Computes the bit positions for the currently computed hashes"
+        self._hash_positions_into(self.hashes, self.positions)
 
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _hash_positions_into(self, size_t* hashes, size_t* out) nogil:
+        "Computes the bit positions for k hashes"
         cdef size_t m = self.offset
         cdef size_t offset = 0
-        cdef size_t h
-        cdef int i
+        cdef unsigned int i
 
-        # Set the bits for the hashes
         for i from 0 <= i < self.k_num:
-            h = self.hashes[i]
-            self.bitmap[offset + (h % m)] = 1
+            out[i] = offset + (hashes[i] % m)
             offset += m
 
-        self.count += 1
+    cdef int _set_bits(self) except -1:
+        "Sets the bits for the currently computed hashes"
+        cdef unsigned int i
+        self._compute_positions()
+        bitmap = self.bitmap
+
+        # Use the C interface if possible, otherwise the bulk Python interface
+        if isinstance(bitmap, CBitmap):
+            (<CBitmap>bitmap).set_bit_array(self.positions, self.k_num)
+        else:
+            bitmap.set_bits([self.positions[i] for i in range(self.k_num)])
+        return 0
+
+    cdef int _test_bits(self) except -1:
+        "Checks the bits for the currently computed hashes"
+        cdef unsigned int i
+        self._compute_positions()
+        bitmap = self.bitmap
+
+        # Use the C interface if possible, otherwise the bulk Python interface
+        if isinstance(bitmap, CBitmap):
+            return (<CBitmap>bitmap).test_bit_array(self.positions, self.k_num)
+        return 1 if bitmap.test_all([self.positions[i] for i in range(self.k_num)]) else 0
+
+    def add(self, key, int check_first=0):
+        "Add a key to the set"
+        self._compute_hashes(key, self.k_num)
+        if check_first and self._test_bits():
+            return False
+
+        self._set_bits()
+        self._add_count(1)
         return True
 
+    def __contains__(self, key):
+        "Checks if the set contains a given key"
+        self._compute_hashes(key, self.k_num)
+        return bool(self._test_bits())
+
+    def add_many(self, keys, int check_first=0):
+        """
+        Adds every key in an iterable to the set. This is equivalent
+        to calling add() for each key, but avoids the per-call overhead.
+        Returns the number of keys that were added.
+        """
+        cdef size_t added = 0
+
+        # Hash and set the bits in batches with the C Bitmap
+        if isinstance(self.bitmap, CBitmap):
+            added = self._probe_all(keys, BATCH_ADD_NEW if check_first else BATCH_ADD, None)
+            self._add_count(added)
+            return added
+
+        for key in keys:
+            self._compute_hashes(key, self.k_num)
+            if check_first and self._test_bits(): continue
+            self._set_bits()
+            added += 1
+
+        self._add_count(added)
+        return added
+
+    def contains_many(self, keys):
+        """
+        Checks if the set contains each key in an iterable.
+        Returns a list of booleans in the same order as the keys.
+        """
+        results = []
+
+        # Hash and test the bits in batches with the C Bitmap
+        if isinstance(self.bitmap, CBitmap):
+            self._probe_all(keys, BATCH_TEST, results)
+            return results
+
+        for key in keys:
+            self._compute_hashes(key, self.k_num)
+            results.append(bool(self._test_bits()))
+
+        return results
+
+    cdef size_t _probe_all(self, keys, int op, list results) except? 0:
+        """
+        Probes an iterable of keys, BATCH_KEYS at a time. See _probe_batch.
+        Returns the number of keys found or added.
+        """
+        cdef size_t done = 0
+        batch = []
+        for key in keys:
+            batch.append(key)
+            if len(batch) >= self.BATCH_KEYS:
+                done += self._probe_batch(batch, op, results)
+                batch = []
+        if batch: done += self._probe_batch(batch, op, results)
+        return done
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    def __contains__(self, char* key):
-        "Checks if the set contains a given key"
-        self._compute_hashes(key)
-        cdef size_t m = self.offset
-        cdef size_t offset = 0
-        cdef size_t h
-        cdef int i
-    
-        for i from 0 <= i < self.k_num:
-            h = self.hashes[i]
-            if self.bitmap[offset+ (h % m)] == 0: return False
-            offset += m
+    cdef size_t _probe_batch(self, list keys, int op, list results) except? 0:
+        """
+        Hashes and probes a batch of keys using private buffers, so
+        concurrent calls do not share any state. The GIL is released for
+        the whole batch, except when setting bits in a bitmap which is not
+        atomic. If results is provided, it is extended with whether each
+        key was found or added. Returns the number of keys found or added.
+        """
+        cdef CBitmap bitmap = <CBitmap>self.bitmap
+        cdef size_t i, n = len(keys)
+        cdef size_t done = 0
+        cdef char** raws = NULL
+        cdef size_t* lengths = NULL
+        cdef uint64_t* values = NULL
+        cdef size_t* hashes = NULL
+        cdef size_t* positions = NULL
+        cdef unsigned char* found = NULL
+        if bitmap.mmap == NULL: raise ValueError, "Bitmap is closed!"
+
+        try:
+            raws = <char**>stdlib.malloc(n*sizeof(char*))
+            lengths = <size_t*>stdlib.malloc(n*sizeof(size_t))
+            values = <uint64_t*>stdlib.malloc(n*sizeof(uint64_t))
+            found = <unsigned char*>stdlib.malloc(n)
+            hashes = <size_t*>stdlib.malloc((self.k_num+4)*sizeof(size_t))
+            positions = <size_t*>stdlib.malloc(self.k_num*sizeof(size_t))
+            if raws == NULL or lengths == NULL or values == NULL or found == NULL or hashes == NULL or positions == NULL:
+                raise MemoryError
+
+            # The keys list keeps the strings alive while the GIL is released,
+            # and owners keeps the data of the keys which are converted
+            owners = []
+            for i in range(n):
+                key = keys[i]
+                owner = _key_data(key, &raws[i], &lengths[i], &values[i], self.hash_engine != ENGINE_MURMUR3)
+                if owner is not key and owner is not None: owners.append(owner)
+
+            if op == BATCH_TEST or bitmap.atomic:
+                with nogil:
+                    done = self._probe_keys(bitmap, raws, lengths, values, n, op, hashes, positions, found)
+            else:
+                done = self._probe_keys(bitmap, raws, lengths, values, n, op, hashes, positions, found)
+
+            if results is not None:
+                results.extend([bool(found[i]) for i in range(n)])
+        finally:
+            stdlib.free(raws)
+            stdlib.free(lengths)
+            stdlib.free(values)
+            stdlib.free(found)
+            stdlib.free(hashes)
+            stdlib.free(positions)
+        return done
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef size_t _probe_keys(self, CBitmap bitmap, char** raws, size_t* lengths, uint64_t* values, size_t n,
+                            int op, size_t* hashes, size_t* positions, unsigned char* found) nogil:
+        "Hashes and probes each key, see _probe_batch"
+        cdef size_t i, done = 0
+        cdef bint hit
+        for i in range(n):
+            self._hash_key(raws[i], lengths[i], values[i], self.k_num, hashes)
+            self._hash_positions_into(hashes, positions)
+            if op == BATCH_ADD:
+                hit = 1
+            else:
+                hit = bitmap._test_array(positions, self.k_num)
+                if op == BATCH_ADD_NEW: hit = not hit
+            if hit and op != BATCH_TEST:
+                bitmap._set_array(positions, self.k_num)
+            found[i] = hit
+            done += hit
+        return done
+
+    def key_hashes(self, key, k=None):
+        """
+        Returns the hashes for a key. At least as many hashes as this
+        filter needs are returned, but more can be requested with k.
+        Since the hashes for a larger k extend those for a smaller k,
+        the result can be shared with any filter that has the same
+        hash engine and index mode and needs at most as many hashes.
+        """
+        cdef unsigned int n = self.k_num
+        cdef unsigned int i
+        if k is not None and k > n: n = k
+        self._reserve_hashes(n)
+        self._compute_hashes(key, n)
+        return [self.hashes[i] for i in range(n)]
+
+    def add_hashes(self, hashes):
+        """
+        Adds a key to the set, given the hashes for
+        the key returned by key_hashes().
+        """
+        self._load_hashes(hashes)
+        self._set_bits()
+        self._add_count(1)
         return True
 
+    def contains_hashes(self, hashes):
+        """
+        Checks if the set contains a key, given the hashes
+        for the key returned by key_hashes().
+        """
+        self._load_hashes(hashes)
+        return bool(self._test_bits())
+
+    def fill_ratio(self):
+        "Returns the fraction of the bits used by keys which are set"
+        return float(self.bitmap.popcount(0, self.bitmap_size / 8)) / self._filter_bits()
+
+    def estimate_cardinality(self):
+        """
+        Estimates the number of distinct keys in the filter from
+        the number of bits that are set. Unlike len(), this is not
+        inflated by duplicate adds or by merging filters. Returns
+        infinity if every bit is set. From "Cardinality estimation
+        and dynamic length adaptation for Bloom filters", Papapetrou et al. 2010.
+        """
+        bits = self._filter_bits()
+        fill = self.fill_ratio()
+        if fill >= 1: return float("inf")
+        return -float(bits) / self.k_num * math.log(1 - fill)
+
+    def current_false_positive_rate(self):
+        """
+        Returns the false positive rate of the filter given
+        the bits that are currently set.
+        """
+        return self.fill_ratio() ** self.k_num
+
+    def _filter_bits(self):
+        "Returns the number of bits used for keys"
+        return self.k_num * self.offset
+
+    def clear(self):
+        """
+        Removes every key from the filter, keeping the bitmap,
+        k, hash engine and index mode.
+        """
+        self.bitmap.clear(0, self.bitmap_size / 8)
+        self._add_count(-len(self))
+
+    def copy(self):
+        "Returns a copy of the filter, using an anonymous bitmap"
+        cdef BloomFilter filt = type(self)(self.bitmap.copy(), self.k_num)
+        filt.count = len(self)
+        return filt
+
+    def union(self, other):
+        """
+        Returns a new filter containing the keys of both filters.
+        The filters must have the same size, k, hash engine and index mode.
+        The new filter uses an anonymous bitmap.
+        """
+        return self.copy().union_update(other)
+
+    def intersection(self, other):
+        """
+        Returns a new filter containing the keys found in both filters.
+        The filters must have the same size, k, hash engine and index mode.
+        The new filter uses an anonymous bitmap. This may have a higher
+        false positive rate than a filter built from the common keys.
+        """
+        return self.copy().intersection_update(other)
+
+    def union_update(self, other):
+        """
+        Adds the keys of another filter to this filter, in place.
+        The count becomes the sum of the counts, which is an upper bound.
+        """
+        self._check_compatible(other)
+        self.bitmap.union_update(other.bitmap, 0, self.bitmap_size / 8)
+        self._add_count(len(other))
+        return self
+
+    def intersection_update(self, other):
+        """
+        Removes the keys that are not in another filter, in place.
+        The count becomes the smaller of the counts, which is an upper bound.
+        """
+        self._check_compatible(other)
+        self.bitmap.intersection_update(other.bitmap, 0, self.bitmap_size / 8)
+        self._add_count(min(len(self), len(other)) - len(self))
+        return self
+
+    def _check_compatible(self, other):
+        "Checks that another filter can be merged with this one"
+        if (len(self.bitmap) != len(other.bitmap) or self.bitmap_size != other.bitmap_size or
+                self.k_num != other.k_num or
+                self.hash_engine != other.hash_engine or self.index_mode != other.index_mode or
+                self.LAYOUT != getattr(other, "LAYOUT", None)):
+            raise ValueError, "Filters must have the same size, k, hash engine and index mode!"
+
     def __len__(self):
-        "Returns the number of elements in the bitmap"
+        """
+        Returns the number of elements in the bitmap. Shared
+        filters read the count, which includes other processes.
+        """
+        if self.shared and self.bitmap:
+            self.count = self.bitmap.atomic_load(self.count_offset)
         return self.count
 
-    def flush(self):
+    cdef int _add_count(self, long long delta) except -1:
+        """
+        Adds to the count. Shared filters add to the count
+        in the bitmap atomically, and keep the new value.
+        """
+        if self.shared:
+            self.count = self.bitmap.atomic_add(self.count_offset, delta)
+        else:
+            self.count += delta
+        return 0
+
+    def flush(self, dirty_only=False):
         """
         Forces us to write out the current count to the bitmap,
-        and flushes the underlying bitmap.
+        and flushes the underlying bitmap. If dirty_only is True,
+        only the modified pages of the bitmap are written.
         """
+        # Shared filters keep the count in the bitmap
+        if self.shared:
+            if self.bitmap: self.bitmap.flush(dirty_only=dirty_only)
+            return
+
         # Get the count string
         count_str = struct.pack(self.SIZE_FMT, self.count)
 
-        # Set the count as the last bytes
-        size_offset = self.bitmap_size / 8
-        if self.bitmap: self.bitmap[size_offset:size_offset+self.SIZE_LEN] = count_str
+        # Set the count, if it changed
+        size_offset = self.count_offset
+        if self.bitmap and self.bitmap[size_offset:size_offset+self.SIZE_LEN] != count_str:
+            self.bitmap[size_offset:size_offset+self.SIZE_LEN] = count_str
 
         # Flush the underlying bitmap
-        if self.bitmap: self.bitmap.flush()
+        if self.bitmap: self.bitmap.flush(dirty_only=dirty_only)
+
+    def dirty_bytes(self):
+        "Returns the number of bytes of the bitmap modified since the last flush"
+        return self.bitmap.dirty_bytes()
 
     def close(self, flush=True):
         "Closes the bloom filter and the underlying bitmap"
@@ -265,23 +840,52 @@ cdef class BloomFilter:
 
     def _read_count(self):
         "Reads the count from the bitmap"
-        # Set the count as the last bytes
-        size_offset = self.bitmap_size / 8
+        size_offset = self.count_offset
         count_str = self.bitmap[size_offset:size_offset+self.SIZE_LEN]
         unpacked = struct.unpack(self.SIZE_FMT, count_str)
         return unpacked[0]
 
     def _read_k_num(self):
-        "Reads the k-num we should use"
+        "Reads the k-num, hash engine and index mode we should use"
         size_offset = self.bitmap_size / 8 + self.SIZE_LEN
         knum_str = self.bitmap[size_offset:size_offset+self.K_NUM_LEN]
         unpacked = struct.unpack(self.K_NUM_FMT, knum_str)
-        return unpacked[0]
+        return unpacked
 
     def _write_k_num(self):
-        "Writes the k-num we should use"
+        "Writes the k-num, hash engine and index mode we should use"
         size_offset = self.bitmap_size / 8 + self.SIZE_LEN
-        knum_str = struct.pack(self.K_NUM_FMT, self.k_num)
+        knum_str = struct.pack(self.K_NUM_FMT, self.k_num, self.hash_engine, self.index_mode)
         self.bitmap[size_offset:size_offset+self.K_NUM_LEN] = knum_str
         self.bitmap.flush()
 
+
+    def _read_header(self):
+        """
+        Reads the k-num, hash engine, index mode and bit size from
+        the header. Returns None if the bitmap does not have a header.
+        """
+        offset = len(self.bitmap) / 8 - self.HEADER_LEN
+        if offset <= 0: return None
+        fields = self.bitmap[offset:offset+self.HEADER_FIELDS_LEN]
+        magic, version, k, engine, mode, layout, bits = struct.unpack(self.HEADER_FMT, fields)
+        if magic != self.HEADER_MAGIC: return None
+
+        # Validate the header before trusting it
+        checksum_str = self.bitmap[offset+self.HEADER_FIELDS_LEN:offset+self.HEADER_FIELDS_LEN+4]
+        if struct.unpack(self.HEADER_CHECKSUM_FMT, checksum_str)[0] != binascii.crc32(fields) & 0xffffffff:
+            raise ValueError, "Header checksum does not match!"
+        if version != self.HEADER_VERSION: raise ValueError, "Unsupported header version %d!" % version
+        if k < 1: raise ValueError, "Header has a bad value for k!"
+        if bits != 8 * offset: raise ValueError, "Header does not match the bitmap size!"
+        if layout != self.LAYOUT_ID: raise ValueError, "Bitmap contains a different kind of filter!"
+        return k, engine, mode, bits
+
+    def _write_header(self):
+        "Writes the header describing the filter"
+        offset = self.bitmap_size / 8
+        fields = struct.pack(self.HEADER_FMT, self.HEADER_MAGIC, self.HEADER_VERSION, self.k_num,
+                             self.hash_engine, self.index_mode, self.LAYOUT_ID, self.bitmap_size)
+        checksum_str = struct.pack(self.HEADER_CHECKSUM_FMT, binascii.crc32(fields) & 0xffffffff)
+        self.bitmap[offset:offset+self.HEADER_FIELDS_LEN+4] = fields + checksum_str
+        self.bitmap.flush()
@@ -0,0 +1,88 @@
+"""
+Implements the hash engines used to map keys onto
+bit positions, using the C implementations where possible.
+Provides the same interface as the hashing module.
+"""
+from libc.stdint cimport uint32_t, uint64_t
+from hashing import HASH_LEGACY, HASH_MURMUR3, DEFAULT_ENGINE, legacy_hashes, key_bytes
+from hashing import INDEX_INDEPENDENT, INDEX_DOUBLE, DEFAULT_INDEX_MODE, INDEX_MODES, MASK_64
+from hashing import GOLDEN_64, KEY_ENCODING
+
+cdef extern from "hashutil.h" nogil:
+    cdef void c_murmur3_128 "murmur3_128" (const void* key, size_t len, uint32_t seed, uint64_t* out)
+    cdef uint64_t c_int_hash "int_hash" (uint64_t key, uint32_t i)
+
+def murmur3_128(key, uint32_t seed=0):
+    """
+    Computes the 128 bit x64 variant of MurmurHash3 over
+    a string. Returns the two 64 bit halves of the hash.
+    """
+    cdef char* raw = key
+    cdef uint64_t out[2]
+    c_murmur3_128(raw, len(key), seed, out)
+    return (out[0], out[1])
+
+def murmur3_hashes(key, unsigned int k):
+    """
+    Generates k hashes for a key using MurmurHash3. Each round
+    yields two hashes, and uses the round number as the seed.
+    """
+    cdef char* raw = key
+    cdef size_t length = len(key)
+    cdef uint64_t out[2]
+    cdef uint32_t seed = 0
+    hashes = []
+    while len(hashes) < k:
+        c_murmur3_128(raw, length, seed, out)
+        hashes.append(out[0])
+        hashes.append(out[1])
+        seed += 1
+    return hashes[:k]
+
+def int_hashes(key, unsigned int k):
+    """
+    Generates k hashes for a 64 bit integer key. Hash i is the
+    MurmurHash3 finalizer applied to the key plus i+1 times the golden
+    ratio. Negative keys use their two's complement. Every engine hashes
+    integer keys this way, so they are never converted to strings.
+    """
+    if not -(1 << 63) <= key <= MASK_64:
+        raise OverflowError("Integer keys must fit in 64 bits!")
+    cdef uint64_t value = key & MASK_64
+    cdef uint32_t i
+    return [c_int_hash(value, i) for i in range(k)]
+
+# Maps the engine ids to the function generating the hashes
+ENGINES = {
+    HASH_LEGACY: legacy_hashes,
+    HASH_MURMUR3: murmur3_hashes,
+}
+
+def double_hashes(uint64_t h1, uint64_t h2, unsigned int k):
+    """
+    Derives k hashes from two base hashes, using h1 + i*h2.
+    From "Less Hashing, Same Performance", Kirsch and Mitzenmacher 2006.
+    """
+    cdef unsigned int i
+    return [h1 + i*h2 for i in range(k)]
+
+def get_hashes(engine, key, k, mode=INDEX_INDEPENDENT):
+    """
+    Generates k hashes for a key using the given hash engine.
+    In the INDEX_DOUBLE mode, the key is only hashed once and
+    the k hashes are derived from the first two. Integer keys
+    are hashed with int_hashes, see key_bytes for the others. The
+    legacy engine hashes unicode keys by code point instead.
+    """
+    try:
+        func = ENGINES[engine]
+    except KeyError:
+        raise ValueError("Unknown hash engine %r!" % engine)
+    if isinstance(key, (int, long)):
+        func = int_hashes
+    elif engine != HASH_LEGACY or not isinstance(key, unicode):
+        key = key_bytes(key)
+    if mode == INDEX_DOUBLE:
+        h1, h2 = func(key, 2)
+        return double_hashes(h1, h2, k)
+    return func(key, k)
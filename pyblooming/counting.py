@@ -0,0 +1,297 @@
+"""
+This module implements a counting bloom filter, which
+stores a small saturating counter per position instead of a
+bit so that keys can be removed.
+"""
+import math
+import struct
+
+# Try to import the C version, fallback to Python
+try:
+    import cbitmap as bitmaplib
+except ImportError:
+    import bitmap as bitmaplib
+from bloom import BloomFilter
+
+
+class CountingBloomFilter(BloomFilter):
+    # The supported counter widths in bits, these pack evenly into bytes
+    WIDTHS = (2, 4, 8)
+    DEFAULT_WIDTH = 4
+
+    # The counter width is stored after the count and k num, or
+    # in the reserved bytes of the header after the count
+    WIDTH_FMT = "<I"
+    WIDTH_LEN = 4
+    HEADER_WIDTH_OFFSET = 40
+
+    # Counting filters can only be merged with each other
+    LAYOUT = "counting"
+    LAYOUT_ID = 2
+
+    # Caches the per byte lookup tables, by width and operation
+    _tables = {}
+
+    def __init__(self, bitmap, k, hash_engine=None, index_mode=None, width=None, shared=False,
+                 threadsafe=False, header=False):
+        """
+        Creates a new counting Bloom Filter instance. Each position
+        holds a counter of width bits which is incremented by add()
+        and decremented by remove(). Counters saturate at their maximum,
+        after which they are never decremented, so a key can not be
+        removed by accident.
+
+        :Parameters:
+          - bitmap : The bitmap that should be used. Must be large enough
+            to store the additional meta data.
+          - k : The number of counters to use per key. Must be at least 1.
+          - hash_engine (optional) : The id of the hash engine to use.
+          - index_mode (optional) : How the hashes are derived.
+          - width (optional) : The number of bits per counter, one of
+            WIDTHS. Defaults to 4. Like k, this is ignored if the bitmap
+            already contains a filter.
+          - threadsafe, header (optional) : See BloomFilter. Counters are
+            updated under the lock of a thread safe filter.
+          - shared (optional) : Counting filters can not be shared, since
+            counters are not updated atomically. Must be False.
+        """
+        if width is None: width = self.DEFAULT_WIDTH
+        if width not in self.WIDTHS: raise ValueError("Bad value provided for width!")
+        if shared: raise ValueError("Counting filters can not be shared!")
+        BloomFilter.__init__(self, bitmap, k, hash_engine, index_mode, shared, threadsafe, header)
+
+        # Restore the width if we need to
+        self.width = self._read_width()
+        if self.width == 0:
+            self.width = width
+            self._write_width()
+        elif self.width not in self.WIDTHS:
+            raise ValueError("Bitmap uses an unknown counter width!")
+
+        self.max_count = (1 << self.width) - 1
+        self.counters = int(self.bitmap_size / self.width)
+        self.offset = int(self.counters / self.k_num)
+        if self.offset == 0: raise ValueError("Bitmap is not large enough!")
+
+    @classmethod
+    def extra_buffer(cls):
+        """
+        Returns the extra bytes we need for our buffer info.
+        """
+        return BloomFilter.extra_buffer() + cls.WIDTH_LEN
+
+    @classmethod
+    def for_capacity(cls, capacity, probability, hash_engine=None, index_mode=None, width=None):
+        """
+        Creates a new counting bloom filter that computes the
+        size required for the given capacity and probability,
+        and sets the ideal K. Uses an anonymous bitmap.
+        """
+        bytes, ideal_k = cls.params_for_capacity(capacity, probability, width)
+        bitmap = bitmaplib.Bitmap(bytes)
+        return cls(bitmap, ideal_k, hash_engine, index_mode, width)
+
+    @classmethod
+    def params_for_capacity(cls, capacity, probability, width=None, header=False):
+        """
+        Returns the number of bytes and ideal K value that
+        should be used to create a counting Bloom Filter for the
+        given capacity and probability. This is the size of a
+        classic filter times the counter width. If header is True,
+        the size is for a filter with a header.
+        """
+        if width is None: width = cls.DEFAULT_WIDTH
+        counters = cls.required_bytes(capacity, probability) * 8
+        ideal_k = int(math.ceil(cls.ideal_k(counters, capacity)))
+        if header: return cls.header_length(counters * width / 8), ideal_k
+        return counters * width / 8 + cls.extra_buffer(), ideal_k
+
+    @classmethod
+    def create(cls, filename, capacity, probability, hash_engine=None, index_mode=None, width=None,
+               threadsafe=False, **kwargs):
+        """
+        Creates a new file backed counting filter with a header, so it
+        can be reopened with open(). See BloomFilter.create.
+        """
+        bytes, ideal_k = cls.params_for_capacity(capacity, probability, width, header=True)
+        if threadsafe: kwargs.setdefault("atomic", True)
+        bitmap = bitmaplib.Bitmap(bytes, filename, **kwargs)
+        return cls(bitmap, ideal_k, hash_engine, index_mode, width, threadsafe=threadsafe, header=True)
+
+    def add(self, key, check_first=False):
+        "Add a key to the set"
+        if check_first and key in self: return False
+        return self.add_hashes(self.key_hashes(key))
+
+    def remove(self, key):
+        """
+        Removes a key from the set. Returns False if the key
+        is not in the set. Removing a key that was never added,
+        but is a false positive, removes part of other keys.
+        """
+        return self.remove_hashes(self.key_hashes(key))
+
+    def __contains__(self, key):
+        "Checks if the set contains a given key"
+        return self.contains_hashes(self.key_hashes(key))
+
+    def add_many(self, keys, check_first=False):
+        """
+        Adds every key in an iterable to the set.
+        Returns the number of keys that were added.
+        """
+        return len([key for key in keys if self.add(key, check_first)])
+
+    def contains_many(self, keys):
+        """
+        Checks if the set contains each key in an iterable.
+        Returns a list of booleans in the same order as the keys.
+        """
+        return [self.__contains__(key) for key in keys]
+
+    def add_hashes(self, hashes):
+        """
+        Adds a key to the set, given the hashes for
+        the key returned by key_hashes().
+        """
+        if self.lock: self.lock.acquire()
+        try:
+            for pos in self._hash_positions(hashes):
+                val = self._get_counter(pos)
+                if val < self.max_count: self._set_counter(pos, val + 1)
+            self.count += 1
+        finally:
+            if self.lock: self.lock.release()
+        return True
+
+    def remove_hashes(self, hashes):
+        """
+        Removes a key from the set, given the hashes for
+        the key returned by key_hashes().
+        """
+        positions = self._hash_positions(hashes)
+        if self.lock: self.lock.acquire()
+        try:
+            values = [self._get_counter(pos) for pos in positions]
+            if not all(values): return False
+
+            # Saturated counters may be shared by more keys than they count
+            for pos, val in zip(positions, values):
+                if val < self.max_count: self._set_counter(pos, val - 1)
+            self.count = max(self.count - 1, 0)
+        finally:
+            if self.lock: self.lock.release()
+        return True
+
+    def contains_hashes(self, hashes):
+        """
+        Checks if the set contains a key, given the hashes
+        for the key returned by key_hashes().
+        """
+        for pos in self._hash_positions(hashes):
+            if not self._get_counter(pos): return False
+        return True
+
+    def counter(self, key):
+        """
+        Returns the smallest counter of a key, which is an upper
+        bound on the number of times it was added.
+        """
+        return min(self._get_counter(pos) for pos in self._positions(key))
+
+    def _get_counter(self, pos):
+        "Returns the value of a counter"
+        bit = pos * self.width
+        byte = bit >> 3
+        shift = 8 - self.width - (bit & 7)
+        return (ord(self.bitmap[byte:byte+1]) >> shift) & self.max_count
+
+    def _set_counter(self, pos, val):
+        "Sets the value of a counter"
+        bit = pos * self.width
+        byte = bit >> 3
+        shift = 8 - self.width - (bit & 7)
+        old = ord(self.bitmap[byte:byte+1])
+        new = (old & ~(self.max_count << shift)) | (val << shift)
+        self.bitmap[byte:byte+1] = chr(new)
+
+    def fill_ratio(self):
+        "Returns the fraction of the counters used by keys which are not zero"
+        table = self._table("nonzero")
+        used = 0
+        end = self.bitmap_size / 8
+        for i in xrange(0, end, self.bitmap.CHUNK_SIZE):
+            chunk = self.bitmap[i:min(i + self.bitmap.CHUNK_SIZE, end)]
+            used += sum(table[ord(c)] for c in chunk)
+        return float(used) / self._filter_bits()
+
+    def union_update(self, other):
+        """
+        Adds the keys of another filter to this filter, in place,
+        by adding the counters. The count becomes the sum of the counts.
+        """
+        self._check_compatible(other)
+        self._combine(other, "add")
+        self.count += len(other)
+        return self
+
+    def intersection_update(self, other):
+        """
+        Removes the keys that are not in another filter, in place,
+        by taking the smaller of the counters. The count becomes the
+        smaller of the counts, which is an upper bound.
+        """
+        self._check_compatible(other)
+        self._combine(other, "min")
+        self.count = min(self.count, len(other))
+        return self
+
+    def _check_compatible(self, other):
+        "Checks that another filter can be merged with this one"
+        BloomFilter._check_compatible(self, other)
+        if self.width != other.width: raise ValueError("Filters must have the same counter width!")
+
+    def _combine(self, other, op):
+        "Combines the counters with those of another filter, a byte at a time"
+        table = self._table(op)
+        size = self.bitmap_size / 8
+        for i in xrange(0, size, self.bitmap.CHUNK_SIZE):
+            j = min(i + self.bitmap.CHUNK_SIZE, size)
+            mine, theirs = self.bitmap[i:j], other.bitmap[i:j]
+            self.bitmap[i:j] = "".join(table[(ord(a) << 8) | ord(b)] for a, b in zip(mine, theirs))
+
+    def _table(self, op):
+        """
+        Returns a lookup table for an operation on the counters
+        packed into bytes. "nonzero" maps a byte to the number of non
+        zero counters, "add" and "min" map a pair of bytes to the byte
+        of the saturating sums or minimums of the counters.
+        """
+        key = (self.width, op)
+        if key in self._tables: return self._tables[key]
+        width, mask = self.width, self.max_count
+        shifts = range(0, 8, width)
+        if op == "nonzero":
+            table = [sum(1 for s in shifts if (b >> s) & mask) for b in xrange(256)]
+        else:
+            func = min if op == "min" else lambda x, y: min(x + y, mask)
+            table = [chr(sum(func((ab >> 8 >> s) & mask, (ab >> s) & mask) << s for s in shifts))
+                     for ab in xrange(1 << 16)]
+        self._tables[key] = table
+        return table
+
+    def _width_offset(self):
+        "Returns the byte offset of the counter width"
+        if self.header: return self.bitmap_size / 8 + self.HEADER_WIDTH_OFFSET
+        return self.bitmap_size / 8 + self.SIZE_LEN + self.K_NUM_LEN
+
+    def _read_width(self):
+        "Reads the counter width from the bitmap"
+        offset = self._width_offset()
+        return struct.unpack(self.WIDTH_FMT, self.bitmap[offset:offset+self.WIDTH_LEN])[0]
+
+    def _write_width(self):
+        "Writes the counter width we should use"
+        offset = self._width_offset()
+        self.bitmap[offset:offset+self.WIDTH_LEN] = struct.pack(self.WIDTH_FMT, self.width)
+        self.bitmap.flush()
@@ -0,0 +1,353 @@
+"""
+This module implements a cuckoo filter on top of the
+bitmap implementation. It stores a fingerprint per key in
+one of two buckets, so lookups touch at most two buckets.
+"""
+import binascii
+import math
+import random
+import struct
+
+# Try to import the C version, fallback to Python
+try:
+    import cbitmap as bitmaplib
+except ImportError:
+    import bitmap as bitmaplib
+try:
+    import chashing as hashing
+except ImportError:
+    import hashing
+
+
+class CuckooFilter(object):
+    # This is the packing format we use to store the count
+    SIZE_FMT = "<Q"
+    SIZE_LEN = 8
+
+    # The fingerprint bits, bucket size and hash engine are
+    # packed after the count. The last byte is reserved.
+    PARAMS_FMT = "<BBBB"
+    PARAMS_LEN = 4
+
+    # The number of fingerprints per bucket
+    BUCKET_SIZE = 4
+
+    # The fraction of entries that can be filled before inserts
+    # start to fail. From "Cuckoo Filter: Practically Better
+    # Than Bloom", Fan et al. 2014.
+    LOAD_FACTOR = 0.95
+
+    # How many fingerprints are relocated before an insert fails
+    MAX_KICKS = 500
+
+    # Used to spread the fingerprint over the buckets
+    FP_MULTIPLIER = 0x9e3779b97f4a7c15
+
+    LAYOUT = "cuckoo"
+
+    def __init__(self, bitmap, fingerprint_bits, hash_engine=None):
+        """
+        Creates a new Cuckoo Filter instance. A cuckoo filter
+        requires a bitmap underneath, which is divided into buckets
+        of BUCKET_SIZE fingerprints.
+
+        :Parameters:
+          - bitmap : The bitmap that should be used. Must be large enough to
+            store the additional meta data. extra_buffer() should be used to
+            determine the amount of additional padding.
+          - fingerprint_bits : The number of bits per fingerprint, between
+            4 and 32. Each bit halves the false positive rate.
+          - hash_engine (optional) : The id of the hash engine to use,
+            from the hashing module. Defaults to hashing.DEFAULT_ENGINE.
+            Like fingerprint_bits, this is ignored if the bitmap already
+            contains a filter. HASH_LEGACY is not supported, since its
+            hashes of similar keys are too close to spread the buckets.
+        """
+        if bitmap is None or fingerprint_bits is None: raise ValueError("Must provide bitmap and fingerprint bits!")
+        if fingerprint_bits < 4 or fingerprint_bits > 32: raise ValueError("Bad value provided for fingerprint bits!")
+        if hash_engine is None: hash_engine = hashing.DEFAULT_ENGINE
+        if hash_engine not in hashing.ENGINES: raise ValueError("Unknown hash engine!")
+        if hash_engine == hashing.HASH_LEGACY: raise ValueError("The legacy hashes are not supported!")
+        self.bitmap = bitmap
+        self.bitmap_size = len(bitmap) - 8*self.extra_buffer() # Ignore our size
+        if self.bitmap_size <= 0: raise ValueError("Bitmap is not large enough!")
+
+        # Restore the parameters if we need to
+        self.fp_bits, bucket_size, self.hash_engine = self._read_params()
+        if self.fp_bits == 0:
+            self.fp_bits = fingerprint_bits
+            self.hash_engine = hash_engine
+            self._write_params()
+        elif bucket_size != self.BUCKET_SIZE:
+            raise ValueError("Bitmap uses an unknown bucket size!")
+        elif self.hash_engine not in hashing.ENGINES:
+            raise ValueError("Bitmap uses an unknown hash engine!")
+
+        self.fp_mask = (1 << self.fp_bits) - 1
+        self.bucket_bits = self.BUCKET_SIZE * self.fp_bits
+        self.bucket_mask = (1 << self.bucket_bits) - 1
+        self.buckets = int(self.bitmap_size / self.bucket_bits)
+        if self.buckets == 0: raise ValueError("Bitmap is not large enough!")
+
+        # Buckets are read as big endian words, enough to cover a bucket
+        # starting at any bit of a byte. Reads past the last bucket
+        # stay within the count and params after the table.
+        self.bucket_words = (self.bucket_bits + 7 + 63) / 64
+        self.bucket_struct = struct.Struct(">%dQ" % self.bucket_words)
+
+        # Seed the relocations so identical inserts give identical files
+        self.random = random.Random(self.buckets)
+
+        # Restore the count
+        self.count = self._read_count()
+        self.info = {} # Allows dynamic properties
+
+    @classmethod
+    def extra_buffer(cls):
+        """
+        Returns the extra bytes we need for our buffer info.
+        """
+        return cls.SIZE_LEN + cls.PARAMS_LEN
+
+    @classmethod
+    def for_capacity(cls, capacity, probability, hash_engine=None):
+        """
+        Creates a new cuckoo filter that computes the size
+        and fingerprint bits required for the given capacity
+        and probability. Uses an anonymous bitmap.
+        """
+        bytes, fp_bits = cls.params_for_capacity(capacity, probability)
+        bitmap = bitmaplib.Bitmap(bytes)
+        return cls(bitmap, fp_bits, hash_engine)
+
+    @classmethod
+    def params_for_capacity(cls, capacity, probability):
+        """
+        Returns the number of bytes and fingerprint bits that
+        should be used to create a Cuckoo Filter for the given
+        capacity and probability.
+        """
+        fp_bits = cls.fingerprint_bits(probability)
+        buckets = int(math.ceil(capacity / (cls.BUCKET_SIZE * cls.LOAD_FACTOR)))
+        bytes = int(math.ceil(buckets * cls.BUCKET_SIZE * fp_bits / 8.0))
+        return bytes+cls.extra_buffer(), fp_bits
+
+    @classmethod
+    def fingerprint_bits(cls, prob):
+        """
+        Returns the number of fingerprint bits needed to achieve
+        the desired false positive probability. A lookup compares
+        against 2 buckets of fingerprints, each matching with
+        a probability of 2^-bits.
+        """
+        raw = math.log(2.0 * cls.BUCKET_SIZE / prob, 2)
+        return max(4, min(32, int(math.ceil(raw))))
+
+    @classmethod
+    def expected_probability(cls, fingerprint_bits, load=1.0):
+        """
+        Returns the expected probability of false positives
+        given the fingerprint bits and the fraction of entries used.
+        """
+        return 1 - (1 - 2.0 ** -fingerprint_bits) ** (2 * cls.BUCKET_SIZE * load)
+
+    def add(self, key, check_first=False):
+        """
+        Add a key to the set. Like BloomFilter, a key is added again
+        unless check_first is set, and then it must be removed as many
+        times. Raises ValueError if the filter is full, in which case
+        the filter is left unchanged.
+        """
+        i1, i2, fp = self._locate(key)
+        if check_first and (self._bucket_has(i1, fp) or self._bucket_has(i2, fp)):
+            return False
+        if not self._insert(i1, i2, fp): raise ValueError("Filter is full!")
+        self.count += 1
+        return True
+
+    def remove(self, key):
+        """
+        Removes a key from the set. Returns False if the key is
+        not in the set. Removing a key that was never added, but is
+        a false positive, removes another key.
+        """
+        i1, i2, fp = self._locate(key)
+        for idx in (i1, i2):
+            bucket = self._read_bucket(idx)
+            if fp in bucket:
+                bucket[bucket.index(fp)] = 0
+                self._write_bucket(idx, bucket)
+                self.count = max(self.count - 1, 0)
+                return True
+        return False
+
+    def __contains__(self, key):
+        "Checks if the set contains a given key"
+        i1, i2, fp = self._locate(key)
+        return self._bucket_has(i1, fp) or self._bucket_has(i2, fp)
+
+    def add_many(self, keys, check_first=False):
+        """
+        Adds every key in an iterable to the set.
+        Returns the number of keys that were added.
+        """
+        return len([key for key in keys if self.add(key, check_first)])
+
+    def contains_many(self, keys):
+        """
+        Checks if the set contains each key in an iterable.
+        Returns a list of booleans in the same order as the keys.
+        """
+        return [self.__contains__(key) for key in keys]
+
+    def load_factor(self):
+        "Returns the fraction of the entries that are used"
+        return float(self.count) / (self.buckets * self.BUCKET_SIZE)
+
+    def _locate(self, key):
+        "Returns the two buckets and the fingerprint of a key"
+        h1, h2 = hashing.get_hashes(self.hash_engine, key, 2)
+
+        # Zero marks an empty entry, so never use it as a fingerprint
+        fp = int((h2 >> 32) % self.fp_mask + 1)
+        i1 = int(h1 % self.buckets)
+        return i1, self._alternate(i1, fp), fp
+
+    def _alternate(self, idx, fp):
+        """
+        Returns the other bucket of a fingerprint. Since
+        (h - i) mod m is its own inverse, this works from either
+        bucket without the number of buckets being a power of two.
+        """
+        h = ((fp * self.FP_MULTIPLIER) & hashing.MASK_64) >> 32
+        return int((h - idx) % self.buckets)
+
+    def _insert(self, i1, i2, fp):
+        """
+        Inserts a fingerprint into one of its buckets, relocating
+        existing fingerprints to their other bucket if both are full.
+        If that fails, the relocations are undone and returns False.
+        """
+        for idx in (i1, i2):
+            bucket = self._read_bucket(idx)
+            if 0 in bucket:
+                bucket[bucket.index(0)] = fp
+                self._write_bucket(idx, bucket)
+                return True
+
+        # Swap the fingerprint with a random entry until one fits
+        kicks = []
+        idx = self.random.choice((i1, i2))
+        for n in xrange(self.MAX_KICKS):
+            bucket = self._read_bucket(idx)
+            slot = self.random.randrange(self.BUCKET_SIZE)
+            kicks.append((idx, slot, bucket[slot]))
+            fp, bucket[slot] = bucket[slot], fp
+            self._write_bucket(idx, bucket)
+
+            idx = self._alternate(idx, fp)
+            bucket = self._read_bucket(idx)
+            if 0 in bucket:
+                bucket[bucket.index(0)] = fp
+                self._write_bucket(idx, bucket)
+                return True
+
+        # Put every fingerprint back where it was
+        for idx, slot, old in reversed(kicks):
+            bucket = self._read_bucket(idx)
+            bucket[slot] = old
+            self._write_bucket(idx, bucket)
+        return False
+
+    def _bucket_range(self, idx):
+        "Returns the byte range holding a bucket, and the padding bits after it"
+        start_bit = idx * self.bucket_bits
+        end_bit = start_bit + self.bucket_bits
+        start, end = start_bit >> 3, (end_bit + 7) >> 3
+        return start, end, end*8 - end_bit
+
+    def _bucket_value(self, idx):
+        "Returns the fingerprints of a bucket, packed into an integer"
+        start_bit = idx * self.bucket_bits
+        start = start_bit >> 3
+        words = self.bucket_struct.unpack(self.bitmap[start:start + 8*self.bucket_words])
+        val = words[0]
+        for word in words[1:]:
+            val = (val << 64) | word
+        shift = 64*self.bucket_words - (start_bit & 7) - self.bucket_bits
+        return (val >> shift) & self.bucket_mask
+
+    def _bucket_has(self, idx, fp):
+        "Checks if a bucket contains a fingerprint"
+        val, fp_bits, mask = self._bucket_value(idx), self.fp_bits, self.fp_mask
+        for i in xrange(self.BUCKET_SIZE):
+            if val & mask == fp: return True
+            val >>= fp_bits
+        return False
+
+    def _read_bucket(self, idx):
+        "Returns the fingerprints in a bucket"
+        val, fp_bits, mask = self._bucket_value(idx), self.fp_bits, self.fp_mask
+        return [(val >> (fp_bits * (self.BUCKET_SIZE - 1 - i))) & mask for i in xrange(self.BUCKET_SIZE)]
+
+    def _write_bucket(self, idx, bucket):
+        "Writes the fingerprints of a bucket"
+        start, end, pad = self._bucket_range(idx)
+        packed = 0
+        for fp in bucket:
+            packed = (packed << self.fp_bits) | fp
+
+        # Keep the bits of the neighboring buckets
+        val = long(binascii.hexlify(self.bitmap[start:end]), 16)
+        mask = ((1 << self.bucket_bits) - 1) << pad
+        val = (val & ~mask) | (packed << pad)
+        self.bitmap[start:end] = binascii.unhexlify("%0*x" % (2*(end-start), val))
+
+    def __len__(self):
+        "Returns the number of elements in the filter"
+        return self.count
+
+    def flush(self, dirty_only=False):
+        """
+        Forces us to write out the current count to the bitmap,
+        and flushes the underlying bitmap. If dirty_only is True,
+        only the modified pages of the bitmap are written.
+        """
+        # Set the count as the last bytes, if it changed
+        count_str = struct.pack(self.SIZE_FMT, self.count)
+        size_offset = self.bitmap_size / 8
+        if self.bitmap and self.bitmap[size_offset:size_offset+self.SIZE_LEN] != count_str:
+            self.bitmap[size_offset:size_offset+self.SIZE_LEN] = count_str
+
+        # Flush the underlying bitmap
+        if self.bitmap: self.bitmap.flush(dirty_only=dirty_only)
+
+    def dirty_bytes(self):
+        "Returns the number of bytes of the bitmap modified since the last flush"
+        return self.bitmap.dirty_bytes()
+
+    def close(self, flush=True):
+        "Closes the cuckoo filter and the underlying bitmap"
+        if self.bitmap:
+            if flush:
+                self.flush()
+            self.bitmap.close(flush=flush)
+            self.bitmap = None
+
+    def _read_count(self):
+        "Reads the count from the bitmap"
+        size_offset = self.bitmap_size / 8
+        count_str = self.bitmap[size_offset:size_offset+self.SIZE_LEN]
+        return struct.unpack(self.SIZE_FMT, count_str)[0]
+
+    def _read_params(self):
+        "Reads the fingerprint bits, bucket size and hash engine"
+        offset = self.bitmap_size / 8 + self.SIZE_LEN
+        return struct.unpack(self.PARAMS_FMT, self.bitmap[offset:offset+self.PARAMS_LEN])[:3]
+
+    def _write_params(self):
+        "Writes the fingerprint bits, bucket size and hash engine"
+        offset = self.bitmap_size / 8 + self.SIZE_LEN
+        params = struct.pack(self.PARAMS_FMT, self.fp_bits, self.BUCKET_SIZE, self.hash_engine, 0)
+        self.bitmap[offset:offset+self.PARAMS_LEN] = params
+        self.bitmap.flush()
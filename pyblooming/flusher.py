@@ -0,0 +1,135 @@
+"""
+This module implements a background thread which
+periodically flushes a Bitmap, BloomFilter or ScalingBloomFilter,
+so that callers do not block on flush().
+"""
+import threading
+import time
+
+
+class Flusher(object):
+    def __init__(self, target, interval=1.0, dirty_threshold=0):
+        """
+        Creates a new Flusher. Every interval, the pages of the
+        target modified since the last flush are written in a background
+        thread. Requests for durability made while a flush is running
+        are coalesced into the next flush.
+
+        BloomFilter.flush writes the count before syncing the bits, and
+        the bits of a key are always set before the count is incremented,
+        so the flushed count never includes keys whose bits are not durable.
+
+        :Parameters:
+            - target : The object to flush. Must provide flush(dirty_only)
+              and dirty_bytes().
+            - interval (optional) : The seconds between flushes. Defaults to 1.
+            - dirty_threshold (optional) : The number of modified bytes
+              needed for a periodic flush. Defaults to 0, i.e. any change.
+              Calls to wait_durable() always flush.
+        """
+        if interval <= 0: raise ValueError("Interval must be positive!")
+        if dirty_threshold < 0: raise ValueError("Dirty threshold must not be negative!")
+        self.target = target
+        self.interval = interval
+        self.dirty_threshold = dirty_threshold
+        self.cond = threading.Condition()
+        self.thread = None
+        self.stopping = False
+        self.error = None
+
+        # Each wait_durable() takes a ticket, and is done once
+        # a flush started after it has completed
+        self.requested = 0
+        self.completed = 0
+
+    def start(self):
+        "Starts the background thread"
+        with self.cond:
+            if self.thread is not None: raise ValueError("Flusher is already started!")
+            self.stopping = False
+            self.thread = threading.Thread(target=self._run, name="pyblooming-flusher")
+            self.thread.daemon = True
+            self.thread.start()
+        return self
+
+    def stop(self, flush=True):
+        """
+        Stops the background thread. If flush is True, all the
+        changes made before the call are flushed first.
+        """
+        if flush and self.thread is not None: self.wait_durable()
+        with self.cond:
+            thread = self.thread
+            self.stopping = True
+            self.cond.notify_all()
+        if thread is not None: thread.join()
+        with self.cond:
+            self.thread = None
+
+    def running(self):
+        "Returns if the background thread is running"
+        return self.thread is not None and self.thread.is_alive()
+
+    def wait_durable(self, timeout=None):
+        """
+        Blocks until all the changes made before the call are
+        flushed. If the background thread is not running, the target
+        is flushed directly. Returns False if the timeout expired.
+        Raises the error of any flush which failed since the last
+        call, even if a later flush succeeded.
+        """
+        if not self.running():
+            with self.cond:
+                error, self.error = self.error, None
+            if error is not None: raise error
+            self.target.flush(dirty_only=True)
+            return True
+
+        deadline = None if timeout is None else time.time() + timeout
+        with self.cond:
+            self.requested += 1
+            ticket = self.requested
+            self.cond.notify_all()
+            while self.completed < ticket and self.error is None:
+                if not self.running(): break
+                if deadline is None:
+                    self.cond.wait(self.interval)
+                else:
+                    remain = deadline - time.time()
+                    if remain <= 0: return False
+                    self.cond.wait(remain)
+            if self.error is not None:
+                error, self.error = self.error, None
+                raise error
+            return self.completed >= ticket
+
+    def _run(self):
+        "Flushes the target until stopped"
+        while True:
+            with self.cond:
+                if not self.stopping and self.requested == self.completed:
+                    self.cond.wait(self.interval)
+                if self.stopping: return
+                ticket = self.requested
+                forced = ticket > self.completed
+
+            # Flush outside the lock so new requests can queue up
+            try:
+                if forced or self._over_threshold():
+                    self.target.flush(dirty_only=True)
+            except Exception as e:
+                # The error is kept until wait_durable() raises it
+                with self.cond:
+                    self.error = e
+                    self.completed = ticket
+                    self.cond.notify_all()
+                continue
+
+            with self.cond:
+                self.completed = ticket
+                self.cond.notify_all()
+
+    def _over_threshold(self):
+        "Checks if enough bytes were modified for a periodic flush"
+        dirty = self.target.dirty_bytes()
+        return dirty > 0 and dirty >= self.dirty_threshold
@@ -0,0 +1,208 @@
+"""
+Implements the hash engines used to map keys onto
+bit positions. Each engine has a numeric id which is
+persisted with a filter, so that a filter is always read
+back with the same hashes it was written with.
+"""
+import struct
+import sys
+
+# The engine ids. These are stored on disk, never renumber them.
+HASH_LEGACY = 0
+HASH_MURMUR3 = 1
+
+# The engine used for newly created filters
+DEFAULT_ENGINE = HASH_MURMUR3
+
+# The index modes, e.g. how the k hashes are derived. These are
+# stored on disk, never renumber them.
+INDEX_INDEPENDENT = 0
+INDEX_DOUBLE = 1
+
+# The index mode used for newly created filters
+DEFAULT_INDEX_MODE = INDEX_INDEPENDENT
+
+# Used to keep the arithmetic in 64 bits
+MASK_64 = (1 << 64) - 1
+
+# Integer keys are mixed with multiples of the 64 bit golden ratio
+GOLDEN_64 = 0x9e3779b97f4a7c15
+
+# Unicode keys are hashed as their bytes in this encoding,
+# except by the legacy engine, which hashes their code points
+KEY_ENCODING = "utf-8"
+
+def legacy_hashes(key, k):
+    """
+    Generates k hashes for a key using the DJB, DEK, FNV, and JS hashes.
+    Every 4 hashes, the key is salted and rehashed. This is the engine
+    used by filters created before hash engines were introduced. Unicode
+    keys are hashed by code point, as they always were.
+    """
+    max_val = (sys.maxint+1)*2
+    hashes = []
+    salt = ""
+    while len(hashes) < k:
+        # Get a set of new hashes
+        new_hashes = _legacy_hash(key, salt)
+        hashes.extend(new_hashes)
+
+        # Generate a new salt
+        salt_raw = (new_hashes[0] ^ new_hashes[1] ^ new_hashes[2] ^ new_hashes[3]) % max_val
+        salt = struct.pack("<Q", salt_raw)
+    return hashes[:k]
+
+def _legacy_hash(key, salt=""):
+    "Computes and returns the DJB, DEK, FNV, and JS hashes"
+    if salt and isinstance(key, unicode): salt = salt.decode("latin-1")
+    if salt: key = salt + key
+    max_val = (sys.maxint+1)*2
+    djb_hash = 5381
+    dek_hash = len(key)
+    fnv_prime = 0x811C9DC5
+    fnv_hash = 0
+    js_hash = 1315423911
+
+    for elem in key:
+        key_val = ord(elem)
+        djb_hash = (((djb_hash << 5) + djb_hash) + key_val) % max_val
+        dek_hash = (((dek_hash << 6) ^ (dek_hash >> 27)) ^ key_val) % max_val
+        fnv_hash = (fnv_hash * fnv_prime) % max_val
+        fnv_hash = fnv_hash ^ key_val
+        js_hash ^= (((js_hash << 5) + key_val + (js_hash >> 2)) % max_val)
+
+    return (djb_hash, dek_hash, fnv_hash, js_hash)
+
+def _rotl64(x, r):
+    "Rotates a 64 bit value left by r bits"
+    return ((x << r) | (x >> (64 - r))) & MASK_64
+
+def _fmix64(k):
+    "Final avalanche mix of a 64 bit value"
+    k ^= k >> 33
+    k = (k * 0xff51afd7ed558ccd) & MASK_64
+    k ^= k >> 33
+    k = (k * 0xc4ceb9fe1a85ec53) & MASK_64
+    k ^= k >> 33
+    return k
+
+def murmur3_128(key, seed=0):
+    """
+    Computes the 128 bit x64 variant of MurmurHash3 over
+    a string. Returns the two 64 bit halves of the hash.
+    """
+    length = len(key)
+    nblocks = length // 16
+    c1 = 0x87c37b91114253d5
+    c2 = 0x4cf5ad432745937f
+    h1 = h2 = seed
+
+    # Mix in the whole 16 byte blocks
+    for i in xrange(nblocks):
+        k1, k2 = struct.unpack_from("<QQ", key, i*16)
+
+        k1 = _rotl64((k1 * c1) & MASK_64, 31)
+        h1 ^= (k1 * c2) & MASK_64
+        h1 = (_rotl64(h1, 27) + h2) & MASK_64
+        h1 = (h1 * 5 + 0x52dce729) & MASK_64
+
+        k2 = _rotl64((k2 * c2) & MASK_64, 33)
+        h2 ^= (k2 * c1) & MASK_64
+        h2 = (_rotl64(h2, 31) + h1) & MASK_64
+        h2 = (h2 * 5 + 0x38495ab5) & MASK_64
+
+    # Mix in the remaining tail bytes
+    tail = key[nblocks*16:]
+    if len(tail) > 8:
+        k2 = struct.unpack("<Q", tail[8:].ljust(8, "\x00"))[0]
+        k2 = _rotl64((k2 * c2) & MASK_64, 33)
+        h2 ^= (k2 * c1) & MASK_64
+    if len(tail) > 0:
+        k1 = struct.unpack("<Q", tail[:8].ljust(8, "\x00"))[0]
+        k1 = _rotl64((k1 * c1) & MASK_64, 31)
+        h1 ^= (k1 * c2) & MASK_64
+
+    # Finalize
+    h1 ^= length
+    h2 ^= length
+    h1 = (h1 + h2) & MASK_64
+    h2 = (h2 + h1) & MASK_64
+    h1 = _fmix64(h1)
+    h2 = _fmix64(h2)
+    h1 = (h1 + h2) & MASK_64
+    h2 = (h2 + h1) & MASK_64
+    return (h1, h2)
+
+def murmur3_hashes(key, k):
+    """
+    Generates k hashes for a key using MurmurHash3. Each round
+    yields two hashes, and uses the round number as the seed.
+    """
+    hashes = []
+    seed = 0
+    while len(hashes) < k:
+        hashes.extend(murmur3_128(key, seed))
+        seed += 1
+    return hashes[:k]
+
+def int_hashes(key, k):
+    """
+    Generates k hashes for a 64 bit integer key. Hash i is the
+    MurmurHash3 finalizer applied to the key plus i+1 times the golden
+    ratio. Negative keys use their two's complement. Every engine hashes
+    integer keys this way, so they are never converted to strings.
+    """
+    if not -(1 << 63) <= key <= MASK_64:
+        raise OverflowError("Integer keys must fit in 64 bits!")
+    key &= MASK_64
+    return [_fmix64((key + (i+1)*GOLDEN_64) & MASK_64) for i in xrange(k)]
+
+def key_bytes(key):
+    """
+    Returns the bytes hashed for a key which is not an integer.
+    Strings are used as is, unicode is encoded with KEY_ENCODING,
+    and the contents of objects supporting the buffer interface,
+    e.g. bytearray, are used. Raises TypeError for other keys.
+    """
+    if isinstance(key, str): return key
+    if isinstance(key, unicode): return key.encode(KEY_ENCODING)
+    if isinstance(key, memoryview): return key.tobytes()
+    if key is None: raise TypeError("Keys can not be None!")
+    return str(buffer(key))
+
+# Maps the engine ids to the function generating the hashes
+ENGINES = {
+    HASH_LEGACY: legacy_hashes,
+    HASH_MURMUR3: murmur3_hashes,
+}
+
+# The known index modes
+INDEX_MODES = (INDEX_INDEPENDENT, INDEX_DOUBLE)
+
+def double_hashes(h1, h2, k):
+    """
+    Derives k hashes from two base hashes, using h1 + i*h2.
+    From "Less Hashing, Same Performance", Kirsch and Mitzenmacher 2006.
+    """
+    return [(h1 + i*h2) & MASK_64 for i in xrange(k)]
+
+def get_hashes(engine, key, k, mode=INDEX_INDEPENDENT):
+    """
+    Generates k hashes for a key using the given hash engine.
+    In the INDEX_DOUBLE mode, the key is only hashed once and
+    the k hashes are derived from the first two. Integer keys
+    are hashed with int_hashes, see key_bytes for the others. The
+    legacy engine hashes unicode keys by code point instead.
+    """
+    try:
+        func = ENGINES[engine]
+    except KeyError:
+        raise ValueError("Unknown hash engine %r!" % engine)
+    if isinstance(key, (int, long)):
+        func = int_hashes
+    elif engine != HASH_LEGACY or not isinstance(key, unicode):
+        key = key_bytes(key)
+    if mode == INDEX_DOUBLE:
+        h1, h2 = func(key, 2)
+        return double_hashes(h1, h2, k)
+    return func(key, k)
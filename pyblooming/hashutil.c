@@ -0,0 +1,95 @@
+#include <stdint.h>
+#include <string.h>
+#include "hashutil.h"
+
+#define ROTL64(x, r) (((x) << (r)) | ((x) >> (64 - (r))))
+
+/**
+ * Final avalanche mix of a 64 bit value.
+ */
+static inline uint64_t fmix64(uint64_t k) {
+    k ^= k >> 33;
+    k *= 0xff51afd7ed558ccdULL;
+    k ^= k >> 33;
+    k *= 0xc4ceb9fe1a85ec53ULL;
+    k ^= k >> 33;
+    return k;
+}
+
+/**
+ * Reads a little endian 64 bit word from a possibly unaligned address.
+ */
+static inline uint64_t read64(const uint8_t* p) {
+    uint64_t v = 0;
+    int i;
+    for (i = 7; i >= 0; i--) v = (v << 8) | p[i];
+    return v;
+}
+
+/**
+ * Computes the 128 bit x64 variant of MurmurHash3.
+ * @arg key The key to hash
+ * @arg len The length of the key in bytes
+ * @arg seed The seed value
+ * @arg out Output array, receives the two 64 bit halves of the hash
+ */
+void murmur3_128(const void* key, size_t len, uint32_t seed, uint64_t out[2]) {
+    const uint8_t* data = (const uint8_t*)key;
+    const size_t nblocks = len / 16;
+    const uint64_t c1 = 0x87c37b91114253d5ULL;
+    const uint64_t c2 = 0x4cf5ad432745937fULL;
+    uint64_t h1 = seed;
+    uint64_t h2 = seed;
+    uint64_t k1, k2;
+    size_t i;
+
+    // Mix in the whole 16 byte blocks
+    for (i = 0; i < nblocks; i++) {
+        k1 = read64(data + i*16);
+        k2 = read64(data + i*16 + 8);
+
+        k1 *= c1; k1 = ROTL64(k1, 31); k1 *= c2; h1 ^= k1;
+        h1 = ROTL64(h1, 27); h1 += h2; h1 = h1*5 + 0x52dce729;
+
+        k2 *= c2; k2 = ROTL64(k2, 33); k2 *= c1; h2 ^= k2;
+        h2 = ROTL64(h2, 31); h2 += h1; h2 = h2*5 + 0x38495ab5;
+    }
+
+    // Mix in the remaining tail bytes
+    const uint8_t* tail = data + nblocks*16;
+    size_t rem = len & 15;
+    k1 = 0;
+    k2 = 0;
+    for (i = rem; i > 8; i--) k2 = (k2 << 8) | tail[i-1];
+    for (i = (rem > 8 ? 8 : rem); i > 0; i--) k1 = (k1 << 8) | tail[i-1];
+    if (rem > 8) {
+        k2 *= c2; k2 = ROTL64(k2, 33); k2 *= c1; h2 ^= k2;
+    }
+    if (rem > 0) {
+        k1 *= c1; k1 = ROTL64(k1, 31); k1 *= c2; h1 ^= k1;
+    }
+
+    // Finalize
+    h1 ^= (uint64_t)len;
+    h2 ^= (uint64_t)len;
+    h1 += h2;
+    h2 += h1;
+    h1 = fmix64(h1);
+    h2 = fmix64(h2);
+    h1 += h2;
+    h2 += h1;
+
+    out[0] = h1;
+    out[1] = h2;
+}
+
+/**
+ * Computes a hash of a 64 bit integer key, by mixing the
+ * key plus i+1 times the 64 bit golden ratio.
+ * @arg key The key to hash
+ * @arg i The index of the hash
+ * @return The i'th hash of the key
+ */
+uint64_t int_hash(uint64_t key, uint32_t i) {
+    return fmix64(key + (uint64_t)(i + 1) * 0x9e3779b97f4a7c15ULL);
+}
@@ -0,0 +1,27 @@
+/**
+ * Header file for hashutil.c
+ */
+#ifndef HASHUTIL_H
+#define HASHUTIL_H
+#include <stdint.h>
+#include <stddef.h>
+
+/**
+ * Computes the 128 bit x64 variant of MurmurHash3.
+ * @arg key The key to hash
+ * @arg len The length of the key in bytes
+ * @arg seed The seed value
+ * @arg out Output array, receives the two 64 bit halves of the hash
+ */
+void murmur3_128(const void* key, size_t len, uint32_t seed, uint64_t out[2]);
+
+/**
+ * Computes a hash of a 64 bit integer key, by mixing the
+ * key plus i+1 times the 64 bit golden ratio.
+ * @arg key The key to hash
+ * @arg i The index of the hash
+ * @return The i'th hash of the key
+ */
+uint64_t int_hash(uint64_t key, uint32_t i);
+
+#endif
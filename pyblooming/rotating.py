@@ -0,0 +1,232 @@
+"""
+This module implements a rotating bloom filter, which
+keeps a fixed number of generations of filters so that keys
+expire after a number of rotations.
+"""
+import json
+import os
+import os.path
+import time
+
+# Try to import the C version, fallback to Python
+try:
+    import cbitmap as bitmaplib
+except ImportError:
+    import bitmap as bitmaplib
+try:
+    from cbloom import BloomFilter
+except ImportError:
+    from bloom import BloomFilter
+
+
+class RotatingBloomFilter(object):
+    # The suffix of the generation files in a directory
+    FILTER_SUFFIX = ".bloom"
+
+    # The manifest records the order of the generations in a directory
+    MANIFEST = "manifest.json"
+    MANIFEST_VERSION = 1
+
+    def __init__(self, filters=None, filenames=None, callback=None, generations=2, capacity=1e6, prob=1e-4,
+                 period=None, hash_engine=None, index_mode=None, directory=None):
+        """
+        Creates a new RotatingBloomFilter. Keys are added to the newest
+        generation and checked against all of them. Each rotation clears
+        the oldest generation and reuses its bitmap as the newest, so a
+        key is kept for between generations-1 and generations rotations.
+
+        :Parameters:
+            - filters (optional) : A list of filters to initialize with,
+              oldest first. They must have the same k, hash engine and
+              index mode. Without this, new filters are created.
+            - filenames (optional) : A callable that generates file names
+              for the new BloomFilters. Without this, anonymous bitmaps
+              will be used.
+            - callback (optional) : A callable that generates bitmaps
+              for the new BloomFilters. Function must take a size parameter,
+              and return bitmaps of that size. The default callback will
+              invoke the filenames callback to get a filename.
+            - generations (optional) : The number of generations. Defaults to 2.
+            - capacity (optional) : The capacity of each generation.
+            - prob (optional) : The false positive rate to enforce. Each
+              generation uses prob / generations, since a key is checked
+              against every generation.
+            - period (optional) : If provided, the filter is rotated
+              automatically every period seconds.
+            - hash_engine (optional) : The hash engine used by new filters.
+            - index_mode (optional) : The index mode used by new filters.
+            - directory (optional) : If provided, new generations are created
+              in this directory with headers, and a manifest of their order
+              and rotation times is kept, so it can be reopened with open().
+              Can not be used with filenames or callback.
+        """
+        if filenames is not None and not callable(filenames):
+            raise ValueError("Filenames must be callable!")
+        if callback is not None and not callable(callback):
+            raise ValueError("Callback must be callable!")
+        if generations < 1: raise ValueError("Must have at least 1 generation!")
+        if period is not None and period <= 0: raise ValueError("Period must be positive!")
+        if directory and (filenames or callback):
+            raise ValueError("Can not use a directory with filenames or a callback!")
+        self.filenames = filenames
+        self.callback = callback or self._callback
+        self.period = period
+        self.directory = directory
+        self.rotated_at = time.time()
+        if directory and not os.path.isdir(directory): os.makedirs(directory)
+
+        if filters:
+            self.filters = list(filters)
+        else:
+            header = bool(directory)
+            length, k = BloomFilter.params_for_capacity(capacity, float(prob) / generations, header=header)
+            self.filters = []
+            for idx in xrange(generations):
+                filt = BloomFilter(self.callback(length), k, hash_engine, index_mode, header=header)
+                if directory: filt.info["file"] = self._filter_name(idx)
+                self.filters.append(filt)
+        for filt in self.filters:
+            filt.info.setdefault("started_at", self.rotated_at)
+
+        # Keys are hashed once for every generation
+        first = self.filters[0]
+        for filt in self.filters[1:]:
+            if (filt.k_num, filt.hash_engine, filt.index_mode) != (first.k_num, first.hash_engine, first.index_mode):
+                raise ValueError("Filters must have the same k, hash engine and index mode!")
+        if directory: self._write_manifest()
+
+    @classmethod
+    def open(cls, directory, **kwargs):
+        """
+        Opens a RotatingBloomFilter from a directory created with
+        directory. The generations are restored in the order of the
+        manifest, with the time of the last rotation, so the next rotation
+        retires the right generation. Any keyword arguments are passed to
+        the constructor, overriding the saved period.
+        """
+        with open(os.path.join(directory, cls.MANIFEST)) as fh:
+            manifest = json.load(fh)
+        if manifest.get("version") != cls.MANIFEST_VERSION:
+            raise ValueError("Unsupported manifest version %r!" % manifest.get("version"))
+
+        filters = []
+        for entry in manifest["filters"]:
+            filt = BloomFilter.open(os.path.join(directory, entry["file"]))
+            filt.info["file"] = entry["file"]
+            filt.info["started_at"] = entry["started_at"]
+            filters.append(filt)
+        kwargs.setdefault("period", manifest["period"])
+        rotating = cls(filters=filters, directory=directory, **kwargs)
+        rotating.rotated_at = manifest["rotated_at"]
+        rotating._write_manifest()
+        return rotating
+
+    def _filter_name(self, idx):
+        "Returns the file name of a generation in the directory"
+        return "%06d%s" % (idx, self.FILTER_SUFFIX)
+
+    def _write_manifest(self):
+        """
+        Writes the manifest to a temporary file which is then renamed,
+        so a reader never sees a partial manifest.
+        """
+        manifest = {"version": self.MANIFEST_VERSION, "period": self.period, "rotated_at": self.rotated_at,
+                    "filters": [{"file": filt.info["file"], "started_at": filt.info["started_at"]}
+                                for filt in self.filters]}
+        path = os.path.join(self.directory, self.MANIFEST)
+        with open(path + ".tmp", "w") as fh:
+            json.dump(manifest, fh, indent=2, sort_keys=True)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.rename(path + ".tmp", path)
+
+    def _callback(self, length):
+        """
+        Default callback used to make bitmaps. Uses the
+        filenames callback to get a filename, or creates a
+        new anonymous bitmap if none is provided.
+        """
+        filename = None
+        if self.filenames:
+            filename = self.filenames()
+        elif self.directory:
+            filename = os.path.join(self.directory, self._filter_name(len(self.filters)))
+        return bitmaplib.Bitmap(length, filename)
+
+    def rotate(self):
+        """
+        Retires the oldest generation, dropping its keys. Its bitmap
+        is cleared in place and reused as the newest generation,
+        so nothing is allocated or rebuilt. The cleared bitmap is
+        flushed before the new order is saved in the manifest, so the
+        retired keys do not come back after a crash.
+        """
+        oldest = self.filters.pop(0)
+        oldest.clear()
+        oldest.flush()
+        self.filters.append(oldest)
+        self.rotated_at = time.time()
+        oldest.info["started_at"] = self.rotated_at
+        if self.directory: self._write_manifest()
+
+    def _check_rotate(self):
+        "Rotates the filter for each period that has passed"
+        if self.period is None: return
+        elapsed = time.time() - self.rotated_at
+        if elapsed < self.period: return
+        for x in xrange(min(int(elapsed / self.period), len(self.filters))):
+            self.rotate()
+
+    def add(self, key, check_first=False):
+        "Add a key to the newest generation"
+        self._check_rotate()
+        newest = self.filters[-1]
+        hashes = newest.key_hashes(key)
+        if check_first and self._contains_hashes(hashes): return False
+        return newest.add_hashes(hashes)
+
+    def __contains__(self, key):
+        "Checks if any generation contains a given key"
+        self._check_rotate()
+        return self._contains_hashes(self.filters[-1].key_hashes(key))
+
+    def _contains_hashes(self, hashes):
+        "Checks the generations for a key, newest first"
+        for filt in reversed(self.filters):
+            if filt.contains_hashes(hashes): return True
+        return False
+
+    def add_many(self, keys, check_first=False):
+        """
+        Adds every key in an iterable to the newest generation.
+        Returns the number of keys that were added.
+        """
+        return len([key for key in keys if self.add(key, check_first)])
+
+    def contains_many(self, keys):
+        """
+        Checks if the set contains each key in an iterable.
+        Returns a list of booleans in the same order as the keys.
+        """
+        return [self.__contains__(key) for key in keys]
+
+    def __len__(self):
+        "Returns the number of keys added to the current generations"
+        return sum(len(filt) for filt in self.filters)
+
+    def flush(self, dirty_only=False):
+        """
+        Flushes all the generations. If dirty_only is True,
+        only the modified pages of each filter are written.
+        """
+        for filt in self.filters:
+            filt.flush(dirty_only=dirty_only)
+
+    def dirty_bytes(self):
+        "Returns the number of bytes modified since the last flush"
+        return sum(filt.dirty_bytes() for filt in self.filters)
+
+    def close(self, flush=True):
+        "Closes all the generations"
+        for filt in self.filters:
+            filt.close(flush=flush)
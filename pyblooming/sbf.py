@@ -2,6 +2,11 @@
 This module implements a scalable bloom filter
 based on our static bloom filters.
 """
+import json
+import os
+import os.path
+import threading
+
 # Try to import the C version, fallback to Python
 try:
     import cbitmap as bitmaplib
@@ -13,8 +18,93 @@ except ImportError:
     from bloom import BloomFilter
 
 
+class LazyFilter(object):
+    def __init__(self, filename, info, k_num, hash_engine, index_mode, bitmap_size, count, threadsafe=False):
+        """
+        Stands in for a filter listed in a manifest, and only opens
+        it when it is first used. Until then, the parameters and count
+        recorded in the manifest are used.
+
+        :Parameters:
+            - filename : The path of the filter.
+            - info : The info of the filter, with its prob and capacity.
+            - k_num, hash_engine, index_mode, bitmap_size : The parameters
+              of the filter.
+            - count : The number of keys in the filter.
+            - threadsafe (optional) : Opens the filter in thread safe mode.
+        """
+        self.filename = filename
+        self.info = info
+        self.k_num = k_num
+        self.hash_engine = hash_engine
+        self.index_mode = index_mode
+        self.bitmap_size = bitmap_size
+        self.count = count
+        self.threadsafe = threadsafe
+        self.filter = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        "Opens the filter if needed, and returns it"
+        with self.lock:
+            if self.filter is None:
+                filt = BloomFilter.open(self.filename, threadsafe=self.threadsafe)
+                filt.info = self.info
+                self.filter = filt
+        return self.filter
+
+    def loaded(self):
+        "Returns if the filter has been opened"
+        return self.filter is not None
+
+    def __getattr__(self, name):
+        # Everything else needs the filter
+        return getattr(self.load(), name)
+
+    def __len__(self):
+        "Returns the number of keys, from the manifest until opened"
+        if self.filter is None: return self.count
+        return len(self.filter)
+
+    def flush(self, dirty_only=False):
+        "Flushes the filter if it was opened"
+        if self.filter is not None: self.filter.flush(dirty_only=dirty_only)
+
+    def dirty_bytes(self):
+        "Returns the bytes modified since the last flush"
+        if self.filter is None: return 0
+        return self.filter.dirty_bytes()
+
+    def close(self, flush=True):
+        "Closes the filter if it was opened"
+        if self.filter is not None:
+            self.count = len(self.filter)
+            self.filter.close(flush=flush)
+            self.filter = None
+
+
 class ScalingBloomFilter(object):
-    def __init__(self, filters=None, filenames=None, callback=None, initial_capacity=1e6, prob=1e-4, scale_size=4, prob_reduction=0.9):
+    # The suffix of the filter files in a directory. New filters are
+    # created with the temporary suffix, and renamed once they are added
+    FILTER_SUFFIX = ".bloom"
+    TEMP_SUFFIX = ".tmp"
+
+    # The manifest describes the filter files in a directory
+    MANIFEST = "manifest.json"
+    MANIFEST_VERSION = 1
+
+    # The orders in which lookups probe the filters
+    PROBE_NEWEST = "newest"
+    PROBE_LARGEST = "largest"
+    PROBE_ADAPTIVE = "adaptive"
+    PROBE_ORDERS = (PROBE_NEWEST, PROBE_LARGEST, PROBE_ADAPTIVE)
+
+    # The number of lookups between updates of the adaptive order
+    ADAPT_INTERVAL = 1024
+
+    def __init__(self, filters=None, filenames=None, callback=None, initial_capacity=1e6, prob=1e-4, scale_size=4, prob_reduction=0.9,
+                 hash_engine=None, index_mode=None, preallocate=False, threadsafe=False, directory=None,
+                 prebuild_threshold=None, probe_order=None):
         """
         Creates a new ScalingBloomFilter that tries to enforce
         a given false positive probability by creating new Bloom Filters
@@ -35,9 +125,41 @@ class ScalingBloomFilter(object):
             - scale_size (optional) : The file size growth rate. Defaults to 4.
             - prob_reduction (optional) : The probability reduction with
               each new filter. Defaults to 0.9.
+            - hash_engine (optional) : The hash engine used by new filters.
+            - index_mode (optional) : The index mode used by new filters.
+            - preallocate (optional) : If True, the default callback allocates
+              the disk space of new files up front instead of sparsely.
+            - threadsafe (optional) : If True, the filter can be used by
+              several threads at once. New filters are created under a lock,
+              so only one is added when threads fill a filter together, and
+              are thread safe filters. The callback must return atomic
+              bitmaps, which the default callback does.
+            - directory (optional) : If provided, new filters are created
+              in this directory with headers, and a manifest of the filters
+              and parameters is kept, so it can be reopened with open().
+              Can not be used with filenames or callback.
+            - prebuild_threshold (optional) : If provided, the next filter is
+              built in a background thread once the largest filter holds this
+              fraction of its capacity, e.g. 0.8. Growing then only swaps in
+              the prebuilt filter, instead of creating it while the caller
+              waits. Combine with preallocate to also move the disk
+              allocation off the insert path.
+            - probe_order (optional) : The order in which lookups probe the
+              filters, one of PROBE_ORDERS. PROBE_NEWEST probes the newest
+              filter first, PROBE_LARGEST the filter with the most bits, and
+              PROBE_ADAPTIVE the filter with the highest observed hit rate,
+              which is updated every ADAPT_INTERVAL lookups. Defaults to
+              PROBE_NEWEST.
         """
         if filenames is not None and not callable(filenames):
             raise ValueError("Filenames must be callable!")
+        if directory and (filenames or callback):
+            raise ValueError("Can not use a directory with filenames or a callback!")
+        if prebuild_threshold is not None and not 0 < prebuild_threshold < 1:
+            raise ValueError("Prebuild threshold must be between 0 and 1!")
+        if probe_order is None: probe_order = self.PROBE_NEWEST
+        if probe_order not in self.PROBE_ORDERS:
+            raise ValueError("Bad value provided for probe order!")
         self.filenames = filenames
         if callback is not None and not callable(callback):
             raise ValueError("Callback must be callable!")
@@ -46,23 +168,238 @@ class ScalingBloomFilter(object):
         self.init_capacity = initial_capacity
         self.scale_size = scale_size
         self.prob_reduction = prob_reduction
+        self.hash_engine = hash_engine
+        self.index_mode = index_mode
+        self.preallocate = preallocate
+        self.threadsafe = threadsafe
+        self.directory = directory
+        self.written_manifest = None
+        self.manifest_lock = threading.Lock()
+        if directory and not os.path.isdir(directory): os.makedirs(directory)
+        self.lock = threading.Lock() if threadsafe else None
+        self.prebuild_threshold = prebuild_threshold
+        self.prebuild_lock = threading.Lock()
+        self.prebuilder = None
+        self.prebuilt = None
+        self.probe_order = probe_order
+        self.lookups = 0
+        self.order = None
+
+        # In thread safe mode, operations register under the current epoch,
+        # so a compaction can wait for them before closing the old filters
+        self.readers = threading.Condition()
+        self.epoch = 0
+        self.active = {}
         self.filters = filters if filters else []
+        self.hash_counts = {}
         self._initialize()
+
+        # The manifest records the counts as of the last flush, so it
+        # never counts keys whose bits may not be on disk
+        self.flushed_counts = dict((id(filt), len(filt)) for filt in self.filters)
         if len(self.filters) == 0:
-            self.filters.append(self._create_filter())
+            self._append_filter(self._create_filter())
+
+    @classmethod
+    def open(cls, directory, lazy=True, **kwargs):
+        """
+        Opens a ScalingBloomFilter from a directory created with
+        directory. The parameters and filters are restored from the
+        manifest, and any keyword arguments are passed to the constructor,
+        overriding the parameters. If lazy is True, only the largest
+        filter is opened, and the others are opened when a lookup reaches
+        them. Opening does not write to the directory, so it can be
+        opened while another filter is adding to it. Directories without
+        a manifest are opened from the filter files, in the order they
+        were created.
+        """
+        threadsafe = kwargs.get("threadsafe", False)
+        path = os.path.join(directory, cls.MANIFEST)
+        if not os.path.exists(path):
+            names = [n for n in os.listdir(directory) if n.endswith(cls.FILTER_SUFFIX)]
+            names.sort(key=lambda n: int(n[:-len(cls.FILTER_SUFFIX)]))
+            filters = [BloomFilter.open(os.path.join(directory, n), threadsafe=threadsafe) for n in names]
+            for name, filt in zip(names, filters):
+                filt.info["file"] = name
+            return cls(filters=filters, directory=directory, **kwargs)
+
+        with open(path) as fh:
+            manifest = json.load(fh)
+        if manifest.get("version") != cls.MANIFEST_VERSION:
+            raise ValueError("Unsupported manifest version %r!" % manifest.get("version"))
+        params = dict((str(key), val) for key, val in manifest["params"].items())
+        params.update(kwargs)
+
+        filters = []
+        for idx, entry in enumerate(manifest["filters"]):
+            filename = os.path.join(directory, entry["file"])
+            info = {"prob": entry["prob"], "capacity": entry["capacity"], "file": entry["file"]}
+            if lazy and idx < len(manifest["filters"]) - 1:
+                filt = LazyFilter(filename, info, entry["k"], entry["hash_engine"], entry["index_mode"],
+                                  entry["bits"], entry["count"], threadsafe)
+            else:
+                filt = BloomFilter.open(filename, threadsafe=threadsafe)
+                filt.info = info
+            filters.append(filt)
+
+        # The manifest is only rewritten once something changes
+        sbf = cls(filters=filters, directory=directory, **params)
+        sbf.written_manifest = manifest
+        sbf.flushed_counts = dict((id(filt), entry["count"]) for filt, entry in zip(filters, manifest["filters"]))
+        return sbf
+
+    def _manifest(self):
+        """
+        Returns the manifest describing the parameters and filters.
+        The count of each filter is the count at its last flush, and
+        filters which were never flushed are recorded as empty.
+        """
+        counts = self.flushed_counts
+        params = {"initial_capacity": self.init_capacity, "prob": self.prob,
+                  "scale_size": self.scale_size, "prob_reduction": self.prob_reduction,
+                  "hash_engine": self.hash_engine, "index_mode": self.index_mode}
+        filters = [{"file": filt.info["file"], "prob": filt.info["prob"],
+                    "capacity": filt.info["capacity"], "k": filt.k_num,
+                    "hash_engine": filt.hash_engine, "index_mode": filt.index_mode,
+                    "bits": filt.bitmap_size,
+                    "count": counts.get(id(filt), 0)}
+                   for filt in self.filters]
+        return {"version": self.MANIFEST_VERSION, "params": params, "filters": filters}
+
+    def _write_manifest(self):
+        """
+        Writes the manifest to a temporary file which is then renamed,
+        so a reader never sees a partial manifest. Does nothing if
+        the manifest is unchanged.
+        """
+        with self.manifest_lock:
+            manifest = self._manifest()
+            if manifest == self.written_manifest: return
+            path = os.path.join(self.directory, self.MANIFEST)
+            with open(path + ".tmp", "w") as fh:
+                json.dump(manifest, fh, indent=2, sort_keys=True)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.rename(path + ".tmp", path)
+            self.written_manifest = manifest
+
+    def _filter_name(self, idx):
+        "Returns the file name of a filter in the directory"
+        return "%06d%s" % (idx, self.FILTER_SUFFIX)
+
+    def _next_filter_name(self):
+        """
+        Returns the file name of the next filter in the directory.
+        Names keep increasing after a compaction, so they never reuse
+        the name of a removed filter.
+        """
+        names = [filt.info["file"] for filt in self.filters if "file" in filt.info]
+        idx = max([int(n[:-len(self.FILTER_SUFFIX)]) + 1 for n in names] + [len(self.filters)])
+        return self._filter_name(idx)
 
     def _initialize(self):
-        "Initializes the probability and capacity of existing filters"
+        """
+        Initializes the probability and capacity of existing filters.
+        Filters which already have them, e.g. from a manifest, keep them.
+        """
         # Bound the ultimate probability by adjusting for the initial
         # From "Scalable Bloom Filters", Almeida 2007
         # We use : P <= P0 * (1 / (1 - r))
         prob = (1 - self.prob_reduction) * self.prob
 
         for filt in self.filters:
-            size = len(filt.bitmap) - 8 * filt.extra_buffer()
-            filt.info["prob"] = prob
-            filt.info["capacity"] = int(BloomFilter.expected_capacity(size, prob))
-            prob *= self.prob_reduction
+            if "prob" not in filt.info or "capacity" not in filt.info:
+                size = filt.bitmap_size
+                filt.info["prob"] = prob
+                filt.info["capacity"] = int(BloomFilter.expected_capacity(size, prob))
+            prob = filt.info["prob"] * self.prob_reduction
+            self._track_hashes(filt)
+            self._init_stats(filt)
+
+    def _track_hashes(self, filt):
+        """
+        Tracks the number of hashes needed by the filters
+        for each pair of hash engine and index mode.
+        """
+        sig = (filt.hash_engine, filt.index_mode)
+        self.hash_counts[sig] = max(self.hash_counts.get(sig, 0), filt.k_num)
+
+    def _init_stats(self, filt):
+        "Initializes the lookup statistics of a filter"
+        filt.info.setdefault("probes", 0)
+        filt.info.setdefault("hits", 0)
+
+    def _append_filter(self, filt):
+        "Adds a new filter as the largest filter"
+        self._adopt(filt)
+
+        # Track the hashes first, so readers can use the new filter at once
+        self._track_hashes(filt)
+        self._init_stats(filt)
+        self.filters.append(filt)
+        if self.directory: self._write_manifest()
+
+    def _adopt(self, filt):
+        """
+        Renames the file of a new filter in a directory from its
+        temporary name, before the manifest lists it. Until then, the
+        file is only known to this filter, and others ignore it.
+        """
+        if not self.directory or not filt.info.pop("temporary", False): return
+        path = os.path.join(self.directory, filt.info["file"])
+        os.rename(path + self.TEMP_SUFFIX, path)
+
+    def _grow(self, full):
+        """
+        Adds a new filter once the largest filter is full, and returns
+        the largest filter. In thread safe mode, a filter is only added if
+        another thread has not already replaced the full filter.
+        """
+        if self.lock is None:
+            self._add_next_filter()
+            return self.filters[-1]
+        with self.lock:
+            if self.filters[-1] is full:
+                self._add_next_filter()
+            return self.filters[-1]
+
+    def _check_prebuild(self, filt):
+        """
+        Starts building the next filter in the background once
+        the largest filter passes the prebuild threshold.
+        """
+        if self.prebuilder is not None or len(filt) < self.prebuild_threshold * filt.info["capacity"]:
+            return
+        with self.prebuild_lock:
+            if self.prebuilder is not None or filt is not self.filters[-1]: return
+            self.prebuilder = threading.Thread(target=self._prebuild, name="pyblooming-prebuild")
+            self.prebuilder.daemon = True
+            self.prebuilder.start()
+
+    def _prebuild(self):
+        "Builds the next filter, run by the prebuild thread"
+        # Errors are dropped, the filter is then created inline
+        try:
+            self.prebuilt = self._create_filter()
+        except Exception:
+            self.prebuilt = None
+
+    def _add_next_filter(self):
+        """
+        Appends the next filter. If it is being built in the background,
+        waits for it. If the background build failed, the filter is
+        created inline, so the error reaches the caller. The prebuild lock
+        is held until the filter is appended, so a new build can not start
+        from the full filter.
+        """
+        with self.prebuild_lock:
+            filt, thread = None, self.prebuilder
+            if thread is not None:
+                thread.join()
+                filt = self.prebuilt
+                self.prebuilder = self.prebuilt = None
+            if filt is None: filt = self._create_filter()
+            self._append_filter(filt)
 
     def _callback(self, length):
         """
@@ -74,15 +411,24 @@ class ScalingBloomFilter(object):
         filename = None
         if self.filenames:
             filename = self.filenames()
+        elif self.directory:
+            # A temporary file left by a crash is never listed, so replace it
+            filename = os.path.join(self.directory, self._next_filter_name() + self.TEMP_SUFFIX)
+            if os.path.exists(filename): os.remove(filename)
 
         # Create a new bitmap
-        bitmap = bitmaplib.Bitmap(length, filename)
+        bitmap = bitmaplib.Bitmap(length, filename, preallocate=self.preallocate, atomic=self.threadsafe)
         return bitmap
 
-    def _create_filter(self):
-        "Creates a new filter"
+    def _create_filter(self, capacity=None):
+        """
+        Creates a new filter. If a capacity is provided, the filter
+        is created with it and the probability of the first filter.
+        """
         # Get the initial parameters
-        capacity, prob = self.init_capacity, self.prob
+        prob = self.prob
+        initial = capacity is not None
+        if not initial: capacity = self.init_capacity
 
         # Bound the ultimate probability by adjusting for the initial
         # From "Scalable Bloom Filters", Almeida 2007
@@ -90,7 +436,7 @@ class ScalingBloomFilter(object):
         prob = (1 - self.prob_reduction) * prob
 
         # Update our parameters if we have filters
-        if len(self.filters) > 0:
+        if len(self.filters) > 0 and not initial:
             # Grow by the scale size
             capacity = self.filters[-1].info["capacity"] * self.scale_size
 
@@ -98,54 +444,344 @@ class ScalingBloomFilter(object):
             prob = self.filters[-1].info["prob"] * self.prob_reduction
 
         # Compute the new size and K
-        length, k = BloomFilter.params_for_capacity(capacity, prob)
+        header = bool(self.directory)
+        length, k = BloomFilter.params_for_capacity(capacity, prob, header=header)
 
         # Invoke our callback to get a bitmap
         bitmap = self.callback(length)
 
         # Create a new bloom filter
-        filter = BloomFilter(bitmap, k)
+        filter = BloomFilter(bitmap, k, self.hash_engine, self.index_mode, threadsafe=self.threadsafe,
+                             header=header)
 
         # Add the new properties
         filter.info["prob"] = prob
         filter.info["capacity"] = capacity
+        if self.directory:
+            filter.info["file"] = self._next_filter_name()
+            filter.info["temporary"] = True
         return filter
 
+    def compact(self, keys, headroom=2.0, expected_count=None):
+        """
+        Replaces the filters with a single filter, so lookups only
+        probe one filter. The filters do not keep the keys, so keys must
+        provide every key that was added, e.g. from a retained key stream.
+        The keys are streamed into the new filter, which is sized for
+        headroom times expected_count, or the current count if it is not
+        provided, with the probability of the first filter. Later filters
+        grow from it, but the filter itself is not grown during the
+        compaction, so expected_count should not be an underestimate.
+
+        Keys added during a compaction are lost unless they are also in
+        keys, and no new filter is added until it completes. In thread safe
+        mode, the old filters are closed once the operations that started
+        before the swap are done. Otherwise, no other method may be called
+        during a compaction. In a directory, the new filter gets a new file
+        and the manifest is replaced atomically before the old files are
+        removed. Returns the new filter.
+        """
+        if headroom < 1: raise ValueError("Headroom must be at least 1!")
+        if expected_count is None: expected_count = len(self)
+
+        # Hold the locks in the order used by growth, so no filter is
+        # added or built in the background meanwhile
+        if self.lock: self.lock.acquire()
+        try:
+            with self.prebuild_lock:
+                self._take_prebuilt()
+                filt = self._create_filter(max(self.init_capacity, int(expected_count * headroom)))
+                filt.add_many(keys)
+                filt.flush()
+
+                # Swap in the new filter, then publish it
+                with self.readers:
+                    old, self.filters = self.filters, [filt]
+                    epoch = self.epoch
+                    self.epoch += 1
+                self._adopt(filt)
+                self.flushed_counts = {id(filt): len(filt)}
+                self.hash_counts = {}
+                self._track_hashes(filt)
+                self._init_stats(filt)
+                if self.directory: self._write_manifest()
+        finally:
+            if self.lock: self.lock.release()
+
+        # Wait for the operations which may still use the old filters
+        with self.readers:
+            while any(e <= epoch for e in self.active):
+                self.readers.wait()
+
+        for prev in old:
+            prev.close(flush=False)
+            if self.directory:
+                os.remove(os.path.join(self.directory, prev.info["file"]))
+        return filt
+
+    def _discard_prebuilt(self):
+        "Discards a filter built in the background, see _take_prebuilt"
+        with self.prebuild_lock:
+            self._take_prebuilt()
+
+    def _take_prebuilt(self):
+        """
+        Waits for a filter being built in the background, and closes it.
+        In a directory its temporary file is removed. The prebuild lock
+        must be held.
+        """
+        if self.prebuilder is None: return
+        self.prebuilder.join()
+        filt = self.prebuilt
+        self.prebuilder = self.prebuilt = None
+        if filt is None: return
+        filt.close(flush=False)
+        if self.directory:
+            os.remove(os.path.join(self.directory, filt.info["file"] + self.TEMP_SUFFIX))
+
+    def _enter(self):
+        """
+        Registers an operation on the filters in thread safe mode, so
+        a compaction does not close them while they are used. Returns
+        the epoch to pass to _exit, or None if nothing is tracked.
+        """
+        if self.lock is None: return None
+        with self.readers:
+            epoch = self.epoch
+            self.active[epoch] = self.active.get(epoch, 0) + 1
+        return epoch
+
+    def _exit(self, epoch):
+        "Unregisters an operation started by _enter"
+        if epoch is None: return
+        with self.readers:
+            self.active[epoch] -= 1
+            if not self.active[epoch]:
+                del self.active[epoch]
+                self.readers.notify_all()
+
     def add(self, key, check_first=False):
         "Add a key to the set"
-        if check_first and key in self:
+        epoch = self._enter()
+        try:
+            return self._add(key, check_first)
+        finally:
+            self._exit(epoch)
+
+    def _add(self, key, check_first):
+        "Adds a key to the largest filter, growing if it is full"
+        hashes = {}
+        if check_first and self._contains(key, hashes):
             return False
 
         # Check if we are over capacity, create a new filter
         filt = self.filters[-1]
         if len(filt) + 1 >= filt.info["capacity"]:
-            filt = self._create_filter()
-            self.filters.append(filt)
+            filt = self._grow(filt)
+        elif self.prebuild_threshold:
+            self._check_prebuild(filt)
 
         # Add the key to the largest filter
-        return filt.add(key)
+        return filt.add_hashes(self._key_hashes(filt, key, hashes))
+
+    def add_many(self, keys, check_first=False):
+        """
+        Adds every key in an iterable to the set. Keys are added
+        to the largest filter in batches that fit in its capacity.
+        Returns the number of keys that were added.
+        """
+        epoch = self._enter()
+        try:
+            if check_first:
+                return len([key for key in keys if self._add(key, True)])
+            return self._add_many(list(keys))
+        finally:
+            self._exit(epoch)
+
+    def _add_many(self, keys):
+        "Adds a list of keys to the largest filters in batches"
+        added = start = 0
+        while start < len(keys):
+            filt, room = self._reserve(len(keys) - start)
+            try:
+                added += filt.add_many(keys[start:start+room])
+            finally:
+                self._release(filt, room)
+            start += room
+            if self.prebuild_threshold: self._check_prebuild(filt)
+        return added
+
+    def _reserve(self, count):
+        """
+        Claims room for up to count keys in the largest filter, adding
+        a filter if it is full. Returns the filter and the number of keys
+        claimed. In thread safe mode the room is claimed under the lock,
+        so concurrent batches do not overfill a filter, and must be given
+        back with _release once the keys are added.
+        """
+        if self.lock is None:
+            while True:
+                filt = self.filters[-1]
+                room = int(filt.info["capacity"]) - len(filt) - 1
+                if room > 0: return filt, min(room, count)
+                self._add_next_filter()
+
+        with self.lock:
+            while True:
+                filt = self.filters[-1]
+                reserved = filt.info.get("reserved", 0)
+                room = int(filt.info["capacity"]) - len(filt) - reserved - 1
+                if room > 0:
+                    room = min(room, count)
+                    filt.info["reserved"] = reserved + room
+                    return filt, room
+                self._add_next_filter()
+
+    def _release(self, filt, room):
+        "Gives back the room claimed by _reserve, once the keys are added"
+        if self.lock is None: return
+        with self.lock:
+            filt.info["reserved"] -= room
 
     def __contains__(self, key):
         "Checks if the set contains a given key"
-        # Walk over the indexes in reverse order
-        for filt in self.filters[::-1]:
-            if key in filt:
+        epoch = self._enter()
+        try:
+            return self._contains(key, {})
+        finally:
+            self._exit(epoch)
+
+    def contains_many(self, keys):
+        """
+        Checks if the set contains each key in an iterable.
+        Returns a list of booleans in the same order as the keys.
+        Each filter checks the keys not found by the larger filters.
+        """
+        epoch = self._enter()
+        try:
+            return self._contains_many(list(keys))
+        finally:
+            self._exit(epoch)
+
+    def _contains_many(self, keys):
+        "Checks a list of keys against the filters, in the probe order"
+        results = [False] * len(keys)
+        pending = range(len(keys))
+        for filt in self._probe_filters(len(keys)):
+            if not pending: break
+            found = filt.contains_many([keys[i] for i in pending])
+            filt.info["probes"] += len(pending)
+            remaining = []
+            for i, hit in zip(pending, found):
+                if hit:
+                    results[i] = True
+                else:
+                    remaining.append(i)
+            filt.info["hits"] += len(pending) - len(remaining)
+            pending = remaining
+        return results
+
+    def _contains(self, key, hashes):
+        """
+        Checks if any of the filters contain a given key. The hashes
+        of the key are cached in the hashes dictionary, so that the
+        key is hashed at most once per hash engine and index mode.
+        """
+        for filt in self._probe_filters(1):
+            info = filt.info
+            info["probes"] += 1
+            if filt.contains_hashes(self._key_hashes(filt, key, hashes)):
+                info["hits"] += 1
                 return True
         return False
 
+    def _probe_filters(self, lookups):
+        """
+        Returns the filters in the order lookups should probe them.
+        The order is kept until the filters change, and the adaptive
+        order is also updated every ADAPT_INTERVAL lookups.
+        """
+        filters = self.filters
+        before, self.lookups = self.lookups, self.lookups + lookups
+        cached = self.order
+        if cached is not None and cached[0] is filters and cached[1] == len(filters):
+            if self.probe_order != self.PROBE_ADAPTIVE or before / self.ADAPT_INTERVAL == self.lookups / self.ADAPT_INTERVAL:
+                return cached[2]
+
+        # Sorts are stable, so ties are probed newest first
+        order = filters[::-1]
+        if self.probe_order == self.PROBE_LARGEST:
+            order.sort(key=lambda filt: filt.bitmap_size, reverse=True)
+        elif self.probe_order == self.PROBE_ADAPTIVE:
+            order.sort(key=lambda filt: float(filt.info["hits"]) / max(filt.info["probes"], 1), reverse=True)
+
+        # Keep the filters the order is for, since they are replaced by a compaction
+        self.order = (filters, len(order), order)
+        return order
+
+    def stats(self):
+        """
+        Returns the lookup statistics of each filter, oldest first.
+        Each is a dictionary with the capacity and count of the filter,
+        the number of lookups which probed it, the number of those which
+        found the key, and their ratio. The counters are not synchronized,
+        so they are approximate when several threads do lookups.
+        """
+        stats = []
+        for filt in self.filters:
+            probes, hits = filt.info["probes"], filt.info["hits"]
+            stats.append({"capacity": filt.info["capacity"], "count": len(filt), "probes": probes,
+                          "hits": hits, "hit_rate": float(hits) / max(probes, 1)})
+        return stats
+
+    def reset_stats(self):
+        "Resets the lookup statistics of each filter"
+        for filt in self.filters:
+            filt.info["probes"] = filt.info["hits"] = 0
+
+    def _key_hashes(self, filt, key, hashes):
+        """
+        Returns the hashes of a key for a filter, reusing the cached
+        hashes when they are compatible. Enough hashes are computed
+        for every filter with the same hash engine and index mode.
+        """
+        sig = (filt.hash_engine, filt.index_mode)
+        cached = hashes.get(sig)
+        if cached is None or len(cached) < filt.k_num:
+            cached = filt.key_hashes(key, self.hash_counts.get(sig))
+            hashes[sig] = cached
+        return cached
+
     def __len__(self):
         "Returns the number of elements in the bitmap"
         return sum(len(filt) for filt in self.filters)
 
-    def flush(self):
-        "Flushes all the underlying Bloom filters"
-        for filt in self.filters:
-            filt.flush()
+    def flush(self, dirty_only=False):
+        """
+        Flushes all the underlying Bloom filters. If dirty_only is
+        True, only the modified pages of each filter are written.
+        The counts are taken before the filters are flushed, and the
+        manifest is only written with them afterwards, so it never
+        counts keys whose bits are not durable.
+        """
+        filters = list(self.filters)
+        counts = dict((id(filt), len(filt)) for filt in filters)
+        for filt in filters:
+            filt.flush(dirty_only=dirty_only)
+        with self.manifest_lock:
+            self.flushed_counts.update(counts)
+        if self.directory: self._write_manifest()
+
+    def dirty_bytes(self):
+        "Returns the number of bytes modified since the last flush"
+        return sum(filt.dirty_bytes() for filt in self.filters)
 
     def close(self, flush=True):
         "Clses all the underlying bloom filters"
+        if flush: self.flush()
         for filt in self.filters:
-            filt.close(flush=flush)
+            filt.close(flush=False)
+        self._discard_prebuilt()
 
     def total_capacity(self):
         "Returns the total capacity"
@@ -0,0 +1,210 @@
+"""
+This module implements a sharded bloom filter, which routes
+each key by its hash to one of a number of independent filters,
+so that shards can be filled and flushed in parallel.
+"""
+import re
+import multiprocessing
+import os
+import os.path
+import struct
+from multiprocessing.pool import ThreadPool
+
+# Try to import the C version, fallback to Python
+try:
+    import chashing as hashing
+except ImportError:
+    import hashing
+from sbf import ScalingBloomFilter
+
+
+class ShardedBloomFilter(object):
+    # Keys are routed with a seed the filters do not use,
+    # so the shard of a key does not predict its bits
+    ROUTE_SEED = 0x9e3779b9
+
+    # The directory of each shard
+    SHARD_FMT = "shard%03d"
+    SHARD_RE = re.compile(r"^shard(\d+)$")
+
+    def __init__(self, shards=None, num_shards=8, initial_capacity=1e6, directory=None, workers=None, **kwargs):
+        """
+        Creates a new ShardedBloomFilter. Each key is added to and
+        checked against a single shard, chosen by a hash of the key.
+        The batch methods group the keys by shard in the calling thread,
+        and then process the shards on a pool of threads. The C filters
+        release the GIL for batch lookups, and for batch adds to atomic
+        bitmaps, so new shards are thread safe when there is a pool. The
+        shards are then filled and checked on several cores at once.
+
+        :Parameters:
+            - shards (optional) : A list of filters to use as the shards.
+              They must provide the interface of ScalingBloomFilter. Without
+              this, new ScalingBloomFilters are created.
+            - num_shards (optional) : The number of shards to create.
+              Defaults to 8.
+            - initial_capacity (optional) : The initial capacity of all the
+              shards, split evenly between them.
+            - directory (optional) : If provided, each shard keeps its filters
+              in a subdirectory, so it can be reopened with open().
+            - workers (optional) : The number of threads of the pool. Defaults
+              to the number of CPUs. 0 processes the shards in the caller.
+            - Any other keyword arguments are passed to the new
+              ScalingBloomFilters, e.g. prob. threadsafe defaults to True
+              if there is more than one worker, since only the atomic bitmaps
+              of thread safe filters are filled without the GIL.
+        """
+        if shards:
+            self.shards = list(shards)
+            self.workers = self._pool_size(workers, len(self.shards))
+        else:
+            if num_shards < 1: raise ValueError("Must have at least 1 shard!")
+            self.workers = self._pool_size(workers, num_shards)
+            if self.workers > 1: kwargs.setdefault("threadsafe", True)
+            capacity = max(int(initial_capacity / num_shards), 1)
+            self.shards = [ScalingBloomFilter(initial_capacity=capacity,
+                                              directory=self._shard_dir(directory, idx), **kwargs)
+                           for idx in xrange(num_shards)]
+        self.directory = directory
+        self.pool = None
+
+    @classmethod
+    def open(cls, directory, workers=None, **kwargs):
+        """
+        Opens a ShardedBloomFilter from a directory created with
+        directory. The shards are ordered by the index in their name,
+        and ValueError is raised if any shard is missing. Any keyword
+        arguments are passed to ScalingBloomFilter.open for each shard,
+        with threadsafe defaulting as in the constructor.
+        """
+        found = {}
+        for name in os.listdir(directory):
+            if not name.startswith("shard"): continue
+            match = cls.SHARD_RE.match(name)
+            if not match: raise ValueError("Invalid shard directory %r!" % name)
+            found[int(match.group(1))] = name
+        if not found: raise ValueError("Directory does not contain any shards!")
+        missing = [idx for idx in xrange(max(found) + 1) if idx not in found]
+        if missing: raise ValueError("Directory is missing shards %r!" % missing)
+
+        if cls._pool_size(workers, len(found)) > 1: kwargs.setdefault("threadsafe", True)
+        shards = [ScalingBloomFilter.open(os.path.join(directory, found[idx]), **kwargs)
+                  for idx in xrange(len(found))]
+        return cls(shards=shards, directory=directory, workers=workers)
+
+    @classmethod
+    def _pool_size(cls, workers, num_shards):
+        "Returns the number of threads of the pool for a number of shards"
+        if workers is None: workers = multiprocessing.cpu_count()
+        if workers < 0: raise ValueError("Workers must not be negative!")
+        return min(workers, num_shards)
+
+    @classmethod
+    def _shard_dir(cls, directory, idx):
+        "Returns the directory of a shard, or None"
+        if not directory: return None
+        return os.path.join(directory, cls.SHARD_FMT % idx)
+
+    def shard_index(self, key):
+        "Returns the index of the shard which holds a key"
+        if isinstance(key, (int, long)):
+            key = struct.pack("<Q", key & hashing.MASK_64)
+        else:
+            key = hashing.key_bytes(key)
+        return int(hashing.murmur3_128(key, self.ROUTE_SEED)[0] % len(self.shards))
+
+    def shard(self, key):
+        "Returns the shard which holds a key"
+        return self.shards[self.shard_index(key)]
+
+    def add(self, key, check_first=False):
+        "Add a key to the set"
+        return self.shard(key).add(key, check_first)
+
+    def __contains__(self, key):
+        "Checks if the set contains a given key"
+        return key in self.shard(key)
+
+    def _group(self, keys):
+        """
+        Groups the keys by shard. Returns a list with the
+        keys of each shard, and a list with their positions.
+        """
+        n = len(self.shards)
+        groups = [[] for x in xrange(n)]
+        positions = [[] for x in xrange(n)]
+        for pos, key in enumerate(keys):
+            idx = self.shard_index(key)
+            groups[idx].append(key)
+            positions[idx].append(pos)
+        return groups, positions
+
+    def _map(self, func, args):
+        """
+        Calls func with each tuple of arguments in args, on the pool
+        if there is more than one. Returns the results in the same order.
+        """
+        if self.workers < 2 or len(args) < 2:
+            return [func(*arg) for arg in args]
+        if self.pool is None:
+            self.pool = ThreadPool(self.workers)
+        return self.pool.map(lambda arg: func(*arg), args)
+
+    def add_many(self, keys, check_first=False):
+        """
+        Adds every key in an iterable to the set, with the
+        shards filled in parallel. Returns the number of keys
+        that were added.
+        """
+        groups, _ = self._group(keys)
+        work = [(shard, group) for shard, group in zip(self.shards, groups) if group]
+        return sum(self._map(lambda shard, group: shard.add_many(group, check_first), work))
+
+    def contains_many(self, keys):
+        """
+        Checks if the set contains each key in an iterable, with
+        the shards checked in parallel. Returns a list of booleans
+        in the same order as the keys.
+        """
+        keys = list(keys)
+        groups, positions = self._group(keys)
+        work = [(shard, group) for shard, group in zip(self.shards, groups) if group]
+        found = self._map(lambda shard, group: shard.contains_many(group), work)
+        shard_pos = [pos for pos in positions if pos]
+        results = [False] * len(keys)
+        for pos, hits in zip(shard_pos, found):
+            for i, hit in zip(pos, hits):
+                results[i] = hit
+        return results
+
+    def __len__(self):
+        "Returns the number of keys in all the shards"
+        return sum(len(shard) for shard in self.shards)
+
+    def flush(self, dirty_only=False):
+        """
+        Flushes the shards in parallel. If dirty_only is True,
+        only the modified pages of each shard are written.
+        """
+        self._map(lambda shard: shard.flush(dirty_only=dirty_only), [(shard,) for shard in self.shards])
+
+    def dirty_bytes(self):
+        "Returns the number of bytes modified since the last flush"
+        return sum(shard.dirty_bytes() for shard in self.shards)
+
+    def close(self, flush=True):
+        "Closes all the shards, and stops the pool"
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        for shard in self.shards:
+            shard.close(flush=flush)
+
+    def total_capacity(self):
+        "Returns the total capacity"
+        return sum(shard.total_capacity() for shard in self.shards)
+
+    def total_bitmap_size(self):
+        "Returns the total size of the bitmaps in bytes"
+        return sum(shard.total_bitmap_size() for shard in self.shards)
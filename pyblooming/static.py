@@ -0,0 +1,233 @@
+"""
+This module implements an immutable xor filter, which is
+built once from a set of keys and then only queried. From
+"Xor Filters: Faster and Smaller Than Bloom and Cuckoo Filters",
+Graf and Lemire 2020.
+"""
+import binascii
+import math
+import os
+import os.path
+import struct
+
+# Try to import the C version, fallback to Python
+try:
+    import cbitmap as bitmaplib
+except ImportError:
+    import bitmap as bitmaplib
+try:
+    import chashing as hashing
+except ImportError:
+    import hashing
+
+
+class StaticFilter(object):
+    # The key count, hash seed and fingerprint bits are stored
+    # after the table. The last bytes are reserved.
+    PARAMS_FMT = "<QIBxxx"
+    PARAMS_LEN = 16
+
+    # The table has 1.23 entries per key, plus a constant
+    SIZE_FACTOR = 1.23
+    SIZE_OFFSET = 32
+
+    # How many seeds are tried before the build fails
+    MAX_SEEDS = 100
+
+    LAYOUT = "xor"
+
+    def __init__(self, bitmap):
+        """
+        Opens an existing Static Filter. Use build() to create one,
+        and open() to open a file. Opening only maps the bitmap.
+
+        :Parameters:
+          - bitmap : The bitmap containing the filter.
+        """
+        if bitmap is None: raise ValueError("Must provide bitmap!")
+        self.bitmap = bitmap
+        self.bitmap_size = len(bitmap) - 8*self.extra_buffer() # Ignore our size
+        if self.bitmap_size <= 0: raise ValueError("Bitmap is not large enough!")
+
+        offset = self.bitmap_size / 8
+        self.count, self.seed, self.fp_bits = struct.unpack(self.PARAMS_FMT,
+                self.bitmap[offset:offset+self.PARAMS_LEN])
+        if self.fp_bits < 1 or self.fp_bits > 32: raise ValueError("Bitmap does not contain a filter!")
+        self.fp_mask = (1 << self.fp_bits) - 1
+        self.segment = self.table_size(self.count) / 3
+        if 3 * self.segment * self.fp_bits > self.bitmap_size: raise ValueError("Bitmap is not large enough!")
+        self.info = {} # Allows dynamic properties
+
+    @classmethod
+    def extra_buffer(cls):
+        """
+        Returns the extra bytes we need for our buffer info.
+        """
+        return cls.PARAMS_LEN
+
+    @classmethod
+    def open(cls, filename, **kwargs):
+        """
+        Opens a Static Filter from a file created by build().
+        Any keyword arguments are passed to the Bitmap.
+        """
+        bitmap = bitmaplib.Bitmap(os.path.getsize(filename), filename, **kwargs)
+        return cls(bitmap)
+
+    @classmethod
+    def build(cls, keys, probability, filename=None):
+        """
+        Builds a new Static Filter from an iterable of keys, with
+        the given false positive probability. If a filename is provided,
+        the filter is written to a temporary file which is then renamed,
+        so readers never see a partial filter. Otherwise an anonymous
+        bitmap is used. Duplicate keys are ignored.
+        """
+        keys = list(set(cls._key_bytes(key) for key in keys))
+        fp_bits = cls.fingerprint_bits(probability)
+        size = cls.table_size(len(keys))
+        for seed in xrange(cls.MAX_SEEDS):
+            table = cls._construct(keys, seed, size / 3, fp_bits)
+            if table is not None: break
+        else:
+            raise ValueError("Failed to build the filter, are the keys distinct?")
+
+        # Write out the table and the parameters
+        table_bytes = int(math.ceil(size * fp_bits / 8.0))
+        length = table_bytes + cls.extra_buffer()
+        tmpname = filename + ".tmp" if filename else None
+        if tmpname and os.path.exists(tmpname): os.remove(tmpname)
+        bitmap = bitmaplib.Bitmap(length, tmpname)
+        packed = cls._pack(table, fp_bits)[:table_bytes]
+        for i in xrange(0, table_bytes, bitmap.CHUNK_SIZE):
+            chunk = packed[i:i + bitmap.CHUNK_SIZE]
+            bitmap[i:i + len(chunk)] = chunk
+        bitmap[table_bytes:length] = struct.pack(cls.PARAMS_FMT, len(keys), seed, fp_bits)
+        if not filename: return cls(bitmap)
+
+        bitmap.close()
+        os.rename(tmpname, filename)
+        return cls.open(filename)
+
+    @classmethod
+    def table_size(cls, count):
+        "Returns the number of fingerprints in the table, a multiple of 3"
+        size = int(cls.SIZE_FACTOR * count) + cls.SIZE_OFFSET
+        return size - size % 3
+
+    @classmethod
+    def fingerprint_bits(cls, prob):
+        """
+        Returns the number of fingerprint bits needed to achieve
+        the desired false positive probability, which is 2^-bits.
+        """
+        return max(1, min(32, int(math.ceil(-math.log(prob, 2)))))
+
+    @classmethod
+    def expected_probability(cls, fingerprint_bits):
+        "Returns the expected probability of false positives"
+        return 2.0 ** -fingerprint_bits
+
+    @classmethod
+    def _key_bytes(cls, key):
+        """
+        Returns the bytes hashed for a key. Integers are packed as
+        64 bit little endian words, other keys use hashing.key_bytes.
+        """
+        if isinstance(key, (int, long)):
+            if not -(1 << 63) <= key <= hashing.MASK_64:
+                raise OverflowError("Integer keys must fit in 64 bits!")
+            return struct.pack("<Q", key & hashing.MASK_64)
+        return hashing.key_bytes(key)
+
+    @classmethod
+    def _locate(cls, key, seed, segment, fp_mask):
+        """
+        Returns the fingerprint and the position in each segment
+        of a key, which must already be converted by _key_bytes.
+        """
+        a, b = hashing.murmur3_128(key, seed)
+        return (int(b >> 32) & fp_mask, int(a & 0xffffffff) % segment,
+                segment + int(a >> 32) % segment, 2*segment + int(b & 0xffffffff) % segment)
+
+    @classmethod
+    def _construct(cls, keys, seed, segment, fp_bits):
+        """
+        Assigns the fingerprints so that the xor of the entries of
+        each key is its fingerprint. Keys are peeled from positions
+        used by a single key, and the entries are then assigned in
+        reverse order. Returns None if the peeling gets stuck.
+        """
+        fp_mask = (1 << fp_bits) - 1
+        located = [cls._locate(key, seed, segment, fp_mask) for key in keys]
+        size = 3 * segment
+        counts = [0] * size
+        xors = [0] * size
+        for idx, loc in enumerate(located):
+            for pos in loc[1:]:
+                counts[pos] += 1
+                xors[pos] ^= idx
+
+        # Peel off the keys which are alone in a position
+        queue = [pos for pos in xrange(size) if counts[pos] == 1]
+        stack = []
+        while queue:
+            pos = queue.pop()
+            if counts[pos] != 1: continue
+            idx = xors[pos]
+            stack.append((idx, pos))
+            for other in located[idx][1:]:
+                counts[other] -= 1
+                xors[other] ^= idx
+                if counts[other] == 1: queue.append(other)
+        if len(stack) != len(keys): return None
+
+        # The last peeled key is assigned first
+        table = [0] * size
+        for idx, pos in reversed(stack):
+            fp, h0, h1, h2 = located[idx]
+            table[pos] = fp ^ table[h0] ^ table[h1] ^ table[h2]
+        return table
+
+    @classmethod
+    def _pack(cls, table, fp_bits):
+        "Packs the fingerprints, 8 at a time since that fills whole bytes"
+        chunks = []
+        for i in xrange(0, len(table), 8):
+            group = table[i:i+8]
+            val = 0
+            for fp in group:
+                val = (val << fp_bits) | fp
+            val <<= (8 - len(group)) * fp_bits
+            chunks.append(binascii.unhexlify("%0*x" % (2*fp_bits, val)))
+        return "".join(chunks)
+
+    def __contains__(self, key):
+        "Checks if the set contains a given key"
+        fp, h0, h1, h2 = self._locate(self._key_bytes(key), self.seed, self.segment, self.fp_mask)
+        return fp == self._entry(h0) ^ self._entry(h1) ^ self._entry(h2)
+
+    def contains_many(self, keys):
+        """
+        Checks if the set contains each key in an iterable.
+        Returns a list of booleans in the same order as the keys.
+        """
+        return [self.__contains__(key) for key in keys]
+
+    def _entry(self, pos):
+        "Returns the fingerprint stored at a position"
+        start_bit = pos * self.fp_bits
+        end_bit = start_bit + self.fp_bits
+        start, end = start_bit >> 3, (end_bit + 7) >> 3
+        val = long(binascii.hexlify(self.bitmap[start:end]), 16)
+        return int(val >> (end*8 - end_bit)) & self.fp_mask
+
+    def __len__(self):
+        "Returns the number of keys in the filter"
+        return self.count
+
+    def close(self):
+        "Closes the filter and the underlying bitmap"
+        if self.bitmap:
+            self.bitmap.close(flush=False)
+            self.bitmap = None
@@ -10,20 +10,36 @@ try:
 except:
     readme_content = ""
 
+# Always build from the Cython sources if Cython is installed, so a
+# checkout never compiles generated C that is older than its .pyx.
+# Without Cython, the generated C files are used.
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    cythonize = None
+ext = "pyx" if cythonize else "c"
+
 ext_modules = [
         Extension("pyblooming.cbitmap",
             extra_compile_args=['-std=gnu99', '-O2'],
-            sources = ["pyblooming/cbitmap.pyx", "pyblooming/cbitmaputil.c"],
+            sources = ["pyblooming/cbitmap.%s" % ext, "pyblooming/cbitmaputil.c"],
             include_dirs = ["pyblooming"],
             library_dirs = ["pyblooming"]
             ),
         Extension("pyblooming.cbloom",
             extra_compile_args=['-std=gnu99', '-O2'],
-            sources = ["pyblooming/cbloom.pyx"],
+            sources = ["pyblooming/cbloom.%s" % ext, "pyblooming/hashutil.c"],
+            include_dirs = ["pyblooming"],
+            library_dirs = ["pyblooming"]
+            ),
+        Extension("pyblooming.chashing",
+            extra_compile_args=['-std=gnu99', '-O2'],
+            sources = ["pyblooming/chashing.%s" % ext, "pyblooming/hashutil.c"],
             include_dirs = ["pyblooming"],
             library_dirs = ["pyblooming"]
             ),
       ]
+if cythonize: ext_modules = cythonize(ext_modules, force=True)
 
 # Create the actual setup method
 setup(name='pyblooming',
@@ -38,7 +54,7 @@ setup(name='pyblooming',
       license="MIT License",
       keywords=["bloom", "filter", "mmap"],
       packages=['pyblooming'],
-      package_data={"pyblooming":["cbitmaputil.h"]},
+      package_data={"pyblooming":["cbitmaputil.h", "hashutil.h", "cbitmap.pxd"]},
       classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
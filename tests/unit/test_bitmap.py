@@ -3,6 +3,8 @@ Contains tests for the Bitmap class.
 """
 import time
 import os
+import mmap
+import threading
 import pytest
 from pyblooming.bitmap import Bitmap as pyBitmap
 from pyblooming.cbitmap import Bitmap as cBitmap
@@ -60,6 +62,199 @@ class TestBitmap(object):
         for bit in xrange(4*8,16 * 8):
             assert 1 == bitmap[bit]
 
+    def test_set_bits(self):
+        """
+        Tests that many bits can be set at once
+        """
+        bitmap = pyBitmap(16)
+        bitmap.set_bits([0, 9, 127])
+        bitmap.set_bits(x for x in (9, 64))
+        for bit in xrange(16 * 8):
+            assert bitmap[bit] == (1 if bit in (0, 9, 64, 127) else 0)
+
+    def test_get_bits(self):
+        """
+        Tests that many bits can be read at once
+        """
+        bitmap = pyBitmap(16)
+        bitmap[3] = 1
+        bitmap[100] = 1
+        assert bitmap.get_bits([3, 4, 100, 3]) == [1, 0, 1, 1]
+        assert bitmap.get_bits([]) == []
+
+    def test_test_all(self):
+        """
+        Tests checking if many bits are set
+        """
+        bitmap = pyBitmap(16)
+        bitmap.set_bits([1, 2, 50])
+        assert bitmap.test_all([1, 2, 50])
+        assert not bitmap.test_all([1, 2, 51])
+        assert bitmap.test_all([])
+
+    def test_bulk_out_of_range(self):
+        """
+        Tests that bulk operations check their bounds
+        """
+        bitmap = pyBitmap(16)
+        with pytest.raises(IndexError):
+            bitmap.set_bits([16 * 8 * 8])
+        with pytest.raises(IndexError):
+            bitmap.get_bits([16 * 8 * 8])
+
+    def test_bitwise(self):
+        """
+        Tests the bitwise operators between bitmaps,
+        including with the other implementation
+        """
+        for other_cls in (pyBitmap, cBitmap):
+            a = pyBitmap(20)
+            b = other_cls(20)
+            a.set_bits([0, 1, 100, 159])
+            b.set_bits([1, 2, 100, 150])
+
+            union = a | b
+            assert [x for x in xrange(160) if union[x]] == [0, 1, 2, 100, 150, 159]
+            inter = a & b
+            assert [x for x in xrange(160) if inter[x]] == [1, 100]
+            xor = a ^ b
+            assert [x for x in xrange(160) if xor[x]] == [0, 2, 150, 159]
+
+            # The operands are unchanged
+            assert [x for x in xrange(160) if a[x]] == [0, 1, 100, 159]
+
+            a |= b
+            assert [x for x in xrange(160) if a[x]] == [0, 1, 2, 100, 150, 159]
+            a &= b
+            assert [x for x in xrange(160) if a[x]] == [1, 2, 100, 150]
+            a ^= b
+            assert [x for x in xrange(160) if a[x]] == []
+
+    def test_bitwise_range(self):
+        """
+        Tests combining a range of bytes
+        """
+        a = pyBitmap(16)
+        b = pyBitmap(16)
+        b.set_bits(xrange(128))
+        a.union_update(b, 2, 5)
+        assert [x for x in xrange(128) if a[x]] == range(16, 40)
+        with pytest.raises(ValueError):
+            a.union_update(b, 0, 17)
+
+    def test_bitwise_size(self):
+        """
+        Tests that bitmaps of different sizes are not combined
+        """
+        with pytest.raises(ValueError):
+            pyBitmap(16) | pyBitmap(32)
+
+    def test_copy(self):
+        """
+        Tests copying a bitmap
+        """
+        a = pyBitmap(16)
+        a.set_bits([3, 70])
+        b = a.copy()
+        assert len(b) == len(a)
+        assert b[0:16] == a[0:16]
+        b[4] = 1
+        assert a[4] == 0
+
+    def test_popcount(self):
+        """
+        Tests counting the set bits
+        """
+        a = pyBitmap(4096)
+        assert a.popcount() == 0
+        a.set_bits(range(0, 4096*8, 3))
+        assert a.popcount() == len(range(0, 4096*8, 3))
+        assert a.popcount(0, 3) == 8
+        assert a.popcount(1, 1) == 0
+        assert a.popcount(4090) == sum(bin(ord(c)).count("1") for c in a[4090:4096])
+        with pytest.raises(ValueError):
+            a.popcount(0, 4097)
+
+    def test_atomic_private(self):
+        """
+        Tests atomic bitmaps can not be private
+        """
+        with pytest.raises(ValueError):
+            pyBitmap(1024, "testpyatomicpriv.mmap", private=True, atomic=True)
+        a = pyBitmap(1024, atomic=True)
+        assert a.atomic
+        a.close()
+
+    def test_atomic_threads(self):
+        """
+        Tests several threads setting bits and adding to a counter
+        """
+        a = pyBitmap(4096, atomic=True)
+        def work(p):
+            for i in xrange(p, 8 * 4000, 4):
+                a.set_bits([i])
+                a.atomic_add(4001, 1)
+        threads = [threading.Thread(target=work, args=(p,)) for p in xrange(4)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        assert a.popcount(0, 4000) == 8 * 4000
+        assert a.atomic_load(4001) == 8 * 4000
+        a.close()
+
+    def test_atomic_add(self):
+        """
+        Tests adding to aligned and unaligned counters
+        """
+        a = pyBitmap(1024, "testpyatomicadd.mmap", atomic=True)
+        assert a.atomic
+        assert a.atomic_add(8, 5) == 5
+        assert a.atomic_add(8, -2) == 3
+        assert a.atomic_add(13, 7) == 7
+        assert a.atomic_load(13) == 7
+        assert a[8:16] == "\x03" + "\x00" * 4 + "\x07" + "\x00" * 2
+        with pytest.raises(ValueError):
+            a.atomic_add(1020, 1)
+        a.close()
+
+    def test_atomic_processes(self):
+        """
+        Tests several processes setting bits and adding
+        to a counter in the same file
+        """
+        procs = 4
+        a = pyBitmap(4096, "testpyatomicprocs.mmap", atomic=True)
+        pids = []
+        for p in xrange(procs):
+            pid = os.fork()
+            if pid == 0:
+                b = pyBitmap(4096, "testpyatomicprocs.mmap", atomic=True)
+                for i in xrange(p, 8 * 4000, procs):
+                    b[i] = 1
+                    b.atomic_add(4001, 1)
+                b.close()
+                os._exit(0)
+            pids.append(pid)
+        for pid in pids:
+            assert os.waitpid(pid, 0)[1] == 0
+
+        assert a.popcount(0, 4000) == 8 * 4000
+        assert a.atomic_load(4001) == 8 * 4000
+        a.close()
+
+    def test_clear(self):
+        """
+        Tests clearing a range of bytes
+        """
+        a = pyBitmap(mmap.PAGESIZE * 2)
+        a.set_bits(range(0, mmap.PAGESIZE * 16, 7))
+        a.clear(8, 16)
+        assert a.popcount(8, 16) == 0
+        assert a.popcount(0, 8) > 0
+        a.clear()
+        assert a.popcount() == 0
+        with pytest.raises(ValueError):
+            a.clear(0, mmap.PAGESIZE * 2 + 1)
+
     def test_doubleclose(self):
         """
         Tests that a double close does not cause problems
@@ -107,6 +302,106 @@ class TestBitmap(object):
             assert bitmap[bit] == 1
         bitmap.close()
 
+    def test_sparse(self):
+        """
+        Tests that a new file is extended without writing it out
+        """
+        bitmap = pyBitmap(1 << 22, "testsparse.mmap")
+        info = os.stat("testsparse.mmap")
+        assert info.st_size == 1 << 22
+        assert info.st_blocks * 512 < 1 << 22
+        assert bitmap.popcount() == 0
+        bitmap.close()
+
+    def test_preallocate(self):
+        """
+        Tests that preallocate allocates the whole file
+        """
+        bitmap = pyBitmap(1 << 22, "testpreallocate.mmap", preallocate=True)
+        info = os.stat("testpreallocate.mmap")
+        assert info.st_size == 1 << 22
+        assert info.st_blocks * 512 >= 1 << 22
+        assert bitmap.popcount() == 0
+        bitmap.close()
+
+    def test_advice(self):
+        """
+        Tests that the advice is checked
+        """
+        bitmap = pyBitmap(4096, "testadvice.mmap", advice="random")
+        bitmap.advise("normal")
+        with pytest.raises(ValueError):
+            bitmap.advise("bogus")
+        with pytest.raises(ValueError):
+            pyBitmap(4096, advice="bogus")
+        bitmap.close()
+
+    def test_prefetch(self):
+        """
+        Tests warming up a file backed bitmap
+        """
+        bitmap = pyBitmap(1 << 16, "testprefetch.mmap", populate=True)
+        bitmap.prefetch()
+        assert bitmap.resident_bytes() is None
+        assert bitmap.popcount() == 0
+        bitmap.close()
+
+    def test_dirty(self):
+        """
+        Tests that the modified pages are tracked and flushed
+        """
+        page = mmap.PAGESIZE
+        bitmap = pyBitmap(4 * page + 10, "testdirty.mmap")
+        assert bitmap.dirty_bytes() == 0
+        bitmap[1] = 1
+        bitmap.set_bits([8 * page + 3, 8 * page + 4])
+        assert bitmap.dirty_bytes() == 2 * page
+        bitmap[4 * page:4 * page + 2] = "ab"
+        assert bitmap.dirty_bytes() == 2 * page + 10
+        bitmap.flush(dirty_only=True)
+        assert bitmap.dirty_bytes() == 0
+
+        other = pyBitmap(4 * page + 10)
+        other[3 * page] = 1
+        bitmap |= other
+        assert bitmap.dirty_bytes() == 4 * page + 10
+        bitmap.flush()
+        assert bitmap.dirty_bytes() == 0
+
+        bitmap2 = pyBitmap(4 * page + 10, "testdirty.mmap")
+        assert bitmap2.get_bits([1, 8 * page + 3, 8 * page + 4]) == [1, 1, 1]
+        assert bitmap2[4 * page:4 * page + 2] == "ab"
+        bitmap.close()
+        bitmap2.close()
+
+    def test_dirty_failed_flush(self):
+        """
+        Tests that the modified pages are kept if the sync fails
+        """
+        class FailingMap(object):
+            def __init__(self, mmap):
+                self.mmap = mmap
+            def __getattr__(self, name):
+                return getattr(self.mmap, name)
+            def flush(self, *args):
+                raise EnvironmentError("Failed to flush the buffers!")
+
+        page = mmap.PAGESIZE
+        bitmap = pyBitmap(4 * page, "testdirtyfail.mmap")
+        bitmap[1] = 1
+        bitmap[8 * 3 * page] = 1
+        real, bitmap.mmap = bitmap.mmap, FailingMap(bitmap.mmap)
+        with pytest.raises(EnvironmentError):
+            bitmap.flush(dirty_only=True)
+        assert bitmap.dirty_bytes() == 2 * page
+        with pytest.raises(EnvironmentError):
+            bitmap.flush()
+        assert bitmap.dirty_bytes() == 2 * page
+        bitmap.mmap = real
+        bitmap.flush(dirty_only=True)
+        assert bitmap.dirty_bytes() == 0
+        bitmap.close()
+
     def test_private_not_shared(self):
         """
         Tests that an open with private does not share data
@@ -198,6 +493,199 @@ class TestCBitmap(object):
         for bit in xrange(4*8,16 * 8):
             assert 1 == bitmap[bit]
 
+    def test_set_bits(self):
+        """
+        Tests that many bits can be set at once
+        """
+        bitmap = cBitmap(16)
+        bitmap.set_bits([0, 9, 127])
+        bitmap.set_bits(x for x in (9, 64))
+        for bit in xrange(16 * 8):
+            assert bitmap[bit] == (1 if bit in (0, 9, 64, 127) else 0)
+
+    def test_get_bits(self):
+        """
+        Tests that many bits can be read at once
+        """
+        bitmap = cBitmap(16)
+        bitmap[3] = 1
+        bitmap[100] = 1
+        assert bitmap.get_bits([3, 4, 100, 3]) == [1, 0, 1, 1]
+        assert bitmap.get_bits([]) == []
+
+    def test_test_all(self):
+        """
+        Tests checking if many bits are set
+        """
+        bitmap = cBitmap(16)
+        bitmap.set_bits([1, 2, 50])
+        assert bitmap.test_all([1, 2, 50])
+        assert not bitmap.test_all([1, 2, 51])
+        assert bitmap.test_all([])
+
+    def test_bulk_out_of_range(self):
+        """
+        Tests that bulk operations check their bounds
+        """
+        bitmap = cBitmap(16)
+        with pytest.raises(IndexError):
+            bitmap.set_bits([16 * 8 * 8])
+        with pytest.raises(IndexError):
+            bitmap.get_bits([16 * 8 * 8])
+
+    def test_bitwise(self):
+        """
+        Tests the bitwise operators between bitmaps,
+        including with the other implementation
+        """
+        for other_cls in (cBitmap, pyBitmap):
+            a = cBitmap(20)
+            b = other_cls(20)
+            a.set_bits([0, 1, 100, 159])
+            b.set_bits([1, 2, 100, 150])
+
+            union = a | b
+            assert [x for x in xrange(160) if union[x]] == [0, 1, 2, 100, 150, 159]
+            inter = a & b
+            assert [x for x in xrange(160) if inter[x]] == [1, 100]
+            xor = a ^ b
+            assert [x for x in xrange(160) if xor[x]] == [0, 2, 150, 159]
+
+            # The operands are unchanged
+            assert [x for x in xrange(160) if a[x]] == [0, 1, 100, 159]
+
+            a |= b
+            assert [x for x in xrange(160) if a[x]] == [0, 1, 2, 100, 150, 159]
+            a &= b
+            assert [x for x in xrange(160) if a[x]] == [1, 2, 100, 150]
+            a ^= b
+            assert [x for x in xrange(160) if a[x]] == []
+
+    def test_bitwise_range(self):
+        """
+        Tests combining a range of bytes
+        """
+        a = cBitmap(16)
+        b = cBitmap(16)
+        b.set_bits(xrange(128))
+        a.union_update(b, 2, 5)
+        assert [x for x in xrange(128) if a[x]] == range(16, 40)
+        with pytest.raises(ValueError):
+            a.union_update(b, 0, 17)
+
+    def test_bitwise_size(self):
+        """
+        Tests that bitmaps of different sizes are not combined
+        """
+        with pytest.raises(ValueError):
+            cBitmap(16) | cBitmap(32)
+
+    def test_copy(self):
+        """
+        Tests copying a bitmap
+        """
+        a = cBitmap(16)
+        a.set_bits([3, 70])
+        b = a.copy()
+        assert len(b) == len(a)
+        assert b[0:16] == a[0:16]
+        b[4] = 1
+        assert a[4] == 0
+
+    def test_popcount(self):
+        """
+        Tests counting the set bits
+        """
+        a = cBitmap(4096)
+        assert a.popcount() == 0
+        a.set_bits(range(0, 4096*8, 3))
+        assert a.popcount() == len(range(0, 4096*8, 3))
+        assert a.popcount(0, 3) == 8
+        assert a.popcount(1, 1) == 0
+        assert a.popcount(4090) == sum(bin(ord(c)).count("1") for c in a[4090:4096])
+        with pytest.raises(ValueError):
+            a.popcount(0, 4097)
+
+    def test_atomic_private(self):
+        """
+        Tests atomic bitmaps can not be private
+        """
+        with pytest.raises(ValueError):
+            cBitmap(1024, "testcatomicpriv.mmap", private=True, atomic=True)
+        a = cBitmap(1024, atomic=True)
+        assert a.atomic
+        a.close()
+
+    def test_atomic_threads(self):
+        """
+        Tests several threads setting bits and adding to a counter
+        """
+        a = cBitmap(4096, atomic=True)
+        def work(p):
+            for i in xrange(p, 8 * 4000, 4):
+                a.set_bits([i])
+                a.atomic_add(4001, 1)
+        threads = [threading.Thread(target=work, args=(p,)) for p in xrange(4)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        assert a.popcount(0, 4000) == 8 * 4000
+        assert a.atomic_load(4001) == 8 * 4000
+        a.close()
+
+    def test_atomic_add(self):
+        """
+        Tests adding to aligned and unaligned counters
+        """
+        a = cBitmap(1024, "testcatomicadd.mmap", atomic=True)
+        assert a.atomic
+        assert a.atomic_add(8, 5) == 5
+        assert a.atomic_add(8, -2) == 3
+        assert a.atomic_add(13, 7) == 7
+        assert a.atomic_load(13) == 7
+        assert a[8:16] == "\x03" + "\x00" * 4 + "\x07" + "\x00" * 2
+        with pytest.raises(ValueError):
+            a.atomic_add(1020, 1)
+        a.close()
+
+    def test_atomic_processes(self):
+        """
+        Tests several processes setting bits and adding
+        to a counter in the same file
+        """
+        procs = 4
+        a = cBitmap(4096, "testcatomicprocs.mmap", atomic=True)
+        pids = []
+        for p in xrange(procs):
+            pid = os.fork()
+            if pid == 0:
+                b = cBitmap(4096, "testcatomicprocs.mmap", atomic=True)
+                for i in xrange(p, 8 * 4000, procs):
+                    b[i] = 1
+                    b.atomic_add(4001, 1)
+                b.close()
+                os._exit(0)
+            pids.append(pid)
+        for pid in pids:
+            assert os.waitpid(pid, 0)[1] == 0
+
+        assert a.popcount(0, 4000) == 8 * 4000
+        assert a.atomic_load(4001) == 8 * 4000
+        a.close()
+
+    def test_clear(self):
+        """
+        Tests clearing a range of bytes
+        """
+        a = cBitmap(mmap.PAGESIZE * 2)
+        a.set_bits(range(0, mmap.PAGESIZE * 16, 7))
+        a.clear(8, 16)
+        assert a.popcount(8, 16) == 0
+        assert a.popcount(0, 8) > 0
+        a.clear()
+        assert a.popcount() == 0
+        with pytest.raises(ValueError):
+            a.clear(0, mmap.PAGESIZE * 2 + 1)
+
     def test_doubleclose(self):
         """
         Tests that a double close does not cause problems
@@ -245,6 +733,83 @@ class TestCBitmap(object):
             assert bitmap[bit] == 1
         bitmap.close()
 
+    def test_sparse(self):
+        """
+        Tests that a new file is extended without writing it out
+        """
+        bitmap = cBitmap(1 << 22, "testsparse.mmap")
+        info = os.stat("testsparse.mmap")
+        assert info.st_size == 1 << 22
+        assert info.st_blocks * 512 < 1 << 22
+        assert bitmap.popcount() == 0
+        bitmap.close()
+
+    def test_preallocate(self):
+        """
+        Tests that preallocate allocates the whole file
+        """
+        bitmap = cBitmap(1 << 22, "testpreallocate.mmap", preallocate=True)
+        info = os.stat("testpreallocate.mmap")
+        assert info.st_size == 1 << 22
+        assert info.st_blocks * 512 >= 1 << 22
+        assert bitmap.popcount() == 0
+        bitmap.close()
+
+    def test_advice(self):
+        """
+        Tests that the advice is checked
+        """
+        bitmap = cBitmap(4096, "testadvice.mmap", advice="random")
+        bitmap.advise("normal")
+        with pytest.raises(ValueError):
+            bitmap.advise("bogus")
+        with pytest.raises(ValueError):
+            cBitmap(4096, advice="bogus")
+        bitmap.close()
+        with pytest.raises(ValueError):
+            bitmap.advise("random")
+
+    def test_prefetch(self):
+        """
+        Tests warming up a file backed bitmap
+        """
+        bitmap = cBitmap(1 << 16, "testprefetch.mmap", advice="random")
+        bitmap.prefetch()
+        assert bitmap.resident_bytes() == 1 << 16
+        bitmap.close()
+
+        bitmap = cBitmap(1 << 16, "testprefetch.mmap", populate=True)
+        assert bitmap.resident_bytes() == 1 << 16
+        bitmap.close()
+
+    def test_dirty(self):
+        """
+        Tests that the modified pages are tracked and flushed
+        """
+        page = mmap.PAGESIZE
+        bitmap = cBitmap(4 * page + 10, "testdirty.mmap")
+        assert bitmap.dirty_bytes() == 0
+        bitmap[1] = 1
+        bitmap.set_bits([8 * page + 3, 8 * page + 4])
+        assert bitmap.dirty_bytes() == 2 * page
+        bitmap[4 * page:4 * page + 2] = "ab"
+        assert bitmap.dirty_bytes() == 2 * page + 10
+        bitmap.flush(dirty_only=True)
+        assert bitmap.dirty_bytes() == 0
+
+        other = cBitmap(4 * page + 10)
+        other[3 * page] = 1
+        bitmap |= other
+        assert bitmap.dirty_bytes() == 4 * page + 10
+        bitmap.flush()
+        assert bitmap.dirty_bytes() == 0
+
+        bitmap2 = cBitmap(4 * page + 10, "testdirty.mmap")
+        assert bitmap2.get_bits([1, 8 * page + 3, 8 * page + 4]) == [1, 1, 1]
+        assert bitmap2[4 * page:4 * page + 2] == "ab"
+        bitmap.close()
+        bitmap2.close()
+
     def test_private_not_shared(self):
         """
         Tests that an open with private does not share data
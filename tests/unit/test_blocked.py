@@ -0,0 +1,128 @@
+"""
+Contains tests for the blocked bloom filter class.
+"""
+import os
+import pytest
+from pyblooming import Bitmap, BloomFilter, BlockedBloomFilter
+from pyblooming.hashing import INDEX_DOUBLE
+
+class TestBlockedBloomFilter(object):
+
+    @classmethod
+    def setup_class(cls):
+        # Remove the mmap files
+        mmap_files = [f for f in os.listdir(".") if f.endswith(".mmap")]
+        [os.remove(f) for f in mmap_files]
+
+    def test_small_bitmap(self):
+        """
+        Tests initializing with a bitmap smaller than a block
+        """
+        with pytest.raises(ValueError):
+            BlockedBloomFilter(Bitmap(32 + BlockedBloomFilter.extra_buffer()), 3)
+
+    def test_params_for_capacity(self):
+        """
+        Tests that the blocked filter needs more space than a
+        classic filter, and meets the probability.
+        """
+        bytes, k = BlockedBloomFilter.params_for_capacity(1e6, 1e-4)
+        classic, classic_k = BloomFilter.params_for_capacity(1e6, 1e-4)
+        assert bytes > classic
+        assert (bytes - BlockedBloomFilter.extra_buffer()) % 64 == 0
+        bits = (bytes - BlockedBloomFilter.extra_buffer()) * 8
+        assert BlockedBloomFilter.block_probability(bits, 1e6, k) <= 1e-4
+
+    def test_block_probability(self):
+        """
+        Tests that the blocked probability is worse than the classic
+        probability, but converges for sparse filters.
+        """
+        bits = BloomFilter.required_bits(1e4, 1e-2)
+        k = int(round(BloomFilter.ideal_k(bits, 1e4)))
+        prob = BlockedBloomFilter.block_probability(bits, 1e4, k)
+        assert prob > 1e-2
+        assert prob < 2e-2
+
+    def test_single_block(self):
+        """
+        Tests that all the bits for a key land in one block
+        """
+        bf = BlockedBloomFilter.for_capacity(10000, 1e-3)
+        for x in xrange(100):
+            blocks = set(idx // 512 for idx in bf._positions("test%d" % x))
+            assert len(blocks) == 1
+
+    def test_add(self):
+        """
+        Tests adding and checking keys
+        """
+        bf = BlockedBloomFilter.for_capacity(1000, 1e-4)
+        assert all([bf.add("test%d" % x, True) for x in xrange(1000)])
+        assert all([bf.__contains__("test%d" % x) for x in xrange(1000)])
+        assert len(bf) == 1000
+        assert bf.add_many("test%d" % x for x in xrange(2000)) == 2000
+        assert all(bf.contains_many("test%d" % x for x in xrange(2000)))
+
+    def test_prob(self):
+        """
+        Tests that the blocked filter is only wrong within
+        a certain threshold at capacity.
+        """
+        for mode in (None, INDEX_DOUBLE):
+            bf = BlockedBloomFilter.for_capacity(10000, 1e-2, index_mode=mode)
+            bf.add_many("test%d" % x for x in xrange(10000))
+            num_wrong = len([x for x in xrange(10000) if "foo%d" % x in bf])
+
+            # Should get about 100 wrong
+            assert num_wrong >= 50
+            assert num_wrong <= 150
+
+    def test_estimate_cardinality(self):
+        """
+        Tests the estimates use the blocked layout
+        """
+        bf = BlockedBloomFilter.for_capacity(10000, 1e-2)
+        bf.add_many("test%d" % x for x in xrange(10000))
+        assert 9500 < bf.estimate_cardinality() < 10500
+        assert 5e-3 < bf.current_false_positive_rate() < 2e-2
+
+    def test_flush(self):
+        """
+        Tests that a blocked filter restores from a file
+        """
+        bytes, k = BlockedBloomFilter.params_for_capacity(1000, 1e-3)
+        bf = BlockedBloomFilter(Bitmap(bytes, "testblockedflush.mmap"), k)
+        bf.add_many("test%d" % x for x in xrange(1000))
+        bf.close()
+
+        bf = BlockedBloomFilter(Bitmap(bytes, "testblockedflush.mmap"), 1)
+        assert bf.k_num == k
+        assert len(bf) == 1000
+        assert all([bf.__contains__("test%d" % x) for x in xrange(1000)])
+        bf.close()
+
+    def test_create_open(self):
+        """
+        Tests a blocked filter with a header reopens from its path,
+        and can not be opened as a classic filter
+        """
+        bf = BlockedBloomFilter.create("testblockedheader.mmap", 1000, 1e-3)
+        assert bf.header
+        assert bf.blocks * bf.BLOCK_BYTES == bf.bitmap_size / 8
+        bf.add_many("test%d" % x for x in xrange(1000))
+        bf.close()
+
+        bf = BlockedBloomFilter.open("testblockedheader.mmap")
+        assert len(bf) == 1000
+        assert all(bf.contains_many("test%d" % x for x in xrange(1000)))
+        bf.close()
+
+        with pytest.raises(ValueError):
+            BloomFilter.open("testblockedheader.mmap")
+
+    @classmethod
+    def teardown_class(cls):
+        # Remove the mmap files
+        mmap_files = [f for f in os.listdir(".") if f.endswith(".mmap")]
+        [os.remove(f) for f in mmap_files]
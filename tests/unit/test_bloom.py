@@ -4,8 +4,10 @@ Contains tests for the main bloom filter class.
 import time
 import os
 import pytest
+import threading
 import hashlib
 from pyblooming import Bitmap
+from pyblooming.hashing import HASH_LEGACY, HASH_MURMUR3, INDEX_INDEPENDENT, INDEX_DOUBLE
 from pyblooming.bloom import BloomFilter as pyBloom
 from pyblooming.cbloom import BloomFilter as cBloom
 
@@ -135,6 +137,256 @@ class TestBloomFilter(object):
         assert all([bf.add("test%d" % x,False) for x in xrange(1000)])
         assert len(bf) == 2000
 
+    def test_add_many(self):
+        """
+        Tests that adding a batch of keys works
+        """
+        bf = pyBloom.for_capacity(1000,1e-4)
+        assert bf.add_many("test%d" % x for x in xrange(1000)) == 1000
+        assert all([bf.__contains__("test%d" % x) for x in xrange(1000)])
+        assert len(bf) == 1000
+
+    def test_add_many_with_check(self):
+        """
+        Tests that adding a batch while checking for existing
+        entries skips duplicates, including those within the batch
+        """
+        bf = pyBloom.for_capacity(1000,1e-4)
+        bf.add("test0")
+        assert bf.add_many(["test0", "test1", "test1", "test2"], True) == 2
+        assert len(bf) == 3
+
+    def test_contains_many(self):
+        """
+        Tests that checking a batch of keys matches single checks
+        """
+        bf = pyBloom.for_capacity(1000,1e-4)
+        [bf.add("test%d" % x) for x in xrange(500)]
+        keys = ["test%d" % x for x in xrange(1000)]
+        assert bf.contains_many(keys) == [k in bf for k in keys]
+        assert all(bf.contains_many(keys[:500]))
+
+    def test_key_hashes(self):
+        """
+        Tests that the hashes of a key can be shared between
+        filters with the same hash engine and index mode
+        """
+        for mode in (INDEX_INDEPENDENT, INDEX_DOUBLE):
+            small = pyBloom.for_capacity(1000,1e-2,index_mode=mode)
+            large = pyBloom.for_capacity(1000,1e-6,index_mode=mode)
+            assert len(small.key_hashes("test")) == small.k_num
+            hashes = small.key_hashes("test", large.k_num)
+            assert len(hashes) == large.k_num
+            assert hashes[:small.k_num] == small.key_hashes("test")
+
+            assert small.add_hashes(hashes)
+            assert large.add_hashes(hashes)
+            assert "test" in small
+            assert "test" in large
+            assert small.contains_hashes(hashes)
+            assert not small.contains_hashes(small.key_hashes("foo", large.k_num))
+            assert len(small) == 1
+
+    def test_union(self):
+        """
+        Tests that the union of filters contains the keys of both
+        """
+        bf1 = pyBloom.for_capacity(2000,1e-4)
+        bf2 = pyBloom.for_capacity(2000,1e-4)
+        [bf1.add("test%d" % x) for x in xrange(1000)]
+        [bf2.add("foo%d" % x) for x in xrange(1000)]
+
+        bf = bf1.union(bf2)
+        assert len(bf) == 2000
+        assert all([bf.__contains__("test%d" % x) for x in xrange(1000)])
+        assert all([bf.__contains__("foo%d" % x) for x in xrange(1000)])
+        assert not any([bf1.__contains__("foo%d" % x) for x in xrange(1000)])
+
+        bf1.union_update(bf2)
+        assert len(bf1) == 2000
+        assert all([bf1.__contains__("foo%d" % x) for x in xrange(1000)])
+
+    def test_intersection(self):
+        """
+        Tests that the intersection of filters contains the common keys
+        """
+        bf1 = pyBloom.for_capacity(2000,1e-4)
+        bf2 = pyBloom.for_capacity(2000,1e-4)
+        [bf1.add("test%d" % x) for x in xrange(1000)]
+        [bf2.add("test%d" % x) for x in xrange(500, 1500)]
+
+        bf = bf1.intersection(bf2)
+        assert len(bf) == 1000
+        assert all([bf.__contains__("test%d" % x) for x in xrange(500, 1000)])
+        assert sum([bf.__contains__("test%d" % x) for x in xrange(500)]) < 10
+
+    def test_estimate_cardinality(self):
+        """
+        Tests estimating the number of keys from the set bits
+        """
+        bf = pyBloom.for_capacity(10000,1e-3)
+        assert bf.estimate_cardinality() == 0
+        assert bf.current_false_positive_rate() == 0
+        [bf.add("test%d" % x) for x in xrange(5000)]
+        [bf.add("test%d" % x) for x in xrange(5000)]
+        assert len(bf) == 10000
+        assert 4800 < bf.estimate_cardinality() < 5200
+        assert 0 < bf.fill_ratio() < 0.5
+        assert bf.current_false_positive_rate() < 1e-3
+        [bf.add("foo%d" % x) for x in xrange(5000)]
+        assert 5e-4 < bf.current_false_positive_rate() < 2e-3
+
+    def test_shared_requires_atomic(self):
+        """
+        Tests shared filters need an atomic bitmap
+        """
+        with pytest.raises(ValueError):
+            pyBloom(Bitmap(1024, "testpysharednonatomic.mmap"), 3, shared=True)
+
+    def test_shared_processes(self):
+        """
+        Tests several processes adding keys to the same filter,
+        none of the bits or counts should be lost
+        """
+        procs = 4
+        bf = pyBloom(Bitmap(8192, "testpyshared.mmap", atomic=True), 3, shared=True)
+        pids = []
+        for p in xrange(procs):
+            pid = os.fork()
+            if pid == 0:
+                child = pyBloom(Bitmap(8192, "testpyshared.mmap", atomic=True), 3, shared=True)
+                child.add_many("test%d" % x for x in xrange(p, 1000, procs))
+                for x in xrange(1000 + p, 1200, procs):
+                    child.add("test%d" % x)
+                child.close()
+                os._exit(0)
+            pids.append(pid)
+        for pid in pids:
+            assert os.waitpid(pid, 0)[1] == 0
+
+        assert len(bf) == 1200
+        assert all(bf.contains_many("test%d" % x for x in xrange(1200)))
+        bf.clear()
+        assert len(bf) == 0
+        bf.close()
+
+        bf = pyBloom(Bitmap(8192, "testpyshared.mmap"), 3)
+        assert len(bf) == 0
+        bf.close()
+
+    def test_threadsafe_requires_atomic(self):
+        """
+        Tests thread safe filters need an atomic bitmap
+        """
+        with pytest.raises(ValueError):
+            pyBloom(Bitmap(1024), 3, threadsafe=True)
+
+    def test_threadsafe_threads(self):
+        """
+        Tests several threads adding and checking keys,
+        none of the bits or counts should be lost
+        """
+        bf = pyBloom(Bitmap(16384, atomic=True), 3, threadsafe=True)
+        def work(p):
+            bf.add_many("test%d" % x for x in xrange(p, 2000, 4))
+            for x in xrange(2000 + p, 2400, 4):
+                bf.add("test%d" % x)
+            assert all(bf.contains_many("test%d" % x for x in xrange(p, 2000, 4)))
+        threads = [threading.Thread(target=work, args=(p,)) for p in xrange(4)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+
+        assert len(bf) == 2400
+        assert all(bf.contains_many("test%d" % x for x in xrange(2400)))
+        assert bf.contains_many(["test%d" % x for x in xrange(2400)]) == [("test%d" % x) in bf for x in xrange(2400)]
+        bf.close()
+
+    def test_create_open(self):
+        """
+        Tests reopening a filter with a header from its path alone
+        """
+        bf = pyBloom.create("testpyheader.mmap", 1000, 0.01, index_mode=INDEX_DOUBLE)
+        assert bf.header
+        assert (bf.bitmap_size / 8) % 8 == 0
+        [bf.add("test%d" % x) for x in xrange(100)]
+        k = bf.k_num
+        bf.close()
+
+        bf = pyBloom.open("testpyheader.mmap")
+        assert bf.header
+        assert bf.k_num == k
+        assert bf.index_mode == INDEX_DOUBLE
+        assert len(bf) == 100
+        assert all(bf.contains_many("test%d" % x for x in xrange(100)))
+        bf.close()
+
+        bf = pyBloom.open("testpyheader.mmap", shared=True)
+        assert bf.bitmap.atomic
+        bf.add("foo")
+        assert len(bf) == 101
+        bf.close()
+
+    def test_open_legacy(self):
+        """
+        Tests opening a file with a trailer from its path alone
+        """
+        bf = pyBloom(Bitmap(1024, "testpylegacy.mmap"), 3)
+        assert not bf.header
+        [bf.add("test%d" % x) for x in xrange(50)]
+        bf.close()
+
+        bf = pyBloom.open("testpylegacy.mmap")
+        assert not bf.header
+        assert bf.k_num == 3
+        assert len(bf) == 50
+        assert "test10" in bf
+        bf.close()
+
+    def test_open_bad_header(self):
+        """
+        Tests a corrupted header, or a file without a filter, is rejected
+        """
+        bf = pyBloom.create("testpybadheader.mmap", 1000, 0.01)
+        offset = bf.bitmap_size / 8
+        bf.close()
+        raw = open("testpybadheader.mmap", "rb").read()
+        corrupt = raw[:offset+10] + "\xff" + raw[offset+11:]
+        open("testpybadheader.mmap", "wb").write(corrupt)
+        with pytest.raises(ValueError):
+            pyBloom.open("testpybadheader.mmap")
+
+        open("testpyempty.mmap", "wb").write("\x00" * 1024)
+        with pytest.raises(ValueError):
+            pyBloom.open("testpyempty.mmap")
+
+    def test_clear(self):
+        """
+        Tests removing every key, keeping the trailer
+        """
+        bf = pyBloom(Bitmap(1024, "testpyclear.mmap"), 3)
+        [bf.add("test%d" % x) for x in xrange(100)]
+        bf.clear()
+        assert len(bf) == 0
+        assert not any(bf.contains_many("test%d" % x for x in xrange(100)))
+        bf.close()
+
+        bf = pyBloom(Bitmap(1024, "testpyclear.mmap"), 5)
+        assert bf.k_num == 3
+        assert len(bf) == 0
+        bf.close()
+
+    def test_merge_incompatible(self):
+        """
+        Tests that filters of different shapes are not merged
+        """
+        bf = pyBloom.for_capacity(1000,1e-4)
+        with pytest.raises(ValueError):
+            bf.union(pyBloom.for_capacity(2000,1e-4))
+        with pytest.raises(ValueError):
+            bf.union(pyBloom.for_capacity(1000,1e-4,HASH_LEGACY))
+        with pytest.raises(ValueError):
+            bf.intersection(pyBloom.for_capacity(1000,1e-4,index_mode=INDEX_DOUBLE))
+
     def test_add_none(self):
         """
         Tests adding None to a set. This should fail.
@@ -145,11 +397,14 @@ class TestBloomFilter(object):
 
     def test_add_int(self):
         """
-        Tests adding an int to a set. This should fail.
+        Tests adding an int to a set
         """
         bf = pyBloom.for_capacity(1000,1e-4)
-        with pytest.raises(TypeError):
-            bf.add(1234)
+        assert bf.add(1234)
+        assert 1234 in bf
+        assert "1234" not in bf
+        with pytest.raises(OverflowError):
+            bf.add(2**64)
 
     def test_check_none(self):
         """
@@ -161,11 +416,33 @@ class TestBloomFilter(object):
 
     def test_check_int(self):
         """
-        Tests checking for an int in a set. This should fail.
+        Tests checking for an int in a set
         """
         bf = pyBloom.for_capacity(1000,1e-4)
+        assert 1234 not in bf
+        with pytest.raises(TypeError):
+            1.5 in bf
+
+    def test_typed_keys(self):
+        """
+        Tests integer, unicode and buffer keys, alone and in batches
+        """
+        bf = pyBloom.for_capacity(10000,1e-4)
+        assert bf.add_many(xrange(-1000, 1000)) == 2000
+        assert bf.add(2**64 - 1)
+        assert all(bf.contains_many(xrange(-1000, 1000)))
+        assert all(x in bf for x in xrange(-1000, 1000))
+        assert -1 in bf
+        assert sum(bf.contains_many(xrange(5000, 6000))) < 5
+
+        # Unicode is hashed as UTF-8, and buffers by their contents
+        assert bf.add(u"caf\xe9")
+        assert "caf\xc3\xa9" in bf
+        bf.add_many([bytearray("test"), buffer("a test2", 2)])
+        assert bf.contains_many(["test", "test2", memoryview("test"), u"test2"]) == [True] * 4
+        assert bf.key_hashes(u"test") == bf.key_hashes("test")
         with pytest.raises(TypeError):
-            1234 in bf
+            bf.add_many(["test", None])
 
     def test_length(self):
         """
@@ -213,6 +490,25 @@ class TestBloomFilter(object):
         bf1.close()
         bf.close()
 
+    def test_flush_dirty_only(self):
+        """
+        Tests that flushing only the modified pages keeps the count
+        """
+        bitmap = Bitmap(1 << 16, "testpyflushdirty.mmap")
+        bf = pyBloom(bitmap, 2)
+        [bf.add("test%d" % x) for x in xrange(100)]
+        assert bf.dirty_bytes() > 0
+        bf.flush(dirty_only=True)
+        assert bf.dirty_bytes() == 0
+        bf.flush(dirty_only=True)
+        assert bf.dirty_bytes() == 0
+
+        bf1 = pyBloom(Bitmap(1 << 16, "testpyflushdirty.mmap"), 20)
+        assert len(bf1) == 100
+        assert all([bf1.__contains__("test%d" % x) for x in xrange(100)])
+        bf1.close()
+        bf.close()
+
     def test_close_does_flush(self):
         """
         Tests that a close does flush
@@ -236,7 +532,7 @@ class TestBloomFilter(object):
         a certain threshold.
         """
         # Only wrong once per hundred
-        bf = pyBloom.for_capacity(1000,0.01)
+        bf = pyBloom.for_capacity(1000,0.01,HASH_LEGACY)
         res = [bf.add("test%d" % x,True) for x in xrange(1000)]
         num_wrong = len([x for x in res if x is False])
 
@@ -244,6 +540,83 @@ class TestBloomFilter(object):
         assert num_wrong >= 5
         assert num_wrong <= 15
 
+    def test_prob_murmur3(self):
+        """
+        Tests that the bloom filter is only wrong within
+        a certain threshold once it is at capacity.
+        """
+        # Only wrong once per hundred
+        bf = pyBloom.for_capacity(1000,0.01,HASH_MURMUR3)
+        [bf.add("test%d" % x) for x in xrange(1000)]
+        num_wrong = len([x for x in xrange(10000) if "foo%d" % x in bf])
+
+        # Should get about 100 wrong
+        assert num_wrong >= 50
+        assert num_wrong <= 150
+
+    def test_hash_engine(self):
+        """
+        Tests that the hash engine is persisted and restored
+        """
+        bitmap = Bitmap(1024, "testpyBloomengine.mmap")
+        bf = pyBloom(bitmap, 2, HASH_LEGACY)
+        assert bf.hash_engine == HASH_LEGACY
+        [bf.add("test%d" % x) for x in xrange(100)]
+        bf.close()
+
+        # Should restore the legacy engine
+        bitmap = Bitmap(1024, "testpyBloomengine.mmap")
+        bf = pyBloom(bitmap, 2, HASH_MURMUR3)
+        assert bf.hash_engine == HASH_LEGACY
+        assert all([bf.__contains__("test%d" % x) for x in xrange(100)])
+        bf.close()
+
+    def test_bad_hash_engine(self):
+        """
+        Tests that unknown hash engines are rejected
+        """
+        with pytest.raises(ValueError):
+            pyBloom(Bitmap(1024), 2, 255)
+
+    def test_prob_double_hashing(self):
+        """
+        Tests that double hashing keeps the false positive
+        rate at a low probability with a large k.
+        """
+        bf = pyBloom.for_capacity(10000,1e-3,index_mode=INDEX_DOUBLE)
+        assert bf.k_num >= 10
+        [bf.add("test%d" % x) for x in xrange(10000)]
+        assert all([bf.__contains__("test%d" % x) for x in xrange(10000)])
+        num_wrong = len([x for x in xrange(100000) if "foo%d" % x in bf])
+
+        # Should get about 100 wrong
+        assert num_wrong >= 50
+        assert num_wrong <= 150
+
+    def test_index_mode(self):
+        """
+        Tests that the index mode is persisted and restored
+        """
+        bitmap = Bitmap(1024, "testpyBloomindex.mmap")
+        bf = pyBloom(bitmap, 4, index_mode=INDEX_DOUBLE)
+        assert bf.index_mode == INDEX_DOUBLE
+        [bf.add("test%d" % x) for x in xrange(100)]
+        bf.close()
+
+        # Should restore the double hashing mode
+        bitmap = Bitmap(1024, "testpyBloomindex.mmap")
+        bf = pyBloom(bitmap, 4, index_mode=INDEX_INDEPENDENT)
+        assert bf.index_mode == INDEX_DOUBLE
+        assert all([bf.__contains__("test%d" % x) for x in xrange(100)])
+        bf.close()
+
+    def test_bad_index_mode(self):
+        """
+        Tests that unknown index modes are rejected
+        """
+        with pytest.raises(ValueError):
+            pyBloom(Bitmap(1024), 2, index_mode=255)
+
     @classmethod
     def teardown_class(cls):
         # Remove the mmap files
@@ -376,6 +749,256 @@ class TestCBloomFilter(object):
         assert all([bf.add("test%d" % x,False) for x in xrange(1000)])
         assert len(bf) == 2000
 
+    def test_add_many(self):
+        """
+        Tests that adding a batch of keys works
+        """
+        bf = cBloom.for_capacity(1000,1e-4)
+        assert bf.add_many("test%d" % x for x in xrange(1000)) == 1000
+        assert all([bf.__contains__("test%d" % x) for x in xrange(1000)])
+        assert len(bf) == 1000
+
+    def test_add_many_with_check(self):
+        """
+        Tests that adding a batch while checking for existing
+        entries skips duplicates, including those within the batch
+        """
+        bf = cBloom.for_capacity(1000,1e-4)
+        bf.add("test0")
+        assert bf.add_many(["test0", "test1", "test1", "test2"], True) == 2
+        assert len(bf) == 3
+
+    def test_contains_many(self):
+        """
+        Tests that checking a batch of keys matches single checks
+        """
+        bf = cBloom.for_capacity(1000,1e-4)
+        [bf.add("test%d" % x) for x in xrange(500)]
+        keys = ["test%d" % x for x in xrange(1000)]
+        assert bf.contains_many(keys) == [k in bf for k in keys]
+        assert all(bf.contains_many(keys[:500]))
+
+    def test_key_hashes(self):
+        """
+        Tests that the hashes of a key can be shared between
+        filters with the same hash engine and index mode
+        """
+        for mode in (INDEX_INDEPENDENT, INDEX_DOUBLE):
+            small = cBloom.for_capacity(1000,1e-2,index_mode=mode)
+            large = cBloom.for_capacity(1000,1e-6,index_mode=mode)
+            assert len(small.key_hashes("test")) == small.k_num
+            hashes = small.key_hashes("test", large.k_num)
+            assert len(hashes) == large.k_num
+            assert hashes[:small.k_num] == small.key_hashes("test")
+
+            assert small.add_hashes(hashes)
+            assert large.add_hashes(hashes)
+            assert "test" in small
+            assert "test" in large
+            assert small.contains_hashes(hashes)
+            assert not small.contains_hashes(small.key_hashes("foo", large.k_num))
+            assert len(small) == 1
+
+    def test_union(self):
+        """
+        Tests that the union of filters contains the keys of both
+        """
+        bf1 = cBloom.for_capacity(2000,1e-4)
+        bf2 = cBloom.for_capacity(2000,1e-4)
+        [bf1.add("test%d" % x) for x in xrange(1000)]
+        [bf2.add("foo%d" % x) for x in xrange(1000)]
+
+        bf = bf1.union(bf2)
+        assert len(bf) == 2000
+        assert all([bf.__contains__("test%d" % x) for x in xrange(1000)])
+        assert all([bf.__contains__("foo%d" % x) for x in xrange(1000)])
+        assert not any([bf1.__contains__("foo%d" % x) for x in xrange(1000)])
+
+        bf1.union_update(bf2)
+        assert len(bf1) == 2000
+        assert all([bf1.__contains__("foo%d" % x) for x in xrange(1000)])
+
+    def test_intersection(self):
+        """
+        Tests that the intersection of filters contains the common keys
+        """
+        bf1 = cBloom.for_capacity(2000,1e-4)
+        bf2 = cBloom.for_capacity(2000,1e-4)
+        [bf1.add("test%d" % x) for x in xrange(1000)]
+        [bf2.add("test%d" % x) for x in xrange(500, 1500)]
+
+        bf = bf1.intersection(bf2)
+        assert len(bf) == 1000
+        assert all([bf.__contains__("test%d" % x) for x in xrange(500, 1000)])
+        assert sum([bf.__contains__("test%d" % x) for x in xrange(500)]) < 10
+
+    def test_estimate_cardinality(self):
+        """
+        Tests estimating the number of keys from the set bits
+        """
+        bf = cBloom.for_capacity(10000,1e-3)
+        assert bf.estimate_cardinality() == 0
+        assert bf.current_false_positive_rate() == 0
+        [bf.add("test%d" % x) for x in xrange(5000)]
+        [bf.add("test%d" % x) for x in xrange(5000)]
+        assert len(bf) == 10000
+        assert 4800 < bf.estimate_cardinality() < 5200
+        assert 0 < bf.fill_ratio() < 0.5
+        assert bf.current_false_positive_rate() < 1e-3
+        [bf.add("foo%d" % x) for x in xrange(5000)]
+        assert 5e-4 < bf.current_false_positive_rate() < 2e-3
+
+    def test_shared_requires_atomic(self):
+        """
+        Tests shared filters need an atomic bitmap
+        """
+        with pytest.raises(ValueError):
+            cBloom(Bitmap(1024, "testcsharednonatomic.mmap"), 3, shared=True)
+
+    def test_shared_processes(self):
+        """
+        Tests several processes adding keys to the same filter,
+        none of the bits or counts should be lost
+        """
+        procs = 4
+        bf = cBloom(Bitmap(8192, "testcshared.mmap", atomic=True), 3, shared=True)
+        pids = []
+        for p in xrange(procs):
+            pid = os.fork()
+            if pid == 0:
+                child = cBloom(Bitmap(8192, "testcshared.mmap", atomic=True), 3, shared=True)
+                child.add_many("test%d" % x for x in xrange(p, 1000, procs))
+                for x in xrange(1000 + p, 1200, procs):
+                    child.add("test%d" % x)
+                child.close()
+                os._exit(0)
+            pids.append(pid)
+        for pid in pids:
+            assert os.waitpid(pid, 0)[1] == 0
+
+        assert len(bf) == 1200
+        assert all(bf.contains_many("test%d" % x for x in xrange(1200)))
+        bf.clear()
+        assert len(bf) == 0
+        bf.close()
+
+        bf = cBloom(Bitmap(8192, "testcshared.mmap"), 3)
+        assert len(bf) == 0
+        bf.close()
+
+    def test_threadsafe_requires_atomic(self):
+        """
+        Tests thread safe filters need an atomic bitmap
+        """
+        with pytest.raises(ValueError):
+            cBloom(Bitmap(1024), 3, threadsafe=True)
+
+    def test_threadsafe_threads(self):
+        """
+        Tests several threads adding and checking keys,
+        none of the bits or counts should be lost
+        """
+        bf = cBloom(Bitmap(16384, atomic=True), 3, threadsafe=True)
+        def work(p):
+            bf.add_many("test%d" % x for x in xrange(p, 2000, 4))
+            for x in xrange(2000 + p, 2400, 4):
+                bf.add("test%d" % x)
+            assert all(bf.contains_many("test%d" % x for x in xrange(p, 2000, 4)))
+        threads = [threading.Thread(target=work, args=(p,)) for p in xrange(4)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+
+        assert len(bf) == 2400
+        assert all(bf.contains_many("test%d" % x for x in xrange(2400)))
+        assert bf.contains_many(["test%d" % x for x in xrange(2400)]) == [("test%d" % x) in bf for x in xrange(2400)]
+        bf.close()
+
+    def test_create_open(self):
+        """
+        Tests reopening a filter with a header from its path alone
+        """
+        bf = cBloom.create("testcheader.mmap", 1000, 0.01, index_mode=INDEX_DOUBLE)
+        assert bf.header
+        assert (bf.bitmap_size / 8) % 8 == 0
+        [bf.add("test%d" % x) for x in xrange(100)]
+        k = bf.k_num
+        bf.close()
+
+        bf = cBloom.open("testcheader.mmap")
+        assert bf.header
+        assert bf.k_num == k
+        assert bf.index_mode == INDEX_DOUBLE
+        assert len(bf) == 100
+        assert all(bf.contains_many("test%d" % x for x in xrange(100)))
+        bf.close()
+
+        bf = cBloom.open("testcheader.mmap", shared=True)
+        assert bf.bitmap.atomic
+        bf.add("foo")
+        assert len(bf) == 101
+        bf.close()
+
+    def test_open_legacy(self):
+        """
+        Tests opening a file with a trailer from its path alone
+        """
+        bf = cBloom(Bitmap(1024, "testclegacy.mmap"), 3)
+        assert not bf.header
+        [bf.add("test%d" % x) for x in xrange(50)]
+        bf.close()
+
+        bf = cBloom.open("testclegacy.mmap")
+        assert not bf.header
+        assert bf.k_num == 3
+        assert len(bf) == 50
+        assert "test10" in bf
+        bf.close()
+
+    def test_open_bad_header(self):
+        """
+        Tests a corrupted header, or a file without a filter, is rejected
+        """
+        bf = cBloom.create("testcbadheader.mmap", 1000, 0.01)
+        offset = bf.bitmap_size / 8
+        bf.close()
+        raw = open("testcbadheader.mmap", "rb").read()
+        corrupt = raw[:offset+10] + "\xff" + raw[offset+11:]
+        open("testcbadheader.mmap", "wb").write(corrupt)
+        with pytest.raises(ValueError):
+            cBloom.open("testcbadheader.mmap")
+
+        open("testcempty.mmap", "wb").write("\x00" * 1024)
+        with pytest.raises(ValueError):
+            cBloom.open("testcempty.mmap")
+
+    def test_clear(self):
+        """
+        Tests removing every key, keeping the trailer
+        """
+        bf = cBloom(Bitmap(1024, "testcclear.mmap"), 3)
+        [bf.add("test%d" % x) for x in xrange(100)]
+        bf.clear()
+        assert len(bf) == 0
+        assert not any(bf.contains_many("test%d" % x for x in xrange(100)))
+        bf.close()
+
+        bf = cBloom(Bitmap(1024, "testcclear.mmap"), 5)
+        assert bf.k_num == 3
+        assert len(bf) == 0
+        bf.close()
+
+    def test_merge_incompatible(self):
+        """
+        Tests that filters of different shapes are not merged
+        """
+        bf = cBloom.for_capacity(1000,1e-4)
+        with pytest.raises(ValueError):
+            bf.union(cBloom.for_capacity(2000,1e-4))
+        with pytest.raises(ValueError):
+            bf.union(cBloom.for_capacity(1000,1e-4,HASH_LEGACY))
+        with pytest.raises(ValueError):
+            bf.intersection(cBloom.for_capacity(1000,1e-4,index_mode=INDEX_DOUBLE))
+
     def test_add_none(self):
         """
         Tests adding None to a set. This should fail.
@@ -386,11 +1009,14 @@ class TestCBloomFilter(object):
 
     def test_add_int(self):
         """
-        Tests adding an int to a set. This should fail.
+        Tests adding an int to a set
         """
         bf = cBloom.for_capacity(1000,1e-4)
-        with pytest.raises(TypeError):
-            bf.add(1234)
+        assert bf.add(1234)
+        assert 1234 in bf
+        assert "1234" not in bf
+        with pytest.raises(OverflowError):
+            bf.add(2**64)
 
     def test_check_none(self):
         """
@@ -402,11 +1028,33 @@ class TestCBloomFilter(object):
 
     def test_check_int(self):
         """
-        Tests checking for an int in a set. This should fail.
+        Tests checking for an int in a set
         """
         bf = cBloom.for_capacity(1000,1e-4)
+        assert 1234 not in bf
         with pytest.raises(TypeError):
-            1234 in bf
+            1.5 in bf
+
+    def test_typed_keys(self):
+        """
+        Tests integer, unicode and buffer keys, alone and in batches
+        """
+        bf = cBloom.for_capacity(10000,1e-4)
+        assert bf.add_many(xrange(-1000, 1000)) == 2000
+        assert bf.add(2**64 - 1)
+        assert all(bf.contains_many(xrange(-1000, 1000)))
+        assert all(x in bf for x in xrange(-1000, 1000))
+        assert -1 in bf
+        assert sum(bf.contains_many(xrange(5000, 6000))) < 5
+
+        # Unicode is hashed as UTF-8, and buffers by their contents
+        assert bf.add(u"caf\xe9")
+        assert "caf\xc3\xa9" in bf
+        bf.add_many([bytearray("test"), buffer("a test2", 2)])
+        assert bf.contains_many(["test", "test2", memoryview("test"), u"test2"]) == [True] * 4
+        assert bf.key_hashes(u"test") == bf.key_hashes("test")
+        with pytest.raises(TypeError):
+            bf.add_many(["test", None])
 
     def test_length(self):
         """
@@ -454,6 +1102,25 @@ class TestCBloomFilter(object):
         bf1.close()
         bf.close()
 
+    def test_flush_dirty_only(self):
+        """
+        Tests that flushing only the modified pages keeps the count
+        """
+        bitmap = Bitmap(1 << 16, "testcflushdirty.mmap")
+        bf = cBloom(bitmap, 2)
+        [bf.add("test%d" % x) for x in xrange(100)]
+        assert bf.dirty_bytes() > 0
+        bf.flush(dirty_only=True)
+        assert bf.dirty_bytes() == 0
+        bf.flush(dirty_only=True)
+        assert bf.dirty_bytes() == 0
+
+        bf1 = cBloom(Bitmap(1 << 16, "testcflushdirty.mmap"), 20)
+        assert len(bf1) == 100
+        assert all([bf1.__contains__("test%d" % x) for x in xrange(100)])
+        bf1.close()
+        bf.close()
+
     def test_close_does_flush(self):
         """
         Tests that a close does flush
@@ -477,7 +1144,7 @@ class TestCBloomFilter(object):
         a certain threshold.
         """
         # Only wrong once per hundred
-        bf = cBloom.for_capacity(1000,0.01)
+        bf = cBloom.for_capacity(1000,0.01,HASH_LEGACY)
         res = [bf.add("test%d" % x,True) for x in xrange(1000)]
         num_wrong = len([x for x in res if x is False])
 
@@ -485,6 +1152,83 @@ class TestCBloomFilter(object):
         assert num_wrong >= 5
         assert num_wrong <= 15
 
+    def test_prob_murmur3(self):
+        """
+        Tests that the bloom filter is only wrong within
+        a certain threshold once it is at capacity.
+        """
+        # Only wrong once per hundred
+        bf = cBloom.for_capacity(1000,0.01,HASH_MURMUR3)
+        [bf.add("test%d" % x) for x in xrange(1000)]
+        num_wrong = len([x for x in xrange(10000) if "foo%d" % x in bf])
+
+        # Should get about 100 wrong
+        assert num_wrong >= 50
+        assert num_wrong <= 150
+
+    def test_hash_engine(self):
+        """
+        Tests that the hash engine is persisted and restored
+        """
+        bitmap = Bitmap(1024, "testcBloomengine.mmap")
+        bf = cBloom(bitmap, 2, HASH_LEGACY)
+        assert bf.hash_engine == HASH_LEGACY
+        [bf.add("test%d" % x) for x in xrange(100)]
+        bf.close()
+
+        # Should restore the legacy engine
+        bitmap = Bitmap(1024, "testcBloomengine.mmap")
+        bf = cBloom(bitmap, 2, HASH_MURMUR3)
+        assert bf.hash_engine == HASH_LEGACY
+        assert all([bf.__contains__("test%d" % x) for x in xrange(100)])
+        bf.close()
+
+    def test_bad_hash_engine(self):
+        """
+        Tests that unknown hash engines are rejected
+        """
+        with pytest.raises(ValueError):
+            cBloom(Bitmap(1024), 2, 255)
+
+    def test_prob_double_hashing(self):
+        """
+        Tests that double hashing keeps the false positive
+        rate at a low probability with a large k.
+        """
+        bf = cBloom.for_capacity(10000,1e-3,index_mode=INDEX_DOUBLE)
+        assert bf.k_num >= 10
+        [bf.add("test%d" % x) for x in xrange(10000)]
+        assert all([bf.__contains__("test%d" % x) for x in xrange(10000)])
+        num_wrong = len([x for x in xrange(100000) if "foo%d" % x in bf])
+
+        # Should get about 100 wrong
+        assert num_wrong >= 50
+        assert num_wrong <= 150
+
+    def test_index_mode(self):
+        """
+        Tests that the index mode is persisted and restored
+        """
+        bitmap = Bitmap(1024, "testcBloomindex.mmap")
+        bf = cBloom(bitmap, 4, index_mode=INDEX_DOUBLE)
+        assert bf.index_mode == INDEX_DOUBLE
+        [bf.add("test%d" % x) for x in xrange(100)]
+        bf.close()
+
+        # Should restore the double hashing mode
+        bitmap = Bitmap(1024, "testcBloomindex.mmap")
+        bf = cBloom(bitmap, 4, index_mode=INDEX_INDEPENDENT)
+        assert bf.index_mode == INDEX_DOUBLE
+        assert all([bf.__contains__("test%d" % x) for x in xrange(100)])
+        bf.close()
+
+    def test_bad_index_mode(self):
+        """
+        Tests that unknown index modes are rejected
+        """
+        with pytest.raises(ValueError):
+            cBloom(Bitmap(1024), 2, index_mode=255)
+
     @classmethod
     def teardown_class(cls):
         # Remove the mmap files
@@ -511,6 +1255,26 @@ class TestFilterCompatibility(object):
         hash2 = hashlib.md5(raw2).digest()
         assert hash1 == hash2
 
+    def test_header_equality(self):
+        """
+        Tests that the two implementations write matching headers
+        """
+        bf1 = cBloom.create("testcompatch.mmap", 1e4, 1e-4)
+        [bf1.add("test%d" % x) for x in xrange(1000)]
+        bf2 = pyBloom.create("testcompatpyh.mmap", 1e4, 1e-4)
+        [bf2.add("test%d" % x) for x in xrange(1000)]
+        bf1.close()
+        bf2.close()
+        self.compare_files("testcompatch.mmap", "testcompatpyh.mmap")
+
+        # Each can open the file of the other
+        bf1 = cBloom.open("testcompatpyh.mmap")
+        bf2 = pyBloom.open("testcompatch.mmap")
+        assert len(bf1) == len(bf2) == 1000
+        assert "test10" in bf1 and "test10" in bf2
+        bf1.close()
+        bf2.close()
+
     def test_equality_1(self):
         """
         Tests that the two implementation generate matching mmaps
@@ -555,6 +1319,100 @@ class TestFilterCompatibility(object):
         # Compare the mmap files
         self.compare_files("testcompatc2.mmap", "testcompatpy2.mmap")
 
+    def test_equality_typed(self):
+        """
+        Tests that the two implementations hash typed keys the same
+        """
+        keys = [0, -1, 2**63, 2**64 - 1, u"caf\xe9", bytearray("test")]
+        for mode in (INDEX_INDEPENDENT, INDEX_DOUBLE):
+            bf1 = cBloom.for_capacity(1e4, 1e-4, index_mode=mode)
+            bf2 = pyBloom.for_capacity(1e4, 1e-4, index_mode=mode)
+            for key in keys:
+                assert bf1.key_hashes(key) == bf2.key_hashes(key)
+
+            # Batches of integers set the same bits
+            bf1.add_many(xrange(1000))
+            bf2.add_many(xrange(1000))
+            size = bf1.bitmap_size / 8
+            assert bf1.bitmap[0:size] == bf2.bitmap[0:size]
+
+    def test_equality_legacy_unicode(self):
+        """
+        Tests that the two implementations hash unicode keys by
+        code point with the legacy engine, alone and in batches
+        """
+        keys = [u"caf\xe9", u"\u65e5\u672c", u"\U0001f600 test", u"test"]
+        for mode in (INDEX_INDEPENDENT, INDEX_DOUBLE):
+            bf1 = cBloom.for_capacity(1e4, 1e-4, hash_engine=HASH_LEGACY, index_mode=mode)
+            bf2 = pyBloom.for_capacity(1e4, 1e-4, hash_engine=HASH_LEGACY, index_mode=mode)
+            for key in keys:
+                assert bf1.key_hashes(key, 12) == bf2.key_hashes(key, 12)
+            assert bf1.key_hashes(u"test") == bf1.key_hashes("test")
+
+            bf1.add_many(keys)
+            bf2.add_many(keys)
+            size = bf1.bitmap_size / 8
+            assert bf1.bitmap[0:size] == bf2.bitmap[0:size]
+            assert all(bf1.contains_many(keys))
+
+    def test_equality_batch(self):
+        """
+        Tests that batch adds generate the same mmaps as single adds
+        """
+        bytes, k = cBloom.params_for_capacity(1e4, 1e-4)
+        bitmap = Bitmap(bytes, "testcompatbatchc.mmap")
+        bf1 = cBloom(bitmap, k)
+        bf1.add_many("test%d" % x for x in xrange(10000))
+
+        # Make a new bitmap
+        bitmap = Bitmap(bytes, "testcompatbatchpy.mmap")
+        bf2 = pyBloom(bitmap, k)
+        [bf2.add("test%d" % x) for x in xrange(10000)]
+
+        # Check the lengths
+        assert len(bf1) == len(bf2)
+        bf1.close()
+        bf2.close()
+
+        # Compare the mmap files
+        self.compare_files("testcompatbatchc.mmap", "testcompatbatchpy.mmap")
+
+    def test_equality_double_hashing(self):
+        """
+        Tests that the two implementation generate matching mmaps
+        when using double hashing, with both hash engines
+        """
+        for engine in (HASH_LEGACY, HASH_MURMUR3):
+            bytes, k = cBloom.params_for_capacity(1e4, 1e-4)
+            bitmap = Bitmap(bytes, "testcompatdoublec%d.mmap" % engine)
+            bf1 = cBloom(bitmap, k, engine, INDEX_DOUBLE)
+            [bf1.add("test%d" % x) for x in xrange(10000)]
+
+            # Make a new bitmap
+            bitmap = Bitmap(bytes, "testcompatdoublepy%d.mmap" % engine)
+            bf2 = pyBloom(bitmap, k, engine, INDEX_DOUBLE)
+            [bf2.add("test%d" % x) for x in xrange(10000)]
+
+            bf1.close()
+            bf2.close()
+
+            # Compare the mmap files
+            self.compare_files("testcompatdoublec%d.mmap" % engine, "testcompatdoublepy%d.mmap" % engine)
+
+    def test_union_compatibility(self):
+        """
+        Tests that filters from both implementations can be merged
+        """
+        bf1 = cBloom.for_capacity(2000,1e-4)
+        bf2 = pyBloom.for_capacity(2000,1e-4)
+        [bf1.add("test%d" % x) for x in xrange(1000)]
+        [bf2.add("foo%d" % x) for x in xrange(1000)]
+
+        for bf in (bf1.union(bf2), bf2.union(bf1)):
+            assert len(bf) == 2000
+            assert all([bf.__contains__("test%d" % x) for x in xrange(1000)])
+            assert all([bf.__contains__("foo%d" % x) for x in xrange(1000)])
+
     def test_swap(self):
         """
         Swaps the mmap files from one implementation to another,
@@ -0,0 +1,166 @@
+"""
+Contains tests for the counting bloom filter class.
+"""
+import os
+import pytest
+from pyblooming import Bitmap, BloomFilter, CountingBloomFilter
+from pyblooming.hashing import INDEX_DOUBLE
+
+class TestCountingBloomFilter(object):
+
+    @classmethod
+    def setup_class(cls):
+        # Remove the mmap files
+        mmap_files = [f for f in os.listdir(".") if f.endswith(".mmap")]
+        [os.remove(f) for f in mmap_files]
+
+    def test_bad_width(self):
+        """
+        Tests that the counter width is checked
+        """
+        with pytest.raises(ValueError):
+            CountingBloomFilter(Bitmap(1024), 3, width=3)
+
+    def test_params_for_capacity(self):
+        """
+        Tests that the counters take width times the bits
+        """
+        bytes, k = CountingBloomFilter.params_for_capacity(1e4, 1e-3)
+        classic, classic_k = BloomFilter.params_for_capacity(1e4, 1e-3)
+        assert k == classic_k
+        assert bytes - CountingBloomFilter.extra_buffer() == 4 * (classic - BloomFilter.extra_buffer())
+        bytes, k = CountingBloomFilter.params_for_capacity(1e4, 1e-3, 8)
+        assert bytes - CountingBloomFilter.extra_buffer() == 8 * (classic - BloomFilter.extra_buffer())
+
+    def test_add_remove(self):
+        """
+        Tests adding and removing keys
+        """
+        for mode in (None, INDEX_DOUBLE):
+            bf = CountingBloomFilter.for_capacity(1000, 1e-4, index_mode=mode)
+            assert all([bf.add("test%d" % x) for x in xrange(1000)])
+            assert all(bf.contains_many("test%d" % x for x in xrange(1000)))
+            assert len(bf) == 1000
+
+            assert all([bf.remove("test%d" % x) for x in xrange(500)])
+            assert len(bf) == 500
+            assert sum(bf.contains_many("test%d" % x for x in xrange(500))) < 5
+            assert all(bf.contains_many("test%d" % x for x in xrange(500, 1000)))
+            assert not bf.remove("foo")
+
+    def test_duplicates(self):
+        """
+        Tests that a key added twice must be removed twice
+        """
+        bf = CountingBloomFilter.for_capacity(1000, 1e-4)
+        bf.add("test")
+        bf.add("test")
+        assert bf.counter("test") == 2
+        assert not bf.add("test", True)
+        assert bf.remove("test")
+        assert "test" in bf
+        assert bf.remove("test")
+        assert "test" not in bf
+
+    def test_saturate(self):
+        """
+        Tests that counters saturate instead of wrapping
+        """
+        bf = CountingBloomFilter.for_capacity(1000, 1e-4, width=2)
+        [bf.add("test") for x in xrange(5)]
+        assert bf.counter("test") == 3
+        [bf.remove("test") for x in xrange(5)]
+        assert bf.counter("test") == 3
+        assert "test" in bf
+
+    def test_estimate_cardinality(self):
+        """
+        Tests estimating the number of keys from the counters
+        """
+        bf = CountingBloomFilter.for_capacity(10000, 1e-3)
+        bf.add_many("test%d" % x for x in xrange(5000))
+        bf.add_many("test%d" % x for x in xrange(5000))
+        assert 4800 < bf.estimate_cardinality() < 5200
+
+    def test_union(self):
+        """
+        Tests merging the counters of two filters
+        """
+        bf1 = CountingBloomFilter.for_capacity(2000, 1e-4)
+        bf2 = CountingBloomFilter.for_capacity(2000, 1e-4)
+        bf1.add_many("test%d" % x for x in xrange(1000))
+        bf2.add_many("test%d" % x for x in xrange(500, 1500))
+
+        bf = bf1.union(bf2)
+        assert len(bf) == 2000
+        assert bf.counter("test700") == 2
+        assert all(bf.contains_many("test%d" % x for x in xrange(1500)))
+
+        bf = bf1.intersection(bf2)
+        assert bf.counter("test700") == 1
+        assert sum(bf.contains_many("test%d" % x for x in xrange(500))) < 5
+
+        with pytest.raises(ValueError):
+            bf1.union(CountingBloomFilter.for_capacity(2000, 1e-4, width=8))
+        with pytest.raises(ValueError):
+            bf1.union(BloomFilter(Bitmap(len(bf1.bitmap) / 8), bf1.k_num))
+
+    def test_flush(self):
+        """
+        Tests that a counting filter restores from a file
+        """
+        bytes, k = CountingBloomFilter.params_for_capacity(1000, 1e-3, 8)
+        bf = CountingBloomFilter(Bitmap(bytes, "testcountingflush.mmap"), k, width=8)
+        bf.add_many("test%d" % x for x in xrange(1000))
+        bf.add("test1")
+        bf.close()
+
+        bf = CountingBloomFilter(Bitmap(bytes, "testcountingflush.mmap"), 1)
+        assert bf.k_num == k
+        assert bf.width == 8
+        assert len(bf) == 1001
+        assert bf.counter("test1") == 2
+        assert all(bf.contains_many("test%d" % x for x in xrange(1000)))
+        bf.close()
+
+    def test_create_open(self):
+        """
+        Tests a counting filter with a header reopens from its path,
+        and can not be opened as a classic filter
+        """
+        bf = CountingBloomFilter.create("testcountingheader.mmap", 1000, 1e-3, width=8)
+        assert bf.header
+        assert bf.width == 8
+        bf.add_many("test%d" % x for x in xrange(1000))
+        bf.add("test1")
+        bf.close()
+
+        bf = CountingBloomFilter.open("testcountingheader.mmap")
+        assert bf.width == 8
+        assert len(bf) == 1001
+        assert bf.counter("test1") == 2
+        assert all(bf.contains_many("test%d" % x for x in xrange(1000)))
+        assert bf.remove("test1")
+        bf.close()
+
+        with pytest.raises(ValueError):
+            BloomFilter.open("testcountingheader.mmap")
+
+    def test_threadsafe(self):
+        """
+        Tests counting filters can be thread safe, but not shared
+        """
+        bf = CountingBloomFilter.create("testcountingsafe.mmap", 1000, 1e-3, threadsafe=True)
+        assert bf.threadsafe
+        assert bf.add("test")
+        assert bf.remove("test")
+        assert "test" not in bf
+        bf.close()
+        with pytest.raises(ValueError):
+            CountingBloomFilter.open("testcountingsafe.mmap", shared=True)
+
+    @classmethod
+    def teardown_class(cls):
+        # Remove the mmap files
+        mmap_files = [f for f in os.listdir(".") if f.endswith(".mmap")]
+        [os.remove(f) for f in mmap_files]
@@ -0,0 +1,120 @@
+"""
+Contains tests for the cuckoo filter class.
+"""
+import os
+import pytest
+from pyblooming import Bitmap, BloomFilter, CuckooFilter
+from pyblooming.hashing import HASH_LEGACY
+
+class TestCuckooFilter(object):
+
+    @classmethod
+    def setup_class(cls):
+        # Remove the mmap files
+        mmap_files = [f for f in os.listdir(".") if f.endswith(".mmap")]
+        [os.remove(f) for f in mmap_files]
+
+    def test_bad_params(self):
+        """
+        Tests that the fingerprint bits and bitmap are checked
+        """
+        with pytest.raises(ValueError):
+            CuckooFilter(Bitmap(1024), 3)
+        with pytest.raises(ValueError):
+            CuckooFilter(Bitmap(1024), 33)
+        with pytest.raises(ValueError):
+            CuckooFilter(Bitmap(CuckooFilter.extra_buffer() + 1), 16)
+        with pytest.raises(ValueError):
+            CuckooFilter(Bitmap(1024), 16, HASH_LEGACY)
+
+    def test_params_for_capacity(self):
+        """
+        Tests that a cuckoo filter is smaller than a bloom
+        filter for low false positive rates.
+        """
+        bytes, fp_bits = CuckooFilter.params_for_capacity(1e6, 1e-4)
+        classic, k = BloomFilter.params_for_capacity(1e6, 1e-4)
+        assert fp_bits == 17
+        assert bytes < classic
+        assert CuckooFilter.expected_probability(fp_bits) <= 1e-4
+
+    def test_add_remove(self):
+        """
+        Tests adding, checking and removing keys
+        """
+        cf = CuckooFilter.for_capacity(10000, 1e-4)
+        assert all([cf.add("test%d" % x) for x in xrange(10000)])
+        assert len(cf) == 10000
+        assert all(cf.contains_many("test%d" % x for x in xrange(10000)))
+        assert cf.load_factor() > 0.9
+
+        assert all([cf.remove("test%d" % x) for x in xrange(5000)])
+        assert len(cf) == 5000
+        assert sum(cf.contains_many("test%d" % x for x in xrange(5000))) < 5
+        assert all(cf.contains_many("test%d" % x for x in xrange(5000, 10000)))
+        assert not cf.remove("foo")
+        assert not cf.add("test9999", True)
+
+    def test_fingerprint_widths(self):
+        """
+        Tests buckets are read back at every fingerprint width,
+        including buckets which do not start on a byte
+        """
+        for fp_bits in xrange(4, 33):
+            bytes = CuckooFilter.params_for_capacity(200, 0.01)[0] * 4
+            cf = CuckooFilter(Bitmap(bytes), fp_bits)
+            cf.add_many("test%d" % x for x in xrange(200))
+            assert all(cf.contains_many("test%d" % x for x in xrange(200)))
+            last = cf.buckets - 1
+            cf._write_bucket(last, [cf.fp_mask, 1, 0, cf.fp_mask])
+            assert cf._read_bucket(last) == [cf.fp_mask, 1, 0, cf.fp_mask]
+            assert cf._bucket_has(last, 1) and not cf._bucket_has(last, 2)
+
+    def test_prob(self):
+        """
+        Tests that the filter is only wrong within
+        a certain threshold at capacity.
+        """
+        cf = CuckooFilter.for_capacity(10000, 1e-3)
+        assert cf.fp_bits == 13
+        cf.add_many("test%d" % x for x in xrange(10000))
+        num_wrong = len([x for x in xrange(100000) if "foo%d" % x in cf])
+
+        # Should get about 90 wrong
+        assert num_wrong >= 30
+        assert num_wrong <= 200
+
+    def test_full(self):
+        """
+        Tests that a failed insert leaves the filter unchanged
+        """
+        cf = CuckooFilter(Bitmap(4 + CuckooFilter.extra_buffer()), 8)
+        assert cf.buckets == 1
+        cf.add_many("test%d" % x for x in xrange(4))
+        before = cf.bitmap[0:4]
+        with pytest.raises(ValueError):
+            cf.add("foo")
+        assert cf.bitmap[0:4] == before
+        assert len(cf) == 4
+        assert all(cf.contains_many("test%d" % x for x in xrange(4)))
+
+    def test_flush(self):
+        """
+        Tests that a cuckoo filter restores from a file
+        """
+        bytes, fp_bits = CuckooFilter.params_for_capacity(1000, 1e-4)
+        cf = CuckooFilter(Bitmap(bytes, "testcuckooflush.mmap"), fp_bits)
+        cf.add_many("test%d" % x for x in xrange(1000))
+        cf.close()
+
+        cf = CuckooFilter(Bitmap(bytes, "testcuckooflush.mmap"), 8)
+        assert cf.fp_bits == fp_bits
+        assert len(cf) == 1000
+        assert all(cf.contains_many("test%d" % x for x in xrange(1000)))
+        cf.close()
+
+    @classmethod
+    def teardown_class(cls):
+        # Remove the mmap files
+        mmap_files = [f for f in os.listdir(".") if f.endswith(".mmap")]
+        [os.remove(f) for f in mmap_files]
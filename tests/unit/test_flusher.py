@@ -0,0 +1,148 @@
+"""
+Contains tests for the background flusher.
+"""
+import time
+import os
+import mmap
+import pytest
+from pyblooming.bitmap import Bitmap as pyBitmap
+from pyblooming.cbitmap import Bitmap as cBitmap
+from pyblooming import Flusher, BloomFilter, ScalingBloomFilter
+
+class BrokenTarget(object):
+    "A target which fails to flush"
+    def flush(self, dirty_only=False):
+        raise OSError("Failed to flush the buffers!")
+
+    def dirty_bytes(self):
+        return 1
+
+class FlakyTarget(object):
+    "A target which fails to flush once"
+    def __init__(self):
+        self.flushes = 0
+
+    def flush(self, dirty_only=False):
+        self.flushes += 1
+        if self.flushes == 1: raise OSError("Failed to flush the buffers!")
+
+    def dirty_bytes(self):
+        return 1
+
+class TestFlusher(object):
+
+    @classmethod
+    def setup_class(cls):
+        # Remove the mmap files
+        mmap_files = [f for f in os.listdir(".") if f.endswith(".mmap")]
+        [os.remove(f) for f in mmap_files]
+
+    def test_wait_durable(self):
+        """
+        Tests that wait_durable flushes the changes
+        """
+        for cls in (pyBitmap, cBitmap):
+            bitmap = cls(4 * mmap.PAGESIZE, "testflusherwait.mmap")
+            flusher = Flusher(bitmap, interval=60).start()
+            bitmap.set_bits([1, 8 * mmap.PAGESIZE])
+            assert bitmap.dirty_bytes() == 2 * mmap.PAGESIZE
+            assert flusher.wait_durable(5)
+            assert bitmap.dirty_bytes() == 0
+            flusher.stop()
+            assert not flusher.running()
+            bitmap.close()
+
+    def test_periodic(self):
+        """
+        Tests that the changes are flushed every interval
+        """
+        bitmap = cBitmap(4 * mmap.PAGESIZE, "testflusherperiodic.mmap")
+        flusher = Flusher(bitmap, interval=0.01).start()
+        bitmap[1] = 1
+        for x in xrange(500):
+            if bitmap.dirty_bytes() == 0: break
+            time.sleep(0.01)
+        assert bitmap.dirty_bytes() == 0
+        flusher.stop()
+        bitmap.close()
+
+    def test_dirty_threshold(self):
+        """
+        Tests that periodic flushes wait for the threshold
+        """
+        bitmap = cBitmap(4 * mmap.PAGESIZE, "testflusherthreshold.mmap")
+        flusher = Flusher(bitmap, interval=0.01, dirty_threshold=2 * mmap.PAGESIZE).start()
+        bitmap[1] = 1
+        time.sleep(0.1)
+        assert bitmap.dirty_bytes() == mmap.PAGESIZE
+        flusher.wait_durable()
+        assert bitmap.dirty_bytes() == 0
+        flusher.stop()
+        bitmap.close()
+
+    def test_not_started(self):
+        """
+        Tests that wait_durable flushes directly without a thread
+        """
+        bitmap = pyBitmap(4 * mmap.PAGESIZE, "testflushernotstarted.mmap")
+        flusher = Flusher(bitmap)
+        bitmap[1] = 1
+        assert flusher.wait_durable()
+        assert bitmap.dirty_bytes() == 0
+        with pytest.raises(ValueError):
+            Flusher(bitmap, interval=0)
+        bitmap.close()
+
+    def test_error(self):
+        """
+        Tests that a failed flush is raised by wait_durable
+        """
+        flusher = Flusher(BrokenTarget(), interval=0.01).start()
+        with pytest.raises(OSError):
+            flusher.wait_durable(5)
+        flusher.stop(flush=False)
+
+    def test_error_sticky(self):
+        """
+        Tests that a failed flush is raised by wait_durable
+        even if a later flush succeeded
+        """
+        target = FlakyTarget()
+        flusher = Flusher(target, interval=0.01).start()
+        deadline = time.time() + 5
+        while target.flushes < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        assert target.flushes >= 2
+        with pytest.raises(OSError):
+            flusher.wait_durable(5)
+        assert flusher.wait_durable(5)
+        flusher.stop(flush=False)
+
+    def test_scaling_filter(self):
+        """
+        Tests flushing a scaling filter while adding keys
+        """
+        data = {"counter": 0, "files":[]}
+        def getname():
+            name = "test.flusher.%03d.mmap" % data["counter"]
+            data["files"].append(name)
+            data["counter"] += 1
+            return name
+
+        s = ScalingBloomFilter(filenames=getname,initial_capacity=1e3, prob=1e-4, scale_size=4)
+        flusher = Flusher(s, interval=0.001).start()
+        [s.add("test%d" % x) for x in xrange(10000)]
+        flusher.stop()
+        assert s.dirty_bytes() == 0
+
+        bitmaps = [pyBitmap(os.path.getsize(f), f) for f in data["files"]]
+        filters = [BloomFilter(b,1) for b in bitmaps]
+        assert sum(len(f) for f in filters) == 10000
+        s.close()
+        [f.close() for f in filters]
+
+    @classmethod
+    def teardown_class(cls):
+        # Remove the mmap files
+        mmap_files = [f for f in os.listdir(".") if f.endswith(".mmap")]
+        [os.remove(f) for f in mmap_files]
@@ -0,0 +1,158 @@
+"""
+Contains tests for the hash engines.
+"""
+import os
+import pytest
+from pyblooming import hashing as pyHashing
+from pyblooming import chashing as cHashing
+
+# Reference values from the canonical MurmurHash3_x64_128
+MURMUR3_VECTORS = [
+    ("", 0, (0x0, 0x0)),
+    ("test", 0, (0xac7d28cc74bde19d, 0x9a128231f9bd4d82)),
+    ("test", 1, (0xc3812fdf4d18f852, 0xc81a9057aa737aec)),
+    ("The quick brown fox jumps over the lazy dog", 0,
+        (0xe34bbc7bbc071b6c, 0x7a433ca9c49a9347)),
+]
+
+# The legacy engine hashed unicode keys by code point before typed keys
+LEGACY_UNICODE_VECTORS = [
+    (u"caf\xe9", [6385107896, 92932457, 11281745215431429641, 1449926811927082]),
+    (u"\u65e5\u672c", [6747126, 1654380, 56503664360725, 1313801637943]),
+]
+
+class TestHashing(object):
+
+    def test_murmur3_vectors(self):
+        """
+        Tests the pure python MurmurHash3 against known values
+        """
+        for key, seed, expected in MURMUR3_VECTORS:
+            assert pyHashing.murmur3_128(key, seed) == expected
+
+    def test_murmur3_hashes(self):
+        """
+        Tests that each round of hashes uses the next seed
+        """
+        hashes = pyHashing.murmur3_hashes("test", 3)
+        assert hashes == [0xac7d28cc74bde19d, 0x9a128231f9bd4d82, 0xc3812fdf4d18f852]
+
+    def test_legacy_hashes(self):
+        """
+        Tests that the legacy hashes salt every 4 hashes
+        """
+        hashes = pyHashing.legacy_hashes("test", 6)
+        assert len(hashes) == 6
+        assert hashes[:4] == pyHashing.legacy_hashes("test", 4)
+        assert hashes[4:] != hashes[:2]
+
+    def test_legacy_unicode(self):
+        """
+        Tests the legacy engine still hashes unicode keys by code
+        point, while the other engines hash their encoded bytes
+        """
+        for key, expected in LEGACY_UNICODE_VECTORS:
+            assert pyHashing.get_hashes(pyHashing.HASH_LEGACY, key, 4) == expected
+            assert pyHashing.get_hashes(pyHashing.HASH_MURMUR3, key, 4) == \
+                   pyHashing.murmur3_hashes(key.encode("utf-8"), 4)
+        assert pyHashing.get_hashes(pyHashing.HASH_LEGACY, u"test", 8) == \
+               pyHashing.get_hashes(pyHashing.HASH_LEGACY, "test", 8)
+
+    def test_unknown_engine(self):
+        """
+        Tests that an unknown engine is rejected
+        """
+        with pytest.raises(ValueError):
+            pyHashing.get_hashes(255, "test", 4)
+
+    def test_double_hashes(self):
+        """
+        Tests that double hashing derives k hashes from the first two
+        """
+        h1, h2 = pyHashing.murmur3_128("test")
+        hashes = pyHashing.get_hashes(pyHashing.HASH_MURMUR3, "test", 5, pyHashing.INDEX_DOUBLE)
+        assert hashes == [(h1 + i*h2) % 2**64 for i in xrange(5)]
+
+    def test_int_hashes(self):
+        """
+        Tests integer keys are mixed instead of converted to strings
+        """
+        hashes = pyHashing.int_hashes(1234, 3)
+        assert hashes == [pyHashing._fmix64((1234 + i*pyHashing.GOLDEN_64) % 2**64) for i in xrange(1, 4)]
+        assert pyHashing.get_hashes(pyHashing.HASH_LEGACY, 1234, 3) == hashes
+        assert pyHashing.int_hashes(-1, 2) == pyHashing.int_hashes(2**64 - 1, 2)
+        assert pyHashing.get_hashes(pyHashing.HASH_MURMUR3, 1234, 3) != \
+               pyHashing.get_hashes(pyHashing.HASH_MURMUR3, "1234", 3)
+        with pytest.raises(OverflowError):
+            pyHashing.int_hashes(2**64, 2)
+        with pytest.raises(OverflowError):
+            pyHashing.int_hashes(-2**63 - 1, 2)
+
+    def test_key_bytes(self):
+        """
+        Tests the bytes hashed for the key types
+        """
+        assert pyHashing.key_bytes("test") == "test"
+        assert pyHashing.key_bytes(u"caf\xe9") == "caf\xc3\xa9"
+        assert pyHashing.key_bytes(bytearray("test")) == "test"
+        assert pyHashing.key_bytes(buffer("a test", 2)) == "test"
+        assert pyHashing.key_bytes(memoryview("test")) == "test"
+        with pytest.raises(TypeError):
+            pyHashing.key_bytes(None)
+        with pytest.raises(TypeError):
+            pyHashing.key_bytes(1.5)
+
+class TestCHashing(object):
+
+    def test_murmur3_vectors(self):
+        """
+        Tests the C MurmurHash3 against known values
+        """
+        for key, seed, expected in MURMUR3_VECTORS:
+            assert cHashing.murmur3_128(key, seed) == expected
+
+    def test_compatibility(self):
+        """
+        Tests that the C and pure python hashes match on
+        keys of every tail length
+        """
+        for length in xrange(40):
+            key = os.urandom(length)
+            assert cHashing.murmur3_128(key, 7) == pyHashing.murmur3_128(key, 7)
+            assert cHashing.murmur3_hashes(key, 5) == pyHashing.murmur3_hashes(key, 5)
+
+    def test_legacy_unicode(self):
+        """
+        Tests the legacy engine hashes unicode keys
+        like the pure python version
+        """
+        for key, expected in LEGACY_UNICODE_VECTORS:
+            assert cHashing.get_hashes(pyHashing.HASH_LEGACY, key, 4) == expected
+            assert cHashing.get_hashes(pyHashing.HASH_LEGACY, key, 9) == \
+                   pyHashing.get_hashes(pyHashing.HASH_LEGACY, key, 9)
+
+    def test_unknown_engine(self):
+        """
+        Tests that an unknown engine is rejected
+        """
+        with pytest.raises(ValueError):
+            cHashing.get_hashes(255, "test", 4)
+
+    def test_double_hashes(self):
+        """
+        Tests that double hashing matches the pure python version
+        """
+        for engine in (pyHashing.HASH_LEGACY, pyHashing.HASH_MURMUR3):
+            hashes = cHashing.get_hashes(engine, "test", 12, pyHashing.INDEX_DOUBLE)
+            assert hashes == pyHashing.get_hashes(engine, "test", 12, pyHashing.INDEX_DOUBLE)
+
+    def test_int_hashes(self):
+        """
+        Tests that the integer hashes match the pure python version
+        """
+        for key in (0, 1234, -1, -2**63, 2**64 - 1):
+            assert cHashing.int_hashes(key, 5) == pyHashing.int_hashes(key, 5)
+            assert cHashing.get_hashes(pyHashing.HASH_MURMUR3, key, 5, pyHashing.INDEX_DOUBLE) == \
+                   pyHashing.get_hashes(pyHashing.HASH_MURMUR3, key, 5, pyHashing.INDEX_DOUBLE)
+        with pytest.raises(OverflowError):
+            cHashing.int_hashes(2**64, 2)
@@ -0,0 +1,164 @@
+"""
+Contains tests for the rotating bloom filter class.
+"""
+import os
+import shutil
+import time
+import pytest
+from pyblooming import Bitmap, BloomFilter, RotatingBloomFilter
+from pyblooming.hashing import HASH_LEGACY
+
+class TestRotatingBloomFilter(object):
+
+    @classmethod
+    def setup_class(cls):
+        # Remove the mmap files
+        mmap_files = [f for f in os.listdir(".") if f.endswith(".mmap")]
+        [os.remove(f) for f in mmap_files]
+
+    def test_params(self):
+        """
+        Tests that the arguments are checked
+        """
+        with pytest.raises(ValueError):
+            RotatingBloomFilter(generations=0)
+        with pytest.raises(ValueError):
+            RotatingBloomFilter(period=0)
+        with pytest.raises(ValueError):
+            RotatingBloomFilter(filters=[BloomFilter.for_capacity(1000, 1e-3),
+                                         BloomFilter.for_capacity(1000, 1e-3, HASH_LEGACY)])
+
+    def test_rotate(self):
+        """
+        Tests that keys expire after the generations rotate
+        """
+        r = RotatingBloomFilter(generations=3, capacity=1000, prob=1e-4)
+        assert len(r.filters) == 3
+        r.add_many("test%d" % x for x in xrange(1000))
+        r.rotate()
+        r.add_many("foo%d" % x for x in xrange(1000))
+        assert len(r) == 2000
+        r.rotate()
+        assert all(r.contains_many("test%d" % x for x in xrange(1000)))
+        assert not r.add("test1", True)
+
+        r.rotate()
+        assert len(r) == 1000
+        assert sum(r.contains_many("test%d" % x for x in xrange(1000))) < 5
+        assert all(r.contains_many("foo%d" % x for x in xrange(1000)))
+
+        r.rotate()
+        assert len(r) == 0
+        assert sum(r.contains_many("foo%d" % x for x in xrange(1000))) < 5
+
+    def test_reuses_bitmaps(self):
+        """
+        Tests that rotating reuses the bitmaps
+        """
+        r = RotatingBloomFilter(generations=2, capacity=1000, prob=1e-4)
+        bitmaps = set(id(f.bitmap) for f in r.filters)
+        r.add("test")
+        [r.rotate() for x in xrange(5)]
+        assert set(id(f.bitmap) for f in r.filters) == bitmaps
+
+    def test_period(self):
+        """
+        Tests rotating automatically
+        """
+        r = RotatingBloomFilter(generations=2, capacity=1000, prob=1e-4, period=0.5)
+        r.add("test")
+        time.sleep(0.6)
+        assert "test" in r
+        time.sleep(0.6)
+        assert "test" not in r
+
+    def test_files(self):
+        """
+        Tests restoring the generations from files
+        """
+        data = {"counter": 0, "files":[]}
+        def getname():
+            name = "test.rotating.%03d.mmap" % data["counter"]
+            data["files"].append(name)
+            data["counter"] += 1
+            return name
+
+        r = RotatingBloomFilter(filenames=getname, generations=2, capacity=1000, prob=1e-4)
+        r.add_many("test%d" % x for x in xrange(100))
+        r.rotate()
+        r.add_many("foo%d" % x for x in xrange(100))
+        r.close()
+
+        # The files are oldest first after a single rotation
+        files = list(reversed(data["files"]))
+        filters = [BloomFilter(Bitmap(os.path.getsize(f), f), 1) for f in files]
+        r = RotatingBloomFilter(filters=filters)
+        assert len(r) == 200
+        r.rotate()
+        assert all(r.contains_many("foo%d" % x for x in xrange(100)))
+        assert sum(r.contains_many("test%d" % x for x in xrange(100))) < 5
+        r.close()
+
+    def test_open_directory(self):
+        """
+        Tests reopening the generations from a directory keeps
+        their order, so the next rotation retires the oldest
+        """
+        path = "testrotatingdir"
+        if os.path.isdir(path): shutil.rmtree(path)
+        r = RotatingBloomFilter(generations=3, capacity=1000, prob=1e-4, period=3600, directory=path)
+        r.add_many("a%d" % x for x in xrange(100))
+        r.rotate()
+        r.add_many("b%d" % x for x in xrange(100))
+        r.rotate()
+        r.add_many("c%d" % x for x in xrange(100))
+        rotated_at = r.rotated_at
+        order = [f.info["file"] for f in r.filters]
+        assert order == ["000002.bloom", "000000.bloom", "000001.bloom"]
+        r.close()
+
+        r = RotatingBloomFilter.open(path)
+        assert [f.info["file"] for f in r.filters] == order
+        assert r.rotated_at == rotated_at
+        assert r.period == 3600
+        assert len(r) == 300
+        r.rotate()
+        assert sum(r.contains_many("a%d" % x for x in xrange(100))) < 5
+        assert all(r.contains_many("b%d" % x for x in xrange(100)))
+        assert all(r.contains_many("c%d" % x for x in xrange(100)))
+        r.close()
+
+        # The rotation was saved as well
+        r = RotatingBloomFilter.open(path)
+        assert [f.info["file"] for f in r.filters] == order[1:] + order[:1]
+        r.close()
+        shutil.rmtree(path)
+
+    def test_rotate_flush(self):
+        """
+        Tests the cleared generation is flushed before
+        the manifest lists it as the newest
+        """
+        path = "testrotatingflush"
+        if os.path.isdir(path): shutil.rmtree(path)
+        r = RotatingBloomFilter(generations=2, capacity=1000, prob=1e-4, period=3600, directory=path)
+        r.add_many("a%d" % x for x in xrange(100))
+        r.rotate()
+        r.add_many("b%d" % x for x in xrange(100))
+        oldest = r.filters[0]
+        dirty = []
+        write = r._write_manifest
+        def record():
+            dirty.append(oldest.dirty_bytes())
+            write()
+        r._write_manifest = record
+        r.rotate()
+        assert dirty == [0]
+        r.close()
+        shutil.rmtree(path)
+
+    @classmethod
+    def teardown_class(cls):
+        # Remove the mmap files
+        mmap_files = [f for f in os.listdir(".") if f.endswith(".mmap")]
+        [os.remove(f) for f in mmap_files]
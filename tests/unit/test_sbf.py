@@ -4,10 +4,14 @@ Contains tests for the scaling bloom filter class.
 import time
 import os
 import os.path
+import shutil
 import pytest
+import threading
 import hashlib
+import json
 from pyblooming.bitmap import Bitmap
 from pyblooming import ScalingBloomFilter, BloomFilter
+from pyblooming.hashing import HASH_LEGACY, INDEX_DOUBLE
 
 class TestBloomFilter(object):
 
@@ -64,6 +68,38 @@ class TestBloomFilter(object):
         assert s.total_bitmap_size() > bytes
         assert s.total_bitmap_size() <= 2*bytes
 
+    def test_hash_once(self):
+        """
+        Tests that a lookup hashes the key once for all the filters
+        """
+        s = ScalingBloomFilter(initial_capacity=1e3, prob=1e-4, scale_size=4)
+        [s.add("test%d" % x,True) for x in xrange(10000)]
+        assert len(s.filters) == 3
+
+        hashes = {}
+        assert not s._contains("foo", hashes)
+        assert len(hashes) == 1
+        assert len(hashes.values()[0]) == max(filt.k_num for filt in s.filters)
+
+    def test_mixed_hashes(self):
+        """
+        Tests that filters using different hash engines and
+        index modes can be stacked
+        """
+        legacy = BloomFilter.for_capacity(1e3, 1e-5, HASH_LEGACY)
+        [legacy.add("test%d" % x) for x in xrange(500)]
+        s = ScalingBloomFilter(filters=[legacy], initial_capacity=1e3, prob=1e-4,
+                               scale_size=4, index_mode=INDEX_DOUBLE)
+        [s.add("test%d" % x,True) for x in xrange(10000)]
+
+        assert len(s) == 10000
+        assert s.filters[-1].index_mode == INDEX_DOUBLE
+        assert all([s.__contains__("test%d" % x) for x in xrange(10000)])
+
+        hashes = {}
+        assert not s._contains("foo", hashes)
+        assert len(hashes) == 2
+
     def test_filename_callback(self):
         """
         Tests that the filter makes the callback to get the filenames
@@ -95,6 +131,412 @@ class TestBloomFilter(object):
         # Counter should get called 3 times
         assert data["counter"] == 3
 
+    def test_many(self):
+        """
+        Tests adding and checking keys in batches across filters
+        """
+        sbf = ScalingBloomFilter(initial_capacity=1000, prob=0.01)
+        assert sbf.add_many("test%d" % x for x in xrange(3000)) == 3000
+        assert len(sbf.filters) == 2
+        assert len(sbf) == 3000
+        assert all(len(f) < f.info["capacity"] for f in sbf.filters)
+        assert all(sbf.contains_many("test%d" % x for x in xrange(3000)))
+        res = sbf.contains_many("new%d" % x for x in xrange(1000))
+        assert res == ["new%d" % x in sbf for x in xrange(1000)]
+        assert sum(res) < 50
+
+    def test_threadsafe(self):
+        """
+        Tests several threads filling filters together only
+        add one new filter each time, and lose no keys
+        """
+        sbf = ScalingBloomFilter(initial_capacity=1000, prob=0.01, threadsafe=True)
+        assert sbf.filters[0].bitmap.atomic
+        def work(p):
+            for x in xrange(p, 20000, 4):
+                sbf.add("test%d" % x)
+        threads = [threading.Thread(target=work, args=(p,)) for p in xrange(4)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+
+        assert len(sbf) == 20000
+        assert all(len(f) >= f.info["capacity"] - 10 for f in sbf.filters[:-1])
+        assert all(sbf.contains_many("test%d" % x for x in xrange(20000)))
+        sbf.close()
+
+    def test_threadsafe_many(self):
+        """
+        Tests batches added by several threads do not
+        overfill the largest filter
+        """
+        sbf = ScalingBloomFilter(initial_capacity=20000, prob=0.01, threadsafe=True)
+        def work(p):
+            sbf.add_many("test%d-%d" % (p, x) for x in xrange(15000))
+        threads = [threading.Thread(target=work, args=(p,)) for p in xrange(4)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+        assert len(sbf) == 60000
+        assert len(sbf.filters) == 2
+        assert all(len(f) < f.info["capacity"] for f in sbf.filters)
+        assert all(f.info["reserved"] == 0 for f in sbf.filters)
+        assert all(sbf.contains_many("test%d-%d" % (p, x) for p in xrange(4) for x in xrange(15000)))
+        sbf.close()
+
+    def test_prebuild(self):
+        """
+        Tests the next filter is built in the background once
+        the largest filter passes the threshold
+        """
+        built = []
+        def callback(length):
+            built.append(threading.current_thread().name)
+            return Bitmap(length)
+        sbf = ScalingBloomFilter(callback=callback, initial_capacity=1000, prob=0.01, prebuild_threshold=0.8)
+        sbf.add_many("test%d" % x for x in xrange(700))
+        assert sbf.prebuilder is None
+        for x in xrange(700, 900):
+            sbf.add("test%d" % x)
+        assert sbf.prebuilder is not None
+        sbf.prebuilder.join()
+        assert len(sbf.filters) == 1
+        assert built[1] == "pyblooming-prebuild"
+
+        # Growing swaps in the prebuilt filter
+        sbf.add_many("test%d" % x for x in xrange(900, 1500))
+        assert len(sbf.filters) == 2
+        assert len(built) == 2
+        assert sbf.prebuilder is None
+        assert sbf.filters[1].info["capacity"] == 4000
+        assert all(sbf.contains_many("test%d" % x for x in xrange(1500)))
+        sbf.close()
+
+    def test_prebuild_close(self):
+        """
+        Tests a prebuilt filter keeps a temporary name until it
+        is added, and is removed on close if it never is
+        """
+        path = "testsbfprebuild"
+        if os.path.isdir(path): shutil.rmtree(path)
+        sbf = ScalingBloomFilter(initial_capacity=1000, prob=0.01, directory=path, prebuild_threshold=0.5)
+        sbf.add_many("test%d" % x for x in xrange(600))
+        sbf.prebuilder.join()
+        assert sorted(os.listdir(path)) == ["000000.bloom", "000001.bloom.tmp", "manifest.json"]
+        sbf.close()
+        assert sorted(os.listdir(path)) == ["000000.bloom", "manifest.json"]
+
+        # A temporary file left by a crash is replaced
+        with open(os.path.join(path, "000001.bloom.tmp"), "w") as fh:
+            fh.write("junk")
+        sbf = ScalingBloomFilter.open(path)
+        sbf.add_many("new%d" % x for x in xrange(1000))
+        assert sorted(os.listdir(path)) == ["000000.bloom", "000001.bloom", "manifest.json"]
+        assert len(sbf.filters[1]) > 0
+        sbf.close()
+        shutil.rmtree(path)
+
+    def test_open_while_adding(self):
+        """
+        Tests opening a directory does not touch the files
+        of a filter which is still adding to it
+        """
+        path = "testsbfreader"
+        if os.path.isdir(path): shutil.rmtree(path)
+        sbf = ScalingBloomFilter(initial_capacity=1000, prob=0.01, directory=path, prebuild_threshold=0.5)
+        sbf.add_many("test%d" % x for x in xrange(600))
+        sbf.prebuilder.join()
+        sbf.flush()
+        manifest = os.path.join(path, "manifest.json")
+        before = (sorted(os.listdir(path)), open(manifest).read(), os.stat(manifest).st_mtime)
+
+        reader = ScalingBloomFilter.open(path)
+        assert len(reader) == 600
+        reader.close()
+        assert (sorted(os.listdir(path)), open(manifest).read(), os.stat(manifest).st_mtime) == before
+
+        # The writer grows into its prebuilt filter
+        sbf.add_many("test%d" % x for x in xrange(600, 2000))
+        sbf.close()
+        sbf = ScalingBloomFilter.open(path)
+        assert len(sbf.filters) == 2
+        assert all(sbf.contains_many("test%d" % x for x in xrange(2000)))
+        sbf.close()
+        shutil.rmtree(path)
+
+    def test_prebuild_threshold(self):
+        """
+        Tests the prebuild threshold must be a fraction
+        """
+        with pytest.raises(ValueError):
+            ScalingBloomFilter(initial_capacity=1000, prebuild_threshold=1.5)
+        with pytest.raises(ValueError):
+            ScalingBloomFilter(initial_capacity=1000, prebuild_threshold=0)
+
+    def test_probe_stats(self):
+        """
+        Tests the lookup statistics of each filter
+        """
+        sbf = ScalingBloomFilter(initial_capacity=1000, prob=0.01)
+        sbf.add_many("test%d" % x for x in xrange(3000))
+        assert len(sbf.filters) == 2
+        assert all("test%d" % x in sbf for x in xrange(500))
+        stats = sbf.stats()
+        assert [s["probes"] for s in stats] == [500 - stats[1]["hits"], 500]
+        assert stats[0]["hits"] == stats[0]["probes"]
+        assert stats[0]["hit_rate"] == 1.0
+        assert stats[1]["hits"] < 50
+        assert [s["count"] for s in stats] == [999, 2001]
+
+        sbf.reset_stats()
+        assert all(sbf.contains_many("test%d" % x for x in xrange(500)))
+        assert sbf.stats() == stats
+        sbf.close()
+
+    def test_probe_largest(self):
+        """
+        Tests probing the filter with the most bits first
+        """
+        big = BloomFilter.for_capacity(10000, 0.01)
+        big.add_many("test%d" % x for x in xrange(500))
+        small = BloomFilter.for_capacity(1000, 0.01)
+        sbf = ScalingBloomFilter(filters=[big, small], prob=0.01, probe_order=ScalingBloomFilter.PROBE_LARGEST)
+        assert all("test%d" % x in sbf for x in xrange(500))
+        assert [s["probes"] for s in sbf.stats()] == [500, 0]
+        with pytest.raises(ValueError):
+            ScalingBloomFilter(initial_capacity=1000, probe_order="random")
+
+    def test_probe_adaptive(self):
+        """
+        Tests the adaptive order probes the filter with
+        the highest hit rate first
+        """
+        sbf = ScalingBloomFilter(initial_capacity=1000, prob=0.01, probe_order=ScalingBloomFilter.PROBE_ADAPTIVE)
+        sbf.add_many("test%d" % x for x in xrange(3000))
+        interval = ScalingBloomFilter.ADAPT_INTERVAL
+        assert all("test%d" % (x % 999) in sbf for x in xrange(2 * interval))
+        stats = sbf.stats()
+        assert stats[1]["probes"] == interval - 1
+        assert stats[0]["hits"] == 2 * interval - stats[1]["hits"]
+
+        # Batches use the same order
+        assert all(sbf.contains_many("test%d" % x for x in xrange(999)))
+        assert sbf.stats()[1]["probes"] == interval - 1
+        sbf.close()
+
+    def test_compact(self):
+        """
+        Tests compacting the filters into one from the keys
+        """
+        sbf = ScalingBloomFilter(initial_capacity=1000, prob=0.01)
+        keys = ["test%d" % x for x in xrange(5000)]
+        sbf.add_many(keys)
+        assert len(sbf.filters) == 3
+        size = sbf.total_bitmap_size()
+
+        filt = sbf.compact(keys)
+        assert sbf.filters == [filt]
+        assert filt.info["capacity"] == 10000
+        assert len(sbf) == 5000
+        assert sbf.total_bitmap_size() < size
+        assert all(sbf.contains_many(keys))
+
+        # Grows from the compacted filter
+        sbf.add_many("new%d" % x for x in xrange(5000))
+        assert len(sbf.filters) == 2
+        assert sbf.filters[1].info["capacity"] == 40000
+        with pytest.raises(ValueError):
+            sbf.compact(keys, headroom=0.5)
+        sbf.close()
+
+    def test_compact_stream(self):
+        """
+        Tests compacting from a stream of keys with an expected count
+        """
+        sbf = ScalingBloomFilter(initial_capacity=1000, prob=0.01)
+        sbf.add_many("test%d" % x for x in xrange(5000))
+        filt = sbf.compact(("test%d" % x for x in xrange(5000)), expected_count=6000)
+        assert filt.info["capacity"] == 12000
+        assert len(sbf) == 5000
+        assert all(sbf.contains_many("test%d" % x for x in xrange(5000)))
+        sbf.close()
+
+    def test_compact_directory(self):
+        """
+        Tests compacting publishes the new filter in the manifest,
+        and removes the old files
+        """
+        path = "testsbfcompact"
+        if os.path.isdir(path): shutil.rmtree(path)
+        sbf = ScalingBloomFilter(initial_capacity=1000, prob=0.01, directory=path)
+        keys = ["test%d" % x for x in xrange(3000)]
+        sbf.add_many(keys)
+        assert len(sbf.filters) == 2
+        sbf.compact(keys)
+        assert sorted(os.listdir(path)) == ["000002.bloom", "manifest.json"]
+        sbf.close()
+
+        sbf = ScalingBloomFilter.open(path)
+        assert len(sbf.filters) == 1
+        assert len(sbf) == 3000
+        assert all(sbf.contains_many(keys))
+        sbf.add_many("new%d" % x for x in xrange(6000))
+        assert [f.info["file"] for f in sbf.filters] == ["000002.bloom", "000003.bloom"]
+        sbf.close()
+        shutil.rmtree(path)
+
+    def test_compact_readers(self):
+        """
+        Tests the old filters stay open until the lookups
+        running during a compaction are done
+        """
+        sbf = ScalingBloomFilter(initial_capacity=2000, prob=0.01, threadsafe=True)
+        keys = ["test%d" % x for x in xrange(20000)]
+        sbf.add_many(keys)
+        errors = []
+        done = threading.Event()
+        def work():
+            try:
+                while not done.is_set():
+                    assert all(sbf.contains_many(keys[:5000]))
+            except Exception, e:
+                errors.append(e)
+        threads = [threading.Thread(target=work) for x in xrange(3)]
+        for t in threads: t.start()
+        for x in xrange(3):
+            sbf.compact(keys)
+        done.set()
+        for t in threads: t.join()
+        assert not errors
+        assert not sbf.active
+        assert len(sbf.filters) == 1
+        sbf.close()
+
+    def test_compact_prebuilt(self):
+        """
+        Tests compacting removes a filter built in the background
+        """
+        path = "testsbfcompactpre"
+        if os.path.isdir(path): shutil.rmtree(path)
+        sbf = ScalingBloomFilter(initial_capacity=1000, prob=0.01, directory=path, prebuild_threshold=0.5)
+        keys = ["test%d" % x for x in xrange(600)]
+        sbf.add_many(keys)
+        sbf.prebuilder.join()
+        assert sbf.prebuilt is not None
+        sbf.compact(keys)
+        assert sbf.prebuilt is None
+        assert sorted(os.listdir(path)) == ["000001.bloom", "manifest.json"]
+        sbf.close()
+        shutil.rmtree(path)
+
+    def test_open_directory(self):
+        """
+        Tests reopening a scaling filter from a directory
+        """
+        path = "testsbfdir"
+        if os.path.isdir(path): shutil.rmtree(path)
+        sbf = ScalingBloomFilter(initial_capacity=1000, prob=0.01, directory=path)
+        sbf.add_many("test%d" % x for x in xrange(3000))
+        assert len(sbf.filters) == 2
+        assert all(f.header for f in sbf.filters)
+        sbf.close()
+        assert sorted(os.listdir(path)) == ["000000.bloom", "000001.bloom", "manifest.json"]
+
+        sbf = ScalingBloomFilter.open(path, initial_capacity=1000, prob=0.01)
+        assert len(sbf.filters) == 2
+        assert len(sbf) == 3000
+        assert all(sbf.contains_many("test%d" % x for x in xrange(3000)))
+        sbf.add_many("new%d" % x for x in xrange(10000))
+        assert len(sbf.filters) == 3
+        assert os.path.exists(os.path.join(path, "000002.bloom"))
+        sbf.close()
+        shutil.rmtree(path)
+
+    def test_manifest_lazy(self):
+        """
+        Tests reopening from the manifest restores the parameters,
+        and only opens the older filters when a lookup reaches them
+        """
+        path = "testsbfmanifest"
+        if os.path.isdir(path): shutil.rmtree(path)
+        sbf = ScalingBloomFilter(initial_capacity=1000, prob=0.01, scale_size=2, prob_reduction=0.5,
+                                 directory=path)
+        sbf.add_many("test%d" % x for x in xrange(5000))
+        infos = [dict(f.info) for f in sbf.filters]
+        assert len(infos) == 3
+        sbf.close()
+        assert os.path.exists(os.path.join(path, "manifest.json"))
+
+        sbf = ScalingBloomFilter.open(path)
+        assert sbf.prob_reduction == 0.5
+        assert sbf.scale_size == 2
+        assert [f.info for f in sbf.filters] == infos
+        assert not any(f.loaded() for f in sbf.filters[:-1])
+        assert len(sbf) == 5000
+
+        # The newest keys are found in the largest filter
+        assert "test4999" in sbf
+        assert not any(f.loaded() for f in sbf.filters[:-1])
+        assert "test0" in sbf
+        assert sbf.filters[0].loaded()
+        assert all(sbf.contains_many("test%d" % x for x in xrange(5000)))
+
+        # New filters follow the restored parameters
+        sbf.add_many("new%d" % x for x in xrange(5000))
+        assert len(sbf.filters) == 4
+        assert sbf.filters[-1].info["capacity"] == infos[-1]["capacity"] * 2
+        assert sbf.filters[-1].info["prob"] == infos[-1]["prob"] * 0.5
+        sbf.close()
+
+        sbf = ScalingBloomFilter.open(path, lazy=False)
+        assert len(sbf.filters) == 4
+        assert len(sbf) == 10000
+        sbf.close()
+        shutil.rmtree(path)
+
+    def test_flush_manifest(self):
+        """
+        Tests the manifest is written after the filters are flushed
+        """
+        path = "testsbfflush"
+        if os.path.isdir(path): shutil.rmtree(path)
+        sbf = ScalingBloomFilter(initial_capacity=1000, prob=0.01, directory=path)
+        sbf.add_many("test%d" % x for x in xrange(3000))
+        dirty = []
+        write = sbf._write_manifest
+        def record():
+            dirty.append(sbf.dirty_bytes())
+            write()
+        sbf._write_manifest = record
+        sbf.flush()
+        assert dirty == [0]
+        sbf.close()
+
+        sbf = ScalingBloomFilter.open(path)
+        assert len(sbf) == 3000
+        sbf.close()
+        shutil.rmtree(path)
+
+    def test_grow_manifest(self):
+        """
+        Tests the manifest written when a filter is added
+        only has the counts of the last flush
+        """
+        path = "testsbfgrow"
+        if os.path.isdir(path): shutil.rmtree(path)
+        sbf = ScalingBloomFilter(initial_capacity=1000, prob=0.01, directory=path)
+        sbf.add_many("test%d" % x for x in xrange(500))
+        sbf.flush()
+        sbf.add_many("test%d" % x for x in xrange(500, 1500))
+        assert len(sbf.filters) == 2
+        with open(os.path.join(path, "manifest.json")) as fh:
+            manifest = json.load(fh)
+        assert [f["count"] for f in manifest["filters"]] == [500, 0]
+        sbf.close()
+
+        with open(os.path.join(path, "manifest.json")) as fh:
+            manifest = json.load(fh)
+        assert sum(f["count"] for f in manifest["filters"]) == 1500
+        shutil.rmtree(path)
+
     def test_doubleclose(self):
         """
         Tests that calling close twice is okay
@@ -156,6 +598,23 @@ class TestBloomFilter(object):
         s.close()
         s1.close()
 
+    def test_flush_dirty_only(self):
+        """
+        Tests flushing only the modified pages of the filters
+        """
+        data = {"counter": 0}
+        def getname():
+            name = "test.flushdirty.%03d.mmap" % data["counter"]
+            data["counter"] += 1
+            return name
+
+        s = ScalingBloomFilter(filenames=getname,initial_capacity=1e3, prob=1e-4, scale_size=4)
+        [s.add("test%d" % x,True) for x in xrange(10000)]
+        assert s.dirty_bytes() > 0
+        s.flush(dirty_only=True)
+        assert s.dirty_bytes() == 0
+        s.close()
+
     def test_close_does_flush(self):
         """
         Tests that a close does flush
@@ -0,0 +1,120 @@
+"""
+Contains tests for the sharded bloom filter class.
+"""
+import os
+import os.path
+import shutil
+import pytest
+from pyblooming import ScalingBloomFilter, ShardedBloomFilter
+
+class TestShardedBloomFilter(object):
+
+    def test_params(self):
+        """
+        Tests that the arguments are checked
+        """
+        with pytest.raises(ValueError):
+            ShardedBloomFilter(num_shards=0)
+        with pytest.raises(ValueError):
+            ShardedBloomFilter(num_shards=2, workers=-1)
+
+    def test_route(self):
+        """
+        Tests that a key is only added to its shard
+        """
+        s = ShardedBloomFilter(num_shards=4, initial_capacity=4000, prob=0.001)
+        assert len(s.shards) == 4
+        assert all(shard.filters[0].info["capacity"] == 1000 for shard in s.shards)
+        assert s.add("test")
+        idx = s.shard_index("test")
+        assert 0 <= idx < 4
+        assert "test" in s.shards[idx]
+        assert [len(shard) for shard in s.shards].count(0) == 3
+        assert "test" in s
+        s.close()
+
+    def test_many(self):
+        """
+        Tests adding and checking keys in batches across shards
+        """
+        s = ShardedBloomFilter(num_shards=4, initial_capacity=4000, prob=0.01, workers=4)
+        assert s.add_many("test%d" % x for x in xrange(10000)) == 10000
+        assert len(s) == 10000
+        assert all(len(shard) > 2000 for shard in s.shards)
+        assert all(len(shard.filters) == 2 for shard in s.shards)
+        assert all(s.contains_many("test%d" % x for x in xrange(10000)))
+        res = s.contains_many("new%d" % x for x in xrange(1000))
+        assert res == ["new%d" % x in s for x in xrange(1000)]
+        assert sum(res) < 50
+        s.close()
+
+    def test_threadsafe(self):
+        """
+        Tests new shards have atomic bitmaps when there is a pool
+        """
+        s = ShardedBloomFilter(num_shards=4, initial_capacity=4000, prob=0.01, workers=4)
+        assert all(shard.threadsafe for shard in s.shards)
+        assert all(shard.filters[0].bitmap.atomic for shard in s.shards)
+        s.close()
+
+        s = ShardedBloomFilter(num_shards=4, initial_capacity=4000, prob=0.01, workers=4, threadsafe=False)
+        assert not any(shard.threadsafe for shard in s.shards)
+        s.close()
+
+    def test_serial(self):
+        """
+        Tests the shards give the same results without a pool
+        """
+        s = ShardedBloomFilter(num_shards=4, initial_capacity=4000, prob=0.01, workers=0)
+        assert not any(shard.threadsafe for shard in s.shards)
+        s.add_many("test%d" % x for x in xrange(5000))
+        assert s.pool is None
+        assert all(s.contains_many("test%d" % x for x in xrange(5000)))
+        s.close()
+
+    def test_directory(self):
+        """
+        Tests reopening the shards from a directory
+        """
+        path = "testsharded"
+        if os.path.isdir(path): shutil.rmtree(path)
+        s = ShardedBloomFilter(num_shards=3, initial_capacity=3000, prob=0.01, directory=path)
+        s.add_many("test%d" % x for x in xrange(5000))
+        s.flush()
+        assert s.dirty_bytes() == 0
+        s.close()
+        assert sorted(os.listdir(path)) == ["shard000", "shard001", "shard002"]
+
+        s = ShardedBloomFilter.open(path)
+        assert len(s.shards) == 3
+        assert len(s) == 5000
+        assert all(s.contains_many("test%d" % x for x in xrange(5000)))
+        s.close()
+        shutil.rmtree(path)
+
+    def test_open_order(self):
+        """
+        Tests the shards are reopened by index, and
+        that a missing shard is an error
+        """
+        path = "testshardedorder"
+        if os.path.isdir(path): shutil.rmtree(path)
+        s = ShardedBloomFilter(num_shards=12, initial_capacity=12000, prob=0.01, directory=path)
+        s.add_many("test%d" % x for x in xrange(5000))
+        counts = [len(shard) for shard in s.shards]
+        s.close()
+
+        # Names beyond the padding sort before smaller indexes
+        os.rename(os.path.join(path, "shard010"), os.path.join(path, "shard0010"))
+        s = ShardedBloomFilter.open(path)
+        assert [len(shard) for shard in s.shards] == counts
+        assert all(s.contains_many("test%d" % x for x in xrange(5000)))
+        s.close()
+
+        shutil.rmtree(os.path.join(path, "shard0010"))
+        with pytest.raises(ValueError):
+            ShardedBloomFilter.open(path)
+        os.mkdir(os.path.join(path, "shard_old"))
+        with pytest.raises(ValueError):
+            ShardedBloomFilter.open(path)
+        shutil.rmtree(path)
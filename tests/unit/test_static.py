@@ -0,0 +1,119 @@
+"""
+Contains tests for the static xor filter class.
+"""
+import os
+import pytest
+from pyblooming import Bitmap, BloomFilter, StaticFilter
+
+class TestStaticFilter(object):
+
+    @classmethod
+    def setup_class(cls):
+        # Remove the mmap files
+        mmap_files = [f for f in os.listdir(".") if f.endswith(".mmap")]
+        [os.remove(f) for f in mmap_files]
+
+    def test_fingerprint_bits(self):
+        """
+        Tests the fingerprint bits for a probability
+        """
+        assert StaticFilter.fingerprint_bits(1e-2) == 7
+        assert StaticFilter.fingerprint_bits(1e-4) == 14
+        assert StaticFilter.expected_probability(14) <= 1e-4
+
+    def test_build(self):
+        """
+        Tests that every key is found after a build
+        """
+        sf = StaticFilter.build(("test%d" % x for x in xrange(10000)), 1e-4)
+        assert len(sf) == 10000
+        assert all(sf.contains_many("test%d" % x for x in xrange(10000)))
+        classic, k = BloomFilter.params_for_capacity(10000, 1e-4)
+        assert len(sf.bitmap) / 8 < classic
+
+    def test_duplicates(self):
+        """
+        Tests that duplicate keys are ignored
+        """
+        sf = StaticFilter.build(["foo", "bar", "foo"], 1e-4)
+        assert len(sf) == 2
+        assert "foo" in sf
+        assert "bar" in sf
+
+    def test_typed_keys(self):
+        """
+        Tests integer, unicode and buffer keys
+        """
+        sf = StaticFilter.build(xrange(-500, 500), 1e-4)
+        assert len(sf) == 1000
+        assert all(sf.contains_many(xrange(-500, 500)))
+        assert 1L in sf
+        with pytest.raises(OverflowError):
+            StaticFilter.build([1 << 64], 1e-4)
+
+        keys = [u"caf\xe9", u"\u65e5\u672c", bytearray("foo"), buffer("bar"), memoryview("baz")]
+        sf = StaticFilter.build(keys, 1e-4)
+        assert len(sf) == 5
+        assert all(sf.contains_many(keys))
+        assert u"caf\xe9".encode("utf-8") in sf
+        assert "foo" in sf
+        assert bytearray("bar") in sf
+
+        # Equal keys of different types are one key
+        sf = StaticFilter.build([u"foo", "foo", bytearray("foo")], 1e-4)
+        assert len(sf) == 1
+        with pytest.raises(TypeError):
+            StaticFilter.build([None], 1e-4)
+
+    def test_empty(self):
+        """
+        Tests building from no keys
+        """
+        sf = StaticFilter.build([], 1e-2)
+        assert len(sf) == 0
+        assert sum(sf.contains_many("test%d" % x for x in xrange(1000))) < 50
+
+    def test_prob(self):
+        """
+        Tests that the filter is only wrong within a certain threshold
+        """
+        sf = StaticFilter.build(("test%d" % x for x in xrange(10000)), 1e-2)
+        assert sf.fp_bits == 7
+        num_wrong = len([x for x in xrange(10000) if "foo%d" % x in sf])
+
+        # Should get about 78 wrong
+        assert num_wrong >= 30
+        assert num_wrong <= 150
+
+    def test_open(self):
+        """
+        Tests that a built file is reopened without a build
+        """
+        sf = StaticFilter.build(("test%d" % x for x in xrange(1000)), 1e-3, "teststatic.mmap")
+        assert not os.path.exists("teststatic.mmap.tmp")
+        sf.close()
+
+        sf = StaticFilter.open("teststatic.mmap")
+        assert len(sf) == 1000
+        assert sf.fp_bits == 10
+        assert all(sf.contains_many("test%d" % x for x in xrange(1000)))
+        sf.close()
+
+        # Rebuilding replaces the file
+        sf = StaticFilter.build(["foo"], 1e-3, "teststatic.mmap")
+        assert len(sf) == 1
+        assert "foo" in sf
+        sf.close()
+
+    def test_bad_bitmap(self):
+        """
+        Tests that an empty bitmap is rejected
+        """
+        with pytest.raises(ValueError):
+            StaticFilter(Bitmap(1024))
+
+    @classmethod
+    def teardown_class(cls):
+        # Remove the mmap files
+        mmap_files = [f for f in os.listdir(".") if f.endswith(".mmap")]
+        [os.remove(f) for f in mmap_files]